@@ -0,0 +1,70 @@
+"""Report the time to analyze the signal bit layout and validate a large in-memory database.
+
+A synthetic CAN FD cluster with the requested number of frames and signals is built with
+:any:`nixnet.database.build`, then analyzed with :any:`nixnet.database.analyze_bit_layout`
+and checked with :any:`MemoryDatabase.validate`.
+
+Usage::
+
+    python benchmarks/bit_layout.py [--frames N] [--signals N]
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import argparse
+import time
+
+from nixnet import constants
+from nixnet import database
+
+
+def make_database(num_frames, num_signals):
+    signal_bits = 64 * 8 // num_signals
+    frames = []
+    for frame_index in range(num_frames):
+        signals = [
+            {
+                'name': 'Sig{}_{}'.format(frame_index, signal_index),
+                'start_bit': signal_index * signal_bits,
+                'num_bits': min(signal_bits, 32),
+                'byte_ordr': constants.SigByteOrdr.LITTLE_ENDIAN,
+            }
+            for signal_index in range(num_signals)]
+        frames.append({
+            'name': 'Frame{}'.format(frame_index),
+            'id': frame_index,
+            'can_io_mode': constants.CanIoMode.CAN_FD,
+            'payload_len': 64,
+            'signals': signals,
+        })
+    db = database.MemoryDatabase('benchmark')
+    database.build(db, {'clusters': [{'name': 'Cluster', 'frames': frames}]})
+    return db
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--frames', type=int, default=1000, help='Number of frames (default: 1000)')
+    parser.add_argument('--signals', type=int, default=25, help='Number of signals per frame (default: 25)')
+    args = parser.parse_args()
+
+    start = time.time()
+    db = make_database(args.frames, args.signals)
+    print('build     {:>8.3f} s'.format(time.time() - start))
+
+    start = time.time()
+    layouts = database.analyze_bit_layout(db)
+    elapsed = time.time() - start
+    utilization = sum(layout.utilization for layout in layouts) / len(layouts)
+    print('layout    {:>8.3f} s  {} signals, mean utilization {:.2f}'.format(
+        elapsed, args.frames * args.signals, utilization))
+
+    start = time.time()
+    report = db.validate()
+    print('validate  {:>8.3f} s  {!r}'.format(time.time() - start, report))
+
+
+if __name__ == '__main__':
+    main()
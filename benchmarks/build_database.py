@@ -0,0 +1,70 @@
+"""Report the time to build a cluster from a declarative spec.
+
+A CAN cluster with the requested number of frames, each with signals and sent by an ECU,
+is built with :any:`nixnet.database.build` into a :any:`MemoryDatabase`,
+both moved in at once and replayed object by object as for a driver database.
+
+Usage::
+
+    python benchmarks/build_database.py [--frames N] [--signals N]
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import argparse
+import time
+
+from nixnet import constants
+from nixnet import database
+
+
+class _ReplayedDatabase(object):
+    """Stands in for a driver database, so that the spec is replayed object by object."""
+
+    def __init__(self):
+        self._memory = database.MemoryDatabase('benchmark')
+        self.name = self._memory.name
+        self.clusters = self._memory.clusters
+
+
+def make_spec(num_frames, num_signals):
+    bits = 64 // num_signals
+    frames = [
+        {
+            'name': 'Frame{}'.format(index),
+            'id': index,
+            'payload_len': 8,
+            'signals': [
+                {'name': 'Signal{}_{}'.format(index, signal), 'start_bit': signal * bits, 'num_bits': bits}
+                for signal in range(num_signals)],
+        }
+        for index in range(num_frames)]
+    names = [frame['name'] for frame in frames]
+    return {'clusters': [{
+        'name': 'Cluster',
+        'protocol': constants.Protocol.CAN,
+        'baud_rate': 500000,
+        'frames': frames,
+        'ecus': [{'name': 'Engine', 'tx_frms': names[::2]}, {'name': 'Body', 'tx_frms': names[1::2]}],
+    }]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--frames', type=int, default=10000, help='Number of frames (default: 10000)')
+    parser.add_argument('--signals', type=int, default=4, help='Number of signals per frame (default: 4)')
+    args = parser.parse_args()
+
+    spec = make_spec(args.frames, args.signals)
+    for label, db in (('moved', database.MemoryDatabase('benchmark')), ('replayed', _ReplayedDatabase())):
+        start = time.time()
+        database.build(db, spec)
+        elapsed = time.time() - start
+        print('{}: {} frames, {} signals, built in {:.2f} s'.format(
+            label, len(db.clusters['Cluster'].frames), args.frames * args.signals, elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""Report the compression ratio and speed of compressed capture files.
+
+Periodic CAN traffic is generated with a few hundred identifiers,
+payloads with rolling counters and slowly changing signals, and timestamps with jitter.
+It is written uncompressed and with every installed codec,
+then read back in the calling process and in a process pool. Requires NumPy.
+
+Usage::
+
+    python benchmarks/capture_compression.py [--frames N] [--processes N]
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from nixnet import capture
+from nixnet.capture import _codec
+from nixnet.capture import _units
+
+
+def _traffic(numpy, count):
+    random = numpy.random.RandomState(0)
+    num_ids = 300
+    periods = random.choice([10, 20, 50, 100, 1000], num_ids) * 10000
+    per_id = count // num_ids + 1
+    cycle = numpy.arange(per_id)
+    timestamps = (periods[:, None] * cycle + random.randint(0, 200, (num_ids, per_id))).ravel()
+    identifiers = numpy.repeat(numpy.arange(0x100, 0x100 + num_ids), per_id)
+    counters = numpy.tile(cycle, num_ids) & 0xFF
+    order = numpy.argsort(timestamps, kind='stable')[:count]
+
+    units = numpy.zeros(count, _units.UNIT_DTYPE)
+    units['timestamp'] = timestamps[order] + 131000000000000000
+    units['identifier'] = identifiers[order]
+    units['payload_length'] = 8
+    payload = units['payload']
+    payload[:, 0] = counters[order]
+    payload[:, 1] = identifiers[order] & 0xFF
+    payload[:, 2:4] = (counters[order] // 16)[:, None]
+    payload[:, 4] = random.randint(0, 2, count)
+    return units.tobytes()
+
+
+def main():
+    import numpy  # type: ignore
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--frames', type=int, default=2000000, help='Number of frames (default: 2000000)')
+    parser.add_argument('--processes', type=int, default=0, help='Pool processes, 0 for one per CPU (default: 0)')
+    args = parser.parse_args()
+
+    data = _traffic(numpy, args.frames)
+    directory = tempfile.mkdtemp()
+    try:
+        for compression in [None] + _codec.available():
+            path = os.path.join(directory, '{}.nxcap'.format(compression))
+            start = time.time()
+            with capture.CaptureWriter(path, compression=compression) as writer:
+                for position in range(0, len(data), 1 << 20):
+                    writer.write_bytes(data[position:position + (1 << 20)])
+            write = time.time() - start
+            ratio = len(data) / os.path.getsize(path)
+
+            with capture.CaptureReader(path) as reader:
+                start = time.time()
+                for _ in reader.read_bytes():
+                    pass
+                serial = time.time() - start
+                start = time.time()
+                for _ in reader.read_bytes(processes=args.processes):
+                    pass
+                pooled = time.time() - start
+            megabytes = len(data) / 1e6
+            print('{:<5} ratio {:>5.1f}  write {:>7.1f} MB/s  read {:>7.1f} MB/s  pooled read {:>7.1f} MB/s'.format(
+                str(compression), ratio, megabytes / write, megabytes / serial, megabytes / pooled))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""Report the speed and peak memory of merging capture files.
+
+Capture files of periodic CAN traffic with interleaved timestamps are merged into one capture file.
+Memory other than the pages of the memory mapped input files should not grow with the number of frames.
+Requires NumPy.
+
+Usage::
+
+    python benchmarks/capture_merge.py [--files N] [--frames N]
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import argparse
+import os
+import resource
+import shutil
+import tempfile
+import time
+
+from nixnet import capture
+from nixnet.capture import _units
+
+_START = 131000000000000000
+
+
+def _buffers(numpy, source, count, per_buffer):
+    random = numpy.random.RandomState(source)
+    for start in range(0, count, per_buffer):
+        size = min(per_buffer, count - start)
+        units = numpy.zeros(size, _units.UNIT_DTYPE)
+        gaps = random.randint(500, 1500, size)
+        units['timestamp'] = _START + 1000 * start + numpy.cumsum(gaps)
+        units['identifier'] = 0x100 * (source + 1) + random.randint(0, 50, size)
+        units['payload_length'] = 8
+        units['payload'] = random.randint(0, 256, (size, 8))
+        yield units.tobytes()
+
+
+def _anonymous_rss():
+    # Resident memory without mapped file pages, on Linux.
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('RssAnon:'):
+                    return int(line.split()[1]) / 1e3
+    except IOError:
+        pass
+    return float('nan')
+
+
+def main():
+    import numpy  # type: ignore
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--files', type=int, default=8, help='Number of capture files (default: 8)')
+    parser.add_argument('--frames', type=int, default=1000000, help='Frames per file (default: 1000000)')
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    try:
+        paths = []
+        for source in range(args.files):
+            path = os.path.join(directory, 'capture{}.nxcap'.format(source))
+            with capture.CaptureWriter(path) as writer:
+                for data in _buffers(numpy, source, args.frames, 1 << 14):
+                    writer.write_bytes(data)
+            paths.append(path)
+        written_rss = _anonymous_rss()
+
+        output = os.path.join(directory, 'merged.nxcap')
+        start = time.time()
+        num_frames = capture.CaptureMerger(paths).write(output)
+        elapsed = time.time() - start
+        print('{} frames from {} files in {:.1f} s, {:.0f} frames/s, {:.0f} MB/s'.format(
+            num_frames, args.files, elapsed, num_frames / elapsed, os.path.getsize(output) / elapsed / 1e6))
+        print('anonymous RSS {:.0f} MB after writing the files, {:.0f} MB after merging, peak RSS {:.0f} MB'.format(
+            written_rss, _anonymous_rss(), resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""Compare a capture query with a full scan of the frames.
+
+Capture files of periodic CAN traffic are searched for one identifier in a time range
+with a payload condition, once by iterating every frame and once with :any:`CaptureQuery`.
+Requires NumPy.
+
+Usage::
+
+    python benchmarks/capture_query.py [--files N] [--frames N] [--processes N]
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from nixnet import _frames
+from nixnet import capture
+from nixnet.capture import _units
+
+_START = 131000000000000000
+
+
+def _buffers(numpy, first, count, per_buffer):
+    random = numpy.random.RandomState(first)
+    for start in range(first, first + count, per_buffer):
+        size = min(per_buffer, first + count - start)
+        units = numpy.zeros(size, _units.UNIT_DTYPE)
+        units['timestamp'] = _START + 1000 * numpy.arange(start, start + size)
+        units['identifier'] = 0x100 + random.randint(0, 200, size)
+        units['payload_length'] = 8
+        units['payload'] = random.randint(0, 256, (size, 8))
+        yield units.tobytes()
+
+
+def main():
+    import numpy  # type: ignore
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--files', type=int, default=4, help='Number of capture files (default: 4)')
+    parser.add_argument('--frames', type=int, default=1000000, help='Frames per file (default: 1000000)')
+    parser.add_argument('--processes', type=int, default=None, help='Query processes (default: none)')
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    try:
+        paths = []
+        for index in range(args.files):
+            path = os.path.join(directory, 'capture{}.nxcap'.format(index))
+            with capture.CaptureWriter(path, compression='zlib') as writer:
+                for data in _buffers(numpy, index * args.frames, args.frames, 1 << 14):
+                    writer.write_bytes(data)
+            paths.append(path)
+
+        total = args.files * args.frames
+        start_timestamp = _START + 1000 * total // 4
+        stop_timestamp = _START + 1000 * total // 2
+
+        start = time.time()
+        scanned = 0
+        for path in paths:
+            with capture.CaptureReader(path) as reader:
+                for data in reader.read_bytes():
+                    for frame in _frames.iterate_frames(data):
+                        in_range = start_timestamp <= frame.timestamp < stop_timestamp
+                        if in_range and frame.identifier == 0x142 and bytearray(frame.payload)[3] > 0x80:
+                            scanned += 1
+        scan_time = time.time() - start
+
+        start = time.time()
+        query = capture.CaptureQuery(
+            paths, start_timestamp, stop_timestamp, identifiers=[0x142],
+            payload=[capture.PayloadCondition(3, '>', 0x80)], processes=args.processes)
+        blocks = query.select_blocks()
+        selected = sum(len(data) // _units.UNIT_SIZE for data in query.read_bytes())
+        query_time = time.time() - start
+
+        assert selected == scanned
+        print('{} frames selected of {}'.format(selected, total))
+        print('full scan: {:.2f} s, {:.0f} frames/s'.format(scan_time, total / scan_time))
+        print('query:     {:.2f} s, {:.0f} frames/s, {} blocks decoded, {:.0f}x faster'.format(
+            query_time, total / query_time, len(blocks), scan_time / query_time))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
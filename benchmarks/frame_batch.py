@@ -0,0 +1,69 @@
+"""Compare the memory and conversion speed of a frame batch with a list of frames.
+
+Raw frame buffers of CAN traffic are converted to a :any:`FrameBatch` and back,
+and to a list of :any:`CanFrame` objects with :any:`XnetFrame`.
+Requires NumPy.
+
+Usage::
+
+    python benchmarks/frame_batch.py [--frames N]
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import argparse
+import time
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+from nixnet import _frames
+from nixnet.capture import _units
+from nixnet import types
+
+_START = 131000000000000000
+
+
+def main():
+    import numpy  # type: ignore
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--frames', type=int, default=1000000, help='Number of frames (default: 1000000)')
+    args = parser.parse_args()
+
+    random = numpy.random.RandomState(0)
+    units = numpy.zeros(args.frames, _units.UNIT_DTYPE)
+    units['timestamp'] = _START + 1000 * numpy.arange(args.frames)
+    units['identifier'] = 0x100 + random.randint(0, 200, args.frames)
+    units['payload_length'] = 8
+    units['payload'] = random.randint(0, 256, (args.frames, 8))
+    data = units.tobytes()
+
+    start = time.time()
+    batch = types.FrameBatch.from_bytes(data)
+    from_time = time.time() - start
+    start = time.time()
+    assert batch.to_bytes() == data
+    to_time = time.time() - start
+    print('FrameBatch: from_bytes {:.3f} s, to_bytes {:.3f} s, {:.0f} bytes per frame'.format(
+        from_time, to_time, len(data) / args.frames))
+
+    if tracemalloc is not None:
+        tracemalloc.start()
+    start = time.time()
+    frames = [types.XnetFrame.from_raw(frame) for frame in _frames.iterate_frames(data)]
+    list_time = time.time() - start
+    if tracemalloc is not None:
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print('CanFrame list: {:.3f} s, {:.0f} bytes per frame'.format(list_time, size / len(frames)))
+    else:
+        print('CanFrame list: {:.3f} s'.format(list_time))
+
+
+if __name__ == '__main__':
+    main()
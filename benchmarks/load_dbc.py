@@ -0,0 +1,102 @@
+"""Report the load time and peak memory of the DBC parser.
+
+A synthetic CAN database with the requested number of frames is written to a temporary
+directory and then loaded with :any:`nixnet.database.load_dbc`.
+Every frame has signals with value tables, comments and attributes, as in a typical production file.
+
+Usage::
+
+    python benchmarks/load_dbc.py [--frames N] [--signals N]
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import argparse
+import io
+import os
+import resource
+import shutil
+import tempfile
+import time
+
+from nixnet import database
+
+_HEADER = u'''VERSION ""
+
+NS_ :
+    NS_DESC_
+    CM_
+    BA_DEF_
+    BA_
+    VAL_
+
+BS_:
+
+BU_: Engine Gateway Body
+
+'''
+
+_ATTRIBUTE_DEFINITIONS = u'''BA_DEF_ "Baudrate" INT 0 1000000;
+BA_DEF_ BO_ "GenMsgSendType" ENUM "Cyclic","Event","CyclicIfActive";
+BA_DEF_ BO_ "GenMsgCycleTime" INT 0 65535;
+BA_DEF_ SG_ "GenSigStartValue" INT 0 65535;
+BA_DEF_DEF_ "Baudrate" 500000;
+BA_DEF_DEF_ "GenMsgSendType" "Event";
+BA_DEF_DEF_ "GenMsgCycleTime" 0;
+BA_DEF_DEF_ "GenSigStartValue" 0;
+BA_ "Baudrate" 500000;
+'''
+
+
+def write_dbc(path, num_frames, num_signals):
+    bits = 64 // num_signals
+    with io.open(path, 'w', encoding='cp1252') as f:
+        f.write(_HEADER)
+        for index in range(num_frames):
+            f.write(u'BO_ {} Frame{}: 8 Engine\n'.format(index, index))
+            for signal in range(num_signals):
+                f.write(u' SG_ Signal{0}_{1} : {2}|{3}@1+ (0.5,-10) [-10|117.5] "km/h" Gateway,Body\n'.format(
+                    index, signal, signal * bits, bits))
+            f.write(u'\n')
+        for index in range(num_frames):
+            f.write(u'CM_ BO_ {0} "Frame {0} sent by the engine controller\nwith a second line";\n'.format(index))
+            for signal in range(num_signals):
+                f.write(u'CM_ SG_ {0} Signal{0}_{1} "Signal {1} of frame {0}";\n'.format(index, signal))
+        f.write(_ATTRIBUTE_DEFINITIONS)
+        for index in range(num_frames):
+            f.write(u'BA_ "GenMsgSendType" BO_ {} 0;\n'.format(index))
+            f.write(u'BA_ "GenMsgCycleTime" BO_ {} {};\n'.format(index, 10 * (index % 10 + 1)))
+            for signal in range(num_signals):
+                f.write(u'BA_ "GenSigStartValue" SG_ {} Signal{}_{} 20;\n'.format(index, index, signal))
+        for index in range(num_frames):
+            for signal in range(num_signals):
+                f.write(u'VAL_ {} Signal{}_{} 0 "Off" 1 "On" 2 "Error" 3 "Not available" ;\n'.format(
+                    index, index, signal))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--frames', type=int, default=25000, help='Number of frames (default: 25000)')
+    parser.add_argument('--signals', type=int, default=8, help='Number of signals per frame (default: 8)')
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, 'benchmark.dbc')
+        write_dbc(path, args.frames, args.signals)
+        size = os.path.getsize(path)
+        start = time.time()
+        db = database.load_dbc(path)
+        elapsed = time.time() - start
+        num_frames = len(db.clusters['Cluster'].frames)
+        print('{} frames, {:.1f} MiB file, loaded in {:.2f} s ({:.1f} MiB/s), peak RSS {:.0f} MiB'.format(
+            num_frames, size / 2 ** 20, elapsed, size / 2 ** 20 / elapsed,
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2 ** 10))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
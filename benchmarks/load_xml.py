@@ -0,0 +1,253 @@
+"""Report the load time and peak memory of the FIBEX and AUTOSAR importers.
+
+A synthetic FlexRay database with the requested number of frames is written to a temporary
+directory in both formats and then loaded with :any:`nixnet.database.load`.
+
+The file is read twice and each record is dropped once its objects are built,
+so peak memory is close to that of the resulting database (the db column), which here is below the file size.
+The XML itself is streamed: the reader column is the peak of walking the file and discarding each record,
+which stays small whatever the file size.
+For comparison, the peak memory of parsing the same file into a complete element tree is also shown.
+
+Usage::
+
+    python benchmarks/load_xml.py [--frames N] [--signals N]
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import argparse
+import gc
+import io
+import os
+import shutil
+import tempfile
+import time
+
+try:
+    from xml.etree import cElementTree as ElementTree
+except ImportError:
+    from xml.etree import ElementTree
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+    import resource
+
+from nixnet import database
+from nixnet.database import _arxml_parser
+from nixnet.database import _fibex_parser
+from nixnet.database import _xml_import
+
+
+_FIBEX_HEADER = u'''<?xml version="1.0" encoding="UTF-8"?>
+<fx:FIBEX xmlns:fx="http://www.asam.net/xml/fbx" xmlns:ho="http://www.asam.net/xml"
+          xmlns:flexray="http://www.asam.net/xml/fbx/flexray">
+<fx:ELEMENTS>
+<fx:CLUSTERS><fx:CLUSTER ID="CL"><ho:SHORT-NAME>Cluster</ho:SHORT-NAME><fx:SPEED>10000000</fx:SPEED>
+<fx:PROTOCOL>FlexRay</fx:PROTOCOL><fx:CHANNEL-REFS><fx:CHANNEL-REF ID-REF="CH_A"/></fx:CHANNEL-REFS>
+<fx:CYCLE>5000</fx:CYCLE><flexray:MACRO-PER-CYCLE>5000</flexray:MACRO-PER-CYCLE>
+<flexray:NUMBER-OF-STATIC-SLOTS>2047</flexray:NUMBER-OF-STATIC-SLOTS>
+<flexray:STATIC-SLOT>2</flexray:STATIC-SLOT><flexray:PAYLOAD-LENGTH-STATIC>127</flexray:PAYLOAD-LENGTH-STATIC>
+</fx:CLUSTER></fx:CLUSTERS>
+'''
+
+_FIBEX_TRIGGERING = u'''<fx:FRAME-TRIGGERING ID="FT{0}"><fx:TIMINGS><fx:ABSOLUTELY-SCHEDULED-TIMING>
+<fx:SLOT-ID>{1}</fx:SLOT-ID><fx:BASE-CYCLE>{2}</fx:BASE-CYCLE><fx:CYCLE-REPETITION>64</fx:CYCLE-REPETITION>
+</fx:ABSOLUTELY-SCHEDULED-TIMING></fx:TIMINGS><fx:FRAME-REF ID-REF="FR{0}"/></fx:FRAME-TRIGGERING>
+'''
+
+_FIBEX_PDU_SIGNAL = u'''<fx:SIGNAL-INSTANCE ID="SI{0}_{1}"><fx:BIT-POSITION>{2}</fx:BIT-POSITION>
+<fx:IS-HIGH-LOW-BYTE-ORDER>false</fx:IS-HIGH-LOW-BYTE-ORDER><fx:SIGNAL-REF ID-REF="SIG{0}_{1}"/></fx:SIGNAL-INSTANCE>
+'''
+
+_FIBEX_FRAME = u'''<fx:FRAME ID="FR{0}"><ho:SHORT-NAME>Frame{0}</ho:SHORT-NAME><fx:BYTE-LENGTH>{1}</fx:BYTE-LENGTH>
+<fx:PDU-INSTANCES><fx:PDU-INSTANCE ID="PI{0}"><fx:PDU-REF ID-REF="PDU{0}"/><fx:BIT-POSITION>0</fx:BIT-POSITION>
+<fx:PDU-UPDATE-BIT-POSITION>{2}</fx:PDU-UPDATE-BIT-POSITION></fx:PDU-INSTANCE></fx:PDU-INSTANCES></fx:FRAME>
+'''
+
+_FIBEX_SIGNAL = u'''<fx:SIGNAL ID="SIG{0}_{1}"><ho:SHORT-NAME>Signal{0}_{1}</ho:SHORT-NAME>
+<fx:CODING-REF ID-REF="COD"/></fx:SIGNAL>
+'''
+
+_FIBEX_FOOTER = u'''</fx:ELEMENTS>
+<fx:PROCESSING-INFORMATION><fx:CODINGS><fx:CODING ID="COD"><ho:SHORT-NAME>Coding</ho:SHORT-NAME>
+<ho:CODED-TYPE ENCODING="UNSIGNED"><ho:BIT-LENGTH>8</ho:BIT-LENGTH></ho:CODED-TYPE>
+<ho:COMPU-METHODS><ho:COMPU-METHOD><ho:SHORT-NAME>Scale</ho:SHORT-NAME><ho:COMPU-INTERNAL-TO-PHYS>
+<ho:COMPU-SCALES><ho:COMPU-SCALE><ho:COMPU-RATIONAL-COEFFS>
+<ho:COMPU-NUMERATOR><ho:V>0</ho:V><ho:V>0.5</ho:V></ho:COMPU-NUMERATOR>
+</ho:COMPU-RATIONAL-COEFFS></ho:COMPU-SCALE></ho:COMPU-SCALES>
+</ho:COMPU-INTERNAL-TO-PHYS></ho:COMPU-METHOD></ho:COMPU-METHODS></fx:CODING></fx:CODINGS>
+</fx:PROCESSING-INFORMATION>
+</fx:FIBEX>
+'''
+
+_ARXML_HEADER = u'''<?xml version="1.0" encoding="UTF-8"?>
+<AUTOSAR xmlns="http://autosar.org/schema/r4.0"><AR-PACKAGES>
+<AR-PACKAGE><SHORT-NAME>Topology</SHORT-NAME><ELEMENTS><FLEXRAY-CLUSTER><SHORT-NAME>Cluster</SHORT-NAME>
+<FLEXRAY-CLUSTER-VARIANTS><FLEXRAY-CLUSTER-CONDITIONAL><BAUDRATE>10000000</BAUDRATE><PHYSICAL-CHANNELS>
+<FLEXRAY-PHYSICAL-CHANNEL><SHORT-NAME>ChannelA</SHORT-NAME><FRAME-TRIGGERINGS>
+'''
+
+_ARXML_TRIGGERING = u'''<FLEXRAY-FRAME-TRIGGERING><SHORT-NAME>Trigger{0}</SHORT-NAME>
+<FRAME-REF DEST="FLEXRAY-FRAME">/Frames/Frame{0}</FRAME-REF><ABSOLUTELY-SCHEDULED-TIMINGS>
+<FLEXRAY-ABSOLUTELY-SCHEDULED-TIMING><COMMUNICATION-CYCLE><CYCLE-REPETITION><BASE-CYCLE>{2}</BASE-CYCLE>
+<CYCLE-REPETITION>CYCLE-REPETITION-64</CYCLE-REPETITION></CYCLE-REPETITION></COMMUNICATION-CYCLE>
+<SLOT-ID>{1}</SLOT-ID></FLEXRAY-ABSOLUTELY-SCHEDULED-TIMING></ABSOLUTELY-SCHEDULED-TIMINGS>
+</FLEXRAY-FRAME-TRIGGERING>
+'''
+
+_ARXML_CLUSTER_END = u'''</FRAME-TRIGGERINGS><CHANNEL-NAME>CHANNEL-A</CHANNEL-NAME></FLEXRAY-PHYSICAL-CHANNEL>
+</PHYSICAL-CHANNELS><CYCLE>0.005</CYCLE><MACRO-PER-CYCLE>5000</MACRO-PER-CYCLE>
+<NUMBER-OF-STATIC-SLOTS>2047</NUMBER-OF-STATIC-SLOTS><STATIC-SLOT-DURATION>2</STATIC-SLOT-DURATION>
+<PAYLOAD-LENGTH-STATIC>127</PAYLOAD-LENGTH-STATIC>
+</FLEXRAY-CLUSTER-CONDITIONAL></FLEXRAY-CLUSTER-VARIANTS></FLEXRAY-CLUSTER></ELEMENTS></AR-PACKAGE>
+'''
+
+_ARXML_FRAME = u'''<FLEXRAY-FRAME><SHORT-NAME>Frame{0}</SHORT-NAME><FRAME-LENGTH>{1}</FRAME-LENGTH>
+<PDU-TO-FRAME-MAPPINGS><PDU-TO-FRAME-MAPPING><SHORT-NAME>Pdu{0}</SHORT-NAME>
+<PDU-REF DEST="I-SIGNAL-I-PDU">/Pdus/Pdu{0}</PDU-REF><START-POSITION>0</START-POSITION>
+<UPDATE-INDICATION-BIT-POSITION>{2}</UPDATE-INDICATION-BIT-POSITION>
+</PDU-TO-FRAME-MAPPING></PDU-TO-FRAME-MAPPINGS></FLEXRAY-FRAME>
+'''
+
+_ARXML_PDU_SIGNAL = u'''<I-SIGNAL-TO-I-PDU-MAPPING><SHORT-NAME>Signal{0}_{1}</SHORT-NAME>
+<I-SIGNAL-REF DEST="I-SIGNAL">/Signals/Signal{0}_{1}</I-SIGNAL-REF>
+<PACKING-BYTE-ORDER>MOST-SIGNIFICANT-BYTE-LAST</PACKING-BYTE-ORDER><START-POSITION>{2}</START-POSITION>
+</I-SIGNAL-TO-I-PDU-MAPPING>
+'''
+
+_ARXML_SIGNAL = u'''<I-SIGNAL><SHORT-NAME>Signal{0}_{1}</SHORT-NAME><LENGTH>8</LENGTH><NETWORK-REPRESENTATION-PROPS>
+<SW-DATA-DEF-PROPS-VARIANTS><SW-DATA-DEF-PROPS-CONDITIONAL>
+<COMPU-METHOD-REF DEST="COMPU-METHOD">/Types/Scale</COMPU-METHOD-REF>
+</SW-DATA-DEF-PROPS-CONDITIONAL></SW-DATA-DEF-PROPS-VARIANTS></NETWORK-REPRESENTATION-PROPS></I-SIGNAL>
+'''
+
+_ARXML_FOOTER = u'''<AR-PACKAGE><SHORT-NAME>Types</SHORT-NAME><ELEMENTS><COMPU-METHOD><SHORT-NAME>Scale</SHORT-NAME>
+<COMPU-INTERNAL-TO-PHYS><COMPU-SCALES><COMPU-SCALE><COMPU-RATIONAL-COEFFS>
+<COMPU-NUMERATOR><V>0</V><V>0.5</V></COMPU-NUMERATOR>
+</COMPU-RATIONAL-COEFFS></COMPU-SCALE></COMPU-SCALES></COMPU-INTERNAL-TO-PHYS></COMPU-METHOD></ELEMENTS></AR-PACKAGE>
+</AR-PACKAGES></AUTOSAR>
+'''
+
+
+def _slot(index):
+    # Spread the frames over the 2047 static slots and 64 base cycles of the cluster.
+    return index % 2047 + 1, index // 2047 % 64
+
+
+def write_fibex(path, num_frames, num_signals):
+    payload_len = num_signals + 1
+    with io.open(path, 'w', encoding='utf-8') as f:
+        f.write(_FIBEX_HEADER)
+        f.write(u'<fx:CHANNELS><fx:CHANNEL ID="CH_A"><ho:SHORT-NAME>ChannelA</ho:SHORT-NAME><fx:FRAME-TRIGGERINGS>\n')
+        for index in range(num_frames):
+            f.write(_FIBEX_TRIGGERING.format(index, *_slot(index)))
+        f.write(u'</fx:FRAME-TRIGGERINGS><flexray:FLEXRAY-CHANNEL-NAME>A</flexray:FLEXRAY-CHANNEL-NAME>'
+                u'</fx:CHANNEL></fx:CHANNELS>\n<fx:PDUS>\n')
+        for index in range(num_frames):
+            f.write(u'<fx:PDU ID="PDU{0}"><ho:SHORT-NAME>Pdu{0}</ho:SHORT-NAME>'
+                    u'<fx:BYTE-LENGTH>{1}</fx:BYTE-LENGTH><fx:SIGNAL-INSTANCES>\n'.format(index, num_signals))
+            for signal in range(num_signals):
+                f.write(_FIBEX_PDU_SIGNAL.format(index, signal, signal * 8))
+            f.write(u'</fx:SIGNAL-INSTANCES></fx:PDU>\n')
+        f.write(u'</fx:PDUS>\n<fx:FRAMES>\n')
+        for index in range(num_frames):
+            f.write(_FIBEX_FRAME.format(index, payload_len, payload_len * 8 - 1))
+        f.write(u'</fx:FRAMES>\n<fx:SIGNALS>\n')
+        for index in range(num_frames):
+            for signal in range(num_signals):
+                f.write(_FIBEX_SIGNAL.format(index, signal))
+        f.write(u'</fx:SIGNALS>\n')
+        f.write(_FIBEX_FOOTER)
+
+
+def write_arxml(path, num_frames, num_signals):
+    payload_len = num_signals + 1
+    with io.open(path, 'w', encoding='utf-8') as f:
+        f.write(_ARXML_HEADER)
+        for index in range(num_frames):
+            f.write(_ARXML_TRIGGERING.format(index, *_slot(index)))
+        f.write(_ARXML_CLUSTER_END)
+        f.write(u'<AR-PACKAGE><SHORT-NAME>Frames</SHORT-NAME><ELEMENTS>\n')
+        for index in range(num_frames):
+            f.write(_ARXML_FRAME.format(index, payload_len, payload_len * 8 - 1))
+        f.write(u'</ELEMENTS></AR-PACKAGE>\n<AR-PACKAGE><SHORT-NAME>Pdus</SHORT-NAME><ELEMENTS>\n')
+        for index in range(num_frames):
+            f.write(u'<I-SIGNAL-I-PDU><SHORT-NAME>Pdu{0}</SHORT-NAME><LENGTH>{1}</LENGTH>'
+                    u'<I-SIGNAL-TO-PDU-MAPPINGS>\n'.format(index, num_signals))
+            for signal in range(num_signals):
+                f.write(_ARXML_PDU_SIGNAL.format(index, signal, signal * 8))
+            f.write(u'</I-SIGNAL-TO-PDU-MAPPINGS></I-SIGNAL-I-PDU>\n')
+        f.write(u'</ELEMENTS></AR-PACKAGE>\n<AR-PACKAGE><SHORT-NAME>Signals</SHORT-NAME><ELEMENTS>\n')
+        for index in range(num_frames):
+            for signal in range(num_signals):
+                f.write(_ARXML_SIGNAL.format(index, signal))
+        f.write(u'</ELEMENTS></AR-PACKAGE>\n')
+        f.write(_ARXML_FOOTER)
+
+
+def measure(function, path):
+    """Return the result, the run time in seconds, and the peak and retained memory in bytes of ``function(path)``.
+
+    The retained memory is that still held by the result, or NaN without tracemalloc.
+    """
+    gc.collect()
+    if tracemalloc is not None:
+        tracemalloc.start()
+    start = time.time()
+    result = function(path)
+    elapsed = time.time() - start
+    if tracemalloc is not None:
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    else:
+        # Without tracemalloc only the process high-water mark (in KiB on Linux) is available,
+        # so run each format in its own process for meaningful numbers.
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        retained = float('nan')
+    return result, elapsed, peak, retained
+
+
+def stream(record_parents):
+    """Return a function that walks the records of a file and discards them."""
+    def walk(path):
+        for _ in _xml_import.XmlRecordReader(path, record_parents):
+            pass
+    return walk
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--frames', type=int, default=5000, help='Number of frames (default: 5000)')
+    parser.add_argument('--signals', type=int, default=8, help='Number of signals per frame (default: 8)')
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    try:
+        print('{:<8} {:>8} {:>10} {:>8} {:>10} {:>10} {:>10} {:>10}'.format(
+            'format', 'frames', 'file MiB', 'load s', 'peak MiB', 'db MiB', 'reader MiB', 'tree MiB'))
+        formats = (
+            ('.xml', write_fibex, _fibex_parser._RECORD_PARENTS),
+            ('.arxml', write_arxml, _arxml_parser._RECORD_PARENTS))
+        for extension, writer, record_parents in formats:
+            path = os.path.join(directory, 'benchmark' + extension)
+            writer(path, args.frames, args.signals)
+            size = os.path.getsize(path)
+            db, elapsed, peak, retained = measure(database.load, path)
+            num_frames = sum(len(cluster.frames) for cluster in db.clusters.values())
+            del db
+            _, _, reader_peak, _ = measure(stream(record_parents), path)
+            _, _, tree_peak, _ = measure(ElementTree.parse, path)
+            print('{:<8} {:>8} {:>10.1f} {:>8.3f} {:>10.1f} {:>10.1f} {:>10.1f} {:>10.1f}'.format(
+                extension, num_frames, size / 2 ** 20, elapsed, peak / 2 ** 20, retained / 2 ** 20,
+                reader_peak / 2 ** 20, tree_peak / 2 ** 20))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""Report the speed and size of MDF4 bus logging files.
+
+An hour of periodic CAN traffic on 8 bus channels is generated, written as MDF4 bus logging groups
+uncompressed and with deflate, then read back as frames. Requires NumPy.
+
+Usage::
+
+    python benchmarks/mdf_write.py [--seconds N] [--rate N]
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from nixnet import capture
+from nixnet.capture import _units
+
+
+def _traffic(numpy, seconds, rate):
+    """Return a second of traffic at a time, ``rate`` frames per second."""
+    random = numpy.random.RandomState(0)
+    identifiers = numpy.arange(0x100, 0x100 + 200)
+    for second in range(seconds):
+        units = numpy.zeros(rate, _units.UNIT_DTYPE)
+        units['timestamp'] = 131000000000000000 + second * 10000000 + numpy.sort(random.randint(0, 10000000, rate))
+        units['identifier'] = identifiers[numpy.arange(rate) % len(identifiers)]
+        units['payload_length'] = 8
+        units['payload'][:, 0] = numpy.arange(rate) & 0xFF
+        units['payload'][:, 1:3] = random.randint(0, 4, (rate, 2))
+        yield units.tobytes()
+
+
+def main():
+    import numpy  # type: ignore
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seconds', type=int, default=3600, help='Seconds of traffic (default: 3600)')
+    parser.add_argument('--rate', type=int, default=2000, help='Frames per second per channel (default: 2000)')
+    args = parser.parse_args()
+
+    channels = 8
+    directory = tempfile.mkdtemp()
+    try:
+        for compression in [None, 'deflate']:
+            path = os.path.join(directory, '{}.mf4'.format(compression))
+            start = time.time()
+            raw_bytes = 0
+            with capture.MdfWriter(path, compression=compression) as writer:
+                for data in _traffic(numpy, args.seconds, args.rate):
+                    for channel in range(1, channels + 1):
+                        writer.write_bytes(data, bus_channel=channel)
+                        raw_bytes += len(data)
+            write = time.time() - start
+
+            start = time.time()
+            with capture.MdfReader(path) as reader:
+                frames = sum(1 for _ in reader.frames(bus_channels=[1]))
+            read = time.time() - start
+            print('{:<7} {:>8.1f} MB  write {:>7.1f} MB/s  read channel 1 {:>9.0f} frames/s'.format(
+                str(compression), os.path.getsize(path) / 1e6, raw_bytes / 1e6 / write, frames / read))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""Report the speed and peak memory of exporting frames to Parquet.
+
+Periodic CAN traffic is converted from raw frame buffers to Arrow columns,
+with the signals of a few database frames decoded, and written to Parquet row groups.
+Requires NumPy and pyarrow.
+
+Usage::
+
+    python benchmarks/parquet_export.py [--frames N] [--row-group-size N]
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import argparse
+import os
+import resource
+import shutil
+import tempfile
+import time
+
+from nixnet import capture
+from nixnet.capture import _units
+from nixnet import constants
+from nixnet import database
+
+
+def _frames(count):
+    cluster = database.MemoryDatabase('benchmark').clusters.add('Body')
+    frames = []
+    for index in range(count):
+        frame = cluster.frames.add('Frame{}'.format(index))
+        frame.id = 0x100 + index
+        frame.payload_len = 8
+        for position in range(4):
+            signal = frame.mux_static_signals.add('Signal{}_{}'.format(index, position))
+            signal.start_bit = 16 * position
+            signal.num_bits = 16
+            signal.data_type = constants.SigDataType.UNSIGNED
+            signal.scale_fac = 0.1
+        frames.append(frame)
+    return frames
+
+
+def _buffers(numpy, count, per_buffer):
+    random = numpy.random.RandomState(0)
+    for start in range(0, count, per_buffer):
+        size = min(per_buffer, count - start)
+        units = numpy.zeros(size, _units.UNIT_DTYPE)
+        units['timestamp'] = 131000000000000000 + 1000 * numpy.arange(start, start + size)
+        units['identifier'] = 0x100 + random.randint(0, 200, size)
+        units['payload_length'] = 8
+        units['payload'] = random.randint(0, 256, (size, 8))
+        yield units.tobytes()
+
+
+def main():
+    import numpy  # type: ignore
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--frames', type=int, default=5000000, help='Number of frames (default: 5000000)')
+    parser.add_argument('--row-group-size', type=int, default=1 << 16, help='Frames per row group (default: 65536)')
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, 'frames.parquet')
+        start = time.time()
+        with capture.ParquetFrameWriter(path, _frames(20), row_group_size=args.row_group_size) as writer:
+            for data in _buffers(numpy, args.frames, 1 << 14):
+                writer.write_bytes(data)
+        elapsed = time.time() - start
+        print('{} frames in {:.1f} s, {:.0f} frames/s, {:.1f} MB file, peak RSS {:.0f} MB'.format(
+            args.frames, elapsed, args.frames / elapsed, os.path.getsize(path) / 1e6,
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
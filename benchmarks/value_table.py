@@ -0,0 +1,54 @@
+"""Report the time to convert raw signal values to labels with a compiled value table.
+
+Random raw values are converted with :any:`CompiledValueTable` for a table of small raw values,
+which uses a dense lookup array, and for a table of sparse raw values, which uses a binary search.
+The per-value dict lookup is timed for comparison. Requires NumPy.
+
+Usage::
+
+    python benchmarks/value_table.py [--values N] [--labels N]
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import argparse
+import time
+
+from nixnet import database
+
+
+def main():
+    import numpy  # type: ignore
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--values', type=int, default=1000000, help='Number of raw values (default: 1000000)')
+    parser.add_argument('--labels', type=int, default=64, help='Number of labels per table (default: 64)')
+    args = parser.parse_args()
+
+    random = numpy.random.RandomState(0)
+    for kind, step in (('dense', 1), ('sparse', 100003)):
+        value_table = dict(('Label{}'.format(index), index * step) for index in range(args.labels))
+        raw = random.randint(0, args.labels + 1, args.values) * step
+
+        table = database.MemoryDbcSignalValueTable(value_table).compile()
+        assert table.dense == (kind == 'dense')
+        start = time.time()
+        labels = table.decode(raw)
+        decode = time.time() - start
+        labels = labels[labels != None].astype(str)  # NOQA: E711
+        start = time.time()
+        table.encode(labels)
+        encode = time.time() - start
+
+        lookup = dict((value, label) for label, value in value_table.items())
+        start = time.time()
+        [lookup.get(value) for value in raw.tolist()]
+        per_value = time.time() - start
+        print('{:<7} decode {:>7.3f} s  encode {:>7.3f} s  dict lookup {:>7.3f} s'.format(
+            kind, decode, encode, per_value))
+
+
+if __name__ == '__main__':
+    main()
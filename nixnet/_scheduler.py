@@ -0,0 +1,143 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import heapq
+import itertools
+import math
+import typing  # NOQA: F401
+
+from nixnet import types
+
+# Jobs due this soon after the current time are released with the jobs already due,
+# so jobs with commensurate periods are released together despite rounding in their deadlines.
+COALESCE_TIME = 1e-6
+
+
+class DeadlineScheduler(object):
+    """Release periodic and one-shot jobs in deadline order.
+
+    Jobs are kept in a heap, so releasing a job costs ``O(log n)`` for ``n`` jobs.
+    Scheduling a key again replaces its job, and replaced jobs are dropped when they reach the top of the heap.
+    Periodic deadlines are computed from the first deadline, so they do not drift over long runs.
+
+    >>> scheduler = DeadlineScheduler()
+    >>> scheduler.schedule('fast', 0.0, 0.01)
+    >>> scheduler.schedule('slow', 0.005, 0.1)
+    >>> scheduler.pop_due(0.006)
+    [('fast', 0.0, 0), ('slow', 0.005, 0)]
+    >>> scheduler.pop_due(0.032)
+    [('fast', 0.03, 2)]
+    >>> scheduler.next_deadline()
+    0.04
+    """
+
+    def __init__(self):
+        # type: () -> None
+        # Deadline, sequence number, key and number of periods since the first deadline.
+        self._heap = []  # type: typing.List[typing.Tuple[float, int, typing.Hashable, int]]
+        # Sequence number, period and first deadline of the current job of each key.
+        self._jobs = {}  # type: typing.Dict[typing.Hashable, typing.Tuple[int, typing.Optional[float], float]]
+        self._sequence = itertools.count()
+
+    def __len__(self):
+        # type: () -> int
+        return len(self._jobs)
+
+    def __contains__(self, key):
+        # type: (typing.Hashable) -> bool
+        return key in self._jobs
+
+    def schedule(self, key, deadline, period=None):
+        # type: (typing.Hashable, float, typing.Optional[float]) -> None
+        """Release ``key`` at ``deadline``, and then every ``period`` seconds unless ``period`` is ``None``."""
+        if period is not None and not period > 0:
+            raise ValueError('Period must be positive: {}'.format(period))
+        sequence = next(self._sequence)
+        self._jobs[key] = (sequence, period, deadline)
+        heapq.heappush(self._heap, (deadline, sequence, key, 0))
+
+    def cancel(self, key):
+        # type: (typing.Hashable) -> None
+        """Stop releasing ``key``."""
+        self._jobs.pop(key, None)
+
+    def next_deadline(self):
+        # type: () -> typing.Optional[float]
+        """Return the earliest deadline, or ``None`` when nothing is scheduled."""
+        heap = self._heap
+        while heap and self._jobs.get(heap[0][2], (None,))[0] != heap[0][1]:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def pop_due(self, now, window=0.0):
+        # type: (float, float) -> typing.List[typing.Tuple[typing.Hashable, float, int]]
+        """Release the jobs due at ``now`` or within ``window`` seconds after it, earliest first.
+
+        Returns a list of ``(key, deadline, missed)``,
+        where ``missed`` counts the whole periods a periodic job was late by.
+        Those periods are skipped rather than released in a burst,
+        and ``deadline`` is the last one that passed.
+        """
+        heap = self._heap
+        jobs = self._jobs
+        due = []
+        end = now + window
+        while heap and heap[0][0] <= end:
+            deadline, sequence, key, count = heapq.heappop(heap)
+            current, period, first = jobs.get(key, (None, None, None))
+            if current != sequence:
+                continue
+            missed = 0
+            if period is None:
+                del jobs[key]
+            else:
+                missed = max(int((now - deadline) // period), 0)
+                count += missed
+                deadline = first + count * period
+                heapq.heappush(heap, (first + (count + 1) * period, sequence, key, count + 1))
+            due.append((key, deadline, missed))
+        return due
+
+
+class JitterRecorder(object):
+    """Accumulate the lateness of writes into :any:`nixnet.types.JitterStats`.
+
+    >>> recorder = JitterRecorder()
+    >>> for lateness in (0.001, 0.003):
+    ...     recorder.add(lateness)
+    >>> stats = recorder.stats()
+    >>> stats.count, round(stats.mean, 6), round(stats.std, 6)
+    (2, 0.002, 0.001)
+    """
+
+    __slots__ = ['count', 'missed', 'min', 'max', '_mean', '_m2']
+
+    def __init__(self):
+        # type: () -> None
+        self.count = 0
+        self.missed = 0
+        self.min = float('inf')
+        self.max = float('-inf')
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, lateness, missed=0):
+        # type: (float, int) -> None
+        # Welford's update keeps the variance accurate over long runs.
+        self.count += 1
+        self.missed += missed
+        if lateness < self.min:
+            self.min = lateness
+        if lateness > self.max:
+            self.max = lateness
+        delta = lateness - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (lateness - self._mean)
+
+    def stats(self):
+        # type: () -> types.JitterStats
+        if not self.count:
+            return types.JitterStats(0, self.missed, 0.0, 0.0, 0.0, 0.0)
+        return types.JitterStats(
+            self.count, self.missed, self.min, self.max, self._mean, math.sqrt(self._m2 / self.count))
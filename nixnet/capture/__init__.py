@@ -0,0 +1,40 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+
+from nixnet.capture._arrow import ArrowConverter
+from nixnet.capture._arrow import ParquetFrameWriter
+from nixnet.capture._asc import AscReader
+from nixnet.capture._async_writer import AsyncCaptureWriter
+from nixnet.capture._async_writer import CaptureWriterStats
+from nixnet.capture._async_writer import FsyncPolicy
+from nixnet.capture._blf import BlfReader
+from nixnet.capture._format import CaptureBlock
+from nixnet.capture._format import CaptureReader
+from nixnet.capture._format import CaptureWriter
+from nixnet.capture._mdf import MdfChannelGroup
+from nixnet.capture._mdf import MdfReader
+from nixnet.capture._mdf import MdfWriter
+from nixnet.capture._merge import CaptureMerger
+from nixnet.capture._query import CaptureQuery
+from nixnet.capture._query import PayloadCondition
+
+
+__all__ = [
+    "ArrowConverter",
+    "AscReader",
+    "AsyncCaptureWriter",
+    "BlfReader",
+    "CaptureBlock",
+    "CaptureMerger",
+    "CaptureQuery",
+    "CaptureReader",
+    "CaptureWriter",
+    "CaptureWriterStats",
+    "FsyncPolicy",
+    "MdfChannelGroup",
+    "MdfReader",
+    "MdfWriter",
+    "ParquetFrameWriter",
+    "PayloadCondition"]
@@ -0,0 +1,371 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+import struct
+import typing  # NOQA: F401
+
+from nixnet import _cconsts
+from nixnet import _frames
+from nixnet import constants
+
+from nixnet.capture import _units
+from nixnet.database import _memory
+
+try:
+    import numpy  # type: ignore
+except ImportError:
+    numpy = None
+
+try:
+    import pyarrow  # type: ignore
+    import pyarrow.parquet  # type: ignore
+except ImportError:
+    pyarrow = None
+
+
+#: Default number of frames in a Parquet row group.
+DEFAULT_ROW_GROUP_SIZE = 1 << 16
+
+_CAN_DATA_TYPES = (
+    _cconsts.NX_FRAME_TYPE_CAN_DATA,
+    _cconsts.NX_FRAME_TYPE_CAN20_DATA,
+    _cconsts.NX_FRAME_TYPE_CANFD_DATA,
+    _cconsts.NX_FRAME_TYPE_CANFDBRS_DATA)
+_PAYLOAD_OFFSET = _units.UNIT_SIZE - _frames.MAX_BASE_UNIT_PAYLOAD_LENGTH
+
+
+def _require_pyarrow():
+    # type: () -> None
+    if pyarrow is None:
+        raise ImportError('Arrow and Parquet export requires the pyarrow package')
+
+
+class _Signal(object):
+    """Where a signal is placed in the payload, and how its raw value is converted."""
+
+    __slots__ = ['column', 'positions', 'last_bit', 'data_type', 'num_bits', 'scale_fac', 'scale_off', 'mux']
+
+    def __init__(self, column, signal, mux=None):
+        # type: (typing.Text, typing.Any, typing.Optional[typing.Tuple[_Signal, int]]) -> None
+        self.column = column
+        self.positions = _memory.signal_bit_positions(signal)
+        self.last_bit = max(self.positions) if self.positions else 0
+        self.data_type = signal.data_type
+        self.num_bits = signal.num_bits
+        self.scale_fac = signal.scale_fac
+        self.scale_off = signal.scale_off
+        # Data multiplexer signal and value of the subframe of a dynamic signal.
+        self.mux = mux
+
+    def raw(self, payload):
+        # type: (int) -> int
+        """Return the raw value of the signal in a payload, given as a little-endian integer."""
+        value = 0
+        for index, position in enumerate(self.positions):
+            value |= (payload >> position & 1) << index
+        return value
+
+    def physical(self, raw):
+        # type: (int) -> float
+        if self.data_type == constants.SigDataType.IEEE_FLOAT:
+            if self.num_bits == 32:
+                raw = struct.unpack('<f', struct.pack('<I', raw))[0]
+            else:
+                raw = struct.unpack('<d', struct.pack('<Q', raw))[0]
+        elif self.data_type == constants.SigDataType.SIGNED and raw >> (self.num_bits - 1):
+            raw -= 1 << self.num_bits
+        return raw * self.scale_fac + self.scale_off
+
+    def raw_array(self, payloads):
+        # type: (typing.Any) -> typing.Any
+        """Return the raw values of the signal in the rows of a NumPy payload matrix."""
+        values = numpy.zeros(len(payloads), numpy.uint64)
+        for index, position in enumerate(self.positions):
+            bits = (payloads[:, position >> 3] >> (position & 7)) & 1
+            values |= bits.astype(numpy.uint64) << numpy.uint64(index)
+        return values
+
+    def physical_array(self, raw):
+        # type: (typing.Any) -> typing.Any
+        if self.data_type == constants.SigDataType.IEEE_FLOAT:
+            if self.num_bits == 32:
+                values = raw.astype(numpy.uint32).view(numpy.float32).astype(numpy.float64)
+            else:
+                values = raw.view(numpy.float64)
+        elif self.data_type == constants.SigDataType.SIGNED:
+            # Move the sign bit to bit 63, so that the arithmetic shift back extends it.
+            shift = 64 - self.num_bits
+            values = (raw << numpy.uint64(shift)).view(numpy.int64) >> numpy.int64(shift)
+        else:
+            values = raw.astype(numpy.float64)
+        return values * self.scale_fac + self.scale_off
+
+
+class _Frame(object):
+    """The raw frame identifier, frame type and signals of a database frame."""
+
+    __slots__ = ['key', 'signals']
+
+    def __init__(self, frame):
+        # type: (typing.Any) -> None
+        if frame.cluster.protocol == constants.Protocol.LIN:
+            self.key = (_cconsts.NX_FRAME_TYPE_LIN_DATA, frame.id)
+        else:
+            identifier = frame.id | (_cconsts.NX_FRAME_ID_CAN_IS_EXTENDED if frame.can_ext_id else 0)
+            self.key = (_cconsts.NX_FRAME_TYPE_CAN_DATA, identifier)
+        static = dict(
+            (signal.name, _Signal(u'{}.{}'.format(frame.name, signal.name), signal))
+            for signal in frame.mux_static_signals.values())
+        self.signals = [static[signal.name] for signal in frame.mux_static_signals.values()]
+        if frame.mux_is_muxed:
+            mux = static[frame.mux_data_mux_sig.name]
+            for subframe in frame.mux_subframes.values():
+                for signal in subframe.dyn_signals.values():
+                    self.signals.append(_Signal(
+                        u'{}.{}'.format(frame.name, signal.name), signal, (mux, subframe.mux_value)))
+
+
+def _frame_key(frame_type, identifier):
+    # type: (int, int) -> typing.Tuple[int, int]
+    if frame_type in _CAN_DATA_TYPES:
+        frame_type = _cconsts.NX_FRAME_TYPE_CAN_DATA
+    return frame_type, identifier
+
+
+class ArrowConverter(object):
+    """Convert raw frame buffers to Apache Arrow record batches.
+
+    Buffers in the raw frame format, as returned by :any:`InFrames.read_bytes`
+    or read from a capture file with :any:`CaptureReader.read_bytes`,
+    are converted column by column, without creating a frame object per frame.
+    Every batch has the columns ``timestamp`` (uint64), ``identifier`` (uint32),
+    ``type``, ``flags`` and ``info`` (uint8), and ``payload`` (binary), as stored in the raw frame format.
+
+    When database frames are given, their signals are decoded into float64 columns
+    named ``<frame>.<signal>``, which are null for the other frames.
+    Dynamic signals are also null when the data multiplexer selects another subframe.
+
+    Requires the ``pyarrow`` package.
+
+    Args:
+        frames(list of :any:`Frame<_frame.Frame>` or :any:`MemoryFrame`): CAN or LIN frames
+            whose signals are decoded, or ``None``.
+    """
+
+    def __init__(self, frames=None):
+        # type: (typing.Optional[typing.Iterable[typing.Any]]) -> None
+        _require_pyarrow()
+        self._frames = collections.OrderedDict()  # type: typing.Dict[typing.Tuple[int, int], _Frame]
+        for frame in frames or ():
+            definition = _Frame(frame)
+            if definition.key in self._frames:
+                raise ValueError('Frame {} has the identifier of another frame'.format(frame.name))
+            self._frames[definition.key] = definition
+        self._columns = [signal.column for definition in self._frames.values() for signal in definition.signals]
+        if len(set(self._columns)) != len(self._columns):
+            raise ValueError('Frames have signals with the same name')
+        fields = [
+            pyarrow.field('timestamp', pyarrow.uint64(), nullable=False),
+            pyarrow.field('identifier', pyarrow.uint32(), nullable=False),
+            pyarrow.field('type', pyarrow.uint8(), nullable=False),
+            pyarrow.field('flags', pyarrow.uint8(), nullable=False),
+            pyarrow.field('info', pyarrow.uint8(), nullable=False),
+            pyarrow.field('payload', pyarrow.binary(), nullable=False),
+        ] + [pyarrow.field(column, pyarrow.float64()) for column in self._columns]
+        self.schema = pyarrow.schema(fields)
+
+    def record_batch(self, frame_bytes):
+        # type: (bytes) -> typing.Any
+        """Return a ``pyarrow.RecordBatch`` of the frames in a raw frame buffer."""
+        data = bytes(frame_bytes)
+        if numpy is not None:
+            columns = self._numpy_columns(data)
+        else:
+            columns = self._python_columns(data)
+        return pyarrow.RecordBatch.from_arrays(columns, schema=self.schema)
+
+    def record_batches(self, buffers):
+        # type: (typing.Iterable[bytes]) -> typing.Iterator[typing.Any]
+        """Yield a ``pyarrow.RecordBatch`` for every raw frame buffer."""
+        for frame_bytes in buffers:
+            yield self.record_batch(frame_bytes)
+
+    def _python_columns(self, data):
+        # type: (bytes) -> typing.List[typing.Any]
+        frames = list(_frames.iterate_frames(data))
+        signals = dict((column, [None] * len(frames)) for column in self._columns)
+        for index, frame in enumerate(frames):
+            definition = self._frames.get(_frame_key(frame.type.value, frame.identifier))
+            if definition is None:
+                continue
+            payload_bits = len(frame.payload) * 8
+            payload = sum(byte << (8 * position) for position, byte in enumerate(bytearray(frame.payload)))
+            for signal in definition.signals:
+                if signal.last_bit >= payload_bits:
+                    continue
+                if signal.mux is not None:
+                    mux, mux_value = signal.mux
+                    if mux.last_bit >= payload_bits or mux.raw(payload) != mux_value:
+                        continue
+                signals[signal.column][index] = signal.physical(signal.raw(payload))
+        return [
+            pyarrow.array([frame.timestamp for frame in frames], pyarrow.uint64()),
+            pyarrow.array([frame.identifier for frame in frames], pyarrow.uint32()),
+            pyarrow.array([frame.type.value for frame in frames], pyarrow.uint8()),
+            pyarrow.array([frame.flags for frame in frames], pyarrow.uint8()),
+            pyarrow.array([frame.info for frame in frames], pyarrow.uint8()),
+            pyarrow.array([frame.payload for frame in frames], pyarrow.binary()),
+        ] + [pyarrow.array(signals[column], pyarrow.float64()) for column in self._columns]
+
+    def _numpy_columns(self, data):
+        # type: (bytes) -> typing.List[typing.Any]
+        units = _units.fixed_units(data)
+        if units is None:
+            offsets = numpy.asarray(_units.frame_offsets(data), numpy.int64)
+            units = _units.units(data, offsets.tolist())
+        else:
+            offsets = numpy.arange(len(units), dtype=numpy.int64) * _units.UNIT_SIZE
+        count = len(units)
+        frame_types = units['type']
+        lengths = units['payload_length'].astype(numpy.int64)
+        j1939 = frame_types == _cconsts.NX_FRAME_TYPE_J1939_DATA
+        lengths[j1939] |= (units['info'][j1939] & _cconsts.NX_FRAME_PAYLD_LEN_HIGH_MASK_J1939).astype(numpy.int64) << 8
+
+        # Gather every payload into one buffer, as Arrow stores binary columns.
+        raw = numpy.frombuffer(data, numpy.uint8)
+        starts = offsets + _PAYLOAD_OFFSET
+        value_offsets = numpy.zeros(count + 1, numpy.int64)
+        numpy.cumsum(lengths, out=value_offsets[1:])
+        positions = numpy.repeat(starts - value_offsets[:-1], lengths) + numpy.arange(value_offsets[-1])
+        payloads = pyarrow.Array.from_buffers(pyarrow.binary(), count, [
+            None, pyarrow.py_buffer(value_offsets.astype(numpy.int32)), pyarrow.py_buffer(raw[positions])])
+
+        columns = [
+            pyarrow.array(units['timestamp'], pyarrow.uint64()),
+            pyarrow.array(units['identifier'], pyarrow.uint32()),
+            pyarrow.array(frame_types, pyarrow.uint8()),
+            pyarrow.array(units['flags'], pyarrow.uint8()),
+            pyarrow.array(units['info'], pyarrow.uint8()),
+            payloads,
+        ]
+        if not self._columns:
+            return columns
+
+        signals = {}
+        key_types = numpy.where(
+            numpy.isin(frame_types, _CAN_DATA_TYPES), _cconsts.NX_FRAME_TYPE_CAN_DATA, frame_types)
+        for (frame_type, identifier), definition in self._frames.items():
+            rows = numpy.flatnonzero((key_types == frame_type) & (units['identifier'] == identifier))
+            if not len(rows) or not definition.signals:
+                continue
+            width = max(signal.last_bit for signal in definition.signals) // 8 + 1
+            # Bytes past the end of a payload are zero, and the signals that use them are null.
+            gather = starts[rows][:, None] + numpy.arange(width)
+            matrix = raw[numpy.minimum(gather, len(raw) - 1)]
+            matrix[numpy.arange(width) >= lengths[rows][:, None]] = 0
+            payload_bits = lengths[rows] * 8
+            raw_values = {}  # type: typing.Dict[int, typing.Any]
+            for signal in definition.signals:
+                raw_values[id(signal)] = signal.raw_array(matrix)
+            for signal in definition.signals:
+                valid = payload_bits > signal.last_bit
+                if signal.mux is not None:
+                    mux, mux_value = signal.mux
+                    valid &= (payload_bits > mux.last_bit) & (raw_values[id(mux)] == mux_value)
+                values = numpy.zeros(count, numpy.float64)
+                mask = numpy.ones(count, bool)
+                values[rows] = signal.physical_array(raw_values[id(signal)])
+                mask[rows] = ~valid
+                signals[signal.column] = pyarrow.array(values, pyarrow.float64(), mask=mask)
+        for column in self._columns:
+            if column not in signals:
+                signals[column] = pyarrow.nulls(count, pyarrow.float64())
+        return columns + [signals[column] for column in self._columns]
+
+
+class ParquetFrameWriter(object):
+    """Write raw frame buffers to a Parquet file, as columns converted by :any:`ArrowConverter`.
+
+    Frames are collected until a row group is full and then written,
+    so memory stays bounded by the row group size however many frames are written.
+
+    Requires the ``pyarrow`` package.
+
+    Args:
+        path(str): Path of the file to create.
+        frames(list of :any:`Frame<_frame.Frame>` or :any:`MemoryFrame`): CAN or LIN frames
+            whose signals are decoded, or ``None``.
+        row_group_size(int): Frames per row group.
+        compression(str): Parquet compression of the columns, such as ``'snappy'``, ``'zstd'`` or ``None``.
+    """
+
+    def __init__(
+            self,
+            path,  # type: typing.Text
+            frames=None,  # type: typing.Optional[typing.Iterable[typing.Any]]
+            row_group_size=DEFAULT_ROW_GROUP_SIZE,  # type: int
+            compression='snappy',  # type: typing.Optional[typing.Text]
+    ):
+        # type: (...) -> None
+        if row_group_size < 1:
+            raise ValueError('Row group size must be positive, not {}'.format(row_group_size))
+        self.path = path
+        self.converter = ArrowConverter(frames)
+        self._row_group_size = row_group_size
+        self._pending = []  # type: typing.List[typing.Any]
+        self._pending_rows = 0
+        self._num_frames = 0
+        self._writer = pyarrow.parquet.ParquetWriter(path, self.converter.schema, compression=compression or 'none')
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        self.close()
+
+    @property
+    def closed(self):
+        # type: () -> bool
+        """bool: Returns whether the writer is closed."""
+        return self._closed
+
+    @property
+    def num_frames(self):
+        # type: () -> int
+        """int: Returns the number of frames written."""
+        return self._num_frames
+
+    def write_bytes(self, frame_bytes):
+        # type: (bytes) -> None
+        """Add frames in the raw frame format, such as a buffer returned by :any:`InFrames.read_bytes`."""
+        batch = self.converter.record_batch(frame_bytes)
+        if not batch.num_rows:
+            return
+        self._pending.append(batch)
+        self._pending_rows += batch.num_rows
+        self._num_frames += batch.num_rows
+        if self._pending_rows >= self._row_group_size:
+            self._write_row_groups(False)
+
+    def close(self):
+        # type: () -> None
+        """Write the remaining frames and the Parquet footer, and close the file."""
+        if self._closed:
+            return
+        self._write_row_groups(True)
+        self._writer.close()
+        self._closed = True
+
+    def _write_row_groups(self, final):
+        # type: (bool) -> None
+        table = pyarrow.Table.from_batches(self._pending, schema=self.converter.schema)
+        size = self._row_group_size
+        end = table.num_rows if final else table.num_rows - table.num_rows % size
+        for start in range(0, end, size):
+            self._writer.write_table(table.slice(start, min(size, end - start)), row_group_size=size)
+        rest = table.slice(end)
+        self._pending = rest.to_batches() if rest.num_rows else []
+        self._pending_rows = rest.num_rows
@@ -0,0 +1,181 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import datetime
+import io
+import re
+import typing  # NOQA: F401
+
+from nixnet import types  # NOQA: F401
+
+from nixnet.capture import _vector
+
+
+_DATE_FORMATS = [
+    '%a %b %d %I:%M:%S.%f %p %Y',
+    '%a %b %d %I:%M:%S %p %Y',
+    '%a %b %d %H:%M:%S.%f %Y',
+    '%a %b %d %H:%M:%S %Y',
+]
+_TIME = re.compile(r'^\s*(\d+)(?:\.(\d*))?\s')
+_DIRECTIONS = {'rx': False, 'tx': True}
+_CAN_FD_EDL = 0x1000
+_CAN_FD_BRS = 0x2000
+_CAN_FD_REMOTE = 0x0010
+
+
+def parse_time(text):
+    # type: (typing.Text) -> int
+    """Return the XNET ticks, in 100 ns, of a time in seconds, without rounding through floating point.
+
+    >>> parse_time('1.015991'), parse_time('2'), parse_time('0.12345678')
+    (10159910, 20000000, 1234567)
+    """
+    seconds, _, fraction = text.partition('.')
+    fraction = (fraction + '0000000')[:7]
+    return int(seconds) * _vector.TICKS_PER_SECOND + int(fraction)
+
+
+def parse_date(text):
+    # type: (typing.Text) -> typing.Optional[datetime.datetime]
+    """Return the ``datetime`` of the date in an ASC header, or ``None`` when it isn't understood.
+
+    >>> parse_date('Wed Jun 23 10:21:47.123 pm 2021')
+    datetime.datetime(2021, 6, 23, 22, 21, 47, 123000)
+    """
+    text = ' '.join(text.split())
+    for date_format in _DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(text, date_format)
+        except ValueError:
+            pass
+    return None
+
+
+class AscReader(_vector.VectorLogReader):
+    """Read the CAN frames of a Vector ASCII log (ASC) file.
+
+    The file is parsed one line at a time, so memory stays bounded however large the file is.
+    Hexadecimal and decimal logs, and absolute and relative timestamps, are supported.
+    Frame times are converted to XNET timestamps, in 100 ns since 1601-01-01,
+    by adding them to :any:`AscReader.start_timestamp`.
+
+    Args:
+        path(str): Path of the ``.asc`` file.
+        channels(list of int): Channels to read, numbered from 1 as in the log, or ``None`` for all.
+        start_timestamp(int): XNET timestamp of the start of the log,
+            or ``None`` to use the date in the file header.
+    """
+
+    def __init__(self, path, channels=None, start_timestamp=None):
+        # type: (typing.Text, typing.Optional[typing.Iterable[int]], typing.Optional[int]) -> None
+        super(AscReader, self).__init__(path, channels, start_timestamp)
+        self._file = io.open(path, 'r', encoding='latin-1')
+        self._date = None  # type: typing.Optional[datetime.datetime]
+        self._base = 16
+        self._relative = False
+        # The header comes before the first frame, so reading it is cheap.
+        for line in self._file:
+            if _TIME.match(line):
+                break
+            self._header_line(line)
+
+    def _header_line(self, line):
+        # type: (typing.Text) -> None
+        words = line.split()
+        if not words:
+            return
+        keyword = words[0].lower()
+        if keyword == 'date' and self._date is None:
+            self._date = parse_date(' '.join(words[1:]))
+        elif keyword == 'base' and len(words) > 1:
+            self._base = 10 if words[1].lower() == 'dec' else 16
+            self._relative = 'relative' in (word.lower() for word in words[2:])
+
+    def _log_start(self):
+        # type: () -> typing.Optional[datetime.datetime]
+        return self._date
+
+    def _read(self):
+        # type: () -> typing.Iterator[typing.Tuple[int, types.RawFrame]]
+        self._file.seek(0)
+        time = 0
+        for line in self._file:
+            match = _TIME.match(line)
+            if match is None:
+                continue
+            timestamp = parse_time(match.group(1) + '.' + (match.group(2) or ''))
+            if self._relative:
+                time += timestamp
+                timestamp = time
+            words = line[match.end():].split()
+            try:
+                if words[0].isdigit():
+                    parsed = self._can(timestamp, words)
+                elif words[0] == 'CANFD':
+                    parsed = self._can_fd(timestamp, words[1:])
+                else:
+                    parsed = None
+            except (IndexError, ValueError):
+                # Events, errors and statistics share the frame prefix and are skipped.
+                parsed = None
+            if parsed is not None:
+                yield parsed
+
+    def _identifier(self, word):
+        # type: (typing.Text) -> typing.Tuple[int, bool]
+        extended = word[-1:].lower() == 'x'
+        return int(word[:-1] if extended else word, self._base), extended
+
+    def _can(self, timestamp, words):
+        # type: (int, typing.List[typing.Text]) -> typing.Optional[typing.Tuple[int, types.RawFrame]]
+        """Parse ``<channel> <id> <Rx|Tx> d <dlc> <data...>`` or ``<channel> <id> <Rx|Tx> r [<dlc>]``."""
+        channel = int(words[0])
+        identifier, extended = self._identifier(words[1])
+        transmitted = _DIRECTIONS[words[2].lower()]
+        kind = words[3].lower()
+        if kind == 'r':
+            payload = b''
+        elif kind == 'd':
+            length = min(int(words[4], 16), 8)
+            payload = self._payload(words[5:5 + length], length)
+        else:
+            return None
+        frame = _vector.can_frame(
+            timestamp, identifier, extended, False, False, kind == 'r', transmitted, payload)
+        return channel, frame
+
+    def _can_fd(self, timestamp, words):
+        # type: (int, typing.List[typing.Text]) -> typing.Optional[typing.Tuple[int, types.RawFrame]]
+        """Parse the words of a ``CANFD`` line after the keyword.
+
+        They are ``<channel> <Rx|Tx> <id> [<name>] <brs> <esi> <dlc> <length> <data...>``,
+        followed by the duration, bit count and flags. Without the flags, the frame is a CAN FD frame.
+        """
+        channel = int(words[0])
+        transmitted = _DIRECTIONS[words[1].lower()]
+        identifier, extended = self._identifier(words[2])
+        position = 3
+        if words[position] not in ('0', '1'):
+            # Symbolic name of the frame.
+            position += 1
+        brs = words[position] == '1'
+        length = int(words[position + 3])
+        data = position + 4
+        payload = self._payload(words[data:data + length], length)
+        fd = True
+        remote = False
+        if len(words) > data + length + 2:
+            flags = int(words[data + length + 2], 16)
+            fd = bool(flags & _CAN_FD_EDL)
+            remote = bool(flags & _CAN_FD_REMOTE)
+            brs = fd and bool(flags & _CAN_FD_BRS)
+        frame = _vector.can_frame(timestamp, identifier, extended, fd, brs, remote, transmitted, payload)
+        return channel, frame
+
+    def _payload(self, words, length):
+        # type: (typing.List[typing.Text], int) -> bytes
+        if len(words) != length:
+            raise ValueError('Frame has {} data bytes instead of {}'.format(len(words), length))
+        return bytes(bytearray(int(word, self._base) for word in words))
@@ -0,0 +1,313 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+import enum
+import threading
+import timeit
+import typing  # NOQA: F401
+
+from nixnet.capture import _codec
+from nixnet.capture import _format
+
+
+class FsyncPolicy(enum.Enum):
+    """When :any:`AsyncCaptureWriter` waits for the operating system to store written data on disk.
+
+    Values:
+        NEVER:
+            Leave it to the operating system.
+        ON_ROTATE:
+            When a file is complete, before the next file is started.
+        PERIODIC:
+            Every ``fsync_interval`` seconds, and when a file is complete.
+        ALWAYS:
+            After every write, which also ends the block being filled.
+    """
+
+    NEVER = 'never'
+    ON_ROTATE = 'on_rotate'
+    PERIODIC = 'periodic'
+    ALWAYS = 'always'
+
+
+CaptureWriterStats_ = collections.namedtuple(
+    'CaptureWriterStats_',
+    ['queued_bytes', 'max_queued_bytes', 'written_bytes', 'writes', 'max_write_latency', 'mean_write_latency',
+     'dropped_buffers', 'dropped_bytes', 'files'])
+
+
+class CaptureWriterStats(CaptureWriterStats_):
+    """Counters of an :any:`AsyncCaptureWriter`.
+
+    Attributes:
+        queued_bytes(int): Frame bytes waiting for the I/O thread.
+        max_queued_bytes(int): Most frame bytes that waited at once.
+        written_bytes(int): Frame bytes written to capture files, before compression.
+        writes(int): Number of coalesced writes.
+        max_write_latency(float): Longest time in seconds a coalesced write took, including any fsync.
+        mean_write_latency(float): Mean time in seconds a coalesced write took.
+        dropped_buffers(int): Number of buffers dropped because the queue was full.
+        dropped_bytes(int): Frame bytes dropped because the queue was full.
+        files(int): Number of capture files started.
+    """
+
+    pass
+
+
+class AsyncCaptureWriter(object):
+    """Write capture files from a dedicated I/O thread.
+
+    :any:`AsyncCaptureWriter.write_bytes` only queues a buffer,
+    so the thread that reads from the driver never waits for the disk.
+    The I/O thread takes everything queued at once and writes it with one :any:`CaptureWriter.write_bytes`,
+    which writes whole blocks.
+    When the disk falls behind and the queue holds ``max_queued_bytes``,
+    new buffers are dropped and counted instead of blocking the reader.
+
+    Files rotate when they reach ``rotate_bytes`` or ``rotate_seconds``.
+    Each file is a complete capture file that :any:`CaptureReader` can open once it is rotated.
+
+    Args:
+        path(str): Path of the capture files. With rotation, it must contain ``{index}``,
+            which is replaced by the number of the file, for example ``'can1_{index:04d}.nxcap'``.
+        max_queued_bytes(int): Most frame bytes waiting for the I/O thread.
+        rotate_bytes(int): Start a new file once a file has at least this many bytes, or ``None``.
+        rotate_seconds(float): Start a new file once a file is this many seconds old, or ``None``.
+        fsync(:any:`FsyncPolicy`): When to wait for data to be stored on disk.
+        fsync_interval(float): Seconds between waits for ``FsyncPolicy.PERIODIC``.
+        block_size(int): Nominal number of frame bytes per block.
+        compression(str): Compression of each block, as for :any:`CaptureWriter`, or ``None``.
+        compression_level(int): Compression level, or ``None`` for the codec's default.
+        clock: Function returning the current time in seconds. Defaults to ``timeit.default_timer``.
+    """
+
+    def __init__(
+            self,
+            path,  # type: typing.Text
+            max_queued_bytes=64 << 20,  # type: int
+            rotate_bytes=None,  # type: typing.Optional[int]
+            rotate_seconds=None,  # type: typing.Optional[float]
+            fsync=FsyncPolicy.ON_ROTATE,  # type: FsyncPolicy
+            fsync_interval=1.0,  # type: float
+            block_size=_format.DEFAULT_BLOCK_SIZE,  # type: int
+            compression=None,  # type: typing.Optional[typing.Text]
+            compression_level=None,  # type: typing.Optional[int]
+            clock=None,  # type: typing.Optional[typing.Callable[[], float]]
+    ):
+        # type: (...) -> None
+        rotates = rotate_bytes is not None or rotate_seconds is not None
+        if rotates and '{index' not in path:
+            raise ValueError('Rotating capture path must contain {{index}}: {}'.format(path))
+        _codec.codec_id(compression)
+        self._path = path
+        self._max_queued_bytes = max_queued_bytes
+        self._rotate_bytes = rotate_bytes
+        self._rotate_seconds = rotate_seconds
+        self._fsync = FsyncPolicy(fsync)
+        self._fsync_interval = fsync_interval
+        self._writer_options = dict(
+            block_size=block_size, compression=compression, compression_level=compression_level)
+        self._clock = clock or timeit.default_timer
+
+        self._condition = threading.Condition()
+        self._queue = collections.deque()  # type: typing.Deque[bytes]
+        self._queued_bytes = 0
+        self._max_seen = 0
+        self._dropped_buffers = 0
+        self._dropped_bytes = 0
+        self._written_bytes = 0
+        self._writes = 0
+        self._max_latency = 0.0
+        self._total_latency = 0.0
+        self._closing = False
+        self._error = None  # type: typing.Optional[BaseException]
+
+        self._files = []  # type: typing.List[typing.Text]
+        self._writer = None  # type: typing.Optional[_format.CaptureWriter]
+        self._opened = 0.0
+        self._synced = 0.0
+        self._file_written = False
+        self._open_file()
+
+        self._thread = threading.Thread(target=self._run, name='nixnet capture writer')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        self.close()
+
+    @property
+    def files(self):
+        # type: () -> typing.List[typing.Text]
+        """list of str: Returns the paths of the files started so far, oldest first."""
+        with self._condition:
+            return list(self._files)
+
+    def stats(self):
+        # type: () -> CaptureWriterStats
+        """Return the current :any:`CaptureWriterStats`."""
+        with self._condition:
+            return CaptureWriterStats(
+                self._queued_bytes, self._max_seen, self._written_bytes, self._writes, self._max_latency,
+                self._total_latency / self._writes if self._writes else 0.0,
+                self._dropped_buffers, self._dropped_bytes, len(self._files))
+
+    def write_bytes(self, frame_bytes, timeout=0.0):
+        # type: (bytes, float) -> bool
+        """Queue frames in the raw frame format, such as a buffer returned by :any:`InFrames.read_bytes`.
+
+        Args:
+            frame_bytes(bytes): Whole frames to write.
+            timeout(float): Seconds to wait for space in the queue.
+                ``0.0`` never waits, and ``None`` waits as long as needed.
+
+        Returns:
+            bool: ``True`` when the frames were queued,
+            or ``False`` when they were dropped because the queue stayed full.
+
+        An error of the I/O thread is raised by the next call.
+        """
+        data = bytes(frame_bytes)
+        if not data:
+            return True
+        with self._condition:
+            self._check()
+            if self._closing:
+                raise ValueError('Write to a closed capture writer')
+            if timeout is None or timeout > 0:
+                end = None if timeout is None else self._clock() + timeout
+                while self._queued_bytes and self._queued_bytes + len(data) > self._max_queued_bytes:
+                    remaining = None if end is None else end - self._clock()
+                    if remaining is not None and remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                    self._check()
+            if self._queued_bytes and self._queued_bytes + len(data) > self._max_queued_bytes:
+                self._dropped_buffers += 1
+                self._dropped_bytes += len(data)
+                return False
+            self._queue.append(data)
+            self._queued_bytes += len(data)
+            self._max_seen = max(self._max_seen, self._queued_bytes)
+            self._condition.notify_all()
+        return True
+
+    def close(self, timeout=None):
+        # type: (typing.Optional[float]) -> None
+        """Write the queued frames, close the current file and stop the I/O thread.
+
+        An error of the I/O thread is raised.
+        """
+        with self._condition:
+            self._closing = True
+            self._condition.notify_all()
+        self._thread.join(timeout)
+        with self._condition:
+            self._check()
+
+    def _check(self):
+        # type: () -> None
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _open_file(self):
+        # type: () -> None
+        path = self._path.format(index=len(self._files))
+        self._writer = _format.CaptureWriter(path, **self._writer_options)
+        self._files.append(path)
+        self._opened = self._synced = self._clock()
+        self._file_written = False
+
+    def _close_file(self):
+        # type: () -> None
+        writer = self._writer
+        if self._fsync != FsyncPolicy.NEVER:
+            writer.flush(sync=True)
+        writer.close()
+
+    def _next_wake(self):
+        # type: () -> typing.Optional[float]
+        wakes = []
+        if self._rotate_seconds is not None:
+            wakes.append(self._opened + self._rotate_seconds)
+        if self._fsync == FsyncPolicy.PERIODIC:
+            wakes.append(self._synced + self._fsync_interval)
+        return min(wakes) if wakes else None
+
+    def _run(self):
+        # type: () -> None
+        try:
+            while True:
+                with self._condition:
+                    while not self._queue and not self._closing:
+                        wake = self._next_wake()
+                        if wake is not None:
+                            remaining = wake - self._clock()
+                            if remaining <= 0:
+                                break
+                            self._condition.wait(remaining)
+                        else:
+                            self._condition.wait()
+                    buffers = list(self._queue)
+                    self._queue.clear()
+                    closing = self._closing
+                if buffers:
+                    self._write(buffers)
+                self._maintain()
+                if closing and not buffers:
+                    break
+        except BaseException as error:
+            with self._condition:
+                self._error = error
+                self._queue.clear()
+                self._queued_bytes = 0
+                self._closing = True
+                self._condition.notify_all()
+        finally:
+            if self._writer is not None and not self._writer.closed:
+                try:
+                    self._close_file()
+                except BaseException as error:
+                    with self._condition:
+                        self._error = self._error or error
+
+    def _write(self, buffers):
+        # type: (typing.List[bytes]) -> None
+        data = b''.join(buffers)
+        start = self._clock()
+        self._writer.write_bytes(data)
+        self._file_written = True
+        if self._fsync == FsyncPolicy.ALWAYS:
+            self._writer.flush(sync=True)
+            self._synced = self._clock()
+        latency = self._clock() - start
+        with self._condition:
+            self._queued_bytes -= len(data)
+            self._written_bytes += len(data)
+            self._writes += 1
+            self._max_latency = max(self._max_latency, latency)
+            self._total_latency += latency
+            self._condition.notify_all()
+
+    def _maintain(self):
+        # type: () -> None
+        """Rotate the file or wait for the disk when it is time to."""
+        now = self._clock()
+        full = self._rotate_bytes is not None and self._writer.size >= self._rotate_bytes
+        old = self._rotate_seconds is not None and now - self._opened >= self._rotate_seconds
+        if old and not self._file_written:
+            # Files without frames are kept until they get some.
+            self._opened = now
+        elif full or old:
+            self._close_file()
+            with self._condition:
+                self._open_file()
+        elif self._fsync == FsyncPolicy.PERIODIC and now - self._synced >= self._fsync_interval:
+            self._writer.flush(sync=True)
+            self._synced = now
@@ -0,0 +1,212 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import datetime
+import io
+import struct
+import typing  # NOQA: F401
+import zlib
+
+from nixnet import _cconsts
+from nixnet import errors
+from nixnet import types  # NOQA: F401
+
+from nixnet.capture import _vector
+
+
+_FILE_MAGIC = b'LOGG'
+# Magic, header size, application and format versions, file size, uncompressed size,
+# object counts, and start and stop time as SYSTEMTIME.
+_FILE_HEADER = struct.Struct('<4sI8BQQII8H8H')
+
+_OBJECT_MAGIC = b'LOBJ'
+# Magic, header size, header version, object size and object type.
+_OBJECT_BASE = struct.Struct('<4sHHII')
+# Flags, client index, object version and timestamp.
+_OBJECT_HEADER_V1 = struct.Struct('<IHHQ')
+# Flags, timestamp status, reserved, object version, timestamp and original timestamp.
+_OBJECT_HEADER_V2 = struct.Struct('<IBBHQ8x')
+_TIME_TEN_MICS = 0x01
+_TIME_ONE_NANS = 0x02
+
+_LOG_CONTAINER = 10
+# Compression method and uncompressed size.
+_CONTAINER_HEADER = struct.Struct('<H6xI4x')
+_NO_COMPRESSION = 0
+_ZLIB_DEFLATE = 2
+
+_CAN_MESSAGE = 1
+_CAN_MESSAGE2 = 86
+# Channel, flags, DLC, identifier and data.
+_CAN_MESSAGE_BODY = struct.Struct('<HBBI8s')
+_CAN_FD_MESSAGE = 100
+# Channel, flags, DLC, identifier, frame length, bit count, FD flags, valid data bytes and data.
+_CAN_FD_MESSAGE_BODY = struct.Struct('<HBBIIBBB5x64s')
+_CAN_FD_MESSAGE_64 = 101
+# Channel, DLC, valid data bytes, transmit count, identifier, frame length, flags,
+# arbitration and data bit timing, BRS and CRC delimiter offsets, bit count, direction,
+# offset of extended data and CRC, followed by the data.
+_CAN_FD_MESSAGE_64_BODY = struct.Struct('<BBBBIIIIIIIHBBI')
+
+_CAN_ID_EXTENDED = 0x80000000
+_CAN_DIR_TX = 0x01
+_CAN_REMOTE = 0x80
+_CAN_FD_EDL = 0x01
+_CAN_FD_BRS = 0x02
+_CAN_FD_64_REMOTE = 0x0010
+_CAN_FD_64_EDL = 0x1000
+_CAN_FD_64_BRS = 0x2000
+
+
+def _bad_file(path, reason):
+    # type: (typing.Text, typing.Text) -> errors.XnetError
+    return errors.XnetError('{} is not a BLF file: {}'.format(path, reason), _cconsts.NX_ERR_FILE_EXTENSION)
+
+
+class BlfReader(_vector.VectorLogReader):
+    """Read the CAN frames of a Vector binary logging format (BLF) file.
+
+    The file is read one log container at a time,
+    so memory stays bounded by the container size however large the file is.
+    Frame times are converted to XNET timestamps, in 100 ns since 1601-01-01,
+    by adding them to :any:`BlfReader.start_timestamp`.
+
+    Args:
+        path(str): Path of the ``.blf`` file.
+        channels(list of int): Channels to read, numbered from 1 as in the log, or ``None`` for all.
+        start_timestamp(int): XNET timestamp of the start of the log,
+            or ``None`` to use the start recorded in the file.
+    """
+
+    def __init__(self, path, channels=None, start_timestamp=None):
+        # type: (typing.Text, typing.Optional[typing.Iterable[int]], typing.Optional[int]) -> None
+        super(BlfReader, self).__init__(path, channels, start_timestamp)
+        self._file = io.open(path, 'rb')
+        data = self._file.read(_FILE_HEADER.size)
+        if len(data) < _FILE_HEADER.size:
+            self.close()
+            raise _bad_file(path, 'header is incomplete')
+        header = _FILE_HEADER.unpack(data)
+        if header[0] != _FILE_MAGIC or header[1] < _FILE_HEADER.size:
+            self.close()
+            raise _bad_file(path, 'header signature is missing')
+        self._header_size = header[1]
+        #: int: Number of objects recorded in the file header, including those that aren't frames.
+        self.object_count = header[12]
+        self._start = header[14:22]
+
+    def _log_start(self):
+        # type: () -> typing.Optional[datetime.datetime]
+        year, month, _, day, hour, minute, second, milliseconds = self._start
+        try:
+            return datetime.datetime(year, month, day, hour, minute, second, milliseconds * 1000)
+        except ValueError:
+            return None
+
+    def _read(self):
+        # type: () -> typing.Iterator[typing.Tuple[int, types.RawFrame]]
+        f = self._file
+        f.seek(self._header_size)
+        tail = b''
+        while True:
+            base = f.read(_OBJECT_BASE.size)
+            if len(base) < _OBJECT_BASE.size:
+                break
+            magic, _, _, object_size, object_type = _OBJECT_BASE.unpack(base)
+            if magic != _OBJECT_MAGIC or object_size < _OBJECT_BASE.size:
+                raise _bad_file(self.path, 'object signature is missing')
+            data = f.read(object_size - _OBJECT_BASE.size)
+            # Objects in the file are padded to 4 bytes.
+            f.read(object_size % 4)
+            if len(data) < object_size - _OBJECT_BASE.size:
+                # Logging stopped in the middle of an object.
+                break
+            if object_type == _LOG_CONTAINER:
+                tail += self._decompress(data)
+                # An object may continue in the next container.
+                position = 0
+                for position, channel, frame in _objects(tail):
+                    if frame is not None:
+                        yield channel, frame
+                tail = tail[position:]
+            else:
+                for _, channel, frame in _objects(base + data):
+                    if frame is not None:
+                        yield channel, frame
+
+    def _decompress(self, data):
+        # type: (bytes) -> bytes
+        method, _ = _CONTAINER_HEADER.unpack_from(data)
+        stored = data[_CONTAINER_HEADER.size:]
+        if method == _NO_COMPRESSION:
+            return stored
+        if method == _ZLIB_DEFLATE:
+            return zlib.decompress(stored)
+        raise _bad_file(self.path, 'container compression {} is unknown'.format(method))
+
+
+def _objects(data):
+    # type: (bytes) -> typing.Iterator[typing.Tuple[int, int, typing.Optional[types.RawFrame]]]
+    """Yield the end, channel and frame of every complete object in a buffer.
+
+    The frame is ``None`` for objects that aren't CAN frames.
+    """
+    position = 0
+    end = len(data)
+    while True:
+        # Objects in containers may be padded too.
+        found = data.find(_OBJECT_MAGIC, position, position + _OBJECT_BASE.size)
+        if found < 0 or found + _OBJECT_BASE.size > end:
+            return
+        _, header_size, header_version, object_size, object_type = _OBJECT_BASE.unpack_from(data, found)
+        next_position = found + object_size
+        if next_position > end:
+            return
+        channel, frame = _parse(data, found, header_size, header_version, object_type)
+        position = next_position
+        yield position, channel, frame
+
+
+def _parse(data, position, header_size, header_version, object_type):
+    # type: (bytes, int, int, int, int) -> typing.Tuple[int, typing.Optional[types.RawFrame]]
+    if object_type not in (_CAN_MESSAGE, _CAN_MESSAGE2, _CAN_FD_MESSAGE, _CAN_FD_MESSAGE_64):
+        return 0, None
+    header_position = position + _OBJECT_BASE.size
+    if header_version == 1:
+        flags, _, _, time = _OBJECT_HEADER_V1.unpack_from(data, header_position)
+    elif header_version == 2:
+        flags, _, _, _, time = _OBJECT_HEADER_V2.unpack_from(data, header_position)
+    else:
+        return 0, None
+    timestamp = time * 100 if flags == _TIME_TEN_MICS else time // 100
+    body = position + header_size
+
+    if object_type in (_CAN_MESSAGE, _CAN_MESSAGE2):
+        channel, flags, dlc, identifier, payload = _CAN_MESSAGE_BODY.unpack_from(data, body)
+        fd = brs = False
+        remote = bool(flags & _CAN_REMOTE)
+        transmitted = bool(flags & _CAN_DIR_TX)
+        payload = payload[:min(dlc, 8)]
+    elif object_type == _CAN_FD_MESSAGE:
+        (channel, flags, dlc, identifier, _, _, fd_flags, length,
+         payload) = _CAN_FD_MESSAGE_BODY.unpack_from(data, body)
+        fd = bool(fd_flags & _CAN_FD_EDL)
+        brs = fd and bool(fd_flags & _CAN_FD_BRS)
+        remote = bool(flags & _CAN_REMOTE)
+        transmitted = bool(flags & _CAN_DIR_TX)
+        payload = payload[:length if fd else min(dlc, 8)]
+    else:
+        fields = _CAN_FD_MESSAGE_64_BODY.unpack_from(data, body)
+        channel, dlc, length, _, identifier, _, flags = fields[:7]
+        fd = bool(flags & _CAN_FD_64_EDL)
+        brs = fd and bool(flags & _CAN_FD_64_BRS)
+        remote = bool(flags & _CAN_FD_64_REMOTE)
+        transmitted = fields[12] == 1
+        start = body + _CAN_FD_MESSAGE_64_BODY.size
+        payload = data[start:start + length]
+
+    frame = _vector.can_frame(
+        timestamp, identifier & ~_CAN_ID_EXTENDED, bool(identifier & _CAN_ID_EXTENDED),
+        fd, brs, remote, transmitted, payload)
+    return channel, frame
@@ -0,0 +1,116 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import typing  # NOQA: F401
+import zlib
+
+from nixnet import _cconsts
+from nixnet import errors
+
+try:
+    import lzma  # type: ignore
+except ImportError:
+    lzma = None
+
+try:
+    import lz4.frame  # type: ignore
+except ImportError:
+    lz4 = None
+
+try:
+    import zstandard  # type: ignore
+except ImportError:
+    zstandard = None
+
+
+#: Block data stored in the raw frame format.
+CODEC_NONE = 0
+#: Block data compressed with zlib.
+CODEC_ZLIB = 1
+#: Block data compressed with lzma, from the standard library on Python 3.
+CODEC_LZMA = 2
+#: Block data compressed with LZ4 frames, when the ``lz4`` package is installed.
+CODEC_LZ4 = 3
+#: Block data compressed with Zstandard, when the ``zstandard`` package is installed.
+CODEC_ZSTD = 4
+
+_CODECS = {
+    None: CODEC_NONE,
+    'zlib': CODEC_ZLIB,
+    'lzma': CODEC_LZMA,
+    'lz4': CODEC_LZ4,
+    'zstd': CODEC_ZSTD,
+}
+
+
+def _modules():
+    # type: () -> typing.Dict[int, typing.Any]
+    return {CODEC_NONE: True, CODEC_ZLIB: zlib, CODEC_LZMA: lzma, CODEC_LZ4: lz4, CODEC_ZSTD: zstandard}
+
+
+def available():
+    # type: () -> typing.List[typing.Text]
+    """Return the compression names whose codec is installed, fastest first.
+
+    >>> 'zlib' in available()
+    True
+    """
+    order = ['lz4', 'zstd', 'zlib', 'lzma']
+    modules = _modules()
+    return [name for name in order if modules[_CODECS[name]] is not None]
+
+
+def codec_id(compression):
+    # type: (typing.Optional[typing.Text]) -> int
+    """Return the codec stored in block headers for a compression name.
+
+    >>> codec_id('zlib')
+    1
+    """
+    try:
+        codec = _CODECS[compression]
+    except KeyError:
+        raise ValueError('Unknown capture compression {!r}, expected one of {}'.format(
+            compression, ', '.join(sorted(name for name in _CODECS if name is not None))))
+    if _modules()[codec] is None:
+        raise ValueError('Capture compression {!r} is not installed'.format(compression))
+    return codec
+
+
+def encode(codec, data, level=None):
+    # type: (int, bytes, typing.Optional[int]) -> bytes
+    """Return the stored form of a block of frames in the raw frame format."""
+    if codec == CODEC_NONE:
+        return data
+    if codec == CODEC_ZLIB:
+        return zlib.compress(data, 6 if level is None else level)
+    if codec == CODEC_LZMA:
+        return lzma.compress(data, preset=6 if level is None else level)
+    if codec == CODEC_LZ4:
+        return lz4.frame.compress(data, compression_level=0 if level is None else level)
+    if codec == CODEC_ZSTD:
+        return zstandard.ZstdCompressor(level=3 if level is None else level).compress(data)
+    raise ValueError('Unknown capture codec {}'.format(codec))
+
+
+def decode(codec, stored, raw_len):
+    # type: (int, bytes, int) -> bytes
+    """Return the frames of a block in the raw frame format from their stored form."""
+    if codec == CODEC_NONE:
+        data = stored
+    elif _modules().get(codec) is None:
+        raise errors.XnetError('Unknown capture codec {}'.format(codec), _cconsts.NX_ERR_INTERNAL_ERROR)
+    elif codec == CODEC_ZLIB:
+        data = zlib.decompress(stored)
+    elif codec == CODEC_LZMA:
+        data = lzma.decompress(stored)
+    elif codec == CODEC_LZ4:
+        data = lz4.frame.decompress(stored)
+    else:
+        data = zstandard.ZstdDecompressor().decompress(stored, max_output_size=raw_len)
+    if len(data) != raw_len:
+        raise errors.XnetError(
+            'Capture block decoded to {} bytes instead of {}'.format(len(data), raw_len),
+            _cconsts.NX_ERR_INTERNAL_ERROR)
+    return data
@@ -0,0 +1,157 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import struct
+import typing  # NOQA: F401
+
+from nixnet import _cconsts
+from nixnet import _frames  # NOQA: F401
+from nixnet import errors
+
+from nixnet.capture import _units
+
+try:
+    import numpy  # type: ignore
+except ImportError:
+    numpy = None
+
+
+_TIMESTAMP_SIZE = 8
+_TIMESTAMP_MASK = (1 << 64) - 1
+# Offsets of the type, info and payload length in a base unit.
+_TYPE = 12
+_INFO = 14
+_PAYLOAD_LENGTH = 15
+
+
+def split(data, offsets=None):
+    # type: (bytes, typing.Optional[typing.List[int]]) -> bytes
+    """Return a raw frame buffer rearranged into columns, which compress much better than the frames.
+
+    The timestamp of every base unit is replaced by the difference to the previous timestamp,
+    and the base units are stored one byte position after the other,
+    so the bytes of each field of all frames are next to each other.
+    The payload units that follow base units come last, in frame order.
+
+    Args:
+        data(bytes): Frames in the raw frame format.
+        offsets(list of int): Byte offset of every frame, or ``None`` when every frame is a single base unit.
+
+    >>> data = _frames.nxFrameFixed_t.pack(1000, 1, 0, 0, 0, 1, b'a')
+    >>> data += _frames.nxFrameFixed_t.pack(1010, 1, 0, 0, 0, 1, b'b')
+    >>> columns = split(data)
+    >>> bytearray(columns[:2]), bytearray(columns[2 * 15:2 * 17])
+    (bytearray(b'\\xe8\\n'), bytearray(b'\\x01\\x01ab'))
+    >>> join(columns, 2) == data
+    True
+    """
+    if offsets is None:
+        base = data
+        extra = b''
+    else:
+        ends = offsets[1:] + [len(data)]
+        base = b''.join(data[offset:offset + _units.UNIT_SIZE] for offset in offsets)
+        extra = b''.join(data[offset + _units.UNIT_SIZE:end] for offset, end in zip(offsets, ends))
+    count = len(base) // _units.UNIT_SIZE
+    if not count:
+        return extra
+
+    if numpy is not None:
+        units = numpy.frombuffer(base, numpy.uint8).reshape(count, _units.UNIT_SIZE).copy()
+        timestamps = units[:, :_TIMESTAMP_SIZE].copy().view('<u8').reshape(count)
+        deltas = timestamps.copy()
+        deltas[1:] -= timestamps[:-1]
+        units[:, :_TIMESTAMP_SIZE] = deltas.view(numpy.uint8).reshape(count, _TIMESTAMP_SIZE)
+        return units.T.tobytes() + extra
+
+    timestamps = _unpack_timestamps(_gather(base, 0, _TIMESTAMP_SIZE, _units.UNIT_SIZE), count)
+    previous = [0] + timestamps[:-1]
+    deltas = _pack_timestamps([(timestamp - last) & _TIMESTAMP_MASK
+                               for timestamp, last in zip(timestamps, previous)])
+    planes = [deltas[position::_TIMESTAMP_SIZE] for position in range(_TIMESTAMP_SIZE)]
+    planes.extend(bytes(base[position::_units.UNIT_SIZE]) for position in range(_TIMESTAMP_SIZE, _units.UNIT_SIZE))
+    planes.append(extra)
+    return b''.join(planes)
+
+
+def join(columns, num_frames):
+    # type: (bytes, int) -> bytes
+    """Return the raw frame buffer of columns from :any:`split`."""
+    size = num_frames * _units.UNIT_SIZE
+    if len(columns) < size:
+        raise errors.XnetError(
+            'Capture block has {} column bytes for {} frames'.format(len(columns), num_frames),
+            _cconsts.NX_ERR_INTERNAL_ERROR)
+    if not num_frames:
+        return b''
+
+    if numpy is not None:
+        planes = numpy.frombuffer(columns, numpy.uint8, size).reshape(_units.UNIT_SIZE, num_frames)
+        units = numpy.ascontiguousarray(planes.T)
+        deltas = units[:, :_TIMESTAMP_SIZE].copy().view('<u8').reshape(num_frames)
+        timestamps = numpy.cumsum(deltas, dtype=numpy.uint64).astype('<u8')
+        units[:, :_TIMESTAMP_SIZE] = timestamps.view(numpy.uint8).reshape(num_frames, _TIMESTAMP_SIZE)
+        base = units.tobytes()
+    else:
+        deltas = _unpack_timestamps(_gather(columns, 0, _TIMESTAMP_SIZE, num_frames, True), num_frames)
+        timestamps = []
+        timestamp = 0
+        for delta in deltas:
+            timestamp = (timestamp + delta) & _TIMESTAMP_MASK
+            timestamps.append(timestamp)
+        packed = _pack_timestamps(timestamps)
+        units = bytearray(size)
+        for position in range(_units.UNIT_SIZE):
+            if position < _TIMESTAMP_SIZE:
+                units[position::_units.UNIT_SIZE] = packed[position::_TIMESTAMP_SIZE]
+            else:
+                units[position::_units.UNIT_SIZE] = columns[position * num_frames:(position + 1) * num_frames]
+        base = bytes(units)
+
+    if len(columns) == size:
+        return base
+    # Frames with payload units take theirs from the end, in order.
+    extra = columns[size:]
+    frame_types = bytearray(columns[_TYPE * num_frames:(_TYPE + 1) * num_frames])
+    infos = bytearray(columns[_INFO * num_frames:(_INFO + 1) * num_frames])
+    lengths = bytearray(columns[_PAYLOAD_LENGTH * num_frames:(_PAYLOAD_LENGTH + 1) * num_frames])
+    frames = []
+    position = 0
+    for index in range(num_frames):
+        frames.append(base[index * _units.UNIT_SIZE:(index + 1) * _units.UNIT_SIZE])
+        tail = _units.frame_size(frame_types[index], infos[index], lengths[index]) - _units.UNIT_SIZE
+        if tail:
+            frames.append(extra[position:position + tail])
+            position += tail
+    if position != len(extra):
+        raise errors.XnetError(
+            'Capture block has {} payload bytes instead of {}'.format(len(extra), position),
+            _cconsts.NX_ERR_INTERNAL_ERROR)
+    return b''.join(frames)
+
+
+def _gather(data, first, width, stride, planar=False):
+    # type: (typing.Any, int, int, int, bool) -> bytearray
+    """Return the bytes ``first`` to ``first + width`` of every ``stride`` bytes as consecutive values.
+
+    With ``planar``, the bytes are read from planes of ``stride`` bytes each instead.
+    """
+    count = stride if planar else len(data) // stride
+    values = bytearray(count * width)
+    for position in range(width):
+        if planar:
+            values[position::width] = data[(first + position) * stride:(first + position + 1) * stride]
+        else:
+            values[position::width] = data[first + position::stride]
+    return values
+
+
+def _unpack_timestamps(data, count):
+    # type: (typing.Any, int) -> typing.List[int]
+    return list(struct.unpack('<{}Q'.format(count), bytes(data)))
+
+
+def _pack_timestamps(timestamps):
+    # type: (typing.List[int]) -> bytes
+    return struct.pack('<{}Q'.format(len(timestamps)), *timestamps)
@@ -0,0 +1,627 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+import io
+import itertools
+import mmap
+import multiprocessing
+import os
+import struct
+import typing  # NOQA: F401
+
+from nixnet import _cconsts
+from nixnet import _frames
+from nixnet import errors
+from nixnet import types  # NOQA: F401
+
+from nixnet.capture import _codec
+from nixnet.capture import _columns
+from nixnet.capture import _units
+
+try:
+    import numpy  # type: ignore
+except ImportError:
+    numpy = None
+
+
+#: Default number of frame bytes in a block.
+DEFAULT_BLOCK_SIZE = 1 << 16
+
+_FILE_MAGIC = b'NXCAPTUR'
+_VERSION = 1
+# Magic, version, header size and nominal block size.
+_FILE_HEADER = struct.Struct('<8sHHI')
+
+_BLOCK_MAGIC = b'NXBK'
+# Magic, codec, flags, reserved, number of frames, frame bytes, stored bytes, frame type filter,
+# first and last timestamp, and identifier filter.
+_BLOCK_HEADER = struct.Struct('<4sBBHIIIIQQ128s')
+_FILTER_BITS = 1024
+# Timestamp, identifier and type of a base unit.
+_UNIT_HEAD = struct.Struct('<QIB')
+
+_INDEX_MAGIC = b'NXIX'
+# Magic and number of blocks, followed by the offset and header of every block.
+_INDEX_HEADER = struct.Struct('<4sI')
+_INDEX_OFFSET = struct.Struct('<Q')
+_TRAILER_MAGIC = b'NXCAPIDX'
+# Offset of the index and magic, at the end of a closed file.
+_TRAILER = struct.Struct('<Q8s')
+
+#: Block flag set when every frame of the block is a single base unit.
+BLOCK_FIXED_UNITS = 0x01
+#: Block flag set when the block data is rearranged into columns before compression.
+BLOCK_COLUMNS = 0x02
+
+CaptureBlock_ = collections.namedtuple(
+    'CaptureBlock_',
+    ['offset', 'codec', 'flags', 'num_frames', 'raw_len', 'stored_len',
+     'first_timestamp', 'last_timestamp', 'id_filter', 'type_filter'])
+
+
+class CaptureBlock(CaptureBlock_):
+    """Index entry of a block of a capture file.
+
+    Attributes:
+        offset(int): Byte offset of the block header in the file.
+        codec(int): Compression of the block data.
+            ``0`` stores the raw frame format unchanged,
+            and ``1`` to ``4`` compress it with zlib, lzma, LZ4 or Zstandard.
+        flags(int): ``BLOCK_FIXED_UNITS`` when every frame is a single 24 byte base unit,
+            and ``BLOCK_COLUMNS`` when the frames are rearranged into columns before compression.
+        num_frames(int): Number of frames in the block.
+        raw_len(int): Bytes of the frames in the raw frame format.
+        stored_len(int): Bytes of the block data in the file.
+        first_timestamp(int): Earliest frame timestamp, in 100 ns since 1601-01-01.
+        last_timestamp(int): Latest frame timestamp.
+        id_filter(bytes): Bloom filter of the raw frame identifiers.
+        type_filter(int): Bit mask of the frame types, or ``0`` when unknown.
+            Files written before the mask was added have ``0``.
+    """
+
+    @property
+    def data_offset(self):
+        # type: () -> int
+        """int: Returns the byte offset of the block data in the file."""
+        return self.offset + _BLOCK_HEADER.size
+
+    def overlaps(self, start=None, stop=None):
+        # type: (typing.Optional[int], typing.Optional[int]) -> bool
+        """Return whether the block may have frames with ``start <= timestamp < stop``."""
+        if start is not None and self.last_timestamp < start:
+            return False
+        return stop is None or self.first_timestamp < stop
+
+    def may_contain(self, identifier):
+        # type: (int) -> bool
+        """Return whether the block may have frames with the raw ``identifier``.
+
+        ``False`` is always correct, while ``True`` may be a false positive.
+        """
+        id_filter = bytearray(self.id_filter)
+        return all(id_filter[bit >> 3] >> (bit & 7) & 1 for bit in _filter_bits(identifier))
+
+    def may_have_type(self, frame_type):
+        # type: (typing.Any) -> bool
+        """Return whether the block may have frames of ``frame_type``.
+
+        ``False`` is always correct, while ``True`` may be a false positive.
+        """
+        return not self.type_filter or bool(self.type_filter & 1 << _type_bit(_raw_type(frame_type)))
+
+
+def _filter_bits(identifier):
+    # type: (int) -> typing.Tuple[int, int]
+    # Two multiplicative hashes, keeping the top 10 bits of 32.
+    return (((identifier * 0x9E3779B1) & 0xFFFFFFFF) >> 22,
+            ((identifier * 0x85EBCA6B) & 0xFFFFFFFF) >> 22)
+
+
+def _type_bit(frame_type):
+    # type: (int) -> int
+    """Return the bit of a frame type in a type filter.
+
+    Folding the type byte gives every frame type of the driver its own bit.
+
+    >>> [_type_bit(frame_type) for frame_type in (0x00, 0x08, 0x10, 0x40, 0xC0)]
+    [0, 11, 22, 24, 8]
+    """
+    return (frame_type ^ frame_type >> 2 ^ frame_type >> 3) & 0x1F
+
+
+def _type_filter(frame_types):
+    # type: (typing.Iterable[int]) -> int
+    type_filter = 0
+    for frame_type in frame_types:
+        type_filter |= 1 << _type_bit(int(frame_type))
+    return type_filter
+
+
+def _raw_type(frame_type):
+    # type: (typing.Any) -> int
+    return getattr(frame_type, 'value', frame_type)
+
+
+def _id_filter(identifiers):
+    # type: (typing.Iterable[int]) -> bytes
+    id_filter = bytearray(_FILTER_BITS // 8)
+    for identifier in identifiers:
+        for bit in _filter_bits(int(identifier)):
+            id_filter[bit >> 3] |= 1 << (bit & 7)
+    return bytes(id_filter)
+
+
+def _raw_identifier(identifier):
+    # type: (typing.Any) -> int
+    return int(identifier)
+
+
+def _summarize(data):
+    # type: (bytes) -> typing.Tuple[int, int, int, int, bytes, int, typing.Optional[typing.List[int]]]
+    """Return the number of frames, flags, first and last timestamp, identifier filter,
+    type filter and frame offsets of a raw frame buffer.
+
+    The offsets are ``None`` when every frame is a single base unit.
+    """
+    fixed = _units.fixed_units(data)
+    if fixed is not None:
+        if not len(fixed):
+            return 0, BLOCK_FIXED_UNITS, 0, 0, _id_filter(()), 0, None
+        timestamps = fixed['timestamp']
+        return (
+            len(fixed),
+            BLOCK_FIXED_UNITS,
+            int(timestamps.min()),
+            int(timestamps.max()),
+            _id_filter(numpy.unique(fixed['identifier']).tolist()),
+            _type_filter(numpy.unique(fixed['type']).tolist()),
+            None)
+
+    offsets = _units.frame_offsets(data)
+    if numpy is not None:
+        units = _units.units(data, offsets)
+        timestamps = units['timestamp'].tolist()
+        identifiers = set(numpy.unique(units['identifier']).tolist())
+        frame_types = set(numpy.unique(units['type']).tolist())
+    else:
+        fields = [_UNIT_HEAD.unpack_from(data, offset) for offset in offsets]
+        timestamps = [timestamp for timestamp, _, _ in fields]
+        identifiers = set(identifier for _, identifier, _ in fields)
+        frame_types = set(frame_type for _, _, frame_type in fields)
+    if len(data) == len(offsets) * _units.UNIT_SIZE:
+        flags = BLOCK_FIXED_UNITS
+        unit_offsets = None  # type: typing.Optional[typing.List[int]]
+    else:
+        flags = 0
+        unit_offsets = offsets
+    if not offsets:
+        return 0, flags, 0, 0, _id_filter(()), 0, None
+    return (
+        len(offsets), flags, min(timestamps), max(timestamps), _id_filter(identifiers), _type_filter(frame_types),
+        unit_offsets)
+
+
+class CaptureWriter(object):
+    """Write frames in the raw frame format to a capture file.
+
+    A capture file stores the frame units exactly as :any:`InFrames.read_bytes` returns them,
+    in blocks of about ``block_size`` bytes that never split a frame.
+    Each block header carries the number of frames, the first and last timestamp
+    and a filter of the frame identifiers,
+    and closing the writer appends an index of all block headers,
+    so :any:`CaptureReader` can skip blocks without reading them.
+
+    Compressed blocks are rearranged into columns first:
+    timestamps become differences to the previous frame,
+    and the bytes of each field of all frames are stored together,
+    which lets the codec take advantage of repeated identifiers and slowly changing payloads.
+
+    Args:
+        path(str): Path of the file to create.
+        block_size(int): Nominal number of frame bytes per block.
+        compression(str): ``'zlib'`` or ``'lzma'`` to compress each block,
+            ``'lz4'`` or ``'zstd'`` when those packages are installed,
+            or ``None`` to store frames unchanged.
+        compression_level(int): Compression level, or ``None`` for the codec's default.
+    """
+
+    def __init__(self, path, block_size=DEFAULT_BLOCK_SIZE, compression=None, compression_level=None):
+        # type: (typing.Text, int, typing.Optional[typing.Text], typing.Optional[int]) -> None
+        if block_size < _units.UNIT_SIZE:
+            raise ValueError('Block size must be at least {} bytes: {}'.format(_units.UNIT_SIZE, block_size))
+        self.path = path
+        self.block_size = block_size
+        self._codec = _codec.codec_id(compression)
+        self._compression_level = compression_level
+        self._file = io.open(path, 'wb')
+        self._file.write(_FILE_HEADER.pack(_FILE_MAGIC, _VERSION, _FILE_HEADER.size, block_size))
+        self._offset = _FILE_HEADER.size
+        self._pending = b''
+        self._blocks = []  # type: typing.List[CaptureBlock]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        self.close()
+
+    @property
+    def blocks(self):
+        # type: () -> typing.List[CaptureBlock]
+        """list of :any:`CaptureBlock`: Returns the blocks written so far."""
+        return list(self._blocks)
+
+    @property
+    def closed(self):
+        # type: () -> bool
+        """bool: Returns whether the writer is closed."""
+        return self._file.closed
+
+    @property
+    def size(self):
+        # type: () -> int
+        """int: Returns the bytes written to the file, without the frames waiting for a block."""
+        return self._offset
+
+    def write_bytes(self, frame_bytes):
+        # type: (bytes) -> None
+        """Add frames in the raw frame format, such as a buffer returned by :any:`InFrames.read_bytes`.
+
+        Full blocks are written to the file, and the remaining frames wait for more frames or :any:`flush`.
+        """
+        data = bytes(frame_bytes)
+        if self._pending:
+            data = self._pending + data
+        position = 0
+        while len(data) - position >= self.block_size:
+            end = _units.block_end(data, position, self.block_size)
+            self._write_block(data[position:end])
+            position = end
+        self._pending = data[position:]
+
+    def write(self, frames):
+        # type: (typing.Iterable[typing.Any]) -> None
+        """Add frames, such as :any:`nixnet.types.RawFrame` or :any:`nixnet.types.CanFrame` objects."""
+        self.write_bytes(b''.join(itertools.chain.from_iterable(
+            _frames.serialize_frame(frame.to_raw()) for frame in frames)))
+
+    def flush(self, sync=False):
+        # type: (bool) -> None
+        """Write the waiting frames as a block, and flush the file.
+
+        Args:
+            sync(bool): Also wait for the operating system to store the file on disk.
+        """
+        if self._pending:
+            self._write_block(self._pending)
+            self._pending = b''
+        self._file.flush()
+        if sync:
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        # type: () -> None
+        """Write the waiting frames and the block index, and close the file."""
+        if self._file.closed:
+            return
+        self.flush()
+        self._write_index()
+        self._file.close()
+
+    def _write_block(self, data):
+        # type: (bytes) -> None
+        num_frames, flags, first_timestamp, last_timestamp, id_filter, type_filter, offsets = _summarize(data)
+        if self._codec == _codec.CODEC_NONE:
+            stored = data
+        else:
+            flags |= BLOCK_COLUMNS
+            stored = _codec.encode(self._codec, _columns.split(data, offsets), self._compression_level)
+        # Blocks start on 8 byte boundaries, so base units in the file are aligned.
+        padding = b'\0' * (-len(stored) % 8)
+        block = CaptureBlock(
+            self._offset, self._codec, flags, num_frames, len(data), len(stored),
+            first_timestamp, last_timestamp, id_filter, type_filter)
+        self._file.write(b''.join((_pack_block_header(block), stored, padding)))
+        self._offset += _BLOCK_HEADER.size + len(stored) + len(padding)
+        self._blocks.append(block)
+
+    def _write_index(self):
+        # type: () -> None
+        self._file.write(_INDEX_HEADER.pack(_INDEX_MAGIC, len(self._blocks)))
+        for block in self._blocks:
+            self._file.write(_INDEX_OFFSET.pack(block.offset))
+            self._file.write(_pack_block_header(block))
+        self._file.write(_TRAILER.pack(self._offset, _TRAILER_MAGIC))
+
+
+def _pack_block_header(block):
+    # type: (CaptureBlock) -> bytes
+    return _BLOCK_HEADER.pack(
+        _BLOCK_MAGIC, block.codec, block.flags, 0, block.num_frames, block.raw_len, block.stored_len,
+        block.type_filter, block.first_timestamp, block.last_timestamp, block.id_filter)
+
+
+def _unpack_block_header(data, position, offset):
+    # type: (typing.Any, int, int) -> typing.Optional[CaptureBlock]
+    (magic, codec, flags, _, num_frames, raw_len, stored_len, type_filter,
+     first_timestamp, last_timestamp, id_filter) = _BLOCK_HEADER.unpack_from(data, position)
+    if magic != _BLOCK_MAGIC:
+        return None
+    return CaptureBlock(
+        offset, codec, flags, num_frames, raw_len, stored_len, first_timestamp, last_timestamp, id_filter,
+        type_filter)
+
+
+def _bad_file(path):
+    # type: (typing.Text) -> errors.XnetError
+    return errors.XnetError('{} is not a capture file'.format(path), _cconsts.NX_ERR_FILE_EXTENSION)
+
+
+class CaptureReader(object):
+    """Read a capture file written by :any:`CaptureWriter`.
+
+    The file is memory mapped, and only the blocks that may hold the requested frames are read.
+    A file that was not closed, for example because logging stopped unexpectedly,
+    is indexed from its block headers instead of the block index.
+
+    Frames are selected by time, with ``start <= timestamp < stop``,
+    and by raw identifier, as returned by ``int()`` of a :any:`nixnet.types.CanIdentifier`.
+
+    Args:
+        path(str): Path of the capture file.
+    """
+
+    def __init__(self, path):
+        # type: (typing.Text) -> None
+        self.path = path
+        self._file = io.open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise _bad_file(path)
+        if len(self._map) < _FILE_HEADER.size:
+            self.close()
+            raise _bad_file(path)
+        magic, version, header_size, self.block_size = _FILE_HEADER.unpack_from(self._map, 0)
+        if magic != _FILE_MAGIC or version != _VERSION:
+            self.close()
+            raise _bad_file(path)
+        self._blocks = self._read_index(header_size)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        self.close()
+
+    def __len__(self):
+        # type: () -> int
+        return sum(block.num_frames for block in self._blocks)
+
+    def close(self):
+        # type: () -> None
+        """Unmap and close the file.
+
+        Arrays from :any:`CaptureReader.arrays` that view the file stay valid,
+        and the file is unmapped when the last of them is released.
+        """
+        if getattr(self, '_map', None) is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                pass
+            self._map = None
+        self._file.close()
+
+    @property
+    def blocks(self):
+        # type: () -> typing.List[CaptureBlock]
+        """list of :any:`CaptureBlock`: Returns the index of the blocks in the file."""
+        return list(self._blocks)
+
+    @property
+    def first_timestamp(self):
+        # type: () -> typing.Optional[int]
+        """int: Returns the earliest frame timestamp, or ``None`` for a file without frames."""
+        timestamps = [block.first_timestamp for block in self._blocks if block.num_frames]
+        return min(timestamps) if timestamps else None
+
+    @property
+    def last_timestamp(self):
+        # type: () -> typing.Optional[int]
+        """int: Returns the latest frame timestamp, or ``None`` for a file without frames."""
+        timestamps = [block.last_timestamp for block in self._blocks if block.num_frames]
+        return max(timestamps) if timestamps else None
+
+    def _read_index(self, header_size):
+        # type: (int) -> typing.List[CaptureBlock]
+        data = self._map
+        size = len(data)
+        if size >= header_size + _INDEX_HEADER.size + _TRAILER.size:
+            index_offset, magic = _TRAILER.unpack_from(data, size - _TRAILER.size)
+            if magic == _TRAILER_MAGIC and header_size <= index_offset <= size - _TRAILER.size:
+                index_magic, count = _INDEX_HEADER.unpack_from(data, index_offset)
+                entry_size = _INDEX_OFFSET.size + _BLOCK_HEADER.size
+                position = index_offset + _INDEX_HEADER.size
+                if index_magic == _INDEX_MAGIC and position + count * entry_size + _TRAILER.size == size:
+                    blocks = []
+                    for _ in range(count):
+                        offset, = _INDEX_OFFSET.unpack_from(data, position)
+                        blocks.append(_unpack_block_header(data, position + _INDEX_OFFSET.size, offset))
+                        position += entry_size
+                    if all(blocks):
+                        return blocks
+
+        # Without an index, walk the block headers and stop at the first incomplete block.
+        blocks = []
+        position = header_size
+        while position + _BLOCK_HEADER.size <= size:
+            block = _unpack_block_header(data, position, position)
+            if block is None:
+                break
+            end = block.data_offset + block.stored_len
+            if end > size:
+                break
+            blocks.append(block)
+            position = end + (-block.stored_len % 8)
+        return blocks
+
+    def select_blocks(self, start=None, stop=None, identifiers=None, frame_types=None):
+        # type: (typing.Optional[int], typing.Optional[int], typing.Optional[typing.Iterable[typing.Any]], typing.Optional[typing.Iterable[typing.Any]]) -> typing.List[CaptureBlock]  # NOQA: E501
+        """Return the blocks that may have frames in the time range with one of the identifiers
+        and one of the frame types.
+        """
+        blocks = [block for block in self._blocks if block.num_frames and block.overlaps(start, stop)]
+        if identifiers is not None:
+            wanted = [_raw_identifier(identifier) for identifier in identifiers]
+            blocks = [block for block in blocks if any(block.may_contain(identifier) for identifier in wanted)]
+        if frame_types is not None:
+            wanted = [_raw_type(frame_type) for frame_type in frame_types]
+            blocks = [block for block in blocks if any(block.may_have_type(frame_type) for frame_type in wanted)]
+        return blocks
+
+    def read_block(self, block):
+        # type: (CaptureBlock) -> bytes
+        """Return the frames of a block in the raw frame format."""
+        return _decode_block(block, self._map[block.data_offset:block.data_offset + block.stored_len])
+
+    def read_bytes(self, start=None, stop=None, identifiers=None, processes=None):
+        # type: (typing.Optional[int], typing.Optional[int], typing.Optional[typing.Iterable[typing.Any]], typing.Optional[int]) -> typing.Iterator[bytes]  # NOQA: E501
+        """Yield the selected frames in the raw frame format, one buffer per block.
+
+        The buffers can be written to a :any:`FrameOutStreamSession` with :any:`OutFrames.write_bytes`.
+
+        Args:
+            start(int): Earliest timestamp, or ``None``.
+            stop(int): Timestamp after the latest one, or ``None``.
+            identifiers(list): Raw identifiers to keep, or ``None`` for all.
+            processes(int): Decompress and select blocks in a pool of this many processes,
+                ``0`` for one per CPU, or ``None`` to do it in the calling thread.
+                Buffers are yielded in file order either way.
+        """
+        if identifiers is not None:
+            identifiers = set(_raw_identifier(identifier) for identifier in identifiers)
+        blocks = self.select_blocks(start, stop, identifiers)
+        if processes is None or len(blocks) < 2:
+            selections = (
+                _filter(block, self.read_block(block), start, stop, identifiers) for block in blocks)
+            for selected in selections:
+                if selected:
+                    yield selected
+            return
+
+        pool = multiprocessing.Pool(processes or None)
+        try:
+            tasks = [(self.path, block, start, stop, identifiers) for block in blocks]
+            for selected in pool.imap(_read_selected, tasks):
+                if selected:
+                    yield selected
+            pool.close()
+        finally:
+            pool.terminate()
+            pool.join()
+
+    def frames(self, start=None, stop=None, identifiers=None, processes=None):
+        # type: (typing.Optional[int], typing.Optional[int], typing.Optional[typing.Iterable[typing.Any]], typing.Optional[int]) -> typing.Iterator[types.RawFrame]  # NOQA: E501
+        """Yield the selected frames as :any:`nixnet.types.RawFrame` objects.
+
+        The arguments are those of :any:`CaptureReader.read_bytes`.
+        """
+        for data in self.read_bytes(start, stop, identifiers, processes):
+            for frame in _frames.iterate_frames(data):
+                yield frame
+
+    def arrays(self, start=None, stop=None, identifiers=None):
+        # type: (typing.Optional[int], typing.Optional[int], typing.Optional[typing.Iterable[typing.Any]]) -> typing.Iterator[typing.Any]  # NOQA: E501
+        """Yield the base units of the selected frames as NumPy structured arrays, one per block.
+
+        The fields are ``timestamp``, ``identifier``, ``type``, ``flags``, ``info``,
+        ``payload_length`` and ``payload``, which holds the first 8 payload bytes.
+        When a whole uncompressed block is selected and its frames are single base units,
+        the array is a read-only view of the memory mapped file. Requires NumPy.
+        """
+        if numpy is None:
+            raise ImportError('CaptureReader.arrays requires NumPy')
+        if identifiers is not None:
+            identifiers = set(_raw_identifier(identifier) for identifier in identifiers)
+        for block in self.select_blocks(start, stop, identifiers):
+            if block.codec == _codec.CODEC_NONE and block.flags & BLOCK_FIXED_UNITS:
+                units = numpy.frombuffer(
+                    self._map, _units.UNIT_DTYPE, block.num_frames, block.data_offset)
+            else:
+                units = _units.units(self.read_block(block))
+            mask = _mask(units, start, stop, identifiers)
+            if mask is not None:
+                units = units[mask]
+            if len(units):
+                yield units
+
+
+def _decode_block(block, stored):
+    # type: (CaptureBlock, bytes) -> bytes
+    data = _codec.decode(block.codec, stored, block.raw_len)
+    if block.flags & BLOCK_COLUMNS:
+        data = _columns.join(data, block.num_frames)
+    return data
+
+
+def _read_selected(task):
+    # type: (typing.Tuple[typing.Text, CaptureBlock, typing.Optional[int], typing.Optional[int], typing.Optional[typing.Set[int]]]) -> bytes  # NOQA: E501
+    """Read, decode and select the frames of a block in a pool process."""
+    path, block, start, stop, identifiers = task
+    return _filter(block, _read_decoded(path, block), start, stop, identifiers)
+
+
+def _read_decoded(path, block):
+    # type: (typing.Text, CaptureBlock) -> bytes
+    """Read and decode the frames of a block without mapping the file."""
+    with io.open(path, 'rb') as f:
+        f.seek(block.data_offset)
+        stored = f.read(block.stored_len)
+    return _decode_block(block, stored)
+
+
+def _filter(block, data, start, stop, identifiers):
+    # type: (CaptureBlock, bytes, typing.Optional[int], typing.Optional[int], typing.Optional[typing.Set[int]]) -> bytes  # NOQA: E501
+    """Return the frames of a decoded block in the time range with one of the identifiers."""
+    after_start = start is None or block.first_timestamp >= start
+    before_stop = stop is None or block.last_timestamp < stop
+    if after_start and before_stop and identifiers is None:
+        return data
+    if numpy is not None:
+        offsets = None if block.flags & BLOCK_FIXED_UNITS else _units.frame_offsets(data)
+        units = _units.units(data, offsets)
+        mask = _mask(units, start, stop, identifiers)
+        if block.flags & BLOCK_FIXED_UNITS:
+            return units[mask].tobytes()
+        return _units.select(data, offsets, numpy.flatnonzero(mask).tolist())
+    offsets = _units.frame_offsets(data)
+    indexes = []
+    for index, offset in enumerate(offsets):
+        timestamp, identifier = struct.unpack_from('<QI', data, offset)
+        if start is not None and timestamp < start:
+            continue
+        if stop is not None and timestamp >= stop:
+            continue
+        if identifiers is not None and identifier not in identifiers:
+            continue
+        indexes.append(index)
+    return _units.select(data, offsets, indexes)
+
+
+def _mask(units, start, stop, identifiers):
+    # type: (typing.Any, typing.Optional[int], typing.Optional[int], typing.Optional[typing.Set[int]]) -> typing.Any
+    """Return the mask of base units in the time range with one of the identifiers, or ``None`` for all."""
+    mask = None
+    if start is not None:
+        mask = units['timestamp'] >= start
+    if stop is not None:
+        before = units['timestamp'] < stop
+        mask = before if mask is None else mask & before
+    if identifiers is not None:
+        wanted = numpy.isin(units['identifier'], numpy.fromiter(identifiers, numpy.uint32, len(identifiers)))
+        mask = wanted if mask is None else mask & wanted
+    return mask
@@ -0,0 +1,1023 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+import heapq
+import io
+import itertools
+import mmap
+import os
+import struct
+import time
+import typing  # NOQA: F401
+
+from nixnet import _cconsts
+from nixnet import _frames
+from nixnet import constants
+from nixnet import types  # NOQA: F401
+
+from nixnet.capture import _mdf_blocks as blocks
+from nixnet.capture import _units
+from nixnet.capture import _vector
+
+try:
+    import numpy  # type: ignore
+except ImportError:
+    numpy = None
+
+
+#: Default number of record bytes a channel group collects before writing a data block.
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+_UNIX_EPOCH = 116444736000000000
+_HD_OFFSET = blocks.ID_BLOCK.size
+
+_CAN_DATA_FRAME = u'CAN_DataFrame'
+_CAN_REMOTE_FRAME = u'CAN_RemoteFrame'
+_LIN_FRAME = u'LIN_Frame'
+_CAN_DATA_TYPES = (
+    _cconsts.NX_FRAME_TYPE_CAN_DATA,
+    _cconsts.NX_FRAME_TYPE_CAN20_DATA,
+    _cconsts.NX_FRAME_TYPE_CANFD_DATA,
+    _cconsts.NX_FRAME_TYPE_CANFDBRS_DATA)
+_CAN_FD_TYPES = (_cconsts.NX_FRAME_TYPE_CANFD_DATA, _cconsts.NX_FRAME_TYPE_CANFDBRS_DATA)
+_CAN_ID_MASK = 0x1FFFFFFF
+# Flags byte of CAN and LIN records.
+_DIR_TX = 0x01
+_EDL = 0x02
+_BRS = 0x04
+# Smallest CAN FD DLC for every payload length.
+_DLC = [next(dlc for dlc in range(16) if _vector.fd_length(dlc) >= length) for length in range(65)]
+
+# Time, bus channel, identifier with IDE in bit 31, DLC, data length, flags, then the data bytes.
+_CAN_RECORD = '<dBIBBB{}s'
+# Time, bus channel, identifier, data length, flags and data bytes.
+_LIN_RECORD = struct.Struct('<dBBBB8s')
+
+
+def _tool_version():
+    # type: () -> typing.Text
+    try:
+        with io.open(os.path.join(os.path.dirname(os.path.dirname(__file__)), 'VERSION'), encoding='utf-8') as f:
+            return f.read().strip()
+    except IOError:
+        return u''
+
+
+class _Channel(object):
+    """A channel of a record, with its structure members."""
+
+    __slots__ = [
+        'name', 'byte_offset', 'bit_count', 'data_type', 'bit_offset', 'channel_type', 'sync_type', 'flags',
+        'unit', 'conversion', 'children']
+
+    def __init__(
+            self,
+            name,  # type: typing.Text
+            byte_offset,  # type: int
+            bit_count,  # type: int
+            data_type=blocks.CN_UINT_LE,  # type: int
+            bit_offset=0,  # type: int
+            channel_type=blocks.CN_FIXED,  # type: int
+            sync_type=0,  # type: int
+            flags=0,  # type: int
+            unit=u'',  # type: typing.Text
+            conversion=None,  # type: typing.Optional[typing.Tuple[float, float]]
+            children=(),  # type: typing.Iterable[_Channel]
+    ):
+        # type: (...) -> None
+        self.name = name
+        self.byte_offset = byte_offset
+        self.bit_count = bit_count
+        self.data_type = data_type
+        self.bit_offset = bit_offset
+        self.channel_type = channel_type
+        self.sync_type = sync_type
+        self.flags = flags
+        self.unit = unit
+        self.conversion = conversion
+        self.children = list(children)
+
+    def walk(self):
+        # type: () -> typing.Iterator[_Channel]
+        yield self
+        for child in self.children:
+            for channel in child.walk():
+                yield channel
+
+
+def _master():
+    # type: () -> _Channel
+    return _Channel(
+        u't', 0, 64, blocks.CN_FLOAT_LE, channel_type=blocks.CN_MASTER, sync_type=blocks.CN_SYNC_TIME, unit=u's')
+
+
+def _can_channels(name, width):
+    # type: (typing.Text, int) -> typing.List[_Channel]
+    members = [
+        _Channel(name + u'.BusChannel', 8, 8),
+        _Channel(name + u'.ID', 9, 29),
+        _Channel(name + u'.IDE', 12, 1, bit_offset=7),
+        _Channel(name + u'.DLC', 13, 4),
+        _Channel(name + u'.DataLength', 14, 8),
+        _Channel(name + u'.Dir', 15, 1),
+    ]
+    if width:
+        members.extend([
+            _Channel(name + u'.EDL', 15, 1, bit_offset=1),
+            _Channel(name + u'.BRS', 15, 1, bit_offset=2),
+            _Channel(name + u'.DataBytes', 16, width * 8, blocks.CN_BYTE_ARRAY),
+        ])
+    frame = _Channel(name, 8, (8 + width) * 8, blocks.CN_BYTE_ARRAY, flags=blocks.CN_FLAG_BUS_EVENT, children=members)
+    return [_master(), frame]
+
+
+def _lin_channels():
+    # type: () -> typing.List[_Channel]
+    members = [
+        _Channel(_LIN_FRAME + u'.BusChannel', 8, 8),
+        _Channel(_LIN_FRAME + u'.ID', 9, 6),
+        _Channel(_LIN_FRAME + u'.DataLength', 10, 8),
+        _Channel(_LIN_FRAME + u'.Dir', 11, 1),
+        _Channel(_LIN_FRAME + u'.DataBytes', 12, 64, blocks.CN_BYTE_ARRAY),
+    ]
+    frame = _Channel(_LIN_FRAME, 8, 12 * 8, blocks.CN_BYTE_ARRAY, flags=blocks.CN_FLAG_BUS_EVENT, children=members)
+    return [_master(), frame]
+
+
+class _Group(object):
+    """A channel group being written, with the records waiting for a data block."""
+
+    def __init__(self, name, channels, record_size, bus_type=None):
+        # type: (typing.Text, typing.List[_Channel], int, typing.Optional[int]) -> None
+        self.name = name
+        self.channels = channels
+        self.record_size = record_size
+        self.bus_type = bus_type
+        self.pending = []  # type: typing.List[bytes]
+        self.pending_size = 0
+        self.num_records = 0
+        # File offset and original length of every data block.
+        self.data_blocks = []  # type: typing.List[typing.Tuple[int, int]]
+        self.zip_type = blocks.ZIP_DEFLATE
+
+
+class MdfWriter(object):
+    """Write frames and decoded signals to an ASAM MDF 4.1 file.
+
+    Frames are stored as bus logging channel groups, as defined by the ASAM MDF bus logging standard:
+    ``CAN_DataFrame`` with 8 byte and, for CAN FD frames with longer payloads, 64 byte ``DataBytes``,
+    ``CAN_RemoteFrame`` and ``LIN_Frame``.
+    Each has the members ``BusChannel``, ``ID``, ``IDE``, ``DLC``, ``DataLength``, ``Dir``, ``EDL``, ``BRS``
+    and ``DataBytes`` that apply to it.
+    Frames of other types are not stored, and are counted by :any:`MdfWriter.skipped_frames`.
+    Decoded signals are stored as value channel groups with :any:`MdfWriter.write_signals`.
+
+    Every channel group collects ``chunk_size`` bytes of records and writes them as a data block,
+    so memory stays bounded however long the log is.
+    Closing the writer adds the data lists and the channel group descriptions.
+    Until then, the file is marked as unfinalized.
+
+    Times are stored in seconds from the start of the file,
+    which is ``start_timestamp`` or else the first timestamp written.
+
+    Args:
+        path(str): Path of the file to create.
+        compression(str): ``'deflate'`` to compress data blocks, or ``None``.
+            Records are transposed before they are compressed.
+        compression_level(int): Compression level, or ``None`` for the default.
+        chunk_size(int): Record bytes per data block.
+        start_timestamp(int): XNET timestamp of the start of the file, in 100 ns since 1601-01-01.
+    """
+
+    def __init__(
+            self,
+            path,  # type: typing.Text
+            compression=None,  # type: typing.Optional[typing.Text]
+            compression_level=None,  # type: typing.Optional[int]
+            chunk_size=DEFAULT_CHUNK_SIZE,  # type: int
+            start_timestamp=None,  # type: typing.Optional[int]
+    ):
+        # type: (...) -> None
+        if compression not in (None, 'deflate'):
+            raise ValueError("Unknown MDF compression {!r}, expected 'deflate'".format(compression))
+        self.path = path
+        self._compress = compression is not None
+        self._compression_level = compression_level
+        self._chunk_size = chunk_size
+        self._start = None  # type: typing.Optional[int]
+        if start_timestamp is not None:
+            self._set_start(start_timestamp)
+        self._groups = collections.OrderedDict()  # type: typing.Dict[typing.Any, _Group]
+        self._skipped = 0
+
+        self._file = io.open(path, 'wb')
+        self._file.write(self._id_block(blocks.UNFINISHED_FILE_ID))
+        header = self._header_block(None)
+        history = blocks.Block(b'##FH', [None, None], blocks.FH_DATA.pack(int(time.time() * 1e9), 0, 0, 0))
+        comment = blocks.text_block(
+            u'<FHcomment><TX>Written by nixnet</TX><tool_id>nixnet</tool_id>'
+            u'<tool_vendor>National Instruments</tool_vendor><tool_version>{}</tool_version></FHcomment>'.format(
+                _tool_version()),
+            b'##MD')
+        history.links[1] = comment
+        self._offset = blocks.layout([header, history, comment], _HD_OFFSET)
+        header.links[1] = history
+        self._file.write(b''.join(block.pack() for block in (header, history, comment)))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        self.close()
+
+    @property
+    def closed(self):
+        # type: () -> bool
+        """bool: Returns whether the writer is closed."""
+        return self._file.closed
+
+    @property
+    def skipped_frames(self):
+        # type: () -> int
+        """int: Returns the number of frames not stored because MDF bus logging has no group for their type."""
+        return self._skipped
+
+    def _set_start(self, timestamp):
+        # type: (int) -> None
+        # MDF start times are in ns since 1970.
+        self._start = max(int(timestamp), _UNIX_EPOCH)
+
+    def _id_block(self, file_id):
+        # type: (bytes) -> bytes
+        unfinished = 0 if file_id == blocks.FILE_ID else 1
+        return blocks.ID_BLOCK.pack(
+            file_id, b'4.10    ', b'nixnet  ', b'', blocks.VERSION, b'', unfinished, 0)
+
+    def _header_block(self, first_group):
+        # type: (typing.Any) -> blocks.Block
+        start = self._start if self._start is not None else _UNIX_EPOCH
+        data = blocks.HD_DATA.pack((start - _UNIX_EPOCH) * 100, 0, 0, 0, 0, 0, 0.0, 0.0)
+        return blocks.Block(b'##HD', [first_group, None, None, None, None, None], data)
+
+    def write_bytes(self, frame_bytes, bus_channel=1):
+        # type: (bytes, int) -> None
+        """Add frames in the raw frame format, such as a buffer returned by :any:`InFrames.read_bytes`.
+
+        Args:
+            frame_bytes(bytes): Whole frames.
+            bus_channel(int): Value of the ``BusChannel`` member of the frames, numbered from 1.
+        """
+        data = bytes(frame_bytes)
+        if not data:
+            return
+        if self._start is None:
+            self._set_start(_frames.nxFrameFixed_t.unpack_from(data)[0])
+        if numpy is not None:
+            records = _numpy_records(data, self._start, bus_channel)
+        else:
+            records = _python_records(data, self._start, bus_channel)
+        for key, (count, record_bytes) in records.items():
+            if key is None:
+                self._skipped += count
+            else:
+                self._append(self._bus_group(key), record_bytes, count)
+
+    def write(self, frames, bus_channel=1):
+        # type: (typing.Iterable[typing.Any], int) -> None
+        """Add frames, such as :any:`nixnet.types.RawFrame` or :any:`nixnet.types.CanFrame` objects."""
+        self.write_bytes(b''.join(itertools.chain.from_iterable(
+            _frames.serialize_frame(frame.to_raw()) for frame in frames)), bus_channel)
+
+    def write_signals(self, group, timestamps, signals, units=None):
+        # type: (typing.Text, typing.Sequence[int], typing.Dict[typing.Text, typing.Sequence[float]], typing.Optional[typing.Dict[typing.Text, typing.Text]]) -> None  # NOQA: E501
+        """Add samples of decoded signals to a value channel group.
+
+        The group is created by its first call, with a 64 bit float channel per signal, in name order.
+        Later calls must have the same signals.
+
+        Args:
+            group(str): Name of the channel group.
+            timestamps(list of int): XNET timestamp of every sample.
+            signals(dict): Physical values of every signal, by signal name, with a value per timestamp.
+            units(dict): Units of the signals, by signal name.
+        """
+        names = sorted(signals)
+        key = ('signals', group)
+        channel_group = self._groups.get(key)
+        if channel_group is None:
+            units = units or {}
+            channels = [_master()] + [
+                _Channel(name, 8 * (index + 1), 64, blocks.CN_FLOAT_LE, unit=units.get(name, u''))
+                for index, name in enumerate(names)]
+            channel_group = _Group(group, channels, 8 * (len(names) + 1))
+            self._groups[key] = channel_group
+        elif names != [channel.name for channel in channel_group.channels[1:]]:
+            raise ValueError('Signals of channel group {} are {}, not {}'.format(
+                group, [channel.name for channel in channel_group.channels[1:]], names))
+        count = len(timestamps)
+        if any(len(signals[name]) != count for name in names):
+            raise ValueError('Every signal must have a value for each of the {} timestamps'.format(count))
+        if not count:
+            return
+        if self._start is None:
+            self._set_start(timestamps[0])
+        if numpy is not None:
+            columns = numpy.empty((count, len(names) + 1), '<f8')
+            columns[:, 0] = (numpy.asarray(timestamps, numpy.int64) - self._start) / 1e7
+            for index, name in enumerate(names):
+                columns[:, index + 1] = signals[name]
+            record_bytes = columns.tobytes()
+        else:
+            record = struct.Struct('<{}d'.format(len(names) + 1))
+            start = self._start
+            values = [signals[name] for name in names]
+            record_bytes = b''.join(
+                record.pack((timestamp - start) / 1e7, *row)
+                for timestamp, row in zip(timestamps, zip(*values)))
+        self._append(channel_group, record_bytes, count)
+
+    def close(self):
+        # type: () -> None
+        """Write the remaining records and the channel group descriptions, and close the file."""
+        if self._file.closed:
+            return
+        for group in self._groups.values():
+            self._write_data_blocks(group, True)
+        metadata = []  # type: typing.List[blocks.Block]
+        data_groups = []
+        for group in self._groups.values():
+            data_group = self._describe(group, metadata)
+            if data_groups:
+                data_groups[-1].links[0] = data_group
+            data_groups.append(data_group)
+        blocks.layout(metadata, self._offset)
+        self._file.write(b''.join(block.pack() for block in metadata))
+
+        header = self._header_block(data_groups[0] if data_groups else None)
+        header.links[1] = _HD_OFFSET + header.size
+        self._file.seek(0)
+        self._file.write(self._id_block(blocks.FILE_ID))
+        self._file.write(header.pack())
+        self._file.close()
+
+    def _bus_group(self, key):
+        # type: (typing.Tuple[typing.Text, int]) -> _Group
+        group = self._groups.get(key)
+        if group is None:
+            name, width = key
+            if name == _LIN_FRAME:
+                group = _Group(name, _lin_channels(), _LIN_RECORD.size, blocks.SI_BUS_LIN)
+            else:
+                group = _Group(name, _can_channels(name, width), 16 + width, blocks.SI_BUS_CAN)
+            self._groups[key] = group
+        return group
+
+    def _append(self, group, record_bytes, count):
+        # type: (_Group, bytes, int) -> None
+        group.pending.append(record_bytes)
+        group.pending_size += len(record_bytes)
+        group.num_records += count
+        if group.pending_size >= self._chunk_size:
+            self._write_data_blocks(group, False)
+
+    def _write_data_blocks(self, group, final):
+        # type: (_Group, bool) -> None
+        """Write the pending records of a group as data blocks of ``chunk_size`` bytes.
+
+        The records that don't fill a data block are kept pending, unless ``final`` is set.
+        """
+        data = b''.join(group.pending)
+        size = max(self._chunk_size // group.record_size, 1) * group.record_size
+        end = len(data) if final else len(data) - len(data) % size
+        for start in range(0, end, size):
+            self._write_data_block(group, data[start:start + size])
+        group.pending = [data[end:]] if end < len(data) else []
+        group.pending_size = len(data) - end
+
+    def _write_data_block(self, group, data):
+        # type: (_Group, bytes) -> None
+        if self._compress:
+            group.zip_type, parameter, stored = blocks.compress(data, group.record_size, self._compression_level)
+            block = blocks.pack_block(
+                b'##DZ', [], blocks.DZ_DATA.pack(b'DT', group.zip_type, parameter, len(data), len(stored)) + stored)
+        else:
+            block = blocks.pack_block(b'##DT', [], data)
+        group.data_blocks.append((self._offset, len(data)))
+        self._file.write(block)
+        self._offset += len(block)
+
+    def _describe(self, group, metadata):
+        # type: (_Group, typing.List[blocks.Block]) -> blocks.Block
+        """Add the blocks that describe a channel group to ``metadata``, and return its data group block."""
+        data = None  # type: typing.Optional[blocks.Block]
+        lists = []  # type: typing.List[blocks.Block]
+        position = 0
+        for start in range(0, len(group.data_blocks), blocks.DL_LINKS):
+            listed = group.data_blocks[start:start + blocks.DL_LINKS]
+            offsets = []
+            for _, length in listed:
+                offsets.append(position)
+                position += length
+            data_list = blocks.Block(
+                b'##DL',
+                [None] + [offset for offset, _ in listed],
+                blocks.DL_DATA.pack(0, len(listed)) + struct.pack('<{}Q'.format(len(offsets)), *offsets))
+            if lists:
+                lists[-1].links[0] = data_list
+            lists.append(data_list)
+        metadata.extend(lists)
+        if lists:
+            data = lists[0]
+            if self._compress:
+                data = blocks.Block(b'##HL', [lists[0]], blocks.HL_DATA.pack(0, group.zip_type))
+                metadata.append(data)
+
+        first_channel = self._describe_channels(group.channels, metadata)
+        name = blocks.text_block(group.name)
+        source = None
+        if group.bus_type is not None:
+            source_name = blocks.text_block(u'CAN' if group.bus_type == blocks.SI_BUS_CAN else u'LIN')
+            source = blocks.Block(
+                b'##SI', [source_name, None, None], blocks.SI_DATA.pack(blocks.SI_BUS, group.bus_type, 0))
+            metadata.extend([source_name, source])
+            flags = blocks.CG_FLAG_BUS_EVENT | blocks.CG_FLAG_PLAIN_BUS_EVENT
+        else:
+            flags = 0
+        channel_group = blocks.Block(
+            b'##CG', [None, first_channel, name, source, None, None],
+            blocks.CG_DATA.pack(0, group.num_records, flags, ord('.'), group.record_size, 0))
+        data_group = blocks.Block(b'##DG', [None, channel_group, data, None], blocks.DG_DATA.pack(0))
+        metadata.extend([name, channel_group, data_group])
+        return data_group
+
+    def _describe_channels(self, channels, metadata):
+        # type: (typing.List[_Channel], typing.List[blocks.Block]) -> typing.Optional[blocks.Block]
+        previous = None  # type: typing.Optional[blocks.Block]
+        first = None  # type: typing.Optional[blocks.Block]
+        for channel in channels:
+            composition = self._describe_channels(channel.children, metadata) if channel.children else None
+            name = blocks.text_block(channel.name)
+            unit = blocks.text_block(channel.unit) if channel.unit else None
+            block = blocks.Block(
+                b'##CN', [None, composition, name, None, None, None, unit, None],
+                blocks.CN_DATA.pack(
+                    channel.channel_type, channel.sync_type, channel.data_type, channel.bit_offset,
+                    channel.byte_offset, channel.bit_count, channel.flags, 0, 0, 0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0))
+            metadata.append(name)
+            if unit is not None:
+                metadata.append(unit)
+            metadata.append(block)
+            if previous is None:
+                first = block
+            else:
+                previous.links[0] = block
+            previous = block
+        return first
+
+
+def _group_key(frame_type, length):
+    # type: (int, int) -> typing.Optional[typing.Tuple[typing.Text, int]]
+    if frame_type in _CAN_DATA_TYPES:
+        return (_CAN_DATA_FRAME, 8 if length <= 8 else 64)
+    if frame_type == _cconsts.NX_FRAME_TYPE_CAN_REMOTE:
+        return (_CAN_REMOTE_FRAME, 0)
+    if frame_type == _cconsts.NX_FRAME_TYPE_LIN_DATA:
+        return (_LIN_FRAME, 8)
+    return None
+
+
+def _python_records(data, start, bus_channel):
+    # type: (bytes, int, int) -> typing.Dict[typing.Any, typing.Tuple[int, bytes]]
+    """Return the number of frames and the records of every bus logging group of a raw frame buffer.
+
+    Frames without a group are counted under ``None``.
+    """
+    records = collections.OrderedDict()  # type: typing.Dict[typing.Any, typing.List[bytes]]
+    skipped = 0
+    for frame in _frames.iterate_frames(data):
+        frame_type = frame.type.value
+        payload = frame.payload
+        key = _group_key(frame_type, len(payload))
+        if key is None:
+            skipped += 1
+            continue
+        seconds = (frame.timestamp - start) / 1e7
+        direction = _DIR_TX if frame.flags & _cconsts.NX_FRAME_FLAGS_TRANSMIT_ECHO else 0
+        if key[0] == _LIN_FRAME:
+            record = _LIN_RECORD.pack(seconds, bus_channel, frame.identifier, len(payload), direction, payload)
+        else:
+            identifier = frame.identifier & _CAN_ID_MASK
+            if frame.identifier & _cconsts.NX_FRAME_ID_CAN_IS_EXTENDED:
+                identifier |= 0x80000000
+            flags = direction
+            if frame_type in _CAN_FD_TYPES:
+                flags |= _EDL
+            if frame_type == _cconsts.NX_FRAME_TYPE_CANFDBRS_DATA:
+                flags |= _BRS
+            record = struct.pack(
+                _CAN_RECORD.format(key[1]),
+                seconds, bus_channel, identifier, _DLC[len(payload)], len(payload), flags, payload)
+        records.setdefault(key, []).append(record)
+    result = collections.OrderedDict(
+        (key, (len(values), b''.join(values))) for key, values in records.items())  # type: typing.Dict[typing.Any, typing.Tuple[int, bytes]]  # NOQA: E501
+    if skipped:
+        result[None] = (skipped, b'')
+    return result
+
+
+def _record_dtype(key):
+    # type: (typing.Tuple[typing.Text, int]) -> typing.Any
+    name, width = key
+    if name == _LIN_FRAME:
+        names = ['t', 'bus', 'id', 'length', 'flags', 'data']
+        formats = ['<f8', 'u1', 'u1', 'u1', 'u1', ('u1', (8,))]
+        offsets = [0, 8, 9, 10, 11, 12]
+        size = _LIN_RECORD.size
+    else:
+        names = ['t', 'bus', 'id', 'dlc', 'length', 'flags']
+        formats = ['<f8', 'u1', '<u4', 'u1', 'u1', 'u1']
+        offsets = [0, 8, 9, 13, 14, 15]
+        if width:
+            names.append('data')
+            formats.append(('u1', (width,)))
+            offsets.append(16)
+        size = 16 + width
+    return numpy.dtype({'names': names, 'formats': formats, 'offsets': offsets, 'itemsize': size})
+
+
+def _numpy_records(data, start, bus_channel):
+    # type: (bytes, int, int) -> typing.Dict[typing.Any, typing.Tuple[int, bytes]]
+    """Return what :any:`_python_records` does, with NumPy."""
+    offsets = None
+    units = _units.fixed_units(data)
+    if units is None:
+        offsets = numpy.asarray(_units.frame_offsets(data), numpy.int64)
+        units = _units.units(data, offsets.tolist())
+    frame_types = units['type']
+    lengths = units['payload_length'].astype(numpy.int64)
+    can_data = numpy.isin(frame_types, _CAN_DATA_TYPES)
+    masks = collections.OrderedDict([
+        ((_CAN_DATA_FRAME, 8), can_data & (lengths <= 8)),
+        ((_CAN_DATA_FRAME, 64), can_data & (lengths > 8)),
+        ((_CAN_REMOTE_FRAME, 0), frame_types == _cconsts.NX_FRAME_TYPE_CAN_REMOTE),
+        ((_LIN_FRAME, 8), frame_types == _cconsts.NX_FRAME_TYPE_LIN_DATA),
+    ])
+    seconds = (units['timestamp'].astype(numpy.int64) - start) / 1e7
+    directions = numpy.where(units['flags'] & _cconsts.NX_FRAME_FLAGS_TRANSMIT_ECHO, _DIR_TX, 0).astype(numpy.uint8)
+    raw = numpy.frombuffer(data, numpy.uint8)
+
+    result = collections.OrderedDict()  # type: typing.Dict[typing.Any, typing.Tuple[int, bytes]]
+    stored = 0
+    for key, mask in masks.items():
+        count = int(numpy.count_nonzero(mask))
+        if not count:
+            continue
+        stored += count
+        selected = units[mask]
+        records = numpy.zeros(count, _record_dtype(key))
+        records['t'] = seconds[mask]
+        records['bus'] = bus_channel
+        records['length'] = selected['payload_length']
+        records['flags'] = directions[mask]
+        if key[0] == _LIN_FRAME:
+            records['id'] = selected['identifier']
+        else:
+            identifiers = selected['identifier']
+            extended = (identifiers & _cconsts.NX_FRAME_ID_CAN_IS_EXTENDED) != 0
+            records['id'] = (identifiers & _CAN_ID_MASK) | (extended.astype(numpy.uint32) << 31)
+            records['dlc'] = numpy.asarray(_DLC, numpy.uint8)[lengths[mask]]
+            types_ = selected['type']
+            records['flags'] |= numpy.where(numpy.isin(types_, _CAN_FD_TYPES), _EDL, 0).astype(numpy.uint8)
+            records['flags'] |= numpy.where(
+                types_ == _cconsts.NX_FRAME_TYPE_CANFDBRS_DATA, _BRS, 0).astype(numpy.uint8)
+        width = key[1]
+        if width:
+            if width <= 8:
+                payloads = selected['payload'].copy()
+            else:
+                # The payload continues from the base unit into the payload units.
+                positions = offsets[mask][:, None] + (_units.UNIT_SIZE - 8) + numpy.arange(width)
+                payloads = raw[numpy.minimum(positions, len(raw) - 1)]
+            payloads[numpy.arange(payloads.shape[1]) >= lengths[mask][:, None]] = 0
+            records['data'][:, :payloads.shape[1]] = payloads
+        result[key] = (count, records.tobytes())
+    if stored < len(units):
+        result[None] = (len(units) - stored, b'')
+    return result
+
+
+MdfChannelGroup_ = collections.namedtuple(
+    'MdfChannelGroup_',
+    ['name', 'channels', 'bus_type', 'num_records'])
+
+
+class MdfChannelGroup(MdfChannelGroup_):
+    """Description of a channel group of an MDF file.
+
+    Attributes:
+        name(str): Acquisition name of the group, such as ``'CAN_DataFrame'`` for CAN bus logging.
+        channels(list of str): Names of the channels, including structure members.
+        bus_type(str): ``'CAN'`` or ``'LIN'`` for bus logging groups, or ``None``.
+        num_records(int): Number of records.
+    """
+
+    pass
+
+
+class _ReadGroup(object):
+
+    def __init__(self, name, channels, bus_type, num_records, record_size, data_link, record_id_size):
+        # type: (typing.Text, typing.List[_Channel], typing.Optional[typing.Text], int, int, int, int) -> None
+        self.name = name
+        self.channels = channels
+        self.bus_type = bus_type
+        self.num_records = num_records
+        self.record_size = record_size
+        self.data_link = data_link
+        self.record_id_size = record_id_size
+
+    def find(self, name):
+        # type: (typing.Text) -> typing.Optional[_Channel]
+        for channel in self.channels:
+            for member in channel.walk():
+                if member.name == name:
+                    return member
+        return None
+
+    def master(self):
+        # type: () -> typing.Optional[_Channel]
+        for channel in self.channels:
+            if channel.channel_type in (blocks.CN_MASTER, blocks.CN_VIRTUAL_MASTER):
+                return channel
+        return None
+
+
+class MdfReader(object):
+    """Read frames and signals from an ASAM MDF 4 file, such as one written by :any:`MdfWriter`.
+
+    Bus logging groups are read as frames,
+    and other channel groups as signals with :any:`MdfReader.signals`.
+    Data blocks are read one at a time from the memory mapped file,
+    uncompressed or compressed with deflate, with or without transposition.
+    Files must be sorted, so that every data group has a single channel group,
+    and channels must have fixed lengths.
+
+    Args:
+        path(str): Path of the MDF file.
+    """
+
+    def __init__(self, path):
+        # type: (typing.Text) -> None
+        self.path = path
+        self._file = io.open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise blocks.bad_file(path, 'file is empty')
+        try:
+            self._groups = self._read_header()
+        except Exception:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        self.close()
+
+    def close(self):
+        # type: () -> None
+        """Unmap and close the file."""
+        if getattr(self, '_map', None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    @property
+    def groups(self):
+        # type: () -> typing.List[MdfChannelGroup]
+        """list of :any:`MdfChannelGroup`: Returns the channel groups of the file."""
+        return [
+            MdfChannelGroup(
+                group.name,
+                [member.name for channel in group.channels for member in channel.walk()],
+                group.bus_type,
+                group.num_records)
+            for group in self._groups]
+
+    def _read_header(self):
+        # type: () -> typing.List[_ReadGroup]
+        data = self._map
+        path = self.path
+        if len(data) < _HD_OFFSET:
+            raise blocks.bad_file(path, 'identification block is incomplete')
+        file_id, _, _, _, version, _, _, _ = blocks.ID_BLOCK.unpack_from(data)
+        if file_id == blocks.UNFINISHED_FILE_ID:
+            raise blocks.bad_file(path, 'file is not finalized')
+        if file_id != blocks.FILE_ID or version < 400:
+            raise blocks.bad_file(path, 'version 4 identification is missing')
+        block_id, links, data_offset, _ = blocks.read_block(data, _HD_OFFSET, path)
+        if block_id != b'##HD':
+            raise blocks.bad_file(path, 'header block is missing')
+        start_ns = blocks.HD_DATA.unpack_from(data, data_offset)[0]
+        self.start_timestamp = start_ns // 100 + _UNIX_EPOCH
+
+        groups = []
+        data_group = links[0]
+        while data_group:
+            _, links, data_offset, _ = blocks.read_block(data, data_group, path)
+            next_data_group, channel_group, data_link = links[:3]
+            record_id_size, = blocks.DG_DATA.unpack_from(data, data_offset)
+            sorted_groups = []
+            while channel_group:
+                group = self._read_channel_group(channel_group, data_link, record_id_size)
+                if group is not None:
+                    sorted_groups.append(group)
+                channel_group = blocks.read_block(data, channel_group, path)[1][0]
+            if len(sorted_groups) > 1:
+                raise blocks.bad_file(path, 'data group at {} is not sorted'.format(data_group))
+            groups.extend(sorted_groups)
+            data_group = next_data_group
+        return groups
+
+    def _read_channel_group(self, offset, data_link, record_id_size):
+        # type: (int, int, int) -> typing.Optional[_ReadGroup]
+        data = self._map
+        path = self.path
+        _, links, data_offset, _ = blocks.read_block(data, offset, path)
+        first_channel, name_link, source_link = links[1:4]
+        _, num_records, flags, _, data_bytes, invalidation_bytes = blocks.CG_DATA.unpack_from(data, data_offset)
+        if flags & 0x0001:
+            # Variable length signal data belongs to other groups.
+            return None
+        bus_type = None
+        if source_link:
+            _, _, source_offset, _ = blocks.read_block(data, source_link, path)
+            source_type, source_bus, _ = blocks.SI_DATA.unpack_from(data, source_offset)
+            bus_type = {blocks.SI_BUS_CAN: u'CAN', blocks.SI_BUS_LIN: u'LIN'}.get(source_bus)
+        channels = self._read_channels(first_channel, record_id_size)
+        name = blocks.read_text(data, name_link, path)
+        if not name:
+            name = next((channel.name for channel in channels if channel.channel_type != blocks.CN_MASTER), u'')
+        return _ReadGroup(
+            name, channels, bus_type, num_records, record_id_size + data_bytes + invalidation_bytes,
+            data_link, record_id_size)
+
+    def _read_channels(self, offset, record_id_size):
+        # type: (int, int) -> typing.List[_Channel]
+        data = self._map
+        path = self.path
+        channels = []
+        while offset:
+            block_id, links, data_offset, _ = blocks.read_block(data, offset, path)
+            if block_id != b'##CN':
+                raise blocks.bad_file(path, 'channel block at {} is missing'.format(offset))
+            next_channel, composition, name_link, _, conversion_link, _, unit_link = links[:7]
+            (channel_type, sync_type, data_type, bit_offset, byte_offset, bit_count,
+             flags) = blocks.CN_DATA.unpack_from(data, data_offset)[:7]
+            children = []  # type: typing.List[_Channel]
+            if composition and blocks.read_block(data, composition, path)[0] == b'##CN':
+                children = self._read_channels(composition, record_id_size)
+            channels.append(_Channel(
+                blocks.read_text(data, name_link, path), record_id_size + byte_offset, bit_count, data_type,
+                bit_offset, channel_type, sync_type, flags, blocks.read_text(data, unit_link, path),
+                self._read_conversion(conversion_link), children))
+            offset = next_channel
+        return channels
+
+    def _read_conversion(self, offset):
+        # type: (int) -> typing.Optional[typing.Tuple[float, float]]
+        if not offset:
+            return None
+        _, _, data_offset, _ = blocks.read_block(self._map, offset, self.path)
+        conversion_type, _, _, _, value_count, _, _ = blocks.CC_DATA.unpack_from(self._map, data_offset)
+        if conversion_type != blocks.CC_LINEAR or value_count < 2:
+            return None
+        return struct.unpack_from('<2d', self._map, data_offset + blocks.CC_DATA.size)
+
+    def _data_blocks(self, offset):
+        # type: (int) -> typing.Iterator[bytes]
+        """Yield the original data of the data blocks linked from ``offset``."""
+        data = self._map
+        path = self.path
+        while offset:
+            block_id, links, data_offset, length = blocks.read_block(data, offset, path)
+            if block_id == b'##DT':
+                yield bytes(data[data_offset:data_offset + length])
+                return
+            if block_id == b'##DZ':
+                original_type, zip_type, parameter, original_length, stored_length = blocks.DZ_DATA.unpack_from(
+                    data, data_offset)
+                if original_type != b'DT':
+                    raise blocks.bad_file(path, 'compressed block at {} is not data'.format(offset))
+                start = data_offset + blocks.DZ_DATA.size
+                yield blocks.decompress(zip_type, parameter, data[start:start + stored_length], original_length, path)
+                return
+            if block_id == b'##HL':
+                offset = links[0]
+            elif block_id == b'##DL':
+                for link in links[1:]:
+                    for block_data in self._data_blocks(link):
+                        yield block_data
+                offset = links[0]
+            else:
+                raise blocks.bad_file(path, 'data block at {} is {!r}'.format(offset, block_id))
+
+    def _records(self, group):
+        # type: (_ReadGroup) -> typing.Iterator[typing.Tuple[bytes, int]]
+        """Yield buffers of whole records of a group, with the number of records in each."""
+        size = group.record_size
+        remaining = group.num_records
+        carry = b''
+        for block_data in self._data_blocks(group.data_link):
+            buffer = carry + block_data if carry else block_data
+            count = min(len(buffer) // size, remaining)
+            if count:
+                yield buffer[:count * size], count
+                remaining -= count
+            carry = buffer[count * size:]
+            if not remaining:
+                return
+
+    def _timestamps(self, group, records, count):
+        # type: (_ReadGroup, bytes, int) -> typing.Any
+        master = group.master()
+        if master is None:
+            raise blocks.bad_file(self.path, 'channel group {} has no time channel'.format(group.name))
+        seconds = _values(records, count, group.record_size, master)
+        if numpy is not None:
+            return numpy.rint(numpy.asarray(seconds, numpy.float64) * 1e7).astype(numpy.int64) + self.start_timestamp
+        return [int(round(value * 1e7)) + self.start_timestamp for value in seconds]
+
+    def _group_frames(self, group, index, bus_channels):
+        # type: (_ReadGroup, int, typing.Optional[typing.Set[int]]) -> typing.Iterator[typing.Tuple[int, int, int, types.RawFrame]]  # NOQA: E501
+        prefix = next(
+            (channel.name for channel in group.channels
+             if channel.name in (_CAN_DATA_FRAME, _CAN_REMOTE_FRAME, _LIN_FRAME)),
+            None)
+        if prefix is None:
+            return
+        members = dict(
+            (member.name[len(prefix) + 1:], member)
+            for member in group.find(prefix).walk() if member.name.startswith(prefix + u'.'))
+        position = 0
+        for records, count in self._records(group):
+            timestamps = self._timestamps(group, records, count)
+            if numpy is not None:
+                timestamps = timestamps.tolist()
+            fields = {}
+            for field in ('BusChannel', 'ID', 'IDE', 'DLC', 'DataLength', 'Dir', 'EDL', 'BRS', 'DataBytes'):
+                member = members.get(field)
+                if member is None:
+                    fields[field] = itertools.repeat(0)
+                else:
+                    values = _values(records, count, group.record_size, member)
+                    fields[field] = values.tolist() if numpy is not None and hasattr(values, 'tolist') else values
+            rows = zip(
+                timestamps, fields['BusChannel'], fields['ID'], fields['IDE'], fields['DLC'], fields['DataLength'],
+                fields['Dir'], fields['EDL'], fields['BRS'],
+                fields['DataBytes'] if 'DataBytes' in members else itertools.repeat(b''))
+            for timestamp, channel, identifier, extended, dlc, length, direction, fd, brs, payload in rows:
+                position += 1
+                if bus_channels is not None and channel not in bus_channels:
+                    continue
+                flags = _cconsts.NX_FRAME_FLAGS_TRANSMIT_ECHO if direction else 0
+                if prefix == _LIN_FRAME:
+                    frame = types.RawFrame(
+                        timestamp, identifier, constants.FrameType.LIN_DATA, flags, 0, payload[:length])
+                else:
+                    if 'DataLength' not in members:
+                        length = _vector.fd_length(dlc) if fd else min(dlc, 8)
+                    frame = _vector.can_frame(
+                        timestamp, identifier, bool(extended), bool(fd), bool(brs), prefix == _CAN_REMOTE_FRAME,
+                        bool(direction), payload[:length])
+                yield timestamp, index, position, frame
+
+    def frames(self, bus_channels=None):
+        # type: (typing.Optional[typing.Iterable[int]]) -> typing.Iterator[types.RawFrame]
+        """Yield the frames of the bus logging groups as :any:`nixnet.types.RawFrame` objects, in timestamp order.
+
+        Args:
+            bus_channels(list of int): ``BusChannel`` values to read, or ``None`` for all.
+        """
+        wanted = None if bus_channels is None else set(bus_channels)
+        streams = [
+            self._group_frames(group, index, wanted)
+            for index, group in enumerate(self._groups) if group.bus_type is not None]
+        for _, _, _, frame in heapq.merge(*streams):
+            yield frame
+
+    def read_bytes(self, bus_channels=None, frames_per_buffer=4096):
+        # type: (typing.Optional[typing.Iterable[int]], int) -> typing.Iterator[bytes]
+        """Yield the frames of :any:`MdfReader.frames` in the raw frame format, ``frames_per_buffer`` at a time."""
+        frames = self.frames(bus_channels)
+        while True:
+            units = list(itertools.chain.from_iterable(
+                _frames.serialize_frame(frame) for frame in itertools.islice(frames, frames_per_buffer)))
+            if not units:
+                return
+            yield b''.join(units)
+
+    def signals(self, group):
+        # type: (typing.Text) -> typing.Tuple[typing.Any, typing.Dict[typing.Text, typing.Any]]
+        """Return the timestamps and the values of every channel of a channel group.
+
+        Timestamps are XNET timestamps, in 100 ns since 1601-01-01.
+        Values are NumPy arrays when NumPy is installed, and lists otherwise.
+
+        Args:
+            group(str): Name of the channel group.
+        """
+        found = next((candidate for candidate in self._groups if candidate.name == group), None)
+        if found is None:
+            raise KeyError(group)
+        channels = [
+            member for channel in found.channels for member in channel.walk()
+            if member.channel_type not in (blocks.CN_MASTER, blocks.CN_VIRTUAL_MASTER) and not member.children]
+        chunks = [(self._timestamps(found, records, count), [
+            _values(records, count, found.record_size, channel) for channel in channels])
+            for records, count in self._records(found)]
+        if numpy is not None:
+            timestamps = numpy.concatenate([chunk[0] for chunk in chunks]) if chunks else numpy.zeros(0, numpy.int64)
+            values = dict(
+                (channel.name, _concatenate([chunk[1][index] for chunk in chunks]))
+                for index, channel in enumerate(channels))
+        else:
+            timestamps = [value for chunk in chunks for value in chunk[0]]
+            values = dict(
+                (channel.name, [value for chunk in chunks for value in chunk[1][index]])
+                for index, channel in enumerate(channels))
+        return timestamps, values
+
+
+def _concatenate(arrays):
+    # type: (typing.List[typing.Any]) -> typing.Any
+    if arrays and isinstance(arrays[0], list):
+        return [value for array in arrays for value in array]
+    return numpy.concatenate(arrays) if arrays else numpy.zeros(0)
+
+
+_FLOAT_FORMATS = {
+    (blocks.CN_FLOAT_LE, 64): '<d',
+    (blocks.CN_FLOAT_LE, 32): '<f',
+    (blocks.CN_FLOAT_BE, 64): '>d',
+    (blocks.CN_FLOAT_BE, 32): '>f',
+}
+
+
+def _values(records, count, record_size, channel):
+    # type: (bytes, int, int, _Channel) -> typing.Any
+    """Return the values of a channel in ``count`` records.
+
+    Byte arrays and strings are lists of bytes.
+    Numbers are NumPy arrays when NumPy is installed, and lists otherwise.
+    """
+    start = channel.byte_offset
+    if channel.data_type > blocks.CN_FLOAT_BE:
+        size = channel.bit_count // 8
+        return [records[offset:offset + size] for offset in range(start, start + count * record_size, record_size)]
+
+    float_format = _FLOAT_FORMATS.get((channel.data_type, channel.bit_count))
+    if float_format is not None:
+        if numpy is not None:
+            values = numpy.ndarray((count,), float_format, records, start, (record_size,)).astype(numpy.float64)
+        else:
+            unpack_from = struct.Struct(float_format).unpack_from
+            values = [unpack_from(records, offset)[0]
+                      for offset in range(start, start + count * record_size, record_size)]
+    else:
+        size = (channel.bit_offset + channel.bit_count + 7) // 8
+        big_endian = channel.data_type in (blocks.CN_UINT_BE, blocks.CN_INT_BE)
+        mask = (1 << channel.bit_count) - 1
+        if numpy is not None:
+            raw = numpy.frombuffer(records, numpy.uint8, count * record_size).reshape(count, record_size)
+            padded = numpy.zeros((count, 8), numpy.uint8)
+            field = raw[:, start:start + size]
+            padded[:, :size] = field[:, ::-1] if big_endian else field
+            values = (padded.view('<u8').reshape(count) >> numpy.uint64(channel.bit_offset)) & numpy.uint64(mask)
+            if channel.data_type in (blocks.CN_INT_LE, blocks.CN_INT_BE):
+                values = values.astype(numpy.int64)
+                values[values >= 1 << (channel.bit_count - 1)] -= 1 << channel.bit_count
+            else:
+                values = values.astype(numpy.int64) if channel.bit_count < 64 else values
+        else:
+            values = []
+            for offset in range(start, start + count * record_size, record_size):
+                field = bytearray(records[offset:offset + size])
+                if big_endian:
+                    field.reverse()
+                value = struct.unpack('<Q', bytes(field + bytearray(8 - size)))[0] >> channel.bit_offset & mask
+                if channel.data_type in (blocks.CN_INT_LE, blocks.CN_INT_BE) and value >> (channel.bit_count - 1):
+                    value -= 1 << channel.bit_count
+                values.append(value)
+    if channel.conversion is not None:
+        offset, factor = channel.conversion
+        if numpy is not None:
+            values = offset + factor * numpy.asarray(values, numpy.float64)
+        else:
+            values = [offset + factor * value for value in values]
+    return values
@@ -0,0 +1,201 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import struct
+import typing  # NOQA: F401
+import zlib
+
+from nixnet import _cconsts
+from nixnet import errors
+
+
+FILE_ID = b'MDF     '
+UNFINISHED_FILE_ID = b'UnFinMF '
+VERSION = 410
+# File identifier, format version, program, reserved, version number, reserved,
+# standard and custom unfinalized flags.
+ID_BLOCK = struct.Struct('<8s8s8s4sH30sHH')
+
+# Identifier, reserved, block length and number of links.
+_HEADER = struct.Struct('<4s4xQQ')
+_LINK = struct.Struct('<Q')
+
+# Start time in ns since 1970, time zone and daylight saving offsets, time flags, time class, flags,
+# start angle and distance.
+HD_DATA = struct.Struct('<QhhBBBxdd')
+# Time in ns since 1970, time zone and daylight saving offsets, time flags.
+FH_DATA = struct.Struct('<QhhB3x')
+# Size of the record identifiers.
+DG_DATA = struct.Struct('<B7x')
+# Record identifier, number of records, flags, path separator, data bytes and invalidation bytes.
+CG_DATA = struct.Struct('<QQHH4xII')
+# Channel type, sync type, data type, bit offset, byte offset, bit count, flags, invalidation bit,
+# precision, attachment count, value range, limits and extended limits.
+CN_DATA = struct.Struct('<BBBBIIIIBxH6d')
+# Conversion type, precision, flags, number of references, number of values, physical range.
+CC_DATA = struct.Struct('<BBHHHdd')
+# Source type, bus type and flags.
+SI_DATA = struct.Struct('<BBB5x')
+# Flags and number of data blocks, followed by their offsets.
+DL_DATA = struct.Struct('<B3xI')
+# Original block type, compression, reserved, compression parameter, original and stored length.
+DZ_DATA = struct.Struct('<2sBxIQQ')
+# Flags and compression of the listed blocks.
+HL_DATA = struct.Struct('<HB5x')
+
+CG_FLAG_BUS_EVENT = 0x0002
+CG_FLAG_PLAIN_BUS_EVENT = 0x0004
+CN_FIXED = 0
+CN_VLSD = 1
+CN_MASTER = 2
+CN_VIRTUAL_MASTER = 3
+CN_SYNC_TIME = 1
+CN_FLAG_BUS_EVENT = 0x0400
+CN_UINT_LE = 0
+CN_UINT_BE = 1
+CN_INT_LE = 2
+CN_INT_BE = 3
+CN_FLOAT_LE = 4
+CN_FLOAT_BE = 5
+CN_STRING_UTF8 = 7
+CN_BYTE_ARRAY = 10
+CC_LINEAR = 1
+SI_BUS = 2
+SI_BUS_CAN = 2
+SI_BUS_LIN = 3
+DL_EQUAL_LENGTH = 0x01
+ZIP_DEFLATE = 0
+ZIP_TRANSPOSE_DEFLATE = 1
+
+#: Links in a data list block.
+DL_LINKS = 1024
+
+
+def bad_file(path, reason):
+    # type: (typing.Text, typing.Text) -> errors.XnetError
+    return errors.XnetError('{} is not a supported MDF file: {}'.format(path, reason), _cconsts.NX_ERR_FILE_EXTENSION)
+
+
+class Block(object):
+    """A block to lay out in a file.
+
+    Links are other blocks, or file offsets, where ``None`` and ``0`` are no link.
+    """
+
+    __slots__ = ['block_id', 'links', 'data', 'offset']
+
+    def __init__(self, block_id, links=(), data=b''):
+        # type: (bytes, typing.Iterable[typing.Any], bytes) -> None
+        self.block_id = block_id
+        self.links = list(links)
+        self.data = data
+        self.offset = 0
+
+    @property
+    def size(self):
+        # type: () -> int
+        """int: Returns the bytes of the block in the file, including the padding to 8 bytes."""
+        return block_size(len(self.links), len(self.data))
+
+    def pack(self):
+        # type: () -> bytes
+        links = [link.offset if isinstance(link, Block) else link or 0 for link in self.links]
+        return pack_block(self.block_id, links, self.data)
+
+
+def block_size(num_links, data_len):
+    # type: (int, int) -> int
+    """Return the bytes of a block in the file, including the padding to 8 bytes.
+
+    >>> block_size(0, 5)
+    32
+    """
+    size = _HEADER.size + num_links * _LINK.size + data_len
+    return size + -size % 8
+
+
+def pack_block(block_id, links, data):
+    # type: (bytes, typing.List[int], bytes) -> bytes
+    """Return a block with its header and its padding to 8 bytes.
+
+    The block length in the header doesn't include the padding.
+    """
+    length = _HEADER.size + len(links) * _LINK.size + len(data)
+    header = _HEADER.pack(block_id, length, len(links))
+    link_data = struct.pack('<{}Q'.format(len(links)), *links)
+    return b''.join((header, link_data, data, b'\0' * (-length % 8)))
+
+
+def layout(blocks, offset):
+    # type: (typing.List[Block], int) -> int
+    """Assign consecutive file offsets to blocks from ``offset``, and return the offset after them."""
+    for block in blocks:
+        block.offset = offset
+        offset += block.size
+    return offset
+
+
+def text_block(text, block_id=b'##TX'):
+    # type: (typing.Text, bytes) -> Block
+    return Block(block_id, data=text.encode('utf-8') + b'\0')
+
+
+def read_block(data, offset, path):
+    # type: (typing.Any, int, typing.Text) -> typing.Tuple[bytes, typing.Tuple[int, ...], int, int]
+    """Return the identifier, links, data offset and data length of the block at ``offset``."""
+    if offset + _HEADER.size > len(data):
+        raise bad_file(path, 'block at {} is outside the file'.format(offset))
+    block_id, length, num_links = _HEADER.unpack_from(data, offset)
+    data_offset = offset + _HEADER.size + num_links * _LINK.size
+    if block_id[:2] != b'##' or data_offset > offset + length or offset + length > len(data):
+        raise bad_file(path, 'block at {} is damaged'.format(offset))
+    links = struct.unpack_from('<{}Q'.format(num_links), data, offset + _HEADER.size)
+    return block_id, links, data_offset, offset + length - data_offset
+
+
+def read_text(data, offset, path):
+    # type: (typing.Any, int, typing.Text) -> typing.Text
+    """Return the text of a TX or MD block, or an empty string without a block."""
+    if not offset:
+        return u''
+    _, _, data_offset, length = read_block(data, offset, path)
+    return bytes(data[data_offset:data_offset + length]).split(b'\0', 1)[0].decode('utf-8')
+
+
+def compress(data, record_size, level=None):
+    # type: (bytes, int, typing.Optional[int]) -> typing.Tuple[int, int, bytes]
+    """Return the compression, compression parameter and data of a DZ block.
+
+    Records of more than one byte are transposed first,
+    so the same byte of every record is next to each other.
+    """
+    if record_size > 1 and len(data) >= record_size:
+        rows = len(data) // record_size
+        body = rows * record_size
+        transposed = b''.join(data[column:body:record_size] for column in range(record_size)) + data[body:]
+        return ZIP_TRANSPOSE_DEFLATE, record_size, zlib.compress(transposed, 6 if level is None else level)
+    return ZIP_DEFLATE, 0, zlib.compress(data, 6 if level is None else level)
+
+
+def decompress(zip_type, parameter, stored, original_length, path):
+    # type: (int, int, bytes, int, typing.Text) -> bytes
+    """Return the original data of a DZ block.
+
+    >>> zip_type, parameter, stored = compress(b'abcdefg', 3)
+    >>> decompress(zip_type, parameter, stored, 7, '') == b'abcdefg'
+    True
+    """
+    data = zlib.decompress(stored)
+    if len(data) != original_length:
+        raise bad_file(path, 'compressed block has {} bytes instead of {}'.format(len(data), original_length))
+    if zip_type == ZIP_DEFLATE:
+        return data
+    if zip_type != ZIP_TRANSPOSE_DEFLATE or not parameter:
+        raise bad_file(path, 'block compression {} is unknown'.format(zip_type))
+    rows = original_length // parameter
+    body = rows * parameter
+    records = bytearray(body)
+    for column in range(parameter):
+        records[column::parameter] = data[column * rows:(column + 1) * rows]
+    return bytes(records) + data[body:]
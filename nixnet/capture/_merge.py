@@ -0,0 +1,248 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import heapq
+import io
+import itertools
+import os
+import struct
+import typing  # NOQA: F401
+
+import six
+
+from nixnet import _frames
+from nixnet import types  # NOQA: F401
+
+from nixnet.capture import _asc
+from nixnet.capture import _blf
+from nixnet.capture import _format
+from nixnet.capture import _mdf
+from nixnet.capture import _mdf_blocks
+from nixnet.capture import _units
+
+try:
+    import numpy  # type: ignore
+except ImportError:
+    numpy = None
+
+
+_TIMESTAMP = struct.Struct('<Q')
+
+
+class CaptureMerger(object):
+    """Merge capture sources into one stream of frames in timestamp order.
+
+    Sources are read one buffer at a time, and a heap of the latest timestamp of every buffer
+    gives the frames that can be merged before another buffer has to be read.
+    Memory stays bounded by one buffer per source, however large the sources are.
+
+    Each source must be in timestamp order, as frames read from one interface are.
+    Frames with the same timestamp keep the order of their source.
+
+    >>> merger = CaptureMerger(['can1.nxcap', 'can2.nxcap', 'lin1.blf'])  # doctest: +SKIP
+    >>> merger.write('merged.nxcap', compression='zlib')  # doctest: +SKIP
+
+    Args:
+        sources(list): Sources of frames, each one of
+
+            - the path of a file written by :any:`CaptureWriter`, or of a BLF, MDF or ASC file;
+            - an object with a ``read_bytes`` method yielding raw frame buffers,
+              like :any:`CaptureReader`, :any:`BlfReader` or :any:`CaptureQuery`;
+            - an iterable of buffers in the raw frame format, like those from :any:`InFrames.read_bytes`.
+        frames_per_buffer(int): Frames read at a time from BLF, MDF and ASC files.
+    """
+
+    def __init__(self, sources, frames_per_buffer=4096):
+        # type: (typing.Iterable[typing.Any], int) -> None
+        if frames_per_buffer < 1:
+            raise ValueError('frames_per_buffer must be positive')
+        self.sources = list(sources)
+        self.frames_per_buffer = frames_per_buffer
+
+    def read_bytes(self):
+        # type: () -> typing.Iterator[bytes]
+        """Yield the merged frames in the raw frame format.
+
+        The buffers can be written to a :any:`CaptureWriter` or, for replay,
+        to a :any:`FrameOutStreamSession` with :any:`OutFrames.write_bytes`.
+        """
+        readers = []  # type: typing.List[typing.Any]
+        try:
+            cursors = []
+            for source in self.sources:
+                if isinstance(source, six.string_types):
+                    source = _open(source)
+                    readers.append(source)
+                cursor = _Cursor(_buffers(source, self.frames_per_buffer))
+                if cursor.fill():
+                    cursors.append(cursor)
+
+            heap = [(cursor.last, position) for position, cursor in enumerate(cursors)]
+            heapq.heapify(heap)
+            while heap:
+                # Frames up to the earliest end of a buffer can't be preceded by frames still unread.
+                # That buffer is taken whole, so a source out of order can't stall the merge.
+                bound, first = heap[0]
+                parts = []
+                for position, cursor in enumerate(cursors):
+                    part = cursor.take(None if position == first else bound)
+                    if part is not None:
+                        parts.append(part)
+                yield _merge(parts)
+                while heap and cursors[heap[0][1]].empty:
+                    cursor = cursors[heap[0][1]]
+                    if cursor.fill():
+                        heapq.heapreplace(heap, (cursor.last, heap[0][1]))
+                    else:
+                        heapq.heappop(heap)
+        finally:
+            for reader in readers:
+                reader.close()
+
+    def frames(self):
+        # type: () -> typing.Iterator[types.RawFrame]
+        """Yield the merged frames as :any:`nixnet.types.RawFrame` objects."""
+        for data in self.read_bytes():
+            for frame in _frames.iterate_frames(data):
+                yield frame
+
+    def write(self, path, block_size=_format.DEFAULT_BLOCK_SIZE, compression=None, compression_level=None):
+        # type: (typing.Text, int, typing.Optional[typing.Text], typing.Optional[int]) -> int
+        """Write the merged frames to a capture file, and return the number of frames.
+
+        The arguments after ``path`` are those of :any:`CaptureWriter`.
+        """
+        with _format.CaptureWriter(path, block_size, compression, compression_level) as writer:
+            for data in self.read_bytes():
+                writer.write_bytes(data)
+        return sum(block.num_frames for block in writer.blocks)
+
+
+def _open(path):
+    # type: (typing.Text) -> typing.Any
+    """Open a capture file with the reader matching its signature."""
+    with io.open(path, 'rb') as f:
+        magic = f.read(8)
+    if magic == _format._FILE_MAGIC:
+        return _format.CaptureReader(path)
+    if magic.startswith(_blf._FILE_MAGIC):
+        return _blf.BlfReader(path)
+    if magic in (_mdf_blocks.FILE_ID, _mdf_blocks.UNFINISHED_FILE_ID):
+        return _mdf.MdfReader(path)
+    if os.path.splitext(path)[1].lower() == '.asc':
+        return _asc.AscReader(path)
+    raise _format._bad_file(path)
+
+
+def _buffers(source, frames_per_buffer):
+    # type: (typing.Any, int) -> typing.Iterator[bytes]
+    read_bytes = getattr(source, 'read_bytes', None)
+    if read_bytes is None:
+        return iter(source)
+    if isinstance(source, (_blf.BlfReader, _asc.AscReader, _mdf.MdfReader)):
+        return read_bytes(frames_per_buffer=frames_per_buffer)
+    return read_bytes()
+
+
+class _Cursor(object):
+    """Frames of the buffer being merged from a source."""
+
+    def __init__(self, buffers):
+        # type: (typing.Iterator[bytes]) -> None
+        self._buffers = buffers
+        self.data = b''
+        self.offsets = []  # type: typing.Any
+        self.timestamps = []  # type: typing.Any
+        self.position = 0
+
+    @property
+    def empty(self):
+        # type: () -> bool
+        return self.position == len(self.timestamps)
+
+    @property
+    def last(self):
+        # type: () -> int
+        return int(self.timestamps[-1])
+
+    def fill(self):
+        # type: () -> bool
+        """Read the next buffer with frames, and return ``False`` at the end of the source."""
+        for data in self._buffers:
+            if not data:
+                continue
+            self.data = data
+            self.position = 0
+            if numpy is not None:
+                units = _units.fixed_units(data)
+                if units is not None:
+                    self.offsets = numpy.arange(0, len(data) + 1, _units.UNIT_SIZE, dtype=numpy.int64)
+                else:
+                    offsets = _units.frame_offsets(data)
+                    units = _units.units(data, offsets)
+                    self.offsets = numpy.array(offsets + [len(data)], numpy.int64)
+                self.timestamps = units['timestamp'].copy()
+            else:
+                offsets = _units.frame_offsets(data)
+                self.offsets = offsets + [len(data)]
+                self.timestamps = [_TIMESTAMP.unpack_from(data, offset)[0] for offset in offsets]
+            return True
+        return False
+
+    def take(self, bound):
+        # type: (typing.Optional[int]) -> typing.Optional[typing.Tuple[bytes, typing.Any, typing.Any]]
+        """Consume the frames up to the first one after ``bound``, or all of them when ``bound`` is ``None``.
+
+        Return their bytes, their offsets in those bytes followed by the end, and their timestamps,
+        or ``None`` when there are none.
+        """
+        start = self.position
+        timestamps = self.timestamps
+        if start == len(timestamps) or bound is not None and timestamps[start] > bound:
+            return None
+        if bound is None:
+            stop = len(timestamps)
+        elif numpy is not None:
+            after = numpy.flatnonzero(timestamps[start:] > bound)
+            stop = start + int(after[0]) if len(after) else len(timestamps)
+        else:
+            stop = start
+            while stop < len(timestamps) and timestamps[stop] <= bound:
+                stop += 1
+        self.position = stop
+        begin = self.offsets[start]
+        offsets = self.offsets[start:stop + 1]
+        if numpy is not None:
+            offsets = offsets - begin
+        else:
+            offsets = [offset - begin for offset in offsets]
+        return bytes(self.data[begin:self.offsets[stop]]), offsets, timestamps[start:stop]
+
+
+def _merge(parts):
+    # type: (typing.List[typing.Tuple[bytes, typing.Any, typing.Any]]) -> bytes
+    """Return the frames of sorted parts in timestamp order, keeping the order of the parts for equal timestamps."""
+    if len(parts) < 2:
+        return parts[0][0] if parts else b''
+    if numpy is None:
+        runs = [
+            six.moves.zip(timestamps, itertools.repeat(part), itertools.count())
+            for part, (_, _, timestamps) in enumerate(parts)]
+        return b''.join(
+            parts[part][0][parts[part][1][position]:parts[part][1][position + 1]]
+            for _, part, position in heapq.merge(*runs))
+
+    data = b''.join(part[0] for part in parts)
+    bases = numpy.cumsum([0] + [len(part[0]) for part in parts[:-1]])
+    starts = numpy.concatenate([offsets[:-1] + base for (_, offsets, _), base in zip(parts, bases)])
+    sizes = numpy.concatenate([numpy.diff(offsets) for _, offsets, _ in parts])
+    order = numpy.argsort(numpy.concatenate([timestamps for _, _, timestamps in parts]), kind='mergesort')
+    if (sizes == _units.UNIT_SIZE).all():
+        return numpy.frombuffer(data, _units.UNIT_DTYPE)[order].tobytes()
+    starts = starts[order]
+    sizes = sizes[order]
+    # Gather the bytes of every frame in order: each output byte comes from its frame start plus its position.
+    shifts = numpy.repeat(starts - (numpy.cumsum(sizes) - sizes), sizes)
+    gather = numpy.arange(len(data), dtype=numpy.int64) + shifts
+    return numpy.frombuffer(data, numpy.uint8)[gather].tobytes()
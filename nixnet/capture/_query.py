@@ -0,0 +1,296 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+import multiprocessing
+import operator
+import struct
+import typing  # NOQA: F401
+
+import six
+
+from nixnet import _cconsts
+from nixnet import _frames
+from nixnet import types  # NOQA: F401
+
+from nixnet.capture import _format
+from nixnet.capture import _units
+
+try:
+    import numpy  # type: ignore
+except ImportError:
+    numpy = None
+
+try:
+    import pandas  # type: ignore
+except ImportError:
+    pandas = None
+
+
+# Timestamp, identifier, type, flags, info and payload length of a base unit.
+_UNIT_FIELDS = struct.Struct('<QIBBBB')
+_PAYLOAD_OFFSET = _units.UNIT_SIZE - _frames.MAX_BASE_UNIT_PAYLOAD_LENGTH
+# J1939 payloads have 12 bits of length.
+_MAX_PAYLOAD_LENGTH = 1 << 12
+
+
+def _any_bits(payload_byte, value):
+    return payload_byte & value != 0
+
+
+_OPERATORS = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    '&': _any_bits,
+}
+
+PayloadCondition_ = collections.namedtuple(
+    'PayloadCondition_',
+    ['index', 'operator', 'value'])
+
+
+class PayloadCondition(PayloadCondition_):
+    """Comparison of a payload byte with a value.
+
+    Frames with a payload too short to have the byte do not match.
+
+    Attributes:
+        index(int): Index of the payload byte.
+        operator(str): ``'=='``, ``'!='``, ``'<'``, ``'<='``, ``'>'`` or ``'>='``,
+            or ``'&'`` to match when the byte has any of the bits of ``value`` set.
+        value(int): Value compared with the byte, from 0 to 0xFF.
+    """
+
+    def matches(self, payload):
+        # type: (bytes) -> bool
+        """Return whether a payload matches the condition.
+
+        >>> PayloadCondition(3, '>', 0x80).matches(b'\\x00\\x00\\x00\\x81')
+        True
+        >>> PayloadCondition(3, '>', 0x80).matches(b'\\xff')
+        False
+        """
+        if len(payload) <= self.index:
+            return False
+        return bool(_OPERATORS[self.operator](bytearray(payload)[self.index], self.value))
+
+
+_Predicate = collections.namedtuple(
+    '_Predicate',
+    ['start', 'stop', 'identifiers', 'frame_types', 'payload'])
+
+
+class CaptureQuery(object):
+    """Select frames from capture files.
+
+    The time range, identifiers and frame types are first checked against the block index of every file,
+    so blocks without matching frames are neither read nor decompressed.
+    The frames of the remaining blocks are then checked with NumPy when it is installed,
+    including the payload conditions.
+
+    Frames are returned in the order of ``paths``, then in file order.
+
+    >>> query = CaptureQuery(['monday.nxcap'], identifiers=[0x18FEF100],
+    ...                      payload=[PayloadCondition(3, '>', 0x80)])  # doctest: +SKIP
+    >>> frames = query.dataframe()  # doctest: +SKIP
+
+    Args:
+        paths(list of str): Paths of capture files written by :any:`CaptureWriter`.
+        start(int): Earliest timestamp, or ``None``.
+        stop(int): Timestamp after the latest one, or ``None``.
+        identifiers(list): Raw identifiers to keep, or ``None`` for all.
+        frame_types(list of :any:`nixnet._enums.FrameType`): Frame types to keep, or ``None`` for all.
+        payload(list of :any:`PayloadCondition`): Conditions every selected payload matches.
+            ``(index, operator, value)`` tuples are accepted too.
+        processes(int): Read and select blocks in a pool of this many processes,
+            ``0`` for one per CPU, or ``None`` to do it in the calling thread.
+    """
+
+    def __init__(
+            self,
+            paths,
+            start=None,
+            stop=None,
+            identifiers=None,
+            frame_types=None,
+            payload=None,
+            processes=None):
+        # type: (typing.Union[typing.Text, typing.Iterable[typing.Text]], typing.Optional[int], typing.Optional[int], typing.Optional[typing.Iterable[typing.Any]], typing.Optional[typing.Iterable[typing.Any]], typing.Optional[typing.Iterable[typing.Any]], typing.Optional[int]) -> None  # NOQA: E501
+        if isinstance(paths, six.string_types):
+            paths = [paths]
+        conditions = tuple(PayloadCondition(*condition) for condition in payload or ())
+        for condition in conditions:
+            if condition.operator not in _OPERATORS:
+                raise ValueError('Unknown payload operator {!r}'.format(condition.operator))
+            if not 0 <= condition.index < _MAX_PAYLOAD_LENGTH:
+                raise ValueError('Payload index {} is out of range'.format(condition.index))
+            if not 0 <= condition.value <= 0xFF:
+                raise ValueError('Payload value {} is not a byte value'.format(condition.value))
+        if identifiers is not None:
+            identifiers = frozenset(_format._raw_identifier(identifier) for identifier in identifiers)
+        if frame_types is not None:
+            frame_types = frozenset(_format._raw_type(frame_type) for frame_type in frame_types)
+        self.paths = list(paths)
+        self.processes = processes
+        self._predicate = _Predicate(start, stop, identifiers, frame_types, conditions)
+
+    def select_blocks(self):
+        # type: () -> typing.List[typing.Tuple[typing.Text, _format.CaptureBlock]]
+        """Return the path and index entry of the blocks that may have selected frames."""
+        predicate = self._predicate
+        selected = []
+        for path in self.paths:
+            with _format.CaptureReader(path) as reader:
+                blocks = reader.select_blocks(
+                    predicate.start, predicate.stop, predicate.identifiers, predicate.frame_types)
+            selected.extend((path, block) for block in blocks)
+        return selected
+
+    def read_bytes(self):
+        # type: () -> typing.Iterator[bytes]
+        """Yield the selected frames in the raw frame format, one buffer per block with selected frames."""
+        tasks = [(path, block, self._predicate) for path, block in self.select_blocks()]
+        if self.processes is None or len(tasks) < 2:
+            for selected in map(_query_block, tasks):
+                if selected:
+                    yield selected
+            return
+
+        pool = multiprocessing.Pool(self.processes or None)
+        try:
+            for selected in pool.imap(_query_block, tasks):
+                if selected:
+                    yield selected
+            pool.close()
+        finally:
+            pool.terminate()
+            pool.join()
+
+    def frames(self):
+        # type: () -> typing.Iterator[types.RawFrame]
+        """Yield the selected frames as :any:`nixnet.types.RawFrame` objects."""
+        for data in self.read_bytes():
+            for frame in _frames.iterate_frames(data):
+                yield frame
+
+    def dataframe(self):
+        # type: () -> typing.Any
+        """Return the selected frames as a pandas ``DataFrame``.
+
+        The columns are ``timestamp``, ``identifier``, ``type``, ``flags`` and ``info``,
+        and ``payload``, which holds the payloads as ``bytes``. Requires NumPy and pandas.
+        """
+        if numpy is None or pandas is None:
+            raise ImportError('CaptureQuery.dataframe requires NumPy and pandas')
+        names = ['timestamp', 'identifier', 'type', 'flags', 'info']
+        columns = dict((name, []) for name in names + ['payload'])  # type: typing.Dict[typing.Text, typing.List[typing.Any]]  # NOQA: E501
+        for data in self.read_bytes():
+            units = _units.fixed_units(data)
+            if units is not None:
+                offsets = list(range(0, len(data), _units.UNIT_SIZE))
+            else:
+                offsets = _units.frame_offsets(data)
+                units = _units.units(data, offsets)
+            for name in names:
+                columns[name].append(units[name])
+            lengths = _payload_lengths(units).tolist()
+            columns['payload'].append([
+                bytes(data[offset + _PAYLOAD_OFFSET:offset + _PAYLOAD_OFFSET + length])
+                for offset, length in zip(offsets, lengths)])
+
+        frame = pandas.DataFrame(dict(
+            (name, numpy.concatenate(columns[name]) if columns[name] else numpy.zeros(0, _units.UNIT_DTYPE[name]))
+            for name in names))
+        frame['payload'] = pandas.Series(
+            [payload for payloads in columns['payload'] for payload in payloads], dtype=object)
+        return frame
+
+
+def _query_block(task):
+    # type: (typing.Tuple[typing.Text, _format.CaptureBlock, _Predicate]) -> bytes
+    """Read, decode and select the frames of a block, in a pool process or the calling thread."""
+    path, block, predicate = task
+    return _select(block, _format._read_decoded(path, block), predicate)
+
+
+def _select(block, data, predicate):
+    # type: (_format.CaptureBlock, bytes, _Predicate) -> bytes
+    """Return the frames of a decoded block that match the predicate."""
+    if numpy is None:
+        return _select_python(data, predicate)
+
+    fixed = block.flags & _format.BLOCK_FIXED_UNITS
+    offsets = None if fixed else _units.frame_offsets(data)
+    units = _units.units(data, offsets)
+    mask = _format._mask(units, predicate.start, predicate.stop, predicate.identifiers)
+    if predicate.frame_types is not None:
+        wanted = numpy.isin(units['type'], numpy.array(sorted(predicate.frame_types), numpy.uint8))
+        mask = wanted if mask is None else mask & wanted
+    if predicate.payload:
+        lengths = _payload_lengths(units)
+        raw = numpy.frombuffer(data, numpy.uint8)
+        for condition in predicate.payload:
+            matches = _payload_mask(raw, units, offsets, lengths, condition)
+            mask = matches if mask is None else mask & matches
+    if mask is None:
+        return data
+    if fixed:
+        return units[mask].tobytes()
+    return _units.select(data, offsets, numpy.flatnonzero(mask).tolist())
+
+
+def _payload_lengths(units):
+    # type: (typing.Any) -> typing.Any
+    """Return the payload length of every base unit, including the high bits of J1939 lengths."""
+    lengths = units['payload_length'].astype(numpy.int64)
+    j1939 = units['type'] == _cconsts.NX_FRAME_TYPE_J1939_DATA
+    if j1939.any():
+        high = units['info'].astype(numpy.int64) & _cconsts.NX_FRAME_PAYLD_LEN_HIGH_MASK_J1939
+        lengths[j1939] |= high[j1939] << 8
+    return lengths
+
+
+def _payload_mask(raw, units, offsets, lengths, condition):
+    # type: (typing.Any, typing.Any, typing.Optional[typing.List[int]], typing.Any, PayloadCondition) -> typing.Any
+    """Return the mask of frames whose payload matches a condition."""
+    present = lengths > condition.index
+    if condition.index < _frames.MAX_BASE_UNIT_PAYLOAD_LENGTH:
+        values = units['payload'][:, condition.index]
+    elif offsets is None:
+        # Single base units have no byte past the base unit payload.
+        return numpy.zeros(len(units), bool)
+    else:
+        positions = numpy.asarray(offsets, numpy.int64) + (_PAYLOAD_OFFSET + condition.index)
+        values = raw[numpy.where(present, positions, 0)]
+    return present & _OPERATORS[condition.operator](values, condition.value)
+
+
+def _select_python(data, predicate):
+    # type: (bytes, _Predicate) -> bytes
+    offsets = _units.frame_offsets(data)
+    indexes = []
+    for index, offset in enumerate(offsets):
+        timestamp, identifier, frame_type, _, info, payload_length = _UNIT_FIELDS.unpack_from(data, offset)
+        if predicate.start is not None and timestamp < predicate.start:
+            continue
+        if predicate.stop is not None and timestamp >= predicate.stop:
+            continue
+        if predicate.identifiers is not None and identifier not in predicate.identifiers:
+            continue
+        if predicate.frame_types is not None and frame_type not in predicate.frame_types:
+            continue
+        if predicate.payload:
+            if frame_type == _cconsts.NX_FRAME_TYPE_J1939_DATA:
+                payload_length |= (info & _cconsts.NX_FRAME_PAYLD_LEN_HIGH_MASK_J1939) << 8
+            payload = data[offset + _PAYLOAD_OFFSET:offset + _PAYLOAD_OFFSET + payload_length]
+            if not all(condition.matches(payload) for condition in predicate.payload):
+                continue
+        indexes.append(index)
+    if len(indexes) == len(offsets):
+        return data
+    return _units.select(data, offsets, indexes)
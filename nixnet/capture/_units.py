@@ -0,0 +1,142 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import struct
+import typing  # NOQA: F401
+
+from nixnet import _cconsts
+from nixnet import _errors
+from nixnet import _frames
+
+try:
+    import numpy  # type: ignore
+except ImportError:
+    numpy = None
+
+
+UNIT_SIZE = _frames.nxFrameFixed_t.size
+
+# Type, flags, info and payload length of a base unit.
+_TAIL = struct.Struct('<BBBB')
+_TAIL_OFFSET = 12
+
+if numpy is not None:
+    #: NumPy dtype of an ``nxFrameFixed_t`` base unit.
+    UNIT_DTYPE = numpy.dtype([
+        ('timestamp', '<u8'),
+        ('identifier', '<u4'),
+        ('type', 'u1'),
+        ('flags', 'u1'),
+        ('info', 'u1'),
+        ('payload_length', 'u1'),
+        ('payload', 'u1', (8,))])
+else:
+    UNIT_DTYPE = None
+
+
+def frame_size(frame_type, info, payload_length):
+    # type: (int, int, int) -> int
+    """Return the bytes of a frame in the raw frame format, from the fields of its base unit.
+
+    >>> frame_size(_cconsts.NX_FRAME_TYPE_CAN_DATA, 0, 8)
+    24
+    >>> frame_size(_cconsts.NX_FRAME_TYPE_CANFD_DATA, 0, 64)
+    80
+    """
+    if frame_type == _cconsts.NX_FRAME_TYPE_J1939_DATA:
+        payload_length |= (info & _cconsts.NX_FRAME_PAYLD_LEN_HIGH_MASK_J1939) << 8
+    return UNIT_SIZE - _frames.MAX_BASE_UNIT_PAYLOAD_LENGTH + _frames._calculate_payload_size(payload_length)
+
+
+def frame_offsets(data):
+    # type: (typing.Any) -> typing.List[int]
+    """Return the byte offset of every frame in a raw frame buffer.
+
+    >>> data = _frames.nxFrameFixed_t.pack(0, 1, 0, 0, 0, 2, b'ab') * 2
+    >>> frame_offsets(data)
+    [0, 24]
+    """
+    offsets = []
+    position = 0
+    end = len(data)
+    unpack_from = _TAIL.unpack_from
+    while position < end:
+        if end - position < UNIT_SIZE:
+            _errors.check_for_error(_cconsts.NX_ERR_INTERNAL_ERROR)
+        offsets.append(position)
+        frame_type, _, info, payload_length = unpack_from(data, position + _TAIL_OFFSET)
+        if payload_length <= _frames.MAX_BASE_UNIT_PAYLOAD_LENGTH and frame_type != _cconsts.NX_FRAME_TYPE_J1939_DATA:
+            position += UNIT_SIZE
+        else:
+            position += frame_size(frame_type, info, payload_length)
+    if position != end:
+        _errors.check_for_error(_cconsts.NX_ERR_INTERNAL_ERROR)
+    return offsets
+
+
+def fixed_units(data):
+    # type: (typing.Any) -> typing.Optional[typing.Any]
+    """Return the frames of a raw frame buffer as a NumPy array of base units without copying,
+    or ``None`` when some frame has a payload unit or NumPy is not installed.
+    """
+    if numpy is None or len(data) % UNIT_SIZE:
+        return None
+    units = numpy.frombuffer(data, UNIT_DTYPE)
+    long_payloads = units['payload_length'] > _frames.MAX_BASE_UNIT_PAYLOAD_LENGTH
+    j1939 = units['type'] == _cconsts.NX_FRAME_TYPE_J1939_DATA
+    if long_payloads.any() or j1939.any():
+        return None
+    return units
+
+
+def units(data, offsets=None):
+    # type: (typing.Any, typing.Optional[typing.List[int]]) -> typing.Any
+    """Return the base units of the frames in a raw frame buffer as a NumPy array.
+
+    The array views ``data`` when every frame is a single base unit, and copies the base units otherwise.
+    Requires NumPy.
+    """
+    fixed = fixed_units(data) if offsets is None else None
+    if fixed is not None:
+        return fixed
+    if offsets is None:
+        offsets = frame_offsets(data)
+    raw = numpy.frombuffer(data, numpy.uint8)
+    gather = numpy.asarray(offsets, numpy.int64)[:, None] + numpy.arange(UNIT_SIZE)
+    return numpy.ascontiguousarray(raw[gather]).view(UNIT_DTYPE).reshape(-1)
+
+
+def select(data, offsets, indexes):
+    # type: (typing.Any, typing.List[int], typing.Iterable[int]) -> bytes
+    """Return the frames at ``indexes`` of a raw frame buffer as a new raw frame buffer."""
+    end = len(data)
+    count = len(offsets)
+    return b''.join(
+        bytes(data[offsets[index]:offsets[index + 1] if index + 1 < count else end])
+        for index in indexes)
+
+
+def block_end(data, start, size):
+    # type: (bytes, int, int) -> int
+    """Return the end of the whole frames from ``start`` that fit in ``size`` bytes.
+
+    A frame larger than ``size`` ends the block on its own.
+
+    >>> data = _frames.nxFrameFixed_t.pack(0, 1, 0, 0, 0, 2, b'ab') * 3
+    >>> block_end(data, 0, 50), block_end(data, 24, 10)
+    (48, 48)
+    """
+    end = min(len(data), start + size)
+    fixed_end = start + (end - start) // UNIT_SIZE * UNIT_SIZE
+    if fixed_end > start and fixed_units(data[start:fixed_end]) is not None:
+        return fixed_end
+    position = start
+    unpack_from = _TAIL.unpack_from
+    while position < len(data):
+        frame_type, _, info, payload_length = unpack_from(data, position + _TAIL_OFFSET)
+        next_position = position + frame_size(frame_type, info, payload_length)
+        if next_position > end and position > start:
+            break
+        position = next_position
+    return position
@@ -0,0 +1,142 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import datetime
+import itertools
+import typing  # NOQA: F401
+
+from nixnet import _cconsts
+from nixnet import _frames
+from nixnet import constants
+from nixnet import types  # NOQA: F401
+
+
+#: Start of the XNET timestamp epoch.
+XNET_EPOCH = datetime.datetime(1601, 1, 1)
+#: XNET timestamp ticks per second.
+TICKS_PER_SECOND = 10 ** 7
+
+# DLC to payload length of CAN FD frames.
+_FD_LENGTHS = [0, 1, 2, 3, 4, 5, 6, 7, 8, 12, 16, 20, 24, 32, 48, 64]
+
+
+def xnet_timestamp(moment):
+    # type: (datetime.datetime) -> int
+    """Return the XNET timestamp, in 100 ns since 1601-01-01, of a naive UTC ``datetime``.
+
+    >>> xnet_timestamp(datetime.datetime(1970, 1, 1))
+    116444736000000000
+    """
+    delta = moment - XNET_EPOCH
+    return (delta.days * 86400 + delta.seconds) * TICKS_PER_SECOND + delta.microseconds * 10
+
+
+def fd_length(dlc):
+    # type: (int) -> int
+    """Return the payload length of a CAN FD frame with a DLC.
+
+    >>> fd_length(8), fd_length(13)
+    (8, 32)
+    """
+    return _FD_LENGTHS[min(dlc, 15)]
+
+
+def can_frame(timestamp, identifier, extended, fd, brs, remote, transmitted, payload):
+    # type: (int, int, bool, bool, bool, bool, bool, bytes) -> types.RawFrame
+    """Return the :any:`nixnet.types.RawFrame` of a CAN frame in a log.
+
+    Frames transmitted by the logging interface are marked as echoes, as XNET reads them.
+
+    >>> can_frame(10, 0x123, True, False, False, False, True, b'')
+    RawFrame(timestamp=0xa, identifier=0x20000123, type=FrameType.CAN_DATA, flags=0x80)
+    """
+    if extended:
+        identifier |= _cconsts.NX_FRAME_ID_CAN_IS_EXTENDED
+    if remote:
+        frame_type = constants.FrameType.CAN_REMOTE
+        payload = b''
+    elif brs:
+        frame_type = constants.FrameType.CANFDBRS_DATA
+    elif fd:
+        frame_type = constants.FrameType.CANFD_DATA
+    else:
+        frame_type = constants.FrameType.CAN_DATA
+    flags = _cconsts.NX_FRAME_FLAGS_TRANSMIT_ECHO if transmitted else 0
+    return types.RawFrame(timestamp, identifier, frame_type, flags, 0, payload)
+
+
+class VectorLogReader(object):
+    """Base of the readers of Vector logs.
+
+    Subclasses yield the CAN frames of the log from ``_read``, with the channel of every frame.
+    """
+
+    def __init__(self, path, channels=None, start_timestamp=None):
+        # type: (typing.Text, typing.Optional[typing.Iterable[int]], typing.Optional[int]) -> None
+        self.path = path
+        self._channels = None if channels is None else set(channels)
+        self._start_timestamp = start_timestamp
+        self._file = None  # type: typing.Any
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        self.close()
+
+    def close(self):
+        # type: () -> None
+        """Close the log."""
+        if self._file is not None:
+            self._file.close()
+
+    @property
+    def start_timestamp(self):
+        # type: () -> int
+        """int: Returns the XNET timestamp of the start of the log, which frame times are added to.
+
+        It is the ``start_timestamp`` argument, or else the start recorded in the log,
+        read as UTC because logs don't record the time zone, or else ``0``.
+        """
+        if self._start_timestamp is not None:
+            return self._start_timestamp
+        start = self._log_start()
+        return 0 if start is None else xnet_timestamp(start)
+
+    def frames(self):
+        # type: () -> typing.Iterator[types.RawFrame]
+        """Yield the CAN frames of the log as :any:`nixnet.types.RawFrame` objects.
+
+        Frames of other buses, error frames and events are skipped,
+        and so are the frames of other channels when ``channels`` is given.
+        """
+        start = self.start_timestamp
+        channels = self._channels
+        for channel, frame in self._read():
+            if channels is None or channel in channels:
+                frame.timestamp += start
+                yield frame
+
+    def read_bytes(self, frames_per_buffer=4096):
+        # type: (int) -> typing.Iterator[bytes]
+        """Yield the frames of :any:`frames` in the raw frame format, ``frames_per_buffer`` at a time.
+
+        The buffers can be written to a :any:`CaptureWriter` or, for replay,
+        to a :any:`FrameOutStreamSession` with :any:`OutFrames.write_bytes`.
+        """
+        frames = self.frames()
+        while True:
+            units = list(itertools.chain.from_iterable(
+                _frames.serialize_frame(frame) for frame in itertools.islice(frames, frames_per_buffer)))
+            if not units:
+                return
+            yield b''.join(units)
+
+    def _log_start(self):
+        # type: () -> typing.Optional[datetime.datetime]
+        raise NotImplementedError()
+
+    def _read(self):
+        # type: () -> typing.Iterator[typing.Tuple[int, types.RawFrame]]
+        raise NotImplementedError()
@@ -0,0 +1,206 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+import time
+import timeit
+import typing  # NOQA: F401
+
+from nixnet import _frames
+from nixnet import _scheduler
+from nixnet import types  # NOQA: F401
+
+__all__ = [
+    'CyclicTransmitter']
+
+
+class _Entry(object):
+    """A frame in the transmit table, serialized once per payload."""
+
+    __slots__ = ['frame', 'period', 'offset', 'data', 'recorder']
+
+    def __init__(self, frame, period, offset):
+        # type: (typing.Any, float, float) -> None
+        self.frame = frame
+        self.period = period
+        self.offset = offset
+        self.recorder = _scheduler.JitterRecorder()
+        self.serialize()
+
+    def serialize(self):
+        # type: () -> None
+        self.data = b''.join(_frames.serialize_frame(self.frame.to_raw()))
+
+
+class CyclicTransmitter(object):
+    """Write frames periodically from software, with one driver write per tick.
+
+    The transmit table holds a frame value, a period and an offset for each key.
+    A deadline scheduler releases the frames that are due,
+    and all of them are written with a single ``write_bytes`` call.
+    Each frame is serialized when it is added or its payload changes, not on every write.
+
+    Use a :any:`FrameOutStreamSession`, which transmits each frame when it is written,
+    so frames with any identifier can share a write.
+    A :any:`FrameOutQueuedSession` transmits only its own frame, so it suits a table with one frame.
+
+    >>> class Frames(object):
+    ...     def write_bytes(self, frame_bytes, timeout):
+    ...         print(len(frame_bytes))
+    >>> class Session(object):
+    ...     frames = Frames()
+    >>> transmitter = CyclicTransmitter(Session())
+    >>> transmitter.add('Engine', types.CanFrame(0x100, payload=b'\\x00' * 8), 0.01)
+    >>> transmitter.add('Doors', types.CanFrame(0x200, payload=b'\\x00' * 8), 0.02, offset=0.005)
+    >>> transmitter.start(now=0.0)
+    >>> transmitter.step(now=0.0)
+    24
+    1
+    >>> transmitter.step(now=0.01)
+    48
+    2
+
+    Args:
+        session: Session to write to, usually a :any:`FrameOutStreamSession`.
+        timeout(float): Time in seconds each write waits for space in the session's queues.
+            Refer to :any:`OutFrames.write_bytes`.
+        clock: Function returning the current time in seconds. Defaults to ``timeit.default_timer``.
+        sleep: Function sleeping for a number of seconds. Defaults to ``time.sleep``.
+    """
+
+    def __init__(
+            self,
+            session,  # type: typing.Any
+            timeout=10,  # type: float
+            clock=None,  # type: typing.Optional[typing.Callable[[], float]]
+            sleep=None,  # type: typing.Optional[typing.Callable[[float], None]]
+    ):
+        # type: (...) -> None
+        self._session = session
+        self._timeout = timeout
+        self._clock = clock or timeit.default_timer
+        self._sleep = sleep or time.sleep
+        self._scheduler = _scheduler.DeadlineScheduler()
+        self._entries = collections.OrderedDict()  # type: typing.Dict[typing.Hashable, _Entry]
+        self._start = None  # type: typing.Optional[float]
+
+    def __len__(self):
+        # type: () -> int
+        return len(self._entries)
+
+    def __contains__(self, key):
+        # type: (typing.Hashable) -> bool
+        return key in self._entries
+
+    def add(self, key, frame, period, offset=0.0):
+        # type: (typing.Hashable, typing.Any, float, float) -> None
+        """Add a frame to the transmit table, or replace the frame of ``key``.
+
+        Args:
+            key: Name of the table entry, for example the frame name.
+            frame(:any:`nixnet.types.Frame`): Frame value to write, such as a :any:`nixnet.types.CanFrame`.
+            period(float): Time in seconds between writes.
+            offset(float): Time in seconds from :any:`CyclicTransmitter.start` to the first write.
+                When the transmitter is already started,
+                the first write is at the next multiple of ``period`` after ``offset``.
+        """
+        if not period > 0:
+            raise ValueError('Period of {} must be positive: {}'.format(key, period))
+        if offset < 0:
+            raise ValueError('Offset of {} must not be negative: {}'.format(key, offset))
+        entry = _Entry(frame, period, offset)
+        self._entries[key] = entry
+        if self._start is not None:
+            self._schedule(key, entry, self._clock())
+
+    def remove(self, key):
+        # type: (typing.Hashable) -> None
+        """Remove ``key`` from the transmit table."""
+        del self._entries[key]
+        self._scheduler.cancel(key)
+
+    def set_payload(self, key, payload):
+        # type: (typing.Hashable, bytes) -> None
+        """Change the payload written for ``key``, starting with its next write."""
+        entry = self._entries[key]
+        entry.frame.payload = bytes(payload)
+        entry.serialize()
+
+    def payload(self, key):
+        # type: (typing.Hashable) -> bytes
+        """Return the payload next written for ``key``."""
+        return self._entries[key].frame.payload
+
+    def _schedule(self, key, entry, now):
+        # type: (typing.Hashable, _Entry, float) -> None
+        deadline = self._start + entry.offset
+        if deadline < now:
+            deadline += -((deadline - now) // entry.period) * entry.period
+        self._scheduler.schedule(key, deadline, entry.period)
+
+    def start(self, now=None):
+        # type: (typing.Optional[float]) -> None
+        """Schedule every frame in the table, counting offsets from ``now``, which defaults to the current time."""
+        if now is None:
+            now = self._clock()
+        self._start = now
+        for key, entry in self._entries.items():
+            self._schedule(key, entry, now)
+
+    def stop(self):
+        # type: () -> None
+        """Stop writing frames. The transmit table is kept."""
+        for key in self._entries:
+            self._scheduler.cancel(key)
+        self._start = None
+
+    def next_deadline(self):
+        # type: () -> typing.Optional[float]
+        """Return the time the next frame is due, or ``None`` when no frame is scheduled."""
+        return self._scheduler.next_deadline()
+
+    def step(self, now=None):
+        # type: (typing.Optional[float]) -> int
+        """Write the frames due at ``now``, which defaults to the current time, with one call.
+
+        Returns the number of frames written.
+        """
+        if now is None:
+            now = self._clock()
+        due = self._scheduler.pop_due(now, _scheduler.COALESCE_TIME)
+        if not due:
+            return 0
+        entries = self._entries
+        self._session.frames.write_bytes(b''.join(entries[key].data for key, _, _ in due), self._timeout)
+        for key, deadline, missed in due:
+            entries[key].recorder.add(now - deadline, missed)
+        return len(due)
+
+    def run(self, duration):
+        # type: (float) -> None
+        """Write frames as they become due for ``duration`` seconds, starting if needed."""
+        end = self._clock() + duration
+        if self._start is None:
+            self.start()
+        while True:
+            now = self._clock()
+            if now >= end:
+                break
+            self.step(now)
+            deadline = self.next_deadline()
+            wake = end if deadline is None else min(deadline, end)
+            delay = wake - self._clock()
+            if delay > 0:
+                self._sleep(delay)
+
+    def jitter(self):
+        # type: () -> typing.Dict[typing.Hashable, types.JitterStats]
+        """Return the :any:`nixnet.types.JitterStats` of every frame by key.
+
+        :any:`JitterStats.peak_to_peak` bounds how much the time between two writes of a frame
+        differs from its period.
+        """
+        return collections.OrderedDict(
+            (key, entry.recorder.stats())
+            for key, entry in self._entries.items())
@@ -3,26 +3,134 @@ from __future__ import division
 from __future__ import print_function
 
 
+from nixnet.database._arxml_parser import load_arxml
+from nixnet.database._builder import build
+from nixnet.database._can_timing import analyze_can_bus
+from nixnet.database._can_timing import can_frame_bits
+from nixnet.database._can_timing import can_frame_time
+from nixnet.database._can_timing import CanBusAnalysis
+from nixnet.database._can_timing import CanFrameBits
+from nixnet.database._can_timing import CanFrameTiming
 from nixnet.database._cluster import Cluster
 from nixnet.database._database_object import DatabaseObject
+from nixnet.database._dbc_parser import load_dbc
+from nixnet.database._dbc_signal_value_table import CompiledValueTable
+from nixnet.database._diff import DatabaseDiff
+from nixnet.database._diff import DatabaseSnapshot
+from nixnet.database._diff import diff_databases
+from nixnet.database._diff import ObjectDiff
 from nixnet.database._ecu import Ecu
+from nixnet.database._fibex_parser import load_fibex
+from nixnet.database._flex_ray_timing import analyze_flex_ray_schedule
+from nixnet.database._flex_ray_timing import cycle_mask
+from nixnet.database._flex_ray_timing import FlexRayFrameTiming
+from nixnet.database._flex_ray_timing import FlexRaySchedule
+from nixnet.database._flex_ray_timing import FlexRaySlotConflict
 from nixnet.database._frame import Frame
+from nixnet.database._layout import analyze_bit_layout
+from nixnet.database._layout import BitLayout
+from nixnet.database._layout import PduOverlap
+from nixnet.database._layout import signal_bit_mask
+from nixnet.database._layout import SignalOutOfPayload
+from nixnet.database._layout import SignalOverlap
+from nixnet.database._ldf_parser import load_ldf
 from nixnet.database._lin_sched import LinSched
 from nixnet.database._lin_sched_entry import LinSchedEntry
+from nixnet.database._lin_timing import analyze_lin_schedule
+from nixnet.database._lin_timing import lin_frame_time
+from nixnet.database._lin_timing import LinFrameTiming
+from nixnet.database._lin_timing import LinScheduleTiming
+from nixnet.database._lin_timing import LinSlot
+from nixnet.database._lin_timing import LinTimeline
+from nixnet.database._lin_timing import LinTimelineSegment
+from nixnet.database._lin_timing import simulate_lin_schedules
+from nixnet.database._load import load
+from nixnet.database._memory import MemoryCluster
+from nixnet.database._memory import MemoryCollection
+from nixnet.database._memory import MemoryDatabase
+from nixnet.database._memory import MemoryDbcAttributeCollection
+from nixnet.database._memory import MemoryDbcSignalValueTable
+from nixnet.database._memory import MemoryEcu
+from nixnet.database._memory import MemoryFrame
+from nixnet.database._memory import MemoryLinSched
+from nixnet.database._memory import MemoryLinSchedEntry
+from nixnet.database._memory import MemoryPdu
+from nixnet.database._memory import MemorySignal
+from nixnet.database._memory import MemorySubFrame
+from nixnet.database._merge import merge_databases
+from nixnet.database._merge import MergePolicy
 from nixnet.database._pdu import Pdu
+from nixnet.database._search import SearchIndex
+from nixnet.database._search import SearchResult
 from nixnet.database._signal import Signal
 from nixnet.database._subframe import SubFrame
+from nixnet.database._validate import ValidationIssue
+from nixnet.database._validate import ValidationReport
 from nixnet.database.database import Database
 
 
 __all__ = [
+    "analyze_bit_layout",
+    "analyze_can_bus",
+    "analyze_flex_ray_schedule",
+    "analyze_lin_schedule",
+    "BitLayout",
+    "build",
+    "can_frame_bits",
+    "can_frame_time",
+    "CanBusAnalysis",
+    "CanFrameBits",
+    "CanFrameTiming",
     "Cluster",
+    "CompiledValueTable",
+    "cycle_mask",
     "Database",
+    "DatabaseDiff",
     "DatabaseObject",
+    "DatabaseSnapshot",
+    "diff_databases",
     "Ecu",
+    "FlexRayFrameTiming",
+    "FlexRaySchedule",
+    "FlexRaySlotConflict",
     "Frame",
+    "lin_frame_time",
+    "LinFrameTiming",
     "LinSched",
     "LinSchedEntry",
+    "LinScheduleTiming",
+    "LinSlot",
+    "LinTimeline",
+    "LinTimelineSegment",
+    "load",
+    "load_arxml",
+    "load_dbc",
+    "load_fibex",
+    "load_ldf",
+    "MemoryCluster",
+    "MemoryCollection",
+    "MemoryDatabase",
+    "MemoryDbcAttributeCollection",
+    "MemoryDbcSignalValueTable",
+    "MemoryEcu",
+    "MemoryFrame",
+    "MemoryLinSched",
+    "MemoryLinSchedEntry",
+    "MemoryPdu",
+    "MemorySignal",
+    "MemorySubFrame",
+    "merge_databases",
+    "MergePolicy",
+    "ObjectDiff",
     "Pdu",
+    "PduOverlap",
+    "SearchIndex",
+    "SearchResult",
     "Signal",
-    "SubFrame"]
+    "signal_bit_mask",
+    "SignalOutOfPayload",
+    "SignalOverlap",
+    "simulate_lin_schedules",
+    "SubFrame",
+    "ValidationIssue",
+    "ValidationReport"]
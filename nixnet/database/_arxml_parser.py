@@ -0,0 +1,390 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+import typing  # NOQA: F401
+
+from nixnet import constants
+
+from nixnet.database import _dbc_parser
+from nixnet.database import _memory
+from nixnet.database import _xml_import
+
+
+# FlexRay cluster parameters in AUTOSAR, with the MemoryCluster properties they set.
+# CYCLE is given in seconds and is handled separately.
+_FLEX_RAY_PARAMETERS = {
+    'ACTION-POINT-OFFSET': 'flex_ray_act_pt_off',
+    'CAS-RX-LOW-MAX': 'flex_ray_cas_rx_l_max',
+    'COLD-START-ATTEMPTS': 'flex_ray_cold_st_ats',
+    'DYNAMIC-SLOT-IDLE-PHASE': 'flex_ray_dyn_slot_idl_ph',
+    'LISTEN-NOISE': 'flex_ray_lis_noise',
+    'MACRO-PER-CYCLE': 'flex_ray_macro_per_cycle',
+    'MAX-WITHOUT-CLOCK-CORRECTION-FATAL': 'flex_ray_max_wo_clk_cor_fat',
+    'MAX-WITHOUT-CLOCK-CORRECTION-PASSIVE': 'flex_ray_max_wo_clk_cor_pas',
+    'MINISLOT-ACTION-POINT-OFFSET': 'flex_ray_minislot_act_pt',
+    'MINISLOT-DURATION': 'flex_ray_minislot',
+    'NETWORK-IDLE-TIME': 'flex_ray_nit',
+    'NETWORK-MANAGEMENT-VECTOR-LENGTH': 'flex_ray_nm_vec_len',
+    'NUMBER-OF-MINISLOTS': 'flex_ray_num_minislt',
+    'NUMBER-OF-STATIC-SLOTS': 'flex_ray_num_stat_slt',
+    'OFFSET-CORRECTION-START': 'flex_ray_off_cor_st',
+    'PAYLOAD-LENGTH-STATIC': 'flex_ray_payld_len_st',
+    'STATIC-SLOT-DURATION': 'flex_ray_stat_slot',
+    'SYMBOL-WINDOW': 'flex_ray_sym_win',
+    'SYNC-FRAME-ID-COUNT-MAX': 'flex_ray_sync_node_max',
+    'TRANSMISSION-START-SEQUENCE-DURATION': 'flex_ray_tss_tx',
+    'WAKEUP-RX-IDLE': 'flex_ray_wake_sym_rx_idl',
+    'WAKEUP-RX-LOW': 'flex_ray_wake_sym_rx_low',
+    'WAKEUP-RX-WINDOW': 'flex_ray_wake_sym_rx_win',
+    'WAKEUP-TX-ACTIVE': 'flex_ray_wake_sym_tx_low',
+    'WAKEUP-TX-IDLE': 'flex_ray_wake_sym_tx_idl',
+}
+
+_CLUSTER_PROTOCOLS = {
+    'CAN-CLUSTER': constants.Protocol.CAN,
+    'FLEXRAY-CLUSTER': constants.Protocol.FLEX_RAY,
+    'LIN-CLUSTER': constants.Protocol.LIN,
+}
+
+_BASE_TYPE_ENCODINGS = {
+    '1C': constants.SigDataType.SIGNED,
+    '2C': constants.SigDataType.SIGNED,
+    'SM': constants.SigDataType.SIGNED,
+    'IEEE754': constants.SigDataType.IEEE_FLOAT,
+}
+
+_BIG_ENDIAN = 'MOST-SIGNIFICANT-BYTE-FIRST'
+
+# The container elements whose children are read one at a time.
+_RECORD_PARENTS = (
+    'ELEMENTS', 'PHYSICAL-CHANNELS', 'FRAME-TRIGGERINGS', 'I-SIGNAL-TRIGGERINGS', 'PDU-TRIGGERINGS')
+
+
+def load_arxml(filepath):
+    # type: (typing.Text) -> _memory.MemoryDatabase
+    """Read an AUTOSAR system description (.arxml) into an in-memory database without the NI-XNET driver.
+
+    The file is read incrementally and each package element is discarded once read,
+    so peak memory grows with the number of database objects rather than the size of the XML.
+    The file is read twice, and the records of each pass are dropped as soon as their objects are built,
+    so peak memory stays close to that of the resulting database.
+
+    Each CAN or FlexRay cluster becomes a :any:`MemoryCluster` with its FlexRay timing parameters.
+    Frames are added to the clusters of the physical channels that trigger them,
+    with the FlexRay slot, base cycle, cycle repetition and channel assignment
+    (or the CAN identifier and addressing mode) of their frame triggerings.
+    I-PDUs are mapped to frames with ``pdu_properties``;
+    the dynamic parts of a multiplexed I-PDU become its subframes.
+    ECUs are connected through the frame ports of their communication connectors.
+
+    Args:
+        filepath(str): Path of the AUTOSAR file.
+    Returns:
+        :any:`MemoryDatabase`: The database.
+    Raises:
+        :any:`XnetError`: The file is not well-formed XML or contains an unresolved reference.
+    """
+    database = _memory.MemoryDatabase(os.path.splitext(os.path.basename(filepath))[0])
+    _xml_import.load_database(database, ArxmlReader(), filepath)
+    return database
+
+
+class ArxmlReader(object):
+    """Read the elements of an AUTOSAR file into :any:`XmlRecords`.
+
+    Records are keyed by their AUTOSAR reference path.
+    """
+
+    # Big-endian signal instances are positioned by their most significant bit.
+    msb_start_bits = True
+
+    def __init__(self):
+        # type: () -> None
+        self._records = _xml_import.XmlRecords()
+        self._reader = None  # type: typing.Optional[_xml_import.XmlRecordReader]
+        self._builder = None  # type: typing.Any
+        self._ports = {}  # type: typing.Dict[typing.Text, typing.Tuple[typing.Text, bool]]
+        self._connectors = {}  # type: typing.Dict[typing.Text, typing.Text]
+        self._ecu_connectors = {}  # type: typing.Dict[typing.Text, typing.List[typing.Text]]
+        self._system_signals = {}  # type: typing.Dict[typing.Text, typing.Text]
+
+    def read(self, source):
+        # type: (typing.Any) -> _xml_import.XmlRecords
+        """Read all but the signals and their I-PDU mappings."""
+        self._read(source, self._HANDLERS, ArxmlReader._read_pdu)
+        self._finish()
+        return self._records
+
+    def read_signals(self, source, builder):
+        # type: (typing.Any, typing.Any) -> None
+        """Read the signals and their I-PDU mappings into the builder of the records from :meth:`read`."""
+        self._builder = builder
+        self._read(source, self._SIGNAL_HANDLERS, ArxmlReader._read_pdu_signals)
+
+    def _read(self, source, handlers, pdu_handler):
+        # type: (typing.Any, typing.Dict[typing.Text, typing.Any], typing.Any) -> None
+        self._reader = _xml_import.XmlRecordReader(source, _RECORD_PARENTS)
+        for element in self._reader:
+            handler = handlers.get(element.tag)
+            if handler is None and element.tag.endswith('-PDU') and element.tag not in handlers:
+                handler = pdu_handler
+            if handler is not None:
+                handler(self, element)
+
+    def _key(self, element):
+        # type: (typing.Any) -> typing.Text
+        return self._records.key(self._path(element))
+
+    def _path(self, element):
+        # type: (typing.Any) -> typing.Text
+        return u'{}/{}'.format(self._reader.path(), element.findtext('SHORT-NAME'))
+
+    def _ref(self, text):
+        # type: (typing.Optional[typing.Text]) -> typing.Optional[typing.Text]
+        return self._records.key(text.strip()) if text else None
+
+    def _read_cluster(self, element):
+        # type: (typing.Any) -> None
+        parameters = {}  # type: typing.Dict[typing.Text, int]
+        for child in element.iter():
+            name = _FLEX_RAY_PARAMETERS.get(child.tag)
+            if name is not None and child.text:
+                parameters[name] = _xml_import.to_int(child.text)
+        cycle = _xml_import.first_text(element, 'CYCLE')
+        if cycle:
+            parameters['flex_ray_cycle'] = int(round(float(cycle) * 1e6))
+
+        baud_rate = _xml_import.first_text(element, 'BAUDRATE')
+        can_fd_baud_rate = _xml_import.first_text(element, 'CAN-FD-BAUDRATE')
+        self._records.clusters[self._key(element)] = _xml_import.XmlCluster(
+            element.findtext('SHORT-NAME'),
+            _CLUSTER_PROTOCOLS.get(element.tag, constants.Protocol.UNKNOWN),
+            _xml_import.to_int(baud_rate) if baud_rate else 0,
+            _xml_import.to_int(can_fd_baud_rate) if can_fd_baud_rate else 0,
+            parameters)
+
+    def _read_channel(self, element):
+        # type: (typing.Any) -> None
+        key = self._key(element)
+        channel = self._records.channels[key]
+        channel.cluster = self._reader.path()
+        name = _xml_import.first_text(element, 'CHANNEL-NAME')
+        if name:
+            channel.letter = name[-1].upper()
+        for reference in element.iter('COMMUNICATION-CONNECTOR-REF'):
+            self._connectors[self._ref(reference.text)] = key
+
+    def _read_frame_triggering(self, element):
+        # type: (typing.Any) -> None
+        timings = []  # type: typing.List[typing.Tuple[int, int, int]]
+        for timing in element.iter('FLEXRAY-ABSOLUTELY-SCHEDULED-TIMING'):
+            slot_id = _xml_import.to_int(timing.findtext('SLOT-ID'))
+            counter = _xml_import.first_text(timing, 'CYCLE-COUNTER')
+            if counter is not None:
+                timings.append((slot_id, _xml_import.to_int(counter), 64))
+                continue
+            repetition = _xml_import.first_text(timing, 'CYCLE-REPETITION') or '1'
+            timings.append((
+                slot_id,
+                _xml_import.to_int(_xml_import.first_text(timing, 'BASE-CYCLE') or '0'),
+                _xml_import.to_int(repetition.split('-')[-1])))
+        identifier = element.findtext('IDENTIFIER')
+        if identifier:
+            timings.append((_xml_import.to_int(identifier), 0, 1))
+        if not timings:
+            return
+
+        self._records.triggerings[self._key(element)] = _xml_import.XmlTriggering(
+            self._reader.path(),
+            self._ref(_xml_import.first_text(element, 'FRAME-REF')),
+            timings,
+            element.findtext('CAN-ADDRESSING-MODE') == 'EXTENDED',
+            element.findtext('CAN-FRAME-TX-BEHAVIOR') == 'CAN-FD',
+            None,
+            _xml_import.to_bool(element.findtext('PAYLOAD-PREAMBLE-INDICATOR')),
+            [self._ref(reference.text) for reference in element.iter('FRAME-PORT-REF')])
+
+    def _read_frame(self, element):
+        # type: (typing.Any) -> None
+        pdus = []
+        for mapping in element.iter('PDU-TO-FRAME-MAPPING'):
+            start_bit = _xml_import.to_int(mapping.findtext('START-POSITION') or '0')
+            if mapping.findtext('PACKING-BYTE-ORDER') == _BIG_ENDIAN:
+                # I-PDUs are byte aligned; the position is that of the first byte's most significant bit.
+                start_bit -= start_bit % 8
+            update_bit = mapping.findtext('UPDATE-INDICATION-BIT-POSITION')
+            pdus.append((
+                self._ref(mapping.findtext('PDU-REF')),
+                start_bit,
+                _xml_import.to_int(update_bit) if update_bit else -1))
+        self._records.frames[self._key(element)] = _xml_import.XmlFrame(
+            element.findtext('SHORT-NAME'),
+            _xml_import.to_int(element.findtext('FRAME-LENGTH') or '0'),
+            pdus)
+
+    def _read_pdu(self, element):
+        # type: (typing.Any) -> None
+        tx_time = None
+        cyclic = element.find('.//CYCLIC-TIMING')
+        if cyclic is not None:
+            period = _xml_import.first_text(cyclic, 'VALUE')
+            tx_time = float(period) if period else None
+
+        self._records.pdus[self._key(element)] = _xml_import.XmlPdu(
+            element.findtext('SHORT-NAME'),
+            _xml_import.to_int(element.findtext('LENGTH') or '0'),
+            None,
+            tx_time)
+        self._records.num_pdus += 1
+
+    def _read_pdu_signals(self, element):
+        # type: (typing.Any) -> None
+        # The keys of the second pass are not shared, since they are dropped once their signals are built.
+        signals = []
+        for mapping in element.iter('I-SIGNAL-TO-I-PDU-MAPPING'):
+            signal = mapping.findtext('I-SIGNAL-REF')
+            if not signal:
+                continue
+            signals.append(_xml_import.XmlSignalInstance(
+                signal.strip(),
+                _xml_import.to_int(mapping.findtext('START-POSITION') or '0'),
+                mapping.findtext('PACKING-BYTE-ORDER') == _BIG_ENDIAN))
+        self._builder.add_instances(self._path(element), signals)
+
+    def _read_multiplexed_pdu(self, element):
+        # type: (typing.Any) -> None
+        num_bits = _xml_import.to_int(element.findtext('SELECTOR-FIELD-LENGTH') or '0')
+        start_bit = _xml_import.to_int(element.findtext('SELECTOR-FIELD-START-POSITION') or '0')
+        big_endian = element.findtext('SELECTOR-FIELD-BYTE-ORDER') == _BIG_ENDIAN
+        if big_endian:
+            start_bit = _dbc_parser._motorola_lsb(start_bit, num_bits)
+        # Signals of the parts are positioned within the multiplexed I-PDU itself.
+        multiplexer = _xml_import.XmlMultiplexer(
+            u'SelectorField',
+            start_bit,
+            big_endian,
+            num_bits,
+            [(self._ref(alternative.findtext('I-PDU-REF')),
+              _xml_import.to_int(alternative.findtext('SELECTOR-FIELD-CODE')),
+              0)
+             for alternative in element.iter('DYNAMIC-PART-ALTERNATIVE')],
+            [(self._ref(part.findtext('I-PDU-REF')), 0) for part in element.iter('STATIC-PART')])
+        self._records.pdus[self._key(element)] = _xml_import.XmlPdu(
+            element.findtext('SHORT-NAME'),
+            _xml_import.to_int(element.findtext('LENGTH') or '0'),
+            multiplexer,
+            None)
+
+    def _read_signal(self, element):
+        # type: (typing.Any) -> None
+        coding = _xml_import.first_text(element, 'COMPU-METHOD-REF')
+        system_signal = element.findtext('SYSTEM-SIGNAL-REF')
+        if coding is None and system_signal:
+            coding = self._system_signals.get(system_signal.strip())
+        base_type = _xml_import.first_text(element, 'BASE-TYPE-REF')
+        length = element.findtext('LENGTH')
+        init_value = element.find('INIT-VALUE')
+        default = _xml_import.first_text(init_value, 'VALUE') if init_value is not None else None
+        self._builder.add_signal(self._path(element), _xml_import.XmlSignal(
+            element.findtext('SHORT-NAME'),
+            coding,
+            base_type,
+            _xml_import.to_int(length) if length else 0,
+            _to_number(default) if default else 0.0))
+
+    def _read_system_signal(self, element):
+        # type: (typing.Any) -> None
+        compu_method = _xml_import.first_text(element, 'COMPU-METHOD-REF')
+        if compu_method:
+            self._system_signals[self._key(element)] = self._ref(compu_method)
+
+    def _read_compu_method(self, element):
+        # type: (typing.Any) -> None
+        internal_to_phys = element.find('COMPU-INTERNAL-TO-PHYS')
+        scale_fac, scale_off, minimum, maximum, value_table = _xml_import.parse_compu_method(
+            internal_to_phys if internal_to_phys is not None else element)
+        unit = element.findtext('UNIT-REF')
+        self._records.codings[self._key(element)] = _xml_import.XmlCoding(
+            0, None, scale_fac, scale_off, minimum, maximum, self._ref(unit), value_table)
+
+    def _read_base_type(self, element):
+        # type: (typing.Any) -> None
+        encoding = (element.findtext('BASE-TYPE-ENCODING') or '').strip().upper()
+        self._records.base_types[self._key(element)] = _BASE_TYPE_ENCODINGS.get(
+            encoding, constants.SigDataType.UNSIGNED)
+
+    def _read_unit(self, element):
+        # type: (typing.Any) -> None
+        self._records.units[self._key(element)] = (
+            element.findtext('DISPLAY-NAME') or element.findtext('SHORT-NAME') or u'')
+
+    def _read_ecu(self, element):
+        # type: (typing.Any) -> None
+        key = self._key(element)
+        connectors = []
+        for connectors_element in element.findall('CONNECTORS'):
+            for connector in connectors_element:
+                connector_key = u'{}/{}'.format(key, connector.findtext('SHORT-NAME'))
+                connectors.append(connector_key)
+                for port in connector.iter('FRAME-PORT'):
+                    port_key = u'{}/{}'.format(connector_key, port.findtext('SHORT-NAME'))
+                    self._ports[port_key] = (key, port.findtext('COMMUNICATION-DIRECTION') == 'OUT')
+        self._ecu_connectors[key] = connectors
+
+        key_slot = _xml_import.first_text(element, 'KEY-SLOT-ID')
+        self._records.ecus[key] = _xml_import.XmlEcu(
+            element.findtext('SHORT-NAME'),
+            [],
+            [],
+            _xml_import.to_int(key_slot) if key_slot else None,
+            _xml_import.to_bool(_xml_import.first_text(element, 'KEY-SLOT-USED-FOR-START-UP')),
+            _xml_import.to_bool(_xml_import.first_text(element, 'KEY-SLOT-USED-FOR-SYNC')))
+
+    def _finish(self):
+        # type: () -> None
+        """Resolve the references that AUTOSAR makes from the referenced element's side."""
+        records = self._records
+        for ecu_key, connectors in self._ecu_connectors.items():
+            channels = records.ecus[ecu_key].channels
+            channels.extend(self._connectors[c] for c in connectors if c in self._connectors)
+        for triggering_key, triggering in records.triggerings.items():
+            for port in triggering.ports:
+                if port in self._ports:
+                    ecu_key, is_tx = self._ports[port]
+                    records.ecus[ecu_key].frames.append((triggering_key, is_tx))
+
+    _HANDLERS = {
+        'CAN-CLUSTER': _read_cluster,
+        'FLEXRAY-CLUSTER': _read_cluster,
+        'LIN-CLUSTER': _read_cluster,
+        'CAN-PHYSICAL-CHANNEL': _read_channel,
+        'FLEXRAY-PHYSICAL-CHANNEL': _read_channel,
+        'LIN-PHYSICAL-CHANNEL': _read_channel,
+        'CAN-FRAME-TRIGGERING': _read_frame_triggering,
+        'FLEXRAY-FRAME-TRIGGERING': _read_frame_triggering,
+        'LIN-FRAME-TRIGGERING': _read_frame_triggering,
+        'CAN-FRAME': _read_frame,
+        'FLEXRAY-FRAME': _read_frame,
+        'LIN-UNCONDITIONAL-FRAME': _read_frame,
+        'MULTIPLEXED-I-PDU': _read_multiplexed_pdu,
+        'SYSTEM-SIGNAL': _read_system_signal,
+        'COMPU-METHOD': _read_compu_method,
+        'SW-BASE-TYPE': _read_base_type,
+        'UNIT': _read_unit,
+        'ECU-INSTANCE': _read_ecu,
+    }
+
+    _SIGNAL_HANDLERS = {
+        'MULTIPLEXED-I-PDU': None,
+        'I-SIGNAL': _read_signal,
+    }
+
+
+def _to_number(text):
+    # type: (typing.Text) -> float
+    text = text.strip()
+    if text.lower().startswith('0x'):
+        return float(int(text, 16))
+    return float(text)
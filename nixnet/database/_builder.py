@@ -0,0 +1,389 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+import enum
+import re
+import typing  # NOQA: F401
+
+import six
+
+from nixnet import _cconsts
+from nixnet import constants
+from nixnet import errors
+from nixnet import types
+
+from nixnet.database import _cluster
+from nixnet.database import _ecu
+from nixnet.database import _frame
+from nixnet.database import _lin_sched
+from nixnet.database import _lin_sched_entry
+from nixnet.database import _memory
+from nixnet.database import _pdu
+from nixnet.database import _signal
+from nixnet.database import _subframe
+
+
+_NAME_RE = re.compile(r'^[A-Za-z_][A-Za-z0-9_]{0,127}$')
+
+_Kind = collections.namedtuple('_Kind', ['driver_class', 'memory_class', 'children', 'references'])
+
+# For each object class: the spec keys that hold children, mapped to the collection property and child class,
+# and the spec keys that refer to other objects of the cluster by name, mapped to the referenced class.
+_KINDS = {
+    constants.ObjectClass.CLUSTER: _Kind(
+        _cluster.Cluster,
+        _memory.MemoryCluster,
+        (
+            ('pdus', 'pdus', constants.ObjectClass.PDU),
+            ('frames', 'frames', constants.ObjectClass.FRAME),
+            ('ecus', 'ecus', constants.ObjectClass.ECU),
+            ('lin_schedules', 'lin_schedules', constants.ObjectClass.LIN_SCHED),
+        ),
+        {}),
+    constants.ObjectClass.FRAME: _Kind(
+        _frame.Frame,
+        _memory.MemoryFrame,
+        (
+            ('signals', 'mux_static_signals', constants.ObjectClass.SIGNAL),
+            ('subframes', 'mux_subframes', constants.ObjectClass.SUBFRAME),
+        ),
+        {'pdu_properties': constants.ObjectClass.PDU}),
+    constants.ObjectClass.PDU: _Kind(
+        _pdu.Pdu,
+        _memory.MemoryPdu,
+        (
+            ('signals', 'mux_static_sigs', constants.ObjectClass.SIGNAL),
+            ('subframes', 'mux_subframes', constants.ObjectClass.SUBFRAME),
+        ),
+        {}),
+    constants.ObjectClass.SUBFRAME: _Kind(
+        _subframe.SubFrame,
+        _memory.MemorySubFrame,
+        (('signals', 'dyn_signals', constants.ObjectClass.SIGNAL),),
+        {}),
+    constants.ObjectClass.SIGNAL: _Kind(_signal.Signal, _memory.MemorySignal, (), {}),
+    constants.ObjectClass.ECU: _Kind(
+        _ecu.Ecu,
+        _memory.MemoryEcu,
+        (),
+        {'tx_frms': constants.ObjectClass.FRAME, 'rx_frms': constants.ObjectClass.FRAME}),
+    constants.ObjectClass.LIN_SCHED: _Kind(
+        _lin_sched.LinSched,
+        _memory.MemoryLinSched,
+        (('entries', 'entries', constants.ObjectClass.LIN_SCHED_ENTRY),),
+        {}),
+    constants.ObjectClass.LIN_SCHED_ENTRY: _Kind(
+        _lin_sched_entry.LinSchedEntry,
+        _memory.MemoryLinSchedEntry,
+        (),
+        {'frames': constants.ObjectClass.FRAME, 'collision_res_sched': constants.ObjectClass.LIN_SCHED}),
+}
+
+# These properties change how the driver interprets the others, so they are set first.
+_FIRST_PROPERTIES = ('protocol', 'can_io_mode')
+
+# The objects that refer to others or are referred to, which _create keeps for _resolve.
+_LINKED_CLASSES = frozenset(
+    [object_class for object_class, kind in _KINDS.items() if kind.references]).union(
+    referenced for kind in _KINDS.values() for referenced in kind.references.values())
+
+_NOT_FOUND_ERRORS = {
+    constants.ObjectClass.FRAME: _cconsts.NX_ERR_FRAME_NOT_FOUND,
+    constants.ObjectClass.PDU: _cconsts.NX_ERR_DATABASE_OBJECT_NOT_FOUND,
+    constants.ObjectClass.LIN_SCHED: _cconsts.NX_ERR_DATABASE_OBJECT_NOT_FOUND,
+}
+
+
+class _Node(object):
+    """A validated object of the spec."""
+
+    def __init__(self, object_class, name, path, properties, references, children):
+        # type: (constants.ObjectClass, typing.Text, typing.Text, typing.List, typing.Dict, typing.List) -> None
+        self.object_class = object_class
+        self.name = name
+        self.path = path
+        self.properties = properties
+        self.references = references
+        self.children = children
+
+
+def build(database, spec):
+    # type: (typing.Any, typing.Any) -> typing.List[typing.Any]
+    """Create clusters and their objects from a declarative spec, all or nothing.
+
+    The spec is a mapping with a ``clusters`` list.
+    Each object is a mapping, or a record such as a ``namedtuple``,
+    with a ``name`` and the properties to set, named as in the database API.
+    Objects hold their children in these lists:
+
+    *   Clusters: ``pdus``, ``frames``, ``ecus`` and ``lin_schedules``.
+    *   Frames and PDUs: ``signals`` and ``subframes``.
+    *   Subframes: ``signals``.
+    *   LIN schedules: ``entries``.
+
+    Objects refer to other objects of their cluster by name:
+    the ECU ``tx_frms`` and ``rx_frms`` and the LIN schedule entry ``frames`` list frame names,
+    the LIN schedule entry ``collision_res_sched`` is a schedule name,
+    and the frame ``pdu_properties`` lists ``(pdu, start_bit, update_bit)`` tuples or mappings with a PDU name.
+
+    .. code-block:: python
+
+        spec = {'clusters': [{
+            'name': 'Body', 'protocol': constants.Protocol.CAN, 'baud_rate': 500000,
+            'frames': [{
+                'name': 'Doors', 'id': 0x120, 'payload_len': 2,
+                'signals': [{'name': 'Lock', 'start_bit': 0, 'num_bits': 1, 'data_type': 'UNSIGNED'}],
+            }],
+            'ecus': [{'name': 'BodyCtrl', 'tx_frms': ['Doors']}],
+        }]}
+        nixnet.database.build(database, spec)
+
+    The whole spec is validated in Python before the database changes:
+    names, property names and types, duplicates, references, and the configuration checks of
+    :any:`MemoryFrame.check_config_status`.
+    Enumerated properties also accept their value or member name.
+    Then the objects are created in one pass,
+    setting each list property once and keeping the references returned by ``add``
+    instead of searching the database again.
+
+    ``database`` is either a :any:`Database` or a :any:`MemoryDatabase`.
+    The clusters of a :any:`MemoryDatabase` are built aside and moved in at once.
+    For a :any:`Database`, if the driver rejects an object,
+    the clusters created so far are deleted again.
+
+    Args:
+        database: Database to which the clusters are added.
+        spec: Declarative description of the clusters.
+    Returns:
+        list: The new clusters, in spec order.
+    Raises:
+        :any:`XnetError`: The first failure. The message starts with the path of the object, such as
+            ``Body.Doors.Lock``, and ``error_code`` is the code of the underlying failure.
+    """
+    clusters = [
+        _parse(constants.ObjectClass.CLUSTER, item, u'')
+        for item in _items(spec, 'clusters', u'')]
+
+    staged = _memory.MemoryDatabase(database.name)
+    for node in clusters:
+        _create(staged.clusters, node)
+    _check_config(staged)
+
+    if isinstance(database, _memory.MemoryDatabase):
+        return _move(staged, database)
+    return _replay(database, clusters)
+
+
+def _parse(object_class, item, parent_path):
+    # type: (constants.ObjectClass, typing.Any, typing.Text) -> _Node
+    kind = _KINDS[object_class]
+    fields = _fields(item, parent_path)
+    name = fields.pop('name', None)
+    if not isinstance(name, six.string_types) or not _NAME_RE.match(name):
+        raise _error(parent_path or u'<spec>', 'invalid object name {!r}'.format(name),
+                     _cconsts.NX_ERR_INVALID_PROPERTY_VALUE)
+    path = u'{}.{}'.format(parent_path, name) if parent_path else name
+
+    children = []
+    for key, collection, child_class in kind.children:
+        nodes = [_parse(child_class, child, path) for child in _items(fields, key, path)]
+        fields.pop(key, None)
+        children.append((collection, nodes))
+
+    references = {}
+    for key in kind.references:
+        if key in fields:
+            references[key] = fields.pop(key)
+
+    properties = []
+    for key in sorted(fields, key=lambda key: (key not in _FIRST_PROPERTIES, key)):
+        properties.append((key, _coerce(kind, key, fields[key], path)))
+    return _Node(object_class, name, path, properties, references, children)
+
+
+def _fields(item, path):
+    # type: (typing.Any, typing.Text) -> typing.Dict[typing.Text, typing.Any]
+    if hasattr(item, '_asdict'):
+        return dict(item._asdict())
+    if isinstance(item, collections.Mapping):
+        return dict(item)
+    raise _error(path or u'<spec>', 'expected a mapping or record, not {!r}'.format(item),
+                 _cconsts.NX_ERR_INVALID_PROPERTY_VALUE)
+
+
+def _items(fields, key, path):
+    # type: (typing.Any, typing.Text, typing.Text) -> typing.List[typing.Any]
+    items = fields.get(key) or []
+    if isinstance(items, (six.string_types, collections.Mapping)):
+        raise _error(path or u'<spec>', '"{}" must be a list'.format(key), _cconsts.NX_ERR_INVALID_PROPERTY_VALUE)
+    return list(items)
+
+
+def _coerce(kind, key, value, path):
+    # type: (_Kind, typing.Text, typing.Any, typing.Text) -> typing.Any
+    prop = getattr(kind.driver_class, key, None)
+    if key == 'name' or not isinstance(prop, property) or prop.fset is None:
+        raise _error(path, 'unknown or read-only property "{}"'.format(key), _cconsts.NX_ERR_INVALID_PROPERTY_VALUE)
+
+    default = kind.memory_class._slot_defaults.get(key, getattr(kind.memory_class, key, None))
+    if isinstance(default, enum.Enum):
+        enum_type = type(default)
+        try:
+            if isinstance(value, enum_type):
+                return value
+            if isinstance(value, six.string_types):
+                return enum_type[value]
+            return enum_type(value)
+        except (KeyError, ValueError):
+            raise _error(path, '{!r} is not a valid {} for "{}"'.format(value, enum_type.__name__, key),
+                         _cconsts.NX_ERR_INVALID_PROPERTY_VALUE)
+
+    if isinstance(default, bool):
+        valid = isinstance(value, bool)
+    elif isinstance(default, six.integer_types):
+        valid = isinstance(value, six.integer_types) and not isinstance(value, bool)
+    elif isinstance(default, float):
+        valid = isinstance(value, (float, ) + six.integer_types) and not isinstance(value, bool)
+    elif isinstance(default, six.string_types):
+        valid = isinstance(value, six.string_types)
+    else:
+        valid = True
+    if not valid:
+        raise _error(path, '{!r} is not a valid value for "{}"'.format(value, key),
+                     _cconsts.NX_ERR_INVALID_PROPERTY_VALUE)
+    if isinstance(default, float):
+        return float(value)
+    return value
+
+
+def _create(collection, node, created=None, objects=None):
+    # type: (typing.Any, _Node, typing.Optional[typing.List[typing.Any]], typing.Optional[typing.Dict]) -> typing.Any
+    """Create the node and its descendants, and resolve the references of a cluster's objects.
+
+    The new object is appended to ``created`` before its properties and children are set,
+    so that it can be deleted if one of them fails.
+    ``objects`` maps the object class and path of the cluster's objects to those returned by ``add``,
+    so that references are resolved without searching the database.
+    """
+    if node.object_class == constants.ObjectClass.CLUSTER:
+        objects = {}
+    try:
+        obj = collection.add(node.name)
+        if created is not None:
+            created.append(obj)
+        for key, value in node.properties:
+            setattr(obj, key, value)
+    except errors.XnetError as error:
+        raise _error(node.path, error.args[0], error.error_code)
+    if objects is not None and node.object_class in _LINKED_CLASSES:
+        objects[(node.object_class, node.path)] = obj
+    for child_collection, children in node.children:
+        target = getattr(obj, child_collection)
+        for child in children:
+            _create(target, child, objects=objects)
+    if node.object_class == constants.ObjectClass.CLUSTER:
+        _resolve(node, objects)
+    return obj
+
+
+def _resolve(node, objects):
+    # type: (_Node, typing.Dict[typing.Tuple[constants.ObjectClass, typing.Text], typing.Any]) -> None
+    """Set the reference properties of the cluster's new objects, looking the objects up by name."""
+    def lookup(object_class, name):
+        try:
+            return objects[(object_class, u'{}.{}'.format(node.path, name))]
+        except (KeyError, TypeError):
+            raise errors.XnetError(
+                '{} "{}" is not defined in the cluster'.format(object_class.name.lower(), name),
+                _NOT_FOUND_ERRORS[object_class])
+
+    pending = [child for _, children in node.children for child in children]
+    while pending:
+        child = pending.pop(0)
+        pending.extend(grandchild for _, grandchildren in child.children for grandchild in grandchildren)
+        if not child.references:
+            continue
+        obj = objects[(child.object_class, child.path)]
+        kind = _KINDS[child.object_class]
+        for key in sorted(child.references):
+            value = child.references[key]
+            referenced_class = kind.references[key]
+            try:
+                if key == 'collision_res_sched':
+                    value = lookup(referenced_class, value) if value is not None else None
+                elif isinstance(value, six.string_types):
+                    raise errors.XnetError('"{}" must be a list'.format(key), _cconsts.NX_ERR_INVALID_PROPERTY_VALUE)
+                elif key == 'pdu_properties':
+                    value = [_pdu_properties(lookup, properties) for properties in value]
+                else:
+                    value = [lookup(referenced_class, name) for name in value]
+                setattr(obj, key, value)
+            except errors.XnetError as error:
+                raise _error(child.path, error.args[0], error.error_code)
+
+
+def _pdu_properties(lookup, properties):
+    # type: (typing.Callable, typing.Any) -> types.PduProperties
+    if isinstance(properties, collections.Mapping):
+        fields = dict(properties)
+    else:
+        fields = dict(zip(types.PduProperties._fields, properties))
+    try:
+        return types.PduProperties(
+            lookup(constants.ObjectClass.PDU, fields['pdu']),
+            int(fields['start_bit']),
+            int(fields.get('update_bit', -1)))
+    except (KeyError, TypeError, ValueError):
+        raise errors.XnetError(
+            'invalid pdu_properties entry {!r}'.format(properties),
+            _cconsts.NX_ERR_INVALID_PROPERTY_VALUE)
+
+
+def _check_config(staged):
+    # type: (_memory.MemoryDatabase) -> None
+    for cluster in staged.clusters.values():
+        for container in list(cluster.pdus.values()) + list(cluster.frames.values()):
+            # Signals first, so that a failure names the signal rather than its frame.
+            for obj in list(container._own_signals()) + [container]:
+                try:
+                    obj.check_config_status()
+                except errors.XnetError as error:
+                    raise _error(u'.'.join(obj._path()), error.args[0], error.error_code)
+
+
+def _move(staged, database):
+    # type: (_memory.MemoryDatabase, _memory.MemoryDatabase) -> typing.List[_memory.MemoryCluster]
+    clusters = list(staged.clusters.values())
+    for cluster in clusters:
+        try:
+            database.clusters._check_unique(cluster.name)
+        except errors.XnetError as error:
+            raise _error(cluster.name, error.args[0], error.error_code)
+    for cluster in clusters:
+        cluster._parent = database
+        database.clusters._insert(cluster)
+    database._changed()
+    return clusters
+
+
+def _replay(database, clusters):
+    # type: (typing.Any, typing.List[_Node]) -> typing.List[typing.Any]
+    created = []  # type: typing.List[typing.Any]
+    try:
+        for node in clusters:
+            _create(database.clusters, node, created)
+    except errors.XnetError:
+        for cluster in reversed(created):
+            try:
+                del database.clusters[cluster.name]
+            except errors.XnetError:
+                pass
+        raise
+    return created
+
+
+def _error(path, message, error_code):
+    # type: (typing.Text, typing.Text, int) -> errors.XnetError
+    return errors.XnetError(u'{}: {}'.format(path, message), error_code)
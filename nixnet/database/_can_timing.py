@@ -0,0 +1,367 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+import math
+import typing  # NOQA: F401
+
+from nixnet import _cconsts
+from nixnet import constants
+from nixnet import errors
+
+try:
+    import numpy  # type: ignore
+except ImportError:
+    numpy = None
+
+
+# Payload lengths a CAN FD data length code can encode.
+_CAN_FD_PAYLOAD_LENS = (0, 1, 2, 3, 4, 5, 6, 7, 8, 12, 16, 20, 24, 32, 48, 64)
+
+# Classic CAN bits that are subject to bit stuffing, without the data field (Davis et al., 2007).
+_CAN_STUFFED_BITS = {False: 34, True: 54}
+# CRC delimiter, ACK slot, ACK delimiter, end of frame and interframe space.
+_TRAILER_BITS = 13
+
+# CAN FD arbitration bits from start of frame to bit rate switch.
+_CAN_FD_HEADER_BITS = {False: 17, True: 36}
+# CAN FD error state indicator and data length code.
+_CAN_FD_CONTROL_BITS = 5
+# CAN FD stuff count, and the CRC for payloads up to 16 bytes and longer.
+_CAN_FD_STUFF_COUNT_BITS = 4
+_CAN_FD_CRC_BITS = (17, 21)
+
+_REMOTE_TIMING_TYPES = (constants.FrmCanTiming.CYCLIC_REMOTE, constants.FrmCanTiming.EVENT_REMOTE)
+
+# Rows of the interference matrix computed at once, which bounds its memory.
+_ROWS_PER_BLOCK = 256
+# Largest table of per-period interference, in entries, before interference is summed per frame instead.
+_MAX_PREFIX_ENTRIES = 1 << 22
+
+CanFrameBits_ = collections.namedtuple(
+    'CanFrameBits_',
+    ['nominal', 'data'])
+
+
+class CanFrameBits(CanFrameBits_):
+    """Worst-case number of bits of a CAN frame on the bus, including stuff bits and interframe space.
+
+    Attributes:
+        nominal(int): Bits sent at the nominal baud rate.
+        data(int): Bits sent at the CAN FD data baud rate.
+            This is ``0`` unless the frame switches the bit rate.
+    """
+
+    pass
+
+
+CanFrameTiming_ = collections.namedtuple(
+    'CanFrameTiming_',
+    ['name', 'id', 'can_ext_id', 'frame_time', 'period', 'load', 'response_time'])
+
+
+class CanFrameTiming(CanFrameTiming_):
+    """Timing of one frame found by :any:`analyze_can_bus`.
+
+    Attributes:
+        name(str): Name of the frame.
+        id(int): Arbitration identifier of the frame.
+        can_ext_id(bool): Whether the identifier is extended.
+        frame_time(float): Worst-case time in seconds to transmit the frame.
+            For remote timing types, this includes the remote frame.
+        period(float): Shortest time in seconds between transmissions,
+            or ``None`` when the frame is event driven without a minimum interval.
+        load(float): Share of the bus time used by the frame, or ``None`` when ``period`` is ``None``.
+        response_time(float): Worst-case time in seconds from queuing the frame to the end of its transmission,
+            or ``float('inf')`` when higher priority frames use the whole bus.
+    """
+
+    @property
+    def schedulable(self):
+        # type: () -> bool
+        """bool: Returns whether the frame is sent before it is queued again."""
+        return self.period is None or self.response_time <= self.period
+
+
+class CanBusAnalysis(object):
+    """Bus load and worst-case response times of a CAN cluster, found by :any:`analyze_can_bus`.
+
+    Attributes:
+        name(str): Name of the cluster.
+        baud_rate(int): Nominal baud rate used for the analysis.
+        can_fd_baud_rate(int): CAN FD data baud rate used for the analysis.
+        frames(list of :any:`CanFrameTiming`): Timing of every frame, from highest to lowest priority.
+    """
+
+    def __init__(self, name, baud_rate, can_fd_baud_rate, frames):
+        # type: (typing.Text, int, int, typing.List[CanFrameTiming]) -> None
+        self.name = name
+        self.baud_rate = baud_rate
+        self.can_fd_baud_rate = can_fd_baud_rate
+        self.frames = frames
+
+    def __repr__(self):
+        return '{}(name={}, frames={}, bus_load={:.3f}, schedulable={})'.format(
+            type(self).__name__, self.name, len(self.frames), self.bus_load, self.schedulable)
+
+    @property
+    def bus_load(self):
+        # type: () -> float
+        """float: Returns the share of the bus time used by the frames with a period.
+
+        A value above 1.0 means the bus is overloaded.
+        """
+        return math.fsum(frame.load for frame in self.frames if frame.load is not None)
+
+    @property
+    def unbounded(self):
+        # type: () -> typing.List[CanFrameTiming]
+        """list of :any:`CanFrameTiming`: Returns the event driven frames without a minimum interval.
+
+        These frames are left out of the bus load,
+        and do not delay lower priority frames in the response time analysis.
+        """
+        return [frame for frame in self.frames if frame.period is None]
+
+    @property
+    def missed_deadlines(self):
+        # type: () -> typing.List[CanFrameTiming]
+        """list of :any:`CanFrameTiming`: Returns the frames whose response time is longer than their period."""
+        return [frame for frame in self.frames if not frame.schedulable]
+
+    @property
+    def schedulable(self):
+        # type: () -> bool
+        """bool: Returns whether every frame is sent before it is queued again."""
+        return not self.missed_deadlines
+
+
+def can_frame_bits(payload_len, can_ext_id=False, can_io_mode=constants.CanIoMode.CAN):
+    # type: (int, bool, constants.CanIoMode) -> CanFrameBits
+    """Returns the worst-case number of bits of a CAN data frame.
+
+    Classic CAN frames use the worst-case bit stuffing of Davis et al. (2007).
+    CAN FD frames round the payload up to a length the data length code can encode,
+    stuff the arbitration, control and data bits dynamically,
+    and add the fixed stuff bits of the stuff count and CRC.
+    The interframe space is included, so back-to-back frames add up.
+
+    >>> print(can_frame_bits(8).nominal)
+    135
+    >>> bits = can_frame_bits(64, can_io_mode=constants.CanIoMode.CAN_FD_BRS)
+    >>> print(bits.nominal, bits.data)
+    34 678
+
+    Args:
+        payload_len(int): Number of payload bytes.
+        can_ext_id(bool): Whether the identifier is extended.
+        can_io_mode(:any:`CanIoMode`): I/O mode of the frame.
+    Returns:
+        :any:`CanFrameBits`
+    """
+    if can_io_mode == constants.CanIoMode.CAN:
+        stuffed_bits = _CAN_STUFFED_BITS[bool(can_ext_id)] + 8 * payload_len
+        return CanFrameBits(stuffed_bits + _TRAILER_BITS + (stuffed_bits - 1) // 4, 0)
+
+    payload_len = next(length for length in _CAN_FD_PAYLOAD_LENS if length >= payload_len)
+    header_bits = _CAN_FD_HEADER_BITS[bool(can_ext_id)]
+    header_stuff_bits = header_bits // 4
+    dynamic_bits = header_bits + _CAN_FD_CONTROL_BITS + 8 * payload_len
+    crc_bits = _CAN_FD_CRC_BITS[payload_len > 16]
+    fixed_bits = _CAN_FD_STUFF_COUNT_BITS + crc_bits
+    data_stuff_bits = (dynamic_bits - 1) // 4 - header_stuff_bits
+    fixed_stuff_bits = (fixed_bits + 3) // 4
+    data_bits = _CAN_FD_CONTROL_BITS + 8 * payload_len + data_stuff_bits + fixed_bits + fixed_stuff_bits
+    nominal_bits = header_bits + header_stuff_bits + _TRAILER_BITS
+    if can_io_mode == constants.CanIoMode.CAN_FD_BRS:
+        return CanFrameBits(nominal_bits, data_bits)
+    return CanFrameBits(nominal_bits + data_bits, 0)
+
+
+def can_frame_time(
+        payload_len,
+        baud_rate,
+        can_ext_id=False,
+        can_io_mode=constants.CanIoMode.CAN,
+        can_fd_baud_rate=0):
+    # type: (int, int, bool, constants.CanIoMode, int) -> float
+    """Returns the worst-case time in seconds to transmit a CAN data frame.
+
+    Args:
+        payload_len(int): Number of payload bytes.
+        baud_rate(int): Nominal baud rate.
+        can_ext_id(bool): Whether the identifier is extended.
+        can_io_mode(:any:`CanIoMode`): I/O mode of the frame.
+        can_fd_baud_rate(int): Data baud rate, used when ``can_io_mode`` is ``CanIoMode.CAN_FD_BRS``.
+    Returns:
+        float: Time in seconds, as computed from :any:`can_frame_bits`.
+    """
+    bits = can_frame_bits(payload_len, can_ext_id, can_io_mode)
+    if not bits.data:
+        return bits.nominal / baud_rate
+    return bits.nominal / baud_rate + bits.data / can_fd_baud_rate
+
+
+def analyze_can_bus(cluster, baud_rate=None, can_fd_baud_rate=None):
+    # type: (typing.Any, typing.Optional[int], typing.Optional[int]) -> CanBusAnalysis
+    """Compute the bus load and worst-case response times of the frames of a CAN cluster.
+
+    Each frame's period is its :any:`Frame.can_tx_time`:
+    the cycle time of cyclic frames, or the minimum interval of event driven frames.
+    Frames are prioritized by identifier, with a standard identifier before
+    an extended identifier with the same first 11 bits.
+
+    Response times use the sufficient test of Davis et al. (2007):
+    a frame waits for the longest lower priority frame, or itself,
+    then for every higher priority frame queued before it starts,
+    and is then transmitted.
+    Queuing jitter is not modelled.
+    With NumPy installed, the response times of all frames are iterated as arrays.
+
+    Pass ``baud_rate`` or ``can_fd_baud_rate`` to study other baud rates
+    without changing the cluster.
+
+    Args:
+        cluster(:any:`Cluster`): CAN cluster to analyze.
+        baud_rate(int): Nominal baud rate to use instead of :any:`Cluster.baud_rate`.
+        can_fd_baud_rate(int): Data baud rate to use instead of :any:`Cluster.can_fd_baud_rate`.
+    Returns:
+        :any:`CanBusAnalysis`
+    Raises:
+        ValueError: ``cluster`` is not a CAN cluster.
+        :any:`XnetError`: The baud rate, or the data baud rate of a frame that switches the bit rate, is not set.
+    """
+    if cluster.protocol != constants.Protocol.CAN:
+        raise ValueError('{} is not a CAN cluster'.format(cluster.name))
+    if baud_rate is None:
+        baud_rate = cluster.baud_rate
+    cluster_io_mode = cluster.can_io_mode
+    if can_fd_baud_rate is None:
+        can_fd_baud_rate = cluster.can_fd_baud_rate if cluster_io_mode == constants.CanIoMode.CAN_FD_BRS else 0
+    if not baud_rate:
+        raise errors.XnetError(
+            'Cluster {} has no baud rate'.format(cluster.name),
+            _cconsts.NX_ERR_BAUD_RATE_NOT_CONFIGURED)
+
+    frames = []
+    for frame in cluster.frames.values():
+        # A frame cannot use a faster I/O mode than its cluster.
+        io_mode = min(frame.can_io_mode, cluster_io_mode, key=_io_mode_rank)
+        if io_mode == constants.CanIoMode.CAN_FD_BRS and not can_fd_baud_rate:
+            raise errors.XnetError(
+                'Frame {} switches the bit rate, but cluster {} has no CAN FD baud rate'.format(
+                    frame.name, cluster.name),
+                _cconsts.NX_ERR_BAUD_RATE_NOT_CONFIGURED)
+        can_ext_id = frame.can_ext_id
+        frame_time = can_frame_time(frame.payload_len, baud_rate, can_ext_id, io_mode, can_fd_baud_rate)
+        timing_type = frame.can_timing_type
+        if timing_type in _REMOTE_TIMING_TYPES:
+            frame_time += can_frame_time(0, baud_rate, can_ext_id, io_mode, can_fd_baud_rate)
+        period = frame.can_tx_time or None
+        frames.append((_priority(frame.id, can_ext_id), frame.name, frame.id, can_ext_id, frame_time, period))
+    frames.sort(key=lambda values: values[0])
+
+    costs = [values[4] for values in frames]
+    periods = [values[5] for values in frames]
+    bit_time = 1 / baud_rate
+    if numpy is None:
+        response_times = _response_times(costs, periods, bit_time)
+    else:
+        response_times = _response_times_numpy(costs, periods, bit_time)
+    timings = [
+        CanFrameTiming(name, id, can_ext_id, frame_time, period, frame_time / period if period else None, response)
+        for (_, name, id, can_ext_id, frame_time, period), response in zip(frames, response_times)]
+    return CanBusAnalysis(cluster.name, baud_rate, can_fd_baud_rate, timings)
+
+
+def _io_mode_rank(io_mode):
+    # type: (constants.CanIoMode) -> int
+    return (constants.CanIoMode.CAN, constants.CanIoMode.CAN_FD, constants.CanIoMode.CAN_FD_BRS).index(io_mode)
+
+
+def _priority(id, can_ext_id):
+    # type: (int, bool) -> typing.Tuple[int, bool]
+    # Arbitration compares the 11 base identifier bits first, and a standard frame wins a tie.
+    return (id if can_ext_id else id << 18), bool(can_ext_id)
+
+
+def _blocking(costs):
+    # type: (typing.List[float]) -> typing.List[float]
+    """Returns for each frame the longest time of a lower priority frame or the frame itself."""
+    blocking = [0.0] * len(costs)
+    longest = 0.0
+    for index in range(len(costs) - 1, -1, -1):
+        longest = max(longest, costs[index])
+        blocking[index] = longest
+    return blocking
+
+
+def _response_times(costs, periods, bit_time):
+    # type: (typing.List[float], typing.List[typing.Optional[float]], float) -> typing.List[float]
+    response_times = []
+    higher = []  # type: typing.List[typing.Tuple[float, float]]
+    utilization = 0.0
+    for cost, period, blocking in zip(costs, periods, _blocking(costs)):
+        if utilization >= 1:
+            response_times.append(float('inf'))
+        else:
+            queuing = blocking
+            while True:
+                delay = blocking + sum(math.ceil((queuing + bit_time) / t) * c for c, t in higher)
+                if delay == queuing:
+                    break
+                queuing = delay
+            response_times.append(queuing + cost)
+        if period:
+            higher.append((cost, period))
+            utilization += cost / period
+    return response_times
+
+
+def _response_times_numpy(costs, periods, bit_time):
+    # type: (typing.List[float], typing.List[typing.Optional[float]], float) -> typing.List[float]
+    costs_array = numpy.array(costs, dtype=float)
+    blocking = numpy.array(_blocking(costs), dtype=float)
+    bounded = numpy.array([bool(period) for period in periods], dtype=bool)
+    higher_costs = costs_array[bounded]
+    higher_periods = numpy.array([period for period in periods if period], dtype=float)
+    # The number of frames with a period that have a higher priority than each frame.
+    num_higher = numpy.cumsum(bounded) - bounded
+    utilization = numpy.concatenate(([0.0], numpy.cumsum(higher_costs / higher_periods)))[num_higher]
+
+    # Frames usually share a few periods, so the interference is summed per period:
+    # row n of the prefix table holds the total time of the first n frames with each period.
+    unique_periods, period_index = numpy.unique(higher_periods, return_inverse=True)
+    if (higher_costs.size + 1) * unique_periods.size <= _MAX_PREFIX_ENTRIES:
+        prefix = numpy.zeros((higher_costs.size + 1, unique_periods.size))
+        prefix[numpy.arange(1, higher_costs.size + 1), period_index.ravel()] = higher_costs
+        prefix = numpy.cumsum(prefix, axis=0)
+
+        def interference(rows):
+            return unique_periods, prefix[num_higher[rows]]
+    else:
+        def interference(rows):
+            width = num_higher[rows].max()
+            mask = numpy.arange(width)[None, :] < num_higher[rows, None]
+            return higher_periods[:width], higher_costs[None, :width] * mask
+
+    queuing = blocking.copy()
+    active = numpy.flatnonzero(utilization < 1)
+    # Each pass moves every frame one step towards its fixed point,
+    # and keeps only the frames that have not reached it.
+    while active.size:
+        still_active = []
+        for start in range(0, active.size, _ROWS_PER_BLOCK):
+            rows = active[start:start + _ROWS_PER_BLOCK]
+            interference_periods, interference_costs = interference(rows)
+            instances = numpy.ceil((queuing[rows, None] + bit_time) / interference_periods[None, :])
+            delay = blocking[rows] + (instances * interference_costs).sum(axis=1)
+            changed = delay != queuing[rows]
+            queuing[rows] = delay
+            still_active.append(rows[changed])
+        active = numpy.concatenate(still_active)
+
+    response_times = queuing + costs_array
+    response_times[utilization >= 1] = float('inf')
+    return response_times.tolist()
@@ -5,3 +5,5 @@ from __future__ import print_function
 
 class DatabaseObject(object):
     """Database object interface."""
+
+    __slots__ = ()
@@ -0,0 +1,522 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+import io
+import os
+import re
+import typing  # NOQA: F401
+
+from nixnet import _cconsts
+from nixnet import constants
+from nixnet import errors
+
+from nixnet.database import _memory
+
+
+_CAN_EXTENDED_ID = 0x80000000
+_CAN_ID_MASK = 0x1FFFFFFF
+_NO_NODE = 'Vector__XXX'
+
+# Enum members are looked up once, because attribute access on an Enum class is slow
+# and signals are parsed hundreds of thousands of times in large files.
+_BIG_ENDIAN = constants.SigByteOrdr.BIG_ENDIAN
+_SIGNED = constants.SigDataType.SIGNED
+_UNSIGNED = constants.SigDataType.UNSIGNED
+
+# The text of a quoted string with backslash escapes, unrolled so that runs of plain characters match at once.
+_STRING = r'"([^"\\]*(?:\\.[^"\\]*)*)"'
+
+_BO_RE = re.compile(r'BO_\s+(\d+)\s+([^\s:]+)\s*:\s*(\d+)\s*(\S*)')
+_SG_RE = re.compile(
+    r'SG_\s+([^\s:]+)\s*(M|m\d+M?)?\s*:\s*'
+    r'(\d+)\s*\|\s*(\d+)\s*@\s*([01])\s*([+-])\s*'
+    r'\(\s*([^,\s]+)\s*,\s*([^)\s]+)\s*\)\s*'
+    r'\[\s*([^|\s]+)\s*\|\s*([^\]\s]+)\s*\]\s*' + _STRING + r'\s*(.*)')
+_TOKEN_RE = re.compile(_STRING + r'|([^\s",;:]+|[,;:])')
+_STRING_RE = re.compile(_STRING)
+
+# Comments, attributes, and value descriptions of frames and signals make up most statements of a large file,
+# so they are matched whole instead of tokenized. Other forms of the statements fall back to the tokenizer.
+_OBJECT = r'(?:BO_\s+(\d+)|SG_\s+(\d+)\s+([^\s";]+))'
+_CM_RE = re.compile(r'CM_\s+' + _OBJECT + r'\s*' + _STRING + r'\s*;$')
+_BA_RE = re.compile(r'BA_\s+"([^"\\]*)"\s+' + _OBJECT + r'\s+(?:' + _STRING + r'|([^\s";]+))\s*;$')
+_VAL_RE = re.compile(r'VAL_\s+(\d+)\s+([^\s";]+)((?:\s+[^\s";]+\s+"[^"\\]*(?:\\.[^"\\]*)*")*)\s*;$')
+_VAL_PAIR_RE = re.compile(r'([^\s";]+)\s+' + _STRING)
+
+# Statements that are complete on one line. Every other statement ends with a semicolon
+# and may span several lines, for example a comment containing line breaks.
+_LINE_KEYWORDS = frozenset(['VERSION', 'NS_', 'BS_', 'BU_', 'BO_', 'SG_'])
+
+
+# Keywords that name the object of a CM_ or BA_ statement, and the number of tokens naming it.
+_OBJECT_TOKEN_COUNTS = {'BU_': 2, 'BO_': 2, 'SG_': 3, 'EV_': 2}
+
+_Token = collections.namedtuple('_Token', ['text', 'quoted'])
+
+
+def load_dbc(filepath, encoding='cp1252'):
+    # type: (typing.Text, typing.Text) -> _memory.MemoryDatabase
+    """Read a CANdb (.dbc) file into an in-memory database without the NI-XNET driver.
+
+    The file is read in a single pass, one line at a time,
+    so memory use grows with the number of database objects rather than the file size.
+
+    As with :any:`Database`, the file contains a single cluster named ``Cluster``.
+    Frames, signals, multiplexed signals, ECUs, comments, value tables, and DBC attributes are imported.
+    The following DBC attributes also set the corresponding properties:
+
+    *   ``Baudrate`` and ``BaudrateCANFD`` set :any:`MemoryCluster` ``baud_rate`` and ``can_fd_baud_rate``.
+    *   ``VFrameFormat`` and ``CANFD_BRS`` set the frame ``can_ext_id``, ``can_io_mode``,
+        and ``application_protocol``.
+    *   ``GenMsgSendType``, ``GenMsgCycleTime``, and ``GenMsgDelayTime``
+        set the frame ``can_timing_type`` and ``can_tx_time``.
+    *   ``GenSigStartValue`` sets the signal ``default``.
+
+    Extended multiplexing (``SG_MUL_VAL_``) and environment variables are ignored.
+
+    Args:
+        filepath(str): Path of the DBC file.
+        encoding(str): Text encoding of the file.
+    Returns:
+        :any:`MemoryDatabase`: The database.
+    Raises:
+        :any:`XnetError`: The file contains a malformed statement.
+    """
+    database = _memory.MemoryDatabase(os.path.splitext(os.path.basename(filepath))[0])
+    parser = DbcParser(database, filepath)
+    with io.open(filepath, 'r', encoding=encoding, errors='replace') as stream:
+        parser.feed(stream)
+    parser.close()
+    return database
+
+
+class DbcParser(object):
+    """Incremental DBC parser that adds one cluster to a :any:`MemoryDatabase`."""
+
+    def __init__(self, database, source='<dbc>'):
+        # type: (_memory.MemoryDatabase, typing.Text) -> None
+        self._source = source
+        self._cluster = database.clusters.add('Cluster')
+        self._frames = {}  # type: typing.Dict[int, _memory.MemoryFrame]
+        self._signals = {}  # type: typing.Dict[typing.Tuple[int, typing.Text], _memory.MemorySignal]
+        self._received = collections.defaultdict(set)  # type: typing.Dict[typing.Text, typing.Set[int]]
+        self._attribute_kinds = collections.defaultdict(list)  # type: typing.Dict[typing.Text, typing.List[typing.Text]]  # NOQA: E501
+        self._frame = None  # type: typing.Optional[_memory.MemoryFrame]
+        self._frame_id = 0
+        self._pending = []  # type: typing.List[typing.Text]
+        self._in_namespace = False
+        self._line_number = 0
+
+    def feed(self, lines):
+        # type: (typing.Iterable[typing.Text]) -> None
+        """Parse more lines of the file."""
+        for line in lines:
+            self._line_number += 1
+            line = line.strip()
+
+            if self._pending:
+                self._pending.append(line)
+                statement = '\n'.join(self._pending)
+                if _is_complete(statement):
+                    self._pending = []
+                    self._parse_statement(statement)
+                continue
+
+            if not line or line.startswith('//'):
+                continue
+            if self._in_namespace:
+                # NS_ is followed by a list of keywords, one per line.
+                if ':' not in line and len(line.split()) == 1:
+                    continue
+                self._in_namespace = False
+
+            if line.startswith('SG_ '):
+                # Signals make up most of a large file, so they skip the keyword dispatch.
+                self._parse_signal(line)
+                continue
+            if line[:4] in self._OBJECT_STATEMENTS and self._parse_object_statement(line):
+                continue
+
+            keyword = line.split(None, 1)[0].rstrip(':')
+            if keyword in _LINE_KEYWORDS:
+                self._parse_line(keyword, line)
+            elif _is_complete(line):
+                self._parse_statement(line)
+            else:
+                self._pending = [line]
+
+    def close(self):
+        # type: () -> None
+        """Finish parsing and apply the DBC attributes that map to properties."""
+        if self._pending:
+            self._error('Statement is not terminated: {}'.format(self._pending[0]))
+        self._cluster._changed()
+        self._apply_attributes()
+
+    def _error(self, message):
+        # type: (typing.Text) -> typing.NoReturn
+        raise errors.XnetError(
+            '{}:{}: {}'.format(self._source, self._line_number, message),
+            _cconsts.NX_ERR_CANNOT_OPEN_DATABASE_FILE)
+
+    def _parse_line(self, keyword, line):
+        # type: (typing.Text, typing.Text) -> None
+        if keyword == 'SG_':
+            self._parse_signal(line)
+        elif keyword == 'BO_':
+            self._parse_frame(line)
+        elif keyword == 'BU_':
+            for name in line.split(':', 1)[1].split():
+                self._get_ecu(name)
+        elif keyword == 'NS_':
+            self._in_namespace = True
+
+    def _parse_frame(self, line):
+        # type: (typing.Text) -> None
+        match = _BO_RE.match(line)
+        if match is None:
+            self._error('Malformed frame: {}'.format(line))
+        frame_id, name, payload_len, transmitter = match.groups()
+        frame_id = int(frame_id)
+        payload_len = int(payload_len)
+
+        frame = self._cluster.frames._insert(_memory.MemoryFrame(self._cluster, name))
+        frame.id = frame_id & _CAN_ID_MASK
+        frame.can_ext_id = bool(frame_id & _CAN_EXTENDED_ID)
+        frame.payload_len = payload_len
+        frame.default_payload = [0] * payload_len
+        self._frames[frame_id] = frame
+        self._frame = frame
+        self._frame_id = frame_id
+
+        if transmitter and transmitter != _NO_NODE:
+            self._get_ecu(transmitter).tx_frms.append(frame)
+
+    def _parse_signal(self, line):
+        # type: (typing.Text) -> None
+        match = _SG_RE.match(line)
+        if match is None:
+            self._error('Malformed signal: {}'.format(line))
+        frame = self._frame
+        if frame is None:
+            self._error('Signal is outside a frame: {}'.format(line))
+        (name, mux, start_bit, num_bits, byte_order, sign,
+         scale_fac, scale_off, minimum, maximum, unit, receivers) = match.groups()
+
+        if not mux:
+            signal = frame.mux_static_signals._insert(_memory.MemorySignal(frame, name))
+        elif mux.startswith('m'):
+            mux_value = int(mux.rstrip('M')[1:])
+            subframe_name = 'Mux{}'.format(mux_value)
+            if subframe_name in frame.mux_subframes:
+                subframe = frame.mux_subframes[subframe_name]
+            else:
+                subframe = frame.mux_subframes.add(subframe_name)
+                subframe.mux_value = mux_value
+            signal = subframe.dyn_signals._insert(_memory.MemorySignal(subframe, name))
+        else:
+            signal = frame.mux_static_signals._insert(_memory.MemorySignal(frame, name))
+            signal.mux_is_data_mux = True
+
+        num_bits = int(num_bits)
+        start_bit = int(start_bit)
+        if byte_order == '0':
+            signal.byte_ordr = _BIG_ENDIAN
+            start_bit = _motorola_lsb(start_bit, num_bits)
+        signal.start_bit = start_bit
+        signal.num_bits = num_bits
+        signal.data_type = _SIGNED if sign == '-' else _UNSIGNED
+        signal.scale_fac = float(scale_fac)
+        signal.scale_off = float(scale_off)
+        signal.min = float(minimum)
+        signal.max = float(maximum)
+        if unit:
+            signal.unit = _unescape(unit) if '\\' in unit else unit
+        self._signals[(self._frame_id, name)] = signal
+
+        if receivers != _NO_NODE:
+            for receiver in receivers.replace(',', ' ').split():
+                received = self._received[receiver]
+                if receiver != _NO_NODE and self._frame_id not in received:
+                    received.add(self._frame_id)
+                    self._get_ecu(receiver).rx_frms.append(frame)
+
+    def _parse_statement(self, statement):
+        # type: (typing.Text) -> None
+        if statement[:4] in self._OBJECT_STATEMENTS and self._parse_object_statement(statement):
+            return
+        tokens = _tokenize(statement)
+        keyword = tokens[0].text
+        handler = self._STATEMENTS.get(keyword)
+        if handler is not None:
+            try:
+                handler(self, tokens[1:])
+            except (IndexError, ValueError, KeyError) as e:
+                self._error('Malformed {} statement ({}): {}'.format(keyword, e, statement))
+
+    def _parse_object_statement(self, statement):
+        # type: (typing.Text) -> bool
+        """Parse a whole comment, attribute, or value description statement of a frame or signal.
+
+        Return ``False`` for other statements, which need the tokenizer.
+        """
+        expression, handler = self._OBJECT_STATEMENTS[statement[:4]]
+        match = expression.match(statement)
+        if match is None:
+            return False
+        try:
+            handler(self, match)
+        except (ValueError, KeyError) as e:
+            self._error('Malformed {} statement ({}): {}'.format(statement.split(None, 1)[0], e, statement))
+        return True
+
+    def _get_frame_or_signal(self, frame_id, signal_frame_id, signal_name):
+        # type: (typing.Optional[typing.Text], typing.Optional[typing.Text], typing.Optional[typing.Text]) -> _memory._MemoryObject  # NOQA: E501
+        if frame_id is not None:
+            return self._frames[int(frame_id)]
+        return self._signals[(int(signal_frame_id), signal_name)]
+
+    def _parse_object_comment(self, match):
+        # type: (typing.Match) -> None
+        frame_id, signal_frame_id, signal_name, text = match.groups()
+        self._get_frame_or_signal(frame_id, signal_frame_id, signal_name).comment = _unescape(text)
+
+    def _parse_object_attribute(self, match):
+        # type: (typing.Match) -> None
+        name, frame_id, signal_frame_id, signal_name, text, value = match.groups()
+        obj = self._get_frame_or_signal(frame_id, signal_frame_id, signal_name)
+        obj._get_dbc_attribute_values()[name] = _unescape(text) if value is None else value
+
+    def _parse_signal_value_descriptions(self, match):
+        # type: (typing.Match) -> None
+        frame_id, name, pairs = match.groups()
+        value_table = self._signals[(int(frame_id), name)]._get_value_table()
+        for value, label in _VAL_PAIR_RE.findall(pairs):
+            value_table[_unescape(label)] = int(float(value))
+
+    def _parse_comment(self, tokens):
+        # type: (typing.List[_Token]) -> None
+        obj = self._get_object(tokens)
+        if obj is not None:
+            obj.comment = _unescape(tokens[_object_token_count(tokens)].text)
+
+    def _parse_attribute_definition(self, tokens):
+        # type: (typing.List[_Token]) -> None
+        kind = u''
+        if not tokens[0].quoted:
+            kind = tokens[0].text
+            tokens = tokens[1:]
+        name = tokens[0].text
+        enums = []  # type: typing.List[typing.Text]
+        if tokens[1].text == 'ENUM':
+            enums = [_unescape(token.text) for token in tokens[2:] if token.quoted]
+        definitions = self._cluster._dbc_attribute_definitions.setdefault(kind, collections.OrderedDict())
+        definitions[name] = [u'', enums]
+        self._attribute_kinds[name].append(kind)
+
+    def _parse_attribute_default(self, tokens):
+        # type: (typing.List[_Token]) -> None
+        name = tokens[0].text
+        value = _unescape(tokens[1].text)
+        for kind in self._attribute_kinds.get(name, ()):
+            self._cluster._dbc_attribute_definitions[kind][name][0] = value
+
+    def _parse_attribute(self, tokens):
+        # type: (typing.List[_Token]) -> None
+        name = tokens[0].text
+        obj = self._get_object(tokens[1:])
+        if obj is not None:
+            obj._get_dbc_attribute_values()[name] = _unescape(tokens[1 + _object_token_count(tokens[1:])].text)
+
+    def _parse_value_descriptions(self, tokens):
+        # type: (typing.List[_Token]) -> None
+        if not tokens[0].text.isdigit():
+            # Value descriptions of an environment variable.
+            return
+        signal = self._signals[(int(tokens[0].text), tokens[1].text)]
+        pairs = tokens[2:]
+        for value, label in zip(pairs[0::2], pairs[1::2]):
+            if label.text == ';':
+                break
+            signal._get_value_table()[_unescape(label.text)] = int(float(value.text))
+
+    def _parse_signal_value_type(self, tokens):
+        # type: (typing.List[_Token]) -> None
+        signal = self._signals[(int(tokens[0].text), tokens[1].text)]
+        value_type = [token.text for token in tokens[2:] if token.text not in (':', ';')][0]
+        if value_type in ('1', '2'):
+            signal.data_type = constants.SigDataType.IEEE_FLOAT
+
+    def _parse_frame_transmitters(self, tokens):
+        # type: (typing.List[_Token]) -> None
+        frame = self._frames[int(tokens[0].text)]
+        for token in tokens[1:]:
+            if token.text not in (':', ',', ';'):
+                ecu = self._get_ecu(token.text)
+                if frame not in ecu.tx_frms:
+                    ecu.tx_frms.append(frame)
+
+    # Statements of frames and signals matched whole, by their first four characters.
+    _OBJECT_STATEMENTS = {
+        'CM_ ': (_CM_RE, _parse_object_comment),
+        'BA_ ': (_BA_RE, _parse_object_attribute),
+        'VAL_': (_VAL_RE, _parse_signal_value_descriptions),
+    }
+
+    _STATEMENTS = {
+        'CM_': _parse_comment,
+        'BA_DEF_': _parse_attribute_definition,
+        'BA_DEF_DEF_': _parse_attribute_default,
+        'BA_': _parse_attribute,
+        'VAL_': _parse_value_descriptions,
+        'SIG_VALTYPE_': _parse_signal_value_type,
+        'BO_TX_BU_': _parse_frame_transmitters,
+    }
+
+    def _get_object(self, tokens):
+        # type: (typing.List[_Token]) -> typing.Optional[_memory._MemoryObject]
+        """Return the object that a CM_ or BA_ statement refers to."""
+        if _object_token_count(tokens) == 0:
+            return self._cluster
+        kind = tokens[0].text
+        if kind == 'BU_':
+            return self._get_ecu(tokens[1].text)
+        elif kind == 'BO_':
+            return self._frames[int(tokens[1].text)]
+        elif kind == 'SG_':
+            return self._signals[(int(tokens[1].text), tokens[2].text)]
+        return None
+
+    def _get_ecu(self, name):
+        # type: (typing.Text) -> _memory.MemoryEcu
+        ecus = self._cluster.ecus
+        return ecus[name] if name in ecus else ecus.add(name)
+
+    def _apply_attributes(self):
+        # type: () -> None
+        cluster = self._cluster
+        cluster_attributes = dict((name, value) for name, (value, _) in cluster.dbc_attributes.items())
+        if cluster_attributes.get('Baudrate'):
+            cluster.baud_rate = int(float(cluster_attributes['Baudrate']))
+        if cluster_attributes.get('BaudrateCANFD'):
+            cluster.can_fd_baud_rate = int(float(cluster_attributes['BaudrateCANFD']))
+
+        frame_definitions = cluster._dbc_attribute_definitions.get('BO_', {})
+        signal_definitions = cluster._dbc_attribute_definitions.get('SG_', {})
+        io_modes = set()
+        for frame in cluster.frames.values():
+            if frame_definitions:
+                _apply_frame_attributes(frame, frame.dbc_attributes)
+            io_modes.add(frame.can_io_mode)
+            if 'GenSigStartValue' in signal_definitions:
+                for signal in frame.sigs:
+                    start_value = signal.dbc_attributes['GenSigStartValue'][0]
+                    if start_value:
+                        signal.default = float(start_value) * signal.scale_fac + signal.scale_off
+
+        if constants.CanIoMode.CAN_FD_BRS in io_modes:
+            cluster.can_io_mode = constants.CanIoMode.CAN_FD_BRS
+        elif constants.CanIoMode.CAN_FD in io_modes:
+            cluster.can_io_mode = constants.CanIoMode.CAN_FD
+
+
+def _apply_frame_attributes(frame, attributes):
+    # type: (_memory.MemoryFrame, _memory.MemoryDbcAttributeCollection) -> None
+    def get(name):
+        return attributes[name][0] if name in attributes else u''
+
+    frame_format = get('VFrameFormat')
+    if frame_format.startswith('Extended') or frame_format == 'J1939PG':
+        frame.can_ext_id = True
+    if frame_format == 'J1939PG':
+        frame.application_protocol = constants.AppProtocol.J1939
+    if frame_format.endswith('_FD'):
+        if get('CANFD_BRS') == '1':
+            frame.can_io_mode = constants.CanIoMode.CAN_FD_BRS
+        else:
+            frame.can_io_mode = constants.CanIoMode.CAN_FD
+
+    send_type = get('GenMsgSendType')
+    cycle_time = float(get('GenMsgCycleTime') or 0)
+    delay_time = float(get('GenMsgDelayTime') or 0)
+    if send_type == 'Cyclic' and cycle_time > 0:
+        frame.can_timing_type = constants.FrmCanTiming.CYCLIC_DATA
+        frame.can_tx_time = cycle_time / 1000
+    elif send_type.startswith('Cyclic') and cycle_time > 0:
+        frame.can_timing_type = constants.FrmCanTiming.CYCLIC_EVENT
+        frame.can_tx_time = cycle_time / 1000
+    else:
+        frame.can_timing_type = constants.FrmCanTiming.EVENT_DATA
+        frame.can_tx_time = delay_time / 1000
+
+
+def _is_complete(statement):
+    # type: (typing.Text) -> bool
+    """Return whether a statement ends with a semicolon outside of a string.
+
+    >>> _is_complete('CM_ "a;')
+    False
+    >>> _is_complete('CM_ "a;\\nb";')
+    True
+    >>> _is_complete('CM_ "a\\\\\\"b;')
+    False
+    >>> _is_complete('CM_ "a\\\\\\\\";')
+    True
+    """
+    if '\\' in statement:
+        # An escaped backslash may come before a closing quote, so strings are matched whole.
+        statement = _STRING_RE.sub('', statement)
+        return '"' not in statement and statement.rstrip().endswith(';')
+    return statement.count('"') % 2 == 0 and statement.rstrip().endswith(';')
+
+
+def _tokenize(statement):
+    # type: (typing.Text) -> typing.List[_Token]
+    """Split a statement into words, punctuation, and quoted strings.
+
+    >>> [tuple(token) for token in _tokenize('BA_ "Name" BO_ 1 "a b";')]
+    [('BA_', False), ('Name', True), ('BO_', False), ('1', False), ('a b', True), (';', False)]
+    """
+    return [_Token(word, False) if word else _Token(text, True) for text, word in _TOKEN_RE.findall(statement)]
+
+
+def _object_token_count(tokens):
+    # type: (typing.List[_Token]) -> int
+    """Return the number of tokens that identify the object of a CM_ or BA_ statement.
+
+    Network comments and attributes have no object, and an attribute value may be an unquoted number.
+
+    >>> _object_token_count(_tokenize('SG_ 1 Speed "comment";'))
+    3
+    >>> _object_token_count(_tokenize('250000;'))
+    0
+    """
+    if tokens[0].quoted:
+        return 0
+    return _OBJECT_TOKEN_COUNTS.get(tokens[0].text, 0)
+
+
+def _unescape(text):
+    # type: (typing.Text) -> typing.Text
+    if '\\' not in text:
+        return text
+    return text.replace('\\"', '"').replace('\\\\', '\\')
+
+
+def _motorola_lsb(start_bit, num_bits):
+    # type: (int, int) -> int
+    """Convert the most significant bit position of a DBC big-endian signal to the least significant.
+
+    >>> _motorola_lsb(7, 8)
+    0
+    >>> _motorola_lsb(7, 16)
+    8
+    >>> _motorola_lsb(3, 12)
+    8
+    """
+    position = start_bit
+    for _ in range(num_bits - 1):
+        position = position + 15 if position % 8 == 0 else position - 1
+    return position
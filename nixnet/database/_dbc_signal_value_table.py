@@ -9,6 +9,16 @@ import typing  # NOQA: F401
 from nixnet import _funcs
 from nixnet import constants
 
+try:
+    import numpy  # type: ignore
+except ImportError:
+    numpy = None
+
+# A dense lookup array is used while it needs at most this many entries per label,
+# so a table with a few large raw values does not allocate a huge array.
+_DENSE_MIN_ENTRIES = 256
+_DENSE_ENTRIES_PER_LABEL = 16
+
 
 class DbcSignalValueTable(collections.Mapping):
     """Collection for accessing a DBC signal value table."""
@@ -80,6 +90,17 @@ class DbcSignalValueTable(collections.Mapping):
         """
         return iter(self._value_table.items())
 
+    def compile(self):
+        # type: () -> CompiledValueTable
+        """Compile the value table for converting many values at once.
+
+            The value table is read from the database once.
+
+            Returns:
+                :any:`CompiledValueTable`
+        """
+        return CompiledValueTable(self._value_table)
+
     @property
     def _value_table(self):
         # type: () -> typing.Dict[typing.Text, int]
@@ -100,3 +121,177 @@ class DbcSignalValueTable(collections.Mapping):
             (key, int(value))
             for value, key in zip(table_list[0::2], table_list[1::2]))
         return table_dict
+
+
+class CompiledValueTable(object):
+    """Value table compiled for converting many raw values at once.
+
+    The labels are sorted by raw value,
+    and each label's index in :any:`CompiledValueTable.labels` is its code.
+    Raw values that are not in the table have the code ``-1``.
+    When NumPy is installed, the conversions take and return NumPy arrays,
+    and look up raw values in a dense array when the raw values are close together,
+    or with a binary search in the sorted raw values otherwise.
+    Without NumPy, they take any iterable and return lists.
+
+    When two labels have the same raw value,
+    raw values are decoded to the first label in sorted order.
+
+    >>> table = CompiledValueTable({'Off': 0, 'On': 1, 'Error': 3})
+    >>> print(', '.join(table.labels))
+    Off, On, Error
+    >>> [int(code) for code in table.codes([3, 0, 2])]
+    [2, 0, -1]
+    >>> [str(label) for label in table.decode([3, 0, 2], default='?')]
+    ['Error', 'Off', '?']
+    >>> [int(value) for value in table.encode(['On', 'Error'])]
+    [1, 3]
+
+    Attributes:
+        labels(tuple of str): Value descriptions, sorted by raw value.
+        raw_values(tuple of int): Raw value of each label.
+        dense(bool): Whether raw values are looked up in a dense array instead of with a binary search.
+    """
+
+    def __init__(self, value_table):
+        # type: (typing.Mapping[typing.Text, int]) -> None
+        pairs = sorted((int(value), label) for label, value in value_table.items())
+        self.labels = tuple(label for _, label in pairs)  # type: typing.Tuple[typing.Text, ...]
+        self.raw_values = tuple(value for value, _ in pairs)  # type: typing.Tuple[int, ...]
+        self._label_values = dict(value_table.items())  # type: typing.Dict[typing.Text, int]
+        self._value_codes = {}  # type: typing.Dict[int, int]
+        for code, value in enumerate(self.raw_values):
+            self._value_codes.setdefault(value, code)
+
+        self._minimum = self.raw_values[0] if pairs else 0
+        span = self.raw_values[-1] - self._minimum + 1 if pairs else 0
+        self.dense = span <= max(_DENSE_MIN_ENTRIES, _DENSE_ENTRIES_PER_LABEL * len(pairs))
+        if numpy is not None:
+            self._sorted_values = numpy.array(self.raw_values, dtype=numpy.int64)
+            self._dense_codes = None
+            by_label = sorted(self._label_values.items())
+            self._sorted_labels = numpy.array([label for label, _ in by_label], dtype='U')
+            self._sorted_label_values = numpy.array([value for _, value in by_label], dtype=numpy.int64)
+            if self.dense:
+                self._dense_codes = numpy.full(span, -1, dtype=numpy.int64)
+                for value, code in self._value_codes.items():
+                    self._dense_codes[value - self._minimum] = code
+
+    def __repr__(self):
+        return '{}(labels={}, dense={})'.format(type(self).__name__, len(self.labels), self.dense)
+
+    def __len__(self):
+        return len(self.labels)
+
+    def codes(self, raw_values):
+        """Convert raw values to label codes.
+
+        Args:
+            raw_values: Raw signal values. Floating-point values that are not whole numbers have no label.
+        Returns:
+            The code of each raw value, or ``-1`` for values that are not in the table.
+        """
+        if numpy is None:
+            return [self._value_codes.get(value, -1) for value in raw_values]
+
+        raw_values = numpy.asarray(raw_values)
+        if raw_values.dtype.kind not in 'biuf':
+            raise TypeError(raw_values.dtype)
+        if not self.labels:
+            return numpy.full(raw_values.shape, -1, dtype=numpy.int64)
+
+        # Values outside the table are masked in their own dtype, so that the cast to int64 cannot wrap.
+        in_table = _within(raw_values, self.raw_values[0], self.raw_values[-1])
+        values = numpy.where(in_table, raw_values, self._minimum).astype(numpy.int64)
+        if self._dense_codes is not None:
+            codes = self._dense_codes[values - self._minimum]
+            found = in_table
+        else:
+            index = numpy.minimum(numpy.searchsorted(self._sorted_values, values), len(self.labels) - 1)
+            found = in_table & (self._sorted_values[index] == values)
+            codes = index
+        return numpy.where(found, codes, -1)
+
+    def decode(self, raw_values, default=None):
+        """Convert raw values to labels.
+
+        Args:
+            raw_values: Raw signal values.
+            default: Label of the raw values that are not in the table.
+        Returns:
+            The label of each raw value. With NumPy, this is an array of ``object`` dtype.
+        """
+        codes = self.codes(raw_values)
+        if numpy is None:
+            return [self.labels[code] if code >= 0 else default for code in codes]
+
+        # Code -1 indexes the last entry, which holds the default.
+        lookup = numpy.empty(len(self.labels) + 1, dtype=object)
+        lookup[:-1] = self.labels
+        lookup[-1] = default
+        return lookup[codes]
+
+    def encode(self, labels):
+        """Convert labels to raw values.
+
+        Args:
+            labels: Value descriptions.
+        Returns:
+            The raw value of each label.
+        Raises:
+            KeyError: A label is not in the table.
+        """
+        if numpy is None:
+            return [self._label_values[label] for label in labels]
+
+        labels = numpy.asarray(labels)
+        if labels.dtype.kind != 'U' or not self.labels:
+            values = [self._label_values[label] for label in labels.ravel().tolist()]
+            return numpy.array(values, dtype=numpy.int64).reshape(labels.shape)
+
+        index = numpy.minimum(numpy.searchsorted(self._sorted_labels, labels), len(self.labels) - 1)
+        found = self._sorted_labels[index] == labels
+        if not found.all():
+            raise KeyError(labels[~found].flat[0])
+        return self._sorted_label_values[index]
+
+    def encode_codes(self, codes):
+        """Convert label codes to raw values.
+
+        Args:
+            codes: Codes, as returned by :any:`CompiledValueTable.codes`.
+        Returns:
+            The raw value of each code.
+        Raises:
+            IndexError: A code is not the index of a label.
+        """
+        if numpy is None:
+            return [self._code_value(code) for code in codes]
+
+        codes = numpy.asarray(codes, dtype=numpy.int64)
+        if codes.size and (codes.min() < 0 or codes.max() >= len(self.labels)):
+            raise IndexError('Codes must be from 0 to {}'.format(len(self.labels) - 1))
+        return self._sorted_values[codes]
+
+    def _code_value(self, code):
+        # type: (int) -> int
+        if not 0 <= code < len(self.labels):
+            raise IndexError('Codes must be from 0 to {}'.format(len(self.labels) - 1))
+        return self.raw_values[code]
+
+
+def _within(values, minimum, maximum):
+    # type: (typing.Any, int, int) -> typing.Any
+    """Return where the whole values of a NumPy array are from ``minimum`` to ``maximum``."""
+    if values.dtype.kind == 'f':
+        # 2 ** 63 is the first float that does not fit in int64; the float bounds can round up to it.
+        in_range = (values >= minimum) & (values <= maximum) & (values < 2.0 ** 63)
+        return in_range & (numpy.floor(values) == values)
+    if values.dtype.kind == 'b':
+        values = values.astype(numpy.uint8)
+    info = numpy.iinfo(values.dtype)
+    minimum = max(minimum, info.min)
+    maximum = min(maximum, info.max)
+    if minimum > maximum:
+        return numpy.zeros(values.shape, dtype=bool)
+    return (values >= values.dtype.type(minimum)) & (values <= values.dtype.type(maximum))
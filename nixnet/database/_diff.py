@@ -0,0 +1,319 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+import enum
+import typing  # NOQA: F401
+
+import six
+
+from nixnet import constants
+from nixnet import errors
+
+from nixnet.database import _cluster
+from nixnet.database import _ecu
+from nixnet.database import _frame
+from nixnet.database import _lin_sched
+from nixnet.database import _lin_sched_entry
+from nixnet.database import _memory  # NOQA: F401
+from nixnet.database import _pdu
+from nixnet.database import _signal
+from nixnet.database import _subframe
+
+
+_MISSING = object()
+
+# Properties that refer to other objects. They are compared by the names of those objects.
+_REFERENCES = ('collision_res_sched', 'frames', 'pdu_properties', 'rx_frms', 'tx_frms')
+
+# Properties whose name starts with one of these only apply to that protocol.
+# Reading them from a driver object of another protocol is an error, so they are skipped.
+_PROTOCOL_PREFIXES = {
+    'can_': constants.Protocol.CAN,
+    'j1939_': constants.Protocol.CAN,
+    'flex_ray_': constants.Protocol.FLEX_RAY,
+    'lin_': constants.Protocol.LIN,
+}
+
+
+def _settable_properties(driver_class):
+    # type: (typing.Any) -> typing.Tuple[typing.Text, ...]
+    names = [
+        name
+        for klass in driver_class.__mro__
+        for name, value in vars(klass).items()
+        if isinstance(value, property) and value.fset is not None and name != 'name']
+    return tuple(sorted(set(names)))
+
+
+_PROPERTIES = {
+    constants.ObjectClass.CLUSTER: _settable_properties(_cluster.Cluster),
+    constants.ObjectClass.FRAME: _settable_properties(_frame.Frame),
+    constants.ObjectClass.PDU: _settable_properties(_pdu.Pdu),
+    constants.ObjectClass.SUBFRAME: _settable_properties(_subframe.SubFrame),
+    constants.ObjectClass.SIGNAL: _settable_properties(_signal.Signal),
+    constants.ObjectClass.ECU: _settable_properties(_ecu.Ecu),
+    constants.ObjectClass.LIN_SCHED: _settable_properties(_lin_sched.LinSched),
+    constants.ObjectClass.LIN_SCHED_ENTRY: _settable_properties(_lin_sched_entry.LinSchedEntry),
+}
+
+# The properties of each object class that apply to a protocol, filled in as they are needed.
+_PROTOCOL_PROPERTIES = {}  # type: typing.Dict[typing.Tuple[constants.ObjectClass, constants.Protocol], typing.Tuple]
+
+
+class DatabaseSnapshot(object):
+    """The properties of every object in a database, read once.
+
+    Reading a driver database property by property is slow.
+    A snapshot reads each object once into plain Python values,
+    so that comparing two databases with :any:`diff_databases` needs no further driver calls.
+
+    Objects are keyed by their class and path, such as ``(ObjectClass.SIGNAL, 'myCluster.myFrame.mySignal')``.
+    Dynamic signals are qualified by their frame, as in :any:`Database.find`.
+    References to other objects are stored as names,
+    and ``pdu_properties`` as ``(pdu, start_bit, update_bit)`` tuples.
+    DBC attribute values are stored as ``dbc_attributes`` and signal value tables as ``dbc_signal_value_table``.
+
+    Args:
+        database: A :any:`Database` or :any:`MemoryDatabase`.
+    """
+
+    def __init__(self, database):
+        # type: (typing.Any) -> None
+        self.objects = collections.OrderedDict()  # type: typing.Dict[typing.Tuple, typing.Dict]
+        for cluster_name, cluster in database.clusters.items():
+            self._add_cluster(cluster_name, cluster)
+
+    def __repr__(self):
+        return '{}(objects={})'.format(type(self).__name__, len(self.objects))
+
+    def __len__(self):
+        return len(self.objects)
+
+    def _add(self, object_class, path, obj, protocol):
+        # type: (constants.ObjectClass, typing.Text, typing.Any, constants.Protocol) -> None
+        self.objects[(object_class, path)] = _read(object_class, obj, protocol)
+
+    def _add_cluster(self, cluster_name, cluster):
+        # type: (typing.Text, typing.Any) -> None
+        protocol = cluster.protocol
+        self._add(constants.ObjectClass.CLUSTER, cluster_name, cluster, protocol)
+        for object_class, collection, signals in (
+                (constants.ObjectClass.PDU, cluster.pdus, 'mux_static_sigs'),
+                (constants.ObjectClass.FRAME, cluster.frames, 'mux_static_signals')):
+            for name, container in collection.items():
+                path = u'{}.{}'.format(cluster_name, name)
+                self._add(object_class, path, container, protocol)
+                for signal_name, signal in getattr(container, signals).items():
+                    self._add(constants.ObjectClass.SIGNAL, u'{}.{}'.format(path, signal_name), signal, protocol)
+                for subframe_name, subframe in container.mux_subframes.items():
+                    self._add(constants.ObjectClass.SUBFRAME, u'{}.{}'.format(path, subframe_name), subframe, protocol)
+                    for signal_name, signal in subframe.dyn_signals.items():
+                        self._add(constants.ObjectClass.SIGNAL, u'{}.{}'.format(path, signal_name), signal, protocol)
+        for name, ecu in cluster.ecus.items():
+            self._add(constants.ObjectClass.ECU, u'{}.{}'.format(cluster_name, name), ecu, protocol)
+        for name, sched in cluster.lin_schedules.items():
+            path = u'{}.{}'.format(cluster_name, name)
+            self._add(constants.ObjectClass.LIN_SCHED, path, sched, protocol)
+            for entry_name, entry in sched.entries.items():
+                self._add(constants.ObjectClass.LIN_SCHED_ENTRY, u'{}.{}'.format(path, entry_name), entry, protocol)
+
+
+ObjectDiff_ = collections.namedtuple(
+    'ObjectDiff_',
+    ['change', 'object_class', 'path', 'before', 'after'])
+
+
+class ObjectDiff(ObjectDiff_):
+    """An object that differs between two databases.
+
+    Attributes:
+        change(str): :any:`ObjectDiff.ADDED`, :any:`ObjectDiff.REMOVED`, or :any:`ObjectDiff.CHANGED`.
+        object_class(:any:`ObjectClass`): Class of the object.
+        path(str): Path of the object, such as ``myCluster.myFrame.mySignal``.
+        before(dict): Properties in the old database. For changed objects, only the properties that changed.
+            Empty for added objects.
+        after(dict): Properties in the new database. For changed objects, only the properties that changed.
+            Empty for removed objects.
+    """
+
+    ADDED = 'added'
+    REMOVED = 'removed'
+    CHANGED = 'changed'
+
+    def to_dict(self):
+        # type: () -> typing.Dict[typing.Text, typing.Any]
+        """Return the difference as plain values that ``json.dumps`` accepts.
+
+        Enumerated values are replaced by their names.
+        """
+        return {
+            'change': self.change,
+            'object_class': self.object_class.name,
+            'path': self.path,
+            'before': _plain(self.before),
+            'after': _plain(self.after),
+        }
+
+
+class DatabaseDiff(object):
+    """Differences between two databases, returned by :any:`diff_databases`.
+
+    Iterating yields every :any:`ObjectDiff`: first the removed, then the added, then the changed objects,
+    each in database order.
+    """
+
+    def __init__(self, removed, added, changed):
+        # type: (typing.List[ObjectDiff], typing.List[ObjectDiff], typing.List[ObjectDiff]) -> None
+        self.removed = removed
+        self.added = added
+        self.changed = changed
+
+    def __repr__(self):
+        return '{}(removed={}, added={}, changed={})'.format(
+            type(self).__name__, len(self.removed), len(self.added), len(self.changed))
+
+    def __len__(self):
+        return len(self.removed) + len(self.added) + len(self.changed)
+
+    def __iter__(self):
+        for diffs in (self.removed, self.added, self.changed):
+            for diff in diffs:
+                yield diff
+
+    def to_dict(self):
+        # type: () -> typing.Dict[typing.Text, typing.List[typing.Dict[typing.Text, typing.Any]]]
+        """Return the differences as plain values that ``json.dumps`` accepts."""
+        return {
+            ObjectDiff.REMOVED: [diff.to_dict() for diff in self.removed],
+            ObjectDiff.ADDED: [diff.to_dict() for diff in self.added],
+            ObjectDiff.CHANGED: [diff.to_dict() for diff in self.changed],
+        }
+
+
+def diff_databases(old, new):
+    # type: (typing.Any, typing.Any) -> DatabaseDiff
+    """Compare two databases object by object.
+
+    Objects are matched by class and path, so the comparison takes time linear in the number of objects.
+    A renamed object shows as removed and added.
+
+    >>> old = _memory.MemoryDatabase('old')
+    >>> frame = old.clusters.add('Body').frames.add('Doors')
+    >>> new = _memory.MemoryDatabase('new')
+    >>> frame = new.clusters.add('Body').frames.add('Doors')
+    >>> frame.can_tx_time = 0.1
+    >>> for change in diff_databases(old, new):
+    ...     print(change.change, change.path, change.before, change.after)
+    changed Body.Doors {'can_tx_time': 0.0} {'can_tx_time': 0.1}
+
+    Args:
+        old: The old :any:`Database`, :any:`MemoryDatabase`, or :any:`DatabaseSnapshot`.
+        new: The new :any:`Database`, :any:`MemoryDatabase`, or :any:`DatabaseSnapshot`.
+    Returns:
+        :any:`DatabaseDiff`: The removed, added, and changed objects.
+    """
+    old_objects = _snapshot(old).objects
+    new_objects = _snapshot(new).objects
+    removed = [
+        ObjectDiff(ObjectDiff.REMOVED, key[0], key[1], properties, {})
+        for key, properties in old_objects.items()
+        if key not in new_objects]
+    added = []
+    changed = []
+    for key, after in new_objects.items():
+        before = old_objects.get(key)
+        if before is None:
+            added.append(ObjectDiff(ObjectDiff.ADDED, key[0], key[1], {}, after))
+            continue
+        names = [name for name in after if before.get(name, _MISSING) != after[name]]
+        names.extend(name for name in before if name not in after)
+        if names:
+            changed.append(ObjectDiff(
+                ObjectDiff.CHANGED, key[0], key[1],
+                dict((name, before[name]) for name in names if name in before),
+                dict((name, after[name]) for name in names if name in after)))
+    return DatabaseDiff(removed, added, changed)
+
+
+def _snapshot(database):
+    # type: (typing.Any) -> DatabaseSnapshot
+    if isinstance(database, DatabaseSnapshot):
+        return database
+    return DatabaseSnapshot(database)
+
+
+def _read(object_class, obj, protocol):
+    # type: (constants.ObjectClass, typing.Any, constants.Protocol) -> typing.Dict[typing.Text, typing.Any]
+    properties = {}  # type: typing.Dict[typing.Text, typing.Any]
+    for name in _protocol_properties(object_class, protocol):
+        value = _get(obj, name)
+        if value is _MISSING:
+            continue
+        if name in _REFERENCES:
+            value = _reference_names(name, value)
+        elif isinstance(value, list):
+            value = tuple(value)
+        properties[name] = value
+
+    attributes = _get(obj, 'dbc_attributes')
+    if attributes is not _MISSING:
+        values = dict((key, value) for key, (value, _) in attributes.items())
+        if values:
+            properties['dbc_attributes'] = values
+    value_table = _get(obj, 'dbc_signal_value_table')
+    if value_table is not _MISSING:
+        values = dict(value_table.items())
+        if values:
+            properties['dbc_signal_value_table'] = values
+    return properties
+
+
+def _protocol_properties(object_class, protocol):
+    # type: (constants.ObjectClass, constants.Protocol) -> typing.Tuple[typing.Text, ...]
+    key = (object_class, protocol)
+    names = _PROTOCOL_PROPERTIES.get(key)
+    if names is None:
+        names = tuple(name for name in _PROPERTIES[object_class] if _applies(name, protocol))
+        _PROTOCOL_PROPERTIES[key] = names
+    return names
+
+
+def _applies(name, protocol):
+    # type: (typing.Text, constants.Protocol) -> bool
+    for prefix, prefix_protocol in _PROTOCOL_PREFIXES.items():
+        if name.startswith(prefix):
+            return protocol == prefix_protocol
+    return True
+
+
+def _get(obj, name):
+    # type: (typing.Any, typing.Text) -> typing.Any
+    try:
+        return getattr(obj, name)
+    except (AttributeError, errors.XnetError):
+        # The property does not apply to this object, such as the collision schedule of an unconditional entry.
+        return _MISSING
+
+
+def _reference_names(name, value):
+    # type: (typing.Text, typing.Any) -> typing.Any
+    if name == 'collision_res_sched':
+        return value.name if value is not None else None
+    if name == 'pdu_properties':
+        return tuple((properties.pdu.name, properties.start_bit, properties.update_bit) for properties in value)
+    return tuple(obj.name for obj in value)
+
+
+def _plain(value):
+    # type: (typing.Any) -> typing.Any
+    if isinstance(value, enum.Enum):
+        return value.name
+    if isinstance(value, dict):
+        return dict((key, _plain(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    if isinstance(value, six.binary_type):
+        return value.decode('latin-1')
+    return value
@@ -0,0 +1,329 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+import typing  # NOQA: F401
+
+from nixnet import constants
+
+from nixnet.database import _memory
+from nixnet.database import _xml_import
+
+
+# FlexRay cluster parameters in FIBEX, with the MemoryCluster properties they set.
+_FLEX_RAY_PARAMETERS = {
+    'ACTION-POINT-OFFSET': 'flex_ray_act_pt_off',
+    'CAS-RX-LOW-MAX': 'flex_ray_cas_rx_l_max',
+    'CLUSTER-DRIFT-DAMPING': 'flex_ray_clst_drift_dmp',
+    'COLD-START-ATTEMPTS': 'flex_ray_cold_st_ats',
+    'CYCLE': 'flex_ray_cycle',
+    'DYNAMIC-SLOT-IDLE-PHASE': 'flex_ray_dyn_slot_idl_ph',
+    'LISTEN-NOISE': 'flex_ray_lis_noise',
+    'MACRO-PER-CYCLE': 'flex_ray_macro_per_cycle',
+    'MAX-WITHOUT-CLOCK-CORRECTION-FATAL': 'flex_ray_max_wo_clk_cor_fat',
+    'MAX-WITHOUT-CLOCK-CORRECTION-PASSIVE': 'flex_ray_max_wo_clk_cor_pas',
+    'MINISLOT': 'flex_ray_minislot',
+    'MINISLOT-ACTION-POINT-OFFSET': 'flex_ray_minislot_act_pt',
+    'N-I-T': 'flex_ray_nit',
+    'NETWORK-MANAGEMENT-VECTOR-LENGTH': 'flex_ray_nm_vec_len',
+    'NUMBER-OF-MINISLOTS': 'flex_ray_num_minislt',
+    'NUMBER-OF-STATIC-SLOTS': 'flex_ray_num_stat_slt',
+    'OFFSET-CORRECTION-START': 'flex_ray_off_cor_st',
+    'PAYLOAD-LENGTH-STATIC': 'flex_ray_payld_len_st',
+    'STATIC-SLOT': 'flex_ray_stat_slot',
+    'SYMBOL-WINDOW': 'flex_ray_sym_win',
+    'SYNC-NODE-MAX': 'flex_ray_sync_node_max',
+    'T-S-S-TRANSMITTER': 'flex_ray_tss_tx',
+    'WAKE-UP-SYMBOL-RX-IDLE': 'flex_ray_wake_sym_rx_idl',
+    'WAKE-UP-SYMBOL-RX-LOW': 'flex_ray_wake_sym_rx_low',
+    'WAKE-UP-SYMBOL-RX-WINDOW': 'flex_ray_wake_sym_rx_win',
+    'WAKE-UP-SYMBOL-TX-IDLE': 'flex_ray_wake_sym_tx_idl',
+    'WAKE-UP-SYMBOL-TX-LOW': 'flex_ray_wake_sym_tx_low',
+}
+
+_PROTOCOLS = {
+    'CAN': constants.Protocol.CAN,
+    'CAN-FD': constants.Protocol.CAN,
+    'FLEXRAY': constants.Protocol.FLEX_RAY,
+    'LIN': constants.Protocol.LIN,
+}
+
+_SIGNED_ENCODINGS = frozenset(['SIGNED', '2C', 'ONES-COMPLEMENT', 'SIGN-MAGNITUDE'])
+
+# The container elements whose children are read one at a time.
+_RECORD_PARENTS = (
+    'CLUSTERS', 'CHANNELS', 'FRAME-TRIGGERINGS', 'PDU-TRIGGERINGS', 'ECUS', 'PDUS', 'FRAMES',
+    'SIGNALS', 'FUNCTIONS', 'COMPOSITES', 'GATEWAYS', 'CODINGS', 'UNITS')
+
+
+def load_fibex(filepath):
+    # type: (typing.Text) -> _memory.MemoryDatabase
+    """Read an ASAM FIBEX (.xml) file into an in-memory database without the NI-XNET driver.
+
+    The file is read incrementally and each element is discarded once read,
+    so peak memory grows with the number of database objects rather than the size of the XML.
+    The file is read twice, and the records of each pass are dropped as soon as their objects are built,
+    so peak memory stays close to that of the resulting database.
+
+    Each FIBEX cluster becomes a :any:`MemoryCluster` with its FlexRay timing parameters.
+    Frames are added to the clusters of the channels that trigger them,
+    with the FlexRay slot, base cycle, cycle repetition and channel assignment
+    (or the CAN identifier and cycle time) of their frame triggerings.
+    A frame triggered in more than one slot of the same cycle uses ``flex_ray_in_cyc_rep_i_ds``.
+    The PDUs of each frame, including multiplexed PDUs with their switched PDUs as subframes,
+    are mapped with ``pdu_properties``, and ECUs are connected through their input and output ports.
+
+    Signal bit positions are those of the least significant bit.
+
+    Args:
+        filepath(str): Path of the FIBEX file.
+    Returns:
+        :any:`MemoryDatabase`: The database.
+    Raises:
+        :any:`XnetError`: The file is not well-formed XML or contains an unresolved reference.
+    """
+    database = _memory.MemoryDatabase(os.path.splitext(os.path.basename(filepath))[0])
+    _xml_import.load_database(database, FibexReader(), filepath)
+    return database
+
+
+class FibexReader(object):
+    """Read the elements of a FIBEX file into :any:`XmlRecords`."""
+
+    # Signal instances are positioned by their least significant bit.
+    msb_start_bits = False
+
+    def __init__(self):
+        # type: () -> None
+        self._records = _xml_import.XmlRecords()
+        self._reader = None  # type: typing.Optional[_xml_import.XmlRecordReader]
+        self._builder = None  # type: typing.Any
+
+    def read(self, source):
+        # type: (typing.Any) -> _xml_import.XmlRecords
+        """Read all but the signals and their PDU instances."""
+        self._read(source, self._HANDLERS)
+        return self._records
+
+    def read_signals(self, source, builder):
+        # type: (typing.Any, typing.Any) -> None
+        """Read the signals and their PDU instances into the builder of the records from :meth:`read`."""
+        self._builder = builder
+        self._read(source, self._SIGNAL_HANDLERS)
+
+    def _read(self, source, handlers):
+        # type: (typing.Any, typing.Dict[typing.Text, typing.Any]) -> None
+        self._reader = _xml_import.XmlRecordReader(source, _RECORD_PARENTS)
+        for element in self._reader:
+            handler = handlers.get(element.tag)
+            if handler is not None:
+                handler(self, element)
+
+    def _id(self, element):
+        # type: (typing.Any) -> typing.Text
+        return self._records.key(element.get('ID'))
+
+    def _ref(self, element):
+        # type: (typing.Any) -> typing.Text
+        return self._records.key(element.get('ID-REF'))
+
+    def _read_cluster(self, element):
+        # type: (typing.Any) -> None
+        key = self._id(element)
+        protocol = (_xml_import.first_text(element, 'PROTOCOL') or 'CAN').upper()
+        parameters = {}  # type: typing.Dict[typing.Text, int]
+        for child in element.iter():
+            name = _FLEX_RAY_PARAMETERS.get(child.tag)
+            if name is not None and child.text:
+                parameters[name] = _xml_import.to_int(child.text)
+        for reference in element.iter('CHANNEL-REF'):
+            self._records.channels[self._ref(reference)].cluster = key
+
+        can_fd_baud_rate = _xml_import.first_text(element, 'CAN-FD-BAUDRATE')
+        can_fd_baud_rate = can_fd_baud_rate or _xml_import.first_text(element, 'CAN-FD-SPEED')
+        self._records.clusters[key] = _xml_import.XmlCluster(
+            element.findtext('SHORT-NAME'),
+            _PROTOCOLS.get(protocol, constants.Protocol.UNKNOWN),
+            _xml_import.to_int(element.findtext('SPEED') or '0'),
+            _xml_import.to_int(can_fd_baud_rate) if can_fd_baud_rate else 0,
+            parameters)
+
+    def _read_channel(self, element):
+        # type: (typing.Any) -> None
+        letter = _xml_import.first_text(element, 'FLEXRAY-CHANNEL-NAME')
+        if letter:
+            self._records.channels[self._id(element)].letter = letter.upper()
+
+    def _read_frame_triggering(self, element):
+        # type: (typing.Any) -> None
+        channel = self._reader.ancestors[-2]
+        timings = [
+            (_xml_import.to_int(timing.findtext('SLOT-ID')),
+             _xml_import.to_int(timing.findtext('BASE-CYCLE') or '0'),
+             _xml_import.to_int(timing.findtext('CYCLE-REPETITION') or '1'))
+            for timing in element.iter('ABSOLUTELY-SCHEDULED-TIMING')]
+
+        can_ext_id = False
+        identifier = element.find('IDENTIFIER/IDENTIFIER-VALUE')
+        if identifier is not None:
+            timings.append((_xml_import.to_int(identifier.text), 0, 1))
+            extended = _xml_import.attribute(identifier, 'EXTENDED-ADDRESSING')
+            can_ext_id = _xml_import.to_bool(extended or _xml_import.first_text(element, 'EXTENDED-ADDRESSING'))
+        if not timings:
+            return
+
+        tx_time = None
+        cycle_time = element.findtext('TIMINGS/CYCLIC-TIMING/REPEATING-TIME-RANGE/VALUE')
+        if cycle_time:
+            tx_time = _xml_import.iso_duration(cycle_time)
+
+        self._records.triggerings[self._id(element)] = _xml_import.XmlTriggering(
+            self._id(channel),
+            self._ref(element.find('FRAME-REF')),
+            timings,
+            can_ext_id,
+            _xml_import.first_text(element, 'CAN-FRAME-TX-BEHAVIOR') == 'CAN-FD',
+            tx_time,
+            _xml_import.to_bool(_xml_import.first_text(element, 'PAYLOAD-PREAMBLE-INDICATOR')),
+            [])
+
+    def _read_ecu(self, element):
+        # type: (typing.Any) -> None
+        frames = []  # type: typing.List[typing.Tuple[typing.Text, bool]]
+        channels = []  # type: typing.List[typing.Text]
+        for connector in element.iter('CONNECTOR'):
+            channel = connector.find('CHANNEL-REF')
+            if channel is not None:
+                channels.append(self._ref(channel))
+            for direction, is_tx in (('INPUTS', False), ('OUTPUTS', True)):
+                for reference in connector.findall(direction + '/*/FRAME-TRIGGERING-REF'):
+                    frames.append((self._ref(reference), is_tx))
+
+        key_slot = None
+        startup = sync = False
+        usage = element.find('.//KEY-SLOT-USAGE')
+        if usage is not None and len(usage):
+            kind = usage[0]
+            if kind.tag in ('STARTUP-SYNC', 'SYNC') and kind.text:
+                key_slot = _xml_import.to_int(kind.text)
+                startup = kind.tag == 'STARTUP-SYNC'
+                sync = True
+
+        self._records.ecus[self._id(element)] = _xml_import.XmlEcu(
+            element.findtext('SHORT-NAME'), frames, channels, key_slot, startup, sync)
+
+    def _read_pdu(self, element):
+        # type: (typing.Any) -> None
+        multiplexer = None
+        switch = element.find('MULTIPLEXER/SWITCH')
+        if switch is not None:
+            dynamic_offset = _segment_offset(element.find('MULTIPLEXER/DYNAMIC-PART'))
+            static_offset = _segment_offset(element.find('MULTIPLEXER/STATIC-PART'))
+            multiplexer = _xml_import.XmlMultiplexer(
+                switch.findtext('SHORT-NAME'),
+                _xml_import.to_int(switch.findtext('BIT-POSITION') or '0'),
+                _xml_import.to_bool(switch.findtext('IS-HIGH-LOW-BYTE-ORDER')),
+                _xml_import.to_int(switch.findtext('BIT-LENGTH') or '0'),
+                [(self._ref(instance.find('PDU-REF')),
+                  _xml_import.to_int(instance.findtext('SWITCH-CODE')),
+                  dynamic_offset)
+                 for instance in element.iter('SWITCHED-PDU-INSTANCE')],
+                [(self._ref(reference), static_offset)
+                 for reference in element.findall('MULTIPLEXER/STATIC-PART//PDU-REF')])
+
+        self._records.pdus[self._id(element)] = _xml_import.XmlPdu(
+            element.findtext('SHORT-NAME'),
+            _xml_import.to_int(element.findtext('BYTE-LENGTH') or '0'),
+            multiplexer,
+            None)
+        self._records.num_pdus += 1
+
+    def _read_pdu_signals(self, element):
+        # type: (typing.Any) -> None
+        # The keys of the second pass are not shared, since they are dropped once their signals are built.
+        self._builder.add_instances(element.get('ID'), [
+            _xml_import.XmlSignalInstance(
+                instance.find('SIGNAL-REF').get('ID-REF'),
+                _xml_import.to_int(instance.findtext('BIT-POSITION') or '0'),
+                _xml_import.to_bool(instance.findtext('IS-HIGH-LOW-BYTE-ORDER')))
+            for instance in element.findall('SIGNAL-INSTANCES/SIGNAL-INSTANCE')])
+
+    def _read_frame(self, element):
+        # type: (typing.Any) -> None
+        pdus = []
+        for instance in element.findall('PDU-INSTANCES/PDU-INSTANCE'):
+            update_bit = instance.findtext('PDU-UPDATE-BIT-POSITION')
+            pdus.append((
+                self._ref(instance.find('PDU-REF')),
+                _xml_import.to_int(instance.findtext('BIT-POSITION') or '0'),
+                _xml_import.to_int(update_bit) if update_bit else -1))
+        self._records.frames[self._id(element)] = _xml_import.XmlFrame(
+            element.findtext('SHORT-NAME'),
+            _xml_import.to_int(element.findtext('BYTE-LENGTH') or '0'),
+            pdus)
+
+    def _read_signal(self, element):
+        # type: (typing.Any) -> None
+        coding = element.find('CODING-REF')
+        default = element.findtext('DEFAULT-VALUE')
+        self._builder.add_signal(element.get('ID'), _xml_import.XmlSignal(
+            element.findtext('SHORT-NAME'),
+            coding.get('ID-REF') if coding is not None else None,
+            None,
+            0,
+            float(default) if default else 0.0))
+
+    def _read_coding(self, element):
+        # type: (typing.Any) -> None
+        coded_type = element.find('CODED-TYPE')
+        num_bits = 0
+        data_type = constants.SigDataType.UNSIGNED
+        if coded_type is not None:
+            num_bits = _xml_import.to_int(coded_type.findtext('BIT-LENGTH') or '0')
+            encoding = (_xml_import.attribute(coded_type, 'ENCODING') or '').upper()
+            base_data_type = (_xml_import.attribute(coded_type, 'BASE-DATA-TYPE') or '').upper()
+            if encoding.startswith('IEEE') or 'FLOAT' in base_data_type:
+                data_type = constants.SigDataType.IEEE_FLOAT
+            elif encoding in _SIGNED_ENCODINGS or base_data_type.startswith('A_INT'):
+                data_type = constants.SigDataType.SIGNED
+
+        scale_fac, scale_off, minimum, maximum, value_table = 1.0, 0.0, None, None, {}
+        unit = None
+        compu_method = element.find('COMPU-METHODS/COMPU-METHOD')
+        if compu_method is not None:
+            scale_fac, scale_off, minimum, maximum, value_table = _xml_import.parse_compu_method(compu_method)
+            unit_reference = compu_method.find('UNIT-REF')
+            if unit_reference is not None:
+                unit = self._ref(unit_reference)
+
+        self._records.codings[self._id(element)] = _xml_import.XmlCoding(
+            num_bits, data_type, scale_fac, scale_off, minimum, maximum, unit, value_table)
+
+    def _read_unit(self, element):
+        # type: (typing.Any) -> None
+        self._records.units[self._id(element)] = (
+            element.findtext('DISPLAY-NAME') or element.findtext('SHORT-NAME') or u'')
+
+    _HANDLERS = {
+        'CLUSTER': _read_cluster,
+        'CHANNEL': _read_channel,
+        'FRAME-TRIGGERING': _read_frame_triggering,
+        'ECU': _read_ecu,
+        'PDU': _read_pdu,
+        'FRAME': _read_frame,
+        'CODING': _read_coding,
+        'UNIT': _read_unit,
+    }
+
+    _SIGNAL_HANDLERS = {
+        'PDU': _read_pdu_signals,
+        'SIGNAL': _read_signal,
+    }
+
+
+def _segment_offset(part):
+    # type: (typing.Any) -> int
+    if part is None:
+        return 0
+    return _xml_import.to_int(part.findtext('SEGMENT-POSITIONS/SEGMENT-POSITION/BIT-POSITION') or '0')
@@ -17,6 +17,21 @@ def find_object(
         object_name,  # type: typing.Text
 ):
     # type: (...) -> _database_object.DatabaseObject
+    class_enum = get_object_class(object_class)
+
+    found_handle = _funcs.nxdb_find_object(parent_handle, class_enum, object_name)
+    if found_handle == 0:
+        _errors.raise_xnet_error(_cconsts.NX_ERR_DATABASE_OBJECT_NOT_FOUND)
+
+    return object_class(_handle=found_handle)
+
+
+def get_object_class(object_class):
+    # type: (typing.Any) -> constants.ObjectClass
+    """Return the :any:`ObjectClass` for a database class.
+
+    In-memory database classes name their :any:`ObjectClass` in ``_object_class``.
+    """
     from nixnet.database._cluster import Cluster
     from nixnet.database._ecu import Ecu
     from nixnet.database._frame import Frame
@@ -36,12 +51,9 @@ def find_object(
         Signal: constants.ObjectClass.SIGNAL,
         SubFrame: constants.ObjectClass.SUBFRAME,
     }.get(object_class)
+    if class_enum is None:
+        class_enum = getattr(object_class, '_object_class', None)
 
     if class_enum is None:
         raise ValueError("Unsupported value provided for argument object_class.", object_class)
-
-    found_handle = _funcs.nxdb_find_object(parent_handle, class_enum, object_name)
-    if found_handle == 0:
-        _errors.raise_xnet_error(_cconsts.NX_ERR_DATABASE_OBJECT_NOT_FOUND)
-
-    return object_class(_handle=found_handle)
+    return class_enum
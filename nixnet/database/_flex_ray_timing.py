@@ -0,0 +1,299 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+import typing  # NOQA: F401
+
+from nixnet import constants
+
+
+_NUM_CYCLES = 64
+_ALL_CYCLES = (1 << _NUM_CYCLES) - 1
+_CHANNELS = (constants.FrmFlexRayChAssign.A, constants.FrmFlexRayChAssign.B)
+_CHANNEL_BITS = constants.FrmFlexRayChAssign.AAND_B.value
+
+FlexRayFrameTiming_ = collections.namedtuple(
+    'FlexRayFrameTiming_',
+    ['name', 'slots', 'ch_assign', 'cycles', 'dynamic', 'latency'])
+
+
+class FlexRayFrameTiming(FlexRayFrameTiming_):
+    """Slots and cycles of one frame found by :any:`analyze_flex_ray_schedule`.
+
+    Attributes:
+        name(str): Name of the frame.
+        slots(tuple of int): Slot of the frame, followed by its in-cycle repetition slots.
+        ch_assign(:any:`FrmFlexRayChAssign`): Channels the frame uses in any of its slots.
+        cycles(int): Mask of the cycles in which the frame is sent, with bit ``n`` set for cycle ``n``.
+        dynamic(bool): Whether the frame's slot is in the dynamic segment.
+        latency(float): Longest time in microseconds between two transmission starts of the frame.
+            This bounds the time from updating the frame's data to the start of its next transmission.
+    """
+
+    @property
+    def num_cycles(self):
+        # type: () -> int
+        """int: Returns the number of cycles out of 64 in which the frame is sent."""
+        return _popcount(self.cycles)
+
+
+FlexRaySlotConflict_ = collections.namedtuple(
+    'FlexRaySlotConflict_',
+    ['name', 'other_name', 'ch_assign', 'slot', 'cycles'])
+
+
+class FlexRaySlotConflict(FlexRaySlotConflict_):
+    """Two frames sent in the same slot, channel and cycle.
+
+    Attributes:
+        name(str): Name of the frame that conflicts.
+        other_name(str): Name of the first frame before it in the same slot.
+        ch_assign(:any:`FrmFlexRayChAssign`): Channel of the conflict, ``A`` or ``B``.
+        slot(int): Slot of the conflict.
+        cycles(int): Mask of the cycles in which both frames are sent.
+    """
+
+    pass
+
+
+class FlexRaySchedule(object):
+    """Slot and cycle occupancy of a FlexRay cluster, found by :any:`analyze_flex_ray_schedule`.
+
+    Occupancy is kept as one 64-bit cycle mask per channel and slot,
+    with bit ``n`` set when a frame is sent in cycle ``n``,
+    so that a frame is placed in all 64 cycles of the matrix at once.
+
+    Attributes:
+        name(str): Name of the cluster.
+        cycle(float): Cycle duration in microseconds.
+        num_stat_slt(int): Number of static slots.
+        num_minislt(int): Number of minislots, which is the largest number of dynamic slots.
+        channels(list of :any:`FrmFlexRayChAssign`): Channels of the cluster, ``A``, ``B`` or both.
+        frames(list of :any:`FlexRayFrameTiming`): Timing of every frame in a valid slot, in database order.
+        conflicts(list of :any:`FlexRaySlotConflict`): Frames that share a slot with an earlier frame.
+        invalid(list of str): Names of the frames whose slots are outside the static and dynamic segments.
+    """
+
+    def __init__(self, name, cycle, num_stat_slt, num_minislt, channels):
+        # type: (typing.Text, float, int, int, typing.List[constants.FrmFlexRayChAssign]) -> None
+        self.name = name
+        self.cycle = cycle
+        self.num_stat_slt = num_stat_slt
+        self.num_minislt = num_minislt
+        self.channels = channels
+        self.frames = []  # type: typing.List[FlexRayFrameTiming]
+        self.conflicts = []  # type: typing.List[FlexRaySlotConflict]
+        self.invalid = []  # type: typing.List[typing.Text]
+        self._occupancy = {}  # type: typing.Dict[typing.Tuple[constants.FrmFlexRayChAssign, int], int]
+        # The frames placed in each channel and slot, with their cycles.
+        self._placed = {}  # type: typing.Dict[typing.Tuple[constants.FrmFlexRayChAssign, int], typing.List[typing.Any]]
+
+    def __repr__(self):
+        return '{}(name={}, frames={}, static_utilization={:.2f}, conflicts={})'.format(
+            type(self).__name__, self.name, len(self.frames), self.static_utilization, len(self.conflicts))
+
+    def slot_cycles(self, ch_assign, slot):
+        # type: (constants.FrmFlexRayChAssign, int) -> int
+        """Returns the cycles in which frames are sent in a slot.
+
+        Args:
+            ch_assign(:any:`FrmFlexRayChAssign`): Channel ``A`` or ``B``.
+            slot(int): Slot ID.
+        Returns:
+            int: Mask of the used cycles, with bit ``n`` set for cycle ``n``.
+        """
+        return self._occupancy.get((ch_assign, slot), 0)
+
+    def free_cycles(self, ch_assign, slot):
+        # type: (constants.FrmFlexRayChAssign, int) -> typing.List[int]
+        """Returns the cycles in which no frame is sent in a slot.
+
+        Args:
+            ch_assign(:any:`FrmFlexRayChAssign`): Channel ``A`` or ``B``.
+            slot(int): Slot ID.
+        Returns:
+            list of int: Free cycle numbers, from 0 to 63.
+        """
+        used = self.slot_cycles(ch_assign, slot)
+        return [cycle for cycle in range(_NUM_CYCLES) if not used >> cycle & 1]
+
+    def free_static_slots(self, ch_assign):
+        # type: (constants.FrmFlexRayChAssign) -> typing.List[int]
+        """Returns the static slots that no frame uses in any cycle.
+
+        Args:
+            ch_assign(:any:`FrmFlexRayChAssign`): Channel ``A`` or ``B``.
+        Returns:
+            list of int: Free slot IDs.
+        """
+        return [slot for slot in range(1, self.num_stat_slt + 1) if not self.slot_cycles(ch_assign, slot)]
+
+    @property
+    def static_utilization(self):
+        # type: () -> float
+        """float: Returns the share of static slot cycles used on the cluster's channels, from 0.0 to 1.0."""
+        return self._utilization(1, self.num_stat_slt)
+
+    @property
+    def dynamic_utilization(self):
+        # type: () -> float
+        """float: Returns the share of dynamic slot cycles assigned to frames on the cluster's channels.
+
+        The dynamic segment has at most one slot per minislot.
+        A dynamic frame is sent only when it has data, so this is an upper bound of the actual use.
+        """
+        return self._utilization(self.num_stat_slt + 1, self.num_minislt)
+
+    def _utilization(self, first_slot, num_slots):
+        # type: (int, int) -> float
+        if not num_slots or not self.channels:
+            return 0.0
+        used = 0
+        for ch_assign in self.channels:
+            for slot in range(first_slot, first_slot + num_slots):
+                used += _popcount(self.slot_cycles(ch_assign, slot))
+        return used / (len(self.channels) * num_slots * _NUM_CYCLES)
+
+    def _place(self, name, ch_assign, slot, cycles):
+        # type: (typing.Text, int, int, int) -> None
+        for channel in _CHANNELS:
+            if not ch_assign & channel.value:
+                continue
+            key = (channel, slot)
+            used = self._occupancy.get(key, 0)
+            if used & cycles:
+                for other_name, other_cycles in self._placed[key]:
+                    if other_cycles & cycles and other_name != name:
+                        self.conflicts.append(
+                            FlexRaySlotConflict(name, other_name, channel, slot, other_cycles & cycles))
+                        break
+            self._occupancy[key] = used | cycles
+            self._placed.setdefault(key, []).append((name, cycles))
+
+
+def cycle_mask(base_cycle, cycle_rep):
+    # type: (int, int) -> int
+    """Returns the cycles in which a frame with a base cycle and cycle repetition is sent.
+
+    >>> mask = cycle_mask(1, 16)
+    >>> print([cycle for cycle in range(64) if mask >> cycle & 1])
+    [1, 17, 33, 49]
+
+    Args:
+        base_cycle(int): First cycle of the frame, from 0 to 63.
+        cycle_rep(int): Number of cycles between transmissions, a power of two from 1 to 64.
+    Returns:
+        int: Mask with bit ``n`` set for cycle ``n``.
+    """
+    if cycle_rep <= 0 or not 0 <= base_cycle < _NUM_CYCLES:
+        return 0
+    # Each doubling of the pattern covers twice as many cycles.
+    mask = 1
+    width = cycle_rep
+    while width < _NUM_CYCLES:
+        mask |= mask << width
+        width *= 2
+    return (mask << base_cycle) & _ALL_CYCLES
+
+
+def analyze_flex_ray_schedule(cluster):
+    # type: (typing.Any) -> FlexRaySchedule
+    """Compute the slot and cycle occupancy of the frames of a FlexRay cluster.
+
+    Every frame is placed in its slot, and in-cycle repetition slots,
+    on its channels in the cycles given by :any:`Frame.flex_ray_base_cycle` and :any:`Frame.flex_ray_cycle_rep`.
+    Frames in slots up to :any:`Cluster.flex_ray_num_stat_slt` are in the static segment,
+    and frames in the following :any:`Cluster.flex_ray_num_minislt` slots in the dynamic segment.
+
+    A frame's latency is the longest time between two of its transmission starts.
+    Dynamic frames are assumed to start one minislot after each other,
+    so the latency of a dynamic frame with in-cycle repetition does not include
+    the delay of longer frames in lower dynamic slots.
+
+    >>> from nixnet.database import _memory
+    >>> cluster = _memory.MemoryDatabase('example').clusters.add('Chassis')
+    >>> cluster.protocol = constants.Protocol.FLEX_RAY
+    >>> cluster.flex_ray_cycle = 5000
+    >>> cluster.flex_ray_num_stat_slt = 4
+    >>> frame = cluster.frames.add('Speed')
+    >>> frame.id = 2
+    >>> frame.flex_ray_cycle_rep = 4
+    >>> schedule = analyze_flex_ray_schedule(cluster)
+    >>> print(schedule.free_static_slots(constants.FrmFlexRayChAssign.A))
+    [1, 3, 4]
+    >>> print(schedule.static_utilization, schedule.frames[0].latency)
+    0.0625 20000.0
+
+    Args:
+        cluster(:any:`Cluster`): FlexRay cluster to analyze.
+    Returns:
+        :any:`FlexRaySchedule`
+    Raises:
+        ValueError: ``cluster`` is not a FlexRay cluster.
+    """
+    if cluster.protocol != constants.Protocol.FLEX_RAY:
+        raise ValueError('{} is not a FlexRay cluster'.format(cluster.name))
+
+    cycle = float(cluster.flex_ray_cycle)
+    macrotick = cluster.flex_ray_macrotick
+    num_stat_slt = cluster.flex_ray_num_stat_slt
+    num_minislt = cluster.flex_ray_num_minislt
+    static_slot = cluster.flex_ray_stat_slot * macrotick
+    minislot = cluster.flex_ray_minislot * macrotick
+    dyn_seg_start = num_stat_slt * static_slot
+
+    frames = list(cluster.frames.values())
+    channel_bits = cluster.flex_ray_channels & _CHANNEL_BITS
+    if not channel_bits:
+        for frame in frames:
+            channel_bits |= frame.flex_ray_ch_assign.value & _CHANNEL_BITS
+    schedule = FlexRaySchedule(
+        cluster.name, cycle, num_stat_slt, num_minislt,
+        [channel for channel in _CHANNELS if channel_bits & channel.value])
+
+    last_slot = num_stat_slt + num_minislt
+    for frame in frames:
+        name = frame.name
+        ch_assign = frame.flex_ray_ch_assign.value & _CHANNEL_BITS
+        slots = [(frame.id, ch_assign)]
+        repetition_ids = frame.flex_ray_in_cyc_rep_i_ds
+        if repetition_ids:
+            repetition_assigns = list(frame.flex_ray_in_cyc_rep_ch_assigns)
+            for index, slot in enumerate(repetition_ids):
+                assign = repetition_assigns[index].value if index < len(repetition_assigns) else ch_assign
+                slots.append((slot, assign & _CHANNEL_BITS))
+        if any(not 1 <= slot <= last_slot for slot, _ in slots):
+            schedule.invalid.append(name)
+            continue
+
+        cycle_rep = frame.flex_ray_cycle_rep
+        cycles = cycle_mask(frame.flex_ray_base_cycle, cycle_rep)
+        all_assigns = 0
+        for slot, assign in slots:
+            schedule._place(name, assign, slot, cycles)
+            all_assigns |= assign
+
+        if len(slots) == 1:
+            latency = cycle_rep * cycle
+        else:
+            # Offsets of the frame's transmission starts within its cycle.
+            offsets = sorted(
+                (slot - 1) * static_slot if slot <= num_stat_slt
+                else dyn_seg_start + (slot - num_stat_slt - 1) * minislot
+                for slot, _ in slots)
+            gaps = [later - earlier for earlier, later in zip(offsets, offsets[1:])]
+            latency = max(gaps + [cycle_rep * cycle - offsets[-1] + offsets[0]])
+        schedule.frames.append(FlexRayFrameTiming(
+            name,
+            tuple(slot for slot, _ in slots),
+            constants.FrmFlexRayChAssign(all_assigns or constants.FrmFlexRayChAssign.NONE.value),
+            cycles,
+            frame.id > num_stat_slt,
+            latency))
+    return schedule
+
+
+def _popcount(mask):
+    # type: (int) -> int
+    return bin(mask).count('1')
@@ -0,0 +1,309 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+import typing  # NOQA: F401
+
+from nixnet import constants
+
+from nixnet.database import _find_object
+from nixnet.database import _memory
+
+
+SignalOverlap_ = collections.namedtuple(
+    'SignalOverlap_',
+    ['path', 'other_path', 'mux_value', 'bits'])
+
+
+class SignalOverlap(SignalOverlap_):
+    """Two signals of a frame or PDU that use the same payload bits.
+
+    Attributes:
+        path(str): Path of the signal that overlaps, such as ``myCluster.myFrame.mySignal``.
+        other_path(str): Path of the first signal before it that uses one of the same bits.
+        mux_value(int): Multiplexer value of the subframe in which the signals overlap,
+            or ``None`` when both are static signals.
+        bits(int): Mask of the shared bits, with bit ``n`` set for payload bit ``n``.
+    """
+
+    pass
+
+
+SignalOutOfPayload_ = collections.namedtuple(
+    'SignalOutOfPayload_',
+    ['path', 'start_bit', 'payload_bits'])
+
+
+PduOverlap_ = collections.namedtuple(
+    'PduOverlap_',
+    ['path', 'other_path', 'bits'])
+
+
+class PduOverlap(PduOverlap_):
+    """Two PDUs mapped to a frame that use the same payload bits.
+
+    Attributes:
+        path(str): Path of the PDU that overlaps, such as ``myCluster.myPdu``.
+        other_path(str): Path of the first PDU mapped before it that uses one of the same bits.
+        bits(int): Mask of the shared frame bits, with bit ``n`` set for payload bit ``n``.
+    """
+
+    pass
+
+
+class SignalOutOfPayload(SignalOutOfPayload_):
+    """A signal that does not fit in the payload of its frame or PDU.
+
+    Attributes:
+        path(str): Path of the signal.
+        start_bit(int): Start bit of the signal.
+        payload_bits(int): Number of bits in the payload.
+    """
+
+    @property
+    def start_bit_in_payload(self):
+        # type: () -> bool
+        """bool: Returns whether the start bit is in the payload, so that only the signal's end is outside."""
+        return 0 <= self.start_bit < self.payload_bits
+
+
+class BitLayout(object):
+    """Payload bits used by the signals of one frame or PDU.
+
+    Bit masks are Python ints with bit ``n`` set for payload bit ``n``, numbered as :any:`Signal.start_bit`.
+    Static signals are always in the payload.
+    The dynamic signals of the subframes with the same multiplexer value are in the payload
+    together with the static signals, but not with the signals of other multiplexer values.
+    The bits used by the signals of the PDUs mapped to a frame, moved to the PDU start bit,
+    and the PDU update bits are static bits of the frame.
+
+    Attributes:
+        object_class(:any:`ObjectClass`): :any:`ObjectClass.FRAME` or :any:`ObjectClass.PDU`.
+        path(str): Path of the frame or PDU, such as ``myCluster.myFrame``.
+        payload_bits(int): Number of bits in the payload.
+        static_mask(int): Bits used by the static signals.
+        branch_masks(dict): Maps each multiplexer value to the bits used by its dynamic signals.
+        overlaps(list of :any:`SignalOverlap`): Signals that share bits with an earlier signal.
+        out_of_payload(list of :any:`SignalOutOfPayload`): Signals that do not fit in the payload.
+            They are left out of the masks.
+        pdu_overlaps(list of :any:`PduOverlap`): PDUs mapped to the frame that share bits with an earlier PDU,
+            counting the whole PDU payload and its update bit.
+    """
+
+    def __init__(self, object_class, path, payload_bits):
+        # type: (constants.ObjectClass, typing.Text, int) -> None
+        self.object_class = object_class
+        self.path = path
+        self.payload_bits = payload_bits
+        self.static_mask = 0
+        self.branch_masks = collections.OrderedDict()  # type: typing.Dict[int, int]
+        self.overlaps = []  # type: typing.List[SignalOverlap]
+        self.out_of_payload = []  # type: typing.List[SignalOutOfPayload]
+        self.pdu_overlaps = []  # type: typing.List[PduOverlap]
+        # Paths of the signals in the order they are placed, to report their problems signal by signal.
+        self._signal_paths = []  # type: typing.List[typing.Text]
+
+    def __repr__(self):
+        return '{}(path={}, utilization={:.2f}, overlaps={}, out_of_payload={}, pdu_overlaps={})'.format(
+            type(self).__name__, self.path, self.utilization, len(self.overlaps), len(self.out_of_payload),
+            len(self.pdu_overlaps))
+
+    @property
+    def used_mask(self):
+        # type: () -> int
+        """int: Returns the bits used by any signal, static or dynamic."""
+        mask = self.static_mask
+        for branch_mask in self.branch_masks.values():
+            mask |= branch_mask
+        return mask
+
+    @property
+    def unused_bits(self):
+        # type: () -> typing.List[int]
+        """list of int: Returns the payload bits that no signal uses."""
+        used = self.used_mask
+        return [bit for bit in range(self.payload_bits) if not used >> bit & 1]
+
+    @property
+    def utilization(self):
+        # type: () -> float
+        """float: Returns the share of payload bits used by any signal, from 0.0 to 1.0."""
+        if not self.payload_bits:
+            return 0.0
+        return _popcount(self.used_mask) / self.payload_bits
+
+    def branch_utilization(self, mux_value):
+        # type: (int) -> float
+        """Returns the share of payload bits used when the multiplexer has ``mux_value``.
+
+        Args:
+            mux_value(int): Multiplexer value of a subframe.
+        Returns:
+            float: The share of payload bits used by the static signals and the subframe's signals.
+        """
+        if not self.payload_bits:
+            return 0.0
+        return _popcount(self.static_mask | self.branch_masks.get(mux_value, 0)) / self.payload_bits
+
+
+def analyze_bit_layout(parent):
+    # type: (typing.Any) -> typing.List[BitLayout]
+    """Analyze the signal bit layout of frames and PDUs.
+
+    For every frame and PDU in ``parent``, this function finds in one pass
+    the signals that overlap, the signals outside the payload,
+    and the bits that no signal uses.
+    Signals of a PDU mapped to a frame are analyzed in the layout of the PDU,
+    and the frame layout uses the PDU's bits and finds the PDUs that overlap.
+
+    >>> db = _memory.MemoryDatabase('example')
+    >>> frame = db.clusters.add('Body').frames.add('Doors')
+    >>> frame.payload_len = 1
+    >>> for name, start_bit in (('Lock', 0), ('Latch', 3)):
+    ...     signal = frame.mux_static_signals.add(name)
+    ...     signal.start_bit = start_bit
+    ...     signal.num_bits = 4
+    >>> layout, = analyze_bit_layout(db)
+    >>> for overlap in layout.overlaps:
+    ...     print(overlap.path, overlap.other_path, overlap.bits)
+    Body.Doors.Latch Body.Doors.Lock 8
+    >>> layout.unused_bits, layout.utilization
+    ([7], 0.875)
+
+    Args:
+        parent: A :any:`Database`, cluster, frame, or PDU, from the driver or in memory.
+    Returns:
+        list of :any:`BitLayout`: A layout for each frame and PDU, in database order.
+    """
+    if hasattr(parent, 'clusters'):
+        return [
+            layout
+            for cluster_name, cluster in parent.clusters.items()
+            for layout in _analyze_cluster(cluster_name, cluster)]
+
+    object_class = _find_object.get_object_class(type(parent))
+    if object_class == constants.ObjectClass.CLUSTER:
+        return _analyze_cluster(parent.name, parent)
+    if object_class in (constants.ObjectClass.FRAME, constants.ObjectClass.PDU):
+        path = u'{}.{}'.format(parent.cluster.name, parent.name)
+        return [analyze_container(object_class, path, parent)]
+    raise ValueError('Unsupported value provided for argument parent.', parent)
+
+
+def _analyze_cluster(cluster_name, cluster):
+    # type: (typing.Text, typing.Any) -> typing.List[BitLayout]
+    pdu_layouts = collections.OrderedDict()  # type: typing.Dict[typing.Text, BitLayout]
+    for name, pdu in cluster.pdus.items():
+        pdu_layouts[name] = analyze_container(constants.ObjectClass.PDU, u'{}.{}'.format(cluster_name, name), pdu)
+    layouts = list(pdu_layouts.values())
+    for name, frame in cluster.frames.items():
+        layouts.append(analyze_container(
+            constants.ObjectClass.FRAME, u'{}.{}'.format(cluster_name, name), frame, pdu_layouts))
+    return layouts
+
+
+def analyze_container(object_class, path, container, pdu_layouts=None):
+    # type: (constants.ObjectClass, typing.Text, typing.Any, typing.Optional[typing.Dict]) -> BitLayout
+    """Analyze the signal bit layout of one frame or PDU, whose path is already known.
+
+    ``pdu_layouts`` maps PDU names to their layouts, when they are already analyzed.
+    """
+    layout = BitLayout(object_class, path, container.payload_len * 8)
+    if object_class == constants.ObjectClass.FRAME:
+        signals = container.mux_static_signals
+    else:
+        signals = container.mux_static_sigs
+    static = []  # type: typing.List[typing.Tuple[typing.Text, int]]
+    layout.static_mask = _place(layout, None, signals.items(), static)
+
+    # Subframes that share a multiplexer value share the payload.
+    branches = collections.OrderedDict()  # type: typing.Dict[int, typing.List]
+    for _, subframe in container.mux_subframes.items():
+        branches.setdefault(subframe.mux_value, []).extend(subframe.dyn_signals.items())
+    for mux_value, items in branches.items():
+        layout.branch_masks[mux_value] = _place(layout, mux_value, items, list(static))
+
+    if object_class == constants.ObjectClass.FRAME:
+        _place_pdus(layout, path.rsplit(u'.', 1)[0], container.pdu_properties, pdu_layouts or {})
+    return layout
+
+
+def signal_bit_mask(signal):
+    # type: (typing.Any) -> int
+    """Return the payload bits of a signal as a mask, with bit ``n`` set for payload bit ``n``.
+
+    Big-endian signals that run past the first payload byte have bits before bit 0,
+    which make the mask negative.
+
+    >>> class Sig(object):
+    ...     start_bit = 12
+    ...     num_bits = 6
+    ...     byte_ordr = constants.SigByteOrdr.BIG_ENDIAN
+    >>> bin(signal_bit_mask(Sig()))
+    '0b1111000000000011'
+    """
+    mask = 0
+    for bit in _memory.signal_bit_positions(signal):
+        if bit < 0:
+            return -1
+        mask |= 1 << bit
+    return mask
+
+
+def _place(layout, mux_value, items, placed):
+    # type: (BitLayout, typing.Optional[int], typing.Iterable, typing.List[typing.Tuple[typing.Text, int]]) -> int
+    """Add signals to the payload after the ``placed`` ones, and return the bits of the new signals."""
+    payload_bits = layout.payload_bits
+    used = 0
+    for _, mask in placed:
+        used |= mask
+    new = 0
+    for name, signal in items:
+        path = u'{}.{}'.format(layout.path, name)
+        layout._signal_paths.append(path)
+        mask = signal_bit_mask(signal)
+        if mask < 0 or mask >> payload_bits or signal.start_bit < 0:
+            layout.out_of_payload.append(SignalOutOfPayload(path, signal.start_bit, payload_bits))
+            continue
+        if mask & used:
+            # Only look for the other signal once an overlap is known, so a clean layout takes one pass.
+            for other_path, other_mask in placed:
+                if mask & other_mask:
+                    layout.overlaps.append(SignalOverlap(path, other_path, mux_value, mask & other_mask))
+                    break
+        used |= mask
+        new |= mask
+        placed.append((path, mask))
+    return new
+
+
+def _place_pdus(layout, cluster_name, pdu_properties, pdu_layouts):
+    # type: (BitLayout, typing.Text, typing.Iterable, typing.Dict[typing.Text, BitLayout]) -> None
+    """Add the bits of the PDUs mapped to a frame to its static bits, and find the PDUs that overlap."""
+    payload_mask = (1 << layout.payload_bits) - 1
+    placed = []  # type: typing.List[typing.Tuple[typing.Text, int]]
+    for properties in pdu_properties:
+        # A PDU that starts before the frame payload is reported by the validation, not here.
+        if properties.start_bit < 0:
+            continue
+        name = properties.pdu.name
+        path = u'{}.{}'.format(cluster_name, name)
+        pdu_layout = pdu_layouts.get(name)
+        if pdu_layout is None:
+            pdu_layout = analyze_container(constants.ObjectClass.PDU, path, properties.pdu)
+        update_mask = 0
+        if 0 <= properties.update_bit < layout.payload_bits:
+            update_mask = 1 << properties.update_bit
+        area = ((1 << pdu_layout.payload_bits) - 1) << properties.start_bit | update_mask
+        for other_path, other_area in placed:
+            if area & other_area:
+                layout.pdu_overlaps.append(PduOverlap(path, other_path, area & other_area))
+                break
+        placed.append((path, area))
+        layout.static_mask |= (pdu_layout.used_mask << properties.start_bit | update_mask) & payload_mask
+
+
+def _popcount(mask):
+    # type: (int) -> int
+    return bin(mask).count('1')
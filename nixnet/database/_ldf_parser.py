@@ -0,0 +1,742 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+import io
+import os
+import re
+import typing  # NOQA: F401
+
+from nixnet import _cconsts
+from nixnet import constants
+from nixnet import errors
+
+from nixnet.database import _memory
+
+
+_MASTER_REQ_ID = 0x3C
+_SLAVE_RESP_ID = 0x3D
+_UNASSIGNED_PID = 0x40
+_NO_DATA = 0xFF
+
+_PROTOCOL_VERSIONS = {
+    '1.2': constants.LinProtocolVer.VER_1_2,
+    '1.3': constants.LinProtocolVer.VER_1_3,
+    '2.0': constants.LinProtocolVer.VER_2_0,
+    '2.1': constants.LinProtocolVer.VER_2_1,
+    '2.2': constants.LinProtocolVer.VER_2_2,
+}
+
+_TOKEN_RE = re.compile(r'''
+    (?P<space>\s+|//[^\n]*|/\*.*?\*/)
+  | "(?P<string>[^"]*)"
+  | (?P<number>[-+]?(?:0[xX][0-9A-Fa-f]+|\d+\.?\d*(?:[eE][-+]?\d+)?|\.\d+(?:[eE][-+]?\d+)?))
+  | (?P<name>[A-Za-z_][A-Za-z0-9_]*)
+  | (?P<punct>[{}:;,=%])
+''', re.VERBOSE | re.DOTALL)
+
+
+_Token = collections.namedtuple('_Token', ['kind', 'text', 'line'])
+_LdfSignal = collections.namedtuple('_LdfSignal', ['size', 'init', 'publisher', 'subscribers'])
+_LdfFrame = collections.namedtuple('_LdfFrame', ['id', 'publishers', 'length', 'signals'])
+_LdfEventTriggeredFrame = collections.namedtuple('_LdfEventTriggeredFrame', ['collision_table', 'id', 'frames'])
+_LdfScheduleCommand = collections.namedtuple('_LdfScheduleCommand', ['command', 'args', 'delay', 'line'])
+
+
+def load_ldf(filepath, encoding='utf-8'):
+    # type: (typing.Text, typing.Text) -> _memory.MemoryDatabase
+    """Read a LIN description file (.ldf) into an in-memory database without the NI-XNET driver.
+
+    As with :any:`Database`, the file contains a single cluster named ``Cluster``.
+    The following sections are imported:
+
+    *   ``LIN_speed`` and the master ``Nodes`` time base set :any:`MemoryCluster`
+        ``baud_rate`` and ``lin_tick``.
+    *   ``Nodes`` and ``Node_attributes`` create :any:`MemoryEcu` objects
+        with ``lin_master``, ``lin_protocol_ver``, ``lin_initial_nad``, ``lin_config_nad``,
+        ``lin_supplier_id``, ``lin_function_id``, ``lin_p2_min``, and ``lin_st_min``.
+    *   ``Signals``, ``Frames``, ``Diagnostic_signals``, and ``Diagnostic_frames``
+        create :any:`MemoryFrame` and :any:`MemorySignal` objects.
+        Unused bits of the frame ``default_payload`` are recessive (1).
+    *   ``Signal_encoding_types`` and ``Signal_representation`` set the signal scaling,
+        limits, unit, and value table.
+    *   ``Schedule_tables``, ``Sporadic_frames``, and ``Event_triggered_frames``
+        create :any:`MemoryLinSched` and :any:`MemoryLinSchedEntry` objects.
+        Node configuration commands are converted to the eight bytes of the master request frame.
+        Schedule entries are named after the frame or command,
+        with a ``_<n>`` suffix when it appears more than once in a table.
+
+    Other sections are ignored.
+
+    Args:
+        filepath(str): Path of the LDF file.
+        encoding(str): Text encoding of the file.
+    Returns:
+        :any:`MemoryDatabase`: The database.
+    Raises:
+        :any:`XnetError`: The file contains a malformed statement.
+    """
+    database = _memory.MemoryDatabase(os.path.splitext(os.path.basename(filepath))[0])
+    with io.open(filepath, 'r', encoding=encoding, errors='replace') as stream:
+        text = stream.read()
+    parser = LdfParser(database, filepath)
+    parser.parse(text)
+    return database
+
+
+class LdfParser(object):
+    """LDF parser that adds one cluster to a :any:`MemoryDatabase`.
+
+    The file is first read into plain tuples, because LDF sections refer to each other
+    in both directions (for example, node attributes refer to frames defined later).
+    The database objects are then built in dependency order.
+    """
+
+    def __init__(self, database, source='<ldf>'):
+        # type: (_memory.MemoryDatabase, typing.Text) -> None
+        self._source = source
+        self._cluster = database.clusters.add('Cluster')
+        self._tokens = []  # type: typing.List[_Token]
+        self._position = 0
+
+        self._header = {}  # type: typing.Dict[typing.Text, typing.List[_Token]]
+        self._master = None  # type: typing.Optional[typing.Text]
+        self._time_base = 0.0
+        self._slaves = []  # type: typing.List[typing.Text]
+        self._signals = collections.OrderedDict()  # type: typing.Dict[typing.Text, _LdfSignal]
+        self._frames = collections.OrderedDict()  # type: typing.Dict[typing.Text, _LdfFrame]
+        self._sporadic_frames = collections.OrderedDict()  # type: typing.Dict[typing.Text, typing.List[typing.Text]]
+        self._event_triggered_frames = collections.OrderedDict()  # type: typing.Dict[typing.Text, _LdfEventTriggeredFrame]  # NOQA: E501
+        self._node_attributes = collections.OrderedDict()  # type: typing.Dict[typing.Text, typing.Dict[typing.Text, typing.Any]]  # NOQA: E501
+        self._schedules = collections.OrderedDict()  # type: typing.Dict[typing.Text, typing.List[_LdfScheduleCommand]]  # NOQA: E501
+        self._encodings = collections.OrderedDict()  # type: typing.Dict[typing.Text, typing.List[typing.List[_Token]]]  # NOQA: E501
+        self._representations = {}  # type: typing.Dict[typing.Text, typing.Text]
+
+    def parse(self, text):
+        # type: (typing.Text) -> None
+        """Parse the whole file and add its objects to the cluster."""
+        self._tokens = _tokenize(text, self._error_at)
+        self._position = 0
+        while not self._at_end():
+            self._parse_top_level()
+        self._build()
+        self._cluster._changed()
+
+    # Tokens
+
+    def _error_at(self, line, message):
+        # type: (int, typing.Text) -> typing.NoReturn
+        raise errors.XnetError(
+            '{}:{}: {}'.format(self._source, line, message),
+            _cconsts.NX_ERR_CANNOT_OPEN_DATABASE_FILE)
+
+    def _error(self, message):
+        # type: (typing.Text) -> typing.NoReturn
+        if self._tokens:
+            line = self._tokens[min(self._position, len(self._tokens) - 1)].line
+        else:
+            line = 1
+        self._error_at(line, message)
+
+    def _at_end(self):
+        # type: () -> bool
+        return self._position >= len(self._tokens)
+
+    def _peek(self, offset=0):
+        # type: (int) -> typing.Optional[typing.Text]
+        position = self._position + offset
+        if position < len(self._tokens):
+            return self._tokens[position].text
+        return None
+
+    def _next(self):
+        # type: () -> _Token
+        if self._at_end():
+            self._error('Unexpected end of file.')
+        token = self._tokens[self._position]
+        self._position += 1
+        return token
+
+    def _accept(self, text):
+        # type: (typing.Text) -> bool
+        if self._peek() == text:
+            self._position += 1
+            return True
+        return False
+
+    def _expect(self, text):
+        # type: (typing.Text) -> None
+        token = self._next()
+        if token.text != text or token.kind == 'string':
+            self._error_at(token.line, 'Expected "{}" but found "{}".'.format(text, token.text))
+
+    def _name(self):
+        # type: () -> typing.Text
+        token = self._next()
+        if token.kind != 'name':
+            self._error_at(token.line, 'Expected a name but found "{}".'.format(token.text))
+        return token.text
+
+    def _number(self):
+        # type: () -> typing.Union[int, float]
+        token = self._next()
+        if token.kind != 'number':
+            self._error_at(token.line, 'Expected a number but found "{}".'.format(token.text))
+        return _to_number(token.text)
+
+    def _milliseconds(self):
+        # type: () -> float
+        """Parse a time in milliseconds and return it in seconds."""
+        value = self._number()
+        self._accept('ms')
+        return value / 1000
+
+    def _skip_block(self):
+        # type: () -> None
+        self._expect('{')
+        depth = 1
+        while depth:
+            text = self._next().text
+            if text == '{':
+                depth += 1
+            elif text == '}':
+                depth -= 1
+
+    def _statement_tokens(self):
+        # type: () -> typing.List[_Token]
+        """Return the tokens up to the next semicolon, which is consumed."""
+        tokens = []
+        while True:
+            token = self._next()
+            if token.text == ';' and token.kind == 'punct':
+                return tokens
+            tokens.append(token)
+
+    def _block_items(self):
+        # type: () -> typing.Iterator[None]
+        """Yield once per item of a braced block, until its closing brace is consumed."""
+        self._expect('{')
+        while not self._accept('}'):
+            if self._at_end():
+                self._error('Block is not closed.')
+            yield
+
+    # Sections
+
+    def _parse_top_level(self):
+        # type: () -> None
+        name = self._name()
+        handler = self._SECTIONS.get(name)
+        if handler is not None:
+            handler(self)
+        elif self._peek() == '{':
+            self._skip_block()
+        else:
+            self._accept('=')
+            self._header[name] = self._statement_tokens()
+
+    def _parse_nodes(self):
+        # type: () -> None
+        for _ in self._block_items():
+            kind = self._name()
+            self._expect(':')
+            if kind == 'Master':
+                self._master = self._name()
+                self._expect(',')
+                self._time_base = self._milliseconds()
+                self._expect(',')
+                self._milliseconds()  # jitter
+                while not self._accept(';'):
+                    self._next()
+            elif kind == 'Slaves':
+                self._slaves.extend(self._name_list())
+            else:
+                self._statement_tokens()
+
+    def _parse_signals(self):
+        # type: () -> None
+        for _ in self._block_items():
+            name = self._name()
+            self._expect(':')
+            size = int(self._number())
+            self._expect(',')
+            if self._accept('{'):
+                init = [int(self._number())]  # type: typing.Union[int, typing.List[int]]
+                while self._accept(','):
+                    init.append(int(self._number()))
+                self._expect('}')
+            else:
+                init = int(self._number())
+            publisher = None
+            subscribers = []  # type: typing.List[typing.Text]
+            if self._accept(','):
+                nodes = self._name_list()
+                publisher, subscribers = nodes[0], nodes[1:]
+            else:
+                self._expect(';')
+            self._signals[name] = _LdfSignal(size, init, publisher, subscribers)
+
+    def _parse_frames(self):
+        # type: () -> None
+        for _ in self._block_items():
+            name = self._name()
+            self._expect(':')
+            frame_id = int(self._number())
+            self._expect(',')
+            publisher = self._name()
+            length = None
+            if self._accept(','):
+                length = int(self._number())
+            signals = self._frame_signals()
+            self._frames[name] = _LdfFrame(frame_id, [publisher], length, signals)
+
+    def _parse_diagnostic_frames(self):
+        # type: () -> None
+        for _ in self._block_items():
+            name = self._name()
+            self._expect(':')
+            frame_id = int(self._number())
+            # The master publishes the request frame and the slaves publish the response frame.
+            self._frames[name] = _LdfFrame(frame_id, None, 8, self._frame_signals())
+
+    def _frame_signals(self):
+        # type: () -> typing.List[typing.Tuple[typing.Text, int]]
+        signals = []
+        for _ in self._block_items():
+            signal = self._name()
+            self._expect(',')
+            signals.append((signal, int(self._number())))
+            self._expect(';')
+        return signals
+
+    def _parse_sporadic_frames(self):
+        # type: () -> None
+        for _ in self._block_items():
+            name = self._name()
+            self._expect(':')
+            self._sporadic_frames[name] = self._name_list()
+
+    def _parse_event_triggered_frames(self):
+        # type: () -> None
+        for _ in self._block_items():
+            name = self._name()
+            self._expect(':')
+            collision_table = None
+            if self._tokens[self._position].kind == 'name':
+                # LIN 2.1 and later name the collision resolving schedule table first.
+                collision_table = self._name()
+                self._expect(',')
+            frame_id = int(self._number())
+            frames = []  # type: typing.List[typing.Text]
+            if self._accept(','):
+                frames = self._name_list()
+            else:
+                self._expect(';')
+            self._event_triggered_frames[name] = _LdfEventTriggeredFrame(collision_table, frame_id, frames)
+
+    def _parse_node_attributes(self):
+        # type: () -> None
+        for _ in self._block_items():
+            node = self._name()
+            attributes = self._node_attributes.setdefault(node, {})
+            for _ in self._block_items():
+                name = self._name()
+                if name == 'configurable_frames':
+                    frames = []  # type: typing.List[typing.Tuple[typing.Text, typing.Optional[int]]]
+                    for _ in self._block_items():
+                        frame = self._name()
+                        message_id = None
+                        if self._accept('='):
+                            message_id = int(self._number())
+                        self._expect(';')
+                        frames.append((frame, message_id))
+                    attributes[name] = frames
+                else:
+                    self._expect('=')
+                    attributes[name] = [
+                        token for token in self._statement_tokens()
+                        if token.text not in (',', 'ms', '%')]
+
+    def _parse_schedule_tables(self):
+        # type: () -> None
+        for _ in self._block_items():
+            table = self._name()
+            commands = self._schedules.setdefault(table, [])
+            for _ in self._block_items():
+                line = self._tokens[self._position].line
+                command = self._name()
+                args = []  # type: typing.List[_Token]
+                if self._accept('{'):
+                    while not self._accept('}'):
+                        token = self._next()
+                        if token.text != ',':
+                            args.append(token)
+                self._expect('delay')
+                delay = self._milliseconds()
+                self._expect(';')
+                commands.append(_LdfScheduleCommand(command, args, delay, line))
+
+    def _parse_signal_encoding_types(self):
+        # type: () -> None
+        for _ in self._block_items():
+            name = self._name()
+            entries = self._encodings.setdefault(name, [])
+            for _ in self._block_items():
+                entries.append([token for token in self._statement_tokens() if token.text != ','])
+
+    def _parse_signal_representation(self):
+        # type: () -> None
+        for _ in self._block_items():
+            encoding = self._name()
+            self._expect(':')
+            for signal in self._name_list():
+                self._representations[signal] = encoding
+
+    def _name_list(self):
+        # type: () -> typing.List[typing.Text]
+        """Parse comma-separated names up to and including a semicolon."""
+        names = [self._name()]
+        while self._accept(','):
+            names.append(self._name())
+        self._expect(';')
+        return names
+
+    _SECTIONS = {
+        'Nodes': _parse_nodes,
+        'Signals': _parse_signals,
+        'Diagnostic_signals': _parse_signals,
+        'Frames': _parse_frames,
+        'Diagnostic_frames': _parse_diagnostic_frames,
+        'Sporadic_frames': _parse_sporadic_frames,
+        'Event_triggered_frames': _parse_event_triggered_frames,
+        'Node_attributes': _parse_node_attributes,
+        'Schedule_tables': _parse_schedule_tables,
+        'Signal_encoding_types': _parse_signal_encoding_types,
+        'Signal_representation': _parse_signal_representation,
+    }
+
+    # Database objects
+
+    def _build(self):
+        # type: () -> None
+        cluster = self._cluster
+        cluster.protocol = constants.Protocol.LIN
+        cluster.lin_tick = self._time_base
+        speed = self._header.get('LIN_speed')
+        if speed:
+            cluster.baud_rate = int(round(_to_number(speed[0].text) * 1000))
+        version = self._header.get('LIN_protocol_version')
+        file_version = self._protocol_version(version[0]) if version else constants.LinProtocolVer.VER_2_2
+
+        if self._master:
+            master = cluster.ecus.add(self._master)
+            master.lin_master = True
+            master.lin_protocol_ver = file_version
+        for name in self._slaves:
+            ecu = cluster.ecus.add(name)
+            ecu.lin_protocol_ver = file_version
+            self._build_node_attributes(ecu, self._node_attributes.get(name, {}))
+
+        for name, frame in self._frames.items():
+            self._build_frame(name, frame)
+        self._build_schedules()
+
+    def _build_node_attributes(self, ecu, attributes):
+        # type: (_memory.MemoryEcu, typing.Dict[typing.Text, typing.Any]) -> None
+        def number(name, index=0):
+            values = attributes.get(name)
+            if values is None or len(values) <= index:
+                return None
+            return _to_number(values[index].text)
+
+        if 'LIN_protocol' in attributes:
+            ecu.lin_protocol_ver = self._protocol_version(attributes['LIN_protocol'][0])
+        if number('configured_NAD') is not None:
+            ecu.lin_config_nad = ecu.lin_initial_nad = int(number('configured_NAD'))
+        if number('initial_NAD') is not None:
+            ecu.lin_initial_nad = int(number('initial_NAD'))
+        if number('product_id') is not None:
+            ecu.lin_supplier_id = int(number('product_id'))
+        if number('product_id', 1) is not None:
+            ecu.lin_function_id = int(number('product_id', 1))
+        if number('P2_min') is not None:
+            ecu.lin_p2_min = number('P2_min') / 1000
+        if number('ST_min') is not None:
+            ecu.lin_st_min = number('ST_min') / 1000
+
+    def _protocol_version(self, token):
+        # type: (_Token) -> constants.LinProtocolVer
+        text = token.text
+        if text.startswith('J2602'):
+            # SAE J2602 is based on LIN 2.0.
+            return constants.LinProtocolVer.VER_2_0
+        version = _PROTOCOL_VERSIONS.get(text)
+        if version is None:
+            self._error_at(token.line, 'LIN protocol version "{}" is not supported.'.format(text))
+        return version
+
+    def _build_frame(self, name, ldf_frame):
+        # type: (typing.Text, _LdfFrame) -> None
+        cluster = self._cluster
+        frame = cluster.frames._insert(_memory.MemoryFrame(cluster, name))
+        frame.id = ldf_frame.id
+        payload_len = ldf_frame.length
+        if payload_len is None:
+            payload_len = max([(offset + self._signals[signal].size + 7) // 8
+                               for signal, offset in ldf_frame.signals if signal in self._signals] or [0])
+        frame.payload_len = payload_len
+
+        payload = (1 << (payload_len * 8)) - 1
+        publishers = ldf_frame.publishers
+        if publishers is None:
+            publishers = [self._master] if frame.id == _MASTER_REQ_ID else self._slaves
+        for publisher in publishers:
+            if publisher in cluster.ecus:
+                cluster.ecus[publisher].tx_frms.append(frame)
+        for signal_name, offset in ldf_frame.signals:
+            ldf_signal = self._signals.get(signal_name)
+            if ldf_signal is None:
+                raise errors.XnetError(
+                    '{}: Frame "{}" refers to unknown signal "{}".'.format(self._source, name, signal_name),
+                    _cconsts.NX_ERR_CANNOT_OPEN_DATABASE_FILE)
+            signal = frame.mux_static_signals._insert(_memory.MemorySignal(frame, signal_name))
+            signal.start_bit = offset
+            signal.num_bits = ldf_signal.size
+            signal.data_type = constants.SigDataType.UNSIGNED
+            signal.max = float((1 << ldf_signal.size) - 1)
+
+            init = ldf_signal.init
+            if isinstance(init, list):
+                init = sum(value << (8 * index) for index, value in enumerate(init))
+            mask = (1 << ldf_signal.size) - 1
+            payload = (payload & ~(mask << offset)) | ((init & mask) << offset)
+            self._build_encoding(signal, self._representations.get(signal_name))
+            signal.default = init * signal.scale_fac + signal.scale_off
+
+            for subscriber in ldf_signal.subscribers:
+                if subscriber in cluster.ecus:
+                    rx_frms = cluster.ecus[subscriber].rx_frms
+                    if frame not in rx_frms:
+                        rx_frms.append(frame)
+        if ldf_frame.id == _MASTER_REQ_ID:
+            for slave in self._slaves:
+                cluster.ecus[slave].rx_frms.append(frame)
+        elif ldf_frame.id == _SLAVE_RESP_ID and self._master:
+            cluster.ecus[self._master].rx_frms.append(frame)
+        frame.default_payload = [(payload >> (8 * index)) & 0xFF for index in range(payload_len)]
+
+    def _build_encoding(self, signal, encoding):
+        # type: (_memory.MemorySignal, typing.Optional[typing.Text]) -> None
+        if encoding is None:
+            return
+        physical_ranges = []
+        for entry in self._encodings.get(encoding, []):
+            kind = entry[0].text
+            if kind == 'physical_value':
+                minimum, maximum, scale_fac, scale_off = [_to_number(token.text) for token in entry[1:5]]
+                physical_ranges.append((minimum, maximum, scale_fac, scale_off))
+                if len(entry) > 5 and not signal.unit:
+                    signal.unit = entry[5].text
+            elif kind == 'logical_value':
+                label = entry[2].text if len(entry) > 2 else entry[1].text
+                signal._get_value_table()[label] = int(_to_number(entry[1].text))
+
+        if physical_ranges:
+            signal.scale_fac = float(physical_ranges[0][2])
+            signal.scale_off = float(physical_ranges[0][3])
+            physical_values = [
+                raw * scale_fac + scale_off
+                for minimum, maximum, scale_fac, scale_off in physical_ranges
+                for raw in (minimum, maximum)]
+            signal.min = float(min(physical_values))
+            signal.max = float(max(physical_values))
+
+    def _build_schedules(self):
+        # type: () -> None
+        cluster = self._cluster
+        collision_tables = set(
+            frame.collision_table for frame in self._event_triggered_frames.values() if frame.collision_table)
+        for table in self._schedules:
+            schedule = cluster.lin_schedules._insert(_memory.MemoryLinSched(cluster, table))
+            if table in collision_tables:
+                schedule.run_mode = constants.LinSchedRunMode.ONCE
+        for table, commands in self._schedules.items():
+            schedule = cluster.lin_schedules[table]
+            counts = collections.Counter()  # type: typing.Dict[typing.Text, int]
+            for command in commands:
+                counts[command.command] += 1
+                name = command.command
+                if counts[name] > 1:
+                    name = u'{}_{}'.format(name, counts[name])
+                entry = schedule.entries._insert(_memory.MemoryLinSchedEntry(schedule, name))
+                entry.delay = command.delay
+                try:
+                    self._build_entry(entry, command)
+                except (IndexError, KeyError, ValueError) as e:
+                    self._error_at(command.line, 'Malformed {} schedule entry ({}).'.format(command.command, e))
+
+    def _build_entry(self, entry, command):
+        # type: (_memory.MemoryLinSchedEntry, _LdfScheduleCommand) -> None
+        frames = self._cluster.frames
+        name = command.command
+        if name in frames:
+            entry.frames = [frames[name]]
+        elif name in self._sporadic_frames:
+            entry.type = constants.LinSchedEntryType.SPORADIC
+            entry.frames = [frames[frame] for frame in self._sporadic_frames[name]]
+        elif name in self._event_triggered_frames:
+            event_triggered_frame = self._event_triggered_frames[name]
+            entry.type = constants.LinSchedEntryType.EVENT_TRIGGERED
+            entry.event_id = event_triggered_frame.id
+            entry.frames = [frames[frame] for frame in event_triggered_frame.frames]
+            if event_triggered_frame.collision_table:
+                entry.collision_res_sched = self._cluster.lin_schedules[event_triggered_frame.collision_table]
+        elif name in _NODE_CONFIG_COMMANDS:
+            entry.type = constants.LinSchedEntryType.NODE_CONFIG_SERVICE
+            entry.nc_ff_data_bytes = _NODE_CONFIG_COMMANDS[name](self, command.args)
+            master_requests = [frame for frame in frames.values() if frame.id == _MASTER_REQ_ID]
+            entry.frames = master_requests[:1]
+        else:
+            self._error_at(command.line, 'Schedule table refers to unknown frame "{}".'.format(name))
+
+    # Node configuration commands, as the eight bytes of the master request frame.
+
+    def _node(self, token):
+        # type: (_Token) -> _memory.MemoryEcu
+        return self._cluster.ecus[token.text]
+
+    def _message_id(self, node, frame):
+        # type: (typing.Text, typing.Text) -> int
+        for name, message_id in self._node_attributes[node].get('configurable_frames', []):
+            if name == frame and message_id is not None:
+                return message_id
+        raise KeyError(frame)
+
+    def _assign_nad(self, args):
+        # type: (typing.List[_Token]) -> typing.List[int]
+        node = self._node(args[0])
+        data = _le16(node.lin_supplier_id) + _le16(node.lin_function_id)
+        return [node.lin_initial_nad, 0x06, 0xB0] + data + [node.lin_config_nad]
+
+    def _conditional_change_nad(self, args):
+        # type: (typing.List[_Token]) -> typing.List[int]
+        nad, identifier, byte, mask, invert, new_nad = [int(_to_number(arg.text)) for arg in args[:6]]
+        return [nad, 0x06, 0xB3, identifier, byte, mask, invert, new_nad]
+
+    def _data_dump(self, args):
+        # type: (typing.List[_Token]) -> typing.List[int]
+        node = self._node(args[0])
+        return [node.lin_config_nad, 0x06, 0xB4] + [int(_to_number(arg.text)) for arg in args[1:6]]
+
+    def _save_configuration(self, args):
+        # type: (typing.List[_Token]) -> typing.List[int]
+        return [self._node(args[0]).lin_config_nad, 0x01, 0xB6] + [_NO_DATA] * 5
+
+    def _assign_frame_id_range(self, args):
+        # type: (typing.List[_Token]) -> typing.List[int]
+        node = self._node(args[0])
+        start_index = int(_to_number(args[1].text))
+        if len(args) > 2:
+            pids = [int(_to_number(arg.text)) for arg in args[2:6]]
+        else:
+            configurable_frames = self._node_attributes.get(node.name, {}).get('configurable_frames', [])
+            pids = [
+                protected_id(self._frame_id(name))
+                for name, _ in configurable_frames[start_index:start_index + 4]]
+        pids += [_NO_DATA] * (4 - len(pids))
+        return [node.lin_config_nad, 0x06, 0xB7, start_index] + pids
+
+    def _assign_frame_id(self, args, unassign=False):
+        # type: (typing.List[_Token], bool) -> typing.List[int]
+        node = self._node(args[0])
+        frame = args[1].text
+        pid = _UNASSIGNED_PID if unassign else protected_id(self._frame_id(frame))
+        data = _le16(node.lin_supplier_id) + _le16(self._message_id(node.name, frame))
+        return [node.lin_config_nad, 0x06, 0xB1] + data + [pid]
+
+    def _unassign_frame_id(self, args):
+        # type: (typing.List[_Token]) -> typing.List[int]
+        return self._assign_frame_id(args, unassign=True)
+
+    def _free_format(self, args):
+        # type: (typing.List[_Token]) -> typing.List[int]
+        return [int(_to_number(arg.text)) for arg in args[:8]]
+
+    def _frame_id(self, name):
+        # type: (typing.Text) -> int
+        if name in self._frames:
+            return self._frames[name].id
+        return self._event_triggered_frames[name].id
+
+
+_NODE_CONFIG_COMMANDS = {
+    'AssignNAD': LdfParser._assign_nad,
+    'ConditionalChangeNAD': LdfParser._conditional_change_nad,
+    'DataDump': LdfParser._data_dump,
+    'SaveConfiguration': LdfParser._save_configuration,
+    'AssignFrameIdRange': LdfParser._assign_frame_id_range,
+    'AssignFrameId': LdfParser._assign_frame_id,
+    'UnassignFrameId': LdfParser._unassign_frame_id,
+    'FreeFormat': LdfParser._free_format,
+}
+
+
+def protected_id(frame_id):
+    # type: (int) -> int
+    """Return the LIN protected identifier of a frame identifier, which adds two parity bits.
+
+    >>> hex(protected_id(0x3C))
+    '0x3c'
+    >>> hex(protected_id(0x3D))
+    '0x7d'
+    >>> hex(protected_id(0x01))
+    '0xc1'
+    """
+    bits = [(frame_id >> index) & 1 for index in range(6)]
+    p0 = bits[0] ^ bits[1] ^ bits[2] ^ bits[4]
+    p1 = 1 ^ bits[1] ^ bits[3] ^ bits[4] ^ bits[5]
+    return (frame_id & 0x3F) | (p0 << 6) | (p1 << 7)
+
+
+def _tokenize(text, error):
+    # type: (typing.Text, typing.Callable[[int, typing.Text], typing.NoReturn]) -> typing.List[_Token]
+    """Split LDF text into names, numbers, strings, and punctuation, dropping whitespace and comments.
+
+    >>> [tuple(token) for token in _tokenize('LIN_speed = 19.2 kbps; // comment', None)]
+    [('name', 'LIN_speed', 1), ('punct', '=', 1), ('number', '19.2', 1), ('name', 'kbps', 1), ('punct', ';', 1)]
+    """
+    tokens = []
+    line = 1
+    position = 0
+    while position < len(text):
+        match = _TOKEN_RE.match(text, position)
+        if match is None:
+            error(line, 'Unexpected character "{}".'.format(text[position]))
+        kind = match.lastgroup
+        if kind != 'space':
+            tokens.append(_Token(kind, match.group(kind), line))
+        line += match.group(0).count('\n')
+        position = match.end()
+    return tokens
+
+
+def _to_number(text):
+    # type: (typing.Text) -> typing.Union[int, float]
+    """Convert an LDF integer, hexadecimal, or real number.
+
+    >>> _to_number('0x3C'), _to_number('-5'), _to_number('19.2')
+    (60, -5, 19.2)
+    """
+    lower = text.lower()
+    if '0x' in lower:
+        return int(lower, 16)
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def _le16(value):
+    # type: (int) -> typing.List[int]
+    return [value & 0xFF, (value >> 8) & 0xFF]
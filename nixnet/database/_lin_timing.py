@@ -0,0 +1,530 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import bisect
+import collections
+import math
+import typing  # NOQA: F401
+
+import six
+
+from nixnet import _cconsts
+from nixnet import constants
+from nixnet import errors
+
+
+# Break, break delimiter, sync byte and protected identifier.
+_HEADER_BITS = 34
+# Start bit, eight data bits and stop bit.
+_BYTE_BITS = 10
+# The LIN specification allows a frame to take 40% longer than its nominal time.
+_FRAME_TIME_TOLERANCE = 1.4
+_NODE_CONFIG_PAYLOAD_LEN = 8
+# Slack when comparing times, far below any LIN tick.
+_EPSILON = 1e-9
+
+LinSlot_ = collections.namedtuple(
+    'LinSlot_',
+    ['time', 'sched', 'entry', 'frames', 'duration', 'frame_time'])
+
+
+class LinSlot(LinSlot_):
+    """One slot of a LIN schedule.
+
+    Attributes:
+        time(float): Start of the slot in seconds.
+            In :any:`LinScheduleTiming.slots`, this is the offset from the start of the schedule.
+        sched(str): Name of the schedule.
+        entry(str): Name of the schedule entry.
+        frames(tuple of str): Names of the frames that can be sent in the slot.
+        duration(float): Time in seconds until the next slot starts.
+        frame_time(float): Worst-case time in seconds to transmit the longest frame of the slot.
+    """
+
+    pass
+
+
+LinFrameTiming_ = collections.namedtuple(
+    'LinFrameTiming_',
+    ['name', 'frame_time', 'num_slots', 'latency'])
+
+
+class LinFrameTiming(LinFrameTiming_):
+    """Timing of one frame in a LIN schedule, found by :any:`analyze_lin_schedule`.
+
+    Attributes:
+        name(str): Name of the frame.
+        frame_time(float): Worst-case time in seconds to transmit the frame.
+        num_slots(int): Number of slots per schedule cycle that can send the frame.
+        latency(float): Longest time in seconds between the starts of two slots that can send the frame,
+            when the schedule runs continuously.
+    """
+
+    pass
+
+
+LinTimelineSegment_ = collections.namedtuple(
+    'LinTimelineSegment_',
+    ['start', 'end', 'sched'])
+
+
+class LinTimelineSegment(LinTimelineSegment_):
+    """A time span in which one LIN schedule runs, found by :any:`simulate_lin_schedules`.
+
+    Attributes:
+        start(float): Time in seconds when the schedule starts or resumes.
+        end(float): Time in seconds when the next schedule takes over,
+            or ``None`` when the schedule runs until the end of the simulation.
+        sched(str): Name of the schedule.
+    """
+
+    pass
+
+
+class LinScheduleTiming(object):
+    """Slots and frame timing of a LIN schedule, found by :any:`analyze_lin_schedule`.
+
+    The master starts every slot on a tick,
+    so each entry's delay is rounded up to a multiple of :any:`Cluster.lin_tick`.
+    Frame times are the nominal time at the baud rate plus the 40% the LIN specification allows.
+
+    Attributes:
+        name(str): Name of the schedule.
+        run_mode(:any:`LinSchedRunMode`): How the master runs the schedule.
+        priority(int): Priority of a run-once schedule. Lower values have higher priority.
+        slots(list of :any:`LinSlot`): Slots of one schedule cycle, with times from the start of the cycle.
+        cycle(float): Duration in seconds of one pass through the schedule.
+        frames(list of :any:`LinFrameTiming`): Timing of every frame the schedule sends, in schedule order.
+    """
+
+    def __init__(self, name, run_mode, priority, slots):
+        # type: (typing.Text, constants.LinSchedRunMode, int, typing.List[LinSlot]) -> None
+        self.name = name
+        self.run_mode = run_mode
+        self.priority = priority
+        self.slots = slots
+        self._offsets = [slot.time for slot in slots]
+        self.cycle = slots[-1].time + slots[-1].duration if slots else 0.0
+        self._busy = [0.0]
+        for slot in slots:
+            self._busy.append(self._busy[-1] + slot.frame_time)
+        # Slot indexes that can send each frame.
+        self._positions = collections.OrderedDict()  # type: typing.Dict[typing.Text, typing.List[int]]
+        frame_times = {}  # type: typing.Dict[typing.Text, float]
+        for index, slot in enumerate(slots):
+            for frame_name in slot.frames:
+                self._positions.setdefault(frame_name, []).append(index)
+                frame_times[frame_name] = max(frame_times.get(frame_name, 0.0), slot.frame_time)
+        self.frames = [
+            LinFrameTiming(frame_name, frame_times[frame_name], len(positions), self._cyclic_gap(positions))
+            for frame_name, positions in self._positions.items()]
+
+    def __repr__(self):
+        return '{}(name={}, slots={}, cycle={}, utilization={:.3f})'.format(
+            type(self).__name__, self.name, len(self.slots), self.cycle, self.utilization)
+
+    @property
+    def utilization(self):
+        # type: () -> float
+        """float: Returns the share of the schedule cycle in which frames are sent, in the worst case.
+
+        Sporadic and event triggered slots are counted with their longest frame.
+        """
+        if not self.cycle:
+            return 0.0
+        return self._busy[-1] / self.cycle
+
+    @property
+    def overruns(self):
+        # type: () -> typing.List[LinSlot]
+        """list of :any:`LinSlot`: Returns the slots that are shorter than the worst-case time of their frames."""
+        return [slot for slot in self.slots if slot.frame_time > slot.duration + _EPSILON]
+
+    def _time(self, phase, index):
+        # type: (float, int) -> float
+        """Returns the start time of a slot, counting slots from the cycle that starts at ``phase``."""
+        cycles, position = divmod(index, len(self.slots))
+        return phase + cycles * self.cycle + self._offsets[position]
+
+    def _index(self, phase, time):
+        # type: (float, float) -> int
+        """Returns the index of the first slot that starts at or after ``time``."""
+        cycles = int(math.floor((time - phase) / self.cycle))
+        position = bisect.bisect_left(self._offsets, time - phase - cycles * self.cycle - _EPSILON)
+        return cycles * len(self.slots) + position
+
+    def _busy_time(self, first, last):
+        # type: (int, int) -> float
+        """Returns the frame time of the slots from index ``first`` up to ``last``."""
+        first_cycles, first_position = divmod(first, len(self.slots))
+        last_cycles, last_position = divmod(last, len(self.slots))
+        return (last_cycles - first_cycles) * self._busy[-1] + self._busy[last_position] - self._busy[first_position]
+
+    def _num_sent(self, frame_name, first, last):
+        # type: (typing.Text, int, int) -> int
+        """Returns how many slots from index ``first`` up to ``last`` can send a frame."""
+        positions = self._positions.get(frame_name, [])
+        return self._occurrence(positions, last) - self._occurrence(positions, first)
+
+    def _occurrence(self, positions, index):
+        # type: (typing.List[int], int) -> int
+        """Returns the number of slots that can send the frame before slot ``index``, counted from slot 0."""
+        cycles, position = divmod(index, len(self.slots))
+        return cycles * len(positions) + bisect.bisect_left(positions, position)
+
+    def _slot_index(self, positions, occurrence):
+        # type: (typing.List[int], int) -> int
+        """Returns the slot index of the frame's ``occurrence``-th slot."""
+        cycles, position = divmod(occurrence, len(positions))
+        return cycles * len(self.slots) + positions[position]
+
+    def _cyclic_gap(self, positions):
+        # type: (typing.List[int]) -> float
+        times = [self._offsets[position] for position in positions]
+        gaps = [later - earlier for earlier, later in zip(times, times[1:])]
+        return max(gaps + [self.cycle - times[-1] + times[0]])
+
+
+class LinTimeline(object):
+    """Slots of the LIN schedules that the master runs over time, found by :any:`simulate_lin_schedules`.
+
+    Each schedule runs in a segment of the timeline.
+    Within a segment, a slot's start time follows from its index in closed form,
+    so that slots, frame counts, utilization and latency of any time window
+    are computed without stepping through the slots before it.
+
+    Attributes:
+        schedules(list of :any:`LinScheduleTiming`): Timing of every schedule of the cluster.
+    """
+
+    def __init__(self, schedules):
+        # type: (typing.List[LinScheduleTiming]) -> None
+        self.schedules = schedules
+        self._segments = []  # type: typing.List[_Segment]
+
+    def __repr__(self):
+        return '{}(segments={})'.format(type(self).__name__, len(self._segments))
+
+    @property
+    def segments(self):
+        # type: () -> typing.List[LinTimelineSegment]
+        """list of :any:`LinTimelineSegment`: Returns the time spans of the schedules, in time order."""
+        return [LinTimelineSegment(segment.start, segment.end, segment.sched.name) for segment in self._segments]
+
+    def schedule_at(self, time):
+        # type: (float) -> typing.Optional[typing.Text]
+        """Returns the name of the schedule running at a time, or ``None`` when no schedule runs.
+
+        Args:
+            time(float): Time in seconds.
+        """
+        for segment in self._segments:
+            if segment.start <= time and (segment.end is None or time < segment.end):
+                return segment.sched.name
+        return None
+
+    def slots(self, start, stop):
+        # type: (float, float) -> typing.Iterator[LinSlot]
+        """Yields the slots that start in a time window, in time order.
+
+        Args:
+            start(float): Start of the window in seconds.
+            stop(float): End of the window in seconds. Slots starting at ``stop`` are not included.
+        Yields:
+            :any:`LinSlot` with the slot's start time.
+        """
+        for segment, first, last in self._ranges(start, stop):
+            sched = segment.sched
+            for index in six.moves.range(first, last):
+                yield sched.slots[index % len(sched.slots)]._replace(time=sched._time(segment.phase, index))
+
+    def count(self, frame_name, start, stop):
+        # type: (typing.Text, float, float) -> int
+        """Returns the number of slots that can send a frame in a time window.
+
+        Args:
+            frame_name(str): Name of the frame.
+            start(float): Start of the window in seconds.
+            stop(float): End of the window in seconds.
+        """
+        return sum(
+            segment.sched._num_sent(frame_name, first, last)
+            for segment, first, last in self._ranges(start, stop))
+
+    def utilization(self, start, stop):
+        # type: (float, float) -> float
+        """Returns the worst-case share of a time window in which frames are sent.
+
+        A slot counts with the worst-case time of its longest frame when it starts in the window.
+
+        Args:
+            start(float): Start of the window in seconds.
+            stop(float): End of the window in seconds.
+        """
+        busy = math.fsum(
+            segment.sched._busy_time(first, last)
+            for segment, first, last in self._ranges(start, stop))
+        return busy / (stop - start)
+
+    def latency(self, frame_name, start, stop):
+        # type: (typing.Text, float, float) -> float
+        """Returns the longest time in a window without a slot that can send a frame.
+
+        This includes the time from ``start`` to the first such slot, and from the last slot to ``stop``,
+        so it bounds the time from updating the frame's data to the start of its next slot,
+        including across schedule changes.
+
+        Args:
+            frame_name(str): Name of the frame.
+            start(float): Start of the window in seconds.
+            stop(float): End of the window in seconds.
+        """
+        latency = 0.0
+        previous = start
+        for segment, first, last in self._ranges(start, stop):
+            sched = segment.sched
+            positions = sched._positions.get(frame_name)
+            if not positions:
+                continue
+            first_occurrence = sched._occurrence(positions, first)
+            last_occurrence = sched._occurrence(positions, last)
+            if first_occurrence == last_occurrence:
+                continue
+            if last_occurrence - first_occurrence > len(positions):
+                # Every gap of the cycle is in the range.
+                times = [
+                    sched._time(segment.phase, sched._slot_index(positions, occurrence))
+                    for occurrence in (first_occurrence, last_occurrence - 1)]
+                latency = max(latency, sched._cyclic_gap(positions), times[0] - previous)
+            else:
+                times = [
+                    sched._time(segment.phase, sched._slot_index(positions, occurrence))
+                    for occurrence in six.moves.range(first_occurrence, last_occurrence)]
+                latency = max([latency, times[0] - previous] + [
+                    later - earlier for earlier, later in zip(times, times[1:])])
+            previous = times[-1]
+        return max(latency, stop - previous)
+
+    def _ranges(self, start, stop):
+        # type: (float, float) -> typing.Iterator[typing.Tuple[_Segment, int, int]]
+        for segment in self._segments:
+            if segment.end is not None and segment.end <= start or segment.start >= stop:
+                continue
+            sched = segment.sched
+            first = max(segment.first, sched._index(segment.phase, start))
+            last = sched._index(segment.phase, stop)
+            if segment.last is not None:
+                last = min(last, segment.last)
+            if first < last:
+                yield segment, first, last
+
+
+class _Segment(object):
+    """A schedule running from slot index ``first`` up to ``last``, where slot 0 starts at ``phase``."""
+
+    def __init__(self, sched, start, first):
+        # type: (LinScheduleTiming, float, int) -> None
+        self.sched = sched
+        self.start = start
+        self.first = first
+        self.phase = start - sched._offsets[first]
+        self.last = len(sched.slots) if sched.run_mode == constants.LinSchedRunMode.ONCE else None
+        self.end = sched._time(self.phase, self.last) if self.last is not None else None
+
+    def stop(self, time):
+        # type: (float) -> float
+        """Stops the schedule when the slot running at ``time`` ends, and returns when that is."""
+        last = max(self.first, self.sched._index(self.phase, time))
+        if self.last is not None:
+            last = min(last, self.last)
+        self.last = last
+        self.end = self.sched._time(self.phase, last)
+        return self.end
+
+
+def lin_frame_time(payload_len, baud_rate):
+    # type: (int, int) -> float
+    """Returns the worst-case time in seconds to transmit a LIN frame.
+
+    >>> print(round(lin_frame_time(8, 19200) * 1000, 3))
+    9.042
+
+    Args:
+        payload_len(int): Number of payload bytes.
+        baud_rate(int): Baud rate of the cluster.
+    Returns:
+        float: The nominal time of the header and response, plus the 40% tolerance of the LIN specification.
+    """
+    return _FRAME_TIME_TOLERANCE * (_HEADER_BITS + _BYTE_BITS * (payload_len + 1)) / baud_rate
+
+
+def analyze_lin_schedule(sched, baud_rate=None):
+    # type: (typing.Any, typing.Optional[int]) -> LinScheduleTiming
+    """Compute the slots and frame timing of a LIN schedule.
+
+    Args:
+        sched(:any:`LinSched`): LIN schedule to analyze.
+        baud_rate(int): Baud rate to use instead of :any:`Cluster.baud_rate`.
+    Returns:
+        :any:`LinScheduleTiming`
+    Raises:
+        :any:`XnetError`: The baud rate is not set.
+    """
+    cluster = sched.clst
+    return _analyze(sched, _baud_rate(cluster, baud_rate), cluster.lin_tick)
+
+
+def simulate_lin_schedules(cluster, requests, baud_rate=None):
+    # type: (typing.Any, typing.Iterable[typing.Tuple[float, typing.Any]], typing.Optional[int]) -> LinTimeline
+    """Simulate the LIN master running the schedules of a cluster.
+
+    Each request changes the running schedule like :any:`SessionBase.change_lin_schedule`.
+    No schedule runs before the first request.
+    Following the :any:`LinSched.priority` and :any:`LinSched.run_mode` rules:
+
+    *   A run-continuous schedule replaces the running continuous schedule,
+        and starts at its first entry once no run-once schedule is pending.
+    *   A run-once schedule is queued by priority.
+        It runs after the slot in progress,
+        then the interrupted continuous schedule resumes with its next entry.
+    *   A null schedule stops communication after the slot in progress,
+        and flushes the pending run-once schedules.
+
+    Every change takes effect when the slot in progress ends.
+    Event triggered collisions are not simulated.
+
+    >>> from nixnet.database import _memory
+    >>> cluster = _memory.MemoryDatabase('example').clusters.add('Body')
+    >>> cluster.protocol = constants.Protocol.LIN
+    >>> cluster.baud_rate = 19200
+    >>> frame = cluster.frames.add('Lights')
+    >>> frame.payload_len = 2
+    >>> entry = cluster.lin_schedules.add('Normal').entries.add('Lights')
+    >>> entry.frames = [frame]
+    >>> entry.delay = 0.01
+    >>> timeline = simulate_lin_schedules(cluster, [(0.0, 'Normal')])
+    >>> print(timeline.count('Lights', 0.0, 3600.0))
+    360000
+
+    Args:
+        cluster(:any:`Cluster`): LIN cluster.
+        requests(list of tuple): Pairs of the request time in seconds and the schedule to run.
+            The schedule is a :any:`LinSched`, its name,
+            or its index in :any:`Cluster.lin_schedules`.
+        baud_rate(int): Baud rate to use instead of :any:`Cluster.baud_rate`.
+    Returns:
+        :any:`LinTimeline`
+    Raises:
+        ValueError: A requested schedule has no slots or lasts no time.
+        :any:`XnetError`: The baud rate is not set.
+    """
+    rate = _baud_rate(cluster, baud_rate)
+    lin_tick = cluster.lin_tick
+    scheds = list(cluster.lin_schedules.values())
+    timings = [_analyze(sched, rate, lin_tick) for sched in scheds]
+    by_name = dict((timing.name, timing) for timing in timings)
+    timeline = LinTimeline(timings)
+
+    segments = timeline._segments
+    # The continuous schedule and the slot it starts or resumes with.
+    continuous = None  # type: typing.Optional[typing.List[typing.Any]]
+    pending = []  # type: typing.List[typing.Tuple[int, int, LinScheduleTiming]]
+    running = None  # type: typing.Optional[_Segment]
+
+    def start(time):
+        # type: (float) -> typing.Optional[_Segment]
+        """Starts the next pending run-once schedule, or resumes the continuous schedule."""
+        if pending:
+            pending.sort(key=lambda item: item[:2])
+            segment = _Segment(pending.pop(0)[2], time, 0)
+        elif continuous is not None:
+            segment = _Segment(continuous[0], time, continuous[1])
+        else:
+            return None
+        segments.append(segment)
+        return segment
+
+    def stop(time):
+        # type: (float) -> float
+        """Stops the running schedule when its slot in progress ends, and returns when that is."""
+        end = running.stop(time)
+        if running.end == running.start:
+            # The schedule was stopped before it started.
+            segments.remove(running)
+        return end
+
+    for sequence, (time, sched) in enumerate(sorted(requests, key=lambda request: request[0])):
+        timing = _lookup(sched, timings, by_name)
+        if timing.run_mode != constants.LinSchedRunMode.NULL and not timing.cycle:
+            raise ValueError('LIN schedule {} has no duration'.format(timing.name))
+        # Run the run-once schedules that end before the request.
+        while running is not None and running.end is not None and running.end <= time:
+            running = start(running.end)
+
+        if timing.run_mode == constants.LinSchedRunMode.NULL:
+            del pending[:]
+            continuous = None
+            if running is not None:
+                stop(time)
+                running = None
+        elif timing.run_mode == constants.LinSchedRunMode.ONCE:
+            pending.append((timing.priority, sequence, timing))
+            if running is None:
+                running = start(time)
+            elif running.sched.run_mode == constants.LinSchedRunMode.CONTINUOUS:
+                end = stop(time)
+                continuous[1] = running.last % len(running.sched.slots)
+                running = start(end)
+        else:
+            continuous = [timing, 0]
+            if running is None:
+                running = start(time)
+            elif running.sched.run_mode == constants.LinSchedRunMode.CONTINUOUS:
+                running = start(stop(time))
+
+    # Run the remaining run-once schedules.
+    while running is not None and running.end is not None:
+        running = start(running.end)
+    return timeline
+
+
+def _baud_rate(cluster, baud_rate):
+    # type: (typing.Any, typing.Optional[int]) -> int
+    if cluster.protocol != constants.Protocol.LIN:
+        raise ValueError('{} is not a LIN cluster'.format(cluster.name))
+    if baud_rate is None:
+        baud_rate = cluster.baud_rate
+    if not baud_rate:
+        raise errors.XnetError(
+            'Cluster {} has no baud rate'.format(cluster.name),
+            _cconsts.NX_ERR_BAUD_RATE_NOT_CONFIGURED)
+    return baud_rate
+
+
+def _analyze(sched, baud_rate, lin_tick):
+    # type: (typing.Any, int, float) -> LinScheduleTiming
+    name = sched.name
+    slots = []
+    time = 0.0
+    for entry in sched.entries.values():
+        frames = list(entry.frames)
+        if entry.type == constants.LinSchedEntryType.NODE_CONFIG_SERVICE:
+            frame_time = lin_frame_time(_NODE_CONFIG_PAYLOAD_LEN, baud_rate)
+        else:
+            frame_time = max([lin_frame_time(frame.payload_len, baud_rate) for frame in frames] + [0.0])
+        duration = entry.delay
+        if lin_tick:
+            duration = math.ceil(duration / lin_tick - _EPSILON) * lin_tick
+        slots.append(LinSlot(time, name, entry.name, tuple(frame.name for frame in frames), duration, frame_time))
+        time += duration
+    return LinScheduleTiming(name, sched.run_mode, sched.priority, slots)
+
+
+def _lookup(sched, timings, by_name):
+    # type: (typing.Any, typing.List[LinScheduleTiming], typing.Dict[typing.Text, LinScheduleTiming]) -> LinScheduleTiming  # NOQA: E501
+    if isinstance(sched, six.integer_types):
+        return timings[sched]
+    if isinstance(sched, six.string_types):
+        return by_name[sched]
+    return by_name[sched.name]
@@ -0,0 +1,50 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+import typing  # NOQA: F401
+
+from nixnet import _cconsts
+from nixnet import errors
+
+from nixnet.database import _arxml_parser
+from nixnet.database import _dbc_parser
+from nixnet.database import _fibex_parser
+from nixnet.database import _ldf_parser
+from nixnet.database import _memory  # NOQA: F401
+
+
+_LOADERS = {
+    '.arxml': _arxml_parser.load_arxml,
+    '.dbc': _dbc_parser.load_dbc,
+    '.ldf': _ldf_parser.load_ldf,
+    '.xml': _fibex_parser.load_fibex,
+}
+
+
+def load(filepath):
+    # type: (typing.Text) -> _memory.MemoryDatabase
+    """Read a database file into an in-memory database without the NI-XNET driver.
+
+    The file format is selected by the file extension:
+
+    *   ``.arxml``: :any:`load_arxml`
+    *   ``.dbc``: :any:`load_dbc`
+    *   ``.ldf``: :any:`load_ldf`
+    *   ``.xml``: :any:`load_fibex`
+
+    Args:
+        filepath(str): Path of the database file.
+    Returns:
+        :any:`MemoryDatabase`: The database.
+    Raises:
+        :any:`XnetError`: The file extension is not supported or the file is malformed.
+    """
+    extension = os.path.splitext(filepath)[1].lower()
+    loader = _LOADERS.get(extension)
+    if loader is None:
+        raise errors.XnetError(
+            'Database file extension "{}" is not supported.'.format(extension),
+            _cconsts.NX_ERR_FILE_EXTENSION)
+    return loader(filepath)
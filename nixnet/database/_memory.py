@@ -0,0 +1,1309 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+import sys
+import typing  # NOQA: F401
+
+import six
+
+from nixnet import _cconsts
+from nixnet import constants
+from nixnet import errors
+
+from nixnet.database import _database_object
+from nixnet.database import _dbc_signal_value_table
+from nixnet.database import _find_object
+
+
+_DUPLICATE_NAME_ERRORS = {
+    constants.ObjectClass.CLUSTER: _cconsts.NX_ERR_DUPLICATE_CLUSTER_NAME,
+    constants.ObjectClass.FRAME: _cconsts.NX_ERR_DUPLICATE_FRAME_NAME,
+    constants.ObjectClass.SIGNAL: _cconsts.NX_ERR_DUPLICATE_SIGNAL_NAME,
+    constants.ObjectClass.ECU: _cconsts.NX_ERR_DUPLICATE_ECU_NAME,
+    constants.ObjectClass.SUBFRAME: _cconsts.NX_ERR_DUPLICATE_SUBFRAME_NAME,
+    constants.ObjectClass.PDU: _cconsts.NX_ERR_DUPLICATE_PDU_OBJECT,
+    constants.ObjectClass.LIN_SCHED: _cconsts.NX_ERR_DUPLICATE_SCHEDULE_NAME,
+    constants.ObjectClass.LIN_SCHED_ENTRY: _cconsts.NX_ERR_DUPLICATE_SCHEDULE_ENTRY_NAME,
+}
+
+_LIN_DIAGNOSTIC_IDS = (0x3C, 0x3D)
+
+_MAX_LIN_PAYLOAD_LEN = 8
+
+_MAX_PAYLOAD_LEN = {
+    constants.CanIoMode.CAN: 8,
+    constants.CanIoMode.CAN_FD: 64,
+    constants.CanIoMode.CAN_FD_BRS: 64,
+}
+
+# Dictionaries keep their insertion order from Python 3.7, in about half the memory of an OrderedDict.
+_OrderedDict = dict if sys.version_info >= (3, 7) else collections.OrderedDict
+
+# Empty collections share this dictionary until their first object is added.
+_NO_OBJECTS = {}  # type: typing.Dict[typing.Text, typing.Any]
+
+
+class MemoryCollection(collections.Mapping):
+    """Collection of in-memory database objects.
+
+    This collection has the same interface as :any:`DbCollection`.
+    Objects keep the order in which they were added.
+    """
+
+    __slots__ = ('_owner', '_type', '_factory', '_objects')
+
+    def __init__(self, owner, db_type, factory):
+        # type: (typing.Any, constants.ObjectClass, typing.Any) -> None
+        self._owner = owner
+        self._type = db_type
+        self._factory = factory
+        self._objects = _NO_OBJECTS  # type: typing.Dict[typing.Text, typing.Any]
+
+    def __repr__(self):
+        return '{}(owner={}, db_type={})'.format(type(self).__name__, self._owner, self._type)
+
+    def __len__(self):
+        return len(self._objects)
+
+    def __iter__(self):
+        return self.keys()
+
+    def __getitem__(self, index):
+        """Return the database object.
+
+        Args:
+            index(str): Name of database object.
+        Returns:
+            Database object.
+        """
+        if isinstance(index, six.string_types):
+            return self._objects[index]
+        else:
+            raise TypeError(index)
+
+    def __delitem__(self, index):
+        obj = self._objects.pop(index)
+        obj._container = None
+        self._owner._changed()
+
+    def keys(self):
+        """Return database object names in the collection.
+
+        Yields:
+            An iterator to database object names in the collection.
+        """
+        return iter(list(self._objects.keys()))
+
+    def values(self):
+        """Return database objects in the collection.
+
+        Yields:
+            An iterator to database objects in the collection.
+        """
+        return iter(list(self._objects.values()))
+
+    def items(self):
+        """Return all database object names and objects in the collection.
+
+        Yields:
+            An iterator to tuple pairs of database object names and objects in the collection
+        """
+        return iter(list(self._objects.items()))
+
+    def add(self, name):
+        # type: (typing.Text) -> typing.Any
+        """Add a new database object to the collection.
+
+        Args:
+            name(str): Name of the new database object.
+        Returns:
+            ``DatabaseObject``: An instance of the new database object.
+        Raises:
+            :any:`XnetError`: An object with this name already exists.
+        """
+        obj = self._insert(self._factory(self._owner, name))
+        self._owner._changed()
+        return obj
+
+    def _insert(self, obj):
+        # type: (typing.Any) -> typing.Any
+        """Add a new object without notifying the owner, for importers that notify once at the end."""
+        name = obj._name
+        self._check_unique(name)
+        if self._objects is _NO_OBJECTS:
+            self._objects = _OrderedDict()
+        obj._container = self
+        self._objects[name] = obj
+        return obj
+
+    def _insert_unnamed(self, obj):
+        # type: (typing.Any) -> None
+        """Add an object keyed by itself, for importers that name it later and then call :meth:`_reindex`."""
+        if self._objects is _NO_OBJECTS:
+            self._objects = _OrderedDict()
+        obj._container = self
+        self._objects[obj] = obj
+
+    def _reindex(self):
+        # type: () -> None
+        """Key the objects by their names again, keeping their order."""
+        objects, self._objects = self._objects, _NO_OBJECTS
+        for obj in objects.values():
+            self._insert(obj)
+
+    def _check_unique(self, name):
+        # type: (typing.Text) -> None
+        if name in self._objects:
+            raise errors.XnetError(
+                'Database object "{}" already exists.'.format(name),
+                _DUPLICATE_NAME_ERRORS.get(self._type, _cconsts.NX_ERR_INVALID_PROPERTY_VALUE))
+
+    def _rename(self, obj, old_name, new_name):
+        # type: (typing.Any, typing.Text, typing.Text) -> None
+        self._check_unique(new_name)
+        self._objects = _OrderedDict(
+            (new_name if name == old_name else name, value)
+            for name, value in self._objects.items())
+
+
+class MemoryDbcAttributeCollection(collections.Mapping):
+    """Collection for accessing the DBC attributes of an in-memory database object.
+
+    This collection has the same interface as :any:`DbcAttributeCollection`.
+    """
+
+    def __init__(self, definitions, values):
+        # type: (typing.Dict[typing.Text, typing.List], typing.Dict[typing.Text, typing.Text]) -> None
+        self._definitions = definitions
+        self._values = values
+
+    def __repr__(self):
+        return '{}({})'.format(type(self).__name__, dict(self.items()))
+
+    def __len__(self):
+        return len(self._definitions)
+
+    def __iter__(self):
+        return self.keys()
+
+    def __getitem__(self, key):
+        # type: (typing.Text) -> typing.Tuple[typing.Text, bool]
+        """Return the attribute value and whether it's the default value.
+
+            Args:
+                key(str): attribute name.
+            Returns:
+                tuple(str, bool): attribute value and whether it's the default value.
+        """
+        if isinstance(key, six.string_types):
+            return self._get_value(key)
+        else:
+            raise TypeError(key)
+
+    def keys(self):
+        """Return all attribute names in the collection.
+
+            Yields:
+                An iterator to all attribute names in the collection.
+        """
+        return iter(self._definitions)
+
+    def values(self):
+        """Return all attribute values in the collection.
+
+            Yields:
+                An iterator to all attribute values in the collection.
+        """
+        for name in self._definitions:
+            yield self._get_value(name)
+
+    def items(self):
+        """Return all attribute names and values in the collection.
+
+            Yields:
+                An iterator to tuple pairs of attribute names and values in the collection.
+        """
+        for name in self._definitions:
+            yield name, self._get_value(name)
+
+    def _get_value(self, name):
+        # type: (typing.Text) -> typing.Tuple[typing.Text, bool]
+        if name not in self._definitions:
+            raise KeyError('Attribute name %s not found in DBC attributes' % name)
+
+        default, enums = self._definitions[name]
+        if name not in self._values:
+            return default, True
+
+        value = self._values[name]
+        if enums:
+            # This attribute is an enum. Replace the enum index with the enum string.
+            value = enums[int(value)]
+        return value, False
+
+
+class MemoryDbcSignalValueTable(collections.Mapping):
+    """Collection for accessing the DBC value table of an in-memory signal.
+
+    This collection has the same interface as :any:`DbcSignalValueTable`.
+    """
+
+    def __init__(self, value_table):
+        # type: (typing.Dict[typing.Text, int]) -> None
+        self._value_table = value_table
+
+    def __repr__(self):
+        return '{}({})'.format(type(self).__name__, self._value_table)
+
+    def __len__(self):
+        return len(self._value_table)
+
+    def __iter__(self):
+        return self.keys()
+
+    def __getitem__(self, key):
+        # type: (typing.Text) -> int
+        """Return the value.
+
+            Args:
+                Value description.
+            Returns:
+                Value
+        """
+        if isinstance(key, six.string_types):
+            return self._value_table[key]
+        else:
+            raise TypeError(key)
+
+    def keys(self):
+        """Return all value descriptions in the collection.
+
+            Yields:
+                An iterator to all value descriptions in the collection.
+        """
+        return iter(self._value_table.keys())
+
+    def values(self):
+        """Return all values in the collection.
+
+            Yields:
+                An iterator to all values in the collection.
+        """
+        return iter(self._value_table.values())
+
+    def items(self):
+        """Return all value descriptions and values in the collection.
+
+            Yields:
+                An iterator to tuple pairs of value descriptions and values in the collection.
+        """
+        return iter(self._value_table.items())
+
+    def compile(self):
+        # type: () -> _dbc_signal_value_table.CompiledValueTable
+        """Compile the value table for converting many values at once.
+
+            Later changes to the value table do not change the compiled table.
+
+            Returns:
+                :any:`CompiledValueTable`
+        """
+        return _dbc_signal_value_table.CompiledValueTable(self._value_table)
+
+
+class _MemoryObject(_database_object.DatabaseObject):
+    """Common behavior of the in-memory database objects."""
+
+    _object_class = None  # type: constants.ObjectClass
+    _dbc_kind = None  # type: typing.Optional[typing.Text]
+
+    # Defaults live on the class, so an object only stores the properties that were set.
+    # The attributes that every object has are kept in slots,
+    # and the instance dictionary is only created for the first property set.
+    # The properties that importers set on every object are also kept in slots,
+    # with the defaults in _slot_defaults, which __init__ sets.
+    # This keeps large databases small.
+    __slots__ = ('_parent', '_name', '_container', '__dict__')
+    _slot_defaults = {}  # type: typing.Dict[typing.Text, typing.Any]
+
+    _dbc_attribute_values = None  # type: typing.Optional[typing.Dict[typing.Text, typing.Text]]
+    _dbc_attributes = None  # type: typing.Optional[MemoryDbcAttributeCollection]
+    comment = u''
+
+    def __init__(self, parent, name):
+        # type: (typing.Any, typing.Text) -> None
+        self._parent = parent
+        self._name = name
+        self._container = None  # type: typing.Optional[MemoryCollection]
+        for key, value in self._slot_defaults.items():
+            setattr(self, key, value)
+
+    def __repr__(self):
+        return '{}(name={})'.format(type(self).__name__, self._name)
+
+    @property
+    def name(self):
+        # type: () -> typing.Text
+        """str: Get or set the object name.
+
+        The name must be unique within the parent object.
+        """
+        return self._name
+
+    @name.setter
+    def name(self, value):
+        # type: (typing.Text) -> None
+        if value == self._name:
+            return
+        if self._container is not None:
+            self._container._rename(self, self._name, value)
+        self._name = value
+        self._changed()
+
+    def check_config_status(self):
+        # type: () -> None
+        """Check this object's configuration status.
+
+        Raises:
+            :any:`XnetError`: The object is incorrectly configured.
+        """
+        pass
+
+    def find(
+            self,
+            object_class,  # type: typing.Type[_database_object.DatabaseObject]
+            object_name,  # type: typing.Text
+    ):
+        # type: (...) -> _database_object.DatabaseObject
+        """Finds an object in the database.
+
+        This function finds a database object relative to this parent object.
+        If this object is not a direct parent, qualify ``object_name`` with the names of
+        the objects in between, such as ``myFrameA.mySignal``.
+
+        Args:
+            object_class(``DatabaseObject``): The class of the object to find.
+                Both the driver classes, such as :any:`nixnet.database.Signal<_signal.Signal>`,
+                and the in-memory classes, such as :any:`MemorySignal`, are accepted.
+            object_name(str): The name of the object to find.
+        Returns:
+            An instance of the found object.
+        Raises:
+            ValueError: Unsupported value provided for argument ``object_class``.
+            :any:`XnetError`: The object is not found or the name is ambiguous.
+        """
+        return _find_descendant(self, object_class, object_name)
+
+    def _children(self):
+        # type: () -> typing.Iterable[_MemoryObject]
+        return ()
+
+    def _path(self):
+        # type: () -> typing.List[typing.Text]
+        """Return the names that qualify this object, from the cluster down."""
+        return self._parent._path() + [self._name]
+
+    def _changed(self):
+        # type: () -> None
+        self._parent._changed()
+
+    def _get_cluster(self):
+        # type: () -> MemoryCluster
+        return self._parent._get_cluster()
+
+    def _get_dbc_attributes(self):
+        # type: () -> MemoryDbcAttributeCollection
+        if self._dbc_attributes is None:
+            definitions = self._get_cluster()._dbc_attribute_definitions.setdefault(
+                self._dbc_kind,
+                collections.OrderedDict())
+            self._dbc_attributes = MemoryDbcAttributeCollection(definitions, self._get_dbc_attribute_values())
+        return self._dbc_attributes
+
+    def _get_dbc_attribute_values(self):
+        # type: () -> typing.Dict[typing.Text, typing.Text]
+        if self._dbc_attribute_values is None:
+            self._dbc_attribute_values = {}
+        return self._dbc_attribute_values
+
+
+class MemoryDatabase(_database_object.DatabaseObject):
+    """Database held in memory instead of in the NI-XNET driver.
+
+    Use the functions in :any:`nixnet.database<nixnet.database>`, such as :any:`load_dbc`,
+    to read a database file without the driver.
+    The in-memory objects provide the same properties as their driver counterparts,
+    so code written against :any:`Database` works unchanged.
+    Changes are not written back to the file.
+
+    Args:
+        database_name(str): Name of the database.
+    """
+
+    _object_class = constants.ObjectClass.DATABASE
+
+    def __init__(self, database_name):
+        # type: (typing.Text) -> None
+        self._name = database_name
+        self._clusters = MemoryCollection(self, constants.ObjectClass.CLUSTER, MemoryCluster)
+        self.show_invalid_from_open = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        self.close()
+
+    def __repr__(self):
+        return '{}(name={})'.format(type(self).__name__, self._name)
+
+    def close(self, close_all_refs=False):
+        # type: (bool) -> None
+        """Closes the database.
+
+        In-memory databases hold no driver resources, so this exists for compatibility with :any:`Database`.
+        """
+        pass
+
+    def find(
+            self,
+            object_class,  # type: typing.Type[_database_object.DatabaseObject]
+            object_name,  # type: typing.Text
+    ):
+        # type: (...) -> _database_object.DatabaseObject
+        """Finds an object in the database.
+
+        The ``object_name`` of objects other than clusters must be qualified such
+        that it is unique within the database, such as ``myCluster.myFrameA.mySignal``.
+
+        Args:
+            object_class(``DatabaseObject``): The class of the object to find.
+                Both the driver classes, such as :any:`nixnet.database.Signal<_signal.Signal>`,
+                and the in-memory classes, such as :any:`MemorySignal`, are accepted.
+            object_name(str): The name of the object to find.
+        Returns:
+            An instance of the found object.
+        Raises:
+            ValueError: Unsupported value provided for argument ``object_class``.
+            :any:`XnetError`: The object is not found or the name is ambiguous.
+        """
+        return _find_descendant(self, object_class, object_name)
+
+    def validate(self, workers=1, precheck=True):
+        # type: (int, bool) -> typing.Any
+        """Checks the configuration of every object in the database and reports all problems.
+
+        See :any:`Database.validate`.
+        The checks of in-memory objects run in Python,
+        so more than one worker only helps when the objects come from a slow source.
+
+        Args:
+            workers(int): Number of threads that run the checks.
+            precheck(bool): Whether to run the Python pre-check.
+        Returns:
+            :any:`ValidationReport`: All problems found, with the path of each object.
+        """
+        from nixnet.database import _validate
+        return _validate.validate(self, workers, precheck)
+
+    @property
+    def name(self):
+        # type: () -> typing.Text
+        """str: Returns the database name."""
+        return self._name
+
+    @property
+    def clusters(self):
+        # type: () -> MemoryCollection
+        """:any:`MemoryCollection`: Returns a collection of :any:`MemoryCluster` objects in this database."""
+        return self._clusters
+
+    def _children(self):
+        return self._clusters.values()
+
+    def _path(self):
+        return []
+
+    def _changed(self):
+        pass
+
+
+class MemoryCluster(_MemoryObject):
+    """In-memory counterpart of :any:`Cluster`."""
+
+    _object_class = constants.ObjectClass.CLUSTER
+    _dbc_kind = u''
+
+    application_protocol = constants.AppProtocol.NONE
+    baud_rate = 0
+    can_fd_baud_rate = 0
+    can_fd_iso_mode = constants.CanFdIsoMode.ISO
+    can_io_mode = constants.CanIoMode.CAN
+    flex_ray_act_pt_off = 0
+    flex_ray_alw_pass_act = 0
+    flex_ray_cas_rx_l_max = 0
+    flex_ray_channels = 0
+    flex_ray_clst_drift_dmp = 0
+    flex_ray_cold_st_ats = 0
+    flex_ray_cycle = 0
+    flex_ray_dyn_slot_idl_ph = 0
+    flex_ray_lis_noise = 0
+    flex_ray_macro_per_cycle = 0
+    flex_ray_max_wo_clk_cor_fat = 0
+    flex_ray_max_wo_clk_cor_pas = 0
+    flex_ray_minislot = 0
+    flex_ray_minislot_act_pt = 0
+    flex_ray_nit = 0
+    flex_ray_nm_vec_len = 0
+    flex_ray_num_minislt = 0
+    flex_ray_num_stat_slt = 0
+    flex_ray_off_cor_st = 0
+    flex_ray_payld_len_dyn_max = 0
+    flex_ray_payld_len_st = 0
+    flex_ray_stat_slot = 0
+    flex_ray_sym_win = 0
+    flex_ray_sync_node_max = 0
+    flex_ray_tss_tx = 0
+    flex_ray_use_wakeup = False
+    flex_ray_wake_sym_rx_idl = 0
+    flex_ray_wake_sym_rx_low = 0
+    flex_ray_wake_sym_rx_win = 0
+    flex_ray_wake_sym_tx_idl = 0
+    flex_ray_wake_sym_tx_low = 0
+    lin_tick = 0.0
+    protocol = constants.Protocol.CAN
+    pdus_reqd = False
+
+    def __init__(self, database, name):
+        # type: (MemoryDatabase, typing.Text) -> None
+        super(MemoryCluster, self).__init__(database, name)
+        self._frames = MemoryCollection(self, constants.ObjectClass.FRAME, MemoryFrame)
+        self._pdus = MemoryCollection(self, constants.ObjectClass.PDU, MemoryPdu)
+        self._ecus = MemoryCollection(self, constants.ObjectClass.ECU, MemoryEcu)
+        self._lin_schedules = MemoryCollection(self, constants.ObjectClass.LIN_SCHED, MemoryLinSched)
+        self._dbc_attribute_definitions = {}  # type: typing.Dict[typing.Text, typing.Dict[typing.Text, typing.List]]
+        self._revision = 0
+        self._unique_names = (-1, {})  # type: typing.Tuple[int, typing.Dict[typing.Text, int]]
+
+    @property
+    def database(self):
+        # type: () -> MemoryDatabase
+        """:any:`MemoryDatabase`: Returns the database that contains this cluster."""
+        return self._parent
+
+    @property
+    def dbc_attributes(self):
+        # type: () -> MemoryDbcAttributeCollection
+        """:any:`MemoryDbcAttributeCollection`: Access the cluster's DBC attributes."""
+        return self._get_dbc_attributes()
+
+    @property
+    def ecus(self):
+        # type: () -> MemoryCollection
+        """:any:`MemoryCollection`: Returns a collection of :any:`MemoryEcu` objects in this cluster."""
+        return self._ecus
+
+    @property
+    def flex_ray_dyn_seg_start(self):
+        # type: () -> int
+        """int: Returns the start of the dynamic segment, in macroticks from the start of the cycle.
+
+        This is the number of static slots multiplied by the static slot length.
+        """
+        return self.flex_ray_num_stat_slt * self.flex_ray_stat_slot
+
+    @property
+    def flex_ray_macrotick(self):
+        # type: () -> float
+        """float: Returns the macrotick duration in microseconds.
+
+        This is the cycle duration divided by the number of macroticks per cycle.
+        """
+        if not self.flex_ray_macro_per_cycle:
+            return 0.0
+        return self.flex_ray_cycle / self.flex_ray_macro_per_cycle
+
+    @property
+    def flex_ray_nit_start(self):
+        # type: () -> int
+        """int: Returns the start of the network idle time, in macroticks from the start of the cycle."""
+        return self.flex_ray_macro_per_cycle - self.flex_ray_nit
+
+    @property
+    def flex_ray_payld_len_max(self):
+        # type: () -> int
+        """int: Returns the larger of the static and maximum dynamic payload lengths, in two-byte words."""
+        return max(self.flex_ray_payld_len_st, self.flex_ray_payld_len_dyn_max)
+
+    @property
+    def flex_ray_sym_win_start(self):
+        # type: () -> int
+        """int: Returns the start of the symbol window, in macroticks from the start of the cycle."""
+        return self.flex_ray_nit_start - self.flex_ray_sym_win
+
+    @property
+    def frames(self):
+        # type: () -> MemoryCollection
+        """:any:`MemoryCollection`: Returns a collection of :any:`MemoryFrame` objects in this cluster."""
+        return self._frames
+
+    @property
+    def lin_schedules(self):
+        # type: () -> MemoryCollection
+        """:any:`MemoryCollection`: Returns a collection of :any:`MemoryLinSched` objects in this cluster."""
+        return self._lin_schedules
+
+    @property
+    def pdus(self):
+        # type: () -> MemoryCollection
+        """:any:`MemoryCollection`: Returns a collection of :any:`MemoryPdu` objects in this cluster."""
+        return self._pdus
+
+    @property
+    def sigs(self):
+        # type: () -> typing.Iterable[MemorySignal]
+        """list of :any:`MemorySignal`: Returns a list of all signals in this cluster."""
+        for frame in self._frames.values():
+            for signal in frame._own_signals():
+                yield signal
+        for pdu in self._pdus.values():
+            for signal in pdu.signals:
+                yield signal
+
+    def _children(self):
+        for collection in (self._frames, self._pdus, self._ecus, self._lin_schedules):
+            for child in collection.values():
+                yield child
+
+    def _path(self):
+        return [self._name]
+
+    def _changed(self):
+        self._revision += 1
+
+    def _get_cluster(self):
+        return self
+
+    def _signal_name_counts(self):
+        # type: () -> typing.Dict[typing.Text, int]
+        revision, counts = self._unique_names
+        if revision != self._revision:
+            counts = collections.defaultdict(int)
+            for signal in self.sigs:
+                counts[signal.name] += 1
+            self._unique_names = (self._revision, counts)
+        return counts
+
+
+class _Multiplexed(_MemoryObject):
+    """Frames and PDUs, which contain static signals and subframes."""
+
+    __slots__ = ('_mux_static_signals', '_mux_subframes', 'default_payload', 'payload_len')
+    _slot_defaults = {'payload_len': 0}
+
+    def __init__(self, parent, name):
+        # type: (typing.Any, typing.Text) -> None
+        super(_Multiplexed, self).__init__(parent, name)
+        # The frames of a cluster with PDUs have no signals of their own, and few frames or PDUs have subframes,
+        # so the collections are created when first used.
+        self._mux_static_signals = None  # type: typing.Optional[MemoryCollection]
+        self._mux_subframes = None  # type: typing.Optional[MemoryCollection]
+        self.default_payload = []  # type: typing.List[int]
+
+    @property
+    def mux_is_muxed(self):
+        # type: () -> bool
+        """bool: Returns whether this object contains a data multiplexer signal."""
+        return any(signal.mux_is_data_mux for signal in self._get_static_signals().values())
+
+    @property
+    def mux_data_mux_sig(self):
+        # type: () -> MemorySignal
+        """:any:`MemorySignal`: Returns the data multiplexer signal.
+
+        Raises:
+            :any:`XnetError`: The data multiplexer signal is not defined.
+        """
+        for signal in self._get_static_signals().values():
+            if signal.mux_is_data_mux:
+                return signal
+        raise errors.XnetError(
+            'The data multiplexer signal is not defined in "{}".'.format(self._name),
+            _cconsts.NX_ERR_SIGNAL_NOT_FOUND)
+
+    @property
+    def mux_subframes(self):
+        # type: () -> MemoryCollection
+        """:any:`MemoryCollection`: Collection of :any:`MemorySubFrame` objects."""
+        return self._get_subframes()
+
+    def _own_signals(self):
+        # type: () -> typing.Iterator[MemorySignal]
+        for signal in self._get_static_signals().values():
+            yield signal
+        for subframe in self._get_subframes().values():
+            for signal in subframe.dyn_signals.values():
+                yield signal
+
+    def _children(self):
+        for collection in (self._get_static_signals(), self._get_subframes()):
+            for child in collection.values():
+                yield child
+
+    def _get_static_signals(self):
+        # type: () -> MemoryCollection
+        if self._mux_static_signals is None:
+            self._mux_static_signals = MemoryCollection(self, constants.ObjectClass.SIGNAL, MemorySignal)
+        return self._mux_static_signals
+
+    def _get_subframes(self):
+        # type: () -> MemoryCollection
+        if self._mux_subframes is None:
+            self._mux_subframes = MemoryCollection(self, constants.ObjectClass.SUBFRAME, MemorySubFrame)
+        return self._mux_subframes
+
+    def _check_signals(self):
+        # type: () -> None
+        for signal in self._own_signals():
+            signal.check_config_status()
+
+
+class MemoryFrame(_Multiplexed):
+    """In-memory counterpart of :any:`Frame<_frame.Frame>`."""
+
+    _object_class = constants.ObjectClass.FRAME
+    _dbc_kind = u'BO_'
+
+    __slots__ = (
+        'id', 'pdu_properties', 'flex_ray_base_cycle', 'flex_ray_ch_assign', 'flex_ray_cycle_rep',
+        '_flex_ray_in_cyc_rep_i_ds', '_flex_ray_in_cyc_rep_ch_assigns')
+    _slot_defaults = dict(
+        _Multiplexed._slot_defaults,
+        id=0,
+        flex_ray_base_cycle=0,
+        flex_ray_ch_assign=constants.FrmFlexRayChAssign.A,
+        flex_ray_cycle_rep=1)
+
+    application_protocol = constants.AppProtocol.NONE
+    can_ext_id = False
+    can_io_mode = constants.CanIoMode.CAN
+    can_timing_type = constants.FrmCanTiming.EVENT_DATA
+    can_tx_time = 0.0
+    flex_ray_preamble = False
+    flex_ray_startup = False
+    flex_ray_sync = False
+    flex_ray_timing_type = constants.FrmFlexRayTiming.CYCLIC
+    variable_payload = False
+
+    def __init__(self, cluster, name):
+        # type: (MemoryCluster, typing.Text) -> None
+        super(MemoryFrame, self).__init__(cluster, name)
+        self.pdu_properties = []  # type: typing.List
+        # Few frames are repeated in a cycle, so the lists are created when first used.
+        self._flex_ray_in_cyc_rep_i_ds = None  # type: typing.Optional[typing.List[int]]
+        self._flex_ray_in_cyc_rep_ch_assigns = None  # type: typing.Optional[typing.List[constants.FrmFlexRayChAssign]]
+
+    def check_config_status(self):
+        # type: () -> None
+        """Check this frame's configuration status.
+
+        Raises:
+            :any:`XnetError`: The frame or one of its signals is incorrectly configured.
+        """
+        protocol = self._get_cluster().protocol
+        max_payload_len = None
+        if protocol == constants.Protocol.CAN:
+            max_payload_len = _MAX_PAYLOAD_LEN[self.can_io_mode]
+        elif protocol == constants.Protocol.LIN:
+            max_payload_len = _MAX_LIN_PAYLOAD_LEN
+        if max_payload_len is not None:
+            if not 0 <= self.payload_len <= max_payload_len:
+                raise errors.XnetError(
+                    'Frame "{}" has {} bytes, more than the {} allowed.'.format(
+                        self._name, self.payload_len, max_payload_len),
+                    _cconsts.NX_ERR_DB_CONFIG_FRAME_NUM_BYTES)
+        self._check_signals()
+
+    @property
+    def cluster(self):
+        # type: () -> MemoryCluster
+        """:any:`MemoryCluster`: Get the parent cluster in which the frame has been created."""
+        return self._parent
+
+    @property
+    def dbc_attributes(self):
+        # type: () -> MemoryDbcAttributeCollection
+        """:any:`MemoryDbcAttributeCollection`: Access the frame's DBC attributes."""
+        return self._get_dbc_attributes()
+
+    @property
+    def flex_ray_in_cyc_rep_enabled(self):
+        # type: () -> bool
+        """bool: Returns whether the frame is repeated in the same cycle at the ``flex_ray_in_cyc_rep_i_ds`` slots."""
+        return bool(self._flex_ray_in_cyc_rep_i_ds)
+
+    @property
+    def flex_ray_in_cyc_rep_i_ds(self):
+        # type: () -> typing.List[int]
+        """list of int: Get or set the slots in which the frame is repeated in the same cycle."""
+        if self._flex_ray_in_cyc_rep_i_ds is None:
+            self._flex_ray_in_cyc_rep_i_ds = []
+        return self._flex_ray_in_cyc_rep_i_ds
+
+    @flex_ray_in_cyc_rep_i_ds.setter
+    def flex_ray_in_cyc_rep_i_ds(self, value):
+        # type: (typing.List[int]) -> None
+        self._flex_ray_in_cyc_rep_i_ds = value
+
+    @property
+    def flex_ray_in_cyc_rep_ch_assigns(self):
+        # type: () -> typing.List[constants.FrmFlexRayChAssign]
+        """list of :any:`FrmFlexRayChAssign`: Get or set the channels of the ``flex_ray_in_cyc_rep_i_ds`` slots."""
+        if self._flex_ray_in_cyc_rep_ch_assigns is None:
+            self._flex_ray_in_cyc_rep_ch_assigns = []
+        return self._flex_ray_in_cyc_rep_ch_assigns
+
+    @flex_ray_in_cyc_rep_ch_assigns.setter
+    def flex_ray_in_cyc_rep_ch_assigns(self, value):
+        # type: (typing.List[constants.FrmFlexRayChAssign]) -> None
+        self._flex_ray_in_cyc_rep_ch_assigns = value
+
+    @property
+    def mux_static_signals(self):
+        # type: () -> MemoryCollection
+        """:any:`MemoryCollection`: Collection of static :any:`MemorySignal` objects in this frame."""
+        return self._get_static_signals()
+
+    @property
+    def sigs(self):
+        # type: () -> typing.Iterable[MemorySignal]
+        """list of :any:`MemorySignal`: Get a list of all signals in the frame.
+
+        This includes the signals of the PDUs mapped to the frame.
+        """
+        for signal in self._own_signals():
+            yield signal
+        for pdu_properties in self.pdu_properties:
+            for signal in pdu_properties.pdu.signals:
+                yield signal
+
+    @property
+    def lin_checksum(self):
+        # type: () -> constants.FrmLinChecksum
+        """:any:`FrmLinChecksum`: Returns whether the LIN frame transmitted checksum is classic or enhanced.
+
+        The lower :any:`MemoryEcu` ``lin_protocol_ver`` of the ECUs transmitting and receiving the frame is significant.
+        If it is 2.0 or higher, the checksum type is enhanced; otherwise, the checksum type is classic.
+        Diagnostic frames (with decimal identifier 60 or 61) always use classic checksum.
+        """
+        if self.id in _LIN_DIAGNOSTIC_IDS:
+            return constants.FrmLinChecksum.CLASSIC
+        versions = [
+            ecu.lin_protocol_ver.value
+            for ecu in self._parent.ecus.values()
+            if self in ecu.tx_frms or self in ecu.rx_frms]
+        if versions and min(versions) < constants.LinProtocolVer.VER_2_0.value:
+            return constants.FrmLinChecksum.CLASSIC
+        return constants.FrmLinChecksum.ENHANCED
+
+
+class MemoryPdu(_Multiplexed):
+    """In-memory counterpart of :any:`Pdu`."""
+
+    _object_class = constants.ObjectClass.PDU
+
+    @property
+    def cluster(self):
+        # type: () -> MemoryCluster
+        """:any:`MemoryCluster`: Get the parent cluster in which the PDU has been created."""
+        return self._parent
+
+    def check_config_status(self):
+        # type: () -> None
+        """Check this PDU's configuration status.
+
+        Raises:
+            :any:`XnetError`: One of the PDU's signals is incorrectly configured.
+        """
+        self._check_signals()
+
+    @property
+    def frms(self):
+        # type: () -> typing.List[MemoryFrame]
+        """list of :any:`MemoryFrame`: Returns the frames to which this PDU is mapped."""
+        return [
+            frame
+            for frame in self._parent.frames.values()
+            if any(properties.pdu is self for properties in frame.pdu_properties)]
+
+    @property
+    def mux_static_sigs(self):
+        # type: () -> MemoryCollection
+        """:any:`MemoryCollection`: Collection of static :any:`MemorySignal` objects in this PDU."""
+        return self._get_static_signals()
+
+    @property
+    def signals(self):
+        # type: () -> typing.List[MemorySignal]
+        """list of :any:`MemorySignal`: Returns all signals in this PDU."""
+        return list(self._own_signals())
+
+
+class MemorySubFrame(_MemoryObject):
+    """In-memory counterpart of :any:`SubFrame`."""
+
+    _object_class = constants.ObjectClass.SUBFRAME
+
+    __slots__ = ('_dyn_signals',)
+
+    mux_value = 0
+
+    def __init__(self, parent, name):
+        # type: (_Multiplexed, typing.Text) -> None
+        super(MemorySubFrame, self).__init__(parent, name)
+        self._dyn_signals = MemoryCollection(self, constants.ObjectClass.SIGNAL, MemorySignal)
+
+    @property
+    def dyn_signals(self):
+        # type: () -> MemoryCollection
+        """:any:`MemoryCollection`: Returns a collection of dynamic :any:`MemorySignal` objects in the subframe."""
+        return self._dyn_signals
+
+    @property
+    def frm(self):
+        # type: () -> typing.Optional[MemoryFrame]
+        """:any:`MemoryFrame`: Returns the frame that contains the subframe.
+
+        For a subframe in a PDU, this is the first frame to which the PDU is mapped, or ``None``.
+        """
+        return _containing_frame(self._parent)
+
+    @property
+    def pdu(self):
+        # type: () -> typing.Optional[MemoryPdu]
+        """:any:`MemoryPdu`: Returns the PDU that contains the subframe, or ``None`` when the parent is a frame."""
+        return self._parent if isinstance(self._parent, MemoryPdu) else None
+
+    @property
+    def name_unique_to_cluster(self):
+        # type: () -> typing.Text
+        """str: Returns a subframe name unique to the cluster that contains the subframe.
+
+        The name is ``<Frame>.<SubFrame>``, because subframe names only need to be unique within their frame.
+        """
+        return u'{}.{}'.format(self._parent.name, self._name)
+
+    def _children(self):
+        return self._dyn_signals.values()
+
+    def _path(self):
+        # Dynamic signals are qualified by the frame, not the subframe.
+        return self._parent._path()
+
+
+class MemorySignal(_MemoryObject):
+    """In-memory counterpart of :any:`Signal<_signal.Signal>`."""
+
+    _object_class = constants.ObjectClass.SIGNAL
+    _dbc_kind = u'SG_'
+
+    __slots__ = ('data_type', 'max', 'min', 'num_bits', 'scale_fac', 'scale_off', 'start_bit')
+    _slot_defaults = {
+        'data_type': constants.SigDataType.SIGNED,
+        'max': 0.0,
+        'min': 0.0,
+        'num_bits': 0,
+        'scale_fac': 1.0,
+        'scale_off': 0.0,
+        'start_bit': 0,
+    }
+
+    _value_table = None  # type: typing.Optional[typing.Dict[typing.Text, int]]
+    _dbc_signal_value_table = None  # type: typing.Optional[MemoryDbcSignalValueTable]
+    byte_ordr = constants.SigByteOrdr.LITTLE_ENDIAN
+    default = 0.0
+    mux_is_data_mux = False
+    unit = u''
+
+    def check_config_status(self):
+        # type: () -> None
+        """Check this signal's configuration status.
+
+        Raises:
+            :any:`XnetError`: The signal is incorrectly configured.
+        """
+        if self.data_type == constants.SigDataType.IEEE_FLOAT:
+            if self.num_bits not in (32, 64):
+                raise errors.XnetError(
+                    'Float signal "{}" must have 32 or 64 bits.'.format(self._name),
+                    _cconsts.NX_ERR_INVALID_PROPERTY_VALUE)
+        elif not 0 < self.num_bits <= 52:
+            raise errors.XnetError(
+                'Integer signal "{}" must have 1 to 52 bits.'.format(self._name),
+                _cconsts.NX_ERR_DB_CONFIG_SIG52_BIT_INTEGER)
+
+        payload_bits = self._container_object().payload_len * 8
+        if any(not 0 <= bit < payload_bits for bit in signal_bit_positions(self)):
+            raise errors.XnetError(
+                'Signal "{}" does not fit in the payload.'.format(self._name),
+                _cconsts.NX_ERR_DB_CONFIG_SIG_OUT_OF_FRAME)
+
+    @property
+    def dbc_attributes(self):
+        # type: () -> MemoryDbcAttributeCollection
+        """:any:`MemoryDbcAttributeCollection`: Access the signal's DBC attributes."""
+        return self._get_dbc_attributes()
+
+    @property
+    def dbc_signal_value_table(self):
+        # type: () -> MemoryDbcSignalValueTable
+        """:any:`MemoryDbcSignalValueTable`: Access the signal's DBC value table."""
+        if self._dbc_signal_value_table is None:
+            self._dbc_signal_value_table = MemoryDbcSignalValueTable(self._get_value_table())
+        return self._dbc_signal_value_table
+
+    def _get_value_table(self):
+        # type: () -> typing.Dict[typing.Text, int]
+        if self._value_table is None:
+            self._value_table = {}
+        return self._value_table
+
+    @property
+    def frame(self):
+        # type: () -> typing.Optional[MemoryFrame]
+        """:any:`MemoryFrame`: Returns the signal parent frame object.
+
+        For a signal in a PDU, this is the first frame to which the PDU is mapped, or ``None``.
+        """
+        return _containing_frame(self._container_object())
+
+    @property
+    def pdu(self):
+        # type: () -> typing.Optional[MemoryPdu]
+        """:any:`MemoryPdu`: Returns the PDU that contains the signal, or ``None`` when the parent is a frame."""
+        container = self._container_object()
+        return container if isinstance(container, MemoryPdu) else None
+
+    @property
+    def name_unique_to_cluster(self):
+        # type: () -> typing.Text
+        """str: Returns a signal name unique to the cluster that contains the signal.
+
+        If the signal name is not unique within the cluster,
+        the name is ``<frame-name>.<signal-name>``.
+        """
+        if self._get_cluster()._signal_name_counts().get(self._name, 0) > 1:
+            return u'{}.{}'.format(self._container_object().name, self._name)
+        return self._name
+
+    @property
+    def mux_is_dynamic(self):
+        # type: () -> bool
+        """bool: Returns whether this signal is a dynamic signal in a subframe."""
+        return isinstance(self._parent, MemorySubFrame)
+
+    @property
+    def mux_value(self):
+        # type: () -> int
+        """int: Returns the multiplexer value of the subframe for a dynamic signal, or 0 for a static signal."""
+        return self._parent.mux_value if self.mux_is_dynamic else 0
+
+    @property
+    def mux_subfrm(self):
+        # type: () -> typing.Optional[MemorySubFrame]
+        """:any:`MemorySubFrame`: Returns the subframe of a dynamic signal, or ``None`` for a static signal."""
+        return self._parent if self.mux_is_dynamic else None
+
+    def _container_object(self):
+        # type: () -> _Multiplexed
+        return self._parent._parent if self.mux_is_dynamic else self._parent
+
+
+class MemoryEcu(_MemoryObject):
+    """In-memory counterpart of :any:`Ecu`."""
+
+    _object_class = constants.ObjectClass.ECU
+    _dbc_kind = u'BU_'
+
+    flex_ray_connected_chs = 0
+    flex_ray_wakeup_chs = 0
+    flex_ray_wakeup_ptrn = 0
+    j1939_node_name = 0
+    j1939_preferred_address = 254
+    lin_config_nad = 0
+    lin_function_id = 0
+    lin_initial_nad = 0
+    lin_master = False
+    lin_p2_min = 0.0
+    lin_protocol_ver = constants.LinProtocolVer.VER_2_2
+    lin_st_min = 0.0
+    lin_supplier_id = 0
+
+    def __init__(self, cluster, name):
+        # type: (MemoryCluster, typing.Text) -> None
+        super(MemoryEcu, self).__init__(cluster, name)
+        self.rx_frms = []  # type: typing.List[MemoryFrame]
+        self.tx_frms = []  # type: typing.List[MemoryFrame]
+
+    @property
+    def clst(self):
+        # type: () -> MemoryCluster
+        """:any:`MemoryCluster`: Returns the parent cluster to which the ECU is connected."""
+        return self._parent
+
+    @property
+    def dbc_attributes(self):
+        # type: () -> MemoryDbcAttributeCollection
+        """:any:`MemoryDbcAttributeCollection`: Access the ECU's DBC attributes."""
+        return self._get_dbc_attributes()
+
+    @property
+    def flex_ray_is_coldstart(self):
+        # type: () -> bool
+        """bool: Returns whether the ECU transmits a FlexRay startup frame and may start the cluster."""
+        return self.flex_ray_startup_frame_ref is not None
+
+    @property
+    def flex_ray_startup_frame_ref(self):
+        # type: () -> typing.Optional[MemoryFrame]
+        """:any:`MemoryFrame`: Returns the FlexRay startup frame that the ECU transmits, or ``None``."""
+        for frame in self.tx_frms:
+            if frame.flex_ray_startup:
+                return frame
+        return None
+
+
+class MemoryLinSched(_MemoryObject):
+    """In-memory counterpart of :any:`LinSched`."""
+
+    _object_class = constants.ObjectClass.LIN_SCHED
+
+    priority = 0
+    run_mode = constants.LinSchedRunMode.CONTINUOUS
+
+    def __init__(self, cluster, name):
+        # type: (MemoryCluster, typing.Text) -> None
+        super(MemoryLinSched, self).__init__(cluster, name)
+        self._entries = MemoryCollection(self, constants.ObjectClass.LIN_SCHED_ENTRY, MemoryLinSchedEntry)
+
+    @property
+    def clst(self):
+        # type: () -> MemoryCluster
+        """:any:`MemoryCluster`: Returns the cluster that contains the LIN schedule."""
+        return self._parent
+
+    @property
+    def entries(self):
+        # type: () -> MemoryCollection
+        """:any:`MemoryCollection`: Collection of :any:`MemoryLinSchedEntry` for this LIN schedule.
+
+        The position of each entry in this collection specifies the position in the schedule.
+        """
+        return self._entries
+
+    def _children(self):
+        return self._entries.values()
+
+
+class MemoryLinSchedEntry(_MemoryObject):
+    """In-memory counterpart of :any:`LinSchedEntry`."""
+
+    _object_class = constants.ObjectClass.LIN_SCHED_ENTRY
+
+    collision_res_sched = None  # type: typing.Optional[MemoryLinSched]
+    delay = 0.0
+    event_id = 0
+    type = constants.LinSchedEntryType.UNCONDITIONAL
+
+    def __init__(self, sched, name):
+        # type: (MemoryLinSched, typing.Text) -> None
+        super(MemoryLinSchedEntry, self).__init__(sched, name)
+        self.frames = []  # type: typing.List[MemoryFrame]
+        self.nc_ff_data_bytes = []  # type: typing.List[int]
+
+    @property
+    def sched(self):
+        # type: () -> MemoryLinSched
+        """:any:`MemoryLinSched`: Returns the LIN schedule that uses this entry."""
+        return self._parent
+
+    @property
+    def name_unique_to_cluster(self):
+        # type: () -> typing.Text
+        """str: Returns a LIN schedule entry name unique to the cluster that contains the object.
+
+        If the single name is not unique within the cluster,
+        the name is ``<schedule-name>.<schedule-entry-name>``.
+        """
+        cluster = self._get_cluster()
+        schedules = [
+            sched
+            for sched in cluster.lin_schedules.values()
+            if self._name in sched.entries]
+        if len(schedules) > 1:
+            return u'{}.{}'.format(self._parent.name, self._name)
+        return self._name
+
+
+def signal_bit_positions(signal):
+    # type: (typing.Any) -> typing.List[int]
+    """Return the payload bit positions of a signal, least significant bit first.
+
+    Bit positions count ``byte * 8 + bit``, as for :any:`Signal.start_bit`.
+
+    >>> class Sig(object):
+    ...     start_bit = 12
+    ...     num_bits = 6
+    ...     byte_ordr = constants.SigByteOrdr.LITTLE_ENDIAN
+    >>> signal_bit_positions(Sig())
+    [12, 13, 14, 15, 16, 17]
+    >>> Sig.byte_ordr = constants.SigByteOrdr.BIG_ENDIAN
+    >>> signal_bit_positions(Sig())
+    [12, 13, 14, 15, 0, 1]
+    """
+    start_bit = signal.start_bit
+    num_bits = signal.num_bits
+    if signal.byte_ordr == constants.SigByteOrdr.LITTLE_ENDIAN:
+        return list(range(start_bit, start_bit + num_bits))
+
+    positions = []
+    position = start_bit
+    for _ in range(num_bits):
+        positions.append(position)
+        # More significant big-endian bits continue in the preceding byte.
+        position = position + 1 if position % 8 != 7 else position - 15
+    return positions
+
+
+def _find_descendant(parent, object_class, object_name):
+    # type: (typing.Any, typing.Any, typing.Text) -> typing.Any
+    class_enum = _find_object.get_object_class(object_class)
+    path = object_name.split('.')
+    found = [
+        obj
+        for obj in _descendants(parent)
+        if obj._object_class == class_enum and obj._path()[-len(path):] == path
+    ]
+    if len(found) != 1:
+        raise errors.XnetError(
+            'Database object "{}" {}.'.format(object_name, 'is ambiguous' if found else 'not found'),
+            _cconsts.NX_ERR_DATABASE_OBJECT_NOT_FOUND)
+    return found[0]
+
+
+def _descendants(parent):
+    # type: (typing.Any) -> typing.Iterator[typing.Any]
+    for child in parent._children():
+        yield child
+        for descendant in _descendants(child):
+            yield descendant
+
+
+def _containing_frame(container):
+    # type: (typing.Any) -> typing.Optional[MemoryFrame]
+    if isinstance(container, MemoryFrame):
+        return container
+    frames = container.frms
+    return frames[0] if frames else None
@@ -0,0 +1,408 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import enum
+import typing  # NOQA: F401
+
+import six
+
+from nixnet import _cconsts
+from nixnet import constants
+from nixnet import errors
+from nixnet import types
+
+from nixnet.database import _diff
+from nixnet.database import _load
+from nixnet.database import _memory
+
+
+class MergePolicy(enum.Enum):
+    """How :any:`merge_databases` resolves two different objects with the same key.
+
+    Values:
+        PREFER_LEFT:
+            Keep the object merged first and drop the later one.
+        PREFER_RIGHT:
+            Replace the object merged first with the later one.
+        RENAME:
+            Keep both, adding ``_2``, ``_3`` and so on to the name of the later one.
+            Frames with the same identifier cannot both be kept, so for them this is the same as ``FAIL``.
+        FAIL:
+            Raise :any:`XnetError`.
+    """
+
+    PREFER_LEFT = 'prefer_left'
+    PREFER_RIGHT = 'prefer_right'
+    RENAME = 'rename'
+    FAIL = 'fail'
+
+
+_CONFLICT_ERRORS = {
+    constants.ObjectClass.CLUSTER: _cconsts.NX_ERR_DUPLICATE_CLUSTER_NAME,
+    constants.ObjectClass.FRAME: _cconsts.NX_ERR_DUPLICATE_FRAME_OBJECT,
+    constants.ObjectClass.PDU: _cconsts.NX_ERR_DUPLICATE_PDU_OBJECT,
+    constants.ObjectClass.ECU: _cconsts.NX_ERR_DUPLICATE_ECU_NAME,
+    constants.ObjectClass.LIN_SCHED: _cconsts.NX_ERR_DUPLICATE_SCHEDULE_NAME,
+}
+
+# Attributes of the in-memory objects that hold references, which are mapped to the merged objects separately.
+_REFERENCE_ATTRIBUTES = ('collision_res_sched', 'frames', 'pdu_properties', 'rx_frms', 'tx_frms')
+
+# Attributes of the in-memory objects that belong to one object, and are not copied.
+_OWN_ATTRIBUTES = ('_parent', '_name', '_container', '_dbc_attributes', '_dbc_signal_value_table')
+
+
+def merge_databases(
+        sources,  # type: typing.Iterable[typing.Any]
+        database_name=u'merged',  # type: typing.Text
+        cluster_name=u'Cluster',  # type: typing.Text
+        policy=MergePolicy.FAIL,  # type: MergePolicy
+        policies=None,  # type: typing.Optional[typing.Dict[constants.ObjectClass, MergePolicy]]
+):
+    # type: (...) -> _memory.MemoryDatabase
+    """Merge the clusters of several in-memory databases into one cluster.
+
+    This combines, for example, the DBC files of each ECU into one vehicle database.
+    The sources are merged from left to right.
+    Each frame, PDU, ECU, and LIN schedule is matched to the objects merged before it:
+
+    *   CAN and LIN frames by identifier, and FlexRay frames by name.
+    *   PDUs, ECUs, and LIN schedules by name.
+
+    An object that matches an equal object, including its signals, subframes, and DBC attributes, is merged silently.
+    Objects that match but differ are conflicts, resolved by the :any:`MergePolicy` of their object class.
+    A frame whose name is taken by a frame with another identifier is a conflict too.
+    The cluster properties, such as the baud rate, conflict as :any:`ObjectClass.CLUSTER` when they differ.
+
+    The frames that an ECU transmits and receives are combined from all sources,
+    so a frame sent by one ECU's file and received in another's ends up connected to both.
+
+    >>> left = _memory.MemoryDatabase('left')
+    >>> frame = left.clusters.add('Cluster').frames.add('Doors')
+    >>> frame.id = 0x120
+    >>> right = _memory.MemoryDatabase('right')
+    >>> frame = right.clusters.add('Cluster').frames.add('DoorStatus')
+    >>> frame.id = 0x120
+    >>> merged = merge_databases([left, right], policy=MergePolicy.PREFER_LEFT)
+    >>> list(merged.clusters['Cluster'].frames)
+    ['Doors']
+
+    Args:
+        sources: :any:`MemoryDatabase` or :any:`MemoryCluster` objects,
+            or file paths that :any:`nixnet.database.load` reads.
+        database_name(str): Name of the merged database.
+        cluster_name(str): Name of the merged cluster.
+        policy(:any:`MergePolicy`): Policy for the object classes not in ``policies``.
+        policies(dict): Maps :any:`ObjectClass` values to the :any:`MergePolicy` for that class.
+    Returns:
+        :any:`MemoryDatabase`: A new database with one cluster. The sources are not changed.
+    Raises:
+        :any:`XnetError`: A conflict with policy :any:`MergePolicy.FAIL`.
+    """
+    database = _memory.MemoryDatabase(database_name)
+    merger = _Merger(database.clusters._insert(_memory.MemoryCluster(database, cluster_name)), policy, policies or {})
+    for source in sources:
+        for cluster in _source_clusters(source):
+            merger.merge(cluster)
+    merger.finish()
+    return database
+
+
+def _source_clusters(source):
+    # type: (typing.Any) -> typing.List[_memory.MemoryCluster]
+    if isinstance(source, six.string_types):
+        source = _load.load(source)
+    if isinstance(source, _memory.MemoryCluster):
+        return [source]
+    if isinstance(source, _memory.MemoryDatabase):
+        return list(source.clusters.values())
+    raise TypeError('Unsupported merge source: {!r}'.format(source))
+
+
+class _IdentityMap(object):
+    """Maps objects by identity, keeping them alive so that their id() is not reused while mapped."""
+
+    def __init__(self):
+        # type: () -> None
+        self._items = {}  # type: typing.Dict[int, typing.Tuple[typing.Any, typing.Any]]
+
+    def __len__(self):
+        # type: () -> int
+        return len(self._items)
+
+    def __contains__(self, key):
+        # type: (typing.Any) -> bool
+        return id(key) in self._items
+
+    def __getitem__(self, key):
+        # type: (typing.Any) -> typing.Any
+        return self._items[id(key)][1]
+
+    def __setitem__(self, key, value):
+        # type: (typing.Any, typing.Any) -> None
+        self._items[id(key)] = (key, value)
+
+    def get(self, key, default=None):
+        # type: (typing.Any, typing.Any) -> typing.Any
+        item = self._items.get(id(key))
+        return default if item is None else item[1]
+
+    def clear(self):
+        # type: () -> None
+        self._items.clear()
+
+
+class _Merger(object):
+    """Merges clusters one by one into a target cluster."""
+
+    def __init__(self, target, policy, policies):
+        # type: (_memory.MemoryCluster, MergePolicy, typing.Dict[constants.ObjectClass, MergePolicy]) -> None
+        self._target = target
+        self._policy = policy
+        self._policies = policies
+        self._merged_clusters = 0
+        self._frames_by_key = {}  # type: typing.Dict[typing.Any, _memory.MemoryFrame]
+        # Objects replaced under PREFER_RIGHT, so references made before can be moved to the replacement.
+        self._replaced = _IdentityMap()
+        # Maps the objects copied from the current cluster to their source.
+        self._origins = _IdentityMap()
+
+    def merge(self, cluster):
+        # type: (_memory.MemoryCluster) -> None
+        self._merge_cluster_properties(cluster)
+        # Maps the source objects to the merged objects, or None for dropped objects.
+        mapping = _IdentityMap()
+        for pdu in cluster.pdus.values():
+            mapping[pdu] = self._merge_named(constants.ObjectClass.PDU, self._target.pdus, pdu)
+        for frame in cluster.frames.values():
+            mapping[frame] = self._merge_frame(cluster.protocol, frame)
+        for ecu in cluster.ecus.values():
+            mapping[ecu] = self._merge_named(constants.ObjectClass.ECU, self._target.ecus, ecu)
+        for sched in cluster.lin_schedules.values():
+            mapping[sched] = self._merge_named(constants.ObjectClass.LIN_SCHED, self._target.lin_schedules, sched)
+
+        for frame in cluster.frames.values():
+            merged = mapping[frame]
+            if merged is not None and self._origins.get(merged) is frame:
+                merged.pdu_properties = [
+                    types.PduProperties(mapping[properties.pdu], properties.start_bit, properties.update_bit)
+                    for properties in frame.pdu_properties
+                    if mapping[properties.pdu] is not None]
+        for ecu in cluster.ecus.values():
+            merged = mapping[ecu]
+            if merged is not None:
+                # Frames are combined from all sources, whichever ECU definition is kept.
+                merged.tx_frms = _union(merged.tx_frms, _mapped(mapping, ecu.tx_frms))
+                merged.rx_frms = _union(merged.rx_frms, _mapped(mapping, ecu.rx_frms))
+        for sched in cluster.lin_schedules.values():
+            merged = mapping[sched]
+            if merged is None or self._origins.get(merged) is not sched:
+                continue
+            for entry in sched.entries.values():
+                merged_entry = merged.entries[entry.name]
+                merged_entry.frames = _mapped(mapping, entry.frames)
+                if entry.collision_res_sched is not None:
+                    merged_entry.collision_res_sched = mapping.get(entry.collision_res_sched)
+
+        for name, definitions in cluster._dbc_attribute_definitions.items():
+            target_definitions = self._target._dbc_attribute_definitions.setdefault(name, type(definitions)())
+            for key, value in definitions.items():
+                target_definitions.setdefault(key, value)
+        self._origins.clear()
+        self._merged_clusters += 1
+
+    def finish(self):
+        # type: () -> None
+        """Move references to replaced objects over to their replacements."""
+        if not self._replaced:
+            return
+        for frame in self._target.frames.values():
+            frame.pdu_properties = [
+                properties._replace(pdu=self._replacement(properties.pdu))
+                for properties in frame.pdu_properties]
+        for ecu in self._target.ecus.values():
+            ecu.tx_frms = _union([], [self._replacement(frame) for frame in ecu.tx_frms])
+            ecu.rx_frms = _union([], [self._replacement(frame) for frame in ecu.rx_frms])
+        for sched in self._target.lin_schedules.values():
+            for entry in sched.entries.values():
+                entry.frames = [self._replacement(frame) for frame in entry.frames]
+                if entry.collision_res_sched is not None:
+                    entry.collision_res_sched = self._replacement(entry.collision_res_sched)
+
+    def _replacement(self, obj):
+        # type: (typing.Any) -> typing.Any
+        while obj in self._replaced:
+            obj = self._replaced[obj]
+        return obj
+
+    def _policy_for(self, object_class):
+        # type: (constants.ObjectClass) -> MergePolicy
+        return self._policies.get(object_class, self._policy)
+
+    def _merge_cluster_properties(self, cluster):
+        # type: (_memory.MemoryCluster) -> None
+        properties = _plain_attributes(cluster)
+        if self._merged_clusters:
+            current = _plain_attributes(self._target)
+            if properties == current:
+                return
+            policy = self._policy_for(constants.ObjectClass.CLUSTER)
+            if policy in (MergePolicy.FAIL, MergePolicy.RENAME):
+                _conflict(constants.ObjectClass.CLUSTER, cluster.name, 'cluster properties differ')
+            if policy == MergePolicy.PREFER_LEFT:
+                return
+            for key in current:
+                delattr(self._target, key)
+        for key, value in properties.items():
+            setattr(self._target, key, value)
+
+    def _merge_named(self, object_class, collection, obj):
+        # type: (constants.ObjectClass, _memory.MemoryCollection, typing.Any) -> typing.Any
+        existing = collection.get(obj.name)
+        if existing is None:
+            return self._insert(collection, obj, obj.name)
+        if _definition(existing) == _definition(obj):
+            return existing
+        return self._resolve(object_class, collection, existing, obj)
+
+    def _merge_frame(self, protocol, frame):
+        # type: (constants.Protocol, _memory.MemoryFrame) -> typing.Optional[_memory.MemoryFrame]
+        collection = self._target.frames
+        if protocol == constants.Protocol.FLEX_RAY:
+            return self._merge_named(constants.ObjectClass.FRAME, collection, frame)
+
+        key = (protocol, frame.id, frame.can_ext_id)
+        existing = self._frames_by_key.get(key)
+        if existing is None:
+            named = collection.get(frame.name)
+            if named is None:
+                merged = self._insert(collection, frame, frame.name)
+            else:
+                # Another identifier under the same name.
+                merged = self._resolve(constants.ObjectClass.FRAME, collection, named, frame)
+                if merged is named:
+                    # The frame is dropped, rather than merged into a frame with another identifier.
+                    return None
+                self._forget(named)
+        elif _definition(existing) == _definition(frame):
+            return existing
+        else:
+            policy = self._policy_for(constants.ObjectClass.FRAME)
+            if policy == MergePolicy.RENAME:
+                policy = MergePolicy.FAIL
+            merged = self._resolve(constants.ObjectClass.FRAME, collection, existing, frame, policy)
+        if self._origins.get(merged) is frame:
+            self._frames_by_key[key] = merged
+        return merged
+
+    def _forget(self, frame):
+        # type: (_memory.MemoryFrame) -> None
+        for key, value in list(self._frames_by_key.items()):
+            if value is frame:
+                del self._frames_by_key[key]
+
+    def _resolve(self, object_class, collection, existing, obj, policy=None):
+        # type: (constants.ObjectClass, typing.Any, typing.Any, typing.Any, typing.Optional[MergePolicy]) -> typing.Any
+        policy = policy or self._policy_for(object_class)
+        if policy == MergePolicy.PREFER_LEFT:
+            return existing
+        if policy == MergePolicy.PREFER_RIGHT:
+            del collection[existing.name]
+            merged = self._insert(collection, obj, obj.name)
+            self._replaced[existing] = merged
+            if object_class == constants.ObjectClass.ECU:
+                # The frames of the replaced ECU came from other sources, which still apply.
+                merged.tx_frms = list(existing.tx_frms)
+                merged.rx_frms = list(existing.rx_frms)
+            return merged
+        if policy == MergePolicy.RENAME:
+            number = 2
+            while u'{}_{}'.format(obj.name, number) in collection:
+                number += 1
+            return self._insert(collection, obj, u'{}_{}'.format(obj.name, number))
+        _conflict(object_class, obj.name, 'differs from "{}"'.format(existing.name))
+
+    def _insert(self, collection, obj, name):
+        # type: (_memory.MemoryCollection, typing.Any, typing.Text) -> typing.Any
+        copied = _copy(obj, self._target, name)
+        collection._insert(copied)
+        self._origins[copied] = obj
+        return copied
+
+
+def _copy(obj, parent, name):
+    # type: (typing.Any, typing.Any, typing.Text) -> typing.Any
+    """Copy an in-memory object with its children. References are left to the caller."""
+    copied = type(obj)(parent, name)
+    for key, value in _stored_attributes(obj):
+        if key in _OWN_ATTRIBUTES or key in _REFERENCE_ATTRIBUTES:
+            continue
+        if isinstance(value, _memory.MemoryCollection):
+            target = _memory.MemoryCollection(copied, value._type, value._factory)
+            setattr(copied, key, target)
+            for child in value.values():
+                target._insert(_copy(child, copied, child.name))
+        elif isinstance(value, list):
+            setattr(copied, key, list(value))
+        elif isinstance(value, dict):
+            setattr(copied, key, dict(value))
+        else:
+            setattr(copied, key, value)
+    return copied
+
+
+def _stored_attributes(obj):
+    # type: (typing.Any) -> typing.List[typing.Tuple[typing.Text, typing.Any]]
+    """Return the attributes of an in-memory object, from its slots and then its instance dictionary."""
+    slots = [
+        key
+        for klass in type(obj).__mro__
+        for key in vars(klass).get('__slots__', ())
+        if key != '__dict__']
+    return [(key, getattr(obj, key)) for key in slots] + list(vars(obj).items())
+
+
+def _plain_attributes(cluster):
+    # type: (_memory.MemoryCluster) -> typing.Dict[typing.Text, typing.Any]
+    """Return the cluster properties that were set, which are kept in the instance."""
+    return dict(
+        (key, value)
+        for key, value in vars(cluster).items()
+        if not key.startswith('_'))
+
+
+def _definition(obj):
+    # type: (typing.Any) -> typing.Any
+    """Return a value that is equal for two objects with the same properties and children."""
+    properties = _diff._read(obj._object_class, obj, obj._get_cluster().protocol)
+    for key in _REFERENCE_ATTRIBUTES:
+        properties.pop(key, None)
+    children = sorted(
+        (child._object_class.value, child.name, _definition(child))
+        for child in obj._children())
+    return properties, children
+
+
+def _mapped(mapping, objects):
+    # type: (_IdentityMap, typing.Iterable[typing.Any]) -> typing.List[typing.Any]
+    mapped = (mapping.get(obj) for obj in objects)
+    return [obj for obj in mapped if obj is not None]
+
+
+def _union(first, second):
+    # type: (typing.List[typing.Any], typing.List[typing.Any]) -> typing.List[typing.Any]
+    seen = set()  # type: typing.Set[int]
+    merged = []
+    for obj in list(first) + list(second):
+        if id(obj) not in seen:
+            seen.add(id(obj))
+            merged.append(obj)
+    return merged
+
+
+def _conflict(object_class, name, message):
+    # type: (constants.ObjectClass, typing.Text, typing.Text) -> None
+    raise errors.XnetError(
+        u'Merge conflict for {} "{}": {}.'.format(object_class.name.lower(), name, message),
+        _CONFLICT_ERRORS[object_class])
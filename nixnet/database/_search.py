@@ -0,0 +1,341 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import bisect
+import collections
+import re
+import typing  # NOQA: F401
+
+from nixnet import constants
+
+from nixnet.database import _database_object  # NOQA: F401
+from nixnet.database import _find_object
+
+
+SearchResult_ = collections.namedtuple(
+    'SearchResult_',
+    ['object_class', 'cluster', 'name', 'name_unique_to_cluster', 'session_name', 'obj'])
+
+
+class SearchResult(SearchResult_):
+    """A database object found by :any:`SearchIndex`.
+
+    Attributes:
+        object_class(:any:`ObjectClass`): Class of the object that matched.
+        cluster(str): Name of the cluster that contains the object.
+        name(str): Short name of the object.
+        name_unique_to_cluster(str): Name that is unique within ``cluster``.
+            For signals, this is ``<Frame>.<Signal>`` when the short name is
+            used by more than one signal in the cluster.
+        session_name(str): Name to use in the ``list`` argument of a session
+            constructor, such as :any:`nixnet.session.SignalInSinglePointSession`.
+            When the index spans more than one cluster, the name is qualified by
+            the cluster name.
+        obj(``DatabaseObject``): The database object itself.
+    """
+
+    pass
+
+
+class _Table(object):
+    """Sorted names of one object class, searchable by prefix, glob, or regex."""
+
+    def __init__(self, entries, keys, case_sensitive):
+        # type: (typing.List[SearchResult], typing.List[typing.Text], bool) -> None
+        normalize = _identity if case_sensitive else _lower
+        order = sorted(range(len(keys)), key=lambda i: normalize(keys[i]))
+        self._entries = [entries[i] for i in order]
+        self._keys = [keys[i] for i in order]
+        self._sort_keys = [normalize(key) for key in self._keys]
+        self._normalize = normalize
+        self._flags = 0 if case_sensitive else re.IGNORECASE
+
+        # All names joined into one blob, so a glob can be scanned with a
+        # single regular expression pass instead of one match per name.
+        self._blob = '\n'.join(self._keys)
+        self._line_starts = []  # type: typing.List[int]
+        position = 0
+        for key in self._keys:
+            self._line_starts.append(position)
+            position += len(key) + 1
+
+    def __len__(self):
+        return len(self._entries)
+
+    def prefix(self, prefix):
+        # type: (typing.Text) -> typing.List[SearchResult]
+        begin, end = self._prefix_range(prefix)
+        return self._entries[begin:end]
+
+    def glob(self, pattern):
+        # type: (typing.Text) -> typing.List[SearchResult]
+        literal = _glob_literal_prefix(pattern)
+        begin, end = self._prefix_range(literal)
+        if begin == end:
+            return []
+        regex = re.compile('^' + _translate_glob(pattern) + '$', re.MULTILINE | self._flags)
+        blob_begin = self._line_starts[begin]
+        blob_end = self._line_starts[end - 1] + len(self._keys[end - 1])
+        return [
+            self._entries[bisect.bisect_right(self._line_starts, match.start()) - 1]
+            for match in regex.finditer(self._blob, blob_begin, blob_end)]
+
+    def regex(self, regex):
+        # type: (typing.Pattern) -> typing.List[SearchResult]
+        search = regex.search
+        return [
+            entry
+            for entry, key in zip(self._entries, self._keys)
+            if search(key)]
+
+    def _prefix_range(self, prefix):
+        # type: (typing.Text) -> typing.Tuple[int, int]
+        prefix = self._normalize(prefix)
+        begin = bisect.bisect_left(self._sort_keys, prefix)
+        if not prefix:
+            return begin, len(self._sort_keys)
+        # The largest code point sorts after every other continuation of the prefix.
+        end = bisect.bisect_left(self._sort_keys, prefix + u'\U0010ffff', begin)
+        return begin, end
+
+
+class SearchIndex(object):
+    """Prebuilt name index over the signals, frames, PDUs, and ECUs of a database.
+
+    Building the index reads every name from the database once.
+    Afterwards, all queries run in Python without accessing the database,
+    so they are suitable for interactively building the ``list`` argument of a session.
+
+    >>> index = SearchIndex(db)  # doctest: +SKIP
+    >>> names = [r.session_name for r in index.glob('*Temp*', constants.ObjectClass.SIGNAL)]  # doctest: +SKIP
+    >>> session = nixnet.SignalInSinglePointSession('CAN1', db_name, '', names)  # doctest: +SKIP
+
+    Queries match the short name of each object.
+    Pass ``qualified=True`` to match the fully qualified name instead,
+    such as ``<Cluster>.<Frame>.<Signal>`` for a signal
+    or ``<Cluster>.<Frame>`` for a frame.
+
+    Args:
+        parent(``DatabaseObject``): A :any:`Database` or :any:`Cluster` to index.
+        case_sensitive(bool): Whether queries distinguish uppercase and lowercase letters.
+    """
+
+    _CLASSES = (
+        constants.ObjectClass.SIGNAL,
+        constants.ObjectClass.FRAME,
+        constants.ObjectClass.PDU,
+        constants.ObjectClass.ECU,
+    )
+
+    def __init__(self, parent, case_sensitive=True):
+        # type: (typing.Any, bool) -> None
+        self._case_sensitive = case_sensitive
+
+        if hasattr(parent, 'clusters'):
+            clusters = list(parent.clusters.values())
+        else:
+            clusters = [parent]
+        qualify = len(clusters) > 1
+
+        entries = dict(
+            (object_class, [])
+            for object_class in self._CLASSES
+        )  # type: typing.Dict[constants.ObjectClass, typing.List[typing.Tuple[SearchResult, typing.Text]]]
+        for cluster in clusters:
+            cluster_name = cluster.name
+            for object_class, obj, name, unique_name, full_name in _walk_cluster(cluster):
+                qualified_name = '{}.{}'.format(cluster_name, full_name)
+                session_name = qualified_name if qualify else unique_name
+                result = SearchResult(object_class, cluster_name, name, unique_name, session_name, obj)
+                entries[object_class].append((result, qualified_name))
+
+        self._short = {}  # type: typing.Dict[constants.ObjectClass, _Table]
+        self._qualified = {}  # type: typing.Dict[constants.ObjectClass, _Table]
+        for object_class, class_entries in entries.items():
+            results = [result for result, _ in class_entries]
+            self._short[object_class] = _Table(
+                results,
+                [result.name for result in results],
+                case_sensitive)
+            self._qualified[object_class] = _Table(
+                results,
+                [qualified_name for _, qualified_name in class_entries],
+                case_sensitive)
+
+    def __repr__(self):
+        return '{}({})'.format(
+            type(self).__name__,
+            ', '.join(
+                '{}={}'.format(object_class.name.lower(), len(self._short[object_class]))
+                for object_class in self._CLASSES))
+
+    def __len__(self):
+        return sum(len(table) for table in self._short.values())
+
+    def prefix(self, prefix, object_class=None, qualified=False):
+        # type: (typing.Text, typing.Any, bool) -> typing.List[SearchResult]
+        """Find objects whose name starts with ``prefix``.
+
+        Args:
+            prefix(str): Start of the name.
+            object_class: Limits the search to one class of object.
+                This is either an :any:`ObjectClass` or a database class such as
+                :any:`nixnet.database.Signal<_signal.Signal>`.
+                By default, signals, frames, PDUs, and ECUs are searched.
+            qualified(bool): Match the fully qualified name instead of the short name.
+        Returns:
+            list of :any:`SearchResult`: Matches, sorted by name within each object class.
+        """
+        return self._query(object_class, qualified, lambda table: table.prefix(prefix))
+
+    def glob(self, pattern, object_class=None, qualified=False):
+        # type: (typing.Text, typing.Any, bool) -> typing.List[SearchResult]
+        """Find objects whose name matches a shell-style wildcard ``pattern``.
+
+        ``*`` matches any run of characters, ``?`` matches a single character,
+        and ``[seq]``/``[!seq]`` match a character in or not in ``seq``.
+        The whole name must match.
+
+        Args:
+            pattern(str): Wildcard pattern, for example ``*Temp*``.
+            object_class: Limits the search to one class of object. See :any:`SearchIndex.prefix`.
+            qualified(bool): Match the fully qualified name instead of the short name.
+        Returns:
+            list of :any:`SearchResult`: Matches, sorted by name within each object class.
+        """
+        return self._query(object_class, qualified, lambda table: table.glob(pattern))
+
+    def regex(self, pattern, object_class=None, qualified=False):
+        # type: (typing.Union[typing.Text, typing.Pattern], typing.Any, bool) -> typing.List[SearchResult]
+        """Find objects whose name contains a match for the regular expression ``pattern``.
+
+        The expression is applied with :func:`re.search`,
+        so anchor it with ``^`` and ``$`` to match the whole name.
+
+        Args:
+            pattern(str or compiled regular expression): Regular expression.
+            object_class: Limits the search to one class of object. See :any:`SearchIndex.prefix`.
+            qualified(bool): Match the fully qualified name instead of the short name.
+        Returns:
+            list of :any:`SearchResult`: Matches, sorted by name within each object class.
+        """
+        if hasattr(pattern, 'search'):
+            regex = pattern
+        else:
+            regex = re.compile(pattern, 0 if self._case_sensitive else re.IGNORECASE)
+        return self._query(object_class, qualified, lambda table: table.regex(regex))
+
+    def _query(self, object_class, qualified, search):
+        tables = self._qualified if qualified else self._short
+        if object_class is None:
+            object_classes = self._CLASSES
+        else:
+            object_classes = (_to_object_class(object_class), )
+
+        results = []  # type: typing.List[SearchResult]
+        for class_enum in object_classes:
+            table = tables.get(class_enum)
+            if table is None:
+                raise ValueError("Unsupported value provided for argument object_class.", object_class)
+            results.extend(search(table))
+        return results
+
+
+def _walk_cluster(cluster):
+    # type: (typing.Any) -> typing.Iterator[typing.Tuple[constants.ObjectClass, typing.Any, typing.Text, typing.Text, typing.Text]]  # NOQA: E501
+    """Yield the class, object, short name, unique name, and full name of each indexed object."""
+    seen_signals = set()  # type: typing.Set[typing.Text]
+    for frame in cluster.frames.values():
+        frame_name = frame.name
+        yield constants.ObjectClass.FRAME, frame, frame_name, frame_name, frame_name
+        for signal in frame.sigs:
+            unique_name = signal.name_unique_to_cluster
+            if unique_name in seen_signals:
+                # A PDU mapped into several frames exposes its signals through each frame.
+                continue
+            seen_signals.add(unique_name)
+            full_name = unique_name if '.' in unique_name else '{}.{}'.format(frame_name, unique_name)
+            yield constants.ObjectClass.SIGNAL, signal, signal.name, unique_name, full_name
+    for pdu in cluster.pdus.values():
+        pdu_name = pdu.name
+        yield constants.ObjectClass.PDU, pdu, pdu_name, pdu_name, pdu_name
+    for ecu in cluster.ecus.values():
+        ecu_name = ecu.name
+        yield constants.ObjectClass.ECU, ecu, ecu_name, ecu_name, ecu_name
+
+
+def _to_object_class(object_class):
+    # type: (typing.Any) -> constants.ObjectClass
+    if isinstance(object_class, constants.ObjectClass):
+        return object_class
+    return _find_object.get_object_class(object_class)
+
+
+def _identity(text):
+    return text
+
+
+def _lower(text):
+    return text.lower()
+
+
+def _glob_literal_prefix(pattern):
+    # type: (typing.Text) -> typing.Text
+    """Return the part of a glob pattern before its first wildcard.
+
+    >>> str(_glob_literal_prefix('Engine*Temp'))
+    'Engine'
+    >>> str(_glob_literal_prefix('*Temp*'))
+    ''
+    """
+    for index, char in enumerate(pattern):
+        if char in '*?[':
+            return pattern[:index]
+    return pattern
+
+
+def _translate_glob(pattern):
+    # type: (typing.Text) -> typing.Text
+    """Translate a glob pattern to a regular expression that never crosses a line.
+
+    >>> str(_translate_glob('a*b?'))
+    'a[^\\\\n]*b[^\\\\n]'
+    >>> str(_translate_glob('[!ab]c'))
+    '[^ab\\\\n]c'
+    >>> str(_translate_glob('[^a]'))
+    '[\\\\^a]'
+    """
+    parts = []
+    index = 0
+    length = len(pattern)
+    while index < length:
+        char = pattern[index]
+        index += 1
+        if char == '*':
+            parts.append('[^\\n]*')
+        elif char == '?':
+            parts.append('[^\\n]')
+        elif char == '[':
+            end = index
+            if end < length and pattern[end] == '!':
+                end += 1
+            if end < length and pattern[end] == ']':
+                end += 1
+            while end < length and pattern[end] != ']':
+                end += 1
+            if end >= length:
+                parts.append('\\[')
+                continue
+            body = pattern[index:end].replace('\\', '\\\\')
+            index = end + 1
+            if body.startswith('!'):
+                parts.append('[^{}\\n]'.format(body[1:]))
+            elif body.startswith('^'):
+                # Only '!' negates a glob class, so a leading '^' is a literal.
+                parts.append('[\\{}]'.format(body))
+            else:
+                parts.append('[{}]'.format(body))
+        else:
+            parts.append(re.escape(char))
+    return ''.join(parts)
@@ -0,0 +1,248 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+from multiprocessing import pool as mp_pool
+import typing  # NOQA: F401
+
+from nixnet import _cconsts
+from nixnet import _errors
+from nixnet import _props
+from nixnet import constants
+from nixnet import errors
+
+from nixnet.database import _layout
+from nixnet.database import _memory
+
+
+_STATUS_GETTERS = {
+    constants.ObjectClass.CLUSTER: _props.get_cluster_config_status,
+    constants.ObjectClass.FRAME: _props.get_frame_config_status,
+    constants.ObjectClass.PDU: _props.get_pdu_config_status,
+    constants.ObjectClass.SIGNAL: _props.get_signal_config_status,
+    constants.ObjectClass.SUBFRAME: _props.get_subframe_config_status,
+    constants.ObjectClass.ECU: _props.get_ecu_config_status,
+    constants.ObjectClass.LIN_SCHED: _props.get_lin_sched_config_status,
+}
+
+# Enough objects per task that handing them to a worker costs little next to checking them.
+_CHUNK_SIZE = 64
+
+ValidationIssue_ = collections.namedtuple(
+    'ValidationIssue_',
+    ['severity', 'object_class', 'path', 'message', 'error_code'])
+
+
+class ValidationIssue(ValidationIssue_):
+    """A problem found by :any:`Database.validate`.
+
+    Attributes:
+        severity(str): :any:`ValidationIssue.ERROR` or :any:`ValidationIssue.WARNING`.
+        object_class(:any:`ObjectClass`): Class of the object with the problem.
+        path(str): Names that qualify the object, such as ``myCluster.myFrame.mySignal``.
+        message(str): Description of the problem.
+        error_code(int): NI-XNET status code of the problem.
+    """
+
+    ERROR = 'error'
+    WARNING = 'warning'
+
+
+class ValidationReport(object):
+    """All problems found by :any:`Database.validate`.
+
+    Iterating the report yields every :any:`ValidationIssue`:
+    first those found by the Python pre-check, then those reported by the objects' configuration status,
+    each in database order.
+    """
+
+    def __init__(self, issues, num_objects):
+        # type: (typing.List[ValidationIssue], int) -> None
+        self._issues = issues
+        self._num_objects = num_objects
+
+    def __repr__(self):
+        return '{}(objects={}, errors={}, warnings={})'.format(
+            type(self).__name__, self._num_objects, len(self.errors), len(self.warnings))
+
+    def __len__(self):
+        return len(self._issues)
+
+    def __iter__(self):
+        return iter(self._issues)
+
+    @property
+    def ok(self):
+        # type: () -> bool
+        """bool: Returns ``True`` when no errors were found. Warnings are allowed."""
+        return not self.errors
+
+    @property
+    def num_objects(self):
+        # type: () -> int
+        """int: Returns the number of database objects that were checked."""
+        return self._num_objects
+
+    @property
+    def errors(self):
+        # type: () -> typing.List[ValidationIssue]
+        """list of :any:`ValidationIssue`: Returns the issues with severity :any:`ValidationIssue.ERROR`."""
+        return [issue for issue in self._issues if issue.severity == ValidationIssue.ERROR]
+
+    @property
+    def warnings(self):
+        # type: () -> typing.List[ValidationIssue]
+        """list of :any:`ValidationIssue`: Returns the issues with severity :any:`ValidationIssue.WARNING`."""
+        return [issue for issue in self._issues if issue.severity == ValidationIssue.WARNING]
+
+    def raise_for_errors(self):
+        # type: () -> None
+        """Raise the first error, if any.
+
+        Raises:
+            :any:`XnetError`: The first error of the report, with the object path in the message.
+        """
+        for issue in self.errors:
+            raise errors.XnetError(u'{}: {}'.format(issue.path, issue.message), issue.error_code)
+
+
+def validate(database, workers, precheck=True):
+    # type: (typing.Any, int, bool) -> ValidationReport
+    """Check every object of the database and report all problems.
+
+    See :any:`Database.validate`.
+    """
+    objects = []  # type: typing.List[typing.Tuple[constants.ObjectClass, typing.Text, typing.Any]]
+    containers = []  # type: typing.List[typing.Tuple[typing.Any, constants.ObjectClass, typing.Text, typing.Any]]
+    for cluster_name, cluster in database.clusters.items():
+        _walk_cluster(cluster_name, cluster, objects, containers)
+
+    thread_pool = mp_pool.ThreadPool(workers) if workers > 1 else None
+    try:
+        issues = []  # type: typing.List[ValidationIssue]
+        if precheck:
+            issues.extend(_flatten(_map(thread_pool, _precheck_container, containers)))
+        # Objects that already failed the pre-check are not checked again.
+        failed = set(issue.path for issue in issues if issue.severity == ValidationIssue.ERROR)
+        remaining = [obj for obj in objects if obj[1] not in failed]
+        issues.extend(_flatten(_map(thread_pool, _check_object, remaining)))
+    finally:
+        if thread_pool is not None:
+            thread_pool.close()
+            thread_pool.join()
+    return ValidationReport(issues, len(objects))
+
+
+def _walk_cluster(cluster_name, cluster, objects, containers):
+    # type: (typing.Text, typing.Any, typing.List, typing.List) -> None
+    objects.append((constants.ObjectClass.CLUSTER, cluster_name, cluster))
+    protocol = cluster.protocol
+    for object_class, collection, signals in (
+            (constants.ObjectClass.PDU, cluster.pdus, 'mux_static_sigs'),
+            (constants.ObjectClass.FRAME, cluster.frames, 'mux_static_signals')):
+        for name, container in collection.items():
+            path = u'{}.{}'.format(cluster_name, name)
+            objects.append((object_class, path, container))
+            for signal_name, signal in getattr(container, signals).items():
+                objects.append((constants.ObjectClass.SIGNAL, u'{}.{}'.format(path, signal_name), signal))
+            for subframe_name, subframe in container.mux_subframes.items():
+                objects.append((constants.ObjectClass.SUBFRAME, u'{}.{}'.format(path, subframe_name), subframe))
+                for signal_name, signal in subframe.dyn_signals.items():
+                    objects.append((constants.ObjectClass.SIGNAL, u'{}.{}'.format(path, signal_name), signal))
+            containers.append((protocol, object_class, path, container))
+    for name, ecu in cluster.ecus.items():
+        objects.append((constants.ObjectClass.ECU, u'{}.{}'.format(cluster_name, name), ecu))
+    for name, sched in cluster.lin_schedules.items():
+        objects.append((constants.ObjectClass.LIN_SCHED, u'{}.{}'.format(cluster_name, name), sched))
+
+
+def _map(thread_pool, function, items):
+    # type: (typing.Optional[mp_pool.ThreadPool], typing.Callable, typing.List) -> typing.Iterable
+    if thread_pool is None:
+        return [function(item) for item in items]
+    return thread_pool.map(function, items, _CHUNK_SIZE)
+
+
+def _flatten(results):
+    # type: (typing.Iterable[typing.List[ValidationIssue]]) -> typing.List[ValidationIssue]
+    return [issue for result in results for issue in result]
+
+
+def _check_object(item):
+    # type: (typing.Tuple[constants.ObjectClass, typing.Text, typing.Any]) -> typing.List[ValidationIssue]
+    object_class, path, obj = item
+    if hasattr(obj, '_handle'):
+        # Reading the status directly reports warnings too, without the warnings module,
+        # which is not safe to intercept from several threads.
+        status_code = _STATUS_GETTERS[object_class](obj._handle)
+        if status_code == _cconsts.NX_SUCCESS:
+            return []
+        severity = ValidationIssue.ERROR if status_code & _cconsts.NX_STATUS_ERROR else ValidationIssue.WARNING
+        return [ValidationIssue(severity, object_class, path, _errors.status_to_string(status_code), status_code)]
+    try:
+        obj.check_config_status()
+    except errors.XnetError as error:
+        return [ValidationIssue(ValidationIssue.ERROR, object_class, path, error.args[0], error.error_code)]
+    return []
+
+
+def _precheck_container(item):
+    # type: (typing.Tuple[typing.Any, constants.ObjectClass, typing.Text, typing.Any]) -> typing.List[ValidationIssue]
+    """Check the payload length and signal layout of a frame or PDU in Python."""
+    protocol, object_class, path, container = item
+    issues = []  # type: typing.List[ValidationIssue]
+    payload_len = container.payload_len
+
+    max_payload_len = None
+    if object_class == constants.ObjectClass.FRAME:
+        if protocol == constants.Protocol.CAN:
+            max_payload_len = _memory._MAX_PAYLOAD_LEN.get(container.can_io_mode)
+        elif protocol == constants.Protocol.LIN:
+            max_payload_len = _memory._MAX_LIN_PAYLOAD_LEN
+    if max_payload_len is not None and payload_len > max_payload_len:
+        issues.append(ValidationIssue(
+            ValidationIssue.ERROR, object_class, path,
+            'Payload length {} is more than the {} bytes allowed.'.format(payload_len, max_payload_len),
+            _cconsts.NX_ERR_DB_CONFIG_FRAME_NUM_BYTES))
+    default_payload = container.default_payload
+    if default_payload and len(default_payload) != payload_len:
+        issues.append(ValidationIssue(
+            ValidationIssue.WARNING, object_class, path,
+            'Default payload has {} bytes, but the payload length is {}.'.format(len(default_payload), payload_len),
+            _cconsts.NX_ERR_DEFAULT_PAYLOAD_NUM_BYTES))
+    if object_class == constants.ObjectClass.FRAME:
+        for properties in container.pdu_properties:
+            end = properties.start_bit + properties.pdu.payload_len * 8
+            if properties.start_bit < 0 or end > payload_len * 8:
+                issues.append(ValidationIssue(
+                    ValidationIssue.ERROR, object_class, path,
+                    'PDU "{}" at bit {} does not fit in the payload.'.format(
+                        properties.pdu.name, properties.start_bit),
+                    _cconsts.NX_ERR_DB_CONFIG_SIG_OUT_OF_FRAME))
+
+    issues.extend(_precheck_signals(object_class, path, container))
+    return issues
+
+
+def _precheck_signals(object_class, path, container):
+    # type: (constants.ObjectClass, typing.Text, typing.Any) -> typing.List[ValidationIssue]
+    layout = _layout.analyze_container(object_class, path, container)
+    issues = []  # type: typing.List[ValidationIssue]
+    for signal in layout.out_of_payload:
+        if signal.start_bit_in_payload:
+            message = 'Signal extends past the {}-bit payload.'.format(signal.payload_bits)
+        else:
+            message = 'Start bit {} is outside the {}-bit payload.'.format(signal.start_bit, signal.payload_bits)
+        issues.append(ValidationIssue(
+            ValidationIssue.ERROR, constants.ObjectClass.SIGNAL, signal.path, message,
+            _cconsts.NX_ERR_DB_CONFIG_SIG_OUT_OF_FRAME))
+    for overlap in layout.overlaps:
+        issues.append(ValidationIssue(
+            ValidationIssue.ERROR, constants.ObjectClass.SIGNAL, overlap.path,
+            'Signal overlaps "{}".'.format(overlap.other_path),
+            _cconsts.NX_ERR_DB_CONFIG_SIG_OVERLAPPED))
+    # Each signal has at most one problem; report them in signal order.
+    order = {signal_path: index for index, signal_path in enumerate(layout._signal_paths)}
+    issues.sort(key=lambda issue: order[issue.path])
+    return issues
@@ -0,0 +1,601 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+import re
+import struct
+import typing  # NOQA: F401
+
+try:
+    from xml.etree import cElementTree as ElementTree
+except ImportError:
+    from xml.etree import ElementTree  # type: ignore
+
+from nixnet import _cconsts
+from nixnet import constants
+from nixnet import errors
+from nixnet import types
+
+from nixnet.database import _dbc_parser
+from nixnet.database import _memory
+
+
+_ISO_DURATION_RE = re.compile(
+    r'P(?:(?P<days>[\d.]+)D)?(?:T(?:(?P<hours>[\d.]+)H)?(?:(?P<minutes>[\d.]+)M)?(?:(?P<seconds>[\d.]+)S)?)?$')
+
+_CHANNEL_MASKS = {'A': 1, 'B': 2}
+
+# Records hold only the plain values of one XML element, so the element can be discarded as soon as it is read.
+XmlCluster = collections.namedtuple(
+    'XmlCluster', ['name', 'protocol', 'baud_rate', 'can_fd_baud_rate', 'parameters'])
+XmlTriggering = collections.namedtuple(
+    'XmlTriggering', ['channel', 'frame', 'timings', 'can_ext_id', 'can_fd', 'tx_time', 'preamble', 'ports'])
+XmlFrame = collections.namedtuple('XmlFrame', ['name', 'payload_len', 'pdus'])
+XmlPdu = collections.namedtuple('XmlPdu', ['name', 'payload_len', 'multiplexer', 'tx_time'])
+XmlSignalInstance = collections.namedtuple('XmlSignalInstance', ['signal', 'start_bit', 'big_endian'])
+XmlMultiplexer = collections.namedtuple(
+    'XmlMultiplexer', ['name', 'start_bit', 'big_endian', 'num_bits', 'dynamic_pdus', 'static_pdus'])
+XmlSignal = collections.namedtuple('XmlSignal', ['name', 'coding', 'base_type', 'num_bits', 'default'])
+XmlCoding = collections.namedtuple(
+    'XmlCoding', ['num_bits', 'data_type', 'scale_fac', 'scale_off', 'min', 'max', 'unit', 'value_table'])
+XmlEcu = collections.namedtuple('XmlEcu', ['name', 'frames', 'channels', 'key_slot', 'startup', 'sync'])
+
+
+class XmlChannel(object):
+    """A cluster channel, completed as the cluster and channel elements are read in either order."""
+
+    __slots__ = ('cluster', 'letter')
+
+    def __init__(self):
+        # type: () -> None
+        self.cluster = None  # type: typing.Optional[typing.Text]
+        self.letter = None  # type: typing.Optional[typing.Text]
+
+
+class XmlRecords(object):
+    """Plain records read from a FIBEX or AUTOSAR file, keyed by their XML identifier or path.
+
+    Signals are not recorded, since they are built as soon as they are read.
+    """
+
+    def __init__(self):
+        # type: () -> None
+        self.clusters = collections.OrderedDict()  # type: typing.Dict[typing.Text, XmlCluster]
+        self.channels = collections.defaultdict(XmlChannel)  # type: typing.Dict[typing.Text, XmlChannel]
+        self.triggerings = collections.OrderedDict()  # type: typing.Dict[typing.Text, XmlTriggering]
+        self.frames = {}  # type: typing.Dict[typing.Text, XmlFrame]
+        self.pdus = {}  # type: typing.Dict[typing.Text, XmlPdu]
+        self.codings = {}  # type: typing.Dict[typing.Text, XmlCoding]
+        self.base_types = {}  # type: typing.Dict[typing.Text, constants.SigDataType]
+        self.units = {}  # type: typing.Dict[typing.Text, typing.Text]
+        self.ecus = collections.OrderedDict()  # type: typing.Dict[typing.Text, XmlEcu]
+        self._keys = {}  # type: typing.Dict[typing.Text, typing.Text]
+        # The number of PDU elements, whose signal instances are read in a second pass.
+        self.num_pdus = 0
+
+    def key(self, text):
+        # type: (typing.Text) -> typing.Text
+        """Return a shared copy of an identifier, so it is stored once however often it is referenced."""
+        return self._keys.setdefault(text, text)
+
+    def drop_structure(self):
+        # type: () -> None
+        """Drop the records of clusters, frames, PDUs and ECUs once they are built.
+
+        Codings, base types and units are kept for the signals.
+        """
+        self.clusters.clear()
+        self.channels.clear()
+        self.triggerings.clear()
+        self.frames.clear()
+        self.pdus.clear()
+        self.ecus.clear()
+        self._keys = {}
+
+
+class XmlRecordReader(object):
+    """Iterate over the record elements of an XML file without holding the whole tree.
+
+    A record is any element whose parent has one of the ``record_parents`` tags.
+    Each record is yielded once it is complete and is then removed from the tree,
+    so memory use is bounded by the largest record rather than by the file size.
+    Namespace prefixes are removed from element tags.
+    """
+
+    def __init__(self, source, record_parents):
+        # type: (typing.Any, typing.Iterable[typing.Text]) -> None
+        self._source = source
+        self._record_parents = frozenset(record_parents)
+        self.ancestors = []  # type: typing.List[typing.Any]
+        self._short_names = []  # type: typing.List[typing.Optional[typing.Text]]
+
+    def __iter__(self):
+        # type: () -> typing.Iterator[typing.Any]
+        ancestors = self.ancestors
+        short_names = self._short_names
+        record_parents = self._record_parents
+        try:
+            for event, element in ElementTree.iterparse(self._source, events=('start', 'end')):
+                if event == 'start':
+                    tag = element.tag
+                    if tag[0] == '{':
+                        element.tag = tag[tag.index('}') + 1:]
+                    ancestors.append(element)
+                    short_names.append(None)
+                    continue
+
+                ancestors.pop()
+                short_names.pop()
+                if not ancestors:
+                    continue
+                if element.tag == 'SHORT-NAME':
+                    short_names[-1] = element.text
+                elif ancestors[-1].tag in record_parents:
+                    yield element
+                    # The record is always the last child read so far.
+                    del ancestors[-1][-1]
+        except ElementTree.ParseError as e:
+            raise errors.XnetError(
+                '{}: {}'.format(self._source, e),
+                _cconsts.NX_ERR_CANNOT_OPEN_DATABASE_FILE)
+
+    def path(self):
+        # type: () -> typing.Text
+        """Return the AUTOSAR reference path of the current record's parent."""
+        return u''.join(u'/' + name for name in self._short_names if name)
+
+
+def attribute(element, name, default=None):
+    # type: (typing.Any, typing.Text, typing.Optional[typing.Text]) -> typing.Optional[typing.Text]
+    """Return an attribute value, ignoring any namespace prefix of the attribute name."""
+    for key, value in element.attrib.items():
+        if key == name or key.endswith('}' + name):
+            return value
+    return default
+
+
+def first_text(element, tag, default=None):
+    # type: (typing.Any, typing.Text, typing.Optional[typing.Text]) -> typing.Optional[typing.Text]
+    """Return the text of the first descendant with the given tag that has any."""
+    for child in element.iter(tag):
+        text = (child.text or '').strip()
+        if text:
+            return text
+    return default
+
+
+def to_int(text):
+    # type: (typing.Text) -> int
+    """Convert an XML integer, which may be hexadecimal or written as a real number.
+
+    >>> to_int('0x10'), to_int('12'), to_int('3.0')
+    (16, 12, 3)
+    """
+    text = text.strip()
+    if text.lower().startswith('0x'):
+        return int(text, 16)
+    try:
+        return int(text)
+    except ValueError:
+        return int(float(text))
+
+
+def to_bool(text):
+    # type: (typing.Optional[typing.Text]) -> bool
+    return text is not None and text.strip().lower() in ('true', '1')
+
+
+def iso_duration(text):
+    # type: (typing.Text) -> float
+    """Convert an ISO 8601 duration to seconds.
+
+    >>> iso_duration('PT0.01S')
+    0.01
+    >>> iso_duration('PT1M30S')
+    90.0
+    """
+    match = _ISO_DURATION_RE.match(text.strip())
+    if match is None:
+        raise ValueError('Invalid duration: {}'.format(text))
+    days, hours, minutes, seconds = [float(value or 0) for value in match.groups()]
+    return ((days * 24 + hours) * 60 + minutes) * 60 + seconds
+
+
+def parse_compu_method(element):
+    # type: (typing.Any) -> typing.Tuple[float, float, typing.Optional[float], typing.Optional[float], typing.Dict[typing.Text, int]]  # NOQA: E501
+    """Read the scaling of an ASAM or AUTOSAR ``COMPU-METHOD`` element.
+
+    Returns:
+        The scale factor, offset, physical minimum and maximum (``None`` if unbounded),
+        and the value table of text scales.
+    """
+    scale_fac = 1.0
+    scale_off = 0.0
+    limits = []  # type: typing.List[float]
+    value_table = {}  # type: typing.Dict[typing.Text, int]
+    linear_found = False
+    for scale in element.iter('COMPU-SCALE'):
+        lower = _limit(scale.find('LOWER-LIMIT'))
+        upper = _limit(scale.find('UPPER-LIMIT'))
+        const = scale.find('COMPU-CONST')
+        if const is not None:
+            label = first_text(const, 'VT', first_text(const, 'V'))
+            if label is not None and lower is not None:
+                value_table[label] = int(lower)
+            continue
+        numerator = [float(v.text) for v in scale.findall('COMPU-RATIONAL-COEFFS/COMPU-NUMERATOR/V')]
+        denominator = [float(v.text) for v in scale.findall('COMPU-RATIONAL-COEFFS/COMPU-DENOMINATOR/V')]
+        fac, off = 1.0, 0.0
+        if len(numerator) >= 2:
+            divisor = denominator[0] if denominator and denominator[0] else 1.0
+            off, fac = numerator[0] / divisor, numerator[1] / divisor
+        if not linear_found:
+            scale_fac, scale_off = fac, off
+            linear_found = True
+        limits.extend(raw * fac + off for raw in (lower, upper) if raw is not None)
+    if not limits:
+        return scale_fac, scale_off, None, None, value_table
+    return scale_fac, scale_off, min(limits), max(limits), value_table
+
+
+def _limit(element):
+    # type: (typing.Any) -> typing.Optional[float]
+    if element is None or element.text is None or 'INF' in element.text.upper():
+        return None
+    return float(element.text)
+
+
+def load_database(database, reader, source):
+    # type: (_memory.MemoryDatabase, typing.Any, typing.Text) -> None
+    """Read the clusters of a FIBEX or AUTOSAR file into an in-memory database.
+
+    The file is read twice, so that no records are held once their objects are built.
+    The first pass reads everything but the signals and their PDU instances,
+    and builds the clusters, frames, PDUs and ECUs.
+    The second pass builds each signal as soon as both its definition and its instance are read,
+    so peak memory stays close to that of the resulting database.
+    """
+    try:
+        builder = _XmlDatabaseBuilder(database, reader.read(source), reader.msb_start_bits)
+        builder.build()
+        reader.read_signals(source, builder)
+        builder.finish()
+    except (KeyError, ValueError) as e:
+        raise errors.XnetError(
+            '{}: Unresolved or invalid reference {}'.format(source, e),
+            _cconsts.NX_ERR_CANNOT_OPEN_DATABASE_FILE)
+
+
+class _XmlDatabaseBuilder(object):
+
+    def __init__(self, database, records, msb_start_bits):
+        # type: (_memory.MemoryDatabase, XmlRecords, bool) -> None
+        self._database = database
+        self._records = records
+        self._msb_start_bits = msb_start_bits
+        self._clusters = {}  # type: typing.Dict[typing.Text, _memory.MemoryCluster]
+        self._frames = {}  # type: typing.Dict[typing.Tuple[typing.Text, typing.Text], _memory.MemoryFrame]
+        self._pdus = {}  # type: typing.Dict[typing.Tuple[typing.Text, typing.Text], _memory.MemoryPdu]
+        self._triggered_frames = {}  # type: typing.Dict[typing.Text, typing.Tuple[typing.Text, _memory.MemoryFrame]]
+
+        # The state of the second pass, in which signals are added to the collections of their PDU keys.
+        self._targets = {}  # type: typing.Dict[typing.Text, typing.List[typing.Tuple[_memory.MemoryCollection, typing.Any, int]]]  # NOQA: E501
+        self._collections = []  # type: typing.List[_memory.MemoryCollection]
+        self._remaining_pdus = records.num_pdus
+        self._signals = {}  # type: typing.Dict[typing.Text, XmlSignal]
+        self._pending = {}  # type: typing.Dict[typing.Text, typing.Any]
+        self._payloads = {}  # type: typing.Dict[_memory._Multiplexed, int]
+        self._limit_cache = {}  # type: typing.Dict[typing.Tuple, typing.Tuple[float, float]]
+
+    def build(self):
+        # type: () -> None
+        """Build the clusters, frames, PDUs and ECUs, and then drop their records."""
+        records = self._records
+        for key, record in records.clusters.items():
+            self._clusters[key] = self._build_cluster(record)
+        for key, triggering in records.triggerings.items():
+            self._build_triggering(key, triggering)
+        for record in records.ecus.values():
+            self._build_ecu(record)
+        records.drop_structure()
+        self._frames.clear()
+        self._pdus.clear()
+        self._triggered_frames.clear()
+
+    def add_instances(self, pdu_key, instances):
+        # type: (typing.Text, typing.List[XmlSignalInstance]) -> None
+        """Add the signals of a PDU, which are completed once their definitions are read."""
+        self._remaining_pdus -= 1
+        for collection, parent, offset in self._targets.pop(pdu_key, ()):
+            self._collections.append(collection)
+            for instance in instances:
+                # The signal is named by its key until its definition is read.
+                signal = _memory.MemorySignal(parent, instance.signal)
+                if instance.big_endian:
+                    signal.byte_ordr = constants.SigByteOrdr.BIG_ENDIAN
+                signal.start_bit = instance.start_bit + offset
+                collection._insert_unnamed(signal)
+                record = self._signals.get(instance.signal)
+                if record is not None:
+                    self._complete_signal(signal, record)
+                    continue
+                pending = self._pending.setdefault(instance.signal, signal)
+                if pending is not signal:
+                    if not isinstance(pending, list):
+                        pending = self._pending[instance.signal] = [pending]
+                    pending.append(signal)
+        if not self._remaining_pdus:
+            # The definitions read so far have been used by all the instances that refer to them.
+            self._signals = {}
+
+    def add_signal(self, key, record):
+        # type: (typing.Text, XmlSignal) -> None
+        """Complete the signals read for a definition, and keep it while PDUs that may refer to it are unread."""
+        pending = self._pending.pop(key, [])
+        for signal in pending if isinstance(pending, list) else [pending]:
+            self._complete_signal(signal, record)
+        if self._remaining_pdus:
+            self._signals[key] = record
+
+    def finish(self):
+        # type: () -> None
+        """Check that all signals were defined, and set the default payloads of the frames and PDUs."""
+        if self._pending:
+            raise KeyError(next(iter(self._pending)))
+        for collection in self._collections:
+            collection._reindex()
+        self._collections = []
+        for cluster in self._clusters.values():
+            for pdu in cluster.pdus.values():
+                pdu.default_payload = _to_bytes(self._payloads.get(pdu, 0), pdu.payload_len)
+            for frame in cluster.frames.values():
+                payload = 0
+                for properties in frame.pdu_properties:
+                    payload |= self._payloads.get(properties.pdu, 0) << properties.start_bit
+                frame.default_payload = _to_bytes(payload, frame.payload_len)
+            self._finish_cluster(cluster)
+            cluster._changed()
+
+    def _build_cluster(self, record):
+        # type: (XmlCluster) -> _memory.MemoryCluster
+        cluster = self._database.clusters.add(record.name)
+        cluster.protocol = record.protocol
+        cluster.baud_rate = record.baud_rate
+        cluster.can_fd_baud_rate = record.can_fd_baud_rate
+        for name, value in record.parameters.items():
+            setattr(cluster, name, value)
+        return cluster
+
+    def _build_triggering(self, key, triggering):
+        # type: (typing.Text, XmlTriggering) -> None
+        channel = self._records.channels[triggering.channel]
+        if channel.cluster not in self._clusters:
+            return
+        cluster = self._clusters[channel.cluster]
+        frame_key = (channel.cluster, triggering.frame)
+        channel_mask = _CHANNEL_MASKS.get(channel.letter or '', 0)
+        frame = self._frames.get(frame_key)
+        timings = list(triggering.timings)
+        if frame is None:
+            frame = self._build_frame(channel.cluster, cluster, self._records.frames[triggering.frame])
+            self._frames[frame_key] = frame
+            identifier, base_cycle, cycle_rep = timings.pop(0)
+            frame.id = identifier
+            if triggering.can_ext_id:
+                frame.can_ext_id = True
+            if triggering.can_fd:
+                if cluster.can_fd_baud_rate > cluster.baud_rate:
+                    frame.can_io_mode = constants.CanIoMode.CAN_FD_BRS
+                else:
+                    frame.can_io_mode = constants.CanIoMode.CAN_FD
+            tx_time = triggering.tx_time
+            if tx_time is None:
+                tx_times = [pdu.tx_time for pdu in self._frame_pdu_records(triggering.frame) if pdu.tx_time]
+                tx_time = tx_times[0] if tx_times else None
+            if tx_time:
+                frame.can_timing_type = constants.FrmCanTiming.CYCLIC_DATA
+                frame.can_tx_time = tx_time
+            if cluster.protocol == constants.Protocol.FLEX_RAY:
+                frame.flex_ray_base_cycle = base_cycle
+                frame.flex_ray_cycle_rep = cycle_rep
+                if triggering.preamble:
+                    frame.flex_ray_preamble = True
+                frame.flex_ray_ch_assign = constants.FrmFlexRayChAssign(channel_mask or 1)
+                if cluster.flex_ray_num_stat_slt and identifier > cluster.flex_ray_num_stat_slt:
+                    frame.flex_ray_timing_type = constants.FrmFlexRayTiming.EVENT
+        self._triggered_frames[key] = (channel.cluster, frame)
+
+        if cluster.protocol != constants.Protocol.FLEX_RAY or not channel_mask:
+            return
+        for identifier, base_cycle, cycle_rep in timings:
+            if identifier == frame.id:
+                if (base_cycle, cycle_rep) == (frame.flex_ray_base_cycle, frame.flex_ray_cycle_rep):
+                    mask = frame.flex_ray_ch_assign.value | channel_mask
+                    frame.flex_ray_ch_assign = constants.FrmFlexRayChAssign(mask)
+                # Otherwise the frame is multiplexed by cycle, which a single frame cannot describe.
+            elif identifier in frame.flex_ray_in_cyc_rep_i_ds:
+                index = frame.flex_ray_in_cyc_rep_i_ds.index(identifier)
+                mask = frame.flex_ray_in_cyc_rep_ch_assigns[index].value | channel_mask
+                frame.flex_ray_in_cyc_rep_ch_assigns[index] = constants.FrmFlexRayChAssign(mask)
+            else:
+                frame.flex_ray_in_cyc_rep_i_ds.append(identifier)
+                frame.flex_ray_in_cyc_rep_ch_assigns.append(constants.FrmFlexRayChAssign(channel_mask))
+
+    def _frame_pdu_records(self, frame_key):
+        # type: (typing.Text) -> typing.List[XmlPdu]
+        return [self._records.pdus[pdu_key] for pdu_key, _, _ in self._records.frames[frame_key].pdus]
+
+    def _build_frame(self, cluster_key, cluster, record):
+        # type: (typing.Text, _memory.MemoryCluster, XmlFrame) -> _memory.MemoryFrame
+        frame = cluster.frames._insert(_memory.MemoryFrame(cluster, record.name))
+        frame.payload_len = record.payload_len
+        pdu_properties = []
+        for pdu_key, start_bit, update_bit in record.pdus:
+            pdu = self._get_pdu(cluster_key, cluster, pdu_key)
+            pdu_properties.append(types.PduProperties(pdu, start_bit, update_bit))
+        frame.pdu_properties = pdu_properties
+        if len(pdu_properties) != 1 or pdu_properties[0].start_bit != 0 or pdu_properties[0].update_bit != -1:
+            cluster.pdus_reqd = True
+        return frame
+
+    def _get_pdu(self, cluster_key, cluster, pdu_key):
+        # type: (typing.Text, _memory.MemoryCluster, typing.Text) -> _memory.MemoryPdu
+        pdu = self._pdus.get((cluster_key, pdu_key))
+        if pdu is not None:
+            return pdu
+
+        record = self._records.pdus[pdu_key]
+        pdu = cluster.pdus._insert(_memory.MemoryPdu(cluster, record.name))
+        pdu.payload_len = record.payload_len
+        self._pdus[(cluster_key, pdu_key)] = pdu
+        self._add_target(pdu_key, pdu.mux_static_sigs, pdu, 0)
+
+        multiplexer = record.multiplexer
+        if multiplexer is not None:
+            switch = pdu.mux_static_sigs._insert(_memory.MemorySignal(pdu, multiplexer.name))
+            switch.mux_is_data_mux = True
+            switch.num_bits = multiplexer.num_bits
+            switch.data_type = constants.SigDataType.UNSIGNED
+            switch.max = float((1 << multiplexer.num_bits) - 1)
+            if multiplexer.big_endian:
+                switch.byte_ordr = constants.SigByteOrdr.BIG_ENDIAN
+            switch.start_bit = multiplexer.start_bit
+            for static_key, offset in multiplexer.static_pdus:
+                if static_key not in self._records.pdus:
+                    raise KeyError(static_key)
+                self._add_target(static_key, pdu.mux_static_sigs, pdu, offset)
+            for dynamic_key, code, offset in multiplexer.dynamic_pdus:
+                name = self._records.pdus[dynamic_key].name
+                if name in pdu.mux_subframes:
+                    name = u'{}_{}'.format(name, code)
+                subframe = pdu.mux_subframes._insert(_memory.MemorySubFrame(pdu, name))
+                subframe.mux_value = code
+                self._add_target(dynamic_key, subframe.dyn_signals, subframe, offset)
+        return pdu
+
+    def _add_target(self, pdu_key, collection, parent, offset):
+        # type: (typing.Text, _memory.MemoryCollection, typing.Any, int) -> None
+        """Add the signals of a PDU to a collection once its instances are read, at an offset in bits."""
+        self._targets.setdefault(pdu_key, []).append((collection, parent, offset))
+
+    def _complete_signal(self, signal, record):
+        # type: (_memory.MemorySignal, XmlSignal) -> None
+        records = self._records
+        coding = records.codings.get(record.coding) if record.coding else None
+        signal._name = record.name
+        signal.num_bits = record.num_bits or (coding.num_bits if coding else 0)
+        if self._msb_start_bits and signal.byte_ordr == constants.SigByteOrdr.BIG_ENDIAN:
+            # The start bit is that of the most significant bit, which needs the signal length.
+            signal.start_bit = _dbc_parser._motorola_lsb(signal.start_bit, signal.num_bits)
+
+        data_type = records.base_types.get(record.base_type) if record.base_type else None
+        if data_type is None and coding is not None:
+            data_type = coding.data_type
+        signal.data_type = data_type or constants.SigDataType.UNSIGNED
+        if coding is not None:
+            signal.scale_fac = coding.scale_fac
+            signal.scale_off = coding.scale_off
+            if coding.unit:
+                signal.unit = records.units.get(coding.unit, u'')
+            if coding.value_table:
+                signal._get_value_table().update(coding.value_table)
+        if coding is not None and coding.min is not None:
+            signal.min = coding.min
+            signal.max = coding.max
+        else:
+            signal.min, signal.max = self._signal_limits(signal)
+
+        if record.default:
+            signal.default = record.default * signal.scale_fac + signal.scale_off
+            parent = signal._parent
+            if isinstance(parent, _memory._Multiplexed):
+                # Only static signals are part of the default payload.
+                self._payloads[parent] = self._payloads.get(parent, 0) | _pack_raw(signal, record.default)
+
+    def _signal_limits(self, signal):
+        # type: (_memory.MemorySignal) -> typing.Tuple[float, float]
+        """Return the physical range of a signal's raw values, shared by all signals with the same coding."""
+        key = (signal.data_type, signal.num_bits, signal.scale_fac, signal.scale_off)
+        limits = self._limit_cache.get(key)
+        if limits is None:
+            values = [raw * signal.scale_fac + signal.scale_off for raw in _raw_limits(signal)]
+            limits = self._limit_cache[key] = (min(values), max(values))
+        return limits
+
+    def _build_ecu(self, record):
+        # type: (XmlEcu) -> None
+        ecus = {}  # type: typing.Dict[typing.Text, _memory.MemoryEcu]
+
+        def get_ecu(cluster_key):
+            ecu = ecus.get(cluster_key)
+            if ecu is None:
+                cluster = self._clusters[cluster_key]
+                ecu = cluster.ecus._insert(_memory.MemoryEcu(cluster, record.name))
+                ecus[cluster_key] = ecu
+            return ecu
+
+        for channel_key in record.channels:
+            channel = self._records.channels.get(channel_key)
+            if channel is not None and channel.cluster in self._clusters:
+                ecu = get_ecu(channel.cluster)
+                ecu.flex_ray_connected_chs |= _CHANNEL_MASKS.get(channel.letter or '', 0)
+        for triggering_key, is_tx in record.frames:
+            if triggering_key not in self._triggered_frames:
+                continue
+            cluster_key, frame = self._triggered_frames[triggering_key]
+            ecu = get_ecu(cluster_key)
+            frames = ecu.tx_frms if is_tx else ecu.rx_frms
+            if frame not in frames:
+                frames.append(frame)
+        if record.key_slot is not None:
+            for ecu in ecus.values():
+                for frame in ecu.tx_frms:
+                    if frame.id == record.key_slot:
+                        frame.flex_ray_startup = record.startup
+                        frame.flex_ray_sync = record.sync
+
+    def _finish_cluster(self, cluster):
+        # type: (_memory.MemoryCluster) -> None
+        io_modes = set(frame.can_io_mode for frame in cluster.frames.values())
+        if constants.CanIoMode.CAN_FD_BRS in io_modes:
+            cluster.can_io_mode = constants.CanIoMode.CAN_FD_BRS
+        elif constants.CanIoMode.CAN_FD in io_modes:
+            cluster.can_io_mode = constants.CanIoMode.CAN_FD
+        if cluster.protocol == constants.Protocol.FLEX_RAY:
+            channels = 0
+            for frame in cluster.frames.values():
+                channels |= frame.flex_ray_ch_assign.value
+            cluster.flex_ray_channels = cluster.flex_ray_channels or channels
+
+
+def _raw_limits(signal):
+    # type: (_memory.MemorySignal) -> typing.Tuple[float, float]
+    if signal.data_type == constants.SigDataType.IEEE_FLOAT:
+        return 0.0, 0.0
+    if signal.data_type == constants.SigDataType.SIGNED:
+        return float(-(1 << (signal.num_bits - 1))), float((1 << (signal.num_bits - 1)) - 1)
+    return 0.0, float((1 << signal.num_bits) - 1)
+
+
+def _pack_raw(signal, raw):
+    # type: (_memory.MemorySignal, float) -> int
+    """Return a raw signal value placed at the signal's bits of a little-endian payload integer."""
+    if signal.data_type == constants.SigDataType.IEEE_FLOAT:
+        if signal.num_bits == 32:
+            value = struct.unpack('<I', struct.pack('<f', raw))[0]
+        else:
+            value = struct.unpack('<Q', struct.pack('<d', raw))[0]
+    else:
+        value = int(raw) & ((1 << signal.num_bits) - 1)
+    payload = 0
+    for index, position in enumerate(_memory.signal_bit_positions(signal)):
+        if value >> index & 1:
+            payload |= 1 << position
+    return payload
+
+
+def _to_bytes(value, length):
+    # type: (int, int) -> typing.List[int]
+    # A list copied from a bytearray has no spare capacity.
+    return list(bytearray((value >> (8 * index)) & 0xFF for index in range(length)))
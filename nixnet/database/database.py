@@ -2,6 +2,7 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import multiprocessing
 import typing  # NOQA: F401
 import warnings
 
@@ -14,6 +15,7 @@ from nixnet import errors
 from nixnet.database import _collection
 from nixnet.database import _database_object
 from nixnet.database import _find_object
+from nixnet.database import _validate
 
 
 class Database(_database_object.DatabaseObject):
@@ -186,6 +188,31 @@ class Database(_database_object.DatabaseObject):
         """
         _funcs.nxdb_save_database(self._handle, db_filepath)
 
+    def validate(self, workers=None, precheck=True):
+        # type: (typing.Optional[int], bool) -> _validate.ValidationReport
+        """Checks the configuration of every object in the database and reports all problems.
+
+        Unlike ``check_config_status``, which raises on the first problem of one object,
+        this function collects the errors and warnings of all clusters, frames, PDUs, signals,
+        subframes, ECUs, and LIN schedules into one :any:`ValidationReport`.
+        The configuration status of the objects is read by a pool of ``workers`` threads.
+
+        Before that, a pre-check in Python finds signals that start or end outside the payload,
+        signals that overlap within the same multiplexer value,
+        and frames or PDUs whose payload length does not match their protocol, default payload, or mapped PDUs.
+        Objects that fail the pre-check are not checked again by the driver.
+
+        Args:
+            workers(int): Number of threads that read the configuration status.
+                The default is the number of processors.
+            precheck(bool): Whether to run the Python pre-check.
+        Returns:
+            :any:`ValidationReport`: All problems found, with the path of each object.
+        """
+        if workers is None:
+            workers = multiprocessing.cpu_count()
+        return _validate.validate(self, workers, precheck)
+
     @property
     def name(self):
         # type: () -> typing.Text
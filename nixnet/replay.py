@@ -0,0 +1,350 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+import struct
+import time
+import timeit
+import typing  # NOQA: F401
+
+from nixnet import _cconsts
+from nixnet import _frames
+from nixnet import _scheduler
+from nixnet import constants
+from nixnet import types
+
+from nixnet.capture import _units
+
+try:
+    import numpy  # type: ignore
+except ImportError:
+    numpy = None
+
+__all__ = [
+    'Replayer',
+    'ReplayStats']
+
+#: Slowest time scaling supported by :any:`Replayer`.
+MIN_SPEED = 0.1
+#: Fastest time scaling supported by :any:`Replayer`.
+MAX_SPEED = 10.0
+
+_TICKS_PER_SECOND = 10 ** 7
+_TICKS_PER_MILLISECOND = 10 ** 4
+_TIMESTAMP = struct.Struct('<Q')
+_DELAY_UNIT = b''.join(_frames.serialize_frame(types.DelayFrame(0).to_raw()))[_TIMESTAMP.size:]
+# Shortest time in seconds between checks of the queue, so a stalled queue isn't polled in a busy loop.
+_POLL_INTERVAL = 0.001
+_ECHO_READ_BYTES = 1 << 16
+
+ReplayStats_ = collections.namedtuple(
+    'ReplayStats_',
+    ['frames', 'delays', 'writes', 'underruns', 'timing_error'])
+
+
+class ReplayStats(ReplayStats_):
+    """Summary of a replay by :any:`Replayer`.
+
+    Attributes:
+        frames(int): Number of recorded frames written.
+        delays(int): Number of :any:`nixnet.types.DelayFrame` frames written between them.
+        writes(int): Number of writes, each with a lookahead window of frames.
+        underruns(int): Number of times the queue was found empty before the end of the replay,
+            so frames may have been transmitted late.
+        timing_error(:any:`nixnet.types.JitterStats`): Achieved minus recorded time of the echoed frames,
+            in seconds, from the first echoed frame, with the recorded times scaled by the speed.
+            ``count`` is ``0`` without an echo session.
+    """
+
+    pass
+
+
+class _Window(object):
+    """Serialized frames of a source buffer, not yet written."""
+
+    __slots__ = ['data', 'ends', 'dues', 'stamps', 'position', 'index']
+
+    def __init__(self, data, ends, dues, stamps):
+        # type: (bytes, typing.List[int], typing.List[float], typing.List[typing.Optional[int]]) -> None
+        self.data = data
+        # End offset, transmit time in seconds from the start of the replay,
+        # and scaled timestamp of every frame, which is None for delay frames.
+        self.ends = ends
+        self.dues = dues
+        self.stamps = stamps
+        self.position = 0
+        self.index = 0
+
+    def __len__(self):
+        # type: () -> int
+        return len(self.ends) - self.index
+
+
+class Replayer(object):
+    """Replay recorded frames on a stream output session with hardware timing.
+
+    Frames are read from raw frame buffers, such as those of :any:`CaptureReader.read_bytes`
+    or :any:`BlfReader.read_bytes`, in timestamp order.
+    They are paced by the interface rather than by sleeping between writes:
+    with ``pacing='timestamps'``, the interface replays the frames at their timestamps,
+    which are scaled by ``speed``,
+    and with ``pacing='delays'``, the gaps between frames are written as
+    :any:`nixnet.types.DelayFrame` frames of whole milliseconds, carrying the rest to the next gap.
+
+    The driver queue is kept filled to ``target_depth`` frames, read from :any:`num_unused`.
+    Whenever the queue drains to half of it, the frames needed to fill it are written
+    from a serialized lookahead window with a single call, and the replayer sleeps
+    until the queue is expected to drain again.
+
+    With an ``echo_session`` that reads the frames echoed by the interface (see :any:`Interface.echo_tx`),
+    the transmit time of every frame is compared with its scaled recorded time
+    and reported in :any:`ReplayStats.timing_error`.
+
+    Args:
+        session: :any:`FrameOutStreamSession` to write to, not yet started.
+        buffers(iterable of bytes): Recorded frames in the raw frame format, in timestamp order.
+        speed(float): Time scaling from 0.1 to 10, where 2 replays twice as fast as recorded.
+        pacing(str): ``'timestamps'`` or ``'delays'``.
+        timing(:any:`nixnet._enums.OutStrmTimng`): Output stream timing the interface is set to,
+            or ``None`` to leave :any:`Interface.out_strm_timng` unchanged.
+            Both pacings need a replay mode.
+        target_depth(int): Frames to keep in the queue,
+            or ``None`` for three quarters of the queue size.
+        echo_session: :any:`FrameInStreamSession` reading the echoed frames, or ``None``.
+        timeout(float): Time in seconds each write waits for space in the queue,
+            and the replay waits for the queue to empty after the last write.
+        clock: Function returning the current time in seconds. Defaults to ``timeit.default_timer``.
+        sleep: Function sleeping for a number of seconds. Defaults to ``time.sleep``.
+    """
+
+    def __init__(
+            self,
+            session,  # type: typing.Any
+            buffers,  # type: typing.Iterable[bytes]
+            speed=1.0,  # type: float
+            pacing='timestamps',  # type: typing.Text
+            timing=constants.OutStrmTimng.REPLAY_EXCLUSIVE,  # type: typing.Optional[constants.OutStrmTimng]
+            target_depth=None,  # type: typing.Optional[int]
+            echo_session=None,  # type: typing.Any
+            timeout=10,  # type: float
+            clock=None,  # type: typing.Optional[typing.Callable[[], float]]
+            sleep=None,  # type: typing.Optional[typing.Callable[[float], None]]
+    ):
+        # type: (...) -> None
+        if not MIN_SPEED <= speed <= MAX_SPEED:
+            raise ValueError('Speed must be from {} to {}: {}'.format(MIN_SPEED, MAX_SPEED, speed))
+        if pacing not in ('timestamps', 'delays'):
+            raise ValueError("Unknown pacing {!r}, expected 'timestamps' or 'delays'".format(pacing))
+        self._session = session
+        self._buffers = iter(buffers)
+        self._speed = speed
+        self._delays = pacing == 'delays'
+        self._echo_session = echo_session
+        self._timeout = timeout
+        self._clock = clock or timeit.default_timer
+        self._sleep = sleep or time.sleep
+        if timing is not None:
+            session.intf.out_strm_timng = timing
+        # Before the session starts, the unused values are the queue size.
+        self._capacity = session.num_unused
+        if target_depth is None:
+            target_depth = self._capacity * 3 // 4
+        if not 0 < target_depth <= self._capacity:
+            raise ValueError('Target depth must be from 1 to the queue size of {} frames: {}'.format(
+                self._capacity, target_depth))
+        self._target_depth = target_depth
+
+        self._windows = collections.deque()  # type: typing.Deque[_Window]
+        self._exhausted = False
+        self._first_timestamp = None  # type: typing.Optional[int]
+        self._previous_timestamp = 0
+        self._delay_ticks = 0
+        self._start = None  # type: typing.Optional[float]
+        # Transmit times of the last written frames, to tell when the queue will have drained.
+        self._written_dues = collections.deque(maxlen=target_depth)  # type: typing.Deque[float]
+        self._expected = collections.deque()  # type: typing.Deque[int]
+        self._first_echo = None  # type: typing.Optional[typing.Tuple[int, int]]
+        self._recorder = _scheduler.JitterRecorder()
+        self._frames = 0
+        self._delay_frames = 0
+        self._writes = 0
+        self._underruns = 0
+
+    @property
+    def target_depth(self):
+        # type: () -> int
+        """int: Returns the number of frames kept in the queue."""
+        return self._target_depth
+
+    def stats(self):
+        # type: () -> ReplayStats
+        """Return the :any:`ReplayStats` of the replay so far."""
+        return ReplayStats(self._frames, self._delay_frames, self._writes, self._underruns, self._recorder.stats())
+
+    def run(self):
+        # type: () -> ReplayStats
+        """Replay every frame, wait for the queue to empty, and return the :any:`ReplayStats`."""
+        session = self._session
+        capacity = self._capacity
+        target = self._target_depth
+        while True:
+            pending = capacity - session.num_unused
+            if not self._fill(target):
+                break
+            if pending <= 0 and self._start is not None:
+                self._underruns += 1
+            self._write(target - pending)
+            self._read_echoes()
+            self._wait(target // 2)
+
+        # Wait for the last frames to be transmitted. Frames are only pending after a write, which sets the start.
+        end = self._clock() + self._timeout
+        last_due = self._written_dues[-1] if self._written_dues else 0.0
+        while capacity - session.num_unused > 0:
+            now = self._clock()
+            if now >= end:
+                break
+            self._sleep(max(self._start + last_due - now, _POLL_INTERVAL))
+        self._read_echoes()
+        return self.stats()
+
+    def _fill(self, count):
+        # type: (int) -> bool
+        """Serialize source buffers until ``count`` frames are ready, and return whether any frame is left."""
+        windows = self._windows
+        ready = sum(len(window) for window in windows)
+        while ready < count and not self._exhausted:
+            try:
+                data = next(self._buffers)
+            except StopIteration:
+                self._exhausted = True
+                break
+            if not data:
+                continue
+            window = self._serialize(bytes(data))
+            windows.append(window)
+            ready += len(window)
+        return ready > 0
+
+    def _write(self, count):
+        # type: (int) -> None
+        """Write up to ``count`` frames of the lookahead windows with one call."""
+        if count <= 0:
+            return
+        pieces = []
+        windows = self._windows
+        while count > 0 and windows:
+            window = windows[0]
+            index = min(window.index + count, len(window.ends))
+            end = window.ends[index - 1]
+            pieces.append(window.data[window.position:end])
+            for position in range(window.index, index):
+                stamp = window.stamps[position]
+                if stamp is None:
+                    self._delay_frames += 1
+                else:
+                    self._frames += 1
+                    if self._echo_session is not None:
+                        self._expected.append(stamp)
+                self._written_dues.append(window.dues[position])
+            count -= index - window.index
+            window.index = index
+            window.position = end
+            if not len(window):
+                windows.popleft()
+        if not pieces:
+            return
+        if self._start is None:
+            # The interface times the frames from the first one it dequeues.
+            self._start = self._clock()
+        self._session.frames.write_bytes(b''.join(pieces), self._timeout)
+        self._writes += 1
+
+    def _wait(self, depth):
+        # type: (int) -> None
+        """Sleep until the queue is expected to have drained to ``depth`` frames."""
+        dues = self._written_dues
+        now = self._clock()
+        if self._start is None or len(dues) <= depth:
+            wake = now
+        else:
+            wake = self._start + dues[len(dues) - 1 - depth]
+        self._sleep(max(wake - now, _POLL_INTERVAL))
+
+    def _scale(self, timestamp):
+        # type: (int) -> int
+        first = self._first_timestamp
+        return first + int(round((timestamp - first) / self._speed))
+
+    def _serialize(self, data):
+        # type: (bytes) -> _Window
+        """Scale the timestamps of a source buffer and add delay frames, as the frames will be written."""
+        if self._first_timestamp is None:
+            self._first_timestamp = self._previous_timestamp = _TIMESTAMP.unpack_from(data)[0]
+        offsets = _units.frame_offsets(data)
+        if numpy is not None and not self._delays:
+            return self._numpy_serialize(data, offsets)
+
+        first = self._first_timestamp
+        pieces = []  # type: typing.List[bytes]
+        ends = []  # type: typing.List[int]
+        dues = []  # type: typing.List[float]
+        stamps = []  # type: typing.List[typing.Optional[int]]
+        size = 0
+        for index, offset in enumerate(offsets):
+            end = offsets[index + 1] if index + 1 < len(offsets) else len(data)
+            timestamp = self._scale(_TIMESTAMP.unpack_from(data, offset)[0])
+            due = (timestamp - first) / _TICKS_PER_SECOND
+            if self._delays:
+                # Gaps are rounded to whole milliseconds, and the rest is carried to the next gap,
+                # so frames are at most half a millisecond from their time.
+                self._delay_ticks += timestamp - self._previous_timestamp
+                self._previous_timestamp = timestamp
+                milliseconds = (self._delay_ticks + _TICKS_PER_MILLISECOND // 2) // _TICKS_PER_MILLISECOND
+                if milliseconds > 0:
+                    self._delay_ticks -= milliseconds * _TICKS_PER_MILLISECOND
+                    pieces.append(_TIMESTAMP.pack(milliseconds) + _DELAY_UNIT)
+                    size += _units.UNIT_SIZE
+                    ends.append(size)
+                    dues.append(due)
+                    stamps.append(None)
+            pieces.append(_TIMESTAMP.pack(timestamp) + data[offset + _TIMESTAMP.size:end])
+            size += end - offset
+            ends.append(size)
+            dues.append(due)
+            stamps.append(timestamp)
+        return _Window(b''.join(pieces), ends, dues, stamps)
+
+    def _numpy_serialize(self, data, offsets):
+        # type: (bytes, typing.List[int]) -> _Window
+        positions = numpy.asarray(offsets, numpy.int64)
+        raw = numpy.frombuffer(data, numpy.uint8).copy()
+        gather = positions[:, None] + numpy.arange(_TIMESTAMP.size)
+        timestamps = raw[gather].view('<u8').reshape(-1).astype(numpy.int64)
+        first = self._first_timestamp
+        scaled = first + numpy.rint((timestamps - first) / self._speed).astype(numpy.int64)
+        raw[gather] = scaled.astype('<u8').view(numpy.uint8).reshape(-1, _TIMESTAMP.size)
+        ends = numpy.append(positions[1:], len(data))
+        dues = (scaled - first) / _TICKS_PER_SECOND
+        return _Window(raw.tobytes(), ends.tolist(), dues.tolist(), scaled.tolist())
+
+    def _read_echoes(self):
+        # type: () -> None
+        """Compare the transmit times of the echoed frames with their scaled recorded times."""
+        if self._echo_session is None:
+            return
+        expected = self._expected
+        while True:
+            data = self._echo_session.frames.read_bytes(_ECHO_READ_BYTES)
+            if not data:
+                return
+            for frame in _frames.iterate_frames(data):
+                if not frame.flags & _cconsts.NX_FRAME_FLAGS_TRANSMIT_ECHO or not expected:
+                    continue
+                recorded = expected.popleft()
+                if self._first_echo is None:
+                    self._first_echo = (frame.timestamp, recorded)
+                first_echo, first_recorded = self._first_echo
+                error = (frame.timestamp - first_echo) - (recorded - first_recorded)
+                self._recorder.add(error / _TICKS_PER_SECOND)
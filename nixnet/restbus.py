@@ -0,0 +1,334 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+import struct
+import time
+import timeit
+import typing  # NOQA: F401
+
+import six
+
+from nixnet import _scheduler
+from nixnet import constants
+from nixnet import types
+
+from nixnet.database import _memory
+
+__all__ = [
+    'Restbus',
+    'RestbusFrame']
+
+_CYCLIC_TIMING_TYPES = (
+    constants.FrmCanTiming.CYCLIC_DATA,
+    constants.FrmCanTiming.CYCLIC_REMOTE,
+    constants.FrmCanTiming.CYCLIC_EVENT)
+_EVENT_TIMING_TYPES = (constants.FrmCanTiming.EVENT_DATA, constants.FrmCanTiming.CYCLIC_EVENT)
+_REMOTE_TIMING_TYPES = (constants.FrmCanTiming.CYCLIC_REMOTE, constants.FrmCanTiming.EVENT_REMOTE)
+
+_DATA_FRAME_TYPES = {
+    constants.CanIoMode.CAN: constants.FrameType.CAN_DATA,
+    constants.CanIoMode.CAN_FD: constants.FrameType.CANFD_DATA,
+    constants.CanIoMode.CAN_FD_BRS: constants.FrameType.CANFDBRS_DATA,
+}
+
+RestbusFrame_ = collections.namedtuple(
+    'RestbusFrame_',
+    ['name', 'ecu', 'id', 'can_ext_id', 'timing_type', 'period'])
+
+
+class RestbusFrame(RestbusFrame_):
+    """A frame in the transmit plan of a :any:`Restbus`.
+
+    Attributes:
+        name(str): Name of the frame.
+        ecu(str): Name of the first emulated ECU that transmits the frame.
+        id(int): Arbitration identifier of the frame.
+        can_ext_id(bool): Whether the identifier is extended.
+        timing_type(:any:`nixnet._enums.FrmCanTiming`): Timing type of the frame.
+        period(float): Time in seconds between cyclic writes,
+            or ``None`` when the frame is only written when its payload changes.
+    """
+
+    pass
+
+
+class _Signal(object):
+    """Where a signal is placed in the payload and how its value is scaled."""
+
+    __slots__ = ['name', 'positions', 'clear_mask', 'data_type', 'num_bits', 'scale_fac', 'scale_off']
+
+    def __init__(self, signal):
+        self.name = signal.name
+        self.positions = _memory.signal_bit_positions(signal)
+        self.clear_mask = ~sum(1 << position for position in self.positions)
+        self.data_type = signal.data_type
+        self.num_bits = signal.num_bits
+        self.scale_fac = signal.scale_fac
+        self.scale_off = signal.scale_off
+
+    def pack(self, payload, value):
+        # type: (int, float) -> int
+        raw = (value - self.scale_off) / self.scale_fac
+        if self.data_type == constants.SigDataType.IEEE_FLOAT:
+            if self.num_bits == 32:
+                bits = struct.unpack('<I', struct.pack('<f', raw))[0]
+            else:
+                bits = struct.unpack('<Q', struct.pack('<d', raw))[0]
+        else:
+            bits = int(round(raw))
+            if self.data_type == constants.SigDataType.SIGNED:
+                low, high = -(1 << (self.num_bits - 1)), (1 << (self.num_bits - 1)) - 1
+            else:
+                low, high = 0, (1 << self.num_bits) - 1
+            if not low <= bits <= high:
+                raise ValueError('Value {} of signal {} is out of range'.format(value, self.name))
+        payload &= self.clear_mask
+        for index, position in enumerate(self.positions):
+            if bits >> index & 1:
+                payload |= 1 << position
+        return payload
+
+
+class _Entry(object):
+    """Transmit state of one frame."""
+
+    __slots__ = ['plan', 'frame', 'signals', 'payload', 'payload_len', 'can_frame', 'session', 'min_interval',
+                 'last_write', 'recorder']
+
+    def __init__(self, plan, frame, session):
+        self.plan = plan
+        self.frame = frame
+        self.signals = {}  # type: typing.Dict[typing.Text, _Signal]
+        self.payload_len = frame.payload_len
+        self.payload = 0
+        for index, byte in enumerate(list(frame.default_payload)[:self.payload_len]):
+            self.payload |= byte << (8 * index)
+        if plan.timing_type in _REMOTE_TIMING_TYPES:
+            frame_type = constants.FrameType.CAN_REMOTE
+        else:
+            frame_type = _DATA_FRAME_TYPES[frame.can_io_mode]
+        self.can_frame = types.CanFrame(types.CanIdentifier(plan.id, plan.can_ext_id), frame_type)
+        self.session = session
+        self.min_interval = frame.can_tx_time if plan.timing_type == constants.FrmCanTiming.EVENT_DATA else 0.0
+        self.last_write = None  # type: typing.Optional[float]
+        self.recorder = _scheduler.JitterRecorder()
+        self._update_frame()
+
+    def _update_frame(self):
+        if self.can_frame.type != constants.FrameType.CAN_REMOTE:
+            payload = self.payload
+            self.can_frame.payload = bytes(bytearray((payload >> (8 * index)) & 0xFF
+                                                     for index in range(self.payload_len)))
+
+    def set_payload(self, payload):
+        # type: (typing.Iterable[int]) -> None
+        payload = bytearray(payload)
+        if len(payload) != self.payload_len:
+            raise ValueError('Payload of frame {} must be {} bytes long, not {}'.format(
+                self.plan.name, self.payload_len, len(payload)))
+        self.payload = sum(byte << (8 * index) for index, byte in enumerate(payload))
+        self._update_frame()
+
+    def set_signal(self, name, value):
+        # type: (typing.Text, float) -> None
+        signal = self.signals.get(name)
+        if signal is None:
+            signal = self.signals[name] = _Signal(self.frame.mux_static_signals[name])
+        self.payload = signal.pack(self.payload, value)
+        self._update_frame()
+
+
+class Restbus(object):
+    """Emulate the ECUs of a CAN cluster by writing their frames from a transmit plan.
+
+    The transmit plan holds every frame an emulated ECU transmits.
+    Frames with a cyclic :any:`Frame.can_timing_type` are written every :any:`Frame.can_tx_time`,
+    and frames with an event timing type are written when their payload changes,
+    no more often than :any:`Frame.can_tx_time` for ``EVENT_DATA``.
+    Payloads start from :any:`Frame.default_payload`, and can be changed per frame or per signal.
+
+    Writes are software timed:
+    a deadline scheduler releases the frames that are due,
+    and all due frames of a session are written with one call.
+    How late each cyclic frame was written is reported by :any:`Restbus.jitter`.
+
+    Args:
+        cluster(:any:`Cluster` or :any:`MemoryCluster`): CAN cluster to emulate.
+        sessions: :any:`FrameOutSinglePointSession` or :any:`FrameOutQueuedSession` to write the frames to,
+            or a dict of such sessions by frame name,
+            for example one :any:`FrameOutQueuedSession` per frame.
+        ecus(list of str or :any:`Ecu`): ECUs to emulate. All ECUs of the cluster are emulated by default.
+        clock: Function returning the current time in seconds. Defaults to ``timeit.default_timer``.
+        sleep: Function sleeping for a number of seconds. Defaults to ``time.sleep``.
+    """
+
+    def __init__(
+            self,
+            cluster,  # type: typing.Any
+            sessions,  # type: typing.Any
+            ecus=None,  # type: typing.Optional[typing.Iterable[typing.Any]]
+            clock=None,  # type: typing.Optional[typing.Callable[[], float]]
+            sleep=None,  # type: typing.Optional[typing.Callable[[float], None]]
+    ):
+        # type: (...) -> None
+        if cluster.protocol != constants.Protocol.CAN:
+            raise ValueError('Cluster {} is not a CAN cluster'.format(cluster.name))
+        self._clock = clock or timeit.default_timer
+        self._sleep = sleep or time.sleep
+        self._scheduler = _scheduler.DeadlineScheduler()
+        self._entries = collections.OrderedDict()  # type: typing.Dict[typing.Text, _Entry]
+        self._started = False
+
+        if ecus is None:
+            ecus = list(cluster.ecus.values())
+        else:
+            ecus = [cluster.ecus[ecu] if isinstance(ecu, six.string_types) else ecu for ecu in ecus]
+        for ecu in ecus:
+            for frame in ecu.tx_frms:
+                if frame.name in self._entries:
+                    continue
+                if isinstance(sessions, dict):
+                    if frame.name not in sessions:
+                        raise ValueError('Frame {} has no session'.format(frame.name))
+                    session = sessions[frame.name]
+                else:
+                    session = sessions
+                timing_type = frame.can_timing_type
+                period = frame.can_tx_time if timing_type in _CYCLIC_TIMING_TYPES else None
+                if period is not None and not period > 0:
+                    raise ValueError('Cyclic frame {} has no transmit time'.format(frame.name))
+                plan = RestbusFrame(frame.name, ecu.name, frame.id, frame.can_ext_id, timing_type, period)
+                self._entries[frame.name] = _Entry(plan, frame, session)
+
+    @property
+    def plan(self):
+        # type: () -> typing.List[RestbusFrame]
+        """list of :any:`RestbusFrame`: Returns the transmit plan, in the order the ECUs transmit the frames."""
+        return [entry.plan for entry in self._entries.values()]
+
+    def payload(self, frame):
+        # type: (typing.Text) -> bytes
+        """Return the payload next written for ``frame``."""
+        return self._entries[frame].can_frame.payload
+
+    def set_payload(self, frame, payload):
+        # type: (typing.Text, typing.Iterable[int]) -> None
+        """Replace the payload of ``frame``.
+
+        The length of the payload must match :any:`Frame.payload_len`.
+        Frames with an event timing type are written at the next possible time.
+        """
+        entry = self._entries[frame]
+        entry.set_payload(payload)
+        self._trigger(entry)
+
+    def set_signals(self, frame, values):
+        # type: (typing.Text, typing.Dict[typing.Text, float]) -> None
+        """Set the physical values of signals in the payload of ``frame``.
+
+        Values are scaled with :any:`Signal.scale_fac` and :any:`Signal.scale_off`
+        and rounded for integer signals. A ``ValueError`` is raised when a value does not fit in its signal.
+        Frames with an event timing type are written at the next possible time.
+
+        Args:
+            frame(str): Name of the frame.
+            values(dict): Physical values by name of a static signal of the frame.
+        """
+        entry = self._entries[frame]
+        payload = entry.payload
+        try:
+            for name, value in values.items():
+                entry.set_signal(name, value)
+        except Exception:
+            entry.payload = payload
+            entry._update_frame()
+            raise
+        self._trigger(entry)
+
+    def _trigger(self, entry):
+        # type: (_Entry) -> None
+        if not self._started or entry.plan.timing_type not in _EVENT_TIMING_TYPES:
+            return
+        event = (entry.plan.name, 'event')
+        if event in self._scheduler:
+            return
+        deadline = self._clock()
+        if entry.last_write is not None:
+            deadline = max(deadline, entry.last_write + entry.min_interval)
+        self._scheduler.schedule(event, deadline)
+
+    def start(self, now=None):
+        # type: (typing.Optional[float]) -> None
+        """Schedule every cyclic frame to be written at ``now``, which defaults to the current time."""
+        if now is None:
+            now = self._clock()
+        for entry in self._entries.values():
+            if entry.plan.period is not None:
+                self._scheduler.schedule(entry.plan.name, now, entry.plan.period)
+        self._started = True
+
+    def stop(self):
+        # type: () -> None
+        """Stop writing frames. Calling :any:`Restbus.start` again restarts the cyclic frames."""
+        for entry in self._entries.values():
+            self._scheduler.cancel(entry.plan.name)
+            self._scheduler.cancel((entry.plan.name, 'event'))
+        self._started = False
+
+    def next_deadline(self):
+        # type: () -> typing.Optional[float]
+        """Return the time the next frame is due, or ``None`` when no frame is scheduled."""
+        return self._scheduler.next_deadline()
+
+    def step(self, now=None):
+        # type: (typing.Optional[float]) -> int
+        """Write the frames due at ``now``, which defaults to the current time.
+
+        Returns the number of frames written.
+        """
+        if now is None:
+            now = self._clock()
+        writes = collections.OrderedDict()  # type: typing.Dict[int, typing.Tuple[typing.Any, typing.List]]
+        written = set()
+        for key, deadline, missed in self._scheduler.pop_due(now, _scheduler.COALESCE_TIME):
+            if isinstance(key, tuple):
+                entry = self._entries[key[0]]
+            else:
+                entry = self._entries[key]
+                entry.recorder.add(now - deadline, missed)
+            if entry.plan.name in written:
+                continue
+            written.add(entry.plan.name)
+            entry.last_write = now
+            session = entry.session
+            writes.setdefault(id(session), (session, []))[1].append(entry.can_frame)
+        for session, frames in writes.values():
+            session.frames.write(frames)
+        return len(written)
+
+    def run(self, duration):
+        # type: (float) -> None
+        """Write frames as they become due for ``duration`` seconds, starting if needed."""
+        end = self._clock() + duration
+        if not self._started:
+            self.start()
+        while True:
+            now = self._clock()
+            if now >= end:
+                break
+            self.step(now)
+            deadline = self.next_deadline()
+            wake = end if deadline is None else min(deadline, end)
+            delay = wake - self._clock()
+            if delay > 0:
+                self._sleep(delay)
+
+    def jitter(self):
+        # type: () -> typing.Dict[typing.Text, types.JitterStats]
+        """Return the :any:`nixnet.types.JitterStats` of every cyclic frame by name."""
+        return collections.OrderedDict(
+            (entry.plan.name, entry.recorder.stats())
+            for entry in self._entries.values()
+            if entry.plan.period is not None)
@@ -13,6 +13,11 @@ from nixnet import _errors
 from nixnet import _py2
 from nixnet import constants
 
+try:
+    import numpy  # type: ignore
+except ImportError:
+    numpy = None
+
 __all__ = [
     'DriverVersion',
     'CanComm',
@@ -29,7 +34,9 @@ __all__ = [
     'LogTriggerFrame',
     'StartTriggerFrame',
     'XnetFrame',
-    'PduProperties']
+    'FrameBatch',
+    'PduProperties',
+    'JitterStats']
 
 
 DriverVersion_ = collections.namedtuple(
@@ -172,6 +179,32 @@ class PduProperties(PduProperties_):
     """
 
 
+JitterStats_ = collections.namedtuple(
+    'JitterStats_',
+    ['count', 'missed', 'min', 'max', 'mean', 'std'])
+
+
+class JitterStats(JitterStats_):
+    """Timing of the writes of one software-timed cyclic frame.
+
+    Lateness is the time in seconds from when a frame was due to when it was written.
+
+    Attributes:
+        count (int): Number of times the frame was written on time or late.
+        missed (int): Number of periods skipped because the frame was more than a period late.
+        min (float): Smallest lateness, or ``0.0`` when ``count`` is ``0``.
+        max (float): Largest lateness, or ``0.0`` when ``count`` is ``0``.
+        mean (float): Mean lateness, or ``0.0`` when ``count`` is ``0``.
+        std (float): Standard deviation of the lateness, or ``0.0`` when ``count`` is ``0``.
+    """
+
+    @property
+    def peak_to_peak(self):
+        # type: () -> float
+        """float: Returns the largest change of lateness, which bounds the period jitter."""
+        return self.max - self.min
+
+
 class CanIdentifier(object):
     """CAN frame arbitration identifier.
 
@@ -1042,3 +1075,304 @@ class XnetFrame(FrameFactory):
         if frame_type is None:
             raise NotImplementedError("Unsupported frame type", frame.type)
         return frame_type.from_raw(frame)
+
+
+if numpy is not None:
+    # Timestamp, identifier, type, flags, info and payload length of a base unit, before its payload.
+    _HEADER_DTYPE = numpy.dtype([
+        ('timestamp', '<u8'),
+        ('identifier', '<u4'),
+        ('type', 'u1'),
+        ('flags', 'u1'),
+        ('info', 'u1'),
+        ('payload_length', 'u1')])
+    _HEADER_SIZE = _HEADER_DTYPE.itemsize
+    _WORD_SIZE = 8
+    # A base unit, the whole frame when the payload fits in its 8 bytes.
+    _UNIT_DTYPE = numpy.dtype(_HEADER_DTYPE.descr + [('payload', 'u1', (_WORD_SIZE,))])
+
+
+class FrameBatch(object):
+    """Frames stored column by column in NumPy arrays.
+
+    A batch holds one array per frame field and the payloads in one byte array,
+    so millions of frames take about 25 bytes each plus their payloads,
+    instead of a Python object per frame and field.
+    Frame objects are only created when the batch is indexed or iterated.
+
+    Indexing with an integer returns a :any:`nixnet.types.RawFrame`.
+    Indexing with a slice, a boolean mask or an array of indexes returns a new batch
+    that shares the payload bytes, and a slice also shares the field arrays.
+
+    Requires NumPy.
+
+    Attributes:
+        timestamps(numpy.ndarray): ``uint64`` timestamps.
+        identifiers(numpy.ndarray): ``uint32`` raw frame identifiers.
+        frame_types(numpy.ndarray): ``uint8`` :any:`nixnet._enums.FrameType` values.
+        flags(numpy.ndarray): ``uint8`` flags that qualify the types.
+        info(numpy.ndarray): ``uint8`` info that qualify the types.
+        payload_data(numpy.ndarray): ``uint8`` bytes holding the payloads.
+        payload_offsets(numpy.ndarray): ``int64`` start of every payload in ``payload_data``.
+        payload_lengths(numpy.ndarray): ``uint16`` length of every payload.
+    """
+
+    __slots__ = [
+        "timestamps",
+        "identifiers",
+        "frame_types",
+        "flags",
+        "info",
+        "payload_data",
+        "payload_offsets",
+        "payload_lengths"]
+
+    def __init__(
+            self,
+            timestamps,
+            identifiers,
+            frame_types,
+            flags,
+            info,
+            payload_data,
+            payload_offsets,
+            payload_lengths):
+        # type: (typing.Any, typing.Any, typing.Any, typing.Any, typing.Any, typing.Any, typing.Any, typing.Any) -> None
+        if numpy is None:
+            raise ImportError('FrameBatch requires NumPy')
+        self.timestamps = numpy.asarray(timestamps, numpy.uint64)
+        self.identifiers = numpy.asarray(identifiers, numpy.uint32)
+        self.frame_types = numpy.asarray(frame_types, numpy.uint8)
+        self.flags = numpy.asarray(flags, numpy.uint8)
+        self.info = numpy.asarray(info, numpy.uint8)
+        self.payload_data = numpy.asarray(payload_data, numpy.uint8)
+        self.payload_offsets = numpy.asarray(payload_offsets, numpy.int64)
+        self.payload_lengths = numpy.asarray(payload_lengths, numpy.uint16)
+        count = len(self.timestamps)
+        if any(len(column) != count for column in self._columns()):
+            raise ValueError('FrameBatch columns must have the same length')
+
+    @classmethod
+    def from_bytes(cls, frame_bytes):
+        # type: (typing.Any) -> FrameBatch
+        """Create a batch from frames in the raw frame format.
+
+        The payloads stay in ``frame_bytes``, which the batch views without copying.
+
+        Args:
+            frame_bytes(bytes): Frames as returned by :any:`InFrames.read_bytes`.
+        """
+        if numpy is None:
+            raise ImportError('FrameBatch requires NumPy')
+        raw = numpy.frombuffer(frame_bytes, numpy.uint8)
+        if len(raw) % _UNIT_DTYPE.itemsize == 0:
+            units = raw.view(_UNIT_DTYPE)
+            lengths = _payload_lengths(units)
+            if (lengths <= _WORD_SIZE).all():
+                # Every frame is one base unit, so the fields are read in place.
+                return cls(
+                    units['timestamp'],
+                    units['identifier'],
+                    units['type'],
+                    units['flags'],
+                    units['info'],
+                    raw,
+                    numpy.arange(len(units), dtype=numpy.int64) * _UNIT_DTYPE.itemsize + _HEADER_SIZE,
+                    lengths)
+        offsets = _frame_offsets(raw)
+        headers = raw[offsets[:, None] + numpy.arange(_HEADER_SIZE)].view(_HEADER_DTYPE).reshape(-1)
+        return cls(
+            headers['timestamp'],
+            headers['identifier'],
+            headers['type'],
+            headers['flags'],
+            headers['info'],
+            raw,
+            offsets + _HEADER_SIZE,
+            _payload_lengths(headers))
+
+    @classmethod
+    def from_frames(cls, frames):
+        # type: (typing.Iterable[typing.Any]) -> FrameBatch
+        """Create a batch from frame objects, such as :any:`nixnet.types.CanFrame` objects.
+
+        Args:
+            frames(iterable of :any:`nixnet.types.Frame`): Frames with a ``to_raw`` method.
+        """
+        if numpy is None:
+            raise ImportError('FrameBatch requires NumPy')
+        raws = [frame.to_raw() for frame in frames]
+        payloads = [bytes(raw.payload) for raw in raws]
+        lengths = numpy.array([len(payload) for payload in payloads], numpy.int64)
+        return cls(
+            [raw.timestamp for raw in raws],
+            [int(raw.identifier) for raw in raws],
+            [raw.type.value for raw in raws],
+            [raw.flags for raw in raws],
+            [raw.info for raw in raws],
+            numpy.frombuffer(b''.join(payloads), numpy.uint8),
+            numpy.cumsum(lengths) - lengths,
+            lengths)
+
+    def to_bytes(self):
+        # type: () -> bytes
+        """Return the frames in the raw frame format.
+
+        The buffer can be written with :any:`OutFrames.write_bytes`.
+        """
+        lengths = self.payload_lengths.astype(numpy.int64)
+        j1939 = self.frame_types == _cconsts.NX_FRAME_TYPE_J1939_DATA
+        high_lengths = lengths >> 8
+        if (high_lengths[~j1939] != 0).any():
+            _errors.check_for_error(_cconsts.NX_ERR_NON_J1939_FRAME_SIZE)
+        if (high_lengths & ~_cconsts.NX_FRAME_PAYLD_LEN_HIGH_MASK_J1939).any():
+            _errors.check_for_error(_cconsts.NX_ERR_FRAME_WRITE_TOO_LARGE)
+
+        payloads = self.payload_data[_gather(self.payload_offsets, lengths)]
+        if (lengths <= _WORD_SIZE).all():
+            # Every frame is one base unit.
+            units = numpy.zeros(len(self), _UNIT_DTYPE)
+            _set_header(units, self, lengths)
+            units['payload'][numpy.arange(_WORD_SIZE) < lengths[:, None]] = payloads
+            return units.tobytes()
+
+        headers = numpy.zeros(len(self), _HEADER_DTYPE)
+        _set_header(headers, self, lengths)
+
+        # Payloads are padded to whole 8 byte words, with at least one word in the base unit.
+        sizes = _HEADER_SIZE + numpy.maximum(_WORD_SIZE, -(-lengths // _WORD_SIZE) * _WORD_SIZE)
+        starts = numpy.cumsum(sizes) - sizes
+        data = numpy.zeros(int(sizes.sum()), numpy.uint8)
+        data[starts[:, None] + numpy.arange(_HEADER_SIZE)] = headers.view(numpy.uint8).reshape(-1, _HEADER_SIZE)
+        data[_gather(starts + _HEADER_SIZE, lengths)] = payloads
+        return data.tobytes()
+
+    def frames(self, frame_type=XnetFrame):
+        # type: (typing.Any) -> typing.Iterator[typing.Any]
+        """Yield the frames created by a frame factory, one at a time.
+
+        Args:
+            frame_type(:any:`nixnet.types.FrameFactory`): A factory for the
+                desired frame formats.
+        """
+        from_raw = frame_type.from_raw
+        for frame in self:
+            yield from_raw(frame)
+
+    def payload(self, index):
+        # type: (int) -> bytes
+        """Return the payload of a frame."""
+        offset = int(self.payload_offsets[index])
+        return self.payload_data[offset:offset + int(self.payload_lengths[index])].tobytes()
+
+    def _columns(self):
+        # type: () -> typing.List[typing.Any]
+        return [
+            self.timestamps, self.identifiers, self.frame_types, self.flags, self.info,
+            self.payload_offsets, self.payload_lengths]
+
+    def __len__(self):
+        # type: () -> int
+        return len(self.timestamps)
+
+    def __getitem__(self, key):
+        # type: (typing.Any) -> typing.Any
+        if isinstance(key, six.integer_types + (numpy.integer,)):
+            offset = int(self.payload_offsets[key])
+            return RawFrame(
+                int(self.timestamps[key]),
+                int(self.identifiers[key]),
+                constants.FrameType(int(self.frame_types[key])),
+                int(self.flags[key]),
+                int(self.info[key]),
+                self.payload_data[offset:offset + int(self.payload_lengths[key])].tobytes())
+        columns = [column[key] for column in self._columns()]
+        return FrameBatch(*(columns[:5] + [self.payload_data] + columns[5:]))
+
+    def __iter__(self):
+        # type: () -> typing.Iterator[RawFrame]
+        payload_data = self.payload_data
+        columns = six.moves.zip(
+            self.timestamps.tolist(), self.identifiers.tolist(), self.frame_types.tolist(), self.flags.tolist(),
+            self.info.tolist(), self.payload_offsets.tolist(), self.payload_lengths.tolist())
+        for timestamp, identifier, frame_type, flags, info, offset, length in columns:
+            yield RawFrame(
+                timestamp, identifier, constants.FrameType(frame_type), flags, info,
+                payload_data[offset:offset + length].tobytes())
+
+    def __repr__(self):
+        # type: () -> typing.Text
+        return "{}(len={})".format(type(self).__name__, len(self))
+
+
+def _set_header(headers, batch, lengths):
+    # type: (typing.Any, FrameBatch, typing.Any) -> None
+    """Set the header fields of base units, with the high bits of J1939 lengths in info."""
+    headers['timestamp'] = batch.timestamps
+    headers['identifier'] = batch.identifiers
+    headers['type'] = batch.frame_types
+    headers['flags'] = batch.flags
+    j1939 = batch.frame_types == _cconsts.NX_FRAME_TYPE_J1939_DATA
+    info = batch.info.copy()
+    high = (lengths[j1939] >> 8).astype(numpy.uint8)
+    info[j1939] = (info[j1939] & (0xFF ^ _cconsts.NX_FRAME_PAYLD_LEN_HIGH_MASK_J1939)) | high
+    headers['info'] = info
+    headers['payload_length'] = lengths & 0xFF
+
+
+def _payload_lengths(headers):
+    # type: (typing.Any) -> typing.Any
+    """Return the payload lengths of base units, with the high bits of J1939 lengths from info."""
+    lengths = headers['payload_length'].astype(numpy.uint16)
+    j1939 = headers['type'] == _cconsts.NX_FRAME_TYPE_J1939_DATA
+    high = (headers['info'] & _cconsts.NX_FRAME_PAYLD_LEN_HIGH_MASK_J1939).astype(numpy.uint16) << 8
+    lengths[j1939] |= high[j1939]
+    return lengths
+
+
+def _gather(starts, lengths):
+    # type: (typing.Any, typing.Any) -> typing.Any
+    """Return the indexes of ``lengths[i]`` consecutive bytes from every ``starts[i]``."""
+    ends = numpy.cumsum(lengths)
+    return numpy.arange(int(ends[-1]) if len(ends) else 0) + numpy.repeat(starts - (ends - lengths), lengths)
+
+
+def _frame_offsets(raw):
+    # type: (typing.Any) -> typing.Any
+    """Return the byte offset of every frame of a raw frame buffer as a NumPy array.
+
+    Frames are whole 8 byte words, so a frame could start at every word.
+    The size of the frame starting at each word gives the word after it,
+    and the words reachable from the first one are found by doubling the jumps,
+    in about log2(frames) array operations.
+    """
+    size = len(raw)
+    if size % _WORD_SIZE:
+        _errors.check_for_error(_cconsts.NX_ERR_INTERNAL_ERROR)
+    words = size // _WORD_SIZE
+    if not words:
+        return numpy.zeros(0, numpy.int64)
+    index_type = numpy.int32 if words < 1 << 30 else numpy.int64
+    # The type, info and payload length are the last bytes of the second word of a base unit.
+    tails = raw.reshape(words, _WORD_SIZE)[1:].astype(index_type)
+    lengths = tails[:, 7]
+    j1939 = tails[:, 4] == _cconsts.NX_FRAME_TYPE_J1939_DATA
+    lengths[j1939] |= (tails[j1939, 6] & _cconsts.NX_FRAME_PAYLD_LEN_HIGH_MASK_J1939) << 8
+
+    # Word ``words`` is the end of the buffer, and ``words + 1`` is past the end of a frame too long for it.
+    end = words
+    past_end = words + 1
+    jumps = numpy.empty(words + 2, index_type)
+    jumps[:words - 1] = numpy.arange(2, words + 1, dtype=index_type) + numpy.maximum(1, (lengths + 7) >> 3)
+    jumps[words - 1:words] = past_end
+    jumps[:words][jumps[:words] > end] = past_end
+    jumps[words:] = [end, past_end]
+    # The first 2**k frames, in order, and the word 2**k frames after every word.
+    starts = numpy.zeros(1, index_type)
+    while jumps[0] < end:
+        stepped = jumps[starts]
+        starts = numpy.concatenate((starts, stepped[stepped < end]))
+        jumps = jumps[jumps]
+    if jumps[0] != end:
+        _errors.check_for_error(_cconsts.NX_ERR_INTERNAL_ERROR)
+    return starts.astype(numpy.int64) * _WORD_SIZE
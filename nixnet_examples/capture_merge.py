@@ -0,0 +1,32 @@
+"""Merge capture files from several interfaces into one capture file in timestamp order.
+
+Usage::
+
+    python -m nixnet_examples.capture_merge merged.nxcap can1.nxcap can2.nxcap log.blf [--compression zlib]
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import argparse
+import time
+
+from nixnet import capture
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('output', help='Capture file to create')
+    parser.add_argument('sources', nargs='+', help='Capture, BLF, MDF or ASC files to merge')
+    parser.add_argument('--compression', default=None, help='Block compression, such as zlib (default: none)')
+    args = parser.parse_args(argv)
+
+    start = time.time()
+    merger = capture.CaptureMerger(args.sources)
+    num_frames = merger.write(args.output, compression=args.compression)
+    print('Merged {} frames from {} files in {:.1f} s.'.format(num_frames, len(args.sources), time.time() - start))
+
+
+if __name__ == '__main__':
+    main()
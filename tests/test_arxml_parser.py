@@ -0,0 +1,616 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import io
+import pytest  # type: ignore
+
+from nixnet import _cconsts
+from nixnet import constants
+from nixnet import database
+from nixnet import errors
+
+
+_ARXML = u'''<?xml version="1.0" encoding="UTF-8"?>
+<AUTOSAR xmlns="http://autosar.org/schema/r4.0" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">
+  <AR-PACKAGES>
+    <AR-PACKAGE>
+      <SHORT-NAME>Topology</SHORT-NAME>
+      <ELEMENTS>
+        <FLEXRAY-CLUSTER>
+          <SHORT-NAME>Chassis</SHORT-NAME>
+          <FLEXRAY-CLUSTER-VARIANTS>
+            <FLEXRAY-CLUSTER-CONDITIONAL>
+              <BAUDRATE>10000000</BAUDRATE>
+              <PHYSICAL-CHANNELS>
+                <FLEXRAY-PHYSICAL-CHANNEL>
+                  <SHORT-NAME>ChannelA</SHORT-NAME>
+                  <COMM-CONNECTORS>
+                    <COMMUNICATION-CONNECTOR-REF-CONDITIONAL>
+                      <COMMUNICATION-CONNECTOR-REF DEST="FLEXRAY-COMMUNICATION-CONNECTOR"
+                        >/Ecus/Engine/EngineA</COMMUNICATION-CONNECTOR-REF>
+                    </COMMUNICATION-CONNECTOR-REF-CONDITIONAL>
+                  </COMM-CONNECTORS>
+                  <FRAME-TRIGGERINGS>
+                    <FLEXRAY-FRAME-TRIGGERING>
+                      <SHORT-NAME>EngineStatusA</SHORT-NAME>
+                      <FRAME-PORT-REFS>
+                        <FRAME-PORT-REF DEST="FRAME-PORT">/Ecus/Engine/EngineA/EngineStatusOut</FRAME-PORT-REF>
+                      </FRAME-PORT-REFS>
+                      <FRAME-REF DEST="FLEXRAY-FRAME">/Frames/EngineStatus</FRAME-REF>
+                      <ABSOLUTELY-SCHEDULED-TIMINGS>
+                        <FLEXRAY-ABSOLUTELY-SCHEDULED-TIMING>
+                          <COMMUNICATION-CYCLE>
+                            <CYCLE-REPETITION>
+                              <BASE-CYCLE>0</BASE-CYCLE>
+                              <CYCLE-REPETITION>CYCLE-REPETITION-1</CYCLE-REPETITION>
+                            </CYCLE-REPETITION>
+                          </COMMUNICATION-CYCLE>
+                          <SLOT-ID>1</SLOT-ID>
+                        </FLEXRAY-ABSOLUTELY-SCHEDULED-TIMING>
+                      </ABSOLUTELY-SCHEDULED-TIMINGS>
+                      <PAYLOAD-PREAMBLE-INDICATOR>true</PAYLOAD-PREAMBLE-INDICATOR>
+                    </FLEXRAY-FRAME-TRIGGERING>
+                    <FLEXRAY-FRAME-TRIGGERING>
+                      <SHORT-NAME>DiagnosticsA</SHORT-NAME>
+                      <FRAME-PORT-REFS>
+                        <FRAME-PORT-REF DEST="FRAME-PORT">/Ecus/Engine/EngineA/DiagnosticsIn</FRAME-PORT-REF>
+                      </FRAME-PORT-REFS>
+                      <FRAME-REF DEST="FLEXRAY-FRAME">/Frames/Diagnostics</FRAME-REF>
+                      <ABSOLUTELY-SCHEDULED-TIMINGS>
+                        <FLEXRAY-ABSOLUTELY-SCHEDULED-TIMING>
+                          <COMMUNICATION-CYCLE>
+                            <CYCLE-COUNTER>
+                              <CYCLE-COUNTER>5</CYCLE-COUNTER>
+                            </CYCLE-COUNTER>
+                          </COMMUNICATION-CYCLE>
+                          <SLOT-ID>2</SLOT-ID>
+                        </FLEXRAY-ABSOLUTELY-SCHEDULED-TIMING>
+                      </ABSOLUTELY-SCHEDULED-TIMINGS>
+                    </FLEXRAY-FRAME-TRIGGERING>
+                  </FRAME-TRIGGERINGS>
+                  <CHANNEL-NAME>CHANNEL-A</CHANNEL-NAME>
+                </FLEXRAY-PHYSICAL-CHANNEL>
+                <FLEXRAY-PHYSICAL-CHANNEL>
+                  <SHORT-NAME>ChannelB</SHORT-NAME>
+                  <COMM-CONNECTORS>
+                    <COMMUNICATION-CONNECTOR-REF-CONDITIONAL>
+                      <COMMUNICATION-CONNECTOR-REF DEST="FLEXRAY-COMMUNICATION-CONNECTOR"
+                        >/Ecus/Engine/EngineB</COMMUNICATION-CONNECTOR-REF>
+                    </COMMUNICATION-CONNECTOR-REF-CONDITIONAL>
+                  </COMM-CONNECTORS>
+                  <FRAME-TRIGGERINGS>
+                    <FLEXRAY-FRAME-TRIGGERING>
+                      <SHORT-NAME>EngineStatusB</SHORT-NAME>
+                      <FRAME-REF DEST="FLEXRAY-FRAME">/Frames/EngineStatus</FRAME-REF>
+                      <ABSOLUTELY-SCHEDULED-TIMINGS>
+                        <FLEXRAY-ABSOLUTELY-SCHEDULED-TIMING>
+                          <COMMUNICATION-CYCLE>
+                            <CYCLE-REPETITION>
+                              <BASE-CYCLE>0</BASE-CYCLE>
+                              <CYCLE-REPETITION>CYCLE-REPETITION-1</CYCLE-REPETITION>
+                            </CYCLE-REPETITION>
+                          </COMMUNICATION-CYCLE>
+                          <SLOT-ID>1</SLOT-ID>
+                        </FLEXRAY-ABSOLUTELY-SCHEDULED-TIMING>
+                      </ABSOLUTELY-SCHEDULED-TIMINGS>
+                    </FLEXRAY-FRAME-TRIGGERING>
+                  </FRAME-TRIGGERINGS>
+                  <CHANNEL-NAME>CHANNEL-B</CHANNEL-NAME>
+                </FLEXRAY-PHYSICAL-CHANNEL>
+              </PHYSICAL-CHANNELS>
+              <ACTION-POINT-OFFSET>4</ACTION-POINT-OFFSET>
+              <CAS-RX-LOW-MAX>87</CAS-RX-LOW-MAX>
+              <COLD-START-ATTEMPTS>8</COLD-START-ATTEMPTS>
+              <CYCLE>0.005</CYCLE>
+              <DYNAMIC-SLOT-IDLE-PHASE>1</DYNAMIC-SLOT-IDLE-PHASE>
+              <LISTEN-NOISE>2</LISTEN-NOISE>
+              <MACRO-PER-CYCLE>5000</MACRO-PER-CYCLE>
+              <MACROTICK-DURATION>1.0E-6</MACROTICK-DURATION>
+              <MINISLOT-ACTION-POINT-OFFSET>2</MINISLOT-ACTION-POINT-OFFSET>
+              <MINISLOT-DURATION>6</MINISLOT-DURATION>
+              <NETWORK-IDLE-TIME>30</NETWORK-IDLE-TIME>
+              <NUMBER-OF-MINISLOTS>300</NUMBER-OF-MINISLOTS>
+              <NUMBER-OF-STATIC-SLOTS>60</NUMBER-OF-STATIC-SLOTS>
+              <PAYLOAD-LENGTH-STATIC>8</PAYLOAD-LENGTH-STATIC>
+              <STATIC-SLOT-DURATION>50</STATIC-SLOT-DURATION>
+              <SYMBOL-WINDOW>10</SYMBOL-WINDOW>
+              <SYNC-FRAME-ID-COUNT-MAX>8</SYNC-FRAME-ID-COUNT-MAX>
+              <TRANSMISSION-START-SEQUENCE-DURATION>9</TRANSMISSION-START-SEQUENCE-DURATION>
+              <WAKEUP-RX-WINDOW>301</WAKEUP-RX-WINDOW>
+              <WAKEUP-TX-ACTIVE>60</WAKEUP-TX-ACTIVE>
+            </FLEXRAY-CLUSTER-CONDITIONAL>
+          </FLEXRAY-CLUSTER-VARIANTS>
+        </FLEXRAY-CLUSTER>
+        <CAN-CLUSTER>
+          <SHORT-NAME>Body</SHORT-NAME>
+          <CAN-CLUSTER-VARIANTS>
+            <CAN-CLUSTER-CONDITIONAL>
+              <BAUDRATE>500000</BAUDRATE>
+              <PHYSICAL-CHANNELS>
+                <CAN-PHYSICAL-CHANNEL>
+                  <SHORT-NAME>BodyCAN</SHORT-NAME>
+                  <FRAME-TRIGGERINGS>
+                    <CAN-FRAME-TRIGGERING>
+                      <SHORT-NAME>DoorStatus</SHORT-NAME>
+                      <FRAME-REF DEST="CAN-FRAME">/Frames/DoorStatus</FRAME-REF>
+                      <CAN-ADDRESSING-MODE>EXTENDED</CAN-ADDRESSING-MODE>
+                      <CAN-FRAME-TX-BEHAVIOR>CAN-FD</CAN-FRAME-TX-BEHAVIOR>
+                      <IDENTIFIER>419364880</IDENTIFIER>
+                    </CAN-FRAME-TRIGGERING>
+                  </FRAME-TRIGGERINGS>
+                </CAN-PHYSICAL-CHANNEL>
+              </PHYSICAL-CHANNELS>
+              <CAN-FD-BAUDRATE>2000000</CAN-FD-BAUDRATE>
+            </CAN-CLUSTER-CONDITIONAL>
+          </CAN-CLUSTER-VARIANTS>
+        </CAN-CLUSTER>
+      </ELEMENTS>
+    </AR-PACKAGE>
+    <AR-PACKAGE>
+      <SHORT-NAME>Ecus</SHORT-NAME>
+      <ELEMENTS>
+        <ECU-INSTANCE>
+          <SHORT-NAME>Engine</SHORT-NAME>
+          <COMM-CONTROLLERS>
+            <FLEXRAY-COMMUNICATION-CONTROLLER>
+              <SHORT-NAME>EngineController</SHORT-NAME>
+              <FLEXRAY-COMMUNICATION-CONTROLLER-VARIANTS>
+                <FLEXRAY-COMMUNICATION-CONTROLLER-CONDITIONAL>
+                  <KEY-SLOT-ID>1</KEY-SLOT-ID>
+                  <KEY-SLOT-USED-FOR-START-UP>true</KEY-SLOT-USED-FOR-START-UP>
+                  <KEY-SLOT-USED-FOR-SYNC>true</KEY-SLOT-USED-FOR-SYNC>
+                </FLEXRAY-COMMUNICATION-CONTROLLER-CONDITIONAL>
+              </FLEXRAY-COMMUNICATION-CONTROLLER-VARIANTS>
+            </FLEXRAY-COMMUNICATION-CONTROLLER>
+          </COMM-CONTROLLERS>
+          <CONNECTORS>
+            <FLEXRAY-COMMUNICATION-CONNECTOR>
+              <SHORT-NAME>EngineA</SHORT-NAME>
+              <ECU-COMM-PORT-INSTANCES>
+                <FRAME-PORT>
+                  <SHORT-NAME>EngineStatusOut</SHORT-NAME>
+                  <COMMUNICATION-DIRECTION>OUT</COMMUNICATION-DIRECTION>
+                </FRAME-PORT>
+                <FRAME-PORT>
+                  <SHORT-NAME>DiagnosticsIn</SHORT-NAME>
+                  <COMMUNICATION-DIRECTION>IN</COMMUNICATION-DIRECTION>
+                </FRAME-PORT>
+              </ECU-COMM-PORT-INSTANCES>
+            </FLEXRAY-COMMUNICATION-CONNECTOR>
+            <FLEXRAY-COMMUNICATION-CONNECTOR>
+              <SHORT-NAME>EngineB</SHORT-NAME>
+            </FLEXRAY-COMMUNICATION-CONNECTOR>
+          </CONNECTORS>
+        </ECU-INSTANCE>
+      </ELEMENTS>
+    </AR-PACKAGE>
+    <AR-PACKAGE>
+      <SHORT-NAME>Frames</SHORT-NAME>
+      <ELEMENTS>
+        <FLEXRAY-FRAME>
+          <SHORT-NAME>EngineStatus</SHORT-NAME>
+          <FRAME-LENGTH>8</FRAME-LENGTH>
+          <PDU-TO-FRAME-MAPPINGS>
+            <PDU-TO-FRAME-MAPPING>
+              <SHORT-NAME>EnginePdu</SHORT-NAME>
+              <PACKING-BYTE-ORDER>MOST-SIGNIFICANT-BYTE-LAST</PACKING-BYTE-ORDER>
+              <PDU-REF DEST="I-SIGNAL-I-PDU">/Pdus/EnginePdu</PDU-REF>
+              <START-POSITION>0</START-POSITION>
+              <UPDATE-INDICATION-BIT-POSITION>39</UPDATE-INDICATION-BIT-POSITION>
+            </PDU-TO-FRAME-MAPPING>
+          </PDU-TO-FRAME-MAPPINGS>
+        </FLEXRAY-FRAME>
+        <FLEXRAY-FRAME>
+          <SHORT-NAME>Diagnostics</SHORT-NAME>
+          <FRAME-LENGTH>4</FRAME-LENGTH>
+          <PDU-TO-FRAME-MAPPINGS>
+            <PDU-TO-FRAME-MAPPING>
+              <SHORT-NAME>DiagPdu</SHORT-NAME>
+              <PDU-REF DEST="MULTIPLEXED-I-PDU">/Pdus/DiagPdu</PDU-REF>
+              <START-POSITION>0</START-POSITION>
+            </PDU-TO-FRAME-MAPPING>
+          </PDU-TO-FRAME-MAPPINGS>
+        </FLEXRAY-FRAME>
+        <CAN-FRAME>
+          <SHORT-NAME>DoorStatus</SHORT-NAME>
+          <FRAME-LENGTH>12</FRAME-LENGTH>
+          <PDU-TO-FRAME-MAPPINGS>
+            <PDU-TO-FRAME-MAPPING>
+              <SHORT-NAME>DoorPdu</SHORT-NAME>
+              <PDU-REF DEST="I-SIGNAL-I-PDU">/Pdus/DoorPdu</PDU-REF>
+              <START-POSITION>0</START-POSITION>
+            </PDU-TO-FRAME-MAPPING>
+          </PDU-TO-FRAME-MAPPINGS>
+        </CAN-FRAME>
+      </ELEMENTS>
+    </AR-PACKAGE>
+    <AR-PACKAGE>
+      <SHORT-NAME>Pdus</SHORT-NAME>
+      <ELEMENTS>
+        <I-SIGNAL-I-PDU>
+          <SHORT-NAME>EnginePdu</SHORT-NAME>
+          <LENGTH>4</LENGTH>
+          <I-PDU-TIMING-SPECIFICATIONS>
+            <I-PDU-TIMING>
+              <TRANSMISSION-MODE-DECLARATION>
+                <TRANSMISSION-MODE-TRUE-TIMING>
+                  <CYCLIC-TIMING>
+                    <TIME-PERIOD>
+                      <VALUE>0.005</VALUE>
+                    </TIME-PERIOD>
+                  </CYCLIC-TIMING>
+                </TRANSMISSION-MODE-TRUE-TIMING>
+              </TRANSMISSION-MODE-DECLARATION>
+            </I-PDU-TIMING>
+          </I-PDU-TIMING-SPECIFICATIONS>
+          <I-SIGNAL-TO-PDU-MAPPINGS>
+            <I-SIGNAL-TO-I-PDU-MAPPING>
+              <SHORT-NAME>EngineSpeed</SHORT-NAME>
+              <I-SIGNAL-REF DEST="I-SIGNAL">/Signals/EngineSpeed</I-SIGNAL-REF>
+              <PACKING-BYTE-ORDER>MOST-SIGNIFICANT-BYTE-LAST</PACKING-BYTE-ORDER>
+              <START-POSITION>0</START-POSITION>
+            </I-SIGNAL-TO-I-PDU-MAPPING>
+            <I-SIGNAL-TO-I-PDU-MAPPING>
+              <SHORT-NAME>CoolantTemp</SHORT-NAME>
+              <I-SIGNAL-REF DEST="I-SIGNAL">/Signals/CoolantTemp</I-SIGNAL-REF>
+              <PACKING-BYTE-ORDER>MOST-SIGNIFICANT-BYTE-LAST</PACKING-BYTE-ORDER>
+              <START-POSITION>16</START-POSITION>
+            </I-SIGNAL-TO-I-PDU-MAPPING>
+          </I-SIGNAL-TO-PDU-MAPPINGS>
+        </I-SIGNAL-I-PDU>
+        <MULTIPLEXED-I-PDU>
+          <SHORT-NAME>DiagPdu</SHORT-NAME>
+          <LENGTH>4</LENGTH>
+          <DYNAMIC-PARTS>
+            <DYNAMIC-PART>
+              <DYNAMIC-PART-ALTERNATIVES>
+                <DYNAMIC-PART-ALTERNATIVE>
+                  <I-PDU-REF DEST="I-SIGNAL-I-PDU">/Pdus/Errors</I-PDU-REF>
+                  <INITIAL-DYNAMIC-PART>true</INITIAL-DYNAMIC-PART>
+                  <SELECTOR-FIELD-CODE>1</SELECTOR-FIELD-CODE>
+                </DYNAMIC-PART-ALTERNATIVE>
+                <DYNAMIC-PART-ALTERNATIVE>
+                  <I-PDU-REF DEST="I-SIGNAL-I-PDU">/Pdus/Version</I-PDU-REF>
+                  <INITIAL-DYNAMIC-PART>false</INITIAL-DYNAMIC-PART>
+                  <SELECTOR-FIELD-CODE>2</SELECTOR-FIELD-CODE>
+                </DYNAMIC-PART-ALTERNATIVE>
+              </DYNAMIC-PART-ALTERNATIVES>
+            </DYNAMIC-PART>
+          </DYNAMIC-PARTS>
+          <SELECTOR-FIELD-BYTE-ORDER>MOST-SIGNIFICANT-BYTE-LAST</SELECTOR-FIELD-BYTE-ORDER>
+          <SELECTOR-FIELD-LENGTH>8</SELECTOR-FIELD-LENGTH>
+          <SELECTOR-FIELD-START-POSITION>0</SELECTOR-FIELD-START-POSITION>
+          <STATIC-PARTS>
+            <STATIC-PART>
+              <I-PDU-REF DEST="I-SIGNAL-I-PDU">/Pdus/Counter</I-PDU-REF>
+            </STATIC-PART>
+          </STATIC-PARTS>
+        </MULTIPLEXED-I-PDU>
+        <I-SIGNAL-I-PDU>
+          <SHORT-NAME>Errors</SHORT-NAME>
+          <LENGTH>4</LENGTH>
+          <I-SIGNAL-TO-PDU-MAPPINGS>
+            <I-SIGNAL-TO-I-PDU-MAPPING>
+              <SHORT-NAME>ErrorCount</SHORT-NAME>
+              <I-SIGNAL-REF DEST="I-SIGNAL">/Signals/ErrorCount</I-SIGNAL-REF>
+              <START-POSITION>8</START-POSITION>
+            </I-SIGNAL-TO-I-PDU-MAPPING>
+          </I-SIGNAL-TO-PDU-MAPPINGS>
+        </I-SIGNAL-I-PDU>
+        <I-SIGNAL-I-PDU>
+          <SHORT-NAME>Version</SHORT-NAME>
+          <LENGTH>4</LENGTH>
+          <I-SIGNAL-TO-PDU-MAPPINGS>
+            <I-SIGNAL-TO-I-PDU-MAPPING>
+              <SHORT-NAME>SoftwareVersion</SHORT-NAME>
+              <I-SIGNAL-REF DEST="I-SIGNAL">/Signals/SoftwareVersion</I-SIGNAL-REF>
+              <START-POSITION>8</START-POSITION>
+            </I-SIGNAL-TO-I-PDU-MAPPING>
+          </I-SIGNAL-TO-PDU-MAPPINGS>
+        </I-SIGNAL-I-PDU>
+        <I-SIGNAL-I-PDU>
+          <SHORT-NAME>Counter</SHORT-NAME>
+          <LENGTH>4</LENGTH>
+          <I-SIGNAL-TO-PDU-MAPPINGS>
+            <I-SIGNAL-TO-I-PDU-MAPPING>
+              <SHORT-NAME>AliveCounter</SHORT-NAME>
+              <I-SIGNAL-REF DEST="I-SIGNAL">/Signals/AliveCounter</I-SIGNAL-REF>
+              <START-POSITION>24</START-POSITION>
+            </I-SIGNAL-TO-I-PDU-MAPPING>
+          </I-SIGNAL-TO-PDU-MAPPINGS>
+        </I-SIGNAL-I-PDU>
+        <I-SIGNAL-I-PDU>
+          <SHORT-NAME>DoorPdu</SHORT-NAME>
+          <LENGTH>12</LENGTH>
+          <I-SIGNAL-TO-PDU-MAPPINGS>
+            <I-SIGNAL-TO-I-PDU-MAPPING>
+              <SHORT-NAME>LockState</SHORT-NAME>
+              <I-SIGNAL-REF DEST="I-SIGNAL">/Signals/LockState</I-SIGNAL-REF>
+              <PACKING-BYTE-ORDER>MOST-SIGNIFICANT-BYTE-FIRST</PACKING-BYTE-ORDER>
+              <START-POSITION>3</START-POSITION>
+            </I-SIGNAL-TO-I-PDU-MAPPING>
+          </I-SIGNAL-TO-PDU-MAPPINGS>
+        </I-SIGNAL-I-PDU>
+      </ELEMENTS>
+    </AR-PACKAGE>
+    <AR-PACKAGE>
+      <SHORT-NAME>Signals</SHORT-NAME>
+      <ELEMENTS>
+        <I-SIGNAL>
+          <SHORT-NAME>EngineSpeed</SHORT-NAME>
+          <LENGTH>16</LENGTH>
+          <NETWORK-REPRESENTATION-PROPS>
+            <SW-DATA-DEF-PROPS-VARIANTS>
+              <SW-DATA-DEF-PROPS-CONDITIONAL>
+                <BASE-TYPE-REF DEST="SW-BASE-TYPE">/Types/UInt16</BASE-TYPE-REF>
+                <COMPU-METHOD-REF DEST="COMPU-METHOD">/Types/SpeedScale</COMPU-METHOD-REF>
+              </SW-DATA-DEF-PROPS-CONDITIONAL>
+            </SW-DATA-DEF-PROPS-VARIANTS>
+          </NETWORK-REPRESENTATION-PROPS>
+          <SYSTEM-SIGNAL-REF DEST="SYSTEM-SIGNAL">/Signals/EngineSpeedSys</SYSTEM-SIGNAL-REF>
+        </I-SIGNAL>
+        <I-SIGNAL>
+          <SHORT-NAME>CoolantTemp</SHORT-NAME>
+          <INIT-VALUE>
+            <NUMERICAL-VALUE-SPECIFICATION>
+              <VALUE>50</VALUE>
+            </NUMERICAL-VALUE-SPECIFICATION>
+          </INIT-VALUE>
+          <LENGTH>8</LENGTH>
+          <NETWORK-REPRESENTATION-PROPS>
+            <SW-DATA-DEF-PROPS-VARIANTS>
+              <SW-DATA-DEF-PROPS-CONDITIONAL>
+                <BASE-TYPE-REF DEST="SW-BASE-TYPE">/Types/SInt8</BASE-TYPE-REF>
+              </SW-DATA-DEF-PROPS-CONDITIONAL>
+            </SW-DATA-DEF-PROPS-VARIANTS>
+          </NETWORK-REPRESENTATION-PROPS>
+          <SYSTEM-SIGNAL-REF DEST="SYSTEM-SIGNAL">/Signals/CoolantTempSys</SYSTEM-SIGNAL-REF>
+        </I-SIGNAL>
+        <I-SIGNAL>
+          <SHORT-NAME>ErrorCount</SHORT-NAME>
+          <LENGTH>16</LENGTH>
+        </I-SIGNAL>
+        <I-SIGNAL>
+          <SHORT-NAME>SoftwareVersion</SHORT-NAME>
+          <LENGTH>16</LENGTH>
+        </I-SIGNAL>
+        <I-SIGNAL>
+          <SHORT-NAME>AliveCounter</SHORT-NAME>
+          <LENGTH>8</LENGTH>
+        </I-SIGNAL>
+        <I-SIGNAL>
+          <SHORT-NAME>LockState</SHORT-NAME>
+          <LENGTH>12</LENGTH>
+          <NETWORK-REPRESENTATION-PROPS>
+            <SW-DATA-DEF-PROPS-VARIANTS>
+              <SW-DATA-DEF-PROPS-CONDITIONAL>
+                <COMPU-METHOD-REF DEST="COMPU-METHOD">/Types/LockTable</COMPU-METHOD-REF>
+              </SW-DATA-DEF-PROPS-CONDITIONAL>
+            </SW-DATA-DEF-PROPS-VARIANTS>
+          </NETWORK-REPRESENTATION-PROPS>
+        </I-SIGNAL>
+        <SYSTEM-SIGNAL>
+          <SHORT-NAME>CoolantTempSys</SHORT-NAME>
+          <PHYSICAL-PROPS>
+            <SW-DATA-DEF-PROPS-VARIANTS>
+              <SW-DATA-DEF-PROPS-CONDITIONAL>
+                <COMPU-METHOD-REF DEST="COMPU-METHOD">/Types/TempScale</COMPU-METHOD-REF>
+              </SW-DATA-DEF-PROPS-CONDITIONAL>
+            </SW-DATA-DEF-PROPS-VARIANTS>
+          </PHYSICAL-PROPS>
+        </SYSTEM-SIGNAL>
+      </ELEMENTS>
+    </AR-PACKAGE>
+    <AR-PACKAGE>
+      <SHORT-NAME>Types</SHORT-NAME>
+      <ELEMENTS>
+        <SW-BASE-TYPE>
+          <SHORT-NAME>UInt16</SHORT-NAME>
+          <BASE-TYPE-SIZE>16</BASE-TYPE-SIZE>
+          <BASE-TYPE-ENCODING>NONE</BASE-TYPE-ENCODING>
+        </SW-BASE-TYPE>
+        <SW-BASE-TYPE>
+          <SHORT-NAME>SInt8</SHORT-NAME>
+          <BASE-TYPE-SIZE>8</BASE-TYPE-SIZE>
+          <BASE-TYPE-ENCODING>2C</BASE-TYPE-ENCODING>
+        </SW-BASE-TYPE>
+        <COMPU-METHOD>
+          <SHORT-NAME>SpeedScale</SHORT-NAME>
+          <CATEGORY>LINEAR</CATEGORY>
+          <UNIT-REF DEST="UNIT">/Types/Rpm</UNIT-REF>
+          <COMPU-INTERNAL-TO-PHYS>
+            <COMPU-SCALES>
+              <COMPU-SCALE>
+                <LOWER-LIMIT INTERVAL-TYPE="CLOSED">0</LOWER-LIMIT>
+                <UPPER-LIMIT INTERVAL-TYPE="CLOSED">65534</UPPER-LIMIT>
+                <COMPU-RATIONAL-COEFFS>
+                  <COMPU-NUMERATOR><V>0</V><V>0.25</V></COMPU-NUMERATOR>
+                  <COMPU-DENOMINATOR><V>1</V></COMPU-DENOMINATOR>
+                </COMPU-RATIONAL-COEFFS>
+              </COMPU-SCALE>
+            </COMPU-SCALES>
+          </COMPU-INTERNAL-TO-PHYS>
+        </COMPU-METHOD>
+        <COMPU-METHOD>
+          <SHORT-NAME>TempScale</SHORT-NAME>
+          <CATEGORY>LINEAR</CATEGORY>
+          <UNIT-REF DEST="UNIT">/Types/DegC</UNIT-REF>
+          <COMPU-INTERNAL-TO-PHYS>
+            <COMPU-SCALES>
+              <COMPU-SCALE>
+                <COMPU-RATIONAL-COEFFS>
+                  <COMPU-NUMERATOR><V>-40</V><V>1</V></COMPU-NUMERATOR>
+                </COMPU-RATIONAL-COEFFS>
+              </COMPU-SCALE>
+            </COMPU-SCALES>
+          </COMPU-INTERNAL-TO-PHYS>
+        </COMPU-METHOD>
+        <COMPU-METHOD>
+          <SHORT-NAME>LockTable</SHORT-NAME>
+          <CATEGORY>TEXTTABLE</CATEGORY>
+          <COMPU-INTERNAL-TO-PHYS>
+            <COMPU-SCALES>
+              <COMPU-SCALE>
+                <LOWER-LIMIT>0</LOWER-LIMIT>
+                <UPPER-LIMIT>0</UPPER-LIMIT>
+                <COMPU-CONST><VT>Unlocked</VT></COMPU-CONST>
+              </COMPU-SCALE>
+              <COMPU-SCALE>
+                <LOWER-LIMIT>1</LOWER-LIMIT>
+                <UPPER-LIMIT>1</UPPER-LIMIT>
+                <COMPU-CONST><VT>Locked</VT></COMPU-CONST>
+              </COMPU-SCALE>
+            </COMPU-SCALES>
+          </COMPU-INTERNAL-TO-PHYS>
+        </COMPU-METHOD>
+        <UNIT>
+          <SHORT-NAME>Rpm</SHORT-NAME>
+          <DISPLAY-NAME>rpm</DISPLAY-NAME>
+        </UNIT>
+        <UNIT>
+          <SHORT-NAME>DegC</SHORT-NAME>
+        </UNIT>
+      </ELEMENTS>
+    </AR-PACKAGE>
+  </AR-PACKAGES>
+</AUTOSAR>
+'''
+
+
+def _write_arxml(tmpdir, text):
+    path = str(tmpdir.join('test.arxml'))
+    with io.open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    return path
+
+
+def test_arxml_flex_ray_cluster(tmpdir):
+    db = database.load(_write_arxml(tmpdir, _ARXML))
+    assert db.name == 'test'
+    assert list(db.clusters.keys()) == ['Chassis', 'Body']
+
+    cluster = db.clusters['Chassis']
+    assert cluster.protocol == constants.Protocol.FLEX_RAY
+    assert cluster.baud_rate == 10000000
+    assert cluster.flex_ray_cycle == 5000
+    assert cluster.flex_ray_macrotick == pytest.approx(1.0)
+    assert cluster.flex_ray_num_stat_slt == 60
+    assert cluster.flex_ray_stat_slot == 50
+    assert cluster.flex_ray_minislot == 6
+    assert cluster.flex_ray_nit == 30
+    assert cluster.flex_ray_sync_node_max == 8
+    assert cluster.flex_ray_tss_tx == 9
+    assert cluster.flex_ray_wake_sym_rx_win == 301
+    assert cluster.flex_ray_wake_sym_tx_low == 60
+    assert cluster.flex_ray_channels == 3
+
+
+def test_arxml_flex_ray_frames(tmpdir):
+    db = database.load_arxml(_write_arxml(tmpdir, _ARXML))
+    cluster = db.clusters['Chassis']
+
+    engine = cluster.frames['EngineStatus']
+    assert engine.id == 1
+    assert engine.payload_len == 8
+    assert engine.flex_ray_ch_assign == constants.FrmFlexRayChAssign.AAND_B
+    assert engine.flex_ray_cycle_rep == 1
+    assert engine.flex_ray_preamble
+    assert engine.flex_ray_startup
+    assert engine.flex_ray_sync
+    assert not engine.flex_ray_in_cyc_rep_enabled
+    assert engine.can_tx_time == pytest.approx(0.005)
+    [properties] = engine.pdu_properties
+    assert (properties.start_bit, properties.update_bit) == (0, 39)
+
+    diag = cluster.frames['Diagnostics']
+    assert diag.id == 2
+    assert diag.flex_ray_base_cycle == 5
+    assert diag.flex_ray_cycle_rep == 64
+    assert diag.flex_ray_ch_assign == constants.FrmFlexRayChAssign.A
+
+    ecu = cluster.ecus['Engine']
+    assert ecu.tx_frms == [engine]
+    assert ecu.rx_frms == [diag]
+    assert ecu.flex_ray_connected_chs == 3
+    assert ecu.flex_ray_startup_frame_ref is engine
+
+
+def test_arxml_pdus_and_signals(tmpdir):
+    db = database.load_arxml(_write_arxml(tmpdir, _ARXML))
+    cluster = db.clusters['Chassis']
+    pdu = cluster.pdus['EnginePdu']
+    assert pdu.payload_len == 4
+    assert pdu.default_payload == [0, 0, 50, 0]
+
+    speed = pdu.mux_static_sigs['EngineSpeed']
+    assert speed.num_bits == 16
+    assert speed.data_type == constants.SigDataType.UNSIGNED
+    assert speed.scale_fac == pytest.approx(0.25)
+    assert speed.max == pytest.approx(16383.5)
+    assert speed.unit == 'rpm'
+
+    temp = pdu.mux_static_sigs['CoolantTemp']
+    assert temp.start_bit == 16
+    assert temp.data_type == constants.SigDataType.SIGNED
+    assert temp.scale_off == -40
+    assert temp.default == pytest.approx(10)
+    assert temp.unit == 'DegC'
+
+
+def test_arxml_signals_before_pdus(tmpdir):
+    start = _ARXML.index('    <AR-PACKAGE>\n      <SHORT-NAME>Signals')
+    end = _ARXML.index('    </AR-PACKAGE>\n', start) + len('    </AR-PACKAGE>\n')
+    pdus = _ARXML.index('    <AR-PACKAGE>\n      <SHORT-NAME>Pdus')
+    text = _ARXML[:pdus] + _ARXML[start:end] + _ARXML[pdus:start] + _ARXML[end:]
+    db = database.load_arxml(_write_arxml(tmpdir, text))
+    pdu = db.clusters['Chassis'].pdus['EnginePdu']
+    assert pdu.default_payload == [0, 0, 50, 0]
+    assert pdu.mux_static_sigs['CoolantTemp'].start_bit == 16
+    assert pdu.mux_static_sigs['CoolantTemp'].unit == 'DegC'
+    assert db.clusters['Body'].pdus['DoorPdu'].mux_static_sigs['LockState'].start_bit == 8
+
+
+def test_arxml_multiplexed_pdu(tmpdir):
+    db = database.load_arxml(_write_arxml(tmpdir, _ARXML))
+    pdu = db.clusters['Chassis'].pdus['DiagPdu']
+    assert pdu.mux_is_muxed
+    assert pdu.mux_data_mux_sig.num_bits == 8
+    assert pdu.mux_static_sigs['AliveCounter'].start_bit == 24
+    assert list(pdu.mux_subframes.keys()) == ['Errors', 'Version']
+    assert pdu.mux_subframes['Version'].mux_value == 2
+    assert pdu.mux_subframes['Errors'].dyn_signals['ErrorCount'].start_bit == 8
+
+
+def test_arxml_can_fd(tmpdir):
+    db = database.load_arxml(_write_arxml(tmpdir, _ARXML))
+    cluster = db.clusters['Body']
+    assert cluster.can_fd_baud_rate == 2000000
+    assert cluster.can_io_mode == constants.CanIoMode.CAN_FD_BRS
+
+    frame = cluster.frames['DoorStatus']
+    assert frame.id == 0x18FF0010
+    assert frame.can_ext_id
+    assert frame.can_timing_type == constants.FrmCanTiming.EVENT_DATA
+
+    lock = cluster.pdus['DoorPdu'].mux_static_sigs['LockState']
+    assert lock.byte_ordr == constants.SigByteOrdr.BIG_ENDIAN
+    assert lock.start_bit == 8
+    assert sorted(lock.dbc_signal_value_table.items()) == [('Locked', 1), ('Unlocked', 0)]
+
+
+def test_arxml_errors(tmpdir):
+    path = _write_arxml(tmpdir, _ARXML.replace('</AR-PACKAGES>', ''))
+    with pytest.raises(errors.XnetError) as excinfo:
+        database.load_arxml(path)
+    assert excinfo.value.error_code == _cconsts.NX_ERR_CANNOT_OPEN_DATABASE_FILE
+
+    path = _write_arxml(tmpdir, _ARXML.replace('>/Pdus/DoorPdu<', '>/Pdus/Missing<'))
+    with pytest.raises(errors.XnetError) as excinfo:
+        database.load_arxml(path)
+    assert '/Pdus/Missing' in str(excinfo.value)
+
+    path = _write_arxml(tmpdir, _ARXML.replace('>/Signals/CoolantTemp<', '>/Signals/Missing<'))
+    with pytest.raises(errors.XnetError) as excinfo:
+        database.load_arxml(path)
+    assert '/Signals/Missing' in str(excinfo.value)
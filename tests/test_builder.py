@@ -0,0 +1,170 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+import mock  # type: ignore
+import pytest  # type: ignore
+
+from nixnet import _cconsts
+from nixnet import constants
+from nixnet import database
+from nixnet import errors
+
+from nixnet.database import _memory
+
+
+class _FakeDatabase(object):
+    """Stands in for a driver database, so that the spec is replayed object by object."""
+
+    def __init__(self):
+        self._memory = database.MemoryDatabase('fake')
+        self.name = self._memory.name
+        self.clusters = self._memory.clusters
+
+
+def _can_spec(**frame_fields):
+    frame = {
+        'name': 'Doors',
+        'id': 0x120,
+        'payload_len': 2,
+        'signals': [
+            {'name': 'Lock', 'start_bit': 0, 'num_bits': 1, 'data_type': 'UNSIGNED'},
+            {'name': 'Window', 'start_bit': 8, 'num_bits': 8, 'scale_fac': 0.5},
+        ],
+    }
+    frame.update(frame_fields)
+    return {'clusters': [{
+        'name': 'Body',
+        'protocol': constants.Protocol.CAN,
+        'baud_rate': 500000,
+        'frames': [frame],
+        'ecus': [{'name': 'BodyCtrl', 'tx_frms': ['Doors'], 'comment': u'Body controller'}],
+    }]}
+
+
+def test_build_can_cluster():
+    db = database.MemoryDatabase('test')
+    clusters = database.build(db, _can_spec())
+
+    cluster = db.clusters['Body']
+    assert clusters == [cluster]
+    assert cluster.database is db
+    assert cluster.baud_rate == 500000
+    frame = cluster.frames['Doors']
+    assert frame.id == 0x120
+    lock = frame.mux_static_signals['Lock']
+    assert lock.data_type == constants.SigDataType.UNSIGNED
+    assert frame.mux_static_signals['Window'].scale_fac == 0.5
+    assert cluster.ecus['BodyCtrl'].tx_frms == [frame]
+    assert db.find(database.Signal, 'Body.Doors.Lock') is lock
+
+
+def test_build_pdus_subframes_and_schedules():
+    Signal = collections.namedtuple('Signal', ['name', 'start_bit', 'num_bits'])
+    spec = {'clusters': [{
+        'name': 'Lin',
+        'protocol': 'LIN',
+        'pdus': [{
+            'name': 'StatusPdu',
+            'payload_len': 2,
+            'signals': [{'name': 'Mode', 'start_bit': 0, 'num_bits': 2, 'mux_is_data_mux': True}],
+            'subframes': [{'name': 'Mode1', 'mux_value': 1, 'signals': [Signal('Level', 8, 8)]}],
+        }],
+        'frames': [{'name': 'Status', 'id': 0x10, 'payload_len': 2, 'pdu_properties': [('StatusPdu', 0, -1)]}],
+        'lin_schedules': [
+            {'name': 'Collision', 'entries': [{'name': 'Resolve', 'frames': ['Status'], 'delay': 0.01}]},
+            {'name': 'Normal', 'entries': [
+                {'name': 'Poll', 'frames': ['Status'], 'delay': 0.01, 'collision_res_sched': 'Collision'},
+            ]},
+        ],
+    }]}
+    db = database.MemoryDatabase('test')
+    database.build(db, spec)
+
+    cluster = db.clusters['Lin']
+    pdu = cluster.pdus['StatusPdu']
+    frame = cluster.frames['Status']
+    assert frame.pdu_properties == [(pdu, 0, -1)]
+    assert [signal.name for signal in frame.sigs] == ['Mode', 'Level']
+    assert pdu.mux_subframes['Mode1'].dyn_signals['Level'].mux_value == 1
+    entry = cluster.lin_schedules['Normal'].entries['Poll']
+    assert entry.frames == [frame]
+    assert entry.collision_res_sched is cluster.lin_schedules['Collision']
+
+
+def test_build_resolves_references_without_lookups():
+    spec = {'clusters': [{
+        'name': 'Lin',
+        'protocol': 'LIN',
+        'frames': [{'name': 'Status', 'id': 0x10, 'payload_len': 1}, {'name': 'Command', 'id': 0x11, 'payload_len': 1}],
+        'lin_schedules': [
+            {'name': 'Slow', 'entries': [{'name': 'Poll', 'frames': ['Status'], 'delay': 0.02}]},
+            {'name': 'Fast', 'entries': [{'name': 'Poll', 'frames': ['Command'], 'delay': 0.01}]},
+        ],
+    }]}
+    db = _FakeDatabase()
+    with mock.patch.object(_memory.MemoryCollection, '__getitem__', side_effect=AssertionError('lookup')):
+        database.build(db, spec)
+
+    cluster = db.clusters['Lin']
+    assert cluster.lin_schedules['Slow'].entries['Poll'].frames == [cluster.frames['Status']]
+    assert cluster.lin_schedules['Fast'].entries['Poll'].frames == [cluster.frames['Command']]
+
+
+@pytest.mark.parametrize("spec, path, error_code", [
+    (_can_spec(name='2Doors'), 'Body', _cconsts.NX_ERR_INVALID_PROPERTY_VALUE),
+    (_can_spec(colour='red'), 'Body.Doors', _cconsts.NX_ERR_INVALID_PROPERTY_VALUE),
+    (_can_spec(id='0x120'), 'Body.Doors', _cconsts.NX_ERR_INVALID_PROPERTY_VALUE),
+    (_can_spec(can_timing_type='SOMETIMES'), 'Body.Doors', _cconsts.NX_ERR_INVALID_PROPERTY_VALUE),
+    (_can_spec(payload_len=1), 'Body.Doors.Window', _cconsts.NX_ERR_DB_CONFIG_SIG_OUT_OF_FRAME),
+    (_can_spec(payload_len=9, signals=[]), 'Body.Doors', _cconsts.NX_ERR_DB_CONFIG_FRAME_NUM_BYTES),
+    (_can_spec(subframes=[{'name': 'A'}, {'name': 'A'}]), 'Body.Doors.A', _cconsts.NX_ERR_DUPLICATE_SUBFRAME_NAME),
+    (_can_spec(pdu_properties=[('Missing', 0, -1)]), 'Body.Doors', _cconsts.NX_ERR_DATABASE_OBJECT_NOT_FOUND),
+])
+def test_build_reports_first_failure(spec, path, error_code):
+    db = database.MemoryDatabase('test')
+    with pytest.raises(errors.XnetError) as excinfo:
+        database.build(db, spec)
+    assert str(excinfo.value).startswith(path + ': ')
+    assert excinfo.value.error_code == error_code
+    assert len(db.clusters) == 0
+
+
+def test_build_unknown_reference():
+    spec = _can_spec()
+    spec['clusters'][0]['ecus'][0]['rx_frms'] = ['Seats']
+    db = database.MemoryDatabase('test')
+    with pytest.raises(errors.XnetError) as excinfo:
+        database.build(db, spec)
+    assert str(excinfo.value).startswith('Body.BodyCtrl: ')
+    assert excinfo.value.error_code == _cconsts.NX_ERR_FRAME_NOT_FOUND
+    assert len(db.clusters) == 0
+
+
+def test_build_existing_cluster_leaves_memory_database_unchanged():
+    db = database.MemoryDatabase('test')
+    db.clusters.add('Body')
+    spec = _can_spec()
+    spec['clusters'].insert(0, {'name': 'Chassis'})
+    with pytest.raises(errors.XnetError) as excinfo:
+        database.build(db, spec)
+    assert excinfo.value.error_code == _cconsts.NX_ERR_DUPLICATE_CLUSTER_NAME
+    assert list(db.clusters) == ['Body']
+
+
+def test_build_rolls_back_replayed_clusters():
+    db = _FakeDatabase()
+    db.clusters.add('Body')
+    spec = _can_spec()
+    spec['clusters'].insert(0, {'name': 'Chassis'})
+    with pytest.raises(errors.XnetError) as excinfo:
+        database.build(db, spec)
+    assert str(excinfo.value).startswith('Body: ')
+    assert excinfo.value.error_code == _cconsts.NX_ERR_DUPLICATE_CLUSTER_NAME
+    assert list(db.clusters) == ['Body']
+
+    db = _FakeDatabase()
+    clusters = database.build(db, spec)
+    assert [cluster.name for cluster in clusters] == ['Chassis', 'Body']
+    assert db.clusters['Body'].ecus['BodyCtrl'].tx_frms == [db.clusters['Body'].frames['Doors']]
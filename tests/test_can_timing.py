@@ -0,0 +1,123 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import pytest  # type: ignore
+
+from nixnet import _cconsts
+from nixnet import constants
+from nixnet import database
+from nixnet.database import _can_timing
+from nixnet import errors
+
+
+@pytest.fixture(params=['python', 'numpy'])
+def solver(request, monkeypatch):
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(_can_timing, 'numpy', None)
+    return request.param
+
+
+@pytest.fixture
+def cluster():
+    cluster = database.MemoryDatabase('test').clusters.add('Body')
+    cluster.baud_rate = 500000
+    for name, id, can_ext_id, timing_type, tx_time in (
+            ('Doors', 0x100, False, constants.FrmCanTiming.CYCLIC_DATA, 0.010),
+            ('Seats', 0x200, False, constants.FrmCanTiming.CYCLIC_DATA, 0.020),
+            ('Alarm', 0x50, True, constants.FrmCanTiming.EVENT_DATA, 0.0)):
+        frame = cluster.frames.add(name)
+        frame.id = id
+        frame.can_ext_id = can_ext_id
+        frame.payload_len = 8
+        frame.can_timing_type = timing_type
+        frame.can_tx_time = tx_time
+    return cluster
+
+
+def test_can_frame_bits():
+    assert database.can_frame_bits(8) == (135, 0)
+    assert database.can_frame_bits(8, can_ext_id=True) == (160, 0)
+    assert database.can_frame_bits(0) == (55, 0)
+    # CAN FD payloads are rounded up to a valid data length.
+    brs = database.can_frame_bits(10, can_io_mode=constants.CanIoMode.CAN_FD_BRS)
+    assert brs == database.can_frame_bits(12, can_io_mode=constants.CanIoMode.CAN_FD_BRS)
+    assert database.can_frame_bits(10, can_io_mode=constants.CanIoMode.CAN_FD) == (sum(brs), 0)
+    assert database.can_frame_time(8, 500000) == pytest.approx(270e-6)
+    assert database.can_frame_time(
+        64, 500000, can_io_mode=constants.CanIoMode.CAN_FD_BRS, can_fd_baud_rate=2000000) == pytest.approx(407e-6)
+
+
+def test_analyze_can_bus(cluster, solver):
+    analysis = database.analyze_can_bus(cluster)
+
+    assert [frame.name for frame in analysis.frames] == ['Alarm', 'Doors', 'Seats']
+    alarm, doors, seats = analysis.frames
+    assert analysis.unbounded == [alarm]
+    assert (alarm.period, alarm.load) == (None, None)
+    assert doors.frame_time == pytest.approx(270e-6)
+    assert doors.load == pytest.approx(0.027)
+    assert analysis.bus_load == pytest.approx(0.0405)
+    # Each frame can be blocked by the longest frame that is not of higher priority.
+    assert alarm.response_time == pytest.approx(640e-6)
+    assert doors.response_time == pytest.approx(540e-6)
+    assert seats.response_time == pytest.approx(810e-6)
+    assert analysis.schedulable
+
+    slower = database.analyze_can_bus(cluster, baud_rate=125000)
+    assert slower.baud_rate == 125000
+    assert slower.frames[2].response_time == pytest.approx(4 * 810e-6)
+    assert cluster.baud_rate == 500000
+
+
+def test_analyze_overloaded_can_bus(cluster, solver):
+    cluster.frames['Doors'].can_tx_time = 0.0002
+    cluster.frames['Seats'].can_timing_type = constants.FrmCanTiming.CYCLIC_REMOTE
+
+    analysis = database.analyze_can_bus(cluster)
+    _, doors, seats = analysis.frames
+    assert seats.frame_time == pytest.approx((135 + 55) * 2e-6)
+    assert seats.response_time == float('inf')
+    assert analysis.missed_deadlines == [doors, seats]
+    assert not analysis.schedulable
+
+
+def test_analyze_can_fd_bus(solver):
+    cluster = database.MemoryDatabase('test').clusters.add('Powertrain')
+    cluster.baud_rate = 500000
+    frame = cluster.frames.add('Torque')
+    frame.can_io_mode = constants.CanIoMode.CAN_FD_BRS
+    frame.payload_len = 64
+    frame.can_tx_time = 0.01
+
+    # A frame cannot use a faster I/O mode than its cluster.
+    assert database.analyze_can_bus(cluster).frames[0].frame_time == pytest.approx(
+        database.can_frame_bits(64).nominal * 2e-6)
+    cluster.can_io_mode = constants.CanIoMode.CAN_FD
+    assert database.analyze_can_bus(cluster).frames[0].frame_time == pytest.approx(sum(
+        database.can_frame_bits(64, can_io_mode=constants.CanIoMode.CAN_FD)) * 2e-6)
+
+    cluster.can_io_mode = constants.CanIoMode.CAN_FD_BRS
+    with pytest.raises(errors.XnetError) as excinfo:
+        database.analyze_can_bus(cluster)
+    assert excinfo.value.error_code == _cconsts.NX_ERR_BAUD_RATE_NOT_CONFIGURED
+
+    cluster.can_fd_baud_rate = 2000000
+    analysis = database.analyze_can_bus(cluster)
+    assert analysis.frames[0].frame_time == pytest.approx(407e-6)
+    assert analysis.frames[0].response_time == pytest.approx(814e-6)
+
+
+def test_analyze_invalid_cluster():
+    db = database.MemoryDatabase('test')
+    cluster = db.clusters.add('Body')
+    with pytest.raises(errors.XnetError):
+        database.analyze_can_bus(cluster)
+    assert database.analyze_can_bus(cluster, baud_rate=500000).frames == []
+
+    cluster = db.clusters.add('Lin')
+    cluster.protocol = constants.Protocol.LIN
+    with pytest.raises(ValueError):
+        database.analyze_can_bus(cluster)
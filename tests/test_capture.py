@@ -0,0 +1,225 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import io
+import itertools
+import os
+import pytest  # type: ignore
+
+from nixnet import _frames
+from nixnet import capture
+from nixnet.capture import _codec
+from nixnet.capture import _columns
+from nixnet.capture import _format
+from nixnet.capture import _units
+from nixnet import constants
+from nixnet import errors
+from nixnet import types
+
+
+@pytest.fixture(params=['python', 'numpy'])
+def scanner(request, monkeypatch):
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(_units, 'numpy', None)
+        monkeypatch.setattr(_columns, 'numpy', None)
+        monkeypatch.setattr(_format, 'numpy', None)
+    return request.param
+
+
+def _raw_frames(count, fd_every=0):
+    frames = []
+    for index in range(count):
+        if fd_every and index % fd_every == 0:
+            frame_type = constants.FrameType.CANFD_DATA
+            payload = bytes(bytearray(range(64)))
+        else:
+            frame_type = constants.FrameType.CAN_DATA
+            payload = bytes(bytearray([index & 0xFF, index >> 8 & 0xFF]))
+        frames.append(types.RawFrame(1000 + 10 * index, 0x100 + index % 7, frame_type, 0, 0, payload))
+    return frames
+
+
+def _to_bytes(frames):
+    return b''.join(itertools.chain.from_iterable(_frames.serialize_frame(frame) for frame in frames))
+
+
+def _write(path, frames, block_size=1024):
+    with capture.CaptureWriter(path, block_size=block_size) as writer:
+        data = _to_bytes(frames)
+        # Buffers from the driver end on frame boundaries, but not on block boundaries.
+        writer.write_bytes(data[:24 * 5])
+        writer.write_bytes(data[24 * 5:])
+    return writer
+
+
+@pytest.mark.parametrize('fd_every', [0, 3])
+def test_capture_round_trip(tmpdir, scanner, fd_every):
+    path = str(tmpdir.join('log.nxcap'))
+    frames = _raw_frames(500, fd_every)
+    writer = _write(path, frames)
+    assert writer.closed
+
+    with capture.CaptureReader(path) as reader:
+        assert len(reader) == 500
+        assert len(reader.blocks) > 5
+        assert all(block.raw_len <= 1024 for block in reader.blocks)
+        assert reader.blocks == writer.blocks
+        assert (reader.first_timestamp, reader.last_timestamp) == (1000, 1000 + 10 * 499)
+        assert list(reader.frames()) == frames
+        assert b''.join(reader.read_bytes()) == _to_bytes(frames)
+
+
+@pytest.mark.parametrize('fd_every', [0, 3])
+def test_capture_selection(tmpdir, scanner, fd_every):
+    path = str(tmpdir.join('log.nxcap'))
+    frames = _raw_frames(500, fd_every)
+    _write(path, frames)
+
+    with capture.CaptureReader(path) as reader:
+        blocks = reader.select_blocks(start=2000, stop=3000)
+        assert 0 < len(blocks) < len(reader.blocks)
+        assert all(block.overlaps(2000, 3000) for block in blocks)
+
+        selected = list(reader.frames(start=2000, stop=3000, identifiers=[types.CanIdentifier(0x102)]))
+        assert selected == [
+            frame for frame in frames
+            if 2000 <= frame.timestamp < 3000 and frame.identifier == 0x102]
+        assert list(reader.frames(identifiers=[0x7FF])) == []
+        assert list(reader.frames(start=10 ** 9)) == []
+
+
+def test_identifier_filter(tmpdir):
+    path = str(tmpdir.join('log.nxcap'))
+    frames = [types.RawFrame(index, 0x100 if index < 40 else 0x200, constants.FrameType.CAN_DATA, 0, 0, b'')
+              for index in range(80)]
+    _write(path, frames, block_size=24 * 40)
+
+    with capture.CaptureReader(path) as reader:
+        first, second = reader.blocks
+        assert first.may_contain(0x100) and not first.may_contain(0x200)
+        assert reader.select_blocks(identifiers=[0x200]) == [second]
+
+
+def test_capture_arrays(tmpdir):
+    numpy = pytest.importorskip('numpy')
+    path = str(tmpdir.join('log.nxcap'))
+    frames = _raw_frames(100)
+    _write(path, frames)
+
+    with capture.CaptureReader(path) as reader:
+        arrays = list(reader.arrays())
+        # Whole blocks of single unit frames are views of the file.
+        assert all(not array.flags.owndata for array in arrays)
+        units = numpy.concatenate(arrays)
+        assert units['timestamp'].tolist() == [frame.timestamp for frame in frames]
+        assert units['payload'][3, :2].tolist() == [3, 0]
+
+        units = numpy.concatenate(list(reader.arrays(start=1500, identifiers=[0x101])))
+        assert units['timestamp'].tolist() == [
+            frame.timestamp for frame in frames if frame.timestamp >= 1500 and frame.identifier == 0x101]
+
+
+def test_unclosed_capture(tmpdir, scanner):
+    path = str(tmpdir.join('log.nxcap'))
+    frames = _raw_frames(100)
+    writer = capture.CaptureWriter(path, block_size=240)
+    writer.write(frames[:95])
+    writer.flush()
+    try:
+        with capture.CaptureReader(path) as reader:
+            assert len(reader.blocks) == 10
+            assert list(reader.frames()) == frames[:95]
+    finally:
+        writer.close()
+
+    # A truncated block is left out.
+    with io.open(path, 'rb') as f:
+        data = f.read()
+    with io.open(path, 'wb') as f:
+        f.write(data[:writer.blocks[-1].data_offset + 10])
+    with capture.CaptureReader(path) as reader:
+        assert len(reader) == 90
+
+
+def test_not_a_capture_file(tmpdir):
+    path = str(tmpdir.join('empty.nxcap'))
+    for content in (b'', b'NXCAPTUR'[::-1] * 4):
+        with io.open(path, 'wb') as f:
+            f.write(content)
+        with pytest.raises(errors.XnetError):
+            capture.CaptureReader(path)
+    os.remove(path)
+
+
+@pytest.fixture(params=['zlib', 'lzma', 'lz4', 'zstd'])
+def compression(request):
+    if request.param not in _codec.available():
+        pytest.skip('{} is not installed'.format(request.param))
+    return request.param
+
+
+@pytest.mark.parametrize('fd_every', [0, 3])
+def test_compressed_capture(tmpdir, scanner, compression, fd_every):
+    path = str(tmpdir.join('log.nxcap'))
+    frames = _raw_frames(2000, fd_every)
+    with capture.CaptureWriter(path, block_size=4096, compression=compression) as writer:
+        writer.write(frames)
+
+    with capture.CaptureReader(path) as reader:
+        assert all(block.flags & _format.BLOCK_COLUMNS for block in reader.blocks)
+        assert all(block.codec == _codec.codec_id(compression) for block in reader.blocks)
+        assert list(reader.frames()) == frames
+        selected = list(reader.frames(start=5000, stop=9000, identifiers=[0x103]))
+        assert selected == [
+            frame for frame in frames
+            if 5000 <= frame.timestamp < 9000 and frame.identifier == 0x103]
+        raw_len = sum(block.raw_len for block in reader.blocks)
+        stored_len = sum(block.stored_len for block in reader.blocks)
+        assert raw_len > 5 * stored_len
+
+
+@pytest.mark.parametrize('fd_every', [0, 3])
+def test_columns(scanner, fd_every):
+    frames = _raw_frames(50, fd_every)
+    frames.append(types.RawFrame(2 ** 64 - 1, 0x1FF, constants.FrameType.J1939_DATA, 0, 0, b'x' * 300))
+    frames.append(types.RawFrame(0, 0x100, constants.FrameType.CAN_DATA, 0, 0, b''))
+    data = _to_bytes(frames)
+    offsets = _units.frame_offsets(data)
+    fixed = len(offsets) * _units.UNIT_SIZE == len(data)
+    columns = _columns.split(data, None if fixed else offsets)
+    assert len(columns) == len(data)
+    assert _columns.join(columns, len(offsets)) == data
+    with pytest.raises(errors.XnetError):
+        _columns.join(columns[:-1], len(offsets))
+
+
+def test_parallel_read(tmpdir):
+    path = str(tmpdir.join('log.nxcap'))
+    frames = _raw_frames(1000, 5)
+    with capture.CaptureWriter(path, block_size=2048, compression='zlib') as writer:
+        writer.write(frames)
+
+    with capture.CaptureReader(path) as reader:
+        assert list(reader.read_bytes(processes=2)) == list(reader.read_bytes())
+        assert list(reader.frames(start=3000, identifiers=[0x101], processes=2)) == list(
+            reader.frames(start=3000, identifiers=[0x101]))
+
+
+def test_compression_errors(tmpdir):
+    path = str(tmpdir.join('log.nxcap'))
+    with pytest.raises(ValueError):
+        capture.CaptureWriter(path, compression='rar')
+    with capture.CaptureWriter(path, compression='zlib') as writer:
+        writer.write(_raw_frames(10))
+
+    # A block whose codec is unknown can't be read.
+    with io.open(path, 'rb') as f:
+        data = f.read()
+    with io.open(path, 'wb') as f:
+        f.write(data.replace(b'NXBK\x01', b'NXBK\x7f'))
+    with capture.CaptureReader(path) as reader:
+        with pytest.raises(errors.XnetError):
+            list(reader.frames())
@@ -0,0 +1,199 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import itertools
+import struct
+
+import pytest  # type: ignore
+
+from nixnet import _frames
+from nixnet import capture
+from nixnet.capture import _arrow
+from nixnet.capture import _units
+from nixnet import constants
+from nixnet import database
+from nixnet import types
+
+pyarrow = pytest.importorskip('pyarrow')
+pyarrow_parquet = pytest.importorskip('pyarrow.parquet')
+
+
+@pytest.fixture(params=['python', 'numpy'])
+def scanner(request, monkeypatch):
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(_units, 'numpy', None)
+        monkeypatch.setattr(_arrow, 'numpy', None)
+    return request.param
+
+
+def _add_signal(container, name, start_bit, num_bits, data_type, byte_ordr=constants.SigByteOrdr.LITTLE_ENDIAN,
+                scale_fac=1.0, scale_off=0.0):
+    signal = container.add(name)
+    signal.start_bit = start_bit
+    signal.num_bits = num_bits
+    signal.data_type = data_type
+    signal.byte_ordr = byte_ordr
+    signal.scale_fac = scale_fac
+    signal.scale_off = scale_off
+    return signal
+
+
+@pytest.fixture
+def frames():
+    cluster = database.MemoryDatabase('test').clusters.add('Body')
+    engine = cluster.frames.add('Engine')
+    engine.id = 0x100
+    engine.payload_len = 8
+    _add_signal(engine.mux_static_signals, 'Speed', 0, 16, constants.SigDataType.UNSIGNED, scale_fac=0.25)
+    _add_signal(engine.mux_static_signals, 'Temp', 16, 8, constants.SigDataType.SIGNED, scale_off=-40.0)
+    _add_signal(engine.mux_static_signals, 'Ratio', 32, 32, constants.SigDataType.IEEE_FLOAT)
+
+    level = cluster.frames.add('Level')
+    level.id = 0x1ABCDE
+    level.can_ext_id = True
+    level.payload_len = 2
+    _add_signal(level.mux_static_signals, 'Level', 12, 12, constants.SigDataType.UNSIGNED,
+                constants.SigByteOrdr.BIG_ENDIAN)
+
+    mux = cluster.frames.add('Mux')
+    mux.id = 0x300
+    mux.payload_len = 4
+    _add_signal(mux.mux_static_signals, 'Select', 0, 8, constants.SigDataType.UNSIGNED).mux_is_data_mux = True
+    for mux_value, name in enumerate(['A', 'B'], 1):
+        subframe = mux.mux_subframes.add(name)
+        subframe.mux_value = mux_value
+        _add_signal(subframe.dyn_signals, name, 8, 16, constants.SigDataType.SIGNED)
+    return [engine, level, mux]
+
+
+def _raw_frames(count):
+    raw = []
+    for index in range(count):
+        timestamp = 1000 + index
+        kind = index % 7
+        if kind == 0:
+            payload = struct.pack('<HbxfB', index, -index % 100, index / 8.0, 0)[:8]
+            frame = types.RawFrame(timestamp, 0x100, constants.FrameType.CAN_DATA, 0, 0, payload)
+        elif kind == 1:
+            # Too short for Temp and Ratio.
+            frame = types.RawFrame(timestamp, 0x100, constants.FrameType.CANFD_DATA, 0x80, 0, b'\x08\x00')
+        elif kind == 2:
+            frame = types.RawFrame(timestamp, 0x201ABCDE, constants.FrameType.CAN_DATA, 0, 0, b'\xab\xc0')
+        elif kind == 3:
+            frame = types.RawFrame(
+                timestamp, 0x300, constants.FrameType.CAN_DATA, 0, 0, struct.pack('<Bh', 1 + index % 3, -index))
+        elif kind == 4:
+            frame = types.RawFrame(
+                timestamp, 0x123, constants.FrameType.CANFDBRS_DATA, 0, 0, bytes(bytearray(range(64))))
+        elif kind == 5:
+            frame = types.RawFrame(timestamp, 0x100, constants.FrameType.CAN_REMOTE, 0, 0, b'')
+        else:
+            frame = types.RawFrame(timestamp, 0x18FEF100, constants.FrameType.J1939_DATA, 0, 0, b'\x55' * 300)
+        raw.append(frame)
+    return raw
+
+
+def _to_bytes(frames):
+    return b''.join(itertools.chain.from_iterable(_frames.serialize_frame(frame) for frame in frames))
+
+
+def _expected_signals(frame):
+    payload = frame.payload
+    if frame.identifier == 0x100 and frame.type != constants.FrameType.CAN_REMOTE:
+        speed, = struct.unpack_from('<H', payload)
+        if len(payload) == 8:
+            _, temp, ratio = struct.unpack('<Hbxf', payload)
+            return {'Engine.Speed': speed * 0.25, 'Engine.Temp': temp - 40.0, 'Engine.Ratio': ratio}
+        return {'Engine.Speed': speed * 0.25}
+    if frame.identifier == 0x201ABCDE:
+        return {'Level.Level': 0xABC}
+    if frame.identifier == 0x300:
+        select, value = struct.unpack('<Bh', payload)
+        signals = {'Mux.Select': float(select)}
+        if select in (1, 2):
+            signals['Mux.' + 'AB'[select - 1]] = float(value)
+        return signals
+    return {}
+
+
+def test_record_batch(scanner, frames):
+    raw = _raw_frames(70)
+    converter = capture.ArrowConverter(frames)
+    assert converter.schema.names == [
+        'timestamp', 'identifier', 'type', 'flags', 'info', 'payload',
+        'Engine.Speed', 'Engine.Temp', 'Engine.Ratio', 'Level.Level', 'Mux.Select', 'Mux.A', 'Mux.B']
+    batch = converter.record_batch(_to_bytes(raw))
+    assert batch.schema == converter.schema
+    columns = batch.to_pydict()
+    assert columns['timestamp'] == [frame.timestamp for frame in raw]
+    assert columns['identifier'] == [frame.identifier for frame in raw]
+    assert columns['type'] == [frame.type.value for frame in raw]
+    assert columns['flags'] == [frame.flags for frame in raw]
+    assert columns['info'] == [1 if frame.type == constants.FrameType.J1939_DATA else 0 for frame in raw]
+    assert columns['payload'] == [frame.payload for frame in raw]
+    for index, frame in enumerate(raw):
+        expected = _expected_signals(frame)
+        for column in converter.schema.names[6:]:
+            assert columns[column][index] == expected.get(column), (index, column)
+
+
+def test_record_batch_64_bit_signals(scanner):
+    cluster = database.MemoryDatabase('test').clusters.add('Body')
+    frame = cluster.frames.add('Wide')
+    frame.id = 0x400
+    frame.payload_len = 8
+    _add_signal(frame.mux_static_signals, 'Signed', 0, 64, constants.SigDataType.SIGNED)
+    other = cluster.frames.add('WideUnsigned')
+    other.id = 0x401
+    other.payload_len = 8
+    _add_signal(other.mux_static_signals, 'Unsigned', 0, 64, constants.SigDataType.UNSIGNED)
+
+    raw = [
+        types.RawFrame(1, 0x400, constants.FrameType.CAN_DATA, 0, 0, struct.pack('<q', -2)),
+        types.RawFrame(2, 0x400, constants.FrameType.CAN_DATA, 0, 0, struct.pack('<q', 2 ** 62)),
+        types.RawFrame(3, 0x401, constants.FrameType.CAN_DATA, 0, 0, b'\xff' * 8),
+        types.RawFrame(4, 0x401, constants.FrameType.CAN_DATA, 0, 0, struct.pack('<Q', 5)),
+    ]
+    columns = capture.ArrowConverter([frame, other]).record_batch(_to_bytes(raw)).to_pydict()
+    assert columns['Wide.Signed'] == [-2.0, float(2 ** 62), None, None]
+    assert columns['WideUnsigned.Unsigned'] == [None, None, float(2 ** 64 - 1), 5.0]
+
+
+def test_record_batch_without_signals(scanner):
+    raw = _raw_frames(10)
+    converter = capture.ArrowConverter()
+    assert converter.schema.names == ['timestamp', 'identifier', 'type', 'flags', 'info', 'payload']
+    batches = list(converter.record_batches([_to_bytes(raw[:4]), b'', _to_bytes(raw[4:])]))
+    assert [batch.num_rows for batch in batches] == [4, 0, 6]
+    assert batches[2].column(5).to_pylist() == [frame.payload for frame in raw[4:]]
+
+
+def test_parquet_writer(tmpdir, scanner, frames):
+    path = str(tmpdir.join('log.parquet'))
+    raw = _raw_frames(1050)
+    with capture.ParquetFrameWriter(path, frames, row_group_size=100) as writer:
+        for start in range(0, len(raw), 33):
+            writer.write_bytes(_to_bytes(raw[start:start + 33]))
+        assert writer.num_frames == 1050
+    assert writer.closed
+
+    parquet_file = pyarrow_parquet.ParquetFile(path)
+    assert parquet_file.metadata.num_row_groups == 11
+    assert parquet_file.metadata.row_group(0).num_rows == 100
+    table = parquet_file.read()
+    assert table.schema == writer.converter.schema
+    assert table.column('payload').to_pylist() == [frame.payload for frame in raw]
+    assert table.column('Engine.Speed').to_pylist()[:2] == [0.0, 2.0]
+
+
+def test_arrow_errors(tmpdir, monkeypatch, frames):
+    with pytest.raises(ValueError):
+        capture.ParquetFrameWriter(str(tmpdir.join('log.parquet')), row_group_size=0)
+    with pytest.raises(ValueError):
+        capture.ArrowConverter(frames + frames[:1])
+    monkeypatch.setattr(_arrow, 'pyarrow', None)
+    with pytest.raises(ImportError):
+        capture.ArrowConverter()
@@ -0,0 +1,164 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import datetime
+import io
+import itertools
+
+import pytest  # type: ignore
+
+from nixnet import _frames
+from nixnet import capture
+from nixnet.capture import _mdf
+from nixnet.capture import _mdf_blocks
+from nixnet.capture import _units
+from nixnet.capture import _vector
+from nixnet import constants
+from nixnet import errors
+from nixnet import types
+
+
+_START = _vector.xnet_timestamp(datetime.datetime(2021, 6, 23, 22, 21, 47))
+
+
+@pytest.fixture(params=['python', 'numpy'])
+def scanner(request, monkeypatch):
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(_units, 'numpy', None)
+        monkeypatch.setattr(_mdf, 'numpy', None)
+    return request.param
+
+
+def _bus_frames(count):
+    frames = []
+    for index in range(count):
+        timestamp = _START + 12345 * index
+        kind = index % 6
+        if kind == 0:
+            frame = types.RawFrame(
+                timestamp, 0x100 + index % 7, constants.FrameType.CAN_DATA, 0, 0, bytes(bytearray([index & 0xFF])))
+        elif kind == 1:
+            frame = types.RawFrame(
+                timestamp, 0x21ABCDEF, constants.FrameType.CAN_DATA, 0x80, 0, b'\x01\x02\x03\x04\x05\x06\x07\x08')
+        elif kind == 2:
+            frame = types.RawFrame(timestamp, 0x321, constants.FrameType.CAN_REMOTE, 0, 0, b'')
+        elif kind == 3:
+            frame = types.RawFrame(timestamp, 0x300, constants.FrameType.CANFD_DATA, 0, 0, bytes(bytearray(range(12))))
+        elif kind == 4:
+            frame = types.RawFrame(
+                timestamp, 0x301, constants.FrameType.CANFDBRS_DATA, 0x80, 0, bytes(bytearray(range(64))))
+        else:
+            frame = types.RawFrame(timestamp, 0x12, constants.FrameType.LIN_DATA, 0, 0, b'\xaa\xbb')
+        frames.append(frame)
+    return frames
+
+
+def _to_bytes(frames):
+    return b''.join(itertools.chain.from_iterable(_frames.serialize_frame(frame) for frame in frames))
+
+
+@pytest.mark.parametrize('compression', [None, 'deflate'])
+def test_mdf_frames(tmpdir, scanner, compression):
+    path = str(tmpdir.join('log.mf4'))
+    frames = _bus_frames(600)
+    error = types.RawFrame(_START, 0, constants.FrameType.CAN_BUS_ERROR, 0, 0, b'\0' * 5)
+    with capture.MdfWriter(path, compression=compression, chunk_size=1000) as writer:
+        data = _to_bytes(frames)
+        writer.write_bytes(_to_bytes(frames[:7]))
+        writer.write([error])
+        writer.write_bytes(_to_bytes(frames[7:]))
+        writer.write(frames[:6], bus_channel=2)
+    assert writer.closed
+    assert writer.skipped_frames == 1
+
+    with capture.MdfReader(path) as reader:
+        assert reader.start_timestamp == _START
+        groups = dict(((group.name, group.channels[-1]), group) for group in reader.groups)
+        assert sorted(group.num_records for group in reader.groups) == [100 + 1] * 2 + [200 + 2, 200 + 2]
+        assert groups[(u'CAN_DataFrame', u'CAN_DataFrame.DataBytes')].bus_type == u'CAN'
+        assert groups[(u'LIN_Frame', u'LIN_Frame.DataBytes')].bus_type == u'LIN'
+        assert u'CAN_RemoteFrame.ID' in groups[(u'CAN_RemoteFrame', u'CAN_RemoteFrame.Dir')].channels
+        assert list(reader.frames(bus_channels=[1])) == frames
+        assert list(reader.frames(bus_channels=[2])) == frames[:6]
+        assert b''.join(reader.read_bytes(bus_channels=[1], frames_per_buffer=64)) == data
+
+
+def test_mdf_blocks(tmpdir):
+    path = str(tmpdir.join('log.mf4'))
+    with capture.MdfWriter(path, chunk_size=100) as writer:
+        writer.write(_bus_frames(6 * 1100))
+    with io.open(path, 'rb') as f:
+        data = f.read()
+    file_id, _, _, _, version, _, unfinished, _ = _mdf_blocks.ID_BLOCK.unpack_from(data)
+    assert (file_id, version, unfinished) == (b'MDF     ', 410, 0)
+    # More data blocks than a data list links need a chain of lists.
+    assert data.count(b'##DL') == 1 + 3 + 1 + 1
+    with capture.MdfReader(path) as reader:
+        assert len(list(reader.frames())) == 6 * 1100
+
+
+@pytest.mark.parametrize('compression', [None, 'deflate'])
+def test_mdf_signals(tmpdir, scanner, compression):
+    path = str(tmpdir.join('signals.mf4'))
+    timestamps = [_START + 10000 * index for index in range(300)]
+    speed = [index * 0.5 for index in range(300)]
+    torque = [-index * 2.0 for index in range(300)]
+    with capture.MdfWriter(path, compression=compression, chunk_size=512) as writer:
+        writer.write_signals(
+            u'Engine', timestamps[:100], {u'Speed': speed[:100], u'Torque': torque[:100]}, {u'Speed': u'km/h'})
+        writer.write_signals(u'Engine', timestamps[100:], {u'Speed': speed[100:], u'Torque': torque[100:]})
+        with pytest.raises(ValueError):
+            writer.write_signals(u'Engine', timestamps[:1], {u'Speed': speed[:1]})
+        with pytest.raises(ValueError):
+            writer.write_signals(u'Engine', timestamps[:2], {u'Speed': speed[:1], u'Torque': torque[:1]})
+
+    with capture.MdfReader(path) as reader:
+        assert reader.groups == [capture.MdfChannelGroup(u'Engine', [u't', u'Speed', u'Torque'], None, 300)]
+        read_timestamps, values = reader.signals(u'Engine')
+        assert list(read_timestamps) == timestamps
+        assert sorted(values) == [u'Speed', u'Torque']
+        assert list(values[u'Speed']) == speed
+        assert list(values[u'Torque']) == torque
+        assert list(reader.frames()) == []
+        with pytest.raises(KeyError):
+            reader.signals(u'Missing')
+
+
+def test_mdf_values(scanner):
+    records = b'\x00\x81\x02\xff' * 3
+    channel = _mdf._Channel(u'x', 1, 12)
+    assert list(_mdf._values(records, 3, 4, channel)) == [0x281] * 3
+    channel = _mdf._Channel(u'x', 1, 16, _mdf_blocks.CN_INT_BE)
+    assert list(_mdf._values(records, 3, 4, channel)) == [0x8102 - 0x10000] * 3
+    channel = _mdf._Channel(u'x', 2, 4, bit_offset=4, conversion=(1.0, 0.5))
+    assert list(_mdf._values(records, 3, 4, channel)) == [1.0] * 3
+
+
+def test_mdf_errors(tmpdir):
+    path = str(tmpdir.join('log.mf4'))
+    with pytest.raises(ValueError):
+        capture.MdfWriter(path, compression='lz4')
+
+    with capture.MdfWriter(path) as writer:
+        writer.write(_bus_frames(6))
+    with io.open(path, 'rb') as f:
+        data = f.read()
+
+    with io.open(path, 'wb') as f:
+        f.write(b'UnFinMF ' + data[8:])
+    with pytest.raises(errors.XnetError) as excinfo:
+        capture.MdfReader(path)
+    assert 'not finalized' in str(excinfo.value)
+
+    with io.open(path, 'wb') as f:
+        f.write(b'')
+    with pytest.raises(errors.XnetError):
+        capture.MdfReader(path)
+
+    with io.open(path, 'wb') as f:
+        f.write(data[:_mdf_blocks.ID_BLOCK.size + 10])
+    with pytest.raises(errors.XnetError):
+        capture.MdfReader(path)
@@ -0,0 +1,172 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import datetime
+import io
+import itertools
+
+import pytest  # type: ignore
+
+from nixnet import _frames
+from nixnet import capture
+from nixnet.capture import _columns
+from nixnet.capture import _format
+from nixnet.capture import _merge
+from nixnet.capture import _units
+from nixnet.capture import _vector
+from nixnet import constants
+from nixnet import errors
+from nixnet import types
+
+from nixnet_examples import capture_merge
+
+_START = _vector.xnet_timestamp(datetime.datetime(2021, 2, 4, 16, 9, 25))
+
+
+@pytest.fixture(params=['python', 'numpy'])
+def scanner(request, monkeypatch):
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(_units, 'numpy', None)
+        monkeypatch.setattr(_columns, 'numpy', None)
+        monkeypatch.setattr(_format, 'numpy', None)
+        monkeypatch.setattr(_merge, 'numpy', None)
+    return request.param
+
+
+def _raw_frames(count, source, gap, fd_every=0):
+    frames = []
+    for index in range(count):
+        if fd_every and index % fd_every == 0:
+            frame_type = constants.FrameType.CANFD_DATA
+            payload = bytes(bytearray([source] * 20))
+        else:
+            frame_type = constants.FrameType.CAN_DATA
+            payload = bytes(bytearray([source, index & 0xFF]))
+        timestamp = _START + gap * index + source
+        frames.append(types.RawFrame(timestamp, 0x100 + source, frame_type, 0, 0, payload))
+    return frames
+
+
+def _to_bytes(frames):
+    return b''.join(itertools.chain.from_iterable(_frames.serialize_frame(frame) for frame in frames))
+
+
+def _buffers(frames, per_buffer):
+    for start in range(0, len(frames), per_buffer):
+        yield _to_bytes(frames[start:start + per_buffer])
+
+
+def _sorted(frames):
+    return sorted(frames, key=lambda frame: frame.timestamp)
+
+
+def test_merge_sources(tmpdir, scanner):
+    path = str(tmpdir.join('can1.nxcap'))
+    first = _raw_frames(700, 1, 10)
+    with capture.CaptureWriter(path, block_size=2048, compression='zlib') as writer:
+        writer.write(first)
+    second = _raw_frames(300, 2, 25, fd_every=4)
+    third = _raw_frames(50, 3, 100)
+    fourth = _raw_frames(900, 4, 7)
+    other_path = str(tmpdir.join('can4.nxcap'))
+    with capture.CaptureWriter(other_path, block_size=24 * 64) as writer:
+        writer.write(fourth)
+
+    with capture.CaptureReader(other_path) as reader:
+        merger = capture.CaptureMerger([path, _buffers(second, 33), [_to_bytes(third)], reader, []])
+        merged = list(merger.frames())
+    assert merged == _sorted(first + second + third + fourth)
+
+
+def test_merge_ties(scanner):
+    frames = [
+        [types.RawFrame(_START + index // 2, 0x100 + source, constants.FrameType.CAN_DATA, 0, 0, b'')
+         for index in range(10)]
+        for source in range(3)]
+    merged = list(capture.CaptureMerger([[_to_bytes(source)] for source in frames]).frames())
+    # Equal timestamps keep the order of their source, then of the sources.
+    assert merged == sorted(
+        itertools.chain.from_iterable(frames), key=lambda frame: (frame.timestamp, frame.identifier))
+
+
+def test_merge_read_ahead(scanner):
+    pulled = [0, 0]
+
+    def source(index, frames):
+        for data in _buffers(frames, 10):
+            pulled[index] += 1
+            yield data
+
+    first = _raw_frames(1000, 0, 10)
+    second = _raw_frames(1000, 1, 10)
+    merged = capture.CaptureMerger([source(0, first), source(1, second)]).read_bytes()
+    data = next(merged)
+    assert pulled == [1, 1]
+    assert list(_frames.iterate_frames(data)) == _sorted(first[:10] + second[:10])[:len(data) // 24]
+    rest = b''.join(merged)
+    assert pulled == [100, 100]
+    assert list(_frames.iterate_frames(data + rest)) == _sorted(first + second)
+
+
+def test_merge_unsorted_source(scanner):
+    frames = _raw_frames(20, 1, 10)
+    shuffled = frames[10:] + frames[:10]
+    merged = list(capture.CaptureMerger([[_to_bytes(shuffled)], [_to_bytes(_raw_frames(20, 2, 10))]]).frames())
+    assert sorted(merged, key=lambda frame: frame.timestamp) == _sorted(frames + _raw_frames(20, 2, 10))
+
+
+def test_merge_files(tmpdir, scanner):
+    asc_path = str(tmpdir.join('log.asc'))
+    with io.open(asc_path, 'w', encoding='latin-1') as f:
+        f.write(u"""date Thu Feb 04 16:09:25 2021
+base dec  timestamps absolute
+   0.000500 1  291             Rx   d 2 1 255
+   0.002500 1  292             Tx   d 1 16
+""")
+    capture_path = str(tmpdir.join('can1.nxcap'))
+    frames = _raw_frames(100, 1, 100)
+    with capture.CaptureWriter(capture_path) as writer:
+        writer.write(frames)
+
+    output = str(tmpdir.join('merged.nxcap'))
+    assert capture.CaptureMerger([asc_path, capture_path]).write(output, block_size=240) == 102
+    with capture.CaptureReader(output) as reader:
+        merged = list(reader.frames())
+        assert len(reader.blocks) == 11
+    asc = [
+        types.RawFrame(_START + 5000, 291, constants.FrameType.CAN_DATA, 0, 0, b'\x01\xff'),
+        types.RawFrame(_START + 25000, 292, constants.FrameType.CAN_DATA, 0x80, 0, b'\x10')]
+    assert merged == _sorted(frames + asc)
+
+
+def test_merge_command(tmpdir, capsys):
+    paths = []
+    frames = []
+    for source in range(3):
+        path = str(tmpdir.join('can{}.nxcap'.format(source)))
+        source_frames = _raw_frames(200, source, 3)
+        with capture.CaptureWriter(path) as writer:
+            writer.write(source_frames)
+        paths.append(path)
+        frames.extend(source_frames)
+
+    output = str(tmpdir.join('merged.nxcap'))
+    capture_merge.main([output] + paths + ['--compression', 'zlib'])
+    assert 'Merged 600 frames from 3 files' in capsys.readouterr().out
+    with capture.CaptureReader(output) as reader:
+        assert reader.blocks[0].codec != 0
+        assert list(reader.frames()) == _sorted(frames)
+
+
+def test_merge_errors(tmpdir):
+    with pytest.raises(ValueError):
+        capture.CaptureMerger([], frames_per_buffer=0)
+    assert list(capture.CaptureMerger([]).read_bytes()) == []
+    path = str(tmpdir.join('log.txt'))
+    with io.open(path, 'wb') as f:
+        f.write(b'not a log')
+    with pytest.raises(errors.XnetError):
+        list(capture.CaptureMerger([path]).read_bytes())
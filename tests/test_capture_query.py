@@ -0,0 +1,160 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import itertools
+
+import pytest  # type: ignore
+
+from nixnet import _frames
+from nixnet import capture
+from nixnet.capture import _format
+from nixnet.capture import _query
+from nixnet.capture import _units
+from nixnet import constants
+from nixnet import types
+
+
+@pytest.fixture(params=['python', 'numpy'])
+def scanner(request, monkeypatch):
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(_units, 'numpy', None)
+        monkeypatch.setattr(_format, 'numpy', None)
+        monkeypatch.setattr(_query, 'numpy', None)
+    return request.param
+
+
+def _raw_frames(count, first_timestamp):
+    frames = []
+    for index in range(count):
+        timestamp = first_timestamp + 10 * index
+        kind = index % 5
+        if kind == 4:
+            frame = types.RawFrame(
+                timestamp, 0x18FEF100, constants.FrameType.J1939_DATA, 0, 0,
+                bytes(bytearray((index + position) & 0xFF for position in range(300))))
+        elif kind == 3:
+            frame = types.RawFrame(
+                timestamp, 0x300, constants.FrameType.CANFD_DATA, 0, 0, bytes(bytearray([index & 0xFF] * 12)))
+        else:
+            payload = bytes(bytearray([index & 0xFF, 0, 0, index * 37 & 0xFF][:kind + 2]))
+            frame = types.RawFrame(timestamp, 0x100 + kind, constants.FrameType.CAN_DATA, 0, 0, payload)
+        frames.append(frame)
+    return frames
+
+
+def _to_bytes(frames):
+    return b''.join(itertools.chain.from_iterable(_frames.serialize_frame(frame) for frame in frames))
+
+
+@pytest.fixture
+def captures(tmpdir):
+    paths = []
+    frames = []
+    for day in range(3):
+        path = str(tmpdir.join('day{}.nxcap'.format(day)))
+        data = _to_bytes(_raw_frames(400, 100000 * day))
+        compression = 'zlib' if day == 1 else None
+        with capture.CaptureWriter(path, block_size=2048, compression=compression) as writer:
+            writer.write_bytes(data)
+        paths.append(path)
+        # J1939 frames are read with the high bits of the payload length in info.
+        frames.extend(_frames.iterate_frames(data))
+    return paths, frames
+
+
+def test_query_pushdown(captures, scanner):
+    paths, frames = captures
+    query = capture.CaptureQuery(paths, start=101000, stop=203000, identifiers=[0x103, 0x18FEF100])
+    selected = list(query.frames())
+    assert selected == [
+        frame for frame in frames
+        if 101000 <= frame.timestamp < 203000 and frame.identifier in (0x103, 0x18FEF100)]
+
+    # The first file is outside of the time range.
+    blocks = query.select_blocks()
+    assert set(path for path, _ in blocks) == set(paths[1:])
+    assert len(list(query.read_bytes())) <= len(blocks)
+    with capture.CaptureReader(paths[0]) as reader:
+        assert reader.select_blocks(start=101000) == []
+
+
+def test_query_frame_types(tmpdir, captures, scanner):
+    paths, frames = captures
+    query = capture.CaptureQuery(paths[0], frame_types=[constants.FrameType.CANFD_DATA])
+    assert list(query.frames()) == [frame for frame in frames[:400] if frame.type == constants.FrameType.CANFD_DATA]
+
+    path = str(tmpdir.join('lin.nxcap'))
+    lin = [types.RawFrame(index, 0x12, constants.FrameType.LIN_DATA, 0, 0, b'\x01') for index in range(100)]
+    with capture.CaptureWriter(path, block_size=24 * 50) as writer:
+        writer.write(lin)
+        writer.write(_raw_frames(100, 1000))
+    with capture.CaptureReader(path) as reader:
+        assert reader.blocks[0].may_have_type(constants.FrameType.LIN_DATA)
+        assert not reader.blocks[0].may_have_type(constants.FrameType.CAN_DATA)
+        assert len(reader.select_blocks(frame_types=[constants.FrameType.LIN_DATA])) == 2
+    query = capture.CaptureQuery([path], frame_types=[constants.FrameType.LIN_DATA])
+    assert [path for path, _ in query.select_blocks()] == [path] * 2
+    assert list(query.frames()) == lin
+
+    # Blocks of files written without a type filter may have any type.
+    block = reader.blocks[0]._replace(type_filter=0)
+    assert block.may_have_type(constants.FrameType.CAN_DATA)
+
+
+@pytest.mark.parametrize('conditions', [
+    [(3, '>', 0x80)],
+    [(0, '&', 0x01), (1, '==', 0)],
+    [(10, '<=', 0x40)],
+    [(299, '!=', 0)],
+])
+def test_query_payload(captures, scanner, conditions):
+    paths, frames = captures
+    conditions = [capture.PayloadCondition(*condition) for condition in conditions]
+    query = capture.CaptureQuery(paths, start=50000, payload=conditions)
+    expected = [
+        frame for frame in frames
+        if frame.timestamp >= 50000 and all(condition.matches(frame.payload) for condition in conditions)]
+    assert expected
+    assert list(query.frames()) == expected
+
+
+def test_query_processes(captures):
+    paths, _ = captures
+    query = capture.CaptureQuery(paths, identifiers=[0x300], payload=[(0, '>=', 0x40)], processes=2)
+    serial = capture.CaptureQuery(paths, identifiers=[0x300], payload=[(0, '>=', 0x40)])
+    assert list(query.read_bytes()) == list(serial.read_bytes())
+
+
+def test_query_dataframe(captures):
+    pytest.importorskip('numpy')
+    pytest.importorskip('pandas')
+    paths, frames = captures
+    query = capture.CaptureQuery(paths, identifiers=[0x18FEF100, 0x101], payload=[(0, '<', 0x80)])
+    expected = [
+        frame for frame in frames
+        if frame.identifier in (0x18FEF100, 0x101) and bytearray(frame.payload)[0] < 0x80]
+    dataframe = query.dataframe()
+    assert dataframe['timestamp'].tolist() == [frame.timestamp for frame in expected]
+    assert dataframe['identifier'].tolist() == [frame.identifier for frame in expected]
+    assert dataframe['type'].tolist() == [frame.type.value for frame in expected]
+    assert dataframe['payload'].tolist() == [frame.payload for frame in expected]
+
+    empty = capture.CaptureQuery(paths, start=10 ** 9).dataframe()
+    assert len(empty) == 0
+    assert list(empty.columns) == ['timestamp', 'identifier', 'type', 'flags', 'info', 'payload']
+
+
+def test_query_errors(captures, monkeypatch):
+    paths, _ = captures
+    with pytest.raises(ValueError):
+        capture.CaptureQuery(paths, payload=[(0, '=', 1)])
+    with pytest.raises(ValueError):
+        capture.CaptureQuery(paths, payload=[(5000, '==', 1)])
+    with pytest.raises(ValueError):
+        capture.CaptureQuery(paths, payload=[(0, '&', 0x180)])
+    monkeypatch.setattr(_query, 'pandas', None)
+    with pytest.raises(ImportError):
+        capture.CaptureQuery(paths).dataframe()
@@ -0,0 +1,193 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import datetime
+import io
+import zlib
+
+import pytest  # type: ignore
+
+from nixnet import capture
+from nixnet.capture import _blf
+from nixnet.capture import _vector
+from nixnet import constants
+from nixnet import errors
+from nixnet import types
+
+
+_START = _vector.xnet_timestamp(datetime.datetime(2021, 6, 23, 22, 21, 47, 123000))
+
+_ASC = u"""date Wed Jun 23 10:21:47.123 pm 2021
+base hex  timestamps absolute
+internal events logged
+// version 9.0.0
+Begin Triggerblock Wed Jun 23 10:21:47.123 pm 2021
+   0.000000 Start of measurement
+   0.015991 CAN 1 Status:chip status error active
+   1.015991 1  123             Rx   d 8 01 02 03 04 05 06 07 08  Length = 272000 BitCount = 139 ID = 291
+   1.020000 2  1ABCDEFx        Tx   d 2 AA BB
+   1.500000 1  ErrorFrame
+   2.000000 1  321             Rx   r
+   2.000001 1  Statistic: D 0 R 0 XD 0 XR 0 E 0 O 0 B 0.00%
+  17.876708 CANFD   1 Rx        300  Engine                            1 0 d 32 """ + u' '.join(
+    [u'{:02X}'.format(index) for index in range(32)]) + u"""   102203  133   303000 e0006659 46500250 4b140250
+  18.000000 CANFD   2 Tx        301                 0 0 8  8 11 22 33 44 11 22 33 44   102203  133   1000 e0006659
+  18.500000 CANFD   1 Rx        302                 0 0 4  4 11 22 33 44
+End TriggerBlock
+"""
+
+
+def _expected_asc():
+    fd_payload = bytes(bytearray(range(32)))
+    return [
+        (1, types.RawFrame(10159910, 0x123, constants.FrameType.CAN_DATA, 0, 0, b'\x01\x02\x03\x04\x05\x06\x07\x08')),
+        (2, types.RawFrame(10200000, 0x21ABCDEF, constants.FrameType.CAN_DATA, 0x80, 0, b'\xaa\xbb')),
+        (1, types.RawFrame(20000000, 0x321, constants.FrameType.CAN_REMOTE, 0, 0, b'')),
+        (1, types.RawFrame(178767080, 0x300, constants.FrameType.CANFDBRS_DATA, 0, 0, fd_payload)),
+        (2, types.RawFrame(180000000, 0x301, constants.FrameType.CANFD_DATA, 0x80, 0, b'\x11\x22\x33\x44' * 2)),
+        (1, types.RawFrame(185000000, 0x302, constants.FrameType.CANFD_DATA, 0, 0, b'\x11\x22\x33\x44')),
+    ]
+
+
+def test_asc_reader(tmpdir):
+    path = str(tmpdir.join('log.asc'))
+    with io.open(path, 'w', encoding='latin-1') as f:
+        f.write(_ASC)
+    expected = _expected_asc()
+
+    with capture.AscReader(path) as reader:
+        assert reader.start_timestamp == _START
+        frames = list(reader.frames())
+    assert frames == [
+        types.RawFrame(frame.timestamp + _START, frame.identifier, frame.type, frame.flags, frame.info, frame.payload)
+        for _, frame in expected]
+
+    with capture.AscReader(path, channels=[2], start_timestamp=0) as reader:
+        assert list(reader.frames()) == [frame for channel, frame in expected if channel == 2]
+        data = b''.join(reader.read_bytes(frames_per_buffer=1))
+    assert len(data) == 24 * 2
+
+
+def test_asc_decimal_relative(tmpdir):
+    path = str(tmpdir.join('log.asc'))
+    with io.open(path, 'w', encoding='latin-1') as f:
+        f.write(u"""date Thu Feb 04 16:09:25 2021
+base dec  timestamps relative
+   0.500000 1  291             Rx   d 2 1 255
+   0.250000 1  292             Tx   d 1 16
+""")
+    with capture.AscReader(path) as reader:
+        assert reader.start_timestamp == _vector.xnet_timestamp(datetime.datetime(2021, 2, 4, 16, 9, 25))
+        frames = list(capture.AscReader(path, start_timestamp=0).frames())
+    assert frames == [
+        types.RawFrame(5000000, 291, constants.FrameType.CAN_DATA, 0, 0, b'\x01\xff'),
+        types.RawFrame(7500000, 292, constants.FrameType.CAN_DATA, 0x80, 0, b'\x10'),
+    ]
+
+
+def _blf_object(object_type, body, header_version=1, time=0, time_flags=_blf._TIME_ONE_NANS):
+    if header_version == 1:
+        header = _blf._OBJECT_HEADER_V1.pack(time_flags, 0, 0, time)
+    else:
+        header = _blf._OBJECT_HEADER_V2.pack(time_flags, 0, 0, 0, time)
+    header_size = _blf._OBJECT_BASE.size + len(header)
+    size = header_size + len(body)
+    return _blf._OBJECT_BASE.pack(b'LOBJ', header_size, header_version, size, object_type) + header + body
+
+
+def _blf_objects():
+    payload = bytes(bytearray(range(64)))
+    return [
+        _blf_object(_blf._CAN_MESSAGE, _blf._CAN_MESSAGE_BODY.pack(1, 0, 3, 0x123, b'\x01\x02\x03'), time=1000000000),
+        # Objects other than CAN frames are skipped.
+        _blf_object(73, b'\0' * 12, time=1100000000),
+        _blf_object(_blf._CAN_MESSAGE2, _blf._CAN_MESSAGE_BODY.pack(2, 0x81, 0, 0x80000456, b'') + b'\0' * 8,
+                    header_version=2, time=120000, time_flags=_blf._TIME_TEN_MICS),
+        _blf_object(_blf._CAN_FD_MESSAGE, _blf._CAN_FD_MESSAGE_BODY.pack(
+            1, 1, 13, 0x200, 0, 0, 0x03, 32, payload), time=1300000000),
+        _blf_object(_blf._CAN_FD_MESSAGE_64, _blf._CAN_FD_MESSAGE_64_BODY.pack(
+            1, 15, 64, 0, 0x201, 0, 0x1000, 0, 0, 0, 0, 0, 0, 0, 0) + payload, time=1400000000),
+        _blf_object(_blf._CAN_FD_MESSAGE_64, _blf._CAN_FD_MESSAGE_64_BODY.pack(
+            2, 8, 8, 0, 0x202, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0) + payload[:8], time=1500000000),
+    ]
+
+
+def _expected_blf():
+    payload = bytes(bytearray(range(64)))
+    return [
+        (1, types.RawFrame(10000000, 0x123, constants.FrameType.CAN_DATA, 0, 0, b'\x01\x02\x03')),
+        (2, types.RawFrame(12000000, 0x20000456, constants.FrameType.CAN_REMOTE, 0x80, 0, b'')),
+        (1, types.RawFrame(13000000, 0x200, constants.FrameType.CANFDBRS_DATA, 0x80, 0, payload[:32])),
+        (1, types.RawFrame(14000000, 0x201, constants.FrameType.CANFD_DATA, 0, 0, payload)),
+        (2, types.RawFrame(15000000, 0x202, constants.FrameType.CAN_DATA, 0x80, 0, payload[:8])),
+    ]
+
+
+def _write_blf(path, container_size, compress=True):
+    # Objects in containers are padded to 4 bytes, and may be split between containers.
+    stream = b''.join(data + b'\0' * (-len(data) % 4) for data in _blf_objects())
+    containers = []
+    for position in range(0, len(stream), container_size):
+        chunk = stream[position:position + container_size]
+        method = _blf._ZLIB_DEFLATE if compress else _blf._NO_COMPRESSION
+        stored = zlib.compress(chunk) if compress else chunk
+        body = _blf._CONTAINER_HEADER.pack(method, len(chunk)) + stored
+        size = _blf._OBJECT_BASE.size + len(body)
+        container = _blf._OBJECT_BASE.pack(b'LOBJ', 16, 1, size, _blf._LOG_CONTAINER) + body
+        containers.append(container + b'\0' * (size % 4))
+    header = _blf._FILE_HEADER.pack(
+        b'LOGG', 144, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, len(_blf_objects()), 0,
+        2021, 6, 3, 23, 22, 21, 47, 123, 0, 0, 0, 0, 0, 0, 0, 0)
+    with io.open(path, 'wb') as f:
+        f.write(header + b'\0' * (144 - len(header)) + b''.join(containers))
+
+
+@pytest.mark.parametrize('container_size, compress', [(100000, True), (50, True), (37, False)])
+def test_blf_reader(tmpdir, container_size, compress):
+    path = str(tmpdir.join('log.blf'))
+    _write_blf(path, container_size, compress)
+    expected = _expected_blf()
+
+    with capture.BlfReader(path) as reader:
+        assert reader.start_timestamp == _START
+        assert reader.object_count == 6
+        assert list(reader.frames()) == [
+            types.RawFrame(frame.timestamp + _START, frame.identifier, frame.type, frame.flags, frame.info,
+                           frame.payload)
+            for _, frame in expected]
+
+    with capture.BlfReader(path, channels=[1], start_timestamp=0) as reader:
+        assert list(reader.frames()) == [frame for channel, frame in expected if channel == 1]
+
+
+def test_blf_to_capture(tmpdir):
+    blf_path = str(tmpdir.join('log.blf'))
+    capture_path = str(tmpdir.join('log.nxcap'))
+    _write_blf(blf_path, 64)
+    with capture.BlfReader(blf_path, start_timestamp=0) as reader:
+        with capture.CaptureWriter(capture_path) as writer:
+            for data in reader.read_bytes(frames_per_buffer=2):
+                writer.write_bytes(data)
+    with capture.CaptureReader(capture_path) as reader:
+        assert list(reader.frames()) == [frame for _, frame in _expected_blf()]
+
+
+def test_blf_errors(tmpdir):
+    path = str(tmpdir.join('log.blf'))
+    for content in (b'', b'LOGX' + b'\0' * 200):
+        with io.open(path, 'wb') as f:
+            f.write(content)
+        with pytest.raises(errors.XnetError):
+            capture.BlfReader(path)
+
+    # A file cut in the middle of a container ends with the last whole container.
+    _write_blf(path, 64)
+    with io.open(path, 'rb') as f:
+        data = f.read()
+    with io.open(path, 'wb') as f:
+        f.write(data[:-10])
+    with capture.BlfReader(path, start_timestamp=0) as reader:
+        frames = list(reader.frames())
+    assert 0 < len(frames) < len(_expected_blf())
+    assert frames == [frame for _, frame in _expected_blf()][:len(frames)]
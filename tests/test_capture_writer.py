@@ -0,0 +1,143 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import itertools
+import pytest  # type: ignore
+import threading
+import time
+
+from nixnet import _frames
+from nixnet import capture
+from nixnet.capture import _format
+from nixnet import constants
+from nixnet import types
+
+
+def _buffers(count, frames_per_buffer=10):
+    buffers = []
+    for index in range(count):
+        frames = [
+            types.RawFrame(
+                100 * index + frame, 0x100 + frame, constants.FrameType.CAN_DATA, 0, 0, bytes(bytearray([frame] * 8)))
+            for frame in range(frames_per_buffer)]
+        buffers.append(b''.join(itertools.chain.from_iterable(_frames.serialize_frame(frame) for frame in frames)))
+    return buffers
+
+
+def _read_all(paths):
+    data = []
+    for path in paths:
+        with capture.CaptureReader(path) as reader:
+            data.extend(reader.read_bytes())
+    return b''.join(data)
+
+
+def _wait_for(condition):
+    end = time.time() + 10
+    while not condition():
+        assert time.time() < end
+        time.sleep(0.001)
+
+
+class _Clock(object):
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_async_writer(tmpdir):
+    path = str(tmpdir.join('log.nxcap'))
+    buffers = _buffers(50)
+    with capture.AsyncCaptureWriter(path, block_size=1024, fsync=capture.FsyncPolicy.ALWAYS) as writer:
+        for data in buffers:
+            assert writer.write_bytes(data)
+    stats = writer.stats()
+    assert writer.files == [path]
+    assert (stats.queued_bytes, stats.written_bytes, stats.dropped_buffers, stats.files) == (
+        0, sum(len(data) for data in buffers), 0, 1)
+    assert 1 <= stats.writes <= 50
+    assert stats.max_write_latency >= stats.mean_write_latency >= 0
+    assert _read_all(writer.files) == b''.join(buffers)
+
+
+def test_rotate_by_size(tmpdir):
+    path = str(tmpdir.join('log_{index:03d}.nxcap'))
+    buffers = _buffers(40)
+    with capture.AsyncCaptureWriter(path, rotate_bytes=2000, block_size=480, compression='zlib') as writer:
+        for data in buffers:
+            writer.write_bytes(data, timeout=None)
+            # Give the I/O thread a chance to write each buffer on its own.
+            _wait_for(lambda: writer.stats().queued_bytes == 0)
+    assert len(writer.files) > 2
+    assert writer.files[1] == str(tmpdir.join('log_001.nxcap'))
+    assert _read_all(writer.files) == b''.join(buffers)
+    with capture.CaptureReader(writer.files[0]) as reader:
+        assert all(block.codec == 1 and block.stored_len < block.raw_len for block in reader.blocks)
+
+
+def test_rotate_by_time(tmpdir):
+    path = str(tmpdir.join('log_{index}.nxcap'))
+    buffers = _buffers(3)
+    clock = _Clock()
+    with capture.AsyncCaptureWriter(path, rotate_seconds=10.0, clock=clock) as writer:
+        writer.write_bytes(buffers[0])
+        _wait_for(lambda: writer.stats().writes == 1)
+        clock.now = 5.0
+        writer.write_bytes(buffers[1])
+        _wait_for(lambda: writer.stats().writes == 2)
+        assert len(writer.files) == 1
+        clock.now = 12.0
+        writer.write_bytes(buffers[2])
+        _wait_for(lambda: writer.stats().writes == 3 and len(writer.files) == 2)
+    assert _read_all(writer.files[:1]) == buffers[0] + buffers[1] + buffers[2]
+    assert _read_all(writer.files[1:]) == b''
+
+
+def test_full_queue_drops_buffers(tmpdir, monkeypatch):
+    release = threading.Event()
+    write_bytes = _format.CaptureWriter.write_bytes
+
+    def slow_write_bytes(self, frame_bytes):
+        release.wait(10)
+        write_bytes(self, frame_bytes)
+
+    monkeypatch.setattr(_format.CaptureWriter, 'write_bytes', slow_write_bytes)
+    path = str(tmpdir.join('log.nxcap'))
+    first, second, third = _buffers(3)
+    writer = capture.AsyncCaptureWriter(path, max_queued_bytes=len(first) + len(second))
+    try:
+        assert writer.write_bytes(first)
+        _wait_for(lambda: not writer._queue)
+        assert writer.write_bytes(second)
+        assert not writer.write_bytes(third)
+        assert not writer.write_bytes(third, timeout=0.01)
+        stats = writer.stats()
+        assert (stats.queued_bytes, stats.dropped_buffers, stats.dropped_bytes) == (
+            len(first) + len(second), 2, 2 * len(third))
+    finally:
+        release.set()
+        writer.close()
+    assert writer.stats().max_queued_bytes == len(first) + len(second)
+    assert _read_all(writer.files) == first + second
+
+
+def test_writer_errors(tmpdir, monkeypatch):
+    with pytest.raises(ValueError):
+        capture.AsyncCaptureWriter(str(tmpdir.join('log.nxcap')), rotate_bytes=1000)
+    with pytest.raises(ValueError):
+        capture.AsyncCaptureWriter(str(tmpdir.join('log.nxcap')), compression='rar')
+
+    def failing_write_bytes(self, frame_bytes):
+        raise IOError('disk full')
+
+    monkeypatch.setattr(_format.CaptureWriter, 'write_bytes', failing_write_bytes)
+    writer = capture.AsyncCaptureWriter(str(tmpdir.join('log.nxcap')))
+    writer.write_bytes(_buffers(1)[0])
+    with pytest.raises(IOError):
+        writer.close()
+    with pytest.raises(ValueError):
+        writer.write_bytes(_buffers(1)[0])
@@ -0,0 +1,132 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import pytest  # type: ignore
+
+from nixnet import _frames
+from nixnet import cyclic
+from nixnet import types
+
+
+class _Clock(object):
+    """Simulated time, where each write takes a fixed delay."""
+
+    def __init__(self, write_delay=0.0):
+        self.now = 0.0
+        self.write_delay = write_delay
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, delay):
+        self.now += delay
+
+
+class _Frames(object):
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.writes = []
+
+    def write_bytes(self, frame_bytes, timeout):
+        frames = [types.CanFrame.from_raw(frame) for frame in _frames.iterate_frames(frame_bytes)]
+        self.writes.append((self.clock.now, [(frame.identifier.identifier, frame.payload) for frame in frames]))
+        self.clock.now += self.clock.write_delay
+
+
+class _Session(object):
+
+    def __init__(self, clock):
+        self.frames = _Frames(clock)
+
+
+def test_due_frames_share_a_write():
+    clock = _Clock()
+    session = _Session(clock)
+    transmitter = cyclic.CyclicTransmitter(session, clock=clock, sleep=clock.sleep)
+    transmitter.add('Engine', types.CanFrame(0x100, payload=b'\x01\x02'), 0.01)
+    transmitter.add('Doors', types.CanFrame(0x200, payload=b'\x03'), 0.02, offset=0.005)
+    transmitter.add('Diag', types.CanFrame(0x300), 0.05)
+    transmitter.run(0.045)
+
+    assert [(time, [id for id, _ in frames]) for time, frames in session.frames.writes] == [
+        (0.0, [0x100, 0x300]),
+        (pytest.approx(0.005), [0x200]),
+        (pytest.approx(0.01), [0x100]),
+        (pytest.approx(0.02), [0x100]),
+        (pytest.approx(0.025), [0x200]),
+        (pytest.approx(0.03), [0x100]),
+        (pytest.approx(0.04), [0x100])]
+    assert session.frames.writes[0][1][0] == (0x100, b'\x01\x02')
+    stats = transmitter.jitter()
+    assert list(stats) == ['Engine', 'Doors', 'Diag']
+    assert (stats['Engine'].count, stats['Doors'].count, stats['Diag'].count) == (5, 2, 1)
+
+
+def test_live_payload_updates():
+    clock = _Clock()
+    session = _Session(clock)
+    transmitter = cyclic.CyclicTransmitter(session, clock=clock)
+    transmitter.add('Engine', types.CanFrame(0x100, payload=b'\x00'), 0.01)
+    transmitter.start()
+    transmitter.step()
+    transmitter.set_payload('Engine', bytearray([5, 6]))
+    assert transmitter.payload('Engine') == b'\x05\x06'
+    clock.now = 0.01
+    transmitter.step()
+    assert [frames for _, frames in session.frames.writes] == [[(0x100, b'\x00')], [(0x100, b'\x05\x06')]]
+
+
+def test_table_changes_while_running():
+    clock = _Clock()
+    session = _Session(clock)
+    transmitter = cyclic.CyclicTransmitter(session, clock=clock)
+    transmitter.add('Engine', types.CanFrame(0x100), 0.01)
+    transmitter.start()
+    clock.now = 0.032
+    # Entries added later keep the grid of their offset from the start.
+    transmitter.add('Doors', types.CanFrame(0x200), 0.02, offset=0.005)
+    assert transmitter.next_deadline() == 0.0
+    transmitter.step()
+    assert transmitter.next_deadline() == pytest.approx(0.04)
+    transmitter.remove('Engine')
+    assert 'Engine' not in transmitter
+    assert transmitter.next_deadline() == pytest.approx(0.045)
+
+    transmitter.stop()
+    assert transmitter.next_deadline() is None
+    assert transmitter.step() == 0
+    with pytest.raises(ValueError):
+        transmitter.add('Broken', types.CanFrame(0x300), 0.0)
+
+
+def test_jitter_of_late_writes():
+    clock = _Clock(write_delay=0.002)
+    transmitter = cyclic.CyclicTransmitter(_Session(clock), clock=clock, sleep=clock.sleep)
+    transmitter.add('Engine', types.CanFrame(0x100), 0.01)
+    transmitter.add('Doors', types.CanFrame(0x200), 0.01)
+    transmitter.start()
+    transmitter.step()
+    clock.now = 0.026
+    transmitter.step()
+
+    stats = transmitter.jitter()['Engine']
+    assert (stats.count, stats.missed) == (2, 1)
+    assert (stats.min, stats.max, stats.mean) == (0.0, pytest.approx(0.006), pytest.approx(0.003))
+    assert stats.std == pytest.approx(0.003)
+    assert stats.peak_to_peak == pytest.approx(0.006)
+
+
+def test_many_frames():
+    clock = _Clock()
+    session = _Session(clock)
+    transmitter = cyclic.CyclicTransmitter(session, clock=clock, sleep=clock.sleep)
+    periods = (0.01, 0.02, 0.05, 0.1)
+    for index in range(400):
+        transmitter.add(index, types.CanFrame(index, payload=b'\x00' * 8), periods[index % len(periods)])
+    transmitter.run(0.995)
+
+    assert len(session.frames.writes) == 100
+    assert sum(len(frames) for _, frames in session.frames.writes) == 100 * (100 + 50 + 20 + 10)
+    assert all(stats.missed == 0 for stats in transmitter.jitter().values())
@@ -0,0 +1,246 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import io
+import os
+import pytest  # type: ignore
+
+from nixnet import _cconsts
+from nixnet import constants
+from nixnet import database
+from nixnet import errors
+
+
+def _attributes_path():
+    return os.path.join(os.path.dirname(__file__), 'databases', 'attributes.dbc')
+
+
+def _write_dbc(tmpdir, text):
+    path = str(tmpdir.join('test.dbc'))
+    with io.open(path, 'w', encoding='cp1252') as f:
+        f.write(text)
+    return path
+
+
+def test_dbc_attributes_match_driver():
+    with database.load(_attributes_path()) as db:
+        assert db.name == 'attributes'
+        cluster = db.clusters['Cluster']
+        frame1 = cluster.frames['Msg1']
+        frame2 = cluster.frames['Msg2']
+        ecu1 = cluster.ecus['ECU1']
+        ecu2 = cluster.ecus['ECU2']
+        sig1 = frame1.mux_static_signals['Sig1']
+        sig2 = frame1.mux_static_signals['Sig2']
+
+        assert sorted(cluster.dbc_attributes.items()) == [('BusType', ('CAN', True)), ('NetworkAttr1', ('abc', True))]
+        assert sorted(ecu1.dbc_attributes.items()) == [('EcuAttr1', ('xEcu1', True))]
+        assert ecu2.dbc_attributes['EcuAttr1'] == ('xEcu2-Set', False)
+        assert sorted(frame1.dbc_attributes.items()) == [('MsgAttr1', ('2', True)),
+                                                         ('MsgAttr2', ('-11.1', True)),
+                                                         ('MsgAttr3', ('DefaultMsgAttr3String', True)),
+                                                         ('MsgAttr4', ('2', True))]
+        assert frame2.dbc_attributes['MsgAttr1'] == ('22', False)
+        assert frame2.dbc_attributes['MsgAttr2'] == ('-23.33', False)
+        assert frame2.dbc_attributes['MsgAttr3'] == ('MsgAttr3String', False)
+        assert frame2.dbc_attributes['MsgAttr4'] == ('1', False)
+        assert sig1.dbc_attributes['SigAttr1'] == ('1', True)
+        assert sig2.dbc_attributes['SigAttr1'] == ('11', False)
+        assert frame1.dbc_attributes == frame1.dbc_attributes
+        with pytest.raises(KeyError):
+            frame1.dbc_attributes['SigAttr1']
+        with pytest.raises(TypeError):
+            frame1.dbc_attributes[5]
+
+        assert sorted(sig1.dbc_signal_value_table.items()) == [('High', 4), ('Low', -10), ('Zero', 0)]
+        assert len(sig2.dbc_signal_value_table) == 0
+
+
+def test_dbc_multiplexing():
+    db = database.load_dbc(_attributes_path())
+    frame = db.clusters['Cluster'].frames['Msg2']
+
+    assert frame.mux_is_muxed
+    assert frame.mux_data_mux_sig.name == 'MuxSig'
+    assert sorted(frame.mux_static_signals.keys()) == ['MuxSig', 'StatSig']
+    assert len(frame.mux_subframes) == 1
+    subframe = list(frame.mux_subframes.values())[0]
+    assert subframe.mux_value == 0
+    assert subframe.frm is frame
+
+    signal = subframe.dyn_signals['ModDepSig']
+    assert signal.mux_is_dynamic
+    assert signal.mux_subfrm is subframe
+    assert signal.frame is frame
+    assert sorted(s.name for s in frame.sigs) == ['ModDepSig', 'MuxSig', 'StatSig']
+    assert db.find(database.Signal, 'Msg2.ModDepSig') is signal
+
+    frame1 = db.clusters['Cluster'].frames['Msg1']
+    assert not frame1.mux_is_muxed
+    with pytest.raises(errors.XnetError):
+        frame1.mux_data_mux_sig
+
+
+def test_dbc_custom_database(custom_database_path):
+    db = database.load(custom_database_path)
+    cluster = db.clusters['Cluster']
+    assert cluster.comment.startswith('This is an example CAN cluster.')
+    assert sorted(cluster.frames.keys()) == [
+        'CANCyclicFrame1', 'CANCyclicFrame2', 'CANEventFrame1', 'CANEventFrame2',
+        'InstrumentPanel', 'TransmissionFluids']
+
+    frame = cluster.frames['CANCyclicFrame1']
+    assert frame.id == 64
+    assert not frame.can_ext_id
+    assert frame.payload_len == 8
+    assert frame.can_timing_type == constants.FrmCanTiming.CYCLIC_DATA
+    assert frame.can_tx_time == pytest.approx(0.010)
+    assert frame.cluster is cluster
+
+    frame = cluster.frames['CANEventFrame1']
+    assert frame.can_timing_type == constants.FrmCanTiming.EVENT_DATA
+    assert frame.can_tx_time == pytest.approx(0.001)
+    assert 'Transmit Time' in frame.comment
+
+    signal = cluster.frames['TransmissionFluids'].mux_static_signals['TransmissionOilTemp']
+    assert signal.start_bit == 32
+    assert signal.num_bits == 16
+    assert signal.byte_ordr == constants.SigByteOrdr.LITTLE_ENDIAN
+    assert signal.data_type == constants.SigDataType.UNSIGNED
+    assert signal.scale_fac == 0.03125
+    assert signal.scale_off == -273
+    assert signal.min == -273
+    assert signal.max == 1735
+    assert signal.unit == u'\xb0C'
+    assert signal.default == pytest.approx(0.0)
+
+    for frame in cluster.frames.values():
+        frame.check_config_status()
+
+
+def test_dbc_signal_encodings(tmpdir):
+    path = _write_dbc(tmpdir, u'''VERSION ""
+
+NS_ :
+    CM_
+    BA_DEF_
+
+BS_:
+
+BU_: Gateway Engine
+
+BO_ 2147484672 Motorola: 8 Engine
+ SG_ Speed : 7|16@0+ (0.5,0) [0|32767] "rpm" Gateway
+ SG_ Ratio : 39|32@1- (1,0) [0|0] "" Gateway,Vector__XXX
+
+BO_ 0 Empty: 0 Vector__XXX
+
+CM_ SG_ 2147484672 Speed "Engine speed
+across two lines; with a \\"quote\\"";
+SIG_VALTYPE_ 2147484672 Ratio : 1;
+BO_TX_BU_ 2147484672 : Engine,Gateway;
+''')
+    db = database.load_dbc(path)
+    cluster = db.clusters['Cluster']
+    frame = cluster.frames['Motorola']
+    assert frame.id == 0x400
+    assert frame.can_ext_id
+
+    speed = frame.mux_static_signals['Speed']
+    assert speed.byte_ordr == constants.SigByteOrdr.BIG_ENDIAN
+    assert speed.start_bit == 8
+    assert speed.comment == 'Engine speed\nacross two lines; with a "quote"'
+    assert frame.mux_static_signals['Ratio'].data_type == constants.SigDataType.IEEE_FLOAT
+
+    assert cluster.ecus['Engine'].tx_frms == [frame]
+    assert cluster.ecus['Gateway'].tx_frms == [frame]
+    assert cluster.ecus['Gateway'].rx_frms == [frame]
+    assert cluster.ecus['Gateway'].clst is cluster
+
+
+def test_dbc_can_fd_and_baud_rate(tmpdir):
+    path = _write_dbc(tmpdir, u'''BO_ 1 Fd: 64 Vector__XXX
+ SG_ Wide : 0|8@1+ (1,0) [0|0] "" Vector__XXX
+BA_DEF_ "Baudrate" INT 0 1000000;
+BA_DEF_ "BaudrateCANFD" INT 0 8000000;
+BA_DEF_ BO_ "VFrameFormat" ENUM "StandardCAN","ExtendedCAN","StandardCAN_FD","ExtendedCAN_FD";
+BA_DEF_ BO_ "CANFD_BRS" ENUM "0","1";
+BA_DEF_ BO_ "GenMsgSendType" ENUM "Cyclic","Event","CyclicIfActive";
+BA_DEF_ BO_ "GenMsgCycleTime" INT 0 0;
+BA_DEF_DEF_ "Baudrate" 500000;
+BA_DEF_DEF_ "BaudrateCANFD" 2000000;
+BA_DEF_DEF_ "VFrameFormat" "StandardCAN";
+BA_DEF_DEF_ "CANFD_BRS" "1";
+BA_DEF_DEF_ "GenMsgSendType" "Cyclic";
+BA_DEF_DEF_ "GenMsgCycleTime" 0;
+BA_ "VFrameFormat" BO_ 1 3;
+BA_ "GenMsgSendType" BO_ 1 2;
+BA_ "GenMsgCycleTime" BO_ 1 20;
+''')
+    db = database.load(path)
+    cluster = db.clusters['Cluster']
+    assert cluster.baud_rate == 500000
+    assert cluster.can_fd_baud_rate == 2000000
+    assert cluster.can_io_mode == constants.CanIoMode.CAN_FD_BRS
+
+    frame = cluster.frames['Fd']
+    assert frame.can_ext_id
+    assert frame.can_io_mode == constants.CanIoMode.CAN_FD_BRS
+    assert frame.can_timing_type == constants.FrmCanTiming.CYCLIC_EVENT
+    assert frame.can_tx_time == pytest.approx(0.020)
+    frame.check_config_status()
+
+
+def test_dbc_network_attributes(tmpdir):
+    path = _write_dbc(tmpdir, u'''BO_ 1 Frame: 8 Vector__XXX
+BA_DEF_ "Baudrate" INT 0 1000000;
+BA_DEF_ "BusType" STRING;
+BA_DEF_DEF_ "Baudrate" 500000;
+BA_DEF_DEF_ "BusType" "";
+BA_ "Baudrate" 250000;
+BA_ "BusType" "CAN";
+CM_ "Network comment";
+''')
+    cluster = database.load_dbc(path).clusters['Cluster']
+    assert cluster.baud_rate == 250000
+    assert cluster.dbc_attributes['Baudrate'][0] == '250000'
+    assert cluster.dbc_attributes['BusType'][0] == 'CAN'
+    assert cluster.comment == 'Network comment'
+
+
+def test_dbc_strings_ending_in_backslash(tmpdir):
+    path = _write_dbc(tmpdir, u'''BO_ 1 Frame: 8 Vector__XXX
+ SG_ Path : 0|8@1+ (1,0) [0|0] "" Vector__XXX
+CM_ "Network \\\\";
+CM_ SG_ 1 Path "C:\\\\";
+CM_ BO_ 1 "Quoted \\"name\\"
+on two lines";
+VAL_ 1 Path 0 "C:\\\\" 1 "D:\\\\" ;
+BA_DEF_ BO_ "Folder" STRING;
+BA_ "Folder" BO_ 1 "logs\\\\";
+''')
+    cluster = database.load_dbc(path).clusters['Cluster']
+    assert cluster.comment == 'Network \\'
+    frame = cluster.frames['Frame']
+    signal = frame.mux_static_signals['Path']
+    assert signal.comment == 'C:\\'
+    assert frame.comment == 'Quoted "name"\non two lines'
+    assert dict(signal.dbc_signal_value_table) == {'C:\\': 0, 'D:\\': 1}
+    assert frame.dbc_attributes['Folder'][0] == 'logs\\'
+
+
+def test_dbc_errors(tmpdir):
+    path = _write_dbc(tmpdir, u' SG_ Orphan : 0|8@1+ (1,0) [0|0] "" Vector__XXX\n')
+    with pytest.raises(errors.XnetError) as excinfo:
+        database.load_dbc(path)
+    assert excinfo.value.error_code == _cconsts.NX_ERR_CANNOT_OPEN_DATABASE_FILE
+    assert 'test.dbc:1:' in str(excinfo.value)
+
+    path = _write_dbc(tmpdir, u'BO_ 1 Frame: 8 Vector__XXX\nCM_ BO_ 1 "unterminated;\n')
+    with pytest.raises(errors.XnetError):
+        database.load_dbc(path)
+
+    with pytest.raises(errors.XnetError) as excinfo:
+        database.load(str(tmpdir.join('test.xyz')))
+    assert excinfo.value.error_code == _cconsts.NX_ERR_FILE_EXTENSION
@@ -0,0 +1,90 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import io
+import json
+import os
+
+from nixnet import constants
+from nixnet import database
+
+
+_DBC = u'''VERSION ""
+
+BU_: Body Gateway
+
+BO_ 288 Doors: 2 Body
+ SG_ Lock : 0|1@1+ (1,0) [0|1] "" Gateway
+ SG_ Window : 8|8@1+ ({scale},0) [0|100] "%" Gateway
+
+BO_ 289 Seats: 1 Body
+ SG_ Heat : 0|2@1+ (1,0) [0|3] "" Gateway
+{extra}
+BA_DEF_ BO_ "GenMsgCycleTime" INT 0 10000;
+BA_DEF_DEF_ "GenMsgCycleTime" 0;
+BA_ "GenMsgCycleTime" BO_ 288 {cycle};
+VAL_ 288 Lock 0 "Unlocked" 1 "Locked" ;
+'''
+
+
+def _load(tmpdir, name, scale='0.5', cycle='100', extra=''):
+    path = os.path.join(str(tmpdir), name + '.dbc')
+    with io.open(path, 'w', encoding='cp1252') as f:
+        f.write(_DBC.format(scale=scale, cycle=cycle, extra=extra))
+    return database.load(path)
+
+
+def test_diff_identical(tmpdir):
+    old = _load(tmpdir, 'old')
+    new = _load(tmpdir, 'new')
+    diff = database.diff_databases(old, new)
+    assert not diff
+    assert diff.to_dict() == {'removed': [], 'added': [], 'changed': []}
+
+
+def test_diff_changes(tmpdir):
+    old = _load(tmpdir, 'old')
+    new = _load(tmpdir, 'new', scale='0.25', cycle='50', extra=u'''
+BO_ 290 Mirrors: 1 Body
+ SG_ Fold : 0|1@1+ (1,0) [0|1] "" Gateway
+''')
+    new.clusters['Cluster'].frames['Doors'].can_timing_type = constants.FrmCanTiming.CYCLIC_DATA
+    new.clusters['Cluster'].frames['Doors'].can_tx_time = 0.05
+    del new.clusters['Cluster'].frames['Seats'].mux_static_signals['Heat']
+
+    diff = database.diff_databases(database.DatabaseSnapshot(old), new)
+
+    assert [(d.object_class, d.path) for d in diff.removed] == [
+        (constants.ObjectClass.SIGNAL, 'Cluster.Seats.Heat')]
+    assert [(d.object_class, d.path) for d in diff.added] == [
+        (constants.ObjectClass.FRAME, 'Cluster.Mirrors'),
+        (constants.ObjectClass.SIGNAL, 'Cluster.Mirrors.Fold')]
+    changed = dict((d.path, (d.before, d.after)) for d in diff.changed)
+    assert changed['Cluster.Doors.Window'] == ({'scale_fac': 0.5}, {'scale_fac': 0.25})
+    doors_before, doors_after = changed['Cluster.Doors']
+    assert doors_before['dbc_attributes']['GenMsgCycleTime'] == '100'
+    assert doors_after['dbc_attributes']['GenMsgCycleTime'] == '50'
+    assert (doors_before['can_tx_time'], doors_after['can_tx_time']) == (0.0, 0.05)
+    assert doors_after['can_timing_type'] == constants.FrmCanTiming.CYCLIC_DATA
+    assert changed['Cluster.Body'] == ({'tx_frms': ('Doors', 'Seats')}, {'tx_frms': ('Doors', 'Seats', 'Mirrors')})
+
+    plain = json.loads(json.dumps(diff.to_dict()))
+    window = [d for d in plain['changed'] if d['path'] == 'Cluster.Doors.Window']
+    assert window == [{
+        'change': 'changed',
+        'object_class': 'SIGNAL',
+        'path': 'Cluster.Doors.Window',
+        'before': {'scale_fac': 0.5},
+        'after': {'scale_fac': 0.25},
+    }]
+    assert plain['removed'][0]['before']['data_type'] == 'UNSIGNED'
+
+
+def test_snapshot_keys(tmpdir):
+    snapshot = database.DatabaseSnapshot(_load(tmpdir, 'old'))
+    assert len(snapshot) == 8
+    signal = snapshot.objects[(constants.ObjectClass.SIGNAL, 'Cluster.Doors.Lock')]
+    assert signal['dbc_signal_value_table'] == {'Unlocked': 0, 'Locked': 1}
+    assert signal['start_bit'] == 0
+    assert snapshot.objects[(constants.ObjectClass.FRAME, 'Cluster.Doors')]['id'] == 288
@@ -0,0 +1,616 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import io
+import pytest  # type: ignore
+
+from nixnet import _cconsts
+from nixnet import constants
+from nixnet import database
+from nixnet import errors
+
+
+_FIBEX = u'''<?xml version="1.0" encoding="UTF-8"?>
+<fx:FIBEX xmlns:fx="http://www.asam.net/xml/fbx" xmlns:ho="http://www.asam.net/xml"
+          xmlns:flexray="http://www.asam.net/xml/fbx/flexray" xmlns:can="http://www.asam.net/xml/fbx/can"
+          xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" VERSION="3.1.0">
+  <fx:ELEMENTS>
+    <fx:CLUSTERS>
+      <fx:CLUSTER ID="CL_FR" xsi:type="flexray:CLUSTER-TYPE">
+        <ho:SHORT-NAME>Chassis</ho:SHORT-NAME>
+        <fx:SPEED>10000000</fx:SPEED>
+        <fx:PROTOCOL>FlexRay</fx:PROTOCOL>
+        <fx:CHANNEL-REFS>
+          <fx:CHANNEL-REF ID-REF="CH_A"/>
+          <fx:CHANNEL-REF ID-REF="CH_B"/>
+        </fx:CHANNEL-REFS>
+        <fx:MEDIUM-ACCESS-METHOD>TDMA</fx:MEDIUM-ACCESS-METHOD>
+        <fx:NUMBER-OF-CYCLES>64</fx:NUMBER-OF-CYCLES>
+        <fx:CYCLE>5000</fx:CYCLE>
+        <flexray:MAX-FRAME-LENGTH>254</flexray:MAX-FRAME-LENGTH>
+        <flexray:COLD-START-ATTEMPTS>8</flexray:COLD-START-ATTEMPTS>
+        <flexray:ACTION-POINT-OFFSET>4</flexray:ACTION-POINT-OFFSET>
+        <flexray:DYNAMIC-SLOT-IDLE-PHASE>1</flexray:DYNAMIC-SLOT-IDLE-PHASE>
+        <flexray:MINISLOT>6</flexray:MINISLOT>
+        <flexray:MINISLOT-ACTION-POINT-OFFSET>2</flexray:MINISLOT-ACTION-POINT-OFFSET>
+        <flexray:N-I-T>30</flexray:N-I-T>
+        <flexray:SAMPLE-CLOCK-PERIOD>0.0125</flexray:SAMPLE-CLOCK-PERIOD>
+        <flexray:STATIC-SLOT>50</flexray:STATIC-SLOT>
+        <flexray:SYMBOL-WINDOW>10</flexray:SYMBOL-WINDOW>
+        <flexray:T-S-S-TRANSMITTER>9</flexray:T-S-S-TRANSMITTER>
+        <flexray:WAKE-UP>
+          <flexray:WAKE-UP-SYMBOL-RX-IDLE>59</flexray:WAKE-UP-SYMBOL-RX-IDLE>
+          <flexray:WAKE-UP-SYMBOL-RX-LOW>55</flexray:WAKE-UP-SYMBOL-RX-LOW>
+          <flexray:WAKE-UP-SYMBOL-RX-WINDOW>301</flexray:WAKE-UP-SYMBOL-RX-WINDOW>
+          <flexray:WAKE-UP-SYMBOL-TX-IDLE>180</flexray:WAKE-UP-SYMBOL-TX-IDLE>
+          <flexray:WAKE-UP-SYMBOL-TX-LOW>60</flexray:WAKE-UP-SYMBOL-TX-LOW>
+        </flexray:WAKE-UP>
+        <flexray:LISTEN-NOISE>2</flexray:LISTEN-NOISE>
+        <flexray:MACRO-PER-CYCLE>5000</flexray:MACRO-PER-CYCLE>
+        <flexray:MAX-WITHOUT-CLOCK-CORRECTION-PASSIVE>10</flexray:MAX-WITHOUT-CLOCK-CORRECTION-PASSIVE>
+        <flexray:MAX-WITHOUT-CLOCK-CORRECTION-FATAL>14</flexray:MAX-WITHOUT-CLOCK-CORRECTION-FATAL>
+        <flexray:NETWORK-MANAGEMENT-VECTOR-LENGTH>2</flexray:NETWORK-MANAGEMENT-VECTOR-LENGTH>
+        <flexray:NUMBER-OF-MINISLOTS>300</flexray:NUMBER-OF-MINISLOTS>
+        <flexray:NUMBER-OF-STATIC-SLOTS>60</flexray:NUMBER-OF-STATIC-SLOTS>
+        <flexray:OFFSET-CORRECTION-START>4920</flexray:OFFSET-CORRECTION-START>
+        <flexray:PAYLOAD-LENGTH-STATIC>8</flexray:PAYLOAD-LENGTH-STATIC>
+        <flexray:SYNC-NODE-MAX>8</flexray:SYNC-NODE-MAX>
+        <flexray:CAS-RX-LOW-MAX>87</flexray:CAS-RX-LOW-MAX>
+      </fx:CLUSTER>
+      <fx:CLUSTER ID="CL_CAN">
+        <ho:SHORT-NAME>Body</ho:SHORT-NAME>
+        <fx:SPEED>500000</fx:SPEED>
+        <fx:PROTOCOL>CAN</fx:PROTOCOL>
+        <fx:CHANNEL-REFS>
+          <fx:CHANNEL-REF ID-REF="CH_CAN"/>
+        </fx:CHANNEL-REFS>
+        <can:CAN-FD-BAUDRATE>2000000</can:CAN-FD-BAUDRATE>
+      </fx:CLUSTER>
+    </fx:CLUSTERS>
+    <fx:CHANNELS>
+      <fx:CHANNEL ID="CH_A">
+        <ho:SHORT-NAME>ChassisA</ho:SHORT-NAME>
+        <fx:FRAME-TRIGGERINGS>
+          <fx:FRAME-TRIGGERING ID="FT_ENGINE_A">
+            <fx:TIMINGS>
+              <fx:ABSOLUTELY-SCHEDULED-TIMING>
+                <fx:SLOT-ID>1</fx:SLOT-ID>
+                <fx:BASE-CYCLE>0</fx:BASE-CYCLE>
+                <fx:CYCLE-REPETITION>1</fx:CYCLE-REPETITION>
+              </fx:ABSOLUTELY-SCHEDULED-TIMING>
+              <fx:ABSOLUTELY-SCHEDULED-TIMING>
+                <fx:SLOT-ID>31</fx:SLOT-ID>
+                <fx:BASE-CYCLE>0</fx:BASE-CYCLE>
+                <fx:CYCLE-REPETITION>1</fx:CYCLE-REPETITION>
+              </fx:ABSOLUTELY-SCHEDULED-TIMING>
+            </fx:TIMINGS>
+            <fx:FRAME-REF ID-REF="FR_ENGINE"/>
+          </fx:FRAME-TRIGGERING>
+          <fx:FRAME-TRIGGERING ID="FT_DIAG">
+            <fx:TIMINGS>
+              <fx:ABSOLUTELY-SCHEDULED-TIMING>
+                <fx:SLOT-ID>80</fx:SLOT-ID>
+                <fx:BASE-CYCLE>1</fx:BASE-CYCLE>
+                <fx:CYCLE-REPETITION>4</fx:CYCLE-REPETITION>
+              </fx:ABSOLUTELY-SCHEDULED-TIMING>
+            </fx:TIMINGS>
+            <fx:FRAME-REF ID-REF="FR_DIAG"/>
+          </fx:FRAME-TRIGGERING>
+        </fx:FRAME-TRIGGERINGS>
+        <flexray:FLEXRAY-CHANNEL-NAME>A</flexray:FLEXRAY-CHANNEL-NAME>
+      </fx:CHANNEL>
+      <fx:CHANNEL ID="CH_B">
+        <ho:SHORT-NAME>ChassisB</ho:SHORT-NAME>
+        <fx:FRAME-TRIGGERINGS>
+          <fx:FRAME-TRIGGERING ID="FT_ENGINE_B">
+            <fx:TIMINGS>
+              <fx:ABSOLUTELY-SCHEDULED-TIMING>
+                <fx:SLOT-ID>1</fx:SLOT-ID>
+                <fx:BASE-CYCLE>0</fx:BASE-CYCLE>
+                <fx:CYCLE-REPETITION>1</fx:CYCLE-REPETITION>
+              </fx:ABSOLUTELY-SCHEDULED-TIMING>
+            </fx:TIMINGS>
+            <fx:FRAME-REF ID-REF="FR_ENGINE"/>
+          </fx:FRAME-TRIGGERING>
+        </fx:FRAME-TRIGGERINGS>
+        <flexray:FLEXRAY-CHANNEL-NAME>B</flexray:FLEXRAY-CHANNEL-NAME>
+      </fx:CHANNEL>
+      <fx:CHANNEL ID="CH_CAN">
+        <ho:SHORT-NAME>BodyCAN</ho:SHORT-NAME>
+        <fx:FRAME-TRIGGERINGS>
+          <fx:FRAME-TRIGGERING ID="FT_DOOR">
+            <fx:TIMINGS>
+              <fx:CYCLIC-TIMING>
+                <fx:REPEATING-TIME-RANGE>
+                  <fx:VALUE>PT0.1S</fx:VALUE>
+                </fx:REPEATING-TIME-RANGE>
+              </fx:CYCLIC-TIMING>
+            </fx:TIMINGS>
+            <fx:IDENTIFIER>
+              <fx:IDENTIFIER-VALUE can:EXTENDED-ADDRESSING="true">0x18FF0010</fx:IDENTIFIER-VALUE>
+            </fx:IDENTIFIER>
+            <fx:FRAME-REF ID-REF="FR_DOOR"/>
+            <can:CAN-FRAME-TX-BEHAVIOR>CAN-FD</can:CAN-FRAME-TX-BEHAVIOR>
+          </fx:FRAME-TRIGGERING>
+        </fx:FRAME-TRIGGERINGS>
+      </fx:CHANNEL>
+    </fx:CHANNELS>
+    <fx:ECUS>
+      <fx:ECU ID="ECU_ENGINE">
+        <ho:SHORT-NAME>Engine</ho:SHORT-NAME>
+        <fx:CONTROLLERS>
+          <fx:CONTROLLER ID="CTRL_ENGINE">
+            <ho:SHORT-NAME>EngineCtrl</ho:SHORT-NAME>
+            <flexray:KEY-SLOT-USAGE>
+              <flexray:STARTUP-SYNC>1</flexray:STARTUP-SYNC>
+            </flexray:KEY-SLOT-USAGE>
+          </fx:CONTROLLER>
+        </fx:CONTROLLERS>
+        <fx:CONNECTORS>
+          <fx:CONNECTOR ID="CON_ENGINE_A">
+            <fx:CHANNEL-REF ID-REF="CH_A"/>
+            <fx:OUTPUTS>
+              <fx:OUTPUT-PORT ID="OP_ENGINE_A">
+                <fx:FRAME-TRIGGERING-REF ID-REF="FT_ENGINE_A"/>
+              </fx:OUTPUT-PORT>
+            </fx:OUTPUTS>
+            <fx:INPUTS>
+              <fx:INPUT-PORT ID="IP_DIAG">
+                <fx:FRAME-TRIGGERING-REF ID-REF="FT_DIAG"/>
+              </fx:INPUT-PORT>
+            </fx:INPUTS>
+          </fx:CONNECTOR>
+          <fx:CONNECTOR ID="CON_ENGINE_B">
+            <fx:CHANNEL-REF ID-REF="CH_B"/>
+            <fx:OUTPUTS>
+              <fx:OUTPUT-PORT ID="OP_ENGINE_B">
+                <fx:FRAME-TRIGGERING-REF ID-REF="FT_ENGINE_B"/>
+              </fx:OUTPUT-PORT>
+            </fx:OUTPUTS>
+          </fx:CONNECTOR>
+        </fx:CONNECTORS>
+      </fx:ECU>
+      <fx:ECU ID="ECU_DOOR">
+        <ho:SHORT-NAME>Door</ho:SHORT-NAME>
+        <fx:CONNECTORS>
+          <fx:CONNECTOR ID="CON_DOOR">
+            <fx:CHANNEL-REF ID-REF="CH_CAN"/>
+            <fx:OUTPUTS>
+              <fx:OUTPUT-PORT ID="OP_DOOR">
+                <fx:FRAME-TRIGGERING-REF ID-REF="FT_DOOR"/>
+              </fx:OUTPUT-PORT>
+            </fx:OUTPUTS>
+          </fx:CONNECTOR>
+        </fx:CONNECTORS>
+      </fx:ECU>
+    </fx:ECUS>
+    <fx:PDUS>
+      <fx:PDU ID="PDU_ENGINE">
+        <ho:SHORT-NAME>EnginePdu</ho:SHORT-NAME>
+        <fx:BYTE-LENGTH>4</fx:BYTE-LENGTH>
+        <fx:PDU-TYPE>APPLICATION</fx:PDU-TYPE>
+        <fx:SIGNAL-INSTANCES>
+          <fx:SIGNAL-INSTANCE ID="SI_SPEED">
+            <fx:BIT-POSITION>0</fx:BIT-POSITION>
+            <fx:IS-HIGH-LOW-BYTE-ORDER>false</fx:IS-HIGH-LOW-BYTE-ORDER>
+            <fx:SIGNAL-REF ID-REF="SIG_SPEED"/>
+          </fx:SIGNAL-INSTANCE>
+          <fx:SIGNAL-INSTANCE ID="SI_TEMP">
+            <fx:BIT-POSITION>16</fx:BIT-POSITION>
+            <fx:IS-HIGH-LOW-BYTE-ORDER>false</fx:IS-HIGH-LOW-BYTE-ORDER>
+            <fx:SIGNAL-REF ID-REF="SIG_TEMP"/>
+          </fx:SIGNAL-INSTANCE>
+        </fx:SIGNAL-INSTANCES>
+      </fx:PDU>
+      <fx:PDU ID="PDU_DIAG">
+        <ho:SHORT-NAME>DiagPdu</ho:SHORT-NAME>
+        <fx:BYTE-LENGTH>4</fx:BYTE-LENGTH>
+        <fx:PDU-TYPE>APPLICATION</fx:PDU-TYPE>
+        <fx:MULTIPLEXER>
+          <fx:SWITCH ID="SW_DIAG">
+            <ho:SHORT-NAME>DiagMode</ho:SHORT-NAME>
+            <fx:BIT-POSITION>0</fx:BIT-POSITION>
+            <fx:IS-HIGH-LOW-BYTE-ORDER>false</fx:IS-HIGH-LOW-BYTE-ORDER>
+            <ho:BIT-LENGTH>8</ho:BIT-LENGTH>
+          </fx:SWITCH>
+          <fx:DYNAMIC-PART ID="DP_DIAG">
+            <fx:SEGMENT-POSITIONS>
+              <fx:SEGMENT-POSITION>
+                <fx:BIT-POSITION>8</fx:BIT-POSITION>
+                <fx:IS-HIGH-LOW-BYTE-ORDER>false</fx:IS-HIGH-LOW-BYTE-ORDER>
+                <ho:BIT-LENGTH>16</ho:BIT-LENGTH>
+              </fx:SEGMENT-POSITION>
+            </fx:SEGMENT-POSITIONS>
+            <fx:SWITCHED-PDU-INSTANCES>
+              <fx:SWITCHED-PDU-INSTANCE ID="SPI_ERRORS">
+                <fx:PDU-REF ID-REF="PDU_ERRORS"/>
+                <fx:SWITCH-CODE>1</fx:SWITCH-CODE>
+              </fx:SWITCHED-PDU-INSTANCE>
+              <fx:SWITCHED-PDU-INSTANCE ID="SPI_VERSION">
+                <fx:PDU-REF ID-REF="PDU_VERSION"/>
+                <fx:SWITCH-CODE>2</fx:SWITCH-CODE>
+              </fx:SWITCHED-PDU-INSTANCE>
+            </fx:SWITCHED-PDU-INSTANCES>
+          </fx:DYNAMIC-PART>
+          <fx:STATIC-PART ID="SP_DIAG">
+            <fx:SEGMENT-POSITIONS>
+              <fx:SEGMENT-POSITION>
+                <fx:BIT-POSITION>24</fx:BIT-POSITION>
+                <fx:IS-HIGH-LOW-BYTE-ORDER>false</fx:IS-HIGH-LOW-BYTE-ORDER>
+                <ho:BIT-LENGTH>8</ho:BIT-LENGTH>
+              </fx:SEGMENT-POSITION>
+            </fx:SEGMENT-POSITIONS>
+            <fx:STATIC-PDU-INSTANCE ID="SPI_COUNTER">
+              <fx:PDU-REF ID-REF="PDU_COUNTER"/>
+            </fx:STATIC-PDU-INSTANCE>
+          </fx:STATIC-PART>
+        </fx:MULTIPLEXER>
+      </fx:PDU>
+      <fx:PDU ID="PDU_ERRORS">
+        <ho:SHORT-NAME>Errors</ho:SHORT-NAME>
+        <fx:BYTE-LENGTH>2</fx:BYTE-LENGTH>
+        <fx:SIGNAL-INSTANCES>
+          <fx:SIGNAL-INSTANCE ID="SI_ERRORS">
+            <fx:BIT-POSITION>0</fx:BIT-POSITION>
+            <fx:IS-HIGH-LOW-BYTE-ORDER>false</fx:IS-HIGH-LOW-BYTE-ORDER>
+            <fx:SIGNAL-REF ID-REF="SIG_ERRORS"/>
+          </fx:SIGNAL-INSTANCE>
+        </fx:SIGNAL-INSTANCES>
+      </fx:PDU>
+      <fx:PDU ID="PDU_VERSION">
+        <ho:SHORT-NAME>Version</ho:SHORT-NAME>
+        <fx:BYTE-LENGTH>2</fx:BYTE-LENGTH>
+        <fx:SIGNAL-INSTANCES>
+          <fx:SIGNAL-INSTANCE ID="SI_VERSION">
+            <fx:BIT-POSITION>0</fx:BIT-POSITION>
+            <fx:IS-HIGH-LOW-BYTE-ORDER>false</fx:IS-HIGH-LOW-BYTE-ORDER>
+            <fx:SIGNAL-REF ID-REF="SIG_VERSION"/>
+          </fx:SIGNAL-INSTANCE>
+        </fx:SIGNAL-INSTANCES>
+      </fx:PDU>
+      <fx:PDU ID="PDU_COUNTER">
+        <ho:SHORT-NAME>Counter</ho:SHORT-NAME>
+        <fx:BYTE-LENGTH>1</fx:BYTE-LENGTH>
+        <fx:SIGNAL-INSTANCES>
+          <fx:SIGNAL-INSTANCE ID="SI_COUNTER">
+            <fx:BIT-POSITION>0</fx:BIT-POSITION>
+            <fx:IS-HIGH-LOW-BYTE-ORDER>false</fx:IS-HIGH-LOW-BYTE-ORDER>
+            <fx:SIGNAL-REF ID-REF="SIG_COUNTER"/>
+          </fx:SIGNAL-INSTANCE>
+        </fx:SIGNAL-INSTANCES>
+      </fx:PDU>
+      <fx:PDU ID="PDU_DOOR">
+        <ho:SHORT-NAME>DoorPdu</ho:SHORT-NAME>
+        <fx:BYTE-LENGTH>12</fx:BYTE-LENGTH>
+        <fx:SIGNAL-INSTANCES>
+          <fx:SIGNAL-INSTANCE ID="SI_LOCK">
+            <fx:BIT-POSITION>8</fx:BIT-POSITION>
+            <fx:IS-HIGH-LOW-BYTE-ORDER>true</fx:IS-HIGH-LOW-BYTE-ORDER>
+            <fx:SIGNAL-REF ID-REF="SIG_LOCK"/>
+          </fx:SIGNAL-INSTANCE>
+        </fx:SIGNAL-INSTANCES>
+      </fx:PDU>
+    </fx:PDUS>
+    <fx:FRAMES>
+      <fx:FRAME ID="FR_ENGINE">
+        <ho:SHORT-NAME>EngineStatus</ho:SHORT-NAME>
+        <fx:BYTE-LENGTH>8</fx:BYTE-LENGTH>
+        <fx:FRAME-TYPE>APPLICATION</fx:FRAME-TYPE>
+        <fx:PDU-INSTANCES>
+          <fx:PDU-INSTANCE ID="PI_ENGINE">
+            <fx:PDU-REF ID-REF="PDU_ENGINE"/>
+            <fx:BIT-POSITION>0</fx:BIT-POSITION>
+            <fx:IS-HIGH-LOW-BYTE-ORDER>false</fx:IS-HIGH-LOW-BYTE-ORDER>
+            <fx:PDU-UPDATE-BIT-POSITION>63</fx:PDU-UPDATE-BIT-POSITION>
+          </fx:PDU-INSTANCE>
+        </fx:PDU-INSTANCES>
+      </fx:FRAME>
+      <fx:FRAME ID="FR_DIAG">
+        <ho:SHORT-NAME>Diagnostics</ho:SHORT-NAME>
+        <fx:BYTE-LENGTH>4</fx:BYTE-LENGTH>
+        <fx:PDU-INSTANCES>
+          <fx:PDU-INSTANCE ID="PI_DIAG">
+            <fx:PDU-REF ID-REF="PDU_DIAG"/>
+            <fx:BIT-POSITION>0</fx:BIT-POSITION>
+          </fx:PDU-INSTANCE>
+        </fx:PDU-INSTANCES>
+      </fx:FRAME>
+      <fx:FRAME ID="FR_DOOR">
+        <ho:SHORT-NAME>DoorStatus</ho:SHORT-NAME>
+        <fx:BYTE-LENGTH>12</fx:BYTE-LENGTH>
+        <fx:PDU-INSTANCES>
+          <fx:PDU-INSTANCE ID="PI_DOOR">
+            <fx:PDU-REF ID-REF="PDU_DOOR"/>
+            <fx:BIT-POSITION>0</fx:BIT-POSITION>
+          </fx:PDU-INSTANCE>
+        </fx:PDU-INSTANCES>
+      </fx:FRAME>
+    </fx:FRAMES>
+    <fx:SIGNALS>
+      <fx:SIGNAL ID="SIG_SPEED">
+        <ho:SHORT-NAME>EngineSpeed</ho:SHORT-NAME>
+        <fx:CODING-REF ID-REF="COD_SPEED"/>
+      </fx:SIGNAL>
+      <fx:SIGNAL ID="SIG_TEMP">
+        <ho:SHORT-NAME>CoolantTemp</ho:SHORT-NAME>
+        <fx:DEFAULT-VALUE>50</fx:DEFAULT-VALUE>
+        <fx:CODING-REF ID-REF="COD_TEMP"/>
+      </fx:SIGNAL>
+      <fx:SIGNAL ID="SIG_ERRORS">
+        <ho:SHORT-NAME>ErrorCount</ho:SHORT-NAME>
+        <fx:CODING-REF ID-REF="COD_16"/>
+      </fx:SIGNAL>
+      <fx:SIGNAL ID="SIG_VERSION">
+        <ho:SHORT-NAME>SoftwareVersion</ho:SHORT-NAME>
+        <fx:CODING-REF ID-REF="COD_16"/>
+      </fx:SIGNAL>
+      <fx:SIGNAL ID="SIG_COUNTER">
+        <ho:SHORT-NAME>AliveCounter</ho:SHORT-NAME>
+        <fx:CODING-REF ID-REF="COD_8"/>
+      </fx:SIGNAL>
+      <fx:SIGNAL ID="SIG_LOCK">
+        <ho:SHORT-NAME>LockState</ho:SHORT-NAME>
+        <fx:CODING-REF ID-REF="COD_LOCK"/>
+      </fx:SIGNAL>
+    </fx:SIGNALS>
+  </fx:ELEMENTS>
+  <fx:PROCESSING-INFORMATION>
+    <ho:UNIT-SPEC>
+      <ho:UNITS>
+        <ho:UNIT ID="UNIT_RPM">
+          <ho:SHORT-NAME>Rpm</ho:SHORT-NAME>
+          <ho:DISPLAY-NAME>rpm</ho:DISPLAY-NAME>
+        </ho:UNIT>
+        <ho:UNIT ID="UNIT_DEGC">
+          <ho:SHORT-NAME>DegC</ho:SHORT-NAME>
+        </ho:UNIT>
+      </ho:UNITS>
+    </ho:UNIT-SPEC>
+    <fx:CODINGS>
+      <fx:CODING ID="COD_SPEED">
+        <ho:SHORT-NAME>SpeedCoding</ho:SHORT-NAME>
+        <ho:CODED-TYPE ho:BASE-DATA-TYPE="A_UINT16" CATEGORY="STANDARD-LENGTH-TYPE" ENCODING="UNSIGNED">
+          <ho:BIT-LENGTH>16</ho:BIT-LENGTH>
+        </ho:CODED-TYPE>
+        <ho:COMPU-METHODS>
+          <ho:COMPU-METHOD>
+            <ho:SHORT-NAME>SpeedScale</ho:SHORT-NAME>
+            <ho:CATEGORY>LINEAR</ho:CATEGORY>
+            <ho:UNIT-REF ID-REF="UNIT_RPM"/>
+            <ho:COMPU-INTERNAL-TO-PHYS>
+              <ho:COMPU-SCALES>
+                <ho:COMPU-SCALE>
+                  <ho:LOWER-LIMIT>0</ho:LOWER-LIMIT>
+                  <ho:UPPER-LIMIT>65534</ho:UPPER-LIMIT>
+                  <ho:COMPU-RATIONAL-COEFFS>
+                    <ho:COMPU-NUMERATOR><ho:V>0</ho:V><ho:V>0.25</ho:V></ho:COMPU-NUMERATOR>
+                    <ho:COMPU-DENOMINATOR><ho:V>1</ho:V></ho:COMPU-DENOMINATOR>
+                  </ho:COMPU-RATIONAL-COEFFS>
+                </ho:COMPU-SCALE>
+              </ho:COMPU-SCALES>
+            </ho:COMPU-INTERNAL-TO-PHYS>
+          </ho:COMPU-METHOD>
+        </ho:COMPU-METHODS>
+      </fx:CODING>
+      <fx:CODING ID="COD_TEMP">
+        <ho:SHORT-NAME>TempCoding</ho:SHORT-NAME>
+        <ho:CODED-TYPE ho:BASE-DATA-TYPE="A_INT8" ENCODING="SIGNED">
+          <ho:BIT-LENGTH>8</ho:BIT-LENGTH>
+        </ho:CODED-TYPE>
+        <ho:COMPU-METHODS>
+          <ho:COMPU-METHOD>
+            <ho:SHORT-NAME>TempScale</ho:SHORT-NAME>
+            <ho:UNIT-REF ID-REF="UNIT_DEGC"/>
+            <ho:COMPU-INTERNAL-TO-PHYS>
+              <ho:COMPU-SCALES>
+                <ho:COMPU-SCALE>
+                  <ho:COMPU-RATIONAL-COEFFS>
+                    <ho:COMPU-NUMERATOR><ho:V>-40</ho:V><ho:V>1</ho:V></ho:COMPU-NUMERATOR>
+                  </ho:COMPU-RATIONAL-COEFFS>
+                </ho:COMPU-SCALE>
+              </ho:COMPU-SCALES>
+            </ho:COMPU-INTERNAL-TO-PHYS>
+          </ho:COMPU-METHOD>
+        </ho:COMPU-METHODS>
+      </fx:CODING>
+      <fx:CODING ID="COD_16">
+        <ho:SHORT-NAME>Raw16</ho:SHORT-NAME>
+        <ho:CODED-TYPE ENCODING="UNSIGNED"><ho:BIT-LENGTH>16</ho:BIT-LENGTH></ho:CODED-TYPE>
+      </fx:CODING>
+      <fx:CODING ID="COD_8">
+        <ho:SHORT-NAME>Raw8</ho:SHORT-NAME>
+        <ho:CODED-TYPE ENCODING="UNSIGNED"><ho:BIT-LENGTH>8</ho:BIT-LENGTH></ho:CODED-TYPE>
+      </fx:CODING>
+      <fx:CODING ID="COD_LOCK">
+        <ho:SHORT-NAME>LockCoding</ho:SHORT-NAME>
+        <ho:CODED-TYPE ENCODING="UNSIGNED"><ho:BIT-LENGTH>12</ho:BIT-LENGTH></ho:CODED-TYPE>
+        <ho:COMPU-METHODS>
+          <ho:COMPU-METHOD>
+            <ho:SHORT-NAME>LockTable</ho:SHORT-NAME>
+            <ho:CATEGORY>TEXTTABLE</ho:CATEGORY>
+            <ho:COMPU-INTERNAL-TO-PHYS>
+              <ho:COMPU-SCALES>
+                <ho:COMPU-SCALE>
+                  <ho:LOWER-LIMIT>0</ho:LOWER-LIMIT>
+                  <ho:UPPER-LIMIT>0</ho:UPPER-LIMIT>
+                  <ho:COMPU-CONST><ho:VT>Unlocked</ho:VT></ho:COMPU-CONST>
+                </ho:COMPU-SCALE>
+                <ho:COMPU-SCALE>
+                  <ho:LOWER-LIMIT>1</ho:LOWER-LIMIT>
+                  <ho:UPPER-LIMIT>1</ho:UPPER-LIMIT>
+                  <ho:COMPU-CONST><ho:VT>Locked</ho:VT></ho:COMPU-CONST>
+                </ho:COMPU-SCALE>
+              </ho:COMPU-SCALES>
+            </ho:COMPU-INTERNAL-TO-PHYS>
+          </ho:COMPU-METHOD>
+        </ho:COMPU-METHODS>
+      </fx:CODING>
+    </fx:CODINGS>
+  </fx:PROCESSING-INFORMATION>
+</fx:FIBEX>
+'''
+
+
+def _write_fibex(tmpdir, text):
+    path = str(tmpdir.join('test.xml'))
+    with io.open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    return path
+
+
+def test_fibex_flex_ray_cluster(tmpdir):
+    db = database.load(_write_fibex(tmpdir, _FIBEX))
+    assert db.name == 'test'
+    assert list(db.clusters.keys()) == ['Chassis', 'Body']
+
+    cluster = db.clusters['Chassis']
+    assert cluster.protocol == constants.Protocol.FLEX_RAY
+    assert cluster.baud_rate == 10000000
+    assert cluster.flex_ray_cycle == 5000
+    assert cluster.flex_ray_macro_per_cycle == 5000
+    assert cluster.flex_ray_macrotick == pytest.approx(1.0)
+    assert cluster.flex_ray_num_stat_slt == 60
+    assert cluster.flex_ray_stat_slot == 50
+    assert cluster.flex_ray_dyn_seg_start == 3000
+    assert cluster.flex_ray_nit == 30
+    assert cluster.flex_ray_nit_start == 4970
+    assert cluster.flex_ray_sym_win_start == 4960
+    assert cluster.flex_ray_num_minislt == 300
+    assert cluster.flex_ray_minislot == 6
+    assert cluster.flex_ray_payld_len_st == 8
+    assert cluster.flex_ray_cold_st_ats == 8
+    assert cluster.flex_ray_wake_sym_rx_win == 301
+    assert cluster.flex_ray_wake_sym_tx_low == 60
+    assert cluster.flex_ray_cas_rx_l_max == 87
+    assert cluster.flex_ray_channels == 3
+
+
+def test_fibex_flex_ray_frames(tmpdir):
+    db = database.load_fibex(_write_fibex(tmpdir, _FIBEX))
+    cluster = db.clusters['Chassis']
+    assert cluster.pdus_reqd
+
+    engine = cluster.frames['EngineStatus']
+    assert engine.id == 1
+    assert engine.payload_len == 8
+    assert engine.flex_ray_base_cycle == 0
+    assert engine.flex_ray_cycle_rep == 1
+    assert engine.flex_ray_ch_assign == constants.FrmFlexRayChAssign.AAND_B
+    assert engine.flex_ray_timing_type == constants.FrmFlexRayTiming.CYCLIC
+    assert engine.flex_ray_in_cyc_rep_enabled
+    assert engine.flex_ray_in_cyc_rep_i_ds == [31]
+    assert engine.flex_ray_in_cyc_rep_ch_assigns == [constants.FrmFlexRayChAssign.A]
+    assert engine.flex_ray_startup
+    assert engine.flex_ray_sync
+
+    diag = cluster.frames['Diagnostics']
+    assert diag.id == 80
+    assert diag.flex_ray_base_cycle == 1
+    assert diag.flex_ray_cycle_rep == 4
+    assert diag.flex_ray_ch_assign == constants.FrmFlexRayChAssign.A
+    assert diag.flex_ray_timing_type == constants.FrmFlexRayTiming.EVENT
+    assert not diag.flex_ray_startup
+
+    ecu = cluster.ecus['Engine']
+    assert ecu.tx_frms == [engine]
+    assert ecu.rx_frms == [diag]
+    assert ecu.flex_ray_connected_chs == 3
+    assert ecu.flex_ray_is_coldstart
+    assert ecu.flex_ray_startup_frame_ref is engine
+
+
+def test_fibex_pdus_and_signals(tmpdir):
+    db = database.load_fibex(_write_fibex(tmpdir, _FIBEX))
+    cluster = db.clusters['Chassis']
+
+    engine = cluster.frames['EngineStatus']
+    [properties] = engine.pdu_properties
+    assert properties.pdu is cluster.pdus['EnginePdu']
+    assert (properties.start_bit, properties.update_bit) == (0, 63)
+    assert engine.default_payload == [0, 0, 50, 0, 0, 0, 0, 0]
+
+    pdu = cluster.pdus['EnginePdu']
+    speed = pdu.mux_static_sigs['EngineSpeed']
+    assert speed.start_bit == 0
+    assert speed.num_bits == 16
+    assert speed.data_type == constants.SigDataType.UNSIGNED
+    assert speed.scale_fac == pytest.approx(0.25)
+    assert speed.max == pytest.approx(16383.5)
+    assert speed.unit == 'rpm'
+    temp = pdu.mux_static_sigs['CoolantTemp']
+    assert temp.start_bit == 16
+    assert temp.data_type == constants.SigDataType.SIGNED
+    assert temp.scale_off == -40
+    assert temp.min == pytest.approx(-168)
+    assert temp.max == pytest.approx(87)
+    assert temp.default == pytest.approx(10)
+    assert temp.unit == 'DegC'
+
+
+def test_fibex_multiplexed_pdu(tmpdir):
+    db = database.load_fibex(_write_fibex(tmpdir, _FIBEX))
+    pdu = db.clusters['Chassis'].pdus['DiagPdu']
+    assert pdu.mux_is_muxed
+    assert pdu.mux_data_mux_sig.name == 'DiagMode'
+    assert pdu.mux_data_mux_sig.num_bits == 8
+    assert pdu.mux_static_sigs['AliveCounter'].start_bit == 24
+    assert list(pdu.mux_subframes.keys()) == ['Errors', 'Version']
+
+    errors_subframe = pdu.mux_subframes['Errors']
+    assert errors_subframe.mux_value == 1
+    assert errors_subframe.dyn_signals['ErrorCount'].start_bit == 8
+    assert pdu.mux_subframes['Version'].mux_value == 2
+
+
+def test_fibex_bit_layout(tmpdir):
+    db = database.load_fibex(_write_fibex(tmpdir, _FIBEX))
+    layouts = {layout.path: layout for layout in database.analyze_bit_layout(db)}
+
+    # The frames use the bits of their PDUs and the update bit.
+    engine = layouts['Chassis.EngineStatus']
+    assert engine.static_mask == layouts['Chassis.EnginePdu'].used_mask | 1 << 63
+    assert engine.utilization == 25 / 64
+    assert layouts['Chassis.Diagnostics'].utilization == 1.0
+    assert layouts['Body.DoorStatus'].used_mask == layouts['Body.DoorPdu'].used_mask
+    assert all(not layout.pdu_overlaps for layout in layouts.values())
+
+
+def test_fibex_can_fd(tmpdir):
+    db = database.load_fibex(_write_fibex(tmpdir, _FIBEX))
+    cluster = db.clusters['Body']
+    assert cluster.protocol == constants.Protocol.CAN
+    assert cluster.can_fd_baud_rate == 2000000
+    assert cluster.can_io_mode == constants.CanIoMode.CAN_FD_BRS
+
+    frame = cluster.frames['DoorStatus']
+    assert frame.id == 0x18FF0010
+    assert frame.can_ext_id
+    assert frame.can_io_mode == constants.CanIoMode.CAN_FD_BRS
+    assert frame.can_timing_type == constants.FrmCanTiming.CYCLIC_DATA
+    assert frame.can_tx_time == pytest.approx(0.1)
+    assert not cluster.pdus_reqd
+    assert cluster.ecus['Door'].tx_frms == [frame]
+
+    assert [signal.name for signal in frame.sigs] == ['LockState']
+    lock = cluster.pdus['DoorPdu'].mux_static_sigs['LockState']
+    assert lock.byte_ordr == constants.SigByteOrdr.BIG_ENDIAN
+    assert lock.start_bit == 8
+    assert sorted(lock.dbc_signal_value_table.items()) == [('Locked', 1), ('Unlocked', 0)]
+
+
+def test_fibex_errors(tmpdir):
+    path = _write_fibex(tmpdir, _FIBEX.replace('</fx:FRAMES>', ''))
+    with pytest.raises(errors.XnetError) as excinfo:
+        database.load_fibex(path)
+    assert excinfo.value.error_code == _cconsts.NX_ERR_CANNOT_OPEN_DATABASE_FILE
+
+    path = _write_fibex(tmpdir, _FIBEX.replace('ID-REF="PDU_ENGINE"', 'ID-REF="PDU_MISSING"'))
+    with pytest.raises(errors.XnetError) as excinfo:
+        database.load_fibex(path)
+    assert 'PDU_MISSING' in str(excinfo.value)
+
+    path = _write_fibex(tmpdir, _FIBEX.replace('ID-REF="SIG_TEMP"', 'ID-REF="SIG_MISSING"'))
+    with pytest.raises(errors.XnetError) as excinfo:
+        database.load_fibex(path)
+    assert 'SIG_MISSING' in str(excinfo.value)
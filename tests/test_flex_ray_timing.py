@@ -0,0 +1,112 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import pytest  # type: ignore
+
+from nixnet import constants
+from nixnet import database
+
+A = constants.FrmFlexRayChAssign.A
+B = constants.FrmFlexRayChAssign.B
+AAND_B = constants.FrmFlexRayChAssign.AAND_B
+
+
+def _add_frame(cluster, name, slot, base_cycle=0, cycle_rep=1, ch_assign=A):
+    frame = cluster.frames.add(name)
+    frame.id = slot
+    frame.flex_ray_base_cycle = base_cycle
+    frame.flex_ray_cycle_rep = cycle_rep
+    frame.flex_ray_ch_assign = ch_assign
+    return frame
+
+
+@pytest.fixture
+def cluster():
+    cluster = database.MemoryDatabase('test').clusters.add('Chassis')
+    cluster.protocol = constants.Protocol.FLEX_RAY
+    cluster.flex_ray_cycle = 5000
+    cluster.flex_ray_macro_per_cycle = 5000
+    cluster.flex_ray_num_stat_slt = 10
+    cluster.flex_ray_stat_slot = 100
+    cluster.flex_ray_num_minislt = 200
+    cluster.flex_ray_minislot = 10
+    cluster.flex_ray_channels = AAND_B.value
+    return cluster
+
+
+def test_cycle_mask():
+    assert database.cycle_mask(0, 1) == (1 << 64) - 1
+    assert database.cycle_mask(3, 64) == 1 << 3
+    assert database.cycle_mask(1, 4) == sum(1 << cycle for cycle in range(1, 64, 4))
+    assert database.cycle_mask(0, 0) == 0
+    assert database.cycle_mask(64, 1) == 0
+
+
+def test_analyze_static_segment(cluster):
+    _add_frame(cluster, 'Speed', 1, ch_assign=AAND_B)
+    _add_frame(cluster, 'Brake', 2, 0, 2)
+    _add_frame(cluster, 'Steer', 2, 1, 4)
+    _add_frame(cluster, 'Yaw', 2, 3, 4, ch_assign=AAND_B)
+
+    schedule = database.analyze_flex_ray_schedule(cluster)
+
+    assert schedule.channels == [A, B]
+    speed, brake, steer, yaw = schedule.frames
+    assert (speed.slots, speed.ch_assign, speed.num_cycles, speed.dynamic) == ((1,), AAND_B, 64, False)
+    assert (brake.latency, steer.latency) == (10000.0, 20000.0)
+    # The frames in slot 2 are sent in different cycles.
+    assert schedule.conflicts == []
+    assert schedule.slot_cycles(A, 2) == brake.cycles | steer.cycles | yaw.cycles == database.cycle_mask(0, 1)
+    assert schedule.free_cycles(B, 2) == [cycle for cycle in range(64) if cycle % 4 != 3]
+    assert schedule.free_static_slots(A) == list(range(3, 11))
+    assert schedule.static_utilization == pytest.approx((64 + 64 + 64 + 16) / (2 * 10 * 64))
+    assert schedule.dynamic_utilization == 0.0
+
+
+def test_analyze_conflicts_and_dynamic_segment(cluster):
+    _add_frame(cluster, 'Brake', 2, 0, 2)
+    _add_frame(cluster, 'Steer', 2, 2, 4)
+    dynamic = _add_frame(cluster, 'Diag', 11, 0, 8, ch_assign=B)
+    dynamic.flex_ray_timing_type = constants.FrmFlexRayTiming.EVENT
+    _add_frame(cluster, 'Bad', 211)
+    _add_frame(cluster, 'None', 3, ch_assign=constants.FrmFlexRayChAssign.NONE)
+
+    schedule = database.analyze_flex_ray_schedule(cluster)
+
+    assert [frame.name for frame in schedule.frames] == ['Brake', 'Steer', 'Diag', 'None']
+    assert schedule.invalid == ['Bad']
+    assert schedule.conflicts == [database.FlexRaySlotConflict('Steer', 'Brake', A, 2, database.cycle_mask(2, 4))]
+    assert schedule.frames[2].dynamic
+    assert schedule.frames[3].ch_assign == constants.FrmFlexRayChAssign.NONE
+    assert schedule.free_static_slots(A) == [1] + list(range(3, 11))
+    assert schedule.dynamic_utilization == pytest.approx(8 / (2 * 200 * 64))
+
+
+def test_in_cycle_repetition_latency(cluster):
+    frame = _add_frame(cluster, 'Torque', 1, 0, 2, ch_assign=A)
+    frame.flex_ray_in_cyc_rep_i_ds = [6, 15]
+    frame.flex_ray_in_cyc_rep_ch_assigns = [B, AAND_B]
+
+    schedule = database.analyze_flex_ray_schedule(cluster)
+
+    torque, = schedule.frames
+    assert torque.slots == (1, 6, 15)
+    assert torque.ch_assign == AAND_B
+    # Starts at 0, 500 and 1040 macroticks of 1 us, then 0 again two cycles later.
+    assert torque.latency == pytest.approx(10000 - 1040)
+    assert schedule.slot_cycles(A, 6) == 0
+    assert schedule.slot_cycles(B, 15) == torque.cycles
+
+
+def test_analyze_derives_channels():
+    cluster = database.MemoryDatabase('test').clusters.add('Chassis')
+    with pytest.raises(ValueError):
+        database.analyze_flex_ray_schedule(cluster)
+
+    cluster.protocol = constants.Protocol.FLEX_RAY
+    cluster.flex_ray_num_stat_slt = 2
+    _add_frame(cluster, 'Speed', 1, ch_assign=B)
+    schedule = database.analyze_flex_ray_schedule(cluster)
+    assert schedule.channels == [B]
+    assert schedule.static_utilization == 0.5
@@ -0,0 +1,133 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import itertools
+
+import mock  # type: ignore
+
+import pytest  # type: ignore
+
+from nixnet import _frames
+from nixnet import constants
+from nixnet import errors
+from nixnet import types
+
+numpy = pytest.importorskip('numpy')
+
+
+def raise_code(code):
+    raise errors.XnetError("", code)
+
+
+def _to_bytes(frames):
+    return b''.join(itertools.chain.from_iterable(_frames.serialize_frame(frame) for frame in frames))
+
+
+def _mixed_frames():
+    frames = []
+    for index in range(40):
+        if index % 5 == 0:
+            frame_type = constants.FrameType.CANFD_DATA
+            payload = bytes(bytearray(range(index % 64 + 1)))
+        elif index % 7 == 0:
+            frame_type = constants.FrameType.J1939_DATA
+            payload = bytes(bytearray([index] * 300))
+        else:
+            frame_type = constants.FrameType.CAN_DATA
+            payload = bytes(bytearray([index] * (index % 9)))
+        frames.append(types.RawFrame(1000 + index, 0x100 + index, frame_type, index & 0x80, 0, payload))
+    return frames
+
+
+def test_frame_batch_round_trip():
+    # J1939 frames read back with the high bits of their length in info.
+    data = _to_bytes(_mixed_frames())
+    batch = types.FrameBatch.from_bytes(data)
+    assert len(batch) == 40
+    assert list(batch) == list(_frames.iterate_frames(data))
+    assert batch.payload_lengths[7] == 300
+    assert batch.payload(7) == bytes(bytearray([7] * 300))
+    assert batch.to_bytes() == data
+    assert batch.payload_data.base is not None
+
+
+def test_frame_batch_fixed_units():
+    frames = [
+        types.RawFrame(index, index, constants.FrameType.CAN_DATA, 0, index & 3,
+                       bytes(bytearray([index] * (index % 9))))
+        for index in range(100)]
+    data = _to_bytes(frames)
+    batch = types.FrameBatch.from_bytes(data)
+    assert list(batch) == frames
+    assert list(batch.payload_offsets[:3]) == [16, 40, 64]
+    assert batch.to_bytes() == data
+
+
+def test_frame_batch_empty():
+    batch = types.FrameBatch.from_bytes(b'')
+    assert len(batch) == 0
+    assert list(batch) == []
+    assert batch.to_bytes() == b''
+    assert types.FrameBatch.from_frames([]).to_bytes() == b''
+
+
+def test_frame_batch_from_frames():
+    frames = [
+        types.CanFrame(types.CanIdentifier(0x123, extended=True), constants.FrameType.CAN_DATA, b'\x01\x02'),
+        types.CanFrame(0x356, constants.FrameType.CANFD_DATA, bytes(bytearray(range(20)))),
+        types.LinFrame(3, constants.FrameType.LIN_DATA, b'\x07'),
+        types.CanBusErrorFrame(100, constants.CanCommState.ERROR_ACTIVE, True, constants.CanLastErr.STUFF, 1, 2),
+    ]
+    batch = types.FrameBatch.from_frames(frames)
+    assert list(batch.frames(types.XnetFrame)) == frames
+    assert batch[0] == frames[0].to_raw()
+    assert types.XnetFrame.from_raw(batch[-1]) == frames[-1]
+    assert types.FrameBatch.from_bytes(batch.to_bytes())[1] == frames[1].to_raw()
+    assert repr(batch) == 'FrameBatch(len=4)'
+
+
+def test_frame_batch_indexing():
+    data = _to_bytes(_mixed_frames())
+    frames = list(_frames.iterate_frames(data))
+    batch = types.FrameBatch.from_bytes(data)
+
+    assert batch[3] == frames[3]
+    assert batch[numpy.int64(-1)] == frames[-1]
+    with pytest.raises(IndexError):
+        batch[40]
+
+    sliced = batch[5:20:5]
+    assert list(sliced) == frames[5:20:5]
+    assert sliced.payload_data is batch.payload_data
+    assert list(batch[batch.identifiers > 0x120]) == frames[0x21:]
+    j1939 = batch[batch.frame_types == constants.FrameType.J1939_DATA.value]
+    assert list(j1939) == [frames[7], frames[14], frames[21], frames[28]]
+    assert list(batch[[2, 0]]) == [frames[2], frames[0]]
+    assert list(_frames.iterate_frames(batch[::-1].to_bytes())) == frames[::-1]
+
+
+@mock.patch('nixnet._errors.check_for_error', raise_code)
+def test_frame_batch_corrupted():
+    data = _to_bytes(_mixed_frames())
+    with pytest.raises(errors.XnetError):
+        types.FrameBatch.from_bytes(data[:-8])
+    with pytest.raises(errors.XnetError):
+        types.FrameBatch.from_bytes(data[:-1])
+
+    batch = types.FrameBatch.from_bytes(data)
+    batch.payload_lengths[1] = 300
+    with pytest.raises(errors.XnetError):
+        batch.to_bytes()
+    batch.payload_lengths[1] = 1
+    batch.payload_lengths[7] = 2048
+    with pytest.raises(errors.XnetError):
+        batch.to_bytes()
+
+
+def test_frame_batch_errors(monkeypatch):
+    with pytest.raises(ValueError):
+        types.FrameBatch([1, 2], [1], [0], [0], [0], b'', [0], [0])
+    monkeypatch.setattr(types, 'numpy', None)
+    with pytest.raises(ImportError):
+        types.FrameBatch.from_bytes(b'')
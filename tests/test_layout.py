@@ -0,0 +1,115 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import pytest  # type: ignore
+
+from nixnet import constants
+from nixnet import database
+from nixnet import types
+
+
+def _add_signal(collection, name, start_bit, num_bits, byte_ordr=constants.SigByteOrdr.LITTLE_ENDIAN):
+    signal = collection.add(name)
+    signal.start_bit = start_bit
+    signal.num_bits = num_bits
+    signal.byte_ordr = byte_ordr
+    return signal
+
+
+@pytest.fixture
+def cluster():
+    db = database.MemoryDatabase('test')
+    cluster = db.clusters.add('Body')
+
+    frame = cluster.frames.add('Doors')
+    frame.payload_len = 2
+    _add_signal(frame.mux_static_signals, 'Mode', 0, 2).mux_is_data_mux = True
+    _add_signal(frame.mux_static_signals, 'Status', 2, 2)
+    for name, mux_value, signals in (
+            ('Mode1', 1, [('Speed', 8, 8)]),
+            ('Mode2', 2, [('Torque', 8, 4), ('Flags', 3, 2)]),
+            ('Mode2b', 2, [('Gear', 10, 2)])):
+        subframe = frame.mux_subframes.add(name)
+        subframe.mux_value = mux_value
+        for signal_name, start_bit, num_bits in signals:
+            _add_signal(subframe.dyn_signals, signal_name, start_bit, num_bits)
+
+    pdu = cluster.pdus.add('Lights')
+    pdu.payload_len = 1
+    _add_signal(pdu.mux_static_sigs, 'Beam', 6, 4, constants.SigByteOrdr.BIG_ENDIAN)
+    _add_signal(pdu.mux_static_sigs, 'Fog', 4, 2)
+    return cluster
+
+
+def test_analyze_multiplexed_frame(cluster):
+    layout, = database.analyze_bit_layout(cluster.frames['Doors'])
+
+    assert layout.object_class == constants.ObjectClass.FRAME
+    assert layout.path == 'Body.Doors'
+    assert layout.payload_bits == 16
+    assert layout.static_mask == 0b1111
+    assert layout.branch_masks == {1: 0xFF00, 2: 0x0F18}
+    assert layout.overlaps == [
+        database.SignalOverlap('Body.Doors.Flags', 'Body.Doors.Status', 2, 0b1000),
+        database.SignalOverlap('Body.Doors.Gear', 'Body.Doors.Torque', 2, 0b1100 << 8),
+    ]
+    assert layout.out_of_payload == []
+    assert layout.unused_bits == [5, 6, 7]
+    assert layout.utilization == 13 / 16
+    assert layout.branch_utilization(1) == 12 / 16
+    assert layout.branch_utilization(3) == 4 / 16
+
+
+def test_analyze_big_endian_out_of_payload(cluster):
+    layout, = database.analyze_bit_layout(cluster.pdus['Lights'])
+
+    assert layout.object_class == constants.ObjectClass.PDU
+    assert layout.out_of_payload == [database.SignalOutOfPayload('Body.Lights.Beam', 6, 8)]
+    assert layout.out_of_payload[0].start_bit_in_payload
+    assert layout.static_mask == 0b110000
+    assert layout.utilization == 0.25
+
+
+def test_analyze_frame_with_pdus(cluster):
+    indicators = cluster.pdus.add('Indicators')
+    indicators.payload_len = 1
+    _add_signal(indicators.mux_static_sigs, 'Left', 0, 2)
+    frame = cluster.frames.add('Lamps')
+    frame.payload_len = 2
+    frame.pdu_properties = [
+        types.PduProperties(cluster.pdus['Lights'], 0, 15),
+        types.PduProperties(indicators, 4, -1),
+    ]
+
+    layouts = database.analyze_bit_layout(cluster)
+    assert [layout.path for layout in layouts] == ['Body.Lights', 'Body.Indicators', 'Body.Doors', 'Body.Lamps']
+    layout = layouts[-1]
+    assert layout.static_mask == 0x8030
+    assert layout.overlaps == []
+    assert layout.pdu_overlaps == [database.PduOverlap('Body.Indicators', 'Body.Lights', 0xF0)]
+    assert layout.utilization == 3 / 16
+    assert database.analyze_bit_layout(frame)[0].static_mask == 0x8030
+
+
+def test_analyze_database_and_cluster(cluster):
+    layouts = database.analyze_bit_layout(cluster.database)
+    assert [layout.path for layout in layouts] == ['Body.Lights', 'Body.Doors']
+    assert [layout.path for layout in database.analyze_bit_layout(cluster)] == ['Body.Lights', 'Body.Doors']
+
+    with pytest.raises(ValueError):
+        database.analyze_bit_layout(cluster.ecus.add('Ecu'))
+
+
+def test_signal_bit_mask():
+    class Sig(object):
+        start_bit = 7
+        num_bits = 10
+        byte_ordr = constants.SigByteOrdr.LITTLE_ENDIAN
+
+    assert database.signal_bit_mask(Sig()) == 0x3FF << 7
+    Sig.byte_ordr = constants.SigByteOrdr.BIG_ENDIAN
+    assert database.signal_bit_mask(Sig()) < 0
+    Sig.start_bit = 15
+    Sig.num_bits = 9
+    assert database.signal_bit_mask(Sig()) == 0x8000 | 0x00FF
@@ -0,0 +1,274 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import io
+import pytest  # type: ignore
+
+from nixnet import _cconsts
+from nixnet import constants
+from nixnet import database
+from nixnet import errors
+
+
+_LDF = u'''
+/* Example LIN cluster */
+LIN_description_file;
+LIN_protocol_version = "2.1";
+LIN_language_version = "2.1";
+LIN_speed = 19.2 kbps;
+
+Nodes {
+    Master: Gateway, 5 ms, 0.1 ms;
+    Slaves: Door, Seat;
+}
+
+Signals {
+    Lock: 2, 1, Gateway, Door;
+    Position: 10, 100, Seat, Gateway;
+    Serial: 16, {0x34, 0x12}, Door, Gateway;
+}
+
+Diagnostic_signals {
+    MasterReqB0: 8, 0;
+    SlaveRespB0: 8, 0;
+}
+
+Frames {
+    DoorCmd: 0x10, Gateway, 1 {
+        Lock, 0;
+    }
+    SeatStatus: 0x11, Seat, 2 {
+        Position, 0;
+    }
+    DoorStatus: 0x12, Door, 2 {
+        Serial, 0;
+    }
+}
+
+Sporadic_frames {
+    SporadicCmd: DoorCmd;
+}
+
+Event_triggered_frames {
+    StatusEvent: Collision, 0x3A, SeatStatus, DoorStatus;
+}
+
+Diagnostic_frames {
+    MasterReq: 0x3C {
+        MasterReqB0, 0;
+    }
+    SlaveResp: 0x3D {
+        SlaveRespB0, 0;
+    }
+}
+
+Node_attributes {
+    Door {
+        LIN_protocol = "2.1";
+        configured_NAD = 0x02;
+        initial_NAD = 0x12;
+        product_id = 0x1E, 0x0102, 0;
+        response_error = Lock;
+        P2_min = 50 ms;
+        ST_min = 5 ms;
+        configurable_frames {
+            DoorCmd;
+            DoorStatus;
+            StatusEvent;
+        }
+    }
+    Seat {
+        LIN_protocol = "1.3";
+        configured_NAD = 0x03;
+    }
+}
+
+Schedule_tables {
+    Normal {
+        DoorCmd delay 10 ms;
+        SeatStatus delay 10 ms;
+        StatusEvent delay 15 ms;
+        SporadicCmd delay 10 ms;
+        DoorCmd delay 10 ms;
+    }
+    Collision {
+        SeatStatus delay 10 ms;
+        DoorStatus delay 10 ms;
+    }
+    Config {
+        AssignNAD { Door } delay 20 ms;
+        AssignFrameIdRange { Door, 0 } delay 20 ms;
+        SaveConfiguration { Door } delay 20 ms;
+        FreeFormat { 0x7F, 0x06, 0xB2, 0x00, 0xFF, 0x7F, 0xFF, 0xFF } delay 20 ms;
+        MasterReq delay 20 ms;
+        SlaveResp delay 20 ms;
+    }
+}
+
+Signal_encoding_types {
+    LockEncoding {
+        logical_value, 0, "Unlocked";
+        logical_value, 1, "Locked";
+    }
+    PositionEncoding {
+        physical_value, 0, 1000, 0.1, -50, "mm";
+        logical_value, 1023, "Invalid";
+    }
+}
+
+Signal_representation {
+    LockEncoding: Lock;
+    PositionEncoding: Position;
+}
+'''
+
+
+def _write_ldf(tmpdir, text):
+    path = str(tmpdir.join('test.ldf'))
+    with io.open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    return path
+
+
+def test_ldf_cluster_and_nodes(tmpdir):
+    db = database.load(_write_ldf(tmpdir, _LDF))
+    assert db.name == 'test'
+    cluster = db.clusters['Cluster']
+    assert cluster.protocol == constants.Protocol.LIN
+    assert cluster.baud_rate == 19200
+    assert cluster.lin_tick == pytest.approx(0.005)
+    assert list(cluster.ecus.keys()) == ['Gateway', 'Door', 'Seat']
+
+    gateway = cluster.ecus['Gateway']
+    door = cluster.ecus['Door']
+    seat = cluster.ecus['Seat']
+    assert gateway.lin_master
+    assert not door.lin_master
+    assert door.lin_protocol_ver == constants.LinProtocolVer.VER_2_1
+    assert seat.lin_protocol_ver == constants.LinProtocolVer.VER_1_3
+    assert door.lin_initial_nad == 0x12
+    assert door.lin_config_nad == 0x02
+    assert door.lin_supplier_id == 0x1E
+    assert door.lin_function_id == 0x0102
+    assert door.lin_p2_min == pytest.approx(0.050)
+    assert door.lin_st_min == pytest.approx(0.005)
+    assert seat.lin_initial_nad == 0x03
+
+    frames = cluster.frames
+    assert [f.name for f in gateway.tx_frms] == ['DoorCmd', 'MasterReq']
+    assert [f.name for f in gateway.rx_frms] == ['SeatStatus', 'DoorStatus', 'SlaveResp']
+    assert [f.name for f in door.tx_frms] == ['DoorStatus', 'SlaveResp']
+    assert [f.name for f in door.rx_frms] == ['DoorCmd', 'MasterReq']
+    assert frames['DoorCmd'].lin_checksum == constants.FrmLinChecksum.ENHANCED
+    assert frames['SeatStatus'].lin_checksum == constants.FrmLinChecksum.CLASSIC
+    assert frames['MasterReq'].lin_checksum == constants.FrmLinChecksum.CLASSIC
+
+
+def test_ldf_frames_and_signals(tmpdir):
+    db = database.load_ldf(_write_ldf(tmpdir, _LDF))
+    cluster = db.clusters['Cluster']
+
+    frame = cluster.frames['SeatStatus']
+    assert frame.id == 0x11
+    assert frame.payload_len == 2
+    assert frame.default_payload == [100, 0xFC]
+    assert cluster.frames['DoorStatus'].default_payload == [0x34, 0x12]
+    assert cluster.frames['DoorCmd'].default_payload == [0xFD]
+    assert cluster.frames['MasterReq'].id == 0x3C
+
+    position = frame.mux_static_signals['Position']
+    assert position.num_bits == 10
+    assert position.byte_ordr == constants.SigByteOrdr.LITTLE_ENDIAN
+    assert position.data_type == constants.SigDataType.UNSIGNED
+    assert position.scale_fac == pytest.approx(0.1)
+    assert position.scale_off == -50
+    assert position.min == pytest.approx(-50)
+    assert position.max == pytest.approx(50)
+    assert position.unit == 'mm'
+    assert position.default == pytest.approx(-40)
+    assert dict(position.dbc_signal_value_table) == {'Invalid': 1023}
+
+    lock = cluster.frames['DoorCmd'].mux_static_signals['Lock']
+    assert sorted(lock.dbc_signal_value_table.items()) == [('Locked', 1), ('Unlocked', 0)]
+    assert lock.max == 3
+
+    for frame in cluster.frames.values():
+        frame.check_config_status()
+
+
+def test_ldf_schedules(tmpdir):
+    db = database.load_ldf(_write_ldf(tmpdir, _LDF))
+    cluster = db.clusters['Cluster']
+    frames = cluster.frames
+    assert list(cluster.lin_schedules.keys()) == ['Normal', 'Collision', 'Config']
+
+    normal = cluster.lin_schedules['Normal']
+    collision = cluster.lin_schedules['Collision']
+    assert normal.run_mode == constants.LinSchedRunMode.CONTINUOUS
+    assert collision.run_mode == constants.LinSchedRunMode.ONCE
+    assert normal.clst is cluster
+    assert list(normal.entries.keys()) == ['DoorCmd', 'SeatStatus', 'StatusEvent', 'SporadicCmd', 'DoorCmd_2']
+
+    entry = normal.entries['DoorCmd']
+    assert entry.type == constants.LinSchedEntryType.UNCONDITIONAL
+    assert entry.delay == pytest.approx(0.010)
+    assert entry.frames == [frames['DoorCmd']]
+    assert entry.sched is normal
+
+    entry = normal.entries['StatusEvent']
+    assert entry.type == constants.LinSchedEntryType.EVENT_TRIGGERED
+    assert entry.event_id == 0x3A
+    assert entry.collision_res_sched is collision
+    assert entry.frames == [frames['SeatStatus'], frames['DoorStatus']]
+    assert normal.entries['SporadicCmd'].type == constants.LinSchedEntryType.SPORADIC
+
+    assert normal.entries['SeatStatus'].name_unique_to_cluster == 'Normal.SeatStatus'
+    assert normal.entries['DoorCmd'].name_unique_to_cluster == 'DoorCmd'
+    assert cluster.find(database.LinSchedEntry, 'Collision.SeatStatus') is collision.entries['SeatStatus']
+
+
+def test_ldf_node_configuration(tmpdir):
+    db = database.load_ldf(_write_ldf(tmpdir, _LDF))
+    config = db.clusters['Cluster'].lin_schedules['Config']
+
+    entries = config.entries
+    node_config = constants.LinSchedEntryType.NODE_CONFIG_SERVICE
+    assert entries['AssignNAD'].type == node_config
+    assert entries['AssignNAD'].nc_ff_data_bytes == [0x12, 0x06, 0xB0, 0x1E, 0x00, 0x02, 0x01, 0x02]
+    assert entries['AssignFrameIdRange'].nc_ff_data_bytes == [0x02, 0x06, 0xB7, 0, 0x50, 0x92, 0xBA, 0xFF]
+    assert entries['SaveConfiguration'].nc_ff_data_bytes == [0x02, 0x01, 0xB6, 0xFF, 0xFF, 0xFF, 0xFF, 0xFF]
+    assert entries['FreeFormat'].nc_ff_data_bytes == [0x7F, 0x06, 0xB2, 0x00, 0xFF, 0x7F, 0xFF, 0xFF]
+    assert entries['AssignNAD'].frames == [db.clusters['Cluster'].frames['MasterReq']]
+    assert entries['MasterReq'].type == constants.LinSchedEntryType.UNCONDITIONAL
+    assert entries['SlaveResp'].frames == [db.clusters['Cluster'].frames['SlaveResp']]
+
+
+def test_ldf_2_2_node_timing(tmpdir):
+    # LIN 2.2A and ISO 17987 files add bit length and tolerance to the master, and a response tolerance to slaves.
+    text = _LDF.replace(
+        u'Master: Gateway, 5 ms, 0.1 ms;', u'Master: Gateway, 5 ms, 0.1 ms, 48 bits, 40 %;').replace(
+        u'ST_min = 5 ms;', u'ST_min = 5 ms;\n        response_tolerance = 38 %;')
+    cluster = database.load_ldf(_write_ldf(tmpdir, text)).clusters['Cluster']
+    assert cluster.lin_tick == pytest.approx(0.005)
+    assert list(cluster.ecus.keys()) == ['Gateway', 'Door', 'Seat']
+    door = cluster.ecus['Door']
+    assert door.lin_st_min == pytest.approx(0.005)
+    assert [f.name for f in door.tx_frms] == ['DoorStatus', 'SlaveResp']
+
+
+def test_ldf_errors(tmpdir):
+    path = _write_ldf(tmpdir, u'Nodes {\n    Master: Gateway 5 ms;\n}\n')
+    with pytest.raises(errors.XnetError) as excinfo:
+        database.load_ldf(path)
+    assert excinfo.value.error_code == _cconsts.NX_ERR_CANNOT_OPEN_DATABASE_FILE
+    assert 'test.ldf:2:' in str(excinfo.value)
+
+    path = _write_ldf(tmpdir, u'Schedule_tables {\n    Table {\n        Missing delay 10 ms;\n    }\n}\n')
+    with pytest.raises(errors.XnetError) as excinfo:
+        database.load_ldf(path)
+    assert 'test.ldf:3:' in str(excinfo.value)
+
+    path = _write_ldf(tmpdir, u'Nodes { Master: Gateway, 5 ms, 0.1 ms; ')
+    with pytest.raises(errors.XnetError):
+        database.load_ldf(path)
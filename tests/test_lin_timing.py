@@ -0,0 +1,133 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import pytest  # type: ignore
+
+from nixnet import _cconsts
+from nixnet import constants
+from nixnet import database
+from nixnet import errors
+
+
+def _add_schedule(cluster, name, entries, run_mode=constants.LinSchedRunMode.CONTINUOUS, priority=0):
+    sched = cluster.lin_schedules.add(name)
+    sched.run_mode = run_mode
+    sched.priority = priority
+    for entry_name, delay, frame_names in entries:
+        entry = sched.entries.add(entry_name)
+        entry.delay = delay
+        entry.frames = [cluster.frames[frame_name] for frame_name in frame_names]
+    return sched
+
+
+@pytest.fixture
+def cluster():
+    cluster = database.MemoryDatabase('test').clusters.add('Body')
+    cluster.protocol = constants.Protocol.LIN
+    cluster.baud_rate = 19200
+    cluster.lin_tick = 0.005
+    for name, payload_len in (('Lights', 2), ('Doors', 8), ('Diag', 4)):
+        cluster.frames.add(name).payload_len = payload_len
+    _add_schedule(cluster, 'Normal', [
+        ('Lights1', 0.01, ['Lights']),
+        # Rounded up to three ticks.
+        ('Doors', 0.012, ['Doors']),
+        ('Lights2', 0.005, ['Lights'])])
+    _add_schedule(cluster, 'Service', [
+        ('Diag1', 0.01, ['Diag']),
+        ('Diag2', 0.01, ['Diag'])], constants.LinSchedRunMode.ONCE, 2)
+    _add_schedule(cluster, 'Sleep', [], constants.LinSchedRunMode.NULL)
+    return cluster
+
+
+def test_lin_frame_time():
+    assert database.lin_frame_time(2, 19200) == pytest.approx(1.4 * 64 / 19200)
+    assert database.lin_frame_time(8, 10000) == pytest.approx(1.4 * 124 / 10000)
+
+
+def test_analyze_lin_schedule(cluster):
+    timing = database.analyze_lin_schedule(cluster.lin_schedules['Normal'])
+
+    assert [(slot.time, slot.entry, slot.frames) for slot in timing.slots] == [
+        (0.0, 'Lights1', ('Lights',)),
+        (0.01, 'Doors', ('Doors',)),
+        (pytest.approx(0.025), 'Lights2', ('Lights',))]
+    assert timing.cycle == pytest.approx(0.03)
+    lights, doors = timing.frames
+    assert (lights.name, lights.num_slots, lights.latency) == ('Lights', 2, pytest.approx(0.025))
+    assert (doors.name, doors.num_slots, doors.latency) == ('Doors', 1, pytest.approx(0.03))
+    assert timing.utilization == pytest.approx((2 * 64 + 124) * 1.4 / 19200 / 0.03)
+    assert timing.overruns == []
+
+    assert [slot.entry for slot in database.analyze_lin_schedule(
+        cluster.lin_schedules['Normal'], baud_rate=2400).overruns] == ['Lights1', 'Doors', 'Lights2']
+
+
+def test_simulate_schedule_changes(cluster):
+    timeline = database.simulate_lin_schedules(cluster, [
+        (0.0, 'Normal'),
+        (0.04, cluster.lin_schedules['Service']),
+        (1.0, 'Sleep'),
+        (2.0, 0)])
+
+    assert [(segment.sched, segment.start, segment.end) for segment in timeline.segments] == [
+        ('Normal', 0.0, pytest.approx(0.04)),
+        ('Service', pytest.approx(0.04), pytest.approx(0.06)),
+        ('Normal', pytest.approx(0.06), pytest.approx(1.005)),
+        ('Normal', 2.0, None)]
+    assert timeline.schedule_at(0.05) == 'Service'
+    assert timeline.schedule_at(1.5) is None
+
+    # Normal resumes with the entry after the one the run-once schedule replaced.
+    assert [(slot.entry, slot.time) for slot in timeline.slots(0.03, 0.08)] == [
+        ('Lights1', pytest.approx(0.03)),
+        ('Diag1', pytest.approx(0.04)),
+        ('Diag2', pytest.approx(0.05)),
+        ('Doors', pytest.approx(0.06)),
+        ('Lights2', pytest.approx(0.075))]
+
+    assert timeline.count('Diag', 0.0, 10.0) == 2
+    assert timeline.count('Lights', 0.0, 0.04) == 3
+    assert timeline.count('Lights', 2.0, 3602.0) == 240000
+    assert timeline.latency('Lights', 0.03, 0.2) == pytest.approx(0.045)
+    assert timeline.latency('Lights', 0.0, 3.0) == pytest.approx(1.02)
+    assert timeline.latency('Lights', 2.0, 3602.0) == pytest.approx(0.025)
+    assert timeline.latency('Diag', 3.0, 4.0) == 1.0
+    assert timeline.utilization(2.0, 3602.0) == pytest.approx(timeline.schedules[0].utilization)
+
+
+def test_simulate_run_once_priority(cluster):
+    _add_schedule(cluster, 'Urgent', [('Urgent', 0.005, ['Diag'])], constants.LinSchedRunMode.ONCE, 1)
+    timeline = database.simulate_lin_schedules(cluster, [
+        (0.0, 'Service'),
+        (0.001, 'Service'),
+        (0.002, 'Urgent'),
+        (0.003, 'Normal')])
+
+    assert [(segment.sched, segment.start) for segment in timeline.segments] == [
+        ('Service', 0.0),
+        ('Urgent', pytest.approx(0.02)),
+        ('Service', pytest.approx(0.025)),
+        ('Normal', pytest.approx(0.045))]
+
+    # A null schedule flushes the pending run-once schedules.
+    timeline = database.simulate_lin_schedules(cluster, [(0.0, 'Service'), (0.001, 'Urgent'), (0.015, 'Sleep')])
+    assert [(segment.sched, segment.end) for segment in timeline.segments] == [
+        ('Service', pytest.approx(0.02))]
+
+
+def test_simulate_invalid(cluster):
+    with pytest.raises(ValueError):
+        database.simulate_lin_schedules(cluster, [(0.0, cluster.lin_schedules.add('Empty'))])
+    with pytest.raises(KeyError):
+        database.simulate_lin_schedules(cluster, [(0.0, 'Missing')])
+
+    cluster.baud_rate = 0
+    with pytest.raises(errors.XnetError) as excinfo:
+        database.simulate_lin_schedules(cluster, [])
+    assert excinfo.value.error_code == _cconsts.NX_ERR_BAUD_RATE_NOT_CONFIGURED
+
+    cluster.protocol = constants.Protocol.CAN
+    with pytest.raises(ValueError):
+        database.analyze_lin_schedule(cluster.lin_schedules['Normal'])
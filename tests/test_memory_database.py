@@ -0,0 +1,126 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import pytest  # type: ignore
+
+from nixnet import _cconsts
+from nixnet import constants
+from nixnet import database
+from nixnet import errors
+from nixnet import types
+
+
+def _create_database():
+    db = database.MemoryDatabase('Test')
+    cluster = db.clusters.add('CAN_Cluster')
+    frame = cluster.frames.add('Frame1')
+    frame.id = 1
+    frame.payload_len = 2
+    signal = frame.mux_static_signals.add('Sig')
+    signal.num_bits = 8
+    frame2 = cluster.frames.add('Frame2')
+    frame2.payload_len = 1
+    signal2 = frame2.mux_static_signals.add('Sig')
+    signal2.num_bits = 8
+    return db, cluster, frame, signal, frame2, signal2
+
+
+def test_memory_collection():
+    db, cluster, frame, signal, frame2, signal2 = _create_database()
+
+    assert list(cluster.frames.keys()) == ['Frame1', 'Frame2']
+    assert list(cluster.frames.values()) == [frame, frame2]
+    assert list(cluster.frames.items()) == [('Frame1', frame), ('Frame2', frame2)]
+    assert 'Frame1' in cluster.frames
+    with pytest.raises(KeyError):
+        cluster.frames['Missing']
+    with pytest.raises(TypeError):
+        cluster.frames[1]
+
+    with pytest.raises(errors.XnetError) as excinfo:
+        cluster.frames.add('Frame1')
+    assert excinfo.value.error_code == _cconsts.NX_ERR_DUPLICATE_FRAME_NAME
+
+    frame2.name = 'Renamed'
+    assert list(cluster.frames.keys()) == ['Frame1', 'Renamed']
+    with pytest.raises(errors.XnetError):
+        frame2.name = 'Frame1'
+
+    del cluster.frames['Renamed']
+    assert list(cluster.frames.keys()) == ['Frame1']
+
+
+def test_memory_name_unique_to_cluster():
+    db, cluster, frame, signal, frame2, signal2 = _create_database()
+
+    assert signal.name_unique_to_cluster == 'Frame1.Sig'
+    assert signal2.name_unique_to_cluster == 'Frame2.Sig'
+
+    signal2.name = 'Other'
+    assert signal.name_unique_to_cluster == 'Sig'
+    assert signal2.name_unique_to_cluster == 'Other'
+
+    del frame2.mux_static_signals['Other']
+    frame2.mux_static_signals.add('Sig')
+    assert signal.name_unique_to_cluster == 'Frame1.Sig'
+
+
+def test_memory_find():
+    db, cluster, frame, signal, frame2, signal2 = _create_database()
+
+    assert db.find(database.Cluster, 'CAN_Cluster') is cluster
+    assert cluster.find(database.Frame, 'Frame2') is frame2
+    assert db.find(database.MemorySignal, 'CAN_Cluster.Frame1.Sig') is signal
+    assert cluster.find(database.Signal, 'Frame2.Sig') is signal2
+    with pytest.raises(errors.XnetError):
+        cluster.find(database.Signal, 'Sig')
+    with pytest.raises(errors.XnetError):
+        cluster.find(database.Signal, 'Missing')
+    with pytest.raises(ValueError):
+        cluster.find(int, 'Sig')
+
+
+def test_memory_pdu():
+    db, cluster, frame, signal, frame2, signal2 = _create_database()
+    pdu = cluster.pdus.add('Pdu')
+    pdu.payload_len = 1
+    pdu_signal = pdu.mux_static_sigs.add('PduSig')
+    pdu_signal.num_bits = 4
+
+    assert pdu.frms == []
+    assert pdu_signal.frame is None
+    frame.pdu_properties = [types.PduProperties(pdu, 8, -1)]
+    assert pdu.frms == [frame]
+    assert pdu_signal.frame is frame
+    assert pdu_signal.pdu is pdu
+    assert signal.pdu is None
+    assert [s.name for s in frame.sigs] == ['Sig', 'PduSig']
+    assert [s.name for s in cluster.sigs] == ['Sig', 'Sig', 'PduSig']
+
+
+def test_memory_check_config_status():
+    db, cluster, frame, signal, frame2, signal2 = _create_database()
+    frame.check_config_status()
+
+    signal.start_bit = 12
+    with pytest.raises(errors.XnetError) as excinfo:
+        frame.check_config_status()
+    assert excinfo.value.error_code == _cconsts.NX_ERR_DB_CONFIG_SIG_OUT_OF_FRAME
+
+    signal.byte_ordr = constants.SigByteOrdr.BIG_ENDIAN
+    frame.check_config_status()
+
+    signal.num_bits = 53
+    with pytest.raises(errors.XnetError) as excinfo:
+        signal.check_config_status()
+    assert excinfo.value.error_code == _cconsts.NX_ERR_DB_CONFIG_SIG52_BIT_INTEGER
+
+    signal.data_type = constants.SigDataType.IEEE_FLOAT
+    with pytest.raises(errors.XnetError):
+        signal.check_config_status()
+
+    frame.payload_len = 9
+    with pytest.raises(errors.XnetError) as excinfo:
+        frame.check_config_status()
+    assert excinfo.value.error_code == _cconsts.NX_ERR_DB_CONFIG_FRAME_NUM_BYTES
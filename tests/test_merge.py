@@ -0,0 +1,127 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import gc
+import io
+import os
+import pytest  # type: ignore
+
+from nixnet import _cconsts
+from nixnet import constants
+from nixnet import database
+from nixnet import errors
+from nixnet import types
+
+
+def _write_dbc(tmpdir, name, ecu, frames, baud_rate=500000):
+    lines = [u'VERSION ""', u'', u'BU_: {} Gateway'.format(ecu), u'']
+    for frame_name, frame_id, signals in frames:
+        lines.append(u'BO_ {} {}: 8 {}'.format(frame_id, frame_name, ecu))
+        for signal_name, start_bit in signals:
+            lines.append(u' SG_ {} : {}|8@1+ (1,0) [0|255] "" Gateway'.format(signal_name, start_bit))
+        lines.append(u'')
+    lines.append(u'BA_DEF_ "Baudrate" INT 0 1000000;')
+    lines.append(u'BA_DEF_DEF_ "Baudrate" 0;')
+    lines.append(u'BA_ "Baudrate" {};'.format(baud_rate))
+    path = os.path.join(str(tmpdir), name + '.dbc')
+    with io.open(path, 'w', encoding='cp1252') as f:
+        f.write(u'\n'.join(lines) + u'\n')
+    return path
+
+
+def test_merge_ecu_databases(tmpdir):
+    paths = [
+        _write_dbc(tmpdir, 'body', 'Body', [('Doors', 288, [('Lock', 0)])]),
+        _write_dbc(tmpdir, 'engine', 'Engine', [('Rpm', 100, [('Speed', 0), ('Load', 8)])]),
+        # The gateway file repeats the engine frame.
+        _write_dbc(tmpdir, 'gateway', 'Engine', [('Rpm', 100, [('Speed', 0), ('Load', 8)])]),
+    ]
+    merged = database.merge_databases(paths, database_name='vehicle', cluster_name='Powertrain')
+
+    assert merged.name == 'vehicle'
+    cluster = merged.clusters['Powertrain']
+    assert cluster.database is merged
+    assert list(cluster.frames) == ['Doors', 'Rpm']
+    assert list(cluster.frames['Rpm'].mux_static_signals) == ['Speed', 'Load']
+    assert list(cluster.ecus) == ['Body', 'Gateway', 'Engine']
+    assert cluster.ecus['Engine'].tx_frms == [cluster.frames['Rpm']]
+    assert cluster.ecus['Gateway'].rx_frms == [cluster.frames['Doors'], cluster.frames['Rpm']]
+    assert merged.find(database.Signal, 'Powertrain.Rpm.Load').frame is cluster.frames['Rpm']
+
+
+def test_merge_frames_by_identifier(tmpdir):
+    left = database.load(_write_dbc(tmpdir, 'left', 'Body', [('Doors', 288, [('Lock', 0)])]))
+    right = database.load(_write_dbc(tmpdir, 'right', 'Body', [('DoorStatus', 288, [('Lock', 0), ('Ajar', 8)])]))
+
+    with pytest.raises(errors.XnetError) as excinfo:
+        database.merge_databases([left, right])
+    assert excinfo.value.error_code == _cconsts.NX_ERR_DUPLICATE_FRAME_OBJECT
+
+    with pytest.raises(errors.XnetError):
+        database.merge_databases([left, right], policy=database.MergePolicy.RENAME)
+
+    cluster = database.merge_databases([left, right], policy=database.MergePolicy.PREFER_LEFT).clusters['Cluster']
+    assert list(cluster.frames) == ['Doors']
+    assert list(cluster.frames['Doors'].mux_static_signals) == ['Lock']
+    assert cluster.ecus['Body'].tx_frms == [cluster.frames['Doors']]
+
+    cluster = database.merge_databases([left, right], policy=database.MergePolicy.PREFER_RIGHT).clusters['Cluster']
+    assert list(cluster.frames) == ['DoorStatus']
+    assert list(cluster.frames['DoorStatus'].mux_static_signals) == ['Lock', 'Ajar']
+    assert cluster.ecus['Body'].tx_frms == [cluster.frames['DoorStatus']]
+
+    # The sources are not changed.
+    assert list(left.clusters['Cluster'].frames) == ['Doors']
+
+
+def test_merge_policies_per_class(tmpdir):
+    left = database.load(_write_dbc(tmpdir, 'left', 'Body', [('Doors', 288, [('Lock', 0)])]))
+    right = database.load(_write_dbc(tmpdir, 'right', 'Body', [('Doors', 289, [('Lock', 0)])], baud_rate=250000))
+
+    with pytest.raises(errors.XnetError) as excinfo:
+        database.merge_databases([left, right], policies={
+            constants.ObjectClass.FRAME: database.MergePolicy.RENAME})
+    assert excinfo.value.error_code == _cconsts.NX_ERR_DUPLICATE_CLUSTER_NAME
+
+    merged = database.merge_databases([left, right], policies={
+        constants.ObjectClass.CLUSTER: database.MergePolicy.PREFER_RIGHT,
+        constants.ObjectClass.FRAME: database.MergePolicy.RENAME})
+    cluster = merged.clusters['Cluster']
+    assert cluster.baud_rate == 250000
+    assert [(frame.name, frame.id) for frame in cluster.frames.values()] == [('Doors', 288), ('Doors_2', 289)]
+    assert cluster.ecus['Body'].tx_frms == list(cluster.frames.values())
+
+
+def test_merge_unsupported_source():
+    with pytest.raises(TypeError):
+        database.merge_databases([object()])
+
+
+def test_merge_replaced_objects_after_garbage_collection():
+    # PREFER_RIGHT replaces the PDUs of the first source, and the third source maps new PDUs to frames.
+    sources = []
+    for payload_len, mapped in ((1, False), (3, False), (3, True)):
+        db = database.MemoryDatabase('source')
+        cluster = db.clusters.add('Cluster')
+        for index in range(50):
+            cluster.pdus.add('Old{}'.format(index)).payload_len = payload_len
+            if mapped:
+                pdu = cluster.pdus.add('New{}'.format(index))
+                frame = cluster.frames.add('Frame{}'.format(index))
+                frame.id = index
+                frame.pdu_properties = [types.PduProperties(pdu, 0, -1)]
+        sources.append(db)
+
+    def collected(sources):
+        # The replaced objects are freed between sources, so that new objects can reuse their ids.
+        for source in sources:
+            gc.collect()
+            yield source
+
+    merged = database.merge_databases(collected(sources), policy=database.MergePolicy.PREFER_RIGHT)
+    cluster = merged.clusters['Cluster']
+    assert cluster.pdus['Old0'].payload_len == 3
+    for index in range(50):
+        [properties] = cluster.frames['Frame{}'.format(index)].pdu_properties
+        assert properties.pdu is cluster.pdus['New{}'.format(index)]
@@ -0,0 +1,186 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import itertools
+
+import pytest  # type: ignore
+
+from nixnet import _frames
+from nixnet.capture import _units
+from nixnet import constants
+from nixnet import replay
+from nixnet import types
+
+_START = 131000000000000000
+
+
+@pytest.fixture(params=['python', 'numpy'])
+def scanner(request, monkeypatch):
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(_units, 'numpy', None)
+        monkeypatch.setattr(replay, 'numpy', None)
+    return request.param
+
+
+class _Clock(object):
+    """Simulated time, where each sleep can last longer than asked."""
+
+    def __init__(self, oversleep=1.0):
+        self.now = 0.0
+        self.oversleep = oversleep
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, delay):
+        self.now += delay * self.oversleep
+
+
+class _Interface(object):
+    out_strm_timng = constants.OutStrmTimng.IMMEDIATE
+
+
+class _Session(object):
+    """Stream output session whose interface transmits frames at their timestamps or after delay frames."""
+
+    def __init__(self, clock, capacity, pacing='timestamps'):
+        self.clock = clock
+        self.capacity = capacity
+        self.pacing = pacing
+        self.intf = _Interface()
+        self.frames = self
+        self.queue = []
+        self.written = []
+        self.writes = []
+        self.echoes = []
+        self.max_depth = 0
+        self.last_time = None
+        self.first = None
+
+    def write_bytes(self, frame_bytes, timeout):
+        frames = list(_frames.iterate_frames(frame_bytes))
+        self.writes.append(len(frames))
+        self.queue.extend((frame, self.clock.now) for frame in frames)
+        self.written.extend(frames)
+        self.max_depth = max(self.max_depth, len(self.queue))
+        assert len(self.queue) <= self.capacity
+
+    def _transmit_time(self, frame, written):
+        if self.pacing == 'delays':
+            start = written if self.last_time is None else max(self.last_time, written)
+            if frame.type == constants.FrameType.SPECIAL_DELAY:
+                return start + frame.timestamp / 1000.0
+            return start
+        if self.first is None:
+            self.first = (written, frame.timestamp)
+        return max(written, self.first[0] + (frame.timestamp - self.first[1]) / 1e7)
+
+    @property
+    def num_unused(self):
+        while self.queue:
+            frame, written = self.queue[0]
+            transmit_time = self._transmit_time(frame, written)
+            if transmit_time > self.clock.now + 1e-12:
+                break
+            self.queue.pop(0)
+            self.last_time = transmit_time
+            if frame.type != constants.FrameType.SPECIAL_DELAY:
+                self.echoes.append(types.RawFrame(
+                    _START + int(round(transmit_time * 1e7)), frame.identifier, frame.type, 0x80, 0, frame.payload))
+        return self.capacity - len(self.queue)
+
+
+class _EchoSession(object):
+
+    def __init__(self, session):
+        self.session = session
+        self.frames = self
+
+    def read_bytes(self, num_bytes):
+        echoes = self.session.echoes[:num_bytes // 24]
+        del self.session.echoes[:len(echoes)]
+        return b''.join(itertools.chain.from_iterable(_frames.serialize_frame(frame) for frame in echoes))
+
+
+def _recorded(count, gap):
+    return [
+        types.RawFrame(_START + index * gap, 0x100 + index % 5, constants.FrameType.CAN_DATA, 0, 0,
+                       bytes(bytearray([index & 0xFF])))
+        for index in range(count)]
+
+
+def _buffers(frames, per_buffer=64):
+    for start in range(0, len(frames), per_buffer):
+        yield b''.join(itertools.chain.from_iterable(
+            _frames.serialize_frame(frame) for frame in frames[start:start + per_buffer]))
+
+
+@pytest.mark.parametrize('speed', [0.5, 2.0])
+def test_replay_timestamps(scanner, speed):
+    clock = _Clock()
+    session = _Session(clock, 200)
+    recorded = _recorded(2000, 10000)
+    replayer = replay.Replayer(
+        session, _buffers(recorded), speed, echo_session=_EchoSession(session), clock=clock, sleep=clock.sleep)
+    assert session.intf.out_strm_timng == constants.OutStrmTimng.REPLAY_EXCLUSIVE
+    assert replayer.target_depth == 150
+    stats = replayer.run()
+
+    assert [frame.timestamp for frame in session.written] == [
+        _START + int(round(index * 10000 / speed)) for index in range(2000)]
+    assert [frame.payload for frame in session.written] == [frame.payload for frame in recorded]
+    assert (stats.frames, stats.delays, stats.underruns) == (2000, 0, 0)
+    # The queue is refilled when half of the target depth is left.
+    assert stats.writes == len(session.writes) < 2000 // 70
+    assert session.max_depth <= 150
+    assert clock.now == pytest.approx(1999 * 0.001 / speed, abs=0.01)
+    assert stats.timing_error.count == 2000
+    assert max(abs(stats.timing_error.min), abs(stats.timing_error.max)) < 1e-6
+
+
+def test_replay_delays(scanner):
+    clock = _Clock()
+    session = _Session(clock, 100, 'delays')
+    recorded = _recorded(1000, 4000)
+    replayer = replay.Replayer(
+        session, _buffers(recorded, 100), pacing='delays', target_depth=50,
+        echo_session=_EchoSession(session), clock=clock, sleep=clock.sleep)
+    stats = replayer.run()
+
+    delays = [frame.timestamp for frame in session.written if frame.type == constants.FrameType.SPECIAL_DELAY]
+    frames = [frame for frame in session.written if frame.type != constants.FrameType.SPECIAL_DELAY]
+    assert frames == recorded
+    # Gaps of 0.4 ms are carried until they round to a millisecond.
+    assert sum(delays) == 400
+    assert set(delays) == {1}
+    assert (stats.frames, stats.delays) == (1000, len(delays))
+    assert stats.timing_error.count == 1000
+    assert max(abs(stats.timing_error.min), abs(stats.timing_error.max)) <= 0.0005
+
+
+def test_replay_underruns(scanner):
+    clock = _Clock(oversleep=3.0)
+    session = _Session(clock, 20)
+    stats = replay.Replayer(
+        session, _buffers(_recorded(500, 10000)), target_depth=4, timing=None,
+        echo_session=_EchoSession(session), clock=clock, sleep=clock.sleep).run()
+    assert session.intf.out_strm_timng == constants.OutStrmTimng.IMMEDIATE
+    assert stats.frames == 500
+    assert stats.underruns > 0
+    assert stats.timing_error.max > 0
+
+
+def test_replay_errors():
+    clock = _Clock()
+    session = _Session(clock, 100)
+    with pytest.raises(ValueError):
+        replay.Replayer(session, [], speed=20.0)
+    with pytest.raises(ValueError):
+        replay.Replayer(session, [], pacing='sleep')
+    with pytest.raises(ValueError):
+        replay.Replayer(session, [], target_depth=101)
+    stats = replay.Replayer(session, [b''], clock=clock, sleep=clock.sleep).run()
+    assert stats == replay.ReplayStats(0, 0, 0, 0, types.JitterStats(0, 0, 0.0, 0.0, 0.0, 0.0))
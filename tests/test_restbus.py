@@ -0,0 +1,191 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import pytest  # type: ignore
+
+from nixnet import constants
+from nixnet import database
+from nixnet import restbus
+from nixnet import types
+
+
+class _Clock(object):
+    """Simulated time, where each sleep and each write takes a fixed delay."""
+
+    def __init__(self, write_delay=0.0):
+        self.now = 0.0
+        self.write_delay = write_delay
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, delay):
+        self.now += delay
+
+
+class _Frames(object):
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.writes = []
+
+    def write(self, frames):
+        self.writes.append((self.clock.now, [(int(frame.identifier), frame.payload) for frame in frames]))
+        self.clock.now += self.clock.write_delay
+
+
+class _Session(object):
+
+    def __init__(self, clock):
+        self.frames = _Frames(clock)
+
+
+def _add_frame(cluster, ecu, name, id, timing_type, tx_time, default_payload=(), signals=()):
+    frame = cluster.frames.add(name)
+    frame.id = id
+    frame.payload_len = 4
+    frame.can_timing_type = timing_type
+    frame.can_tx_time = tx_time
+    frame.default_payload = list(default_payload)
+    for signal_name, start_bit, num_bits, data_type, scale_fac in signals:
+        signal = frame.mux_static_signals.add(signal_name)
+        signal.start_bit = start_bit
+        signal.num_bits = num_bits
+        signal.data_type = data_type
+        signal.scale_fac = scale_fac
+    cluster.ecus[ecu].tx_frms.append(frame)
+    return frame
+
+
+@pytest.fixture
+def cluster():
+    cluster = database.MemoryDatabase('test').clusters.add('Body')
+    cluster.baud_rate = 500000
+    for name in ('Engine', 'Doors', 'Gateway'):
+        cluster.ecus.add(name)
+    _add_frame(cluster, 'Engine', 'Rpm', 0x100, constants.FrmCanTiming.CYCLIC_DATA, 0.01, [1, 2, 3, 4], [
+        ('Speed', 0, 16, constants.SigDataType.UNSIGNED, 0.25),
+        ('Temp', 16, 8, constants.SigDataType.SIGNED, 1.0)])
+    _add_frame(cluster, 'Doors', 'Locks', 0x200, constants.FrmCanTiming.CYCLIC_DATA, 0.025)
+    _add_frame(cluster, 'Doors', 'Alarm', 0x50, constants.FrmCanTiming.EVENT_DATA, 0.1)
+    _add_frame(cluster, 'Gateway', 'Diag', 0x3DF, constants.FrmCanTiming.CYCLIC_DATA, 1.0)
+    return cluster
+
+
+def test_transmit_plan(cluster):
+    clock = _Clock()
+    bus = restbus.Restbus(cluster, _Session(clock), ecus=['Engine', cluster.ecus['Doors']], clock=clock)
+
+    assert bus.plan == [
+        restbus.RestbusFrame('Rpm', 'Engine', 0x100, False, constants.FrmCanTiming.CYCLIC_DATA, 0.01),
+        restbus.RestbusFrame('Locks', 'Doors', 0x200, False, constants.FrmCanTiming.CYCLIC_DATA, 0.025),
+        restbus.RestbusFrame('Alarm', 'Doors', 0x50, False, constants.FrmCanTiming.EVENT_DATA, None)]
+    assert bus.payload('Rpm') == b'\x01\x02\x03\x04'
+    # Missing default payloads are zero.
+    assert bus.payload('Locks') == b'\x00\x00\x00\x00'
+
+    with pytest.raises(ValueError):
+        restbus.Restbus(cluster, {'Rpm': _Session(clock)}, ecus=['Engine', 'Doors'], clock=clock)
+
+
+def test_cyclic_writes_are_batched(cluster):
+    clock = _Clock()
+    session = _Session(clock)
+    bus = restbus.Restbus(cluster, session, clock=clock, sleep=clock.sleep)
+    bus.run(0.045)
+
+    times = [time for time, _ in session.frames.writes]
+    assert times == pytest.approx([0.0, 0.01, 0.02, 0.025, 0.03, 0.04])
+    assert [id for id, _ in session.frames.writes[0][1]] == [0x100, 0x200, 0x3DF]
+    stats = bus.jitter()
+    assert list(stats) == ['Rpm', 'Locks', 'Diag']
+    assert stats['Rpm'] == types.JitterStats(5, 0, 0.0, 0.0, 0.0, 0.0)
+    assert stats['Diag'].count == 1
+
+
+def test_sessions_per_frame(cluster):
+    clock = _Clock()
+    sessions = dict((name, _Session(clock)) for name in ('Rpm', 'Locks', 'Alarm', 'Diag'))
+    bus = restbus.Restbus(cluster, sessions, clock=clock)
+    bus.start()
+    assert bus.step() == 3
+    assert dict((name, len(session.frames.writes)) for name, session in sessions.items()) == {
+        'Rpm': 1, 'Locks': 1, 'Alarm': 0, 'Diag': 1}
+
+
+def test_late_writes_are_reported(cluster):
+    clock = _Clock(write_delay=0.004)
+    bus = restbus.Restbus(cluster, _Session(clock), ecus=['Engine'], clock=clock, sleep=clock.sleep)
+    bus.start()
+    bus.step()
+    clock.now = 0.035
+    bus.step()
+
+    stats = bus.jitter()['Rpm']
+    assert (stats.count, stats.missed) == (2, 2)
+    assert (stats.min, stats.max) == (0.0, pytest.approx(0.005))
+    assert stats.peak_to_peak == pytest.approx(0.005)
+    assert bus.next_deadline() == pytest.approx(0.04)
+
+
+def test_signal_overrides(cluster):
+    clock = _Clock()
+    session = _Session(clock)
+    bus = restbus.Restbus(cluster, session, clock=clock)
+
+    bus.set_signals('Rpm', {'Speed': 1000.0, 'Temp': -2})
+    assert bus.payload('Rpm') == b'\xa0\x0f\xfe\x04'
+    with pytest.raises(ValueError):
+        bus.set_signals('Rpm', {'Temp': -1, 'Speed': 20000.0})
+    # A failed update leaves the payload unchanged.
+    assert bus.payload('Rpm') == b'\xa0\x0f\xfe\x04'
+    with pytest.raises(ValueError):
+        bus.set_payload('Rpm', [0, 0])
+
+
+def test_event_frames(cluster):
+    clock = _Clock()
+    session = _Session(clock)
+    bus = restbus.Restbus(cluster, session, ecus=['Doors'], clock=clock)
+    bus.start()
+    bus.step()
+    assert [id for id, _ in session.frames.writes[-1][1]] == [0x200]
+
+    bus.set_payload('Alarm', [1, 0, 0, 0])
+    bus.step()
+    assert session.frames.writes[-1][1] == [(0x50, b'\x01\x00\x00\x00')]
+
+    # Event frames are not written more often than their transmit time.
+    clock.now = 0.05
+    bus.set_payload('Alarm', [2, 0, 0, 0])
+    bus.set_payload('Alarm', [3, 0, 0, 0])
+    clock.now = 0.09
+    bus.step()
+    assert [id for id, _ in session.frames.writes[-1][1]] == [0x200]
+    clock.now = 0.11
+    bus.step()
+    assert sorted(session.frames.writes[-1][1]) == [(0x50, b'\x03\x00\x00\x00'), (0x200, b'\x00\x00\x00\x00')]
+
+
+def test_many_frames():
+    cluster = database.MemoryDatabase('test').clusters.add('Body')
+    cluster.ecus.add('Ecu')
+    periods = (0.01, 0.02, 0.05, 0.1, 0.5)
+    for index in range(500):
+        _add_frame(cluster, 'Ecu', 'Frame{}'.format(index), index, constants.FrmCanTiming.CYCLIC_DATA,
+                   periods[index % len(periods)])
+    clock = _Clock()
+    session = _Session(clock)
+    bus = restbus.Restbus(cluster, session, clock=clock, sleep=clock.sleep)
+    bus.run(0.995)
+
+    assert len(session.frames.writes) == 100
+    assert sum(len(frames) for _, frames in session.frames.writes) == 100 * (100 + 50 + 20 + 10 + 2)
+    assert all(stats.missed == 0 and stats.max < 1e-9 for stats in bus.jitter().values())
+
+
+def test_restbus_requires_can(cluster):
+    cluster.protocol = constants.Protocol.LIN
+    with pytest.raises(ValueError):
+        restbus.Restbus(cluster, None)
@@ -0,0 +1,149 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+import pytest  # type: ignore
+import re
+
+from nixnet import constants
+from nixnet import database
+
+
+class _FakeObject(object):
+
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+def _fake_signal(name, unique_name=None):
+    return _FakeObject(name=name, name_unique_to_cluster=unique_name or name)
+
+
+def _fake_cluster(name, frames, ecus=()):
+    return _FakeObject(
+        name=name,
+        frames=dict((frame.name, frame) for frame in frames),
+        pdus=dict((frame.name, _FakeObject(name=frame.name)) for frame in frames),
+        ecus=dict((ecu, _FakeObject(name=ecu)) for ecu in ecus))
+
+
+def _fake_frame(name, signals):
+    return _FakeObject(name=name, sigs=signals)
+
+
+@pytest.fixture
+def engine_cluster():
+    return _fake_cluster('Powertrain', [
+        _fake_frame('EngineStatus', [
+            _fake_signal('EngineSpeed'),
+            _fake_signal('EngineTemp'),
+            _fake_signal('Checksum', 'EngineStatus.Checksum'),
+        ]),
+        _fake_frame('GearboxStatus', [
+            _fake_signal('GearboxTemp'),
+            _fake_signal('Checksum', 'GearboxStatus.Checksum'),
+        ]),
+    ], ecus=['ECM', 'TCM'])
+
+
+def test_search_index_prefix(engine_cluster):
+    index = database.SearchIndex(engine_cluster)
+    assert len(index) == 11
+    assert repr(index) == 'SearchIndex(signal=5, frame=2, pdu=2, ecu=2)'
+
+    results = index.prefix('Engine', constants.ObjectClass.SIGNAL)
+    assert [r.name for r in results] == ['EngineSpeed', 'EngineTemp']
+    assert [r.session_name for r in results] == ['EngineSpeed', 'EngineTemp']
+    assert all(r.cluster == 'Powertrain' for r in results)
+    assert all(r.object_class == constants.ObjectClass.SIGNAL for r in results)
+
+    assert [r.name for r in index.prefix('Engine')] == ['EngineSpeed', 'EngineTemp', 'EngineStatus', 'EngineStatus']
+    assert [r.name for r in index.prefix('Engine', database.Frame)] == ['EngineStatus']
+    assert index.prefix('engine') == []
+    assert len(index.prefix('', constants.ObjectClass.SIGNAL)) == 5
+
+
+def test_search_index_glob(engine_cluster):
+    index = database.SearchIndex(engine_cluster)
+
+    results = index.glob('*Temp', constants.ObjectClass.SIGNAL)
+    assert [r.session_name for r in results] == ['EngineTemp', 'GearboxTemp']
+
+    results = index.glob('Checksum', constants.ObjectClass.SIGNAL)
+    assert [r.session_name for r in results] == ['EngineStatus.Checksum', 'GearboxStatus.Checksum']
+
+    assert [r.name for r in index.glob('?CM', database.Ecu)] == ['ECM', 'TCM']
+    assert [r.name for r in index.glob('[!T]CM', database.Ecu)] == ['ECM']
+    assert [r.name for r in index.glob('[^T]CM', database.Ecu)] == ['TCM']
+    assert [r.name for r in index.glob('[ab', database.Ecu)] == []
+    assert index.glob('Engine', constants.ObjectClass.SIGNAL) == []
+
+
+def test_search_index_qualified(engine_cluster):
+    index = database.SearchIndex(engine_cluster)
+
+    results = index.glob('*.GearboxStatus.*', constants.ObjectClass.SIGNAL, qualified=True)
+    assert [r.name_unique_to_cluster for r in results] == ['GearboxStatus.Checksum', 'GearboxTemp']
+
+    results = index.regex(r'^Powertrain\.Engine', constants.ObjectClass.FRAME, qualified=True)
+    assert [r.name for r in results] == ['EngineStatus']
+
+
+def test_search_index_regex(engine_cluster):
+    index = database.SearchIndex(engine_cluster)
+
+    results = index.regex('Temp$', constants.ObjectClass.SIGNAL)
+    assert [r.name for r in results] == ['EngineTemp', 'GearboxTemp']
+
+    results = index.regex(re.compile('speed', re.IGNORECASE), constants.ObjectClass.SIGNAL)
+    assert [r.name for r in results] == ['EngineSpeed']
+
+
+def test_search_index_case_insensitive(engine_cluster):
+    index = database.SearchIndex(engine_cluster, case_sensitive=False)
+
+    assert [r.name for r in index.prefix('engines', database.Signal)] == ['EngineSpeed']
+    assert [r.name for r in index.glob('*TEMP', database.Signal)] == ['EngineTemp', 'GearboxTemp']
+    assert [r.name for r in index.regex('^gear', database.Frame)] == ['GearboxStatus']
+
+
+def test_search_index_multiple_clusters(engine_cluster):
+    body_cluster = _fake_cluster('Body', [
+        _fake_frame('Doors', [_fake_signal('DoorTemp')]),
+    ])
+    db = _FakeObject(clusters={'Powertrain': engine_cluster, 'Body': body_cluster})
+    index = database.SearchIndex(db)
+
+    results = index.glob('*Temp', constants.ObjectClass.SIGNAL)
+    assert sorted(r.session_name for r in results) == [
+        'Body.Doors.DoorTemp',
+        'Powertrain.EngineStatus.EngineTemp',
+        'Powertrain.GearboxStatus.GearboxTemp']
+
+    results = index.glob('Checksum', constants.ObjectClass.SIGNAL)
+    assert [r.session_name for r in results] == [
+        'Powertrain.EngineStatus.Checksum',
+        'Powertrain.GearboxStatus.Checksum']
+
+
+def test_search_index_invalid_object_class(engine_cluster):
+    index = database.SearchIndex(engine_cluster)
+    with pytest.raises(ValueError):
+        index.prefix('Engine', constants.ObjectClass.CLUSTER)
+    with pytest.raises(ValueError):
+        index.prefix('Engine', database.Cluster)
+
+
+@pytest.mark.integration
+def test_search_index_database():
+    database_filepath = os.path.join(os.path.dirname(__file__), 'databases\\attributes.dbc')
+    with database.Database(database_filepath) as db:
+        index = database.SearchIndex(db)
+
+        results = index.glob('Sig*', database.Signal)
+        assert [r.name for r in results] == ['Sig1', 'Sig2']
+        assert [r.session_name for r in results] == ['Sig1', 'Sig2']
+        assert results[0].obj == db.clusters['Cluster'].frames['Msg1'].mux_static_signals['Sig1']
+
+        assert [r.name for r in index.regex('^ECU', database.Ecu)] == ['ECU1', 'ECU2']
@@ -0,0 +1,98 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import pytest  # type: ignore
+
+from nixnet import _cconsts
+from nixnet import database
+from nixnet import errors
+
+
+def _database(signals, payload_len=2, subframes=()):
+    db = database.MemoryDatabase('test')
+    frame = db.clusters.add('Body').frames.add('Doors')
+    frame.id = 0x120
+    frame.payload_len = payload_len
+    for fields in signals:
+        signal = frame.mux_static_signals.add(fields.pop('name'))
+        for key, value in fields.items():
+            setattr(signal, key, value)
+    for subframe_spec in subframes:
+        subframe = frame.mux_subframes.add(subframe_spec['name'])
+        subframe.mux_value = subframe_spec['mux_value']
+        for name, start_bit, num_bits in subframe_spec['signals']:
+            signal = subframe.dyn_signals.add(name)
+            signal.start_bit = start_bit
+            signal.num_bits = num_bits
+    return db
+
+
+def _signal(name, start_bit, num_bits, **fields):
+    fields.update(name=name, start_bit=start_bit, num_bits=num_bits)
+    return fields
+
+
+def test_validate_clean_database():
+    db = _database([_signal('Lock', 0, 1), _signal('Window', 8, 8)])
+    report = db.validate()
+    assert report.ok
+    assert len(report) == 0
+    assert report.num_objects == 4
+    report.raise_for_errors()
+
+
+def test_validate_reports_all_problems():
+    db = _database([
+        _signal('Lock', 0, 4),
+        _signal('Latch', 2, 4),
+        _signal('Window', 20, 8),
+        _signal('Mirror', 14, 4),
+        _signal('Seat', 8, 60)])
+    frame = db.clusters['Body'].frames['Doors']
+    frame.default_payload = [0, 0, 0]
+
+    report = db.validate(workers=4)
+
+    assert not report.ok
+    found = [(issue.path, issue.error_code) for issue in report.errors]
+    assert found == [
+        ('Body.Doors.Latch', _cconsts.NX_ERR_DB_CONFIG_SIG_OVERLAPPED),
+        ('Body.Doors.Window', _cconsts.NX_ERR_DB_CONFIG_SIG_OUT_OF_FRAME),
+        ('Body.Doors.Mirror', _cconsts.NX_ERR_DB_CONFIG_SIG_OUT_OF_FRAME),
+        ('Body.Doors.Seat', _cconsts.NX_ERR_DB_CONFIG_SIG_OUT_OF_FRAME),
+        ('Body.Doors', _cconsts.NX_ERR_DB_CONFIG_SIG_OUT_OF_FRAME),
+    ]
+    assert 'Start bit 20' in report.errors[1].message
+    assert [issue.path for issue in report.warnings] == ['Body.Doors']
+    assert report.warnings[0].error_code == _cconsts.NX_ERR_DEFAULT_PAYLOAD_NUM_BYTES
+
+    with pytest.raises(errors.XnetError) as excinfo:
+        report.raise_for_errors()
+    assert str(excinfo.value).startswith('Body.Doors.Latch: ')
+    assert excinfo.value.error_code == _cconsts.NX_ERR_DB_CONFIG_SIG_OVERLAPPED
+
+
+def test_validate_multiplexed_signals():
+    db = _database(
+        [_signal('Mode', 0, 4, mux_is_data_mux=True), _signal('Status', 4, 4)],
+        subframes=[
+            {'name': 'Mode1', 'mux_value': 1, 'signals': [('Speed', 8, 8)]},
+            {'name': 'Mode2', 'mux_value': 2, 'signals': [('Torque', 8, 8), ('Flags', 6, 4)]},
+        ])
+    report = db.validate()
+    assert [(issue.path, issue.message) for issue in report.errors] == [
+        ('Body.Doors.Flags', 'Signal overlaps "Body.Doors.Status".'),
+    ]
+
+
+def test_validate_payload_length():
+    db = _database([], payload_len=9)
+    report = db.validate(precheck=False)
+    assert [(issue.path, issue.error_code) for issue in report] == [
+        ('Body.Doors', _cconsts.NX_ERR_DB_CONFIG_FRAME_NUM_BYTES),
+    ]
+    report = db.validate()
+    assert [(issue.path, issue.error_code) for issue in report] == [
+        ('Body.Doors', _cconsts.NX_ERR_DB_CONFIG_FRAME_NUM_BYTES),
+    ]
@@ -0,0 +1,102 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import pytest  # type: ignore
+
+from nixnet import database
+from nixnet.database import _dbc_signal_value_table
+
+
+_GEARS = {'Park': 0, 'Reverse': 1, 'Neutral': 2, 'Drive': 3, 'Invalid': 15}
+_ERRORS = {'None': 0, 'Timeout': 0x1000, 'Overflow': 0x20000, 'Fault': 0x7FFFFFFF}
+
+
+@pytest.fixture
+def no_numpy(monkeypatch):
+    monkeypatch.setattr(_dbc_signal_value_table, 'numpy', None)
+
+
+def _signal_value_table(values):
+    signal = database.MemoryDatabase('test').clusters.add('Body').frames.add('Gear').mux_static_signals.add('Gear')
+    signal._get_value_table().update(values)
+    return signal.dbc_signal_value_table
+
+
+def test_compile_from_signal():
+    value_table = _signal_value_table(_GEARS)
+    table = value_table.compile()
+    assert table.labels == ('Park', 'Reverse', 'Neutral', 'Drive', 'Invalid')
+    assert table.raw_values == (0, 1, 2, 3, 15)
+    assert table.dense
+    assert len(table) == 5
+
+    # The compiled table is a snapshot.
+    value_table._value_table['Sport'] = 4
+    assert len(table) == 5
+    assert not database.CompiledValueTable(_ERRORS).dense
+
+
+@pytest.mark.parametrize('values', [_GEARS, _ERRORS])
+def test_lists_without_numpy(no_numpy, values):
+    table = database.CompiledValueTable(values)
+    raw = list(values.values()) + [7, 2.5]
+    codes = table.codes(raw)
+    assert codes[-2:] == [-1, -1]
+    assert [table.raw_values[code] for code in codes[:-2]] == raw[:-2]
+    assert table.decode(raw, default='?') == list(values.keys()) + ['?', '?']
+    assert table.encode(list(values.keys())) == list(values.values())
+    assert table.encode_codes(codes[:-2]) == raw[:-2]
+    with pytest.raises(KeyError):
+        table.encode(['Unknown'])
+    with pytest.raises(IndexError):
+        table.encode_codes([-1])
+
+
+@pytest.mark.parametrize('values', [_GEARS, _ERRORS])
+def test_numpy_arrays(values):
+    numpy = pytest.importorskip('numpy')
+    table = database.CompiledValueTable(values)
+    raw = numpy.array((list(values.values()) + [7, -1, 0x7FFFFFFF + 1]) * 2, dtype=numpy.int64).reshape(2, -1)
+
+    codes = table.codes(raw)
+    assert codes.shape == raw.shape
+    known = codes >= 0
+    assert known.sum(axis=1).tolist() == [len(values)] * 2
+    assert numpy.array_equal(table.encode_codes(codes[known]), raw[known])
+
+    labels = table.decode(raw)
+    assert labels.dtype == object
+    assert labels.shape == raw.shape
+    assert labels[0].tolist() == list(values.keys()) + [None] * 3
+
+    assert numpy.array_equal(table.encode(labels[known].astype(str)), raw[known])
+    with pytest.raises(KeyError):
+        table.encode(['Park', 'Unknown'])
+    with pytest.raises(IndexError):
+        table.encode_codes([len(values)])
+
+
+def test_numpy_float_and_empty():
+    numpy = pytest.importorskip('numpy')
+    table = database.CompiledValueTable(_GEARS)
+    codes = table.codes(numpy.array([3.0, 3.5, numpy.nan, numpy.inf, 15.0]))
+    assert codes.tolist() == [3, -1, -1, -1, 4]
+    assert table.decode(numpy.array([], dtype=numpy.uint8)).shape == (0,)
+    assert table.encode([]).shape == (0,)
+    assert database.CompiledValueTable({}).codes(numpy.arange(3)).tolist() == [-1, -1, -1]
+    with pytest.raises(TypeError):
+        table.codes(numpy.array(['Park']))
+
+
+@pytest.mark.parametrize('values', [{'Err': -1, 'Off': 0, 'On': 1}, dict(_ERRORS, Err=-1)])
+def test_numpy_values_outside_table(recwarn, values):
+    numpy = pytest.importorskip('numpy')
+    table = database.CompiledValueTable(values)
+    # Code 1 is the label of raw value 0, after 'Err' with raw value -1.
+    # Casting the other values to int64 would wrap them to -1, or overflow.
+    assert table.codes(numpy.array([2 ** 64 - 1, 0], dtype=numpy.uint64)).tolist() == [-1, 1]
+    assert table.codes(numpy.array([1e30, -1e30, 2.0 ** 63, -1.0])).tolist() == [-1, -1, -1, 0]
+    assert table.codes(numpy.array([-128, 0], dtype=numpy.int8)).tolist() == [-1, 1]
+    assert table.decode(numpy.array([2 ** 64 - 1], dtype=numpy.uint64)).tolist() == [None]
+    assert not [warning for warning in recwarn if issubclass(warning.category, RuntimeWarning)]